@@ -1,11 +1,13 @@
 """
-Admin DLQ metrics API router.
+Admin DLQ API router.
 
-Provides a single ``GET /admin/api/dlq/metrics`` endpoint that returns
-aggregated DLQ message counts per queue and status.  Protected by the
-same HMAC session token used by SQLAdmin.
+Provides ``GET /admin/api/dlq/metrics``, which returns aggregated DLQ
+message counts per queue and status, and ``POST /admin/api/dlq/retry``,
+which republishes every pending message matching a filter.  Protected by
+the same HMAC session token used by SQLAdmin.
 """
 
+from datetime import datetime
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, Request
@@ -14,8 +16,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.admin.auth import admin_auth
 from app.core.db.crud.dlq_message import dlq_message_db
-from app.core.dependencies.db import get_async_session
+from app.core.dependencies.db import get_read_session
 from app.core.exceptions.types import AuthenticationException
+from app.core.services.dlq import retry_by_filter
 
 router = APIRouter()
 
@@ -61,8 +64,38 @@ class DLQMetricsResponse(BaseModel):
     ]
 
 
+class DLQRetryRequest(BaseModel):
+    queue_name: Annotated[
+        str | None,
+        Field(description="DLQ or original queue name (all queues if omitted)"),
+    ] = None
+    error_pattern: Annotated[
+        str | None,
+        Field(
+            min_length=1,
+            description="Case-insensitive substring of the error message",
+        ),
+    ] = None
+    since: Annotated[
+        datetime | None,
+        Field(description="Only messages dead-lettered at or after this time"),
+    ] = None
+    until: Annotated[
+        datetime | None,
+        Field(description="Only messages dead-lettered before this time"),
+    ] = None
+
+
+class DLQRetryResponse(BaseModel):
+    retried: Annotated[int, Field(description="Messages republished")]
+    skipped: Annotated[
+        int,
+        Field(description="Messages left pending (original queue unknown)"),
+    ]
+
+
 # ---------------------------------------------------------------------------
-# Endpoint
+# Endpoints
 # ---------------------------------------------------------------------------
 
 
@@ -81,7 +114,7 @@ class DLQMetricsResponse(BaseModel):
     dependencies=[Depends(require_admin_auth)],
 )
 async def dlq_metrics(
-    session: Annotated[AsyncSession, Depends(get_async_session)],
+    session: Annotated[AsyncSession, Depends(get_read_session)],
 ) -> DLQMetricsResponse:
     summary = await dlq_message_db.get_metrics_summary(session)
     rows = await dlq_message_db.get_metrics(session)
@@ -101,3 +134,29 @@ async def dlq_metrics(
         by_queue=summary["by_queue"],
         items=items,
     )
+
+
+@router.post(
+    "/dlq/retry",
+    response_model=DLQRetryResponse,
+    summary="Bulk DLQ Retry",
+    description=(
+        "## Bulk DLQ Retry\n\n"
+        "Republishes every **pending** dead-lettered message matching the\n"
+        "filter to its original queue and marks it `retried`.  Matching rows\n"
+        "are streamed in keyset pages and each page is published with one\n"
+        "publisher-confirm wait.  An empty filter retries every pending\n"
+        "message.\n\n"
+        "### Authentication\n\n"
+        "Requires a valid admin session (same HMAC token as `/admin`)."
+    ),
+    dependencies=[Depends(require_admin_auth)],
+)
+async def dlq_retry(body: DLQRetryRequest) -> DLQRetryResponse:
+    result = await retry_by_filter(
+        queue_name=body.queue_name,
+        error_pattern=body.error_pattern,
+        since=body.since,
+        until=body.until,
+    )
+    return DLQRetryResponse(retried=result.retried, skipped=result.skipped)
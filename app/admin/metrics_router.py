@@ -0,0 +1,222 @@
+"""
+Admin runtime metrics API router.
+
+Provides ``GET /admin/api/metrics/db-pool``, reporting the database
+connection pools of the serving process: the active pool profile, live
+pool counters, pool event counters and the background liveness state.
+
+Provides ``GET /admin/api/metrics/messaging`` (JSON) and
+``GET /admin/api/metrics/messaging/prometheus`` (text exposition format),
+reporting the messaging layer: handler run time and time-in-queue
+histograms, message outcomes and polled queue depths merged across every
+process that reports to Redis (API, consumer workers), plus the
+transactional outbox backlog.
+
+Protected by the same HMAC session token used by SQLAdmin.
+"""
+
+from datetime import datetime, timezone
+from typing import Annotated, Any
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+from pydantic import BaseModel, Field
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.admin.dlq_router import require_admin_auth
+from app.core.config import DatabasePoolProfile, settings
+from app.core.db import db_router
+from app.core.db.crud import outbox_event_db
+from app.core.dependencies.db import get_read_session
+from app.core.services.messaging_metrics import (
+    collect_messaging_metrics,
+    messaging_metrics,
+)
+
+router = APIRouter()
+
+
+# ---------------------------------------------------------------------------
+# Schemas
+# ---------------------------------------------------------------------------
+
+
+class DBPoolMetricsResponse(BaseModel):
+    process_role: Annotated[str, Field(description="PROCESS_ROLE of this process")]
+    profile: Annotated[DatabasePoolProfile, Field(description="Pool profile in effect")]
+    statement_cache_size: Annotated[
+        int, Field(description="Prepared statements cached per connection")
+    ]
+    pgbouncer_transaction_mode: Annotated[
+        bool, Field(description="Whether PgBouncer compatibility is enabled")
+    ]
+    pre_ping: Annotated[bool, Field(description="Whether checkout pre-ping is on")]
+    engines: Annotated[
+        dict[str, dict[str, Any]],
+        Field(description="Pool statistics keyed by engine (primary, replica-N)"),
+    ]
+
+
+class OutboxBacklog(BaseModel):
+    pending: Annotated[int, Field(description="Outbox events not yet published")]
+    oldest_pending_age_seconds: Annotated[
+        float | None, Field(description="Age of the oldest pending event")
+    ]
+    exhausted: Annotated[
+        int,
+        Field(
+            description=(
+                "Pending events the relay gave up on after "
+                "OUTBOX_RELAY_MAX_ATTEMPTS failed attempts"
+            )
+        ),
+    ]
+
+
+class MessagingMetricsResponse(BaseModel):
+    broker: Annotated[str, Field(description="MESSAGING_BROKER in use")]
+    processes: Annotated[
+        list[str],
+        Field(description="Processes whose metrics are included (role:host:pid)"),
+    ]
+    queues: Annotated[
+        dict[str, dict[str, Any]],
+        Field(
+            description=(
+                "Per queue: handler and time-in-queue histograms, message "
+                "outcome counts and the last polled depth"
+            )
+        ),
+    ]
+    outbox: OutboxBacklog
+
+
+# ---------------------------------------------------------------------------
+# Endpoint
+# ---------------------------------------------------------------------------
+
+
+@router.get(
+    "/metrics/db-pool",
+    response_model=DBPoolMetricsResponse,
+    summary="Database Pool Metrics",
+    description=(
+        "## Database Pool Metrics\n\n"
+        "Returns connection pool statistics for this API process.\n\n"
+        "### Per engine\n\n"
+        "- `size`, `checked_in`, `checked_out`, `overflow` - live pool state\n"
+        "- `connects`, `checkouts`, `checkins`, `invalidations` - event counts\n"
+        "- `hold_ms_avg`, `hold_ms_max` - how long connections are held\n"
+        "- `liveness_ok`, `liveness_latency_ms`, `liveness_failures` - "
+        "background liveness check\n"
+        "- `reads_routed` (and `healthy`/`lag_seconds` for replicas)\n\n"
+        "### Authentication\n\n"
+        "Requires a valid admin session (same HMAC token as `/admin`)."
+    ),
+    dependencies=[Depends(require_admin_auth)],
+)
+async def db_pool_metrics() -> DBPoolMetricsResponse:
+    return DBPoolMetricsResponse(
+        process_role=settings.PROCESS_ROLE,
+        profile=settings.db_pool_profile,
+        statement_cache_size=settings.DB_STATEMENT_CACHE_SIZE,
+        pgbouncer_transaction_mode=settings.DB_PGBOUNCER_TRANSACTION_MODE,
+        pre_ping=settings.DB_POOL_PRE_PING,
+        engines=db_router.pool_metrics(),
+    )
+
+
+async def _outbox_backlog(session: AsyncSession) -> OutboxBacklog:
+    pending, oldest = await outbox_event_db.backlog(session)
+    exhausted = await outbox_event_db.count_exhausted(
+        session, settings.OUTBOX_RELAY_MAX_ATTEMPTS
+    )
+    age = None
+    if oldest is not None:
+        age = (datetime.now(timezone.utc) - oldest).total_seconds()
+    return OutboxBacklog(
+        pending=pending, oldest_pending_age_seconds=age, exhausted=exhausted
+    )
+
+
+@router.get(
+    "/metrics/messaging",
+    response_model=MessagingMetricsResponse,
+    summary="Messaging Metrics",
+    description=(
+        "## Messaging Metrics\n\n"
+        "Returns messaging-layer metrics merged across every process that "
+        "reports to Redis (every `MESSAGING_METRICS_REPORT_SECONDS`): the API "
+        "and each consumer worker. `processes` lists the processes included; "
+        "without Redis only the serving process is reported.\n\n"
+        "### Per queue\n\n"
+        "- `handlers` - handler run-time histogram (seconds) per handler\n"
+        "- `time_in_queue_seconds` - publish (`x-published-at`) to ack "
+        "histogram, retry waits included\n"
+        "- `messages` - counts by outcome: `acked`, `retried`, "
+        "`dead_lettered`, `dropped`\n"
+        "- `depth` - ready `messages` and `consumers` from the last passive "
+        "declare (every `RABBITMQ_QUEUE_DEPTH_POLL_SECONDS`)\n\n"
+        "Histograms report cumulative bucket counts keyed by upper bound.\n\n"
+        "### Outbox\n\n"
+        "- `pending`, `oldest_pending_age_seconds` - events waiting for the "
+        "relay\n"
+        "- `exhausted` - pending events the relay gave up on after "
+        "`OUTBOX_RELAY_MAX_ATTEMPTS` failed attempts\n\n"
+        "### Authentication\n\n"
+        "Requires a valid admin session (same HMAC token as `/admin`)."
+    ),
+    dependencies=[Depends(require_admin_auth)],
+)
+async def messaging_metrics_json(
+    session: Annotated[AsyncSession, Depends(get_read_session)],
+) -> MessagingMetricsResponse:
+    metrics, processes = await collect_messaging_metrics(messaging_metrics)
+    return MessagingMetricsResponse(
+        broker=settings.MESSAGING_BROKER,
+        processes=processes,
+        queues=metrics.snapshot(),
+        outbox=await _outbox_backlog(session),
+    )
+
+
+@router.get(
+    "/metrics/messaging/prometheus",
+    response_class=PlainTextResponse,
+    summary="Messaging Metrics (Prometheus)",
+    description=(
+        "## Messaging Metrics (Prometheus)\n\n"
+        "The messaging metrics in the Prometheus text exposition format: "
+        "`messaging_handler_seconds` and `messaging_time_in_queue_seconds` "
+        "histograms, `messaging_messages_total`, `messaging_queue_messages`, "
+        "`messaging_queue_consumers`, `messaging_outbox_pending`, "
+        "`messaging_outbox_oldest_pending_age_seconds` and "
+        "`messaging_outbox_exhausted`.\n\n"
+        "### Authentication\n\n"
+        "Requires a valid admin session (same HMAC token as `/admin`)."
+    ),
+    dependencies=[Depends(require_admin_auth)],
+)
+async def messaging_metrics_prometheus(
+    session: Annotated[AsyncSession, Depends(get_read_session)],
+) -> PlainTextResponse:
+    metrics, _ = await collect_messaging_metrics(messaging_metrics)
+    backlog = await _outbox_backlog(session)
+    lines = [
+        "# HELP messaging_outbox_pending Outbox events not yet published.",
+        "# TYPE messaging_outbox_pending gauge",
+        f"messaging_outbox_pending {backlog.pending}",
+        "# HELP messaging_outbox_oldest_pending_age_seconds "
+        "Age of the oldest pending outbox event.",
+        "# TYPE messaging_outbox_oldest_pending_age_seconds gauge",
+        "messaging_outbox_oldest_pending_age_seconds "
+        f"{backlog.oldest_pending_age_seconds or 0:g}",
+        "# HELP messaging_outbox_exhausted "
+        "Pending outbox events the relay gave up on.",
+        "# TYPE messaging_outbox_exhausted gauge",
+        f"messaging_outbox_exhausted {backlog.exhausted}",
+    ]
+    return PlainTextResponse(
+        metrics.render_prometheus() + "\n".join(lines) + "\n",
+        media_type="text/plain; version=0.0.4",
+    )
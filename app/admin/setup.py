@@ -20,7 +20,9 @@ from app.admin.views import (
     WorkspaceAdmin,
     WorkspaceMemberAdmin,
 )
-from app.core.db import async_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.core.db.routing import RoutingSession
 
 # Admin instance will be created when init_admin is called
 admin: Admin | None = None
@@ -35,9 +37,11 @@ def init_admin(app: FastAPI) -> None:
     """
     global admin
 
+    # List/detail pages read from a replica when one is healthy; actions and
+    # edits write to (and then stay on) the primary.
     admin = Admin(
         app=app,
-        engine=async_engine,
+        session_maker=async_sessionmaker(sync_session_class=RoutingSession),
         title="CueBX Admin",
         base_url="/admin",
         authentication_backend=admin_auth,
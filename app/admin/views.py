@@ -26,7 +26,7 @@ from starlette.responses import RedirectResponse
 from app.apps.cubex_api.db.models.workspace import UsageLog, Workspace, WorkspaceMember
 from app.core.db import AsyncSessionLocal
 from app.core.db.crud.dlq_message import dlq_message_db
-from app.core.services.event_publisher import get_publisher
+from app.core.services.dlq import retry_messages
 from app.core.db.crud.quota import plan_pricing_rule_db
 from app.core.db.models.dlq_message import DLQMessage
 from app.core.db.models.plan import Plan
@@ -870,29 +870,9 @@ class DLQMessageAdmin(ModelView, model=DLQMessage):
         pks = request.query_params.get("pks", "").split(",")
         pks = [pk for pk in pks if pk]
 
-        async with AsyncSessionLocal() as session:
-            for pk in pks:
-                msg = await dlq_message_db.get_by_id(session, UUID(pk))
-                if not msg or msg.status != DLQMessageStatus.PENDING:
-                    continue
-
-                # Determine the original queue to re-publish to
-                original_queue = (
-                    (msg.headers or {}).get("x-original-queue") if msg.headers else None
-                )
-                if not original_queue and msg.queue_name.endswith("_dead"):
-                    original_queue = msg.queue_name[: -len("_dead")]
-
-                if original_queue:
-                    try:
-                        payload = json.loads(msg.message_body)
-                    except (json.JSONDecodeError, TypeError):
-                        payload = {"raw": msg.message_body}
-
-                    await get_publisher()(original_queue, payload)
-
-                msg.status = DLQMessageStatus.RETRIED
-            await session.commit()
+        if pks:
+            # Keyset-paged, one publish batch (single confirm wait) per page
+            await retry_messages([UUID(pk) for pk in pks])
 
         referer = request.headers.get("referer", "/admin/dlq-message/list")
         return RedirectResponse(referer, status_code=302)
@@ -6,6 +6,10 @@ from app.apps.cubex_api.db.crud.support import (
     SalesRequestDB,
     sales_request_db,
 )
+from app.apps.cubex_api.db.crud.usage_rollup import (
+    WorkspaceUsageRollupDB,
+    workspace_usage_rollup_db,
+)
 from app.apps.cubex_api.db.crud.workspace import (
     APIKeyDB,
     UsageLogDB,
@@ -24,6 +28,9 @@ __all__ = [
     # Support
     "SalesRequestDB",
     "sales_request_db",
+    # Usage rollups
+    "WorkspaceUsageRollupDB",
+    "workspace_usage_rollup_db",
     # Classes
     "APIKeyDB",
     "UsageLogDB",
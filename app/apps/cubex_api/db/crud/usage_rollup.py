@@ -0,0 +1,24 @@
+"""
+CRUD operations for workspace usage rollups.
+
+"""
+
+from app.apps.cubex_api.db.models.usage_rollup import WorkspaceUsageRollup
+from app.core.db.crud.usage_rollup import UsageRollupDB
+
+
+class WorkspaceUsageRollupDB(UsageRollupDB[WorkspaceUsageRollup]):
+    """CRUD operations for WorkspaceUsageRollup (owner column: workspace_id)."""
+
+    def __init__(self):
+        super().__init__(WorkspaceUsageRollup, owner_field="workspace_id")
+
+
+# Global CRUD instance
+workspace_usage_rollup_db = WorkspaceUsageRollupDB()
+
+
+__all__ = [
+    "WorkspaceUsageRollupDB",
+    "workspace_usage_rollup_db",
+]
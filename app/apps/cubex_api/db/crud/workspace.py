@@ -4,17 +4,20 @@ CRUD operations for Workspace models.
 """
 
 import re
+import secrets
 from datetime import datetime, timezone
 from decimal import Decimal
 from typing import Any, Sequence
 from uuid import UUID
 
 from sqlalchemy import SQLColumnExpression, and_, func
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
 
-from app.core.db.crud.base import BaseDB
+from app.core.db.crud.base import BaseDB, ReturnStrategy
+from app.core.db.crud.usage_log import UsageLogBaseDB
 from app.apps.cubex_api.db.models.workspace import (
     APIKey,
     UsageLog,
@@ -59,10 +62,23 @@ class WorkspaceDB(BaseDB[Workspace]):
     """CRUD operations for Workspace model."""
 
     SLUG_PREFIX = "ws"
+    # Random hex suffix for taken slugs (6 characters, 16.7M values)
+    SLUG_SUFFIX_BYTES = 3
+    SLUG_MAX_LENGTH = 128
+    # Inserts tried before giving up on a slug conflict
+    SLUG_MAX_ATTEMPTS = 5
 
     def __init__(self):
         super().__init__(Workspace)
 
+    def _base_slug(self, base_name: str) -> str:
+        suffix_length = self.SLUG_SUFFIX_BYTES * 2 + 1
+        base_slug = f"{self.SLUG_PREFIX}-{slugify(base_name)}"
+        return base_slug[: self.SLUG_MAX_LENGTH - suffix_length].rstrip("-")
+
+    def _suffixed_slug(self, base_slug: str) -> str:
+        return f"{base_slug}-{secrets.token_hex(self.SLUG_SUFFIX_BYTES)}"
+
     async def generate_unique_slug(
         self,
         session: AsyncSession,
@@ -71,22 +87,78 @@ class WorkspaceDB(BaseDB[Workspace]):
         """
         Generate a unique slug for a workspace.
 
+        Takes one query whatever the name: the bare slug if it is free,
+        otherwise the slug with a random suffix. Concurrent requests can
+        still pick the same slug; ``create_with_unique_slug`` retries on
+        the unique index instead of probing.
+
         Args:
             session: Database session.
             base_name: Base name to generate slug from.
 
         Returns:
-            Unique slug with prefix (e.g., 'ws-john-doe' or 'ws-john-doe-2').
+            Slug with prefix (e.g., 'ws-john-doe' or 'ws-john-doe-3f9a1c').
         """
-        base_slug = f"{self.SLUG_PREFIX}-{slugify(base_name)}"
-        slug = base_slug
-        suffix = 1
+        base_slug = self._base_slug(base_name)
+        try:
+            taken = await session.scalar(
+                select(Workspace.id).where(Workspace.slug == base_slug).limit(1)
+            )
+        except SQLAlchemyError as e:
+            raise DatabaseException(
+                f"Error checking workspace slug {base_slug}: {str(e)}"
+            ) from e
+        return self._suffixed_slug(base_slug) if taken else base_slug
 
-        while await self.exists(session, {"slug": slug}):
-            slug = f"{base_slug}-{suffix}"
-            suffix += 1
+    async def create_with_unique_slug(
+        self,
+        session: AsyncSession,
+        data: dict[str, Any],
+        base_name: str,
+        return_strategy: ReturnStrategy = ReturnStrategy.REFRESH,
+    ) -> Workspace:
+        """
+        Create a workspace with a slug generated from ``base_name``.
 
-        return slug
+        Each insert runs in a savepoint; if another transaction took the
+        slug first, the insert is retried with a new random suffix.
+        Flushes only; the caller commits.
+
+        Args:
+            session: Database session (within a transaction).
+            data: Workspace fields other than ``slug``.
+            base_name: Base name to generate the slug from.
+            return_strategy: How the returned workspace is hydrated.
+
+        Returns:
+            Created workspace.
+
+        Raises:
+            DatabaseException: On other database errors, or if no free slug
+                was found in ``SLUG_MAX_ATTEMPTS`` inserts.
+        """
+        base_slug = self._base_slug(base_name)
+        slug = await self.generate_unique_slug(session, base_name)
+        for _ in range(self.SLUG_MAX_ATTEMPTS):
+            try:
+                async with session.begin_nested():
+                    return await self.create(
+                        session,
+                        {**data, "slug": slug},
+                        commit_self=False,
+                        return_strategy=return_strategy,
+                    )
+            except DatabaseException as e:
+                if not (
+                    isinstance(e.__cause__, IntegrityError)
+                    and "slug" in str(e.__cause__.orig)
+                ):
+                    raise
+            slug = self._suffixed_slug(base_slug)
+
+        raise DatabaseException(
+            f"Could not allocate a unique workspace slug for {base_name!r}"
+        )
 
     async def get_by_slug(
         self,
@@ -237,6 +309,7 @@ class WorkspaceMemberDB(BaseDB[WorkspaceMember]):
         session: AsyncSession,
         workspace_id: UUID,
         user_id: UUID,
+        load_user: bool = True,
     ) -> WorkspaceMember | None:
         """
         Get workspace member.
@@ -245,6 +318,7 @@ class WorkspaceMemberDB(BaseDB[WorkspaceMember]):
             session: Database session.
             workspace_id: Workspace ID.
             user_id: User ID.
+            load_user: Eager-load ``member.user`` (skip for permission checks).
 
         Returns:
             Member or None if not found.
@@ -252,7 +326,7 @@ class WorkspaceMemberDB(BaseDB[WorkspaceMember]):
         return await self.get_one_by_filters(
             session,
             {"workspace_id": workspace_id, "user_id": user_id, "is_deleted": False},
-            options=[selectinload(WorkspaceMember.user)],
+            options=[selectinload(WorkspaceMember.user)] if load_user else [],
         )
 
     async def get_workspace_members(
@@ -588,6 +662,32 @@ class APIKeyDB(BaseDB[APIKey]):
             options=[selectinload(APIKey.workspace)],
         )
 
+    async def get_many_by_key_hashes(
+        self,
+        session: AsyncSession,
+        key_hashes: Sequence[str],
+    ) -> dict[str, APIKey]:
+        """
+        Get several (non-deleted) API keys by hash in one query.
+
+        Args:
+            session: Database session.
+            key_hashes: HMAC-SHA256 hashes of the API keys.
+
+        Returns:
+            Mapping of key hash to APIKey for the keys that exist.
+        """
+        if not key_hashes:
+            return {}
+        keys = await self.get_all(
+            session,
+            filters=[
+                APIKey.key_hash.in_(set(key_hashes)),
+                APIKey.is_deleted.is_(False),
+            ],
+        )
+        return {key.key_hash: key for key in keys}
+
     async def get_active_by_hash(
         self,
         session: AsyncSession,
@@ -712,7 +812,7 @@ class APIKeyDB(BaseDB[APIKey]):
         )
 
 
-class UsageLogDB(BaseDB[UsageLog]):
+class UsageLogDB(UsageLogBaseDB[UsageLog]):
     """
     CRUD operations for UsageLog model.
 
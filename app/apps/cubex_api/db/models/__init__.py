@@ -3,6 +3,7 @@ Database models for cubex_api.
 """
 
 from app.apps.cubex_api.db.models.support import SalesRequest
+from app.apps.cubex_api.db.models.usage_rollup import WorkspaceUsageRollup
 from app.apps.cubex_api.db.models.workspace import (
     APIKey,
     UsageLog,
@@ -18,4 +19,5 @@ __all__ = [
     "Workspace",
     "WorkspaceInvitation",
     "WorkspaceMember",
+    "WorkspaceUsageRollup",
 ]
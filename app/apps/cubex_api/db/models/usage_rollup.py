@@ -0,0 +1,146 @@
+"""
+Usage rollup model for cubex_api.
+
+"""
+
+from datetime import datetime
+from decimal import Decimal
+from uuid import UUID
+
+from sqlalchemy import (
+    BigInteger,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    Integer,
+    Numeric,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.db.models.base import BaseModel
+from app.core.enums import FeatureKey, UsageRollupGranularity
+
+
+class WorkspaceUsageRollup(BaseModel):
+    """
+    Pre-aggregated API usage per workspace, feature and time bucket.
+
+    One row exists per (workspace, feature_key, granularity, bucket_start).
+    Rows are maintained by the usage commit path with an idempotent
+    ``INSERT ... ON CONFLICT DO UPDATE`` that adds the committed log's
+    counters to the stored ones, so usage summaries never scan usage_logs.
+
+    Only logs leaving PENDING through a commit are rolled up; logs expired
+    by the scheduler are not counted.
+
+    Attributes:
+        workspace_id: Foreign key to the workspace.
+        feature_key: Feature the usage was recorded for.
+        granularity: Bucket size (hour or day).
+        bucket_start: UTC start of the bucket.
+        request_count: Committed requests in the bucket.
+        success_count: Requests committed as SUCCESS.
+        failed_count: Requests committed as FAILED.
+        credits_charged: Credits charged for successful live-key requests.
+        input_tokens: Sum of reported input tokens.
+        output_tokens: Sum of reported output tokens.
+        latency_ms_sum: Sum of reported latencies (for the mean).
+        latency_count: Number of requests that reported a latency.
+        latency_histogram: Counts per LATENCY_HISTOGRAM_BOUNDS_MS slot.
+    """
+
+    __tablename__ = "workspace_usage_rollups"
+    __table_args__ = (
+        Index(
+            "uq_workspace_usage_rollups_bucket",
+            "workspace_id",
+            "feature_key",
+            "granularity",
+            "bucket_start",
+            unique=True,
+        ),
+        Index(
+            "ix_workspace_usage_rollups_workspace_granularity_bucket",
+            "workspace_id",
+            "granularity",
+            "bucket_start",
+        ),
+    )
+
+    workspace_id: Mapped[UUID] = mapped_column(
+        PG_UUID(as_uuid=True),
+        ForeignKey("workspaces.id", ondelete="CASCADE"),
+        nullable=False,
+        comment="Workspace the usage is attributed to",
+    )
+
+    feature_key: Mapped[FeatureKey] = mapped_column(
+        Enum(FeatureKey, native_enum=False, name="feature_key"),
+        nullable=False,
+        comment="Feature Key (e.g., 'api.career_path')",
+    )
+
+    granularity: Mapped[UsageRollupGranularity] = mapped_column(
+        Enum(
+            UsageRollupGranularity,
+            native_enum=False,
+            name="usage_rollup_granularity",
+        ),
+        nullable=False,
+        comment="Bucket size: hour or day",
+    )
+
+    bucket_start: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        comment="UTC start of the hour/day bucket",
+    )
+
+    request_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, comment="Committed requests"
+    )
+
+    success_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, comment="Requests committed as SUCCESS"
+    )
+
+    failed_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, comment="Requests committed as FAILED"
+    )
+
+    credits_charged: Mapped[Decimal] = mapped_column(
+        Numeric(14, 2),
+        nullable=False,
+        default=Decimal("0"),
+        comment="Credits charged for successful live-key requests",
+    )
+
+    input_tokens: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, default=0, comment="Sum of input tokens"
+    )
+
+    output_tokens: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, default=0, comment="Sum of output tokens"
+    )
+
+    latency_ms_sum: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, default=0, comment="Sum of reported latencies"
+    )
+
+    latency_count: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        comment="Requests that reported a latency",
+    )
+
+    latency_histogram: Mapped[list[int]] = mapped_column(
+        ARRAY(Integer),
+        nullable=False,
+        comment="Request counts per latency histogram slot",
+    )
+
+
+__all__ = ["WorkspaceUsageRollup"]
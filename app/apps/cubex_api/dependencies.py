@@ -17,7 +17,7 @@ Example usage:
 
     @router.get("/workspaces/{workspace_id}")
     async def get_workspace(member: WorkspaceMember):
-        # member is the WorkspaceMember object for current user
+        # member is the current user's membership snapshot
         return {"workspace_id": member.workspace_id}
 
     @router.patch("/workspaces/{workspace_id}/settings")
@@ -37,11 +37,14 @@ from uuid import UUID
 from fastapi import Depends, Path
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.apps.cubex_api.db.crud import workspace_member_db, workspace_db
-from app.apps.cubex_api.db.models import Workspace, WorkspaceMember
-from app.core.dependencies import get_async_session, get_current_active_user
+from app.apps.cubex_api.db.crud import workspace_db
+from app.apps.cubex_api.db.models import Workspace
+from app.apps.cubex_api.services.membership_cache import (
+    MembershipSnapshot,
+    membership_cache,
+)
+from app.core.dependencies import CurrentActivePrincipal, get_async_session
 from app.core.config import request_logger
-from app.core.db.models import User
 from app.core.enums import WorkspaceStatus
 from app.core.exceptions.types import (
     ForbiddenException,
@@ -91,25 +94,25 @@ class WorkspaceFrozenException(ForbiddenException):
 
 async def get_workspace_member(
     workspace_id: Annotated[UUID, Path(description="Workspace ID")],
-    current_user: Annotated[User, Depends(get_current_active_user)],
+    current_user: CurrentActivePrincipal,
     session: Annotated[AsyncSession, Depends(get_async_session)],
-) -> WorkspaceMember:
+) -> MembershipSnapshot:
     """
     Verify user is a member of the workspace and return membership.
 
     This dependency:
     1. Extracts workspace_id from path parameters
     2. Gets current authenticated user
-    3. Checks if user is a member of the workspace
-    4. Returns the WorkspaceMember object
+    3. Checks if user is a member of the workspace (via the membership cache)
+    4. Returns the membership snapshot
 
     Args:
         workspace_id: The workspace ID from the path.
-        current_user: The authenticated user.
+        current_user: The authenticated principal (cached, no user read).
         session: The database session.
 
     Returns:
-        WorkspaceMember: The membership record for the current user.
+        MembershipSnapshot: The membership of the current user.
 
     Raises:
         WorkspaceAccessDeniedException: If user is not a member.
@@ -119,10 +122,7 @@ async def get_workspace_member(
         async def get_info(member: WorkspaceMember):
             return {"role": member.role.value}
     """
-    async with session.begin():
-        member = await workspace_member_db.get_member(
-            session, workspace_id, current_user.id
-        )
+    member = await membership_cache.get(session, workspace_id, current_user.id)
 
     if not member:
         request_logger.warning(
@@ -138,8 +138,8 @@ async def get_workspace_member(
 
 
 async def get_workspace_admin(
-    member: Annotated[WorkspaceMember, Depends(get_workspace_member)],
-) -> WorkspaceMember:
+    member: Annotated[MembershipSnapshot, Depends(get_workspace_member)],
+) -> MembershipSnapshot:
     """
     Verify user is an admin or owner of the workspace.
 
@@ -150,7 +150,7 @@ async def get_workspace_admin(
         member: The workspace member from get_workspace_member.
 
     Returns:
-        WorkspaceMember: The membership record if user is admin/owner.
+        MembershipSnapshot: The membership if user is admin/owner.
 
     Raises:
         AdminPermissionRequiredException: If user is not admin/owner.
@@ -172,8 +172,8 @@ async def get_workspace_admin(
 
 
 async def get_workspace_owner(
-    member: Annotated[WorkspaceMember, Depends(get_workspace_member)],
-) -> WorkspaceMember:
+    member: Annotated[MembershipSnapshot, Depends(get_workspace_member)],
+) -> MembershipSnapshot:
     """
     Verify user is the owner of the workspace.
 
@@ -184,7 +184,7 @@ async def get_workspace_owner(
         member: The workspace member from get_workspace_member.
 
     Returns:
-        WorkspaceMember: The membership record if user is owner.
+        MembershipSnapshot: The membership if user is owner.
 
     Raises:
         OwnerPermissionRequiredException: If user is not owner.
@@ -207,7 +207,7 @@ async def get_workspace_owner(
 
 async def get_active_workspace(
     workspace_id: Annotated[UUID, Path(description="Workspace ID")],
-    member: Annotated[WorkspaceMember, Depends(get_workspace_member)],
+    member: Annotated[MembershipSnapshot, Depends(get_workspace_member)],
     session: Annotated[AsyncSession, Depends(get_async_session)],
 ) -> Workspace:
     """
@@ -252,9 +252,9 @@ async def get_active_workspace(
 
 
 async def get_active_workspace_admin(
-    member: Annotated[WorkspaceMember, Depends(get_workspace_admin)],
+    member: Annotated[MembershipSnapshot, Depends(get_workspace_admin)],
     workspace: Annotated[Workspace, Depends(get_active_workspace)],
-) -> tuple[WorkspaceMember, Workspace]:
+) -> tuple[MembershipSnapshot, Workspace]:
     """
     Get admin member and verify workspace is active.
 
@@ -277,9 +277,9 @@ async def get_active_workspace_admin(
 
 
 async def get_active_workspace_owner(
-    member: Annotated[WorkspaceMember, Depends(get_workspace_owner)],
+    member: Annotated[MembershipSnapshot, Depends(get_workspace_owner)],
     workspace: Annotated[Workspace, Depends(get_active_workspace)],
-) -> tuple[WorkspaceMember, Workspace]:
+) -> tuple[MembershipSnapshot, Workspace]:
     """
     Get owner member and verify workspace is active.
 
@@ -302,17 +302,17 @@ async def get_active_workspace_owner(
 
 
 # Basic workspace access
-WorkspaceMemberDep = Annotated[WorkspaceMember, Depends(get_workspace_member)]
-WorkspaceAdminDep = Annotated[WorkspaceMember, Depends(get_workspace_admin)]
-WorkspaceOwnerDep = Annotated[WorkspaceMember, Depends(get_workspace_owner)]
+WorkspaceMemberDep = Annotated[MembershipSnapshot, Depends(get_workspace_member)]
+WorkspaceAdminDep = Annotated[MembershipSnapshot, Depends(get_workspace_admin)]
+WorkspaceOwnerDep = Annotated[MembershipSnapshot, Depends(get_workspace_owner)]
 
 # Active workspace (not frozen)
 ActiveWorkspaceDep = Annotated[Workspace, Depends(get_active_workspace)]
 ActiveWorkspaceAdminDep = Annotated[
-    tuple[WorkspaceMember, Workspace], Depends(get_active_workspace_admin)
+    tuple[MembershipSnapshot, Workspace], Depends(get_active_workspace_admin)
 ]
 ActiveWorkspaceOwnerDep = Annotated[
-    tuple[WorkspaceMember, Workspace], Depends(get_active_workspace_owner)
+    tuple[MembershipSnapshot, Workspace], Depends(get_active_workspace_owner)
 ]
 
 
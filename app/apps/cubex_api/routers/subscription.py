@@ -14,10 +14,13 @@ from uuid import UUID
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.dependencies import CurrentActiveUser, get_async_session
+from app.core.dependencies import (
+    CurrentActivePrincipal,
+    CurrentActiveUser,
+    get_async_session,
+)
 from app.core.config import request_logger
 from app.core.services.rate_limit import rate_limit_by_ip
-from app.apps.cubex_api.db.crud import workspace_member_db
 from app.apps.cubex_api.schemas import (
     PlanResponse,
     PlanListResponse,
@@ -35,6 +38,7 @@ from app.apps.cubex_api.schemas import (
 )
 from app.apps.cubex_api.services import (
     subscription_service,
+    membership_cache,
     WorkspaceAccessDeniedException,
     AdminPermissionRequiredException,
     OwnerPermissionRequiredException,
@@ -307,7 +311,7 @@ Returns the subscription details including:
 )
 async def get_workspace_subscription(
     workspace_id: UUID,
-    current_user: CurrentActiveUser,
+    current_user: CurrentActivePrincipal,
     session: Annotated[AsyncSession, Depends(get_async_session)],
 ) -> SubscriptionResponse | None:
     """Get subscription for a workspace."""
@@ -315,9 +319,7 @@ async def get_workspace_subscription(
         f"GET /subscriptions/workspaces/{workspace_id} - user={current_user.id}"
     )
     async with session.begin():
-        member = await workspace_member_db.get_member(
-            session, workspace_id, current_user.id
-        )
+        member = await membership_cache.get(session, workspace_id, current_user.id)
         if not member:
             raise WorkspaceAccessDeniedException()
 
@@ -416,9 +418,7 @@ async def create_checkout(
         f"- user={current_user.id} plan={data.plan_id} seats={data.seat_count}"
     )
     async with session.begin():
-        member = await workspace_member_db.get_member(
-            session, workspace_id, current_user.id
-        )
+        member = await membership_cache.get(session, workspace_id, current_user.id)
         if not member or not member.is_admin:
             raise AdminPermissionRequiredException()
 
@@ -521,7 +521,7 @@ Returns the updated subscription with new seat count and billing details.
 async def update_seats(
     workspace_id: UUID,
     data: SeatUpdateRequest,
-    current_user: CurrentActiveUser,
+    current_user: CurrentActivePrincipal,
     session: Annotated[AsyncSession, Depends(get_async_session)],
 ) -> SubscriptionResponse:
     """Update subscription seat count."""
@@ -530,9 +530,7 @@ async def update_seats(
         f"- user={current_user.id} seats={data.seat_count}"
     )
     async with session.begin():
-        member = await workspace_member_db.get_member(
-            session, workspace_id, current_user.id
-        )
+        member = await membership_cache.get(session, workspace_id, current_user.id)
         if not member or not member.is_admin:
             raise AdminPermissionRequiredException()
 
@@ -624,7 +622,7 @@ Returns the updated subscription with cancellation details.
 async def cancel_subscription(
     workspace_id: UUID,
     data: CancelSubscriptionRequest,
-    current_user: CurrentActiveUser,
+    current_user: CurrentActivePrincipal,
     session: Annotated[AsyncSession, Depends(get_async_session)],
     _: Annotated[None, Depends(_cancel_rate_limit)],
 ) -> SubscriptionResponse:
@@ -635,9 +633,7 @@ async def cancel_subscription(
     )
     async with session.begin():
         # Check owner access (only owner can cancel)
-        member = await workspace_member_db.get_member(
-            session, workspace_id, current_user.id
-        )
+        member = await membership_cache.get(session, workspace_id, current_user.id)
         if not member or not member.is_owner:
             raise OwnerPermissionRequiredException(
                 "Only workspace owner can cancel subscription."
@@ -729,7 +725,7 @@ This endpoint enables workspace access for specified members.
 async def reactivate_workspace(
     workspace_id: UUID,
     data: ReactivateRequest,
-    current_user: CurrentActiveUser,
+    current_user: CurrentActivePrincipal,
     session: Annotated[AsyncSession, Depends(get_async_session)],
 ) -> MessageResponse:
     """Reactivate a frozen workspace after resubscription."""
@@ -737,9 +733,7 @@ async def reactivate_workspace(
         f"POST /subscriptions/workspaces/{workspace_id}/reactivate - user={current_user.id}"
     )
     async with session.begin():
-        member = await workspace_member_db.get_member(
-            session, workspace_id, current_user.id
-        )
+        member = await membership_cache.get(session, workspace_id, current_user.id)
         if not member or not member.is_owner:
             raise OwnerPermissionRequiredException(
                 "Only workspace owner can reactivate workspace."
@@ -861,7 +855,7 @@ The preview shows:
 async def preview_subscription_change(
     workspace_id: UUID,
     data: UpgradePreviewRequest,
-    current_user: CurrentActiveUser,
+    current_user: CurrentActivePrincipal,
     session: Annotated[AsyncSession, Depends(get_async_session)],
 ) -> UpgradePreviewResponse:
     """Preview the cost of upgrading to a new plan."""
@@ -870,9 +864,7 @@ async def preview_subscription_change(
         f"- user={current_user.id} new_plan={data.new_plan_id}"
     )
     async with session.begin():
-        member = await workspace_member_db.get_member(
-            session, workspace_id, current_user.id
-        )
+        member = await membership_cache.get(session, workspace_id, current_user.id)
         if not member or not member.is_admin:
             raise AdminPermissionRequiredException()
 
@@ -1010,7 +1002,7 @@ Returns the updated subscription with the new plan details.
 async def upgrade_plan(
     workspace_id: UUID,
     data: UpgradeRequest,
-    current_user: CurrentActiveUser,
+    current_user: CurrentActivePrincipal,
     session: Annotated[AsyncSession, Depends(get_async_session)],
     _: Annotated[None, Depends(_upgrade_rate_limit)],
 ) -> SubscriptionResponse:
@@ -1020,9 +1012,7 @@ async def upgrade_plan(
         f"- user={current_user.id} new_plan={data.new_plan_id}"
     )
     async with session.begin():
-        member = await workspace_member_db.get_member(
-            session, workspace_id, current_user.id
-        )
+        member = await membership_cache.get(session, workspace_id, current_user.id)
         if not member or not member.is_admin:
             raise AdminPermissionRequiredException()
 
@@ -4,8 +4,10 @@ Workspace router for cubex_api.
 - Workspace CRUD operations
 - Member management (invite, enable/disable, remove)
 - Invitation management
+- Usage summaries (served from pre-aggregated rollups)
 """
 
+from datetime import datetime
 from decimal import Decimal
 from typing import Annotated
 from uuid import UUID
@@ -15,7 +17,12 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.core.services.quota_cache import QuotaCacheService
-from app.core.dependencies import CurrentActiveUser, get_async_session
+from app.core.dependencies import (
+    CurrentActivePrincipal,
+    CurrentActiveUser,
+    get_async_session,
+    get_read_session,
+)
 from app.core.config import request_logger
 from app.core.services.rate_limit import rate_limit_by_ip
 from app.core.exceptions.types import (
@@ -28,6 +35,7 @@ from app.core.exceptions.types import (
 from app.apps.cubex_api.db.crud import (
     workspace_member_db,
     workspace_invitation_db,
+    workspace_usage_rollup_db,
 )
 from app.apps.cubex_api.schemas import (
     WorkspaceCreate,
@@ -52,6 +60,7 @@ from app.apps.cubex_api.schemas import (
 from app.apps.cubex_api.services import (
     workspace_service,
     quota_service,
+    membership_cache,
     WorkspaceNotFoundException,
     WorkspaceFrozenException,
     InsufficientSeatsException,
@@ -64,7 +73,14 @@ from app.apps.cubex_api.services import (
     FreeWorkspaceNoInvitesException,
     APIKeyNotFoundException,
 )
-from app.core.enums import MemberRole, MemberStatus
+from app.core.enums import (
+    FeatureKey,
+    MemberRole,
+    MemberStatus,
+    UsageRollupGranularity,
+)
+from app.core.schemas.usage import UsageSummaryResponse
+from app.core.services.usage_rollup import resolve_summary_window, summarize_rollups
 from app.core.services.oauth.base import OAuthStateManager
 from app.apps.cubex_api.db.models import (
     Workspace,
@@ -222,8 +238,8 @@ Returns a list of workspaces with basic information:
 """,
 )
 async def list_workspaces(
-    current_user: CurrentActiveUser,
-    session: Annotated[AsyncSession, Depends(get_async_session)],
+    current_user: CurrentActivePrincipal,
+    session: Annotated[AsyncSession, Depends(get_read_session)],
     role_filter: Annotated[MemberRole | None, Query(alias="member_role")] = None,
 ) -> WorkspaceListResponse:
     """List all workspaces the current user has access to."""
@@ -395,15 +411,13 @@ Retrieve detailed information about a specific workspace including members and s
 )
 async def get_workspace(
     workspace_id: UUID,
-    current_user: CurrentActiveUser,
+    current_user: CurrentActivePrincipal,
     session: Annotated[AsyncSession, Depends(get_async_session)],
 ) -> WorkspaceDetailResponse:
     """Get workspace details."""
     request_logger.info(f"GET /workspaces/{workspace_id} - user={current_user.id}")
     async with session.begin():
-        member = await workspace_member_db.get_member(
-            session, workspace_id, current_user.id
-        )
+        member = await membership_cache.get(session, workspace_id, current_user.id)
         if not member:
             raise NotFoundException("Workspace not found or access denied.")
 
@@ -516,7 +530,7 @@ All fields are optional. Only provided fields will be updated.
 async def update_workspace(
     workspace_id: UUID,
     data: WorkspaceUpdate,
-    current_user: CurrentActiveUser,
+    current_user: CurrentActivePrincipal,
     session: Annotated[AsyncSession, Depends(get_async_session)],
 ) -> WorkspaceResponse:
     """Update workspace details."""
@@ -608,7 +622,7 @@ Array of member objects:
 )
 async def list_members(
     workspace_id: UUID,
-    current_user: CurrentActiveUser,
+    current_user: CurrentActivePrincipal,
     session: Annotated[AsyncSession, Depends(get_async_session)],
     status_filter: MemberStatus | None = Query(None, alias="status"),
 ) -> list[WorkspaceMemberResponse]:
@@ -617,9 +631,7 @@ async def list_members(
         f"GET /workspaces/{workspace_id}/members - user={current_user.id}"
     )
     async with session.begin():
-        member = await workspace_member_db.get_member(
-            session, workspace_id, current_user.id
-        )
+        member = await membership_cache.get(session, workspace_id, current_user.id)
         if not member:
             raise NotFoundException("Workspace not found or access denied.")
 
@@ -715,7 +727,7 @@ async def update_member_status(
     workspace_id: UUID,
     member_user_id: UUID,
     data: MemberStatusUpdate,
-    current_user: CurrentActiveUser,
+    current_user: CurrentActivePrincipal,
     session: Annotated[AsyncSession, Depends(get_async_session)],
 ) -> WorkspaceMemberResponse:
     """Enable or disable a workspace member."""
@@ -815,7 +827,7 @@ async def update_member_role(
     workspace_id: UUID,
     member_user_id: UUID,
     data: MemberRoleUpdate,
-    current_user: CurrentActiveUser,
+    current_user: CurrentActivePrincipal,
     session: Annotated[AsyncSession, Depends(get_async_session)],
 ) -> WorkspaceMemberResponse:
     """Update a member's role."""
@@ -908,7 +920,7 @@ removed from the member list.
 async def remove_member(
     workspace_id: UUID,
     member_user_id: UUID,
-    current_user: CurrentActiveUser,
+    current_user: CurrentActivePrincipal,
     session: Annotated[AsyncSession, Depends(get_async_session)],
 ) -> MessageResponse:
     """Remove a member from workspace."""
@@ -995,7 +1007,7 @@ Voluntarily leave a workspace. The user loses all access.
 )
 async def leave_workspace(
     workspace_id: UUID,
-    current_user: CurrentActiveUser,
+    current_user: CurrentActivePrincipal,
     session: Annotated[AsyncSession, Depends(get_async_session)],
 ) -> MessageResponse:
     """Leave a workspace."""
@@ -1092,7 +1104,7 @@ Returns the updated workspace with new owner.
 async def transfer_ownership(
     workspace_id: UUID,
     new_owner_id: UUID,
-    current_user: CurrentActiveUser,
+    current_user: CurrentActivePrincipal,
     session: Annotated[AsyncSession, Depends(get_async_session)],
     _: Annotated[None, Depends(_transfer_rate_limit)],
 ) -> WorkspaceResponse:
@@ -1177,7 +1189,7 @@ Retrieve all pending invitations for a workspace.
 )
 async def list_invitations(
     workspace_id: UUID,
-    current_user: CurrentActiveUser,
+    current_user: CurrentActivePrincipal,
     session: Annotated[AsyncSession, Depends(get_async_session)],
 ) -> InvitationListResponse:
     """List pending invitations."""
@@ -1185,9 +1197,7 @@ async def list_invitations(
         f"GET /workspaces/{workspace_id}/invitations - user={current_user.id}"
     )
     async with session.begin():
-        member = await workspace_member_db.get_member(
-            session, workspace_id, current_user.id
-        )
+        member = await membership_cache.get(session, workspace_id, current_user.id)
         if not member or not member.is_admin:
             raise ForbiddenException("Admin permission required.")
 
@@ -1287,7 +1297,7 @@ an invitation URL to accept.
 async def create_invitation(
     workspace_id: UUID,
     data: InvitationCreate,
-    current_user: CurrentActiveUser,
+    current_user: CurrentActivePrincipal,
     session: Annotated[AsyncSession, Depends(get_async_session)],
     _: Annotated[None, Depends(_invite_rate_limit)],
 ) -> InvitationCreatedResponse:
@@ -1397,7 +1407,7 @@ Revoke a pending invitation. The invitation link will no longer work.
 async def revoke_invitation(
     workspace_id: UUID,
     invitation_id: UUID,
-    current_user: CurrentActiveUser,
+    current_user: CurrentActivePrincipal,
     session: Annotated[AsyncSession, Depends(get_async_session)],
 ) -> MessageResponse:
     """Revoke a pending invitation."""
@@ -1690,7 +1700,7 @@ requests to the external developer API.
 async def create_api_key(
     workspace_id: UUID,
     data: APIKeyCreate,
-    current_user: CurrentActiveUser,
+    current_user: CurrentActivePrincipal,
     session: Annotated[AsyncSession, Depends(get_async_session)],
     _: Annotated[None, Depends(_create_api_key_rate_limit)],
 ) -> APIKeyCreatedResponse:
@@ -1700,9 +1710,7 @@ async def create_api_key(
     )
 
     async with session.begin():
-        member = await workspace_member_db.get_member(
-            session, workspace_id, current_user.id
-        )
+        member = await membership_cache.get(session, workspace_id, current_user.id)
         if not member:
             raise NotFoundException("Workspace not found or access denied.")
         if member.role not in [MemberRole.ADMIN, MemberRole.OWNER]:
@@ -1778,7 +1786,7 @@ Retrieve all API keys for the workspace.
 )
 async def list_api_keys(
     workspace_id: UUID,
-    current_user: CurrentActiveUser,
+    current_user: CurrentActivePrincipal,
     session: Annotated[AsyncSession, Depends(get_async_session)],
 ) -> APIKeyListResponse:
     """List all API keys for the workspace."""
@@ -1787,9 +1795,7 @@ async def list_api_keys(
     )
 
     async with session.begin():
-        member = await workspace_member_db.get_member(
-            session, workspace_id, current_user.id
-        )
+        member = await membership_cache.get(session, workspace_id, current_user.id)
         if not member:
             raise NotFoundException("Workspace not found or access denied.")
 
@@ -1861,7 +1867,7 @@ Revoke an API key. The key will immediately stop working.
 async def revoke_api_key(
     workspace_id: UUID,
     api_key_id: UUID,
-    current_user: CurrentActiveUser,
+    current_user: CurrentActivePrincipal,
     session: Annotated[AsyncSession, Depends(get_async_session)],
 ) -> MessageResponse:
     """Revoke an API key."""
@@ -1871,9 +1877,7 @@ async def revoke_api_key(
 
     try:
         async with session.begin():
-            member = await workspace_member_db.get_member(
-                session, workspace_id, current_user.id
-            )
+            member = await membership_cache.get(session, workspace_id, current_user.id)
             if not member:
                 raise NotFoundException("Workspace not found or access denied.")
             if member.role not in [MemberRole.ADMIN, MemberRole.OWNER]:
@@ -1894,4 +1898,122 @@ async def revoke_api_key(
     return MessageResponse(message="API key revoked.")
 
 
+@router.get(
+    "/{workspace_id}/usage/summary",
+    response_model=UsageSummaryResponse,
+    summary="Get workspace usage summary",
+    description="""
+## Get Workspace Usage Summary
+
+Return committed API usage for the workspace, aggregated per feature and
+per hour or day. Figures come from pre-aggregated rollup tables that are
+updated when each usage log is committed, so the cost of this endpoint
+depends on the number of buckets in the window, not on request volume.
+
+### Authorization
+
+- User must be a **member** of the workspace
+
+### Path Parameters
+
+| Parameter | Type | Description |
+|-----------|------|-------------|
+| `workspace_id` | UUID | The workspace identifier |
+
+### Query Parameters
+
+| Parameter | Type | Required | Default | Description |
+|-----------|------|----------|---------|-------------|
+| `granularity` | string | No | `day` | Bucket size: `hour` or `day` |
+| `start` | datetime | No | `end` - 24h (hour) / 30d (day) | Inclusive window start (aligned down to the bucket) |
+| `end` | datetime | No | now | Exclusive window end |
+| `feature_key` | string | No | — | Restrict the summary to one feature |
+
+The window may span at most 31 days for `hour` and 366 days for `day`.
+
+### Response
+
+| Field | Type | Description |
+|-------|------|-------------|
+| `granularity` | string | Bucket size used for `series` |
+| `start` / `end` | datetime | Resolved window |
+| `totals` | object | Counters across all features |
+| `by_feature` | array | Counters per feature (`feature_key` + counters) |
+| `series` | array | Counters per bucket (`bucket_start` + counters) |
+
+Each counter object contains `request_count`, `success_count`,
+`failed_count`, `credits_charged`, `input_tokens`, `output_tokens`,
+`avg_latency_ms` and histogram-estimated `p50_latency_ms`,
+`p95_latency_ms`, `p99_latency_ms`.
+
+### Notes
+
+- Only committed usage is counted; pending and expired logs are not
+- Test-key requests are counted but never contribute `credits_charged`
+- Percentiles are estimates from a fixed-bucket latency histogram
+""",
+    responses={
+        400: {
+            "description": "Invalid window",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "'start' must be before 'end'."}
+                }
+            },
+        },
+        404: {
+            "description": "Workspace not found",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "Workspace not found or access denied."}
+                }
+            },
+        },
+    },
+)
+async def get_usage_summary(
+    workspace_id: UUID,
+    current_user: CurrentActivePrincipal,
+    session: Annotated[AsyncSession, Depends(get_read_session)],
+    granularity: Annotated[
+        UsageRollupGranularity,
+        Query(description="Bucket size: hour or day"),
+    ] = UsageRollupGranularity.DAY,
+    start: Annotated[
+        datetime | None,
+        Query(description="Inclusive window start"),
+    ] = None,
+    end: Annotated[
+        datetime | None,
+        Query(description="Exclusive window end"),
+    ] = None,
+    feature_key: Annotated[
+        FeatureKey | None,
+        Query(description="Restrict the summary to one feature"),
+    ] = None,
+) -> UsageSummaryResponse:
+    """Summarise committed workspace usage from the rollup tables."""
+    request_logger.info(
+        f"GET /workspaces/{workspace_id}/usage/summary - user={current_user.id} "
+        f"granularity={granularity.value} feature_key={feature_key}"
+    )
+    window_start, window_end = resolve_summary_window(granularity, start, end)
+
+    async with session.begin():
+        member = await membership_cache.get(session, workspace_id, current_user.id)
+        if not member:
+            raise NotFoundException("Workspace not found or access denied.")
+
+        rows = await workspace_usage_rollup_db.list_buckets(
+            session,
+            workspace_id,
+            granularity,
+            window_start,
+            window_end,
+            feature_key=feature_key,
+        )
+
+    return summarize_rollups(rows, granularity, window_start, window_end)
+
+
 __all__ = ["router"]
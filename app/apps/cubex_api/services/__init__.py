@@ -45,6 +45,11 @@ from app.apps.cubex_api.services.quota import (
 from app.apps.cubex_api.services.quota_cache import (
     APIQuotaCacheService,
 )
+from app.apps.cubex_api.services.membership_cache import (
+    MembershipCache,
+    MembershipSnapshot,
+    membership_cache,
+)
 
 __all__ = [
     # Subscription service
@@ -86,4 +91,8 @@ __all__ = [
     "CLIENT_ID_PREFIX",
     # Quota cache service
     "APIQuotaCacheService",
+    # Membership cache
+    "MembershipCache",
+    "MembershipSnapshot",
+    "membership_cache",
 ]
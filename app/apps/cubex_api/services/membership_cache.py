@@ -0,0 +1,256 @@
+"""
+Workspace membership cache for authorization checks.
+
+Workspace-scoped endpoints check the caller's membership (and role) on
+every request, and services such as ``WorkspaceService._require_admin_member``
+repeat the same lookup within the request. ``MembershipCache`` answers
+these checks with a ``MembershipSnapshot`` from two tiers:
+
+- per-request memoization in ``session.info`` (one session per request),
+  so repeated checks in a request cost nothing, across the request's
+  transactions (it is dropped on rollback);
+- Redis (``workspace_member:{workspace_id}:{user_id}``,
+  ``WORKSPACE_MEMBERSHIP_CACHE_TTL_SECONDS``), shared by every worker.
+  Only existing memberships are stored there, so a new member is never
+  hidden by a cached miss.
+
+Invalidation: code that changes a membership (status or role changes,
+removal, invitation acceptance, ownership transfer) calls
+``invalidate_on_commit``; ``_freeze_workspace`` and reactivation call
+``invalidate_workspace_on_commit``. Both clear the entries at once and
+again after the transaction commits (see ``commit_hooks``).
+"""
+
+from dataclasses import dataclass
+from typing import Any
+from uuid import UUID
+
+import orjson
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.apps.cubex_api.db.crud import workspace_member_db
+from app.apps.cubex_api.db.models import WorkspaceMember
+from app.core.config import request_logger, settings
+from app.core.enums import MemberRole, MemberStatus
+from app.core.services import RedisService
+from app.core.services.commit_hooks import CommitHook, register_commit_hook
+
+_MEMO_KEY = "workspace_membership_memo"
+_PENDING_KEY = "workspace_membership_pending"
+
+
+@dataclass(frozen=True)
+class MembershipSnapshot:
+    """
+    The fields authorization needs from a ``WorkspaceMember``.
+
+    Attributes:
+        workspace_id: Workspace ID.
+        user_id: Member's user ID.
+        role: Member role.
+        status: Member status.
+    """
+
+    workspace_id: UUID
+    user_id: UUID
+    role: MemberRole
+    status: MemberStatus
+
+    @classmethod
+    def from_member(cls, member: WorkspaceMember) -> "MembershipSnapshot":
+        return cls(
+            workspace_id=member.workspace_id,
+            user_id=member.user_id,
+            role=member.role,
+            status=member.status,
+        )
+
+    @property
+    def is_owner(self) -> bool:
+        """Check if member is workspace owner."""
+        return self.role == MemberRole.OWNER
+
+    @property
+    def is_admin(self) -> bool:
+        """Check if member has admin privileges."""
+        return self.role in (MemberRole.OWNER, MemberRole.ADMIN)
+
+    @property
+    def is_enabled(self) -> bool:
+        """Check if member is enabled (has access)."""
+        return self.status == MemberStatus.ENABLED
+
+    def to_json(self) -> str:
+        return orjson.dumps(
+            {"role": self.role.value, "status": self.status.value}
+        ).decode()
+
+    @classmethod
+    def from_json(
+        cls, workspace_id: UUID, user_id: UUID, raw: str
+    ) -> "MembershipSnapshot":
+        data = orjson.loads(raw)
+        return cls(
+            workspace_id=workspace_id,
+            user_id=user_id,
+            role=MemberRole(data["role"]),
+            status=MemberStatus(data["status"]),
+        )
+
+
+def membership_key(workspace_id: UUID, user_id: UUID) -> str:
+    return f"workspace_member:{workspace_id}:{user_id}"
+
+
+def membership_pattern(workspace_id: UUID) -> str:
+    """Glob matching every membership key of a workspace."""
+    return f"workspace_member:{workspace_id}:*"
+
+
+class MembershipCache:
+    """
+    Request-memoized, Redis-backed cache of workspace memberships.
+
+    Example:
+        >>> member = await membership_cache.get(session, workspace_id, user_id)
+        >>> if member is None or not member.is_admin:
+        ...     raise PermissionDeniedException()
+    """
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+
+    @staticmethod
+    def _memo(session: AsyncSession | Session) -> dict:
+        return session.info.setdefault(_MEMO_KEY, {})
+
+    @staticmethod
+    def _pending(session: AsyncSession | Session) -> dict[str, set]:
+        return session.info.setdefault(
+            _PENDING_KEY, {"members": set(), "workspaces": set()}
+        )
+
+    async def get(
+        self, session: AsyncSession, workspace_id: UUID, user_id: UUID
+    ) -> MembershipSnapshot | None:
+        """
+        Membership of a user in a workspace.
+
+        On a miss the membership is read with ``session``: inside the
+        caller's transaction if one is open, otherwise in its own.
+
+        Args:
+            session: The request's database session.
+            workspace_id: Workspace ID.
+            user_id: User ID.
+
+        Returns:
+            The membership, or None if the user is not a member.
+        """
+        memo = self._memo(session)
+        key = (workspace_id, user_id)
+        if key in memo:
+            return memo[key]
+
+        snapshot: MembershipSnapshot | None = None
+        if RedisService.is_connected():
+            raw = await RedisService.get(membership_key(workspace_id, user_id))
+            if raw is not None:
+                try:
+                    snapshot = MembershipSnapshot.from_json(workspace_id, user_id, raw)
+                except (orjson.JSONDecodeError, KeyError, ValueError):
+                    request_logger.warning(
+                        f"Discarding malformed membership {workspace_id}/{user_id}"
+                    )
+
+        if snapshot is None:
+            snapshot = await self._load(session, workspace_id, user_id)
+            if snapshot is not None and RedisService.is_connected():
+                await RedisService.set(
+                    membership_key(workspace_id, user_id),
+                    snapshot.to_json(),
+                    ttl=self.ttl,
+                )
+
+        memo[key] = snapshot
+        return snapshot
+
+    async def _load(
+        self, session: AsyncSession, workspace_id: UUID, user_id: UUID
+    ) -> MembershipSnapshot | None:
+        if session.in_transaction():
+            member = await workspace_member_db.get_member(
+                session, workspace_id, user_id, load_user=False
+            )
+        else:
+            async with session.begin():
+                member = await workspace_member_db.get_member(
+                    session, workspace_id, user_id, load_user=False
+                )
+        return MembershipSnapshot.from_member(member) if member else None
+
+    async def invalidate(self, workspace_id: UUID, user_id: UUID) -> None:
+        """Drop a membership from Redis now."""
+        if RedisService.is_connected():
+            await RedisService.delete(membership_key(workspace_id, user_id))
+
+    async def invalidate_workspace(self, workspace_id: UUID) -> None:
+        """Drop every membership of a workspace from Redis now."""
+        if RedisService.is_connected():
+            await RedisService.delete_pattern(membership_pattern(workspace_id))
+
+    async def invalidate_on_commit(
+        self, session: AsyncSession | Session, workspace_id: UUID, user_id: UUID
+    ) -> None:
+        """Invalidate a membership now and again when ``session`` commits."""
+        self._memo(session).pop((workspace_id, user_id), None)
+        self._pending(session)["members"].add((workspace_id, user_id))
+        await self.invalidate(workspace_id, user_id)
+
+    async def invalidate_workspace_on_commit(
+        self, session: AsyncSession | Session, workspace_id: UUID
+    ) -> None:
+        """Invalidate every membership of a workspace now and on commit."""
+        memo = self._memo(session)
+        for key in [key for key in memo if key[0] == workspace_id]:
+            del memo[key]
+        self._pending(session)["workspaces"].add(workspace_id)
+        await self.invalidate_workspace(workspace_id)
+
+    async def _flush(self, pending: dict[str, Any]) -> None:
+        try:
+            for workspace_id, user_id in pending["members"]:
+                await self.invalidate(workspace_id, user_id)
+            for workspace_id in pending["workspaces"]:
+                await self.invalidate_workspace(workspace_id)
+        except Exception as e:
+            request_logger.error(f"Membership cache invalidation failed: {e}")
+
+
+membership_cache = MembershipCache(ttl=settings.WORKSPACE_MEMBERSHIP_CACHE_TTL_SECONDS)
+
+
+def _discard_memo(session: Session) -> None:
+    # Memberships read after an invalidation may reflect rolled-back writes
+    session.info.pop(_MEMO_KEY, None)
+
+
+# The memo outlives a commit: the request's later transactions reuse it,
+# and entries written in the committed one were dropped when invalidated.
+register_commit_hook(
+    CommitHook(
+        info_key=_PENDING_KEY,
+        flush=lambda pending: membership_cache._flush(pending),
+        on_rollback=_discard_memo,
+    )
+)
+
+
+__all__ = [
+    "MembershipCache",
+    "MembershipSnapshot",
+    "membership_cache",
+    "membership_key",
+    "membership_pattern",
+]
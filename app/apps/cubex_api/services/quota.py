@@ -17,19 +17,29 @@ from decimal import Decimal
 import secrets
 import time
 from datetime import datetime, timedelta, timezone
-from typing import Any
+from collections import defaultdict
+from typing import Any, Sequence
 from uuid import UUID
 
 from fastapi import status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.apps.cubex_api.db.crud import api_key_db, usage_log_db, workspace_db
+from app.apps.cubex_api.db.crud import (
+    api_key_db,
+    usage_log_db,
+    workspace_db,
+    workspace_usage_rollup_db,
+)
 from app.apps.cubex_api.db.models import APIKey
 from app.apps.cubex_api.services.quota_cache import APIQuotaCacheService
 from app.core.config import settings, workspace_logger
 from app.core.services.redis_service import RedisService
-from app.core.db.crud import api_subscription_context_db
-from app.core.enums import AccessStatus, FeatureKey
+from app.core.db.crud import (
+    ReturnStrategy,
+    UsageLogCommit,
+    api_subscription_context_db,
+)
+from app.core.enums import AccessStatus, FeatureKey, UsageLogStatus
 from app.core.exceptions.types import NotFoundException
 from app.core.utils import create_request_fingerprint, hmac_hash_otp
 
@@ -897,6 +907,7 @@ class QuotaService:
                 "credits_reserved": credits_reserved,
             },
             commit_self=False,
+            return_strategy=ReturnStrategy.RETURNING,
         )
 
         key_type = "test" if is_test_key else "live"
@@ -983,6 +994,10 @@ class QuotaService:
                 "API key does not own this usage log.",
             )
 
+        # Only the commit that leaves PENDING feeds the rollups; replays of
+        # an already-committed log must not be counted twice.
+        was_pending = usage_log.status == UsageLogStatus.PENDING
+
         # Commit the usage log (idempotent - commit handles already-committed case)
         committed_log = await usage_log_db.commit(
             session,
@@ -996,10 +1011,11 @@ class QuotaService:
         if committed_log:
             is_test_key = api_key_record.is_test_key
 
-            # If successfully committed as SUCCESS, increment credits_used counter
+            # If this commit moved the log to SUCCESS, increment credits_used
             # (but not for test keys - they don't consume credits)
             if (
-                success
+                was_pending
+                and success
                 and committed_log.credits_charged is not None
                 and not is_test_key
             ):
@@ -1011,6 +1027,17 @@ class QuotaService:
                         session, context.id, committed_log.credits_charged
                     )
 
+            if was_pending:
+                await workspace_usage_rollup_db.record(
+                    session,
+                    committed_log.workspace_id,
+                    committed_log,
+                    credits_charged=(
+                        None if is_test_key else committed_log.credits_charged
+                    ),
+                    commit_self=False,
+                )
+
             if commit_self:
                 await session.commit()
 
@@ -1026,6 +1053,105 @@ class QuotaService:
         # Shouldn't happen, but handle gracefully
         return (True, "Usage log not found, but operation is idempotent.")
 
+    async def commit_usage_batch(
+        self,
+        session: AsyncSession,
+        commits: Sequence[tuple[str, UsageLogCommit]],
+    ) -> list[tuple[bool, str]]:
+        """
+        Commit many pending usage logs in the caller's transaction.
+
+        Set-based counterpart of ``commit_usage`` with the same per-item
+        outcomes: API keys and usage logs are loaded with one query each,
+        every eligible log is committed by a single ``UPDATE ... RETURNING``,
+        credits are added with one aggregated per-workspace increment and
+        the rollups with one upsert. Only logs that actually leave PENDING
+        charge credits or feed the rollups, so replays are no-ops.
+
+        Args:
+            session: Database session (the caller commits).
+            commits: ``(api_key, commit)`` pairs. A usage log repeated in the
+                batch is committed by its first occurrence only.
+
+        Returns:
+            ``(success, message)`` per input item, in input order.
+        """
+        results: list[tuple[bool, str] | None] = [None] * len(commits)
+
+        key_hashes: dict[int, str] = {}
+        for index, (api_key, _) in enumerate(commits):
+            if self._validate_api_key_format(api_key):
+                key_hashes[index] = self._hash_api_key(api_key)
+            else:
+                results[index] = (
+                    True,
+                    "Invalid API key format, but operation is idempotent.",
+                )
+
+        api_keys = await api_key_db.get_many_by_key_hashes(
+            session, list(key_hashes.values())
+        )
+        usage_logs = await usage_log_db.get_by_ids(
+            session, [commit.usage_log_id for _, commit in commits]
+        )
+
+        eligible: dict[UUID, tuple[UsageLogCommit, APIKey]] = {}
+        for index, key_hash in key_hashes.items():
+            commit = commits[index][1]
+            api_key_record = api_keys.get(key_hash)
+            if not api_key_record:
+                results[index] = (
+                    True,
+                    "API key not found, but operation is idempotent.",
+                )
+                continue
+            usage_log = usage_logs.get(commit.usage_log_id)
+            if not usage_log or usage_log.is_deleted:
+                results[index] = (
+                    True,
+                    "Usage log not found, but operation is idempotent.",
+                )
+                continue
+            if usage_log.api_key_id != api_key_record.id:
+                workspace_logger.warning(
+                    f"Usage commit ownership mismatch: "
+                    f"usage_log.api_key_id={usage_log.api_key_id}, "
+                    f"api_key.id={api_key_record.id}"
+                )
+                results[index] = (False, "API key does not own this usage log.")
+                continue
+            eligible.setdefault(commit.usage_log_id, (commit, api_key_record))
+            status_str = "SUCCESS" if commit.success else "FAILED"
+            results[index] = (True, f"Usage committed as {status_str}.")
+
+        committed = await usage_log_db.commit_many(
+            session, [commit for commit, _ in eligible.values()]
+        )
+
+        credits: dict[UUID, Decimal] = defaultdict(Decimal)
+        rollup_entries = []
+        for log in committed:
+            is_test_key = eligible[log.id][1].is_test_key
+            if (
+                log.status == UsageLogStatus.SUCCESS
+                and log.credits_charged is not None
+                and not is_test_key
+            ):
+                credits[log.workspace_id] += log.credits_charged
+            rollup_entries.append(
+                (log.workspace_id, log, None if is_test_key else log.credits_charged)
+            )
+
+        await api_subscription_context_db.increment_credits_used_many(session, credits)
+        await workspace_usage_rollup_db.record_many(session, rollup_entries)
+
+        workspace_logger.info(
+            f"Usage batch committed: {len(commits)} requested, "
+            f"{len(committed)} moved out of PENDING, "
+            f"credits charged to {len(credits)} workspace(s)"
+        )
+        return [result for result in results if result is not None]
+
 
 # Global service instance
 quota_service = QuotaService()
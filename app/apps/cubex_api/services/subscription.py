@@ -19,8 +19,10 @@ from app.apps.cubex_api.db.crud import (
     workspace_member_db,
 )
 from app.apps.cubex_api.db.models import Workspace
+from app.apps.cubex_api.services.membership_cache import membership_cache
 from app.core.config import stripe_logger
 from app.core.db.crud import (
+    ReturnStrategy,
     api_subscription_context_db,
     plan_db,
     subscription_db,
@@ -366,10 +368,13 @@ class SubscriptionService:
             if total_amount_cents > 0:
                 amount = Decimal(total_amount_cents) / Decimal(100)
 
+        # The plan is attached directly so the subscription is fully hydrated
+        # by the INSERT ... RETURNING without a follow-up refresh.
         subscription = await subscription_db.create(
             session,
             {
                 "plan_id": plan_id,
+                "plan": plan,
                 "product_type": ProductType.API,
                 "stripe_subscription_id": stripe_subscription_id,
                 "stripe_customer_id": stripe_customer_id,
@@ -380,6 +385,7 @@ class SubscriptionService:
                 "amount": amount,
             },
             commit_self=False,
+            return_strategy=ReturnStrategy.RETURNING,
         )
 
         # Link subscription to workspace via context
@@ -402,6 +408,7 @@ class SubscriptionService:
                     "workspace_id": workspace_id,
                 },
                 commit_self=False,
+                return_strategy=ReturnStrategy.NONE,
             )
 
         # Activate workspace
@@ -409,23 +416,13 @@ class SubscriptionService:
             session, workspace_id, WorkspaceStatus.ACTIVE, commit_self=False
         )
 
-        if commit_self:
-            await session.commit()
-        else:
-            await session.flush()
-        await session.refresh(subscription)
-
-        stripe_logger.info(
-            f"Subscription created: {subscription.id} for workspace {workspace_id}"
-        )
-
-        # Queue subscription activation email to workspace owner
+        # Queue subscription activation email to workspace owner (written to
+        # the outbox in this transaction)
         workspace = await workspace_db.get_by_id(session, workspace_id)
         if workspace:
             owner = await user_db.get_by_id(session, workspace.owner_id)
-            plan = await plan_db.get_by_id(session, plan_id)
-            if owner and plan:
-                await get_publisher()(
+            if owner:
+                await get_publisher(session)(
                     "subscription_activated_emails",
                     {
                         "email": owner.email,
@@ -437,6 +434,15 @@ class SubscriptionService:
                     },
                 )
 
+        if commit_self:
+            await session.commit()
+        else:
+            await session.flush()
+
+        stripe_logger.info(
+            f"Subscription created: {subscription.id} for workspace {workspace_id}"
+        )
+
         return subscription
 
     async def handle_subscription_updated(
@@ -728,6 +734,7 @@ class SubscriptionService:
         )
 
         # Disable all members except owner
+        await membership_cache.invalidate_workspace_on_commit(session, workspace_id)
         await workspace_member_db.disable_all_members(
             session, workspace_id, except_owner=True, commit_self=False
         )
@@ -1024,6 +1031,7 @@ class SubscriptionService:
             raise SubscriptionNotFoundException("No active subscription.")
 
         members = await workspace_member_db.get_workspace_members(session, workspace_id)
+        await membership_cache.invalidate_workspace_on_commit(session, workspace_id)
 
         # Owner is always enabled
         owner_member = next((m for m in members if m.is_owner), None)
@@ -1280,7 +1288,7 @@ class SubscriptionService:
             session,
             subscription_id,
             {"plan_id": new_plan.id},
-            commit_self=commit_self,
+            commit_self=False,
         )
 
         if not updated_subscription:
@@ -1288,16 +1296,11 @@ class SubscriptionService:
                 f"Subscription {subscription_id} not found after update"
             )
 
-        stripe_logger.info(
-            f"Subscription {subscription_id} upgraded: "
-            f"{current_plan.name} -> {new_plan.name}"
-        )
-
         workspace = await workspace_db.get_by_id(
             session, workspace_id, options=[selectinload(Workspace.owner)]
         )
         if workspace and workspace.owner:
-            await get_publisher()(
+            await get_publisher(session)(
                 "subscription_activated_emails",
                 {
                     "email": workspace.owner.email,
@@ -1312,6 +1315,14 @@ class SubscriptionService:
                 f"{current_plan.name} -> {new_plan.name}"
             )
 
+        if commit_self:
+            await session.commit()
+
+        stripe_logger.info(
+            f"Subscription {subscription_id} upgraded: "
+            f"{current_plan.name} -> {new_plan.name}"
+        )
+
         return updated_subscription
 
 
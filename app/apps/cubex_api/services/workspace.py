@@ -10,6 +10,7 @@ from typing import Sequence
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.apps.cubex_api.db.crud import (
     workspace_db,
@@ -21,9 +22,14 @@ from app.apps.cubex_api.db.models import (
     WorkspaceMember,
     WorkspaceInvitation,
 )
+from app.apps.cubex_api.services.membership_cache import (
+    MembershipSnapshot,
+    membership_cache,
+)
 from app.core.services.quota_cache import QuotaCacheService
 from app.core.config import settings, workspace_logger
 from app.core.db.crud import (
+    ReturnStrategy,
     api_subscription_context_db,
     plan_db,
     subscription_db,
@@ -127,25 +133,19 @@ class WorkspaceService:
     # Default invitation expiry (7 days)
     INVITATION_EXPIRY_DAYS = 7
 
-    async def _generate_workspace_identity(
-        self,
-        session: AsyncSession,
-        user: User,
-    ) -> tuple[str, str]:
+    def _generate_workspace_identity(self, user: User) -> tuple[str, str]:
         """
-        Generate display name and slug for a personal workspace.
+        Generate display name and slug base name for a personal workspace.
 
         Args:
-            session: Database session.
             user: User to generate identity for.
 
         Returns:
-            Tuple of (display_name, slug).
+            Tuple of (display_name, base_name).
         """
         base_name = user.full_name or user.email.split("@")[0]
         display_name = f"{base_name}'s Workspace"
-        slug = await workspace_db.generate_unique_slug(session, base_name)
-        return display_name, slug
+        return display_name, base_name
 
     async def _get_required_free_plan(
         self,
@@ -254,7 +254,7 @@ class WorkspaceService:
         workspace_id: UUID,
         user_id: UUID,
         error_message: str = "Only admins can perform this action.",
-    ) -> WorkspaceMember:
+    ) -> MembershipSnapshot:
         """
         Get a member and verify they have admin privileges.
 
@@ -265,12 +265,12 @@ class WorkspaceService:
             error_message: Custom error message.
 
         Returns:
-            The admin member.
+            The admin's membership (from the membership cache).
 
         Raises:
             PermissionDeniedException: If user is not an admin.
         """
-        member = await workspace_member_db.get_member(session, workspace_id, user_id)
+        member = await membership_cache.get(session, workspace_id, user_id)
         if not member or not member.is_admin:
             raise PermissionDeniedException(error_message)
         return member
@@ -281,7 +281,7 @@ class WorkspaceService:
         workspace_id: UUID,
         user_id: UUID,
         error_message: str = "Only owner can perform this action.",
-    ) -> WorkspaceMember:
+    ) -> MembershipSnapshot:
         """
         Get a member and verify they are the owner.
 
@@ -292,12 +292,12 @@ class WorkspaceService:
             error_message: Custom error message.
 
         Returns:
-            The owner member.
+            The owner's membership (from the membership cache).
 
         Raises:
             PermissionDeniedException: If user is not the owner.
         """
-        member = await workspace_member_db.get_member(session, workspace_id, user_id)
+        member = await membership_cache.get(session, workspace_id, user_id)
         if not member or not member.is_owner:
             raise PermissionDeniedException(error_message)
         return member
@@ -380,18 +380,18 @@ class WorkspaceService:
             )
             return existing_workspace, owner_member, existing_sub
 
-        display_name, slug = await self._generate_workspace_identity(session, user)
+        display_name, base_name = self._generate_workspace_identity(user)
 
-        workspace = await workspace_db.create(
+        workspace = await workspace_db.create_with_unique_slug(
             session,
             {
                 "display_name": display_name,
-                "slug": slug,
                 "owner_id": user.id,
                 "status": WorkspaceStatus.ACTIVE,
                 "is_personal": True,
             },
-            commit_self=False,
+            base_name=base_name,
+            return_strategy=ReturnStrategy.RETURNING,
         )
 
         # Add owner as member
@@ -405,39 +405,43 @@ class WorkspaceService:
                 "joined_at": datetime.now(timezone.utc),
             },
             commit_self=False,
+            return_strategy=ReturnStrategy.RETURNING,
         )
 
         # Get free plan for API product (must exist - seeded in migrations)
         free_plan = await self._get_required_free_plan(session, ProductType.API)
 
-        # Create subscription (free plan, no Stripe)
+        # Create subscription (free plan, no Stripe). Relationships are
+        # attached in memory so none of the new rows needs a refresh.
         subscription = await subscription_db.create(
             session,
             {
                 "plan_id": free_plan.id,
+                "plan": free_plan,
                 "product_type": ProductType.API,
                 "status": SubscriptionStatus.ACTIVE,
                 "seat_count": 1,
             },
             commit_self=False,
+            return_strategy=ReturnStrategy.RETURNING,
         )
 
-        await api_subscription_context_db.create(
+        context = await api_subscription_context_db.create(
             session,
             {
                 "subscription_id": subscription.id,
                 "workspace_id": workspace.id,
             },
             commit_self=False,
+            return_strategy=ReturnStrategy.NONE,
         )
+        # The workspace is brand new, so its context is known without a load
+        set_committed_value(workspace, "api_subscription_context", context)
 
         if commit_self:
             await session.commit()
         else:
             await session.flush()
-        await session.refresh(workspace)
-        await session.refresh(member)
-        await session.refresh(subscription)
 
         workspace_logger.info(
             f"Personal workspace created: {workspace.id} for user {user.id}"
@@ -469,19 +473,16 @@ class WorkspaceService:
         Returns:
             Created workspace.
         """
-        slug = await workspace_db.generate_unique_slug(session, display_name)
-
-        workspace = await workspace_db.create(
+        workspace = await workspace_db.create_with_unique_slug(
             session,
             {
                 "display_name": display_name,
-                "slug": slug,
                 "owner_id": owner.id,
                 "status": WorkspaceStatus.ACTIVE,
                 "is_personal": False,
                 "description": description,
             },
-            commit_self=False,
+            base_name=display_name,
         )
 
         # Add owner as member
@@ -802,15 +803,15 @@ class WorkspaceService:
                 "status": InvitationStatus.PENDING,
                 "expires_at": self._calculate_invitation_expiry(),
             },
-            commit_self=commit_self,
+            commit_self=False,
         )
 
-        # Queue invitation email
+        # Queue invitation email (written to the outbox with the invitation)
         inviter = await user_db.get_by_id(session, inviter_id)
         inviter_name = inviter.full_name if inviter else "A team member"
         invitation_link = f"{callback_url}?token={raw_token}"
 
-        await get_publisher()(
+        await get_publisher(session)(
             "workspace_invitation_emails",
             {
                 "email": email,
@@ -822,6 +823,9 @@ class WorkspaceService:
             },
         )
 
+        if commit_self:
+            await session.commit()
+
         workspace_logger.info(
             f"Invitation sent to {email} for workspace {workspace_id} by {inviter_id}"
         )
@@ -873,6 +877,9 @@ class WorkspaceService:
         workspace = await self.get_workspace(session, invitation.workspace_id)
         await self._check_can_add_member(session, workspace)
 
+        await membership_cache.invalidate_on_commit(
+            session, invitation.workspace_id, user.id
+        )
         member = await workspace_member_db.create(
             session,
             {
@@ -944,6 +951,9 @@ class WorkspaceService:
                 if available_seats <= 0:
                     continue
 
+                await membership_cache.invalidate_on_commit(
+                    session, invitation.workspace_id, user.id
+                )
                 member = await workspace_member_db.create(
                     session,
                     {
@@ -1078,6 +1088,9 @@ class WorkspaceService:
                 if enabled_count >= subscription.seat_count:
                     raise InsufficientSeatsException()
 
+        await membership_cache.invalidate_on_commit(
+            session, workspace_id, member_user_id
+        )
         target_member = await workspace_member_db.update_status(
             session, target_member.id, status, commit_self=commit_self
         )
@@ -1135,6 +1148,9 @@ class WorkspaceService:
         if role == MemberRole.OWNER:
             raise PermissionDeniedException("Use transfer_ownership to change owner.")
 
+        await membership_cache.invalidate_on_commit(
+            session, workspace_id, member_user_id
+        )
         target_member = await workspace_member_db.update(
             session, target_member.id, {"role": role}, commit_self=commit_self
         )
@@ -1185,6 +1201,9 @@ class WorkspaceService:
         if target_member.is_owner:
             raise PermissionDeniedException("Cannot remove workspace owner.")
 
+        await membership_cache.invalidate_on_commit(
+            session, workspace_id, member_user_id
+        )
         await workspace_member_db.delete(
             session, target_member.id, commit_self=commit_self
         )
@@ -1227,6 +1246,7 @@ class WorkspaceService:
                 "Owner cannot leave. Transfer ownership first."
             )
 
+        await membership_cache.invalidate_on_commit(session, workspace_id, user_id)
         await workspace_member_db.delete(session, member.id, commit_self=commit_self)
 
         workspace_logger.info(f"User {user_id} left workspace {workspace_id}")
@@ -1272,6 +1292,10 @@ class WorkspaceService:
         current_owner_member = await workspace_member_db.get_member(
             session, workspace_id, current_owner_id
         )
+        await membership_cache.invalidate_on_commit(
+            session, workspace_id, current_owner_id
+        )
+        await membership_cache.invalidate_on_commit(session, workspace_id, new_owner_id)
         if current_owner_member:
             await workspace_member_db.update(
                 session,
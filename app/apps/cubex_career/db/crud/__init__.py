@@ -8,10 +8,16 @@ from app.apps.cubex_career.db.crud.usage_log import (
     CareerUsageLogDB,
     career_usage_log_db,
 )
+from app.apps.cubex_career.db.crud.usage_rollup import (
+    CareerUsageRollupDB,
+    career_usage_rollup_db,
+)
 
 __all__ = [
     "CareerAnalysisResultDB",
     "career_analysis_result_db",
     "CareerUsageLogDB",
     "career_usage_log_db",
+    "CareerUsageRollupDB",
+    "career_usage_rollup_db",
 ]
@@ -86,6 +86,37 @@ class CareerAnalysisResultDB(BaseDB[CareerAnalysisResult]):
             commit_self=commit_self,
         )
 
+    async def create_many_from_commits(
+        self,
+        session: AsyncSession,
+        results: Sequence[tuple[UUID, UUID, FeatureKey, dict[str, Any]]],
+    ) -> list[CareerAnalysisResult]:
+        """
+        Create analysis results for several successful commits in one INSERT.
+
+        Args:
+            session: Database session (the caller commits).
+            results: ``(usage_log_id, user_id, feature_key, result_data)``
+                per committed usage log.
+
+        Returns:
+            The created CareerAnalysisResult rows.
+        """
+        return await self.bulk_insert_returning(
+            session,
+            [
+                {
+                    "usage_log_id": usage_log_id,
+                    "user_id": user_id,
+                    "feature_key": feature_key,
+                    "title": _default_title(feature_key),
+                    "result_data": result_data,
+                }
+                for usage_log_id, user_id, feature_key, result_data in results
+            ],
+            commit_self=False,
+        )
+
     async def get_by_usage_log_id(
         self,
         session: AsyncSession,
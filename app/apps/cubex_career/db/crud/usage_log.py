@@ -12,13 +12,13 @@ from sqlalchemy import SQLColumnExpression, and_, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
-from app.core.db.crud.base import BaseDB
+from app.core.db.crud.usage_log import UsageLogBaseDB
 from app.apps.cubex_career.db.models.usage_log import CareerUsageLog
 from app.core.enums import UsageLogStatus
 from app.core.exceptions.types import DatabaseException
 
 
-class CareerUsageLogDB(BaseDB[CareerUsageLog]):
+class CareerUsageLogDB(UsageLogBaseDB[CareerUsageLog]):
     """
     CRUD operations for CareerUsageLog model.
 
@@ -0,0 +1,21 @@
+"""CRUD operations for Career usage rollups."""
+
+from app.apps.cubex_career.db.models.usage_rollup import CareerUsageRollup
+from app.core.db.crud.usage_rollup import UsageRollupDB
+
+
+class CareerUsageRollupDB(UsageRollupDB[CareerUsageRollup]):
+    """CRUD operations for CareerUsageRollup (owner column: user_id)."""
+
+    def __init__(self):
+        super().__init__(CareerUsageRollup, owner_field="user_id")
+
+
+# Global CRUD instance
+career_usage_rollup_db = CareerUsageRollupDB()
+
+
+__all__ = [
+    "CareerUsageRollupDB",
+    "career_usage_rollup_db",
+]
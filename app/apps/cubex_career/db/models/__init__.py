@@ -2,5 +2,6 @@
 
 from app.apps.cubex_career.db.models.analysis_result import CareerAnalysisResult
 from app.apps.cubex_career.db.models.usage_log import CareerUsageLog
+from app.apps.cubex_career.db.models.usage_rollup import CareerUsageRollup
 
-__all__ = ["CareerAnalysisResult", "CareerUsageLog"]
+__all__ = ["CareerAnalysisResult", "CareerUsageLog", "CareerUsageRollup"]
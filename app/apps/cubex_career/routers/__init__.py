@@ -3,5 +3,6 @@
 from app.apps.cubex_career.routers.history import router as history_router
 from app.apps.cubex_career.routers.subscription import router as subscription_router
 from app.apps.cubex_career.routers.internal import router as internal_router
+from app.apps.cubex_career.routers.usage import router as usage_router
 
-__all__ = ["history_router", "subscription_router", "internal_router"]
+__all__ = ["history_router", "subscription_router", "internal_router", "usage_router"]
@@ -19,7 +19,11 @@ from app.apps.cubex_career.schemas.history import (
     AnalysisHistoryListResponse,
 )
 from app.core.config import request_logger
-from app.core.dependencies import CurrentActiveUser, get_async_session
+from app.core.dependencies import (
+    CurrentActivePrincipal,
+    get_async_session,
+    get_read_session,
+)
 from app.core.enums import FeatureKey
 from app.core.exceptions.types import NotFoundException
 
@@ -150,8 +154,8 @@ commits a successful usage log with `result_data` via
     },
 )
 async def list_history(
-    user: CurrentActiveUser,
-    session: Annotated[AsyncSession, Depends(get_async_session)],
+    user: CurrentActivePrincipal,
+    session: Annotated[AsyncSession, Depends(get_read_session)],
     feature_key: Annotated[
         FeatureKey | None,
         Query(description="Filter by career feature key"),
@@ -291,7 +295,7 @@ result.
 )
 async def get_result(
     result_id: UUID,
-    user: CurrentActiveUser,
+    user: CurrentActivePrincipal,
     session: Annotated[AsyncSession, Depends(get_async_session)],
 ) -> AnalysisHistoryDetail:
     """Get full details of a single analysis result owned by the current user."""
@@ -375,7 +379,7 @@ returns `404 Not Found` on subsequent calls.
 )
 async def delete_result(
     result_id: UUID,
-    user: CurrentActiveUser,
+    user: CurrentActivePrincipal,
     session: Annotated[AsyncSession, Depends(get_async_session)],
 ) -> None:
     """Soft-delete a single analysis result owned by the current user."""
@@ -35,7 +35,7 @@ from app.apps.cubex_career.services.quota import career_quota_service
 from app.core.db.crud import career_subscription_context_db
 from app.core.enums import AccessStatus
 from app.core.dependencies import (
-    CurrentActiveUser,
+    CurrentActivePrincipal,
     get_async_session,
     InternalAPIKeyDep,
 )
@@ -196,7 +196,7 @@ router = APIRouter(prefix="/internal", tags=["Career - Internal API"])
 )
 async def validate_usage(
     request: UsageValidateRequest,
-    current_user: CurrentActiveUser,
+    current_user: CurrentActivePrincipal,
     _: InternalAPIKeyDep,
     session: Annotated[AsyncSession, Depends(get_async_session)],
 ) -> JSONResponse:
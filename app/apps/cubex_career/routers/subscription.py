@@ -15,7 +15,11 @@ from uuid import UUID
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.dependencies import CurrentActiveUser, get_async_session
+from app.core.dependencies import (
+    CurrentActivePrincipal,
+    CurrentActiveUser,
+    get_async_session,
+)
 from app.core.config import request_logger
 from app.core.schemas.plan import (
     PlanResponse,
@@ -217,7 +221,7 @@ subscription exists.
 """,
 )
 async def get_my_career_subscription(
-    current_user: CurrentActiveUser,
+    current_user: CurrentActivePrincipal,
     session: Annotated[AsyncSession, Depends(get_async_session)],
 ) -> CareerSubscriptionResponse | None:
     """Get current user's Career subscription."""
@@ -372,7 +376,7 @@ Returns detailed proration information.
 )
 async def preview_career_upgrade(
     request_data: CareerUpgradePreviewRequest,
-    current_user: CurrentActiveUser,
+    current_user: CurrentActivePrincipal,
     session: Annotated[AsyncSession, Depends(get_async_session)],
 ) -> CareerUpgradePreviewResponse:
     """Preview the cost of upgrading to a new Career plan."""
@@ -465,7 +469,7 @@ Returns the updated subscription with new plan details.
 )
 async def upgrade_career_plan(
     request_data: CareerUpgradeRequest,
-    current_user: CurrentActiveUser,
+    current_user: CurrentActivePrincipal,
     session: Annotated[AsyncSession, Depends(get_async_session)],
 ) -> CareerSubscriptionResponse:
     """Upgrade to a different Career plan."""
@@ -554,7 +558,7 @@ at the end of the current billing period.
 )
 async def cancel_career_subscription(
     request_data: CareerCancelRequest,
-    current_user: CurrentActiveUser,
+    current_user: CurrentActivePrincipal,
     session: Annotated[AsyncSession, Depends(get_async_session)],
 ) -> CareerMessageResponse:
     """Cancel Career subscription."""
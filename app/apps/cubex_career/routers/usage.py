@@ -0,0 +1,122 @@
+"""
+Career usage router.
+
+- Usage summary for the authenticated user (served from pre-aggregated rollups)
+"""
+
+from datetime import datetime
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.apps.cubex_career.db.crud import career_usage_rollup_db
+from app.core.config import request_logger
+from app.core.dependencies import CurrentActivePrincipal, get_read_session
+from app.core.enums import FeatureKey, UsageRollupGranularity
+from app.core.schemas.usage import UsageSummaryResponse
+from app.core.services.usage_rollup import resolve_summary_window, summarize_rollups
+
+router = APIRouter(prefix="/usage")
+
+
+@router.get(
+    "/summary",
+    response_model=UsageSummaryResponse,
+    summary="Get career usage summary",
+    description="""
+## Get Career Usage Summary
+
+Return the authenticated user's committed Career usage, aggregated per
+feature and per hour or day. Figures come from pre-aggregated rollup
+tables updated when each usage log is committed, so the cost of this
+endpoint depends on the number of buckets in the window, not on the
+number of analyses performed.
+
+### Authorization
+
+- User must be authenticated (Bearer JWT)
+
+### Query Parameters
+
+| Parameter | Type | Required | Default | Description |
+|-----------|------|----------|---------|-------------|
+| `granularity` | string | No | `day` | Bucket size: `hour` or `day` |
+| `start` | datetime | No | `end` - 24h (hour) / 30d (day) | Inclusive window start (aligned down to the bucket) |
+| `end` | datetime | No | now | Exclusive window end |
+| `feature_key` | string | No | — | Restrict the summary to one career feature |
+
+The window may span at most 31 days for `hour` and 366 days for `day`.
+
+### Response
+
+| Field | Type | Description |
+|-------|------|-------------|
+| `granularity` | string | Bucket size used for `series` |
+| `start` / `end` | datetime | Resolved window |
+| `totals` | object | Counters across all features |
+| `by_feature` | array | Counters per feature (`feature_key` + counters) |
+| `series` | array | Counters per bucket (`bucket_start` + counters) |
+
+Each counter object contains `request_count`, `success_count`,
+`failed_count`, `credits_charged`, `input_tokens`, `output_tokens`,
+`avg_latency_ms` and histogram-estimated `p50_latency_ms`,
+`p95_latency_ms`, `p99_latency_ms`.
+
+### Notes
+
+- Only committed usage is counted; pending and expired logs are not
+- Percentiles are estimates from a fixed-bucket latency histogram
+""",
+    responses={
+        400: {
+            "description": "Invalid window",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "'start' must be before 'end'."}
+                }
+            },
+        },
+        401: {"description": "Missing or invalid Bearer JWT"},
+    },
+)
+async def get_usage_summary(
+    user: CurrentActivePrincipal,
+    session: Annotated[AsyncSession, Depends(get_read_session)],
+    granularity: Annotated[
+        UsageRollupGranularity,
+        Query(description="Bucket size: hour or day"),
+    ] = UsageRollupGranularity.DAY,
+    start: Annotated[
+        datetime | None,
+        Query(description="Inclusive window start"),
+    ] = None,
+    end: Annotated[
+        datetime | None,
+        Query(description="Exclusive window end"),
+    ] = None,
+    feature_key: Annotated[
+        FeatureKey | None,
+        Query(description="Restrict the summary to one career feature"),
+    ] = None,
+) -> UsageSummaryResponse:
+    """Summarise the current user's committed Career usage from the rollup tables."""
+    request_logger.info(
+        f"GET /career/usage/summary - user={user.id} "
+        f"granularity={granularity.value} feature_key={feature_key}"
+    )
+    window_start, window_end = resolve_summary_window(granularity, start, end)
+
+    async with session.begin():
+        rows = await career_usage_rollup_db.list_buckets(
+            session,
+            user.id,
+            granularity,
+            window_start,
+            window_end,
+            feature_key=feature_key,
+        )
+    return summarize_rollups(rows, granularity, window_start, window_end)
+
+
+__all__ = ["router"]
@@ -25,7 +25,8 @@ from dataclasses import dataclass
 from decimal import Decimal
 import time
 from datetime import datetime, timedelta, timezone
-from typing import Any
+from collections import defaultdict
+from typing import Any, Sequence
 from uuid import UUID
 
 from fastapi import status
@@ -34,10 +35,15 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.apps.cubex_career.db.crud import (
     career_analysis_result_db,
     career_usage_log_db,
+    career_usage_rollup_db,
 )
 from app.core.config import career_logger
-from app.core.db.crud import career_subscription_context_db
-from app.core.enums import AccessStatus, FeatureKey
+from app.core.db.crud import (
+    ReturnStrategy,
+    UsageLogCommit,
+    career_subscription_context_db,
+)
+from app.core.enums import AccessStatus, FeatureKey, UsageLogStatus
 from app.core.services.quota_cache import QuotaCacheService
 from app.core.services.redis_service import RedisService
 from app.core.utils import create_request_fingerprint
@@ -450,6 +456,7 @@ class CareerQuotaService:
                 "credits_reserved": credits_reserved,
             },
             commit_self=False,
+            return_strategy=ReturnStrategy.RETURNING,
         )
 
         career_logger.info(
@@ -524,6 +531,10 @@ class CareerQuotaService:
                 "User does not own this usage log.",
             )
 
+        # Only the commit that leaves PENDING feeds the rollups; replays of
+        # an already-committed log must not be counted twice.
+        was_pending = usage_log.status == UsageLogStatus.PENDING
+
         # Commit the usage log (idempotent)
         committed_log = await career_usage_log_db.commit(
             session,
@@ -535,8 +546,8 @@ class CareerQuotaService:
         )
 
         if committed_log:
-            # If successfully committed as SUCCESS, increment credits_used counter
-            if success and committed_log.credits_charged is not None:
+            # If this commit moved the log to SUCCESS, increment credits_used
+            if was_pending and success and committed_log.credits_charged is not None:
                 context = await career_subscription_context_db.get_by_user(
                     session, committed_log.user_id
                 )
@@ -545,8 +556,9 @@ class CareerQuotaService:
                         session, context.id, committed_log.credits_charged
                     )
 
-            # Store analysis result if provided and successful
-            if success and result_data and committed_log.feature_key:
+            # Store analysis result if provided and successful (once - the
+            # result is unique per usage log)
+            if was_pending and success and result_data and committed_log.feature_key:
                 await career_analysis_result_db.create_from_commit(
                     session,
                     usage_log_id=usage_id,
@@ -556,6 +568,15 @@ class CareerQuotaService:
                     commit_self=False,
                 )
 
+            if was_pending:
+                await career_usage_rollup_db.record(
+                    session,
+                    committed_log.user_id,
+                    committed_log,
+                    credits_charged=committed_log.credits_charged,
+                    commit_self=False,
+                )
+
             if commit_self:
                 await session.commit()
 
@@ -569,6 +590,92 @@ class CareerQuotaService:
 
         return (True, "Usage log not found, but operation is idempotent.")
 
+    async def commit_usage_batch(
+        self,
+        session: AsyncSession,
+        commits: Sequence[tuple[UUID, UsageLogCommit, dict | None]],
+    ) -> list[tuple[bool, str]]:
+        """
+        Commit many pending usage logs in the caller's transaction.
+
+        Set-based counterpart of ``commit_usage`` with the same per-item
+        outcomes: usage logs are loaded with one query, every eligible log
+        is committed by a single ``UPDATE ... RETURNING``, credits are added
+        with one aggregated per-user increment, analysis results are
+        inserted together and the rollups updated with one upsert. Only logs
+        that actually leave PENDING charge credits, store results or feed
+        the rollups, so replays are no-ops.
+
+        Args:
+            session: Database session (the caller commits).
+            commits: ``(user_id, commit, result_data)`` triples. A usage log
+                repeated in the batch is committed by its first occurrence
+                only.
+
+        Returns:
+            ``(success, message)`` per input item, in input order.
+        """
+        results: list[tuple[bool, str]] = []
+        usage_logs = await career_usage_log_db.get_by_ids(
+            session, [commit.usage_log_id for _, commit, _ in commits]
+        )
+
+        eligible: dict[UUID, tuple[UsageLogCommit, dict | None]] = {}
+        for user_id, commit, result_data in commits:
+            usage_log = usage_logs.get(commit.usage_log_id)
+            if not usage_log or usage_log.is_deleted:
+                results.append(
+                    (True, "Usage log not found, but operation is idempotent.")
+                )
+                continue
+            if usage_log.user_id != user_id:
+                career_logger.warning(
+                    f"Usage commit ownership mismatch: "
+                    f"usage_log.user_id={usage_log.user_id}, "
+                    f"request.user_id={user_id}"
+                )
+                results.append((False, "User does not own this usage log."))
+                continue
+            eligible.setdefault(commit.usage_log_id, (commit, result_data))
+            status_str = "SUCCESS" if commit.success else "FAILED"
+            results.append((True, f"Usage committed as {status_str}."))
+
+        committed = await career_usage_log_db.commit_many(
+            session, [commit for commit, _ in eligible.values()]
+        )
+
+        credits: dict[UUID, Decimal] = defaultdict(Decimal)
+        analysis_results = []
+        for log in committed:
+            if log.status != UsageLogStatus.SUCCESS:
+                continue
+            if log.credits_charged is not None:
+                credits[log.user_id] += log.credits_charged
+            result_data = eligible[log.id][1]
+            if result_data and log.feature_key:
+                analysis_results.append(
+                    (log.id, log.user_id, log.feature_key, result_data)
+                )
+
+        await career_subscription_context_db.increment_credits_used_many(
+            session, credits
+        )
+        if analysis_results:
+            await career_analysis_result_db.create_many_from_commits(
+                session, analysis_results
+            )
+        await career_usage_rollup_db.record_many(
+            session,
+            [(log.user_id, log, log.credits_charged) for log in committed],
+        )
+
+        career_logger.info(
+            f"Usage batch committed: {len(commits)} requested, "
+            f"{len(committed)} moved out of PENDING, "
+            f"credits charged to {len(credits)} user(s)"
+        )
+        return results
+
 
 # Global service instance
 career_quota_service = CareerQuotaService()
@@ -12,6 +12,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import stripe_logger
 from app.core.db.crud import (
+    ReturnStrategy,
     career_subscription_context_db,
     plan_db,
     subscription_db,
@@ -172,16 +173,19 @@ class CareerSubscriptionService:
         if not free_plan:
             raise ValueError("Free Career plan not found. Ensure plans are seeded.")
 
-        # Create subscription (free plan, no Stripe)
+        # Create subscription (free plan, no Stripe); attaching the plan
+        # avoids a refresh just to load the relationship.
         subscription = await subscription_db.create(
             session,
             {
                 "plan_id": free_plan.id,
+                "plan": free_plan,
                 "product_type": ProductType.CAREER,
                 "status": SubscriptionStatus.ACTIVE,
                 "seat_count": 1,  # Career is always single-user
             },
             commit_self=False,
+            return_strategy=ReturnStrategy.RETURNING,
         )
 
         await career_subscription_context_db.create(
@@ -191,13 +195,13 @@ class CareerSubscriptionService:
                 "user_id": user.id,
             },
             commit_self=False,
+            return_strategy=ReturnStrategy.NONE,
         )
 
         if commit_self:
             await session.commit()
         else:
             await session.flush()
-        await session.refresh(subscription)
 
         stripe_logger.info(
             f"Career free subscription created: {subscription.id} for user {user.id}"
@@ -335,20 +339,27 @@ class CareerSubscriptionService:
             if first_item.price and first_item.price.unit_amount is not None:
                 amount = Decimal(first_item.price.unit_amount) / Decimal(100)
 
+        plan = await plan_db.get_by_id(session, plan_id)
+        subscription_data: dict[str, Any] = {
+            "plan_id": plan_id,
+            "product_type": ProductType.CAREER,
+            "stripe_subscription_id": stripe_subscription_id,
+            "stripe_customer_id": stripe_customer_id,
+            "status": SubscriptionStatus.ACTIVE,
+            "seat_count": 1,  # Career is always single-user
+            "current_period_start": current_period_start,
+            "current_period_end": current_period_end,
+            "amount": amount,
+        }
+        if plan:
+            # Attach the plan so no refresh is needed to load the relationship
+            subscription_data["plan"] = plan
+
         subscription = await subscription_db.create(
             session,
-            {
-                "plan_id": plan_id,
-                "product_type": ProductType.CAREER,
-                "stripe_subscription_id": stripe_subscription_id,
-                "stripe_customer_id": stripe_customer_id,
-                "status": SubscriptionStatus.ACTIVE,
-                "seat_count": 1,  # Career is always single-user
-                "current_period_start": current_period_start,
-                "current_period_end": current_period_end,
-                "amount": amount,
-            },
+            subscription_data,
             commit_self=False,
+            return_strategy=ReturnStrategy.RETURNING,
         )
 
         # Link subscription to user via context
@@ -371,23 +382,14 @@ class CareerSubscriptionService:
                     "user_id": user_id,
                 },
                 commit_self=False,
+                return_strategy=ReturnStrategy.NONE,
             )
 
-        if commit_self:
-            await session.commit()
-        else:
-            await session.flush()
-        await session.refresh(subscription)
-
-        stripe_logger.info(
-            f"Career subscription created: {subscription.id} for user {user_id}"
-        )
-
-        # Queue subscription activation email to user
+        # Queue subscription activation email to user (written to the outbox
+        # in this transaction)
         user = await user_db.get_by_id(session, user_id)
-        plan = await plan_db.get_by_id(session, plan_id)
         if user and plan:
-            await get_publisher()(
+            await get_publisher(session)(
                 "subscription_activated_emails",
                 {
                     "email": user.email,
@@ -399,6 +401,15 @@ class CareerSubscriptionService:
                 },
             )
 
+        if commit_self:
+            await session.commit()
+        else:
+            await session.flush()
+
+        stripe_logger.info(
+            f"Career subscription created: {subscription.id} for user {user_id}"
+        )
+
         return subscription
 
     async def handle_subscription_updated(
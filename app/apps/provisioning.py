@@ -0,0 +1,38 @@
+"""
+Post-signup provisioning hooks for each product.
+
+Every process that provisions users (the API, the message consumers and
+the scheduler) calls ``register_post_signup_hooks`` at startup.
+"""
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.db.models import User
+from app.core.services.lifecycle import register_post_signup_hook
+from app.apps.cubex_api.services.workspace import WorkspaceService
+from app.apps.cubex_career.services.subscription import CareerSubscriptionService
+
+
+async def create_personal_workspace(session: AsyncSession, user: User) -> None:
+    """Create the user's personal API workspace on the free plan."""
+    await WorkspaceService().create_personal_workspace(session, user, commit_self=False)
+
+
+async def create_career_subscription(session: AsyncSession, user: User) -> None:
+    """Create the user's free Career subscription."""
+    await CareerSubscriptionService().create_free_subscription(
+        session, user, commit_self=False
+    )
+
+
+def register_post_signup_hooks() -> None:
+    """Register every product's post-signup hook (safe to call twice)."""
+    register_post_signup_hook(create_personal_workspace)
+    register_post_signup_hook(create_career_subscription)
+
+
+__all__ = [
+    "create_career_subscription",
+    "create_personal_workspace",
+    "register_post_signup_hooks",
+]
@@ -4,7 +4,9 @@ from app.core.db.config import (
     Base,
     dispose_db,
     init_db,
+    pool_liveness_monitor,
 )
+from app.core.db.routing import ReadSessionLocal, db_router
 
 __all__ = [
     "async_engine",
@@ -12,4 +14,7 @@ __all__ = [
     "Base",
     "dispose_db",
     "init_db",
+    "pool_liveness_monitor",
+    "ReadSessionLocal",
+    "db_router",
 ]
@@ -4,19 +4,54 @@ from sqlalchemy.ext.asyncio import (
     async_sessionmaker,
     AsyncAttrs,
 )
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import DeclarativeBase
 
 from app.core.config import settings
 
+from app.core.db.pool import PoolLivenessMonitor, engine_options, instrument_engine
+
 ASYNC_SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
 
-async_engine: AsyncEngine = create_async_engine(
-    ASYNC_SQLALCHEMY_DATABASE_URL,
-    echo=settings.DEBUG,
-    pool_size=20,  # Increase pool size for concurrent connections
-    max_overflow=30,  # Allow overflow connections
-    pool_pre_ping=True,  # Validate connections before use
-    pool_recycle=3600,  # Recycle connections every hour
+
+def create_database_engine(url: str) -> AsyncEngine:
+    """
+    Create an instrumented engine sized by this process role's pool profile.
+
+    Args:
+        url: Database URL.
+
+    Returns:
+        The new engine.
+    """
+    options = engine_options(
+        settings.db_pool_profile,
+        statement_cache_size=settings.DB_STATEMENT_CACHE_SIZE,
+        pgbouncer_transaction_mode=settings.DB_PGBOUNCER_TRANSACTION_MODE,
+        pre_ping=settings.DB_POOL_PRE_PING,
+    )
+    # The statement cache options are asyncpg connect() arguments
+    if make_url(url).get_driver_name() != "asyncpg":
+        options.pop("connect_args")
+    engine = create_async_engine(url, echo=settings.DEBUG, **options)
+    instrument_engine(engine)
+    return engine
+
+
+async_engine: AsyncEngine = create_database_engine(ASYNC_SQLALCHEMY_DATABASE_URL)
+
+# Read replicas share the primary's pool profile; reads are routed to them
+# by app.core.db.routing.
+replica_engines: list[AsyncEngine] = [
+    create_database_engine(url) for url in settings.DATABASE_REPLICA_URLS
+]
+
+# Replaces per-checkout pre-ping; started by each process entry point.
+pool_liveness_monitor = PoolLivenessMonitor(
+    {
+        "primary": async_engine,
+        **{f"replica-{index}": engine for index, engine in enumerate(replica_engines)},
+    }
 )
 
 AsyncSessionLocal = async_sessionmaker(
@@ -46,9 +81,13 @@ async def init_db() -> None:
 async def dispose_db() -> None:
     """
     Dispose the database connection.
-    This function is responsible for disposing the database connection by calling the `dispose()` method of the `async_engine` object.
+    This function is responsible for disposing the database connection by calling the `dispose()` method of the `async_engine` object
+    and of every read replica engine.
 
     Returns:
         None
     """
+    await pool_liveness_monitor.stop()
     await async_engine.dispose()
+    for engine in replica_engines:
+        await engine.dispose()
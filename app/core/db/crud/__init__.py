@@ -1,6 +1,7 @@
-from app.core.db.crud.base import BaseDB
+from app.core.db.crud.base import BaseDB, ReturnStrategy
 from app.core.db.crud.dlq_message import DLQMessageDB, dlq_message_db
 from app.core.db.crud.otp import OTPTokenDB
+from app.core.db.crud.outbox_event import OutboxEventDB, outbox_event_db
 from app.core.db.crud.plan import PlanDB
 from app.core.db.crud.quota import (
     FeatureCostConfigDB,
@@ -14,6 +15,8 @@ from app.core.db.crud.subscription_context import (
     APISubscriptionContextDB,
     CareerSubscriptionContextDB,
 )
+from app.core.db.crud.usage_log import UsageLogBaseDB, UsageLogCommit
+from app.core.db.crud.usage_rollup import UsageRollupDB
 from app.core.db.crud.user import OAuthAccountDB, UserDB
 
 # Global CRUD instances - use these instead of creating new instances
@@ -35,13 +38,18 @@ __all__ = [
     "DLQMessageDB",
     "OAuthAccountDB",
     "OTPTokenDB",
+    "OutboxEventDB",
     "PlanDB",
     # Quota
     "FeatureCostConfigDB",
     "PlanPricingRuleDB",
     "RefreshTokenDB",
+    "ReturnStrategy",
     "StripeEventLogDB",
     "SubscriptionDB",
+    "UsageLogBaseDB",
+    "UsageLogCommit",
+    "UsageRollupDB",
     "UserDB",
     # Global instances (for actual usage)
     "api_subscription_context_db",
@@ -52,6 +60,7 @@ __all__ = [
     "user_db",
     "oauth_account_db",
     "otp_token_db",
+    "outbox_event_db",
     "refresh_token_db",
     "plan_db",
     "subscription_db",
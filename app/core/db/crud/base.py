@@ -1,6 +1,8 @@
 from datetime import datetime, timezone
+from enum import Enum
 from typing import (
     Any,
+    Iterator,
     TypeVar,
     Generic,
     Type,
@@ -9,16 +11,21 @@ from typing import (
 )
 from uuid import UUID
 
+import asyncpg
 from sqlalchemy import (
     SQLColumnExpression,
     UnaryExpression,
     and_,
+    column as sa_column,
     or_,
     update as sa_update,
     delete as sa_delete,
+    inspect as sa_inspect,
+    values as sa_values,
 )
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlalchemy.sql.expression import asc, desc
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
@@ -28,6 +35,28 @@ from app.core.exceptions.types import DatabaseException
 
 T = TypeVar("T")
 
+# PostgreSQL's extended protocol caps a single statement at 32767 bind
+# parameters; bulk operations chunk their VALUES lists to stay below it.
+MAX_BIND_PARAMS = 32767
+
+
+class ReturnStrategy(str, Enum):
+    """
+    How write methods hydrate the instance they return.
+
+    - ``REFRESH``: re-SELECT the row after flush/commit. Also loads eager
+      (``selectin``/``joined``) relationships. One extra round trip.
+    - ``RETURNING``: rely on the write statement's ``RETURNING`` clause
+      (SQLAlchemy fetches server-generated columns during the INSERT).
+      A SELECT is only issued for columns that are still unloaded.
+      Relationships are not loaded.
+    - ``NONE``: return the instance exactly as flushed, no hydration.
+    """
+
+    REFRESH = "refresh"
+    RETURNING = "returning"
+    NONE = "none"
+
 
 class BaseDB(Generic[T]):
     def __init__(self, model: Type[T]):
@@ -278,6 +307,7 @@ class BaseDB(Generic[T]):
         data: dict,
         validate: Callable[[dict], dict] | None = None,
         commit_self: bool = True,
+        return_strategy: ReturnStrategy = ReturnStrategy.REFRESH,
     ) -> T:
         """
         Asynchronously creates and persists a new instance of the model using the provided data.
@@ -286,6 +316,7 @@ class BaseDB(Generic[T]):
             data (dict): A dictionary of fields and values to initialize the model instance.
             validate (Callable[[dict], dict] | None, optional): An optional callable to validate or transform the input data before model instantiation. Defaults to None.
             commit_self (bool, optional): If True, commits the transaction and refreshes the object from the database. If False, only flushes the session. Defaults to True.
+            return_strategy (ReturnStrategy, optional): How the returned instance is hydrated. Defaults to ReturnStrategy.REFRESH.
         Returns:
             T: The newly created and persisted model instance.
         Raises:
@@ -303,7 +334,7 @@ class BaseDB(Generic[T]):
             else:
                 await session.flush()
 
-            await session.refresh(obj)
+            await self._hydrate(session, obj, return_strategy)
             return obj
         except (SQLAlchemyError, ValueError) as e:
             raise DatabaseException(
@@ -311,7 +342,11 @@ class BaseDB(Generic[T]):
             ) from e
 
     async def bulk_create(
-        self, session: AsyncSession, objects: list[T], commit_self: bool = True
+        self,
+        session: AsyncSession,
+        objects: list[T],
+        commit_self: bool = True,
+        return_strategy: ReturnStrategy = ReturnStrategy.REFRESH,
     ) -> list[T]:
         """
         Asynchronously creates multiple instances of the model using the provided objects.
@@ -321,6 +356,7 @@ class BaseDB(Generic[T]):
             objects (list[T]): A list of model instances to create.
             commit_self (bool, optional): If True, commits the transaction and refreshes the objects from the database.
                 If False, only flushes the session. Defaults to True.
+            return_strategy (ReturnStrategy, optional): How the returned instances are hydrated. Defaults to ReturnStrategy.REFRESH.
 
         Returns:
             list[T]: The list of newly created and persisted model instances.
@@ -337,7 +373,7 @@ class BaseDB(Generic[T]):
                 await session.flush()
 
             for obj in objects:
-                await session.refresh(obj)
+                await self._hydrate(session, obj, return_strategy)
             return objects
         except (SQLAlchemyError, ValueError) as e:
             raise DatabaseException(
@@ -560,6 +596,9 @@ class BaseDB(Generic[T]):
         unique_fields: list[str],
         exclude_from_update: list[str] | None = None,
         commit_self: bool = True,
+        increment_fields: list[str] | None = None,
+        update_expressions: dict[str, Callable[[Any], Any]] | None = None,
+        return_strategy: ReturnStrategy = ReturnStrategy.REFRESH,
     ) -> tuple[T, bool]:
         """
         Upsert a record using PostgreSQL's INSERT ... ON CONFLICT ... DO UPDATE.
@@ -567,6 +606,11 @@ class BaseDB(Generic[T]):
         Performs an atomic upsert operation: inserts a new record if it doesn't exist,
         or updates the existing record if there's a conflict on the unique fields.
 
+        Counter-style tables can use ``increment_fields`` so that a conflict adds
+        the inserted value to the stored one (``col = col + EXCLUDED.col``)
+        instead of overwriting it. Anything more involved can be expressed with
+        ``update_expressions``.
+
         Args:
             session: Database session.
             data: Dictionary of all fields to set on the record.
@@ -575,6 +619,15 @@ class BaseDB(Generic[T]):
             exclude_from_update: Fields to exclude from updates on conflict.
                                  Defaults to ["id", "created_at"] plus the unique_fields.
             commit_self: Whether to commit after the operation.
+            increment_fields: Fields that are accumulated on conflict
+                              (``col = col + EXCLUDED.col``).
+            update_expressions: Mapping of field name to a callable that receives
+                                the statement's ``excluded`` namespace and returns
+                                the SQL expression to assign on conflict. Takes
+                                precedence over ``increment_fields``.
+            return_strategy: How the returned instance is hydrated. The
+                             statement already uses RETURNING, so anything
+                             other than REFRESH skips the extra SELECT.
 
         Returns:
             A tuple of (instance, created) where created is True if a new record
@@ -591,37 +644,20 @@ class BaseDB(Generic[T]):
                 )
 
         try:
-            default_exclude = {"id", "created_at", *unique_fields}
-            if exclude_from_update:
-                default_exclude.update(exclude_from_update)
-
             # Prepare insert data (exclude 'id' to let DB generate it)
             insert_data = {k: v for k, v in data.items() if k != "id"}
 
             now = datetime.now(timezone.utc)
-            if hasattr(self.model, "created_at") and "created_at" not in insert_data:
-                insert_data["created_at"] = now
-            if hasattr(self.model, "updated_at") and "updated_at" not in insert_data:
-                insert_data["updated_at"] = now
-            if hasattr(self.model, "is_deleted") and "is_deleted" not in insert_data:
-                insert_data["is_deleted"] = False
-
-            # Build the update set (fields to update on conflict)
-            update_set = {
-                k: v for k, v in insert_data.items() if k not in default_exclude
-            }
-            # Always update updated_at on conflict
-            if hasattr(self.model, "updated_at"):
-                update_set["updated_at"] = now
-
-            stmt = (
-                pg_insert(self.model)
-                .values(**insert_data)
-                .on_conflict_do_update(
-                    index_elements=unique_fields,
-                    set_=update_set,
-                )
-                .returning(self.model)
+            self._stamp_row(insert_data, now)
+
+            stmt = self._build_upsert(
+                [insert_data],
+                update_fields=list(insert_data),
+                unique_fields=unique_fields,
+                exclude_from_update=exclude_from_update,
+                increment_fields=increment_fields,
+                update_expressions=update_expressions,
+                now=now,
             )
 
             result = await session.execute(stmt)
@@ -632,7 +668,8 @@ class BaseDB(Generic[T]):
             else:
                 await session.flush()
 
-            await session.refresh(instance)
+            if return_strategy == ReturnStrategy.REFRESH:
+                await session.refresh(instance)
 
             # Determine if this was an insert or update by checking created_at vs updated_at
             # If they're equal (within a small margin), it was likely an insert
@@ -651,6 +688,409 @@ class BaseDB(Generic[T]):
                 f"Error upserting {self.model.__name__}: {str(e)}"
             ) from e
 
+    @staticmethod
+    async def _hydrate(
+        session: AsyncSession, obj: Any, return_strategy: ReturnStrategy
+    ) -> None:
+        """Hydrate a freshly written instance according to ``return_strategy``."""
+        if return_strategy == ReturnStrategy.REFRESH:
+            await session.refresh(obj)
+        elif return_strategy == ReturnStrategy.RETURNING:
+            state = sa_inspect(obj)
+            unloaded = []
+            for attr in state.mapper.column_attrs:
+                if attr.key not in state.unloaded:
+                    continue
+                column = attr.columns[0]
+                if column.default is None and column.server_default is None:
+                    # Omitted columns without defaults were inserted as NULL
+                    set_committed_value(obj, attr.key, None)
+                else:
+                    unloaded.append(attr.key)
+            if unloaded:
+                await session.refresh(obj, attribute_names=unloaded)
+
+    # ------------------------------------------------------------------
+    # Set-based bulk operations
+    # ------------------------------------------------------------------
+
+    def _stamp_row(self, row: dict[str, Any], now: datetime) -> dict[str, Any]:
+        """Fill created_at/updated_at/is_deleted on an insert row if missing."""
+        if hasattr(self.model, "created_at") and "created_at" not in row:
+            row["created_at"] = now
+        if hasattr(self.model, "updated_at") and "updated_at" not in row:
+            row["updated_at"] = now
+        if hasattr(self.model, "is_deleted") and "is_deleted" not in row:
+            row["is_deleted"] = False
+        return row
+
+    def _prepare_bulk_rows(
+        self, rows: Sequence[dict[str, Any]], now: datetime
+    ) -> list[dict[str, Any]]:
+        """
+        Complete insert rows with column defaults so every row has the same keys.
+
+        Multi-row VALUES lists and COPY both need a uniform column list, so
+        Python-side column defaults (``id``, ``status`` ...) are resolved
+        here instead of per row by SQLAlchemy.
+
+        Raises:
+            ValueError: If rows do not share the same set of columns.
+        """
+        table = getattr(self.model, "__table__")
+        prepared: list[dict[str, Any]] = []
+        for data in rows:
+            row = self._stamp_row(dict(data), now)
+            for column in table.columns:
+                default = column.default
+                if column.key in row or default is None:
+                    continue
+                if default.is_scalar:
+                    row[column.key] = default.arg
+                elif default.is_callable:
+                    row[column.key] = default.arg(None)
+            prepared.append(row)
+
+        keys = set(prepared[0])
+        for row in prepared[1:]:
+            if set(row) != keys:
+                raise ValueError(
+                    f"All rows for a bulk {self.model.__name__} operation must "
+                    f"provide the same columns"
+                )
+        return prepared
+
+    @staticmethod
+    def _chunks(
+        rows: list[dict[str, Any]], chunk_size: int | None
+    ) -> Iterator[list[dict[str, Any]]]:
+        """Split rows so each statement stays under ``MAX_BIND_PARAMS``."""
+        width = max(len(rows[0]), 1)
+        size = max(MAX_BIND_PARAMS // width, 1)
+        if chunk_size is not None:
+            size = max(min(size, chunk_size), 1)
+        for start in range(0, len(rows), size):
+            yield rows[start : start + size]
+
+    def _build_upsert(
+        self,
+        rows: list[dict[str, Any]],
+        update_fields: list[str],
+        unique_fields: list[str],
+        exclude_from_update: list[str] | None,
+        increment_fields: list[str] | None,
+        update_expressions: dict[str, Callable[[Any], Any]] | None,
+        now: datetime,
+    ) -> Any:
+        """Build ``INSERT ... VALUES ... ON CONFLICT DO UPDATE ... RETURNING``."""
+        excluded_fields = {"id", "created_at", *unique_fields}
+        if exclude_from_update:
+            excluded_fields.update(exclude_from_update)
+
+        insert_stmt = pg_insert(self.model).values(rows)
+
+        # Fields supplied by the caller are overwritten from EXCLUDED on conflict
+        update_set: dict[str, Any] = {
+            k: insert_stmt.excluded[k]
+            for k in update_fields
+            if k not in excluded_fields
+        }
+        # Always update updated_at on conflict
+        if hasattr(self.model, "updated_at"):
+            update_set["updated_at"] = now
+        for field in increment_fields or []:
+            update_set[field] = getattr(self.model, field) + insert_stmt.excluded[field]
+        for field, build in (update_expressions or {}).items():
+            update_set[field] = build(insert_stmt.excluded)
+
+        return (
+            insert_stmt.on_conflict_do_update(
+                index_elements=unique_fields,
+                set_=update_set,
+            )
+            .returning(self.model)
+            .execution_options(populate_existing=True)
+        )
+
+    async def bulk_insert_returning(
+        self,
+        session: AsyncSession,
+        rows: Sequence[dict[str, Any]],
+        commit_self: bool = True,
+        chunk_size: int | None = None,
+    ) -> list[T]:
+        """
+        Insert many rows with one ``INSERT ... VALUES ... RETURNING`` per chunk.
+
+        Unlike ``bulk_create`` there is no per-object refresh: the inserted
+        rows come back from RETURNING in the same round trip.
+
+        Args:
+            session: Database session.
+            rows: Column/value dictionaries; all rows must share the same keys
+                  once column defaults are applied.
+            commit_self: Whether to commit after the operation.
+            chunk_size: Optional cap on rows per statement (always bounded by
+                        the bind parameter limit).
+
+        Returns:
+            The inserted instances, in input order.
+
+        Raises:
+            DatabaseException: If an error occurs during the operation.
+        """
+        if not rows:
+            return []
+
+        try:
+            prepared = self._prepare_bulk_rows(rows, datetime.now(timezone.utc))
+            instances: list[T] = []
+            for chunk in self._chunks(prepared, chunk_size):
+                stmt = pg_insert(self.model).values(chunk).returning(self.model)
+                result = await session.execute(stmt)
+                instances.extend(result.scalars().all())
+
+            if commit_self:
+                await session.commit()
+            else:
+                await session.flush()
+            return instances
+        except (SQLAlchemyError, ValueError) as e:
+            raise DatabaseException(
+                f"Error bulk inserting {self.model.__name__}: {str(e)}"
+            ) from e
+
+    async def bulk_upsert(
+        self,
+        session: AsyncSession,
+        rows: Sequence[dict[str, Any]],
+        unique_fields: list[str],
+        exclude_from_update: list[str] | None = None,
+        commit_self: bool = True,
+        increment_fields: list[str] | None = None,
+        update_expressions: dict[str, Callable[[Any], Any]] | None = None,
+        chunk_size: int | None = None,
+    ) -> list[T]:
+        """
+        Upsert many rows with one ``INSERT ... ON CONFLICT DO UPDATE`` per chunk.
+
+        Multi-row counterpart of ``upsert``. Only the fields present in the
+        input rows are overwritten on conflict; column defaults filled in for
+        the insert never clobber existing values. For returned instances,
+        ``created_at == updated_at`` identifies freshly inserted rows.
+
+        Args:
+            session: Database session.
+            rows: Column/value dictionaries sharing the same keys.
+            unique_fields: Conflict target (must be present in every row and
+                           unique across ``rows``).
+            exclude_from_update: Fields to exclude from updates on conflict.
+            commit_self: Whether to commit after the operation.
+            increment_fields: Fields accumulated on conflict.
+            update_expressions: Custom conflict expressions (see ``upsert``).
+            chunk_size: Optional cap on rows per statement.
+
+        Returns:
+            The inserted or updated instances.
+
+        Raises:
+            DatabaseException: If an error occurs during the operation.
+            ValueError: If a unique field is missing or duplicated in ``rows``.
+        """
+        if not rows:
+            return []
+
+        seen: set[tuple[Any, ...]] = set()
+        for row in rows:
+            missing = [f for f in unique_fields if f not in row]
+            if missing:
+                raise ValueError(
+                    f"Unique field '{missing[0]}' must be present in data for upsert"
+                )
+            key = tuple(row[f] for f in unique_fields)
+            if key in seen:
+                # PostgreSQL rejects ON CONFLICT DO UPDATE touching a row twice
+                raise ValueError(f"Duplicate conflict key {key} in bulk upsert rows")
+            seen.add(key)
+
+        try:
+            now = datetime.now(timezone.utc)
+            update_fields = [k for k in rows[0] if k != "id"]
+            prepared = self._prepare_bulk_rows(
+                [{k: v for k, v in row.items() if k != "id"} for row in rows], now
+            )
+            instances: list[T] = []
+            for chunk in self._chunks(prepared, chunk_size):
+                stmt = self._build_upsert(
+                    chunk,
+                    update_fields=update_fields,
+                    unique_fields=unique_fields,
+                    exclude_from_update=exclude_from_update,
+                    increment_fields=increment_fields,
+                    update_expressions=update_expressions,
+                    now=now,
+                )
+                result = await session.execute(stmt)
+                instances.extend(result.scalars().all())
+
+            if commit_self:
+                await session.commit()
+            else:
+                await session.flush()
+            return instances
+        except SQLAlchemyError as e:
+            raise DatabaseException(
+                f"Error bulk upserting {self.model.__name__}: {str(e)}"
+            ) from e
+
+    async def bulk_update_by_pk(
+        self,
+        session: AsyncSession,
+        rows: Sequence[dict[str, Any]],
+        commit_self: bool = True,
+        chunk_size: int | None = None,
+    ) -> int:
+        """
+        Apply per-row updates with one ``UPDATE ... FROM (VALUES ...)`` per chunk.
+
+        Each row carries its primary key (``id``) and the new values. All rows
+        must update the same set of columns. ``updated_at`` is bumped unless
+        provided. Instances already loaded in the session are not refreshed.
+
+        Args:
+            session: Database session.
+            rows: Dictionaries with ``id`` plus the columns to set.
+            commit_self: Whether to commit after the operation.
+            chunk_size: Optional cap on rows per statement.
+
+        Returns:
+            Number of rows updated.
+
+        Raises:
+            DatabaseException: If an error occurs during the operation.
+            ValueError: If a row lacks ``id`` or the rows' columns differ.
+        """
+        if not rows:
+            return 0
+
+        columns = list(rows[0])
+        if "id" not in columns:
+            raise ValueError("Every row for bulk_update_by_pk must include 'id'")
+        for row in rows:
+            if set(row) != set(columns):
+                raise ValueError(
+                    "All rows for bulk_update_by_pk must provide the same columns"
+                )
+
+        try:
+            table = getattr(self.model, "__table__")
+            now = datetime.now(timezone.utc)
+            prepared = [dict(row) for row in rows]
+            if hasattr(self.model, "updated_at") and "updated_at" not in columns:
+                columns.append("updated_at")
+                for row in prepared:
+                    row["updated_at"] = now
+
+            updated = 0
+            for chunk in self._chunks(prepared, chunk_size):
+                source = sa_values(
+                    *[sa_column(c, table.c[c].type) for c in columns],
+                    name="bulk_source",
+                ).data([tuple(row[c] for c in columns) for row in chunk])
+                stmt = (
+                    sa_update(table)
+                    .where(table.c.id == source.c.id)
+                    .values({c: source.c[c] for c in columns if c != "id"})
+                )
+                result = await session.execute(stmt)
+                updated += result.rowcount  # type: ignore[attr-defined]
+
+            if commit_self:
+                await session.commit()
+            else:
+                await session.flush()
+            return updated
+        except SQLAlchemyError as e:
+            raise DatabaseException(
+                f"Error bulk updating {self.model.__name__}: {str(e)}"
+            ) from e
+
+    async def copy_insert(
+        self,
+        session: AsyncSession,
+        rows: Sequence[dict[str, Any]],
+        commit_self: bool = True,
+    ) -> int:
+        """
+        Ingest many rows through PostgreSQL ``COPY`` (asyncpg fast path).
+
+        Intended for very large, append-only ingests where RETURNING is not
+        needed. Values go through the column types' bind processors, so enums
+        and JSON are stored exactly as the ORM would store them. Falls back
+        to ``bulk_insert_returning`` when the driver has no COPY support.
+
+        Args:
+            session: Database session (the COPY joins its transaction).
+            rows: Column/value dictionaries sharing the same keys.
+            commit_self: Whether to commit after the operation.
+
+        Returns:
+            Number of rows ingested.
+
+        Raises:
+            DatabaseException: If an error occurs during the operation.
+        """
+        if not rows:
+            return 0
+
+        try:
+            prepared = self._prepare_bulk_rows(rows, datetime.now(timezone.utc))
+            connection = await session.connection()
+            raw = await connection.get_raw_connection()
+            driver = raw.driver_connection
+
+            if not hasattr(driver, "copy_records_to_table"):
+                await self.bulk_insert_returning(
+                    session, prepared, commit_self=commit_self
+                )
+                return len(prepared)
+
+            # asyncpg opens the DB transaction lazily on the first statement;
+            # make sure COPY runs inside the session's transaction.
+            await connection.exec_driver_sql("SELECT 1")
+
+            table = getattr(self.model, "__table__")
+            columns = list(prepared[0])
+            processors = [
+                table.c[c].type.bind_processor(connection.dialect) for c in columns
+            ]
+            records = [
+                tuple(
+                    process(row[c]) if process else row[c]
+                    for c, process in zip(columns, processors)
+                )
+                for row in prepared
+            ]
+            await driver.copy_records_to_table(  # type: ignore[union-attr]
+                table.name,
+                records=records,
+                columns=columns,
+                schema_name=table.schema,
+            )
+
+            if commit_self:
+                await session.commit()
+            return len(records)
+        except (
+            SQLAlchemyError,
+            ValueError,
+            asyncpg.PostgresError,
+            asyncpg.InterfaceError,
+        ) as e:
+            raise DatabaseException(
+                f"Error copying {self.model.__name__} rows: {str(e)}"
+            ) from e
+
     async def exists(self, session: AsyncSession, filters: dict) -> bool:
         """
         Checks if an instance of the model exists in the database that matches the given filters.
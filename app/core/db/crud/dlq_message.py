@@ -3,13 +3,15 @@ CRUD operations for :class:`DLQMessage`.
 
 Provides standard ``BaseDB`` operations (get_by_id, get_all with
 keyset pagination) plus a custom ``get_metrics`` aggregation for
-the admin dashboard.
+the admin dashboard, and the keyset-paged reads and bulk status
+updates used by bulk DLQ retries.
 """
 
-from typing import Any, Sequence
+from datetime import datetime
+from typing import Any, Collection, Sequence
 from uuid import UUID
 
-from sqlalchemy import Row, false, func, update
+from sqlalchemy import Row, false, func, literal, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
@@ -78,6 +80,106 @@ class DLQMessageDB(BaseDB[DLQMessage]):
 
         return {"total": total, "by_status": by_status, "by_queue": by_queue}
 
+    async def get_pending_page(
+        self,
+        session: AsyncSession,
+        limit: int,
+        queue_name: str | None = None,
+        error_pattern: str | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        ids: Collection[UUID] | None = None,
+        after: tuple[datetime, UUID] | None = None,
+    ) -> Sequence[DLQMessage]:
+        """
+        Lock and return the next page of PENDING messages matching a filter.
+
+        Pages are ordered by ``(created_at, id)`` and continue after the
+        ``after`` cursor (the last row of the previous page), so a scan never
+        re-reads rows. Rows are locked ``FOR UPDATE SKIP LOCKED``: two
+        concurrent retries never pick the same message.
+
+        Args:
+            session: Database session; the locks last until its transaction ends.
+            limit: Maximum rows to return.
+            queue_name: Only this DLQ (``stripe_payment_failed_dead``); the
+                original queue name is accepted too.
+            error_pattern: Case-insensitive substring of the error message
+                (``%`` and ``_`` act as LIKE wildcards).
+            since: Only messages dead-lettered at or after this time.
+            until: Only messages dead-lettered before this time.
+            ids: Only these messages.
+            after: ``(created_at, id)`` of the last row already seen.
+
+        Returns:
+            Up to ``limit`` locked messages.
+        """
+        try:
+            stmt = select(DLQMessage).where(
+                DLQMessage.status == DLQMessageStatus.PENDING,
+                DLQMessage.is_deleted.is_(false()),
+            )
+            if queue_name is not None:
+                if not queue_name.endswith("_dead"):
+                    queue_name = f"{queue_name}_dead"
+                stmt = stmt.where(DLQMessage.queue_name == queue_name)
+            if error_pattern:
+                stmt = stmt.where(DLQMessage.error_message.ilike(f"%{error_pattern}%"))
+            if since is not None:
+                stmt = stmt.where(DLQMessage.created_at >= since)
+            if until is not None:
+                stmt = stmt.where(DLQMessage.created_at < until)
+            if ids is not None:
+                stmt = stmt.where(DLQMessage.id.in_(ids))
+            if after is not None:
+                created_at, last_id = after
+                stmt = stmt.where(
+                    tuple_(DLQMessage.created_at, DLQMessage.id)
+                    > tuple_(
+                        literal(created_at, DLQMessage.created_at.type),
+                        literal(last_id, DLQMessage.id.type),
+                    )
+                )
+            stmt = (
+                stmt.order_by(DLQMessage.created_at, DLQMessage.id)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+            )
+            result = await session.execute(stmt)
+            return result.scalars().all()
+        except Exception as e:
+            raise DatabaseException(f"Error retrieving DLQ messages: {e}") from e
+
+    async def bulk_mark_retried(
+        self,
+        session: AsyncSession,
+        ids: list[UUID],
+        commit_self: bool = True,
+    ) -> int:
+        """
+        Set status to RETRIED for all PENDING messages whose id is in *ids*.
+
+        Returns:
+            The number of rows updated.
+        """
+        try:
+            stmt = (
+                update(DLQMessage)
+                .where(
+                    DLQMessage.id.in_(ids),
+                    DLQMessage.status == DLQMessageStatus.PENDING,
+                )
+                .values(status=DLQMessageStatus.RETRIED)
+            )
+            result = await session.execute(stmt)
+            if commit_self:
+                await session.commit()
+            return result.rowcount  # type: ignore[return-value]
+        except Exception as e:
+            if commit_self:
+                await session.rollback()
+            raise DatabaseException(f"Error marking DLQ messages retried: {e}") from e
+
     async def bulk_discard(
         self,
         session: AsyncSession,
@@ -0,0 +1,208 @@
+"""
+CRUD operations for :class:`OutboxEvent`.
+
+The relay claims pending events in batches (``FOR UPDATE SKIP LOCKED``,
+so several relays never publish the same row), then marks them published
+or records the failed attempt in the same transaction. A failed event
+backs off exponentially and is no longer claimed once it reaches the
+relay's attempt limit, so it cannot stall the events behind it.
+"""
+
+from datetime import datetime, timedelta
+from typing import Sequence
+from uuid import UUID
+
+from sqlalchemy import delete, func, literal, or_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.core.db.crud.base import BaseDB
+from app.core.db.models.outbox_event import OutboxEvent
+from app.core.exceptions.types import DatabaseException
+
+
+class OutboxEventDB(BaseDB[OutboxEvent]):
+    """CRUD for transactional outbox events."""
+
+    def __init__(self) -> None:
+        super().__init__(OutboxEvent)
+
+    async def claim_batch(
+        self,
+        session: AsyncSession,
+        limit: int,
+        max_attempts: int | None = None,
+    ) -> Sequence[OutboxEvent]:
+        """
+        Lock and return the oldest pending events that are due.
+
+        Events backing off after a failure (``next_attempt_at`` in the
+        future) are skipped.
+
+        Args:
+            session: Database session; the locks last until its transaction ends.
+            limit: Maximum rows to return.
+            max_attempts: Skip events with this many failed attempts.
+
+        Returns:
+            Up to ``limit`` locked events, oldest first.
+        """
+        try:
+            stmt = (
+                select(OutboxEvent)
+                .where(
+                    OutboxEvent.published_at.is_(None),
+                    or_(
+                        OutboxEvent.next_attempt_at.is_(None),
+                        OutboxEvent.next_attempt_at <= func.now(),
+                    ),
+                )
+                .order_by(OutboxEvent.created_at, OutboxEvent.id)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+            )
+            if max_attempts is not None:
+                stmt = stmt.where(OutboxEvent.attempts < max_attempts)
+            result = await session.execute(stmt)
+            return result.scalars().all()
+        except Exception as e:
+            raise DatabaseException(f"Error claiming outbox events: {e}") from e
+
+    async def mark_published(
+        self,
+        session: AsyncSession,
+        ids: list[UUID],
+        commit_self: bool = True,
+    ) -> int:
+        """
+        Set ``published_at`` on the given events.
+
+        Returns:
+            The number of rows updated.
+        """
+        try:
+            stmt = (
+                update(OutboxEvent)
+                .where(OutboxEvent.id.in_(ids))
+                .values(published_at=func.now(), last_error=None, next_attempt_at=None)
+            )
+            result = await session.execute(stmt)
+            if commit_self:
+                await session.commit()
+            return result.rowcount  # type: ignore[return-value]
+        except Exception as e:
+            if commit_self:
+                await session.rollback()
+            raise DatabaseException(
+                f"Error marking outbox events published: {e}"
+            ) from e
+
+    async def record_failure(
+        self,
+        session: AsyncSession,
+        ids: list[UUID],
+        error: str,
+        max_backoff_seconds: float | None = None,
+        commit_self: bool = True,
+    ) -> int:
+        """
+        Count a failed publish attempt on the given events.
+
+        Args:
+            session: Database session.
+            ids: Events whose publish failed.
+            error: Error message to record.
+            max_backoff_seconds: When set, postpone each event's next
+                attempt by ``2 ** attempts`` seconds (before this failure),
+                capped at this value.
+            commit_self: Whether to commit after the operation.
+
+        Returns:
+            The number of rows updated.
+        """
+        try:
+            values = {"attempts": OutboxEvent.attempts + 1, "last_error": error}
+            if max_backoff_seconds is not None:
+                backoff = func.least(
+                    func.power(2, OutboxEvent.attempts), max_backoff_seconds
+                )
+                values["next_attempt_at"] = (
+                    func.now() + literal(timedelta(seconds=1)) * backoff
+                )
+            stmt = update(OutboxEvent).where(OutboxEvent.id.in_(ids)).values(values)
+            result = await session.execute(stmt)
+            if commit_self:
+                await session.commit()
+            return result.rowcount  # type: ignore[return-value]
+        except Exception as e:
+            if commit_self:
+                await session.rollback()
+            raise DatabaseException(
+                f"Error recording outbox publish failure: {e}"
+            ) from e
+
+    async def backlog(self, session: AsyncSession) -> tuple[int, datetime | None]:
+        """
+        Count pending events.
+
+        Returns:
+            ``(pending, oldest_created_at)``; the timestamp is None when
+            nothing is pending.
+        """
+        try:
+            stmt = select(func.count(), func.min(OutboxEvent.created_at)).where(
+                OutboxEvent.published_at.is_(None)
+            )
+            pending, oldest = (await session.execute(stmt)).one()
+            return pending, oldest
+        except Exception as e:
+            raise DatabaseException(f"Error counting outbox backlog: {e}") from e
+
+    async def count_exhausted(self, session: AsyncSession, max_attempts: int) -> int:
+        """
+        Count unpublished events the relay has given up on.
+
+        Returns:
+            The number of pending events with at least ``max_attempts``
+            failed attempts.
+        """
+        try:
+            stmt = select(func.count()).where(
+                OutboxEvent.published_at.is_(None),
+                OutboxEvent.attempts >= max_attempts,
+            )
+            return (await session.execute(stmt)).scalar_one()
+        except Exception as e:
+            raise DatabaseException(
+                f"Error counting exhausted outbox events: {e}"
+            ) from e
+
+    async def purge_published(
+        self,
+        session: AsyncSession,
+        before: datetime,
+        commit_self: bool = True,
+    ) -> int:
+        """
+        Delete events published before ``before``.
+
+        Returns:
+            The number of rows deleted.
+        """
+        try:
+            stmt = delete(OutboxEvent).where(OutboxEvent.published_at < before)
+            result = await session.execute(stmt)
+            if commit_self:
+                await session.commit()
+            return result.rowcount  # type: ignore[return-value]
+        except Exception as e:
+            if commit_self:
+                await session.rollback()
+            raise DatabaseException(
+                f"Error purging published outbox events: {e}"
+            ) from e
+
+
+outbox_event_db = OutboxEventDB()
+
+__all__ = ["OutboxEventDB", "outbox_event_db"]
@@ -5,13 +5,13 @@ CRUD operations for RefreshToken model.
 - Looking up tokens by hash
 - Revoking single tokens
 - Revoking all tokens for a user (sign out all devices)
-- Cleaning up expired tokens
+- Cleaning up expired tokens and purging old cleaned-up rows
 """
 
 from datetime import datetime, timezone
 from uuid import UUID
 
-from sqlalchemy import and_, update
+from sqlalchemy import and_, delete, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -150,6 +150,7 @@ class RefreshTokenDB(BaseDB[RefreshToken]):
         session: AsyncSession,
         user_id: UUID,
         commit_self: bool = True,
+        created_before: datetime | None = None,
     ) -> int:
         """
         Revoke all refresh tokens for a user (sign out all devices).
@@ -158,6 +159,8 @@ class RefreshTokenDB(BaseDB[RefreshToken]):
             session: The database session.
             user_id: The ID of the user whose tokens should be revoked.
             commit_self: Whether to commit the transaction.
+            created_before: If given, only revoke tokens created before it
+                (used when replaying a sign-out recorded elsewhere).
 
         Returns:
             The number of tokens that were revoked.
@@ -168,15 +171,17 @@ class RefreshTokenDB(BaseDB[RefreshToken]):
         """
         now = datetime.now(timezone.utc)
 
+        conditions = [
+            self.model.user_id == user_id,
+            self.model.revoked_at == None,  # noqa: E711
+        ]
+        if created_before is not None:
+            conditions.append(self.model.created_at < created_before)
+
         stmt = (
             update(self.model)
-            .where(
-                and_(
-                    self.model.user_id == user_id,
-                    self.model.revoked_at == None,  # noqa: E711
-                )
-            )
-            .values(revoked_at=now, updated_at=now)
+            .where(and_(*conditions))
+            .values(revoked_at=created_before or now, updated_at=now)
         )
 
         result = await session.execute(stmt)
@@ -231,6 +236,41 @@ class RefreshTokenDB(BaseDB[RefreshToken]):
 
         return result.rowcount  # type: ignore[attr-defined]
 
+    async def purge_deleted(
+        self,
+        session: AsyncSession,
+        deleted_before: datetime,
+        commit_self: bool = True,
+    ) -> int:
+        """
+        Permanently delete tokens soft-deleted before a cutoff.
+
+        Args:
+            session: The database session.
+            deleted_before: Delete rows whose deleted_at is before this.
+            commit_self: Whether to commit the transaction.
+
+        Returns:
+            The number of tokens that were deleted.
+
+        Example:
+            >>> cutoff = datetime.now(timezone.utc) - timedelta(days=30)
+            >>> count = await db.purge_deleted(session, cutoff)
+        """
+        stmt = delete(self.model).where(
+            and_(
+                self.model.is_deleted == True,  # noqa: E712
+                self.model.deleted_at < deleted_before,
+            )
+        )
+
+        result = await session.execute(stmt)
+
+        if commit_self:
+            await session.commit()
+
+        return result.rowcount  # type: ignore[attr-defined]
+
     async def get_active_tokens_for_user(
         self,
         session: AsyncSession,
@@ -8,6 +8,7 @@ from typing import Sequence
 from uuid import UUID
 
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 
@@ -18,6 +19,7 @@ from app.core.db.models.subscription_context import (
     CareerSubscriptionContext,
 )
 from app.core.enums import ProductType, SubscriptionStatus
+from app.core.exceptions.types import DatabaseException
 
 
 class SubscriptionDB(BaseDB[Subscription]):
@@ -241,5 +243,52 @@ class StripeEventLogDB(BaseDB[StripeEventLog]):
             commit_self=commit_self,
         )
 
+    async def record_event(
+        self,
+        session: AsyncSession,
+        event_id: str,
+        event_type: str,
+        commit_self: bool = True,
+    ) -> bool:
+        """
+        Log a Stripe event unless it is already logged.
+
+        Uses ``INSERT ... ON CONFLICT DO NOTHING``, so a concurrent
+        transaction logging the same event blocks until the first one
+        commits or rolls back. Called at the start of the transaction that
+        processes the event, this makes the processing itself run once.
+
+        Args:
+            session: Database session.
+            event_id: Stripe event ID.
+            event_type: Type of event.
+            commit_self: Whether to commit the transaction.
+
+        Returns:
+            True if the event was logged now, False if it already was.
+        """
+        try:
+            stmt = (
+                pg_insert(StripeEventLog)
+                .values(
+                    event_id=event_id,
+                    event_type=event_type,
+                    processed_at=datetime.now(timezone.utc),
+                )
+                .on_conflict_do_nothing(index_elements=["event_id"])
+                .returning(StripeEventLog.id)
+            )
+            result = await session.execute(stmt)
+            inserted = result.scalar_one_or_none() is not None
+            if commit_self:
+                await session.commit()
+            return inserted
+        except Exception as e:
+            if commit_self:
+                await session.rollback()
+            raise DatabaseException(
+                f"Error logging Stripe event {event_id}: {e}"
+            ) from e
+
 
 __all__ = ["SubscriptionDB", "StripeEventLogDB"]
@@ -4,9 +4,10 @@ CRUD operations for subscription context models.
 """
 
 from decimal import Decimal
+from typing import Any, Mapping
 from uuid import UUID
 
-from sqlalchemy import select, update
+from sqlalchemy import column, select, update, values
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 
@@ -17,6 +18,31 @@ from app.core.db.models.subscription_context import (
 )
 
 
+async def _increment_credits_used_by_owner(
+    session: AsyncSession,
+    model: Any,
+    owner_field: str,
+    amounts: Mapping[UUID, Decimal],
+) -> None:
+    """Add per-owner amounts to credits_used with one UPDATE ... FROM VALUES."""
+    amounts = {owner: amount for owner, amount in amounts.items() if amount}
+    if not amounts:
+        return
+    owner_column = getattr(model, owner_field)
+    source = values(
+        column("owner_id", owner_column.type),
+        column("amount", model.credits_used.type),
+        name="credit_increments",
+    ).data(list(amounts.items()))
+    stmt = (
+        update(model)
+        .where(owner_column == source.c.owner_id, model.is_deleted.is_(False))
+        .values(credits_used=model.credits_used + source.c.amount)
+        .execution_options(synchronize_session=False)
+    )
+    await session.execute(stmt)
+
+
 class APISubscriptionContextDB(BaseDB[APISubscriptionContext]):
     """CRUD operations for APISubscriptionContext model."""
 
@@ -102,6 +128,22 @@ class APISubscriptionContextDB(BaseDB[APISubscriptionContext]):
         )
         await session.execute(stmt)
 
+    async def increment_credits_used_many(
+        self,
+        session: AsyncSession,
+        amounts: Mapping[UUID, Decimal],
+    ) -> None:
+        """
+        Atomically increment credits_used for several workspaces at once.
+
+        Args:
+            session: Database session.
+            amounts: Credits to add, keyed by workspace ID.
+        """
+        await _increment_credits_used_by_owner(
+            session, APISubscriptionContext, "workspace_id", amounts
+        )
+
     async def reset_credits_used(
         self,
         session: AsyncSession,
@@ -212,6 +254,22 @@ class CareerSubscriptionContextDB(BaseDB[CareerSubscriptionContext]):
         )
         await session.execute(stmt)
 
+    async def increment_credits_used_many(
+        self,
+        session: AsyncSession,
+        amounts: Mapping[UUID, Decimal],
+    ) -> None:
+        """
+        Atomically increment credits_used for several users at once.
+
+        Args:
+            session: Database session.
+            amounts: Credits to add, keyed by user ID.
+        """
+        await _increment_credits_used_by_owner(
+            session, CareerSubscriptionContext, "user_id", amounts
+        )
+
     async def reset_credits_used(
         self,
         session: AsyncSession,
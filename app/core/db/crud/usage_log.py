@@ -0,0 +1,187 @@
+"""
+Shared CRUD base for usage log tables.
+
+The API (per-workspace) and Career (per-user) products each own a usage
+log model with identical lifecycle columns (status, credits, metrics,
+failure details). The set-based commit path used by the batching usage
+consumer lives here once.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Sequence, TypeVar
+from uuid import UUID
+
+from sqlalchemy import (
+    Boolean,
+    case,
+    cast,
+    column as sa_column,
+    func,
+    values as sa_values,
+)
+from sqlalchemy import update as sa_update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.core.db.crud.base import BaseDB
+from app.core.enums import UsageLogStatus
+from app.core.exceptions.types import DatabaseException
+
+U = TypeVar("U")
+
+# Metric/failure columns set by a commit when the caller reports them.
+_COMMIT_DETAIL_COLUMNS: tuple[str, ...] = (
+    "model_used",
+    "input_tokens",
+    "output_tokens",
+    "latency_ms",
+    "failure_type",
+    "failure_reason",
+)
+
+
+@dataclass(frozen=True)
+class UsageLogCommit:
+    """One requested commit of a pending usage log."""
+
+    usage_log_id: UUID
+    success: bool
+    metrics: dict | None = None
+    failure: dict | None = None
+
+    def detail_values(self) -> dict[str, Any]:
+        """Column values reported by the caller (``None`` = keep stored)."""
+        metrics = self.metrics or {}
+        failure = self.failure or {}
+        return {
+            "model_used": metrics.get("model_used"),
+            "input_tokens": metrics.get("input_tokens"),
+            "output_tokens": metrics.get("output_tokens"),
+            "latency_ms": metrics.get("latency_ms"),
+            "failure_type": failure.get("failure_type"),
+            "failure_reason": failure.get("reason"),
+        }
+
+
+class UsageLogBaseDB(BaseDB[U]):
+    """CRUD operations shared by the API and Career usage log models."""
+
+    async def get_by_ids(
+        self,
+        session: AsyncSession,
+        ids: Sequence[UUID],
+    ) -> dict[UUID, U]:
+        """
+        Load several usage logs in one query.
+
+        Args:
+            session: Database session.
+            ids: Usage log IDs.
+
+        Returns:
+            Mapping of ID to usage log for the IDs that exist.
+        """
+        if not ids:
+            return {}
+        id_column = getattr(self.model, "id")
+        try:
+            result = await session.execute(
+                select(self.model).where(id_column.in_(set(ids)))
+            )
+            return {row.id: row for row in result.scalars().all()}  # type: ignore[attr-defined]
+        except SQLAlchemyError as e:
+            raise DatabaseException(
+                f"Error loading {self.model.__name__} rows: {str(e)}"
+            ) from e
+
+    async def commit_many(
+        self,
+        session: AsyncSession,
+        commits: Sequence[UsageLogCommit],
+    ) -> list[U]:
+        """
+        Commit many pending usage logs with one ``UPDATE ... RETURNING``.
+
+        Applies the same transition as the single-row ``commit``: status
+        becomes SUCCESS/FAILED, ``credits_charged`` is set to the reserved
+        credits on success, and reported metrics/failure details are stored.
+        Only rows still PENDING (and not deleted) are updated, so replays and
+        commits racing the expiry job are no-ops.
+
+        Args:
+            session: Database session (the caller commits).
+            commits: Commits to apply; usage log IDs must be unique.
+
+        Returns:
+            The usage logs that moved out of PENDING, as updated.
+
+        Raises:
+            DatabaseException: If the update fails.
+            ValueError: If a usage log ID appears more than once.
+        """
+        if not commits:
+            return []
+        if len({c.usage_log_id for c in commits}) != len(commits):
+            raise ValueError("commit_many requires unique usage log IDs")
+
+        table = getattr(self.model, "__table__")
+        source = sa_values(
+            sa_column("id", table.c.id.type),
+            sa_column("success", Boolean()),
+            sa_column("status", table.c.status.type),
+            *[sa_column(name, table.c[name].type) for name in _COMMIT_DETAIL_COLUMNS],
+            name="commit_source",
+        ).data(
+            [
+                (
+                    c.usage_log_id,
+                    c.success,
+                    UsageLogStatus.SUCCESS if c.success else UsageLogStatus.FAILED,
+                    *c.detail_values().values(),
+                )
+                for c in commits
+            ]
+        )
+
+        now = datetime.now(timezone.utc)
+        model: Any = self.model
+        stmt = (
+            sa_update(self.model)
+            .where(
+                model.id == source.c.id,
+                model.status == UsageLogStatus.PENDING,
+                model.is_deleted.is_(False),
+            )
+            .values(
+                status=source.c.status,
+                committed_at=now,
+                updated_at=now,
+                credits_charged=case(
+                    (source.c.success, model.credits_reserved),
+                    else_=model.credits_charged,
+                ),
+                # Postgres types an all-NULL VALUES column as text, so cast
+                # the reported details back to the column types
+                **{
+                    name: func.coalesce(
+                        cast(source.c[name], table.c[name].type),
+                        getattr(model, name),
+                    )
+                    for name in _COMMIT_DETAIL_COLUMNS
+                },
+            )
+            .returning(self.model)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        try:
+            result = await session.execute(stmt)
+            return list(result.scalars().all())
+        except SQLAlchemyError as e:
+            raise DatabaseException(
+                f"Error committing {self.model.__name__} rows: {str(e)}"
+            ) from e
+
+
+__all__ = ["UsageLogBaseDB", "UsageLogCommit"]
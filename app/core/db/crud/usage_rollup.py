@@ -0,0 +1,317 @@
+"""
+Shared CRUD base for pre-aggregated usage rollup tables.
+
+The API (per-workspace) and Career (per-user) products each own a rollup
+model; both have identical counter columns and differ only in the owner
+column, so the write and read paths live here once, together with the
+bucketing and latency-histogram helpers used to build each increment.
+"""
+
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Any, Sequence, Type, TypeVar
+from uuid import UUID
+
+from sqlalchemy.dialects.postgresql import array
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.core.db.crud.base import BaseDB
+from app.core.enums import FeatureKey, UsageLogStatus, UsageRollupGranularity
+from app.core.exceptions.types import DatabaseException
+
+R = TypeVar("R")
+
+# Upper bounds (inclusive, in milliseconds) of the latency histogram slots.
+# The histogram stored on each rollup row has one extra trailing slot for
+# latencies above the last bound. Changing these bounds requires a data
+# migration of existing rollup rows.
+LATENCY_HISTOGRAM_BOUNDS_MS: tuple[int, ...] = (
+    50,
+    100,
+    250,
+    500,
+    750,
+    1000,
+    1500,
+    2000,
+    3000,
+    5000,
+    10000,
+    30000,
+    60000,
+)
+LATENCY_HISTOGRAM_SIZE = len(LATENCY_HISTOGRAM_BOUNDS_MS) + 1
+
+# Counter columns that are summed on conflict by the rollup upsert.
+ROLLUP_COUNTER_FIELDS: tuple[str, ...] = (
+    "request_count",
+    "success_count",
+    "failed_count",
+    "credits_charged",
+    "input_tokens",
+    "output_tokens",
+    "latency_ms_sum",
+    "latency_count",
+)
+
+
+def truncate_to_bucket(
+    moment: datetime, granularity: UsageRollupGranularity
+) -> datetime:
+    """
+    Align a timestamp to the start of its UTC hour or day bucket.
+
+    Args:
+        moment: Timestamp to align (naive values are treated as UTC).
+        granularity: Bucket size.
+
+    Returns:
+        The timezone-aware bucket start.
+    """
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    moment = moment.astimezone(timezone.utc)
+    if granularity == UsageRollupGranularity.DAY:
+        return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+def latency_histogram(latency_ms: int | None) -> list[int]:
+    """
+    Build a one-observation latency histogram.
+
+    Args:
+        latency_ms: Observed latency, or ``None`` when not reported.
+
+    Returns:
+        A list of ``LATENCY_HISTOGRAM_SIZE`` slot counts (all zeros when
+        no latency was reported).
+    """
+    histogram = [0] * LATENCY_HISTOGRAM_SIZE
+    if latency_ms is None:
+        return histogram
+    for index, bound in enumerate(LATENCY_HISTOGRAM_BOUNDS_MS):
+        if latency_ms <= bound:
+            histogram[index] += 1
+            return histogram
+    histogram[-1] += 1
+    return histogram
+
+
+def build_rollup_counters(
+    usage_log: Any, credits_charged: Decimal | None
+) -> dict[str, Any]:
+    """
+    Build the rollup increment for one committed usage log.
+
+    Args:
+        usage_log: The usage log (API or Career), already moved out of
+            PENDING.
+        credits_charged: Credits to attribute to the rollup (``None`` or
+            zero for failed requests and test keys).
+
+    Returns:
+        Column values for the rollup upsert (counters + histogram).
+    """
+    succeeded = usage_log.status == UsageLogStatus.SUCCESS
+    latency = usage_log.latency_ms
+    return {
+        "request_count": 1,
+        "success_count": 1 if succeeded else 0,
+        "failed_count": 0 if succeeded else 1,
+        "credits_charged": (credits_charged or Decimal("0")) if succeeded else 0,
+        "input_tokens": usage_log.input_tokens or 0,
+        "output_tokens": usage_log.output_tokens or 0,
+        "latency_ms_sum": latency or 0,
+        "latency_count": 1 if latency is not None else 0,
+        "latency_histogram": latency_histogram(latency),
+    }
+
+
+class UsageRollupDB(BaseDB[R]):
+    """
+    CRUD operations for a usage rollup model.
+
+    Subclasses pass the model and the name of its owner column
+    (``workspace_id`` or ``user_id``).
+    """
+
+    def __init__(self, model: Type[R], owner_field: str):
+        super().__init__(model)
+        self.owner_field = owner_field
+
+    def _merge_histogram(self, excluded: Any) -> Any:
+        """Element-wise sum of the stored and incoming latency histograms."""
+        stored = getattr(self.model, "latency_histogram")
+        return array(
+            [
+                stored[slot] + excluded.latency_histogram[slot]
+                for slot in range(1, LATENCY_HISTOGRAM_SIZE + 1)
+            ]
+        )
+
+    async def record(
+        self,
+        session: AsyncSession,
+        owner_id: UUID,
+        usage_log: Any,
+        credits_charged: Decimal | None,
+        commit_self: bool = False,
+    ) -> None:
+        """
+        Add one committed usage log to the hourly and daily rollups.
+
+        Must only be called for the commit that moves the log out of
+        PENDING; replays of an already-committed log must not call it,
+        otherwise the counters would be incremented twice.
+
+        Args:
+            session: Database session.
+            owner_id: Workspace or user ID the usage belongs to.
+            usage_log: The committed usage log.
+            credits_charged: Credits to attribute (``None``/0 when nothing
+                was charged).
+            commit_self: Whether to commit the transaction.
+
+        Raises:
+            DatabaseException: If an upsert fails.
+        """
+        counters = build_rollup_counters(usage_log, credits_charged)
+        for granularity in UsageRollupGranularity:
+            await self.upsert(
+                session,
+                data={
+                    self.owner_field: owner_id,
+                    "feature_key": usage_log.feature_key,
+                    "granularity": granularity,
+                    "bucket_start": truncate_to_bucket(
+                        usage_log.created_at, granularity
+                    ),
+                    **counters,
+                },
+                unique_fields=[
+                    self.owner_field,
+                    "feature_key",
+                    "granularity",
+                    "bucket_start",
+                ],
+                increment_fields=list(ROLLUP_COUNTER_FIELDS),
+                update_expressions={"latency_histogram": self._merge_histogram},
+                commit_self=False,
+            )
+
+        if commit_self:
+            await session.commit()
+
+    async def record_many(
+        self,
+        session: AsyncSession,
+        entries: Sequence[tuple[UUID, Any, Decimal | None]],
+        commit_self: bool = False,
+    ) -> None:
+        """
+        Add many committed usage logs to the rollups with one upsert.
+
+        Increments for the same owner/feature/bucket are summed in Python
+        first, so the upsert touches each rollup row once. The same
+        only-on-leaving-PENDING rule as ``record`` applies.
+
+        Args:
+            session: Database session.
+            entries: ``(owner_id, usage_log, credits_charged)`` per log.
+            commit_self: Whether to commit the transaction.
+
+        Raises:
+            DatabaseException: If the upsert fails.
+        """
+        unique_fields = [self.owner_field, "feature_key", "granularity", "bucket_start"]
+        rows: dict[tuple, dict[str, Any]] = {}
+        for owner_id, usage_log, credits_charged in entries:
+            counters = build_rollup_counters(usage_log, credits_charged)
+            for granularity in UsageRollupGranularity:
+                key = (
+                    owner_id,
+                    usage_log.feature_key,
+                    granularity,
+                    truncate_to_bucket(usage_log.created_at, granularity),
+                )
+                row = rows.get(key)
+                if row is None:
+                    rows[key] = {**dict(zip(unique_fields, key)), **counters}
+                    continue
+                for field in ROLLUP_COUNTER_FIELDS:
+                    row[field] += counters[field]
+                row["latency_histogram"] = [
+                    stored + added
+                    for stored, added in zip(
+                        row["latency_histogram"], counters["latency_histogram"]
+                    )
+                ]
+
+        if rows:
+            await self.bulk_upsert(
+                session,
+                list(rows.values()),
+                unique_fields=unique_fields,
+                increment_fields=list(ROLLUP_COUNTER_FIELDS),
+                update_expressions={"latency_histogram": self._merge_histogram},
+                commit_self=False,
+            )
+
+        if commit_self:
+            await session.commit()
+
+    async def list_buckets(
+        self,
+        session: AsyncSession,
+        owner_id: UUID,
+        granularity: UsageRollupGranularity,
+        start: datetime,
+        end: datetime,
+        feature_key: FeatureKey | None = None,
+    ) -> Sequence[R]:
+        """
+        Return rollup rows for an owner within ``[start, end)``.
+
+        Args:
+            session: Database session.
+            owner_id: Workspace or user ID.
+            granularity: Bucket size to read.
+            start: Inclusive bucket start lower bound.
+            end: Exclusive bucket start upper bound.
+            feature_key: Optional feature filter.
+
+        Returns:
+            Rollup rows ordered by bucket_start.
+        """
+        bucket_start = getattr(self.model, "bucket_start")
+        stmt = select(self.model).where(
+            getattr(self.model, self.owner_field) == owner_id,
+            getattr(self.model, "granularity") == granularity,
+            bucket_start >= start,
+            bucket_start < end,
+        )
+        if feature_key is not None:
+            stmt = stmt.where(getattr(self.model, "feature_key") == feature_key)
+        stmt = stmt.order_by(bucket_start)
+
+        try:
+            result = await session.execute(stmt)
+            return result.scalars().all()
+        except SQLAlchemyError as e:
+            raise DatabaseException(
+                f"Error listing {self.model.__name__} rows for {owner_id}: {str(e)}"
+            ) from e
+
+
+__all__ = [
+    "LATENCY_HISTOGRAM_BOUNDS_MS",
+    "LATENCY_HISTOGRAM_SIZE",
+    "ROLLUP_COUNTER_FIELDS",
+    "UsageRollupDB",
+    "build_rollup_counters",
+    "latency_histogram",
+    "truncate_to_bucket",
+]
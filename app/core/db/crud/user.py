@@ -1,7 +1,15 @@
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import and_, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.core.db.crud import BaseDB
 from app.core.db.models import OAuthAccount, User
+from app.core.enums import OAuthProviders
+from app.core.exceptions.types import DatabaseException
 
 
 class UserDB(BaseDB[User]):
@@ -9,8 +17,217 @@ class UserDB(BaseDB[User]):
         super().__init__(model=User)
         self.oauth_accounts_loader = selectinload(User.oauth_accounts)
 
+    async def bump_token_version(
+        self, session: AsyncSession, id: UUID, commit_self: bool = True
+    ) -> int | None:
+        """
+        Atomically increment a user's token version.
+
+        Access tokens carry the version they were issued with, so bumping
+        it revokes every access token issued before the change.
+
+        Args:
+            session: The database session.
+            id: The user ID.
+            commit_self: Whether to commit the transaction.
+
+        Returns:
+            The new token version, or None if the user does not exist.
+
+        Raises:
+            DatabaseException: If the update fails.
+        """
+        try:
+            stmt = (
+                update(self.model)
+                .where(self.model.id == id)
+                .values(token_version=self.model.token_version + 1)
+                .returning(self.model.token_version)
+            )
+            result = await session.execute(stmt)
+            version = result.scalar_one_or_none()
+
+            if commit_self:
+                await session.commit()
+            else:
+                await session.flush()
+
+            return version
+        except SQLAlchemyError as e:
+            raise DatabaseException(
+                f"Error bumping token version for User with ID {id}: {str(e)}"
+            ) from e
+
+    async def claim_for_provisioning(
+        self, session: AsyncSession, id: UUID
+    ) -> User | None:
+        """
+        Lock a user that still needs post-signup provisioning.
+
+        The row stays locked until the transaction ends, so concurrent
+        deliveries of the same provisioning job don't both run; a locked
+        row is skipped rather than waited for.
+
+        Args:
+            session: The database session (within a transaction).
+            id: The user ID.
+
+        Returns:
+            The user, or None if they don't exist, are already provisioned
+            or are being provisioned elsewhere.
+
+        Raises:
+            DatabaseException: If the query fails.
+        """
+        try:
+            stmt = (
+                select(self.model)
+                .where(
+                    self.model.id == id,
+                    self.model.provisioned_at.is_(None),
+                    self.model.is_deleted.is_(False),
+                )
+                .with_for_update(skip_locked=True)
+            )
+            return (await session.execute(stmt)).scalar_one_or_none()
+        except SQLAlchemyError as e:
+            raise DatabaseException(
+                f"Error claiming User with ID {id} for provisioning: {str(e)}"
+            ) from e
+
+    async def get_unprovisioned_ids(
+        self,
+        session: AsyncSession,
+        created_before: datetime,
+        limit: int,
+    ) -> list[UUID]:
+        """
+        List verified users still waiting for provisioning.
+
+        Users with the fewest failed sweep attempts come first (oldest first
+        among equals), so users that keep failing don't take every run's
+        batch from the ones behind them.
+
+        Args:
+            session: The database session.
+            created_before: Only users created before this time.
+            limit: Maximum number of IDs to return.
+
+        Returns:
+            The user IDs.
+
+        Raises:
+            DatabaseException: If the query fails.
+        """
+        try:
+            stmt = (
+                select(self.model.id)
+                .where(
+                    self.model.provisioned_at.is_(None),
+                    self.model.email_verified.is_(True),
+                    self.model.is_deleted.is_(False),
+                    self.model.created_at < created_before,
+                )
+                .order_by(self.model.provisioning_attempts, self.model.created_at)
+                .limit(limit)
+            )
+            return list((await session.execute(stmt)).scalars().all())
+        except SQLAlchemyError as e:
+            raise DatabaseException(
+                f"Error listing unprovisioned users: {str(e)}"
+            ) from e
+
+    async def record_provisioning_failure(
+        self, session: AsyncSession, id: UUID, commit_self: bool = True
+    ) -> int | None:
+        """
+        Count a failed provisioning sweep attempt for a user.
+
+        Args:
+            session: The database session.
+            id: The user ID.
+            commit_self: Whether to commit the transaction.
+
+        Returns:
+            The user's new attempt count, or None if they don't exist.
+
+        Raises:
+            DatabaseException: If the update fails.
+        """
+        try:
+            stmt = (
+                update(self.model)
+                .where(self.model.id == id)
+                .values(provisioning_attempts=self.model.provisioning_attempts + 1)
+                .returning(self.model.provisioning_attempts)
+            )
+            result = await session.execute(stmt)
+            attempts = result.scalar_one_or_none()
+
+            if commit_self:
+                await session.commit()
+            else:
+                await session.flush()
+
+            return attempts
+        except SQLAlchemyError as e:
+            raise DatabaseException(
+                f"Error recording provisioning failure for User with ID {id}: {str(e)}"
+            ) from e
+
 
 class OAuthAccountDB(BaseDB[OAuthAccount]):
     def __init__(self):
         super().__init__(model=OAuthAccount)
         self.user_loader = selectinload(OAuthAccount.user)
+
+    async def resolve_user(
+        self,
+        session: AsyncSession,
+        provider: OAuthProviders,
+        provider_account_id: str,
+        email: str,
+    ) -> tuple[User | None, OAuthAccount | None]:
+        """
+        Find the user for an OAuth sign-in, and their link to the account.
+
+        In one query, returns the user linked to the provider account or,
+        failing that, the user with the email (to be linked).
+
+        Args:
+            session: The database session.
+            provider: The OAuth provider.
+            provider_account_id: The user's ID at the provider.
+            email: The email address the provider returned.
+
+        Returns:
+            (user, oauth_account): the linked user and the account, the
+            user with the email and None, or (None, None).
+
+        Raises:
+            DatabaseException: If the query fails.
+        """
+        account_matches = and_(
+            OAuthAccount.provider == provider,
+            OAuthAccount.provider_account_id == provider_account_id,
+        )
+        linked_user_ids = select(OAuthAccount.user_id).where(account_matches)
+        stmt = (
+            select(User, OAuthAccount)
+            .outerjoin(
+                OAuthAccount, and_(OAuthAccount.user_id == User.id, account_matches)
+            )
+            .where(User.id.in_(linked_user_ids) | (User.email == email))
+            # Prefer the linked user over an email match
+            .order_by(OAuthAccount.id.is_(None))
+            .limit(1)
+        )
+        try:
+            row = (await session.execute(stmt)).first()
+        except SQLAlchemyError as e:
+            raise DatabaseException(
+                f"Error resolving OAuth user for {provider.value}: {str(e)}"
+            ) from e
+        if row is None:
+            return None, None
+        return row[0], row[1]
@@ -1,5 +1,6 @@
 from app.core.db.models.dlq_message import DLQMessage
 from app.core.db.models.otp import OTPToken
+from app.core.db.models.outbox_event import OutboxEvent
 from app.core.db.models.plan import Plan, FeatureSchema
 from app.core.db.models.quota import FeatureCostConfig, PlanPricingRule
 from app.core.db.models.refresh_token import RefreshToken
@@ -19,6 +20,7 @@ __all__ = [
     "FeatureSchema",
     "OAuthAccount",
     "OTPToken",
+    "OutboxEvent",
     "Plan",
     "FeatureCostConfig",
     "PlanPricingRule",
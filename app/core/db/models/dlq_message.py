@@ -75,7 +75,11 @@ class DLQMessage(BaseModel):
         comment="Lifecycle status: pending → retried | discarded",
     )
 
-    __table_args__ = (Index("ix_dlq_messages_queue_status", "queue_name", "status"),)
+    __table_args__ = (
+        Index("ix_dlq_messages_queue_status", "queue_name", "status"),
+        # Keyset scans of pending messages in bulk retries
+        Index("ix_dlq_messages_status_created_at", "status", "created_at", "id"),
+    )
 
 
 __all__ = ["DLQMessage"]
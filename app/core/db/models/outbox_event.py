@@ -0,0 +1,95 @@
+"""
+Transactional outbox event model.
+
+Service code that publishes an event while it writes to the database
+adds an outbox row in the same transaction instead of talking to
+RabbitMQ. The outbox relay publishes pending rows and marks them
+published, so an event is delivered if and only if its transaction
+committed.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, Index, Integer, String, Text, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.db.models.base import BaseModel
+
+
+class OutboxEvent(BaseModel):
+    """
+    Event waiting to be (or already) published to the message broker.
+
+    Attributes:
+        queue_name: Destination queue.
+        payload: Event body (JSON-serialisable).
+        headers: Message headers to publish with the event.
+        attempts: Number of failed publish attempts; the relay skips
+            events that reach ``OUTBOX_RELAY_MAX_ATTEMPTS``.
+        last_error: Error from the most recent failed attempt.
+        next_attempt_at: Earliest time of the next publish attempt after a
+            failure (exponential backoff); NULL when due now.
+        published_at: When the broker confirmed the event; NULL while
+            the event is pending.
+    """
+
+    __tablename__ = "outbox_events"
+
+    queue_name: Mapped[str] = mapped_column(
+        String(255),
+        nullable=False,
+        comment="Destination queue",
+    )
+
+    payload: Mapped[dict] = mapped_column(
+        JSONB,
+        nullable=False,
+        comment="Event body",
+    )
+
+    headers: Mapped[dict | None] = mapped_column(
+        JSONB,
+        nullable=True,
+        comment="Message headers",
+    )
+
+    attempts: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        comment="Number of failed publish attempts",
+    )
+
+    last_error: Mapped[str | None] = mapped_column(
+        Text,
+        nullable=True,
+        comment="Error from the most recent failed publish attempt",
+    )
+
+    next_attempt_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+        comment="Earliest time of the next publish attempt (NULL: due now)",
+    )
+
+    published_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+        comment="When the broker confirmed the event (NULL while pending)",
+    )
+
+    __table_args__ = (
+        # The relay only ever scans pending rows, oldest first
+        Index(
+            "ix_outbox_events_pending",
+            "created_at",
+            "id",
+            postgresql_where=text("published_at IS NULL"),
+        ),
+        # Purging published rows past the retention window
+        Index("ix_outbox_events_published_at", "published_at"),
+    )
+
+
+__all__ = ["OutboxEvent"]
@@ -1,7 +1,17 @@
+from datetime import datetime
 from typing import TYPE_CHECKING
 from uuid import UUID
 
-from sqlalchemy import Boolean, Enum, ForeignKey, String
+from sqlalchemy import (
+    Boolean,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    text,
+)
 from sqlalchemy.ext.associationproxy import AssociationProxy, association_proxy
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -51,6 +61,14 @@ class User(BaseModel):
         nullable=False,
     )
 
+    token_version: Mapped[int] = mapped_column(
+        Integer,
+        default=0,
+        server_default="0",
+        nullable=False,
+        comment="Bumped to revoke every access token issued before the change",
+    )
+
     stripe_customer_id: Mapped[str | None] = mapped_column(
         String(128),
         unique=True,
@@ -59,6 +77,20 @@ class User(BaseModel):
         comment="Stripe Customer ID for billing across all products",
     )
 
+    provisioned_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+        comment="When post-signup provisioning (workspace, subscriptions) finished",
+    )
+
+    provisioning_attempts: Mapped[int] = mapped_column(
+        Integer,
+        default=0,
+        server_default="0",
+        nullable=False,
+        comment="Failed provisioning sweep attempts",
+    )
+
     oauth_accounts: Mapped[list["OAuthAccount"]] = relationship(
         "OAuthAccount",
         back_populates="user",
@@ -88,6 +120,16 @@ class User(BaseModel):
         "subscription",
     )
 
+    __table_args__ = (
+        # Users still waiting for provisioning, least attempted then oldest
+        Index(
+            "ix_users_unprovisioned",
+            "provisioning_attempts",
+            "created_at",
+            postgresql_where=text("provisioned_at IS NULL"),
+        ),
+    )
+
 
 class OAuthAccount(BaseModel):
     __tablename__ = "oauth_accounts"
@@ -115,3 +157,12 @@ class OAuthAccount(BaseModel):
         "User",
         back_populates="oauth_accounts",
     )
+
+    __table_args__ = (
+        # OAuth sign-in looks accounts up by provider identity
+        Index(
+            "ix_oauth_accounts_provider_account",
+            "provider",
+            "provider_account_id",
+        ),
+    )
@@ -0,0 +1,242 @@
+"""
+Connection pool configuration, instrumentation and liveness checking.
+
+Every engine is built from the pool profile of the current process role
+(``PROCESS_ROLE``/``DB_POOL_PROFILES``), so the web app, the message
+consumer and the scheduler each size their pools independently.
+
+Instead of ``pool_pre_ping`` - one extra round trip on *every* checkout -
+a ``PoolLivenessMonitor`` runs ``SELECT 1`` per engine in the background.
+When the check fails the engine's pool is disposed, so the idle
+connections that died with the server are replaced on their next
+checkout rather than surfacing as errors in requests. ``DB_POOL_PRE_PING``
+re-enables per-checkout pre-ping for environments that need it.
+
+Pool events (connect/checkout/checkin/invalidate) are counted per engine
+and reported by ``pool_stats`` together with the live pool counters.
+"""
+
+import asyncio
+from dataclasses import asdict, dataclass
+from time import monotonic
+from typing import Any
+from uuid import uuid4
+from weakref import WeakKeyDictionary
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import QueuePool
+
+from app.core.config import DatabasePoolProfile, database_logger
+
+
+def _unique_statement_name() -> str:
+    return f"__asyncpg_{uuid4()}__"
+
+
+def engine_options(
+    profile: DatabasePoolProfile,
+    statement_cache_size: int,
+    pgbouncer_transaction_mode: bool = False,
+    pre_ping: bool = False,
+) -> dict[str, Any]:
+    """
+    Build ``create_async_engine`` keyword arguments for a pool profile.
+
+    Args:
+        profile: Pool sizing for the current process role.
+        statement_cache_size: Prepared statements cached per connection,
+            applied to both asyncpg's cache and SQLAlchemy's asyncpg
+            dialect cache.
+        pgbouncer_transaction_mode: Disable prepared statement caching and
+            use unique statement names, as required by PgBouncer in
+            transaction pooling mode.
+        pre_ping: Ping each connection on checkout.
+
+    Returns:
+        Keyword arguments for ``create_async_engine``.
+    """
+    if pgbouncer_transaction_mode:
+        connect_args: dict[str, Any] = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": _unique_statement_name,
+        }
+    else:
+        connect_args = {
+            "statement_cache_size": statement_cache_size,
+            "prepared_statement_cache_size": statement_cache_size,
+        }
+    return {
+        "pool_size": profile.pool_size,
+        "max_overflow": profile.max_overflow,
+        "pool_timeout": profile.pool_timeout,
+        "pool_recycle": profile.pool_recycle,
+        "pool_pre_ping": pre_ping,
+        "connect_args": connect_args,
+    }
+
+
+@dataclass
+class PoolCounters:
+    """Pool event counters and liveness state for one engine."""
+
+    connects: int = 0
+    checkouts: int = 0
+    checkins: int = 0
+    invalidations: int = 0
+    hold_ms_total: float = 0.0
+    hold_ms_max: float = 0.0
+    liveness_ok: bool | None = None
+    liveness_checked_at: float | None = None
+    liveness_latency_ms: float | None = None
+    liveness_failures: int = 0
+
+
+_counters: WeakKeyDictionary[Engine, PoolCounters] = WeakKeyDictionary()
+
+
+def instrument_engine(engine: AsyncEngine) -> PoolCounters:
+    """
+    Attach pool event counters to an engine (idempotent).
+
+    The listeners are registered on the engine, so they survive
+    ``engine.dispose()`` recreating the pool.
+
+    Args:
+        engine: Engine to instrument.
+
+    Returns:
+        The engine's counters.
+    """
+    sync_engine = engine.sync_engine
+    counters = _counters.get(sync_engine)
+    if counters is not None:
+        return counters
+    counters = _counters[sync_engine] = PoolCounters()
+
+    @event.listens_for(sync_engine, "connect")
+    def _on_connect(dbapi_connection: Any, record: Any) -> None:
+        counters.connects += 1
+
+    @event.listens_for(sync_engine, "checkout")
+    def _on_checkout(dbapi_connection: Any, record: Any, proxy: Any) -> None:
+        counters.checkouts += 1
+        record.info["checked_out_at"] = monotonic()
+
+    @event.listens_for(sync_engine, "checkin")
+    def _on_checkin(dbapi_connection: Any, record: Any) -> None:
+        counters.checkins += 1
+        checked_out_at = record.info.pop("checked_out_at", None)
+        if checked_out_at is not None:
+            held_ms = (monotonic() - checked_out_at) * 1000
+            counters.hold_ms_total += held_ms
+            counters.hold_ms_max = max(counters.hold_ms_max, held_ms)
+
+    @event.listens_for(sync_engine, "invalidate")
+    def _on_invalidate(dbapi_connection: Any, record: Any, exception: Any) -> None:
+        counters.invalidations += 1
+
+    return counters
+
+
+def pool_stats(engine: AsyncEngine) -> dict[str, Any]:
+    """
+    Live pool counters plus event counters for an engine.
+
+    Args:
+        engine: Engine to report on.
+
+    Returns:
+        Pool class, size/checked-in/checked-out/overflow (QueuePool only)
+        and, for instrumented engines, the event and liveness counters.
+    """
+    pool = engine.pool
+    stats: dict[str, Any] = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+        )
+    counters = _counters.get(engine.sync_engine)
+    if counters is not None:
+        stats.update(asdict(counters))
+        stats["hold_ms_avg"] = (
+            counters.hold_ms_total / counters.checkins if counters.checkins else None
+        )
+    return stats
+
+
+class PoolLivenessMonitor:
+    """
+    Periodically checks that each engine can reach its database.
+
+    A failed check disposes the engine's pool so stale connections are
+    dropped before a request checks them out.
+    """
+
+    def __init__(self, engines: dict[str, AsyncEngine]):
+        self.engines = engines
+        self._task: asyncio.Task | None = None
+
+    async def check_engine(self, name: str, engine: AsyncEngine) -> bool:
+        """Run ``SELECT 1`` on one engine, disposing its pool on failure."""
+        counters = instrument_engine(engine)
+        started = monotonic()
+        try:
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+        except Exception as e:
+            if counters.liveness_ok is not False:
+                database_logger.warning(
+                    f"Database liveness check failed for {name}, "
+                    f"disposing pool: {e}"
+                )
+            counters.liveness_ok = False
+            counters.liveness_failures += 1
+            await engine.dispose()
+        else:
+            if counters.liveness_ok is False:
+                database_logger.info(f"Database liveness restored for {name}")
+            counters.liveness_ok = True
+            counters.liveness_latency_ms = (monotonic() - started) * 1000
+        counters.liveness_checked_at = monotonic()
+        return bool(counters.liveness_ok)
+
+    async def check_all(self) -> None:
+        """Check every engine concurrently."""
+        await asyncio.gather(
+            *(self.check_engine(name, engine) for name, engine in self.engines.items())
+        )
+
+    async def _run(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            await self.check_all()
+
+    def start(self, interval: float) -> None:
+        """Start the background liveness check."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(interval))
+
+    async def stop(self) -> None:
+        """Stop the background liveness check."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+__all__ = [
+    "PoolCounters",
+    "PoolLivenessMonitor",
+    "engine_options",
+    "instrument_engine",
+    "pool_stats",
+]
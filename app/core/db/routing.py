@@ -0,0 +1,236 @@
+"""
+Primary/replica routing for async sessions.
+
+Sessions created from ``ReadSessionLocal`` (or the ``get_read_session``
+dependency) send plain SELECTs to a healthy read replica and everything
+else to the primary:
+
+- Only a ``Select`` without a row lock is read from a replica. DML,
+  ``SELECT ... FOR UPDATE``, raw ``text()`` statements and flushes always
+  use the primary.
+- Once anything has been written in the current request (asyncio task),
+  every later statement in that request - from any session - is pinned to
+  the primary, so a request always reads its own writes.
+- A background monitor measures each replica's replay lag; replicas lagging
+  more than ``DATABASE_REPLICA_MAX_LAG_SECONDS`` (or unreachable) are skipped
+  until they catch up, falling back to the primary when none is usable.
+
+With no ``DATABASE_REPLICA_URLS`` configured every statement goes to the
+primary, so read sessions behave exactly like ``AsyncSessionLocal``.
+"""
+
+import asyncio
+import itertools
+from contextvars import ContextVar
+from dataclasses import dataclass
+from time import monotonic
+from typing import Any
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from app.core.config import database_logger, settings
+from app.core.db.config import async_engine, replica_engines
+from app.core.db.pool import pool_stats
+
+# Replay lag in seconds; 0 on a primary or a replica that has replayed
+# everything it received (an idle primary must not look like lag).
+_REPLICA_LAG_SQL = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(
+            EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0
+        )
+    END
+    """)
+
+# Set once the current request (asyncio task) has written to the primary.
+_primary_pinned: ContextVar[bool] = ContextVar("db_primary_pinned", default=False)
+
+
+def pin_to_primary() -> None:
+    """Route every remaining statement of the current request to the primary."""
+    _primary_pinned.set(True)
+
+
+def is_pinned_to_primary() -> bool:
+    """Whether the current request has been pinned to the primary."""
+    return _primary_pinned.get()
+
+
+@dataclass
+class ReplicaState:
+    """Health of one read replica as last measured by the lag monitor."""
+
+    name: str
+    engine: AsyncEngine
+    healthy: bool = False
+    lag_seconds: float | None = None
+    checked_at: float | None = None
+    reads_routed: int = 0
+
+
+class DatabaseRouter:
+    """
+    Chooses the engine for read statements and tracks replica health.
+
+    Replicas start out unhealthy and are only used after the first
+    successful lag check, so a cold start never reads from a replica
+    whose state is unknown.
+    """
+
+    def __init__(
+        self,
+        primary: AsyncEngine,
+        replicas: list[AsyncEngine],
+        max_lag_seconds: float,
+    ):
+        self.primary = primary
+        self.replicas = [
+            ReplicaState(name=f"replica-{index}", engine=engine)
+            for index, engine in enumerate(replicas)
+        ]
+        self.max_lag_seconds = max_lag_seconds
+        self.primary_reads_routed = 0
+        self._round_robin = itertools.cycle(range(len(self.replicas) or 1))
+        self._monitor_task: asyncio.Task | None = None
+
+    def read_engine(self) -> AsyncEngine:
+        """Return the engine for the next read (a healthy replica or the primary)."""
+        if not is_pinned_to_primary():
+            for _ in range(len(self.replicas)):
+                replica = self.replicas[next(self._round_robin)]
+                if replica.healthy:
+                    replica.reads_routed += 1
+                    return replica.engine
+        self.primary_reads_routed += 1
+        return self.primary
+
+    async def check_replica(self, replica: ReplicaState) -> None:
+        """Measure one replica's lag and update its health."""
+        try:
+            async with replica.engine.connect() as conn:
+                lag = float((await conn.execute(_REPLICA_LAG_SQL)).scalar_one())
+        except Exception as e:
+            if replica.healthy:
+                database_logger.warning(
+                    f"Read replica {replica.name} unreachable, using primary: {e}"
+                )
+            replica.healthy = False
+            replica.lag_seconds = None
+        else:
+            healthy = lag <= self.max_lag_seconds
+            if replica.healthy and not healthy:
+                database_logger.warning(
+                    f"Read replica {replica.name} lagging {lag:.1f}s, using primary"
+                )
+            replica.healthy = healthy
+            replica.lag_seconds = lag
+        replica.checked_at = monotonic()
+
+    async def check_replicas(self) -> None:
+        """Measure the lag of every replica concurrently."""
+        await asyncio.gather(*(self.check_replica(r) for r in self.replicas))
+
+    async def _monitor(self, interval: float) -> None:
+        while True:
+            await self.check_replicas()
+            await asyncio.sleep(interval)
+
+    def start_lag_monitor(self, interval: float) -> None:
+        """Start the background lag monitor (no-op without replicas)."""
+        if self.replicas and self._monitor_task is None:
+            self._monitor_task = asyncio.create_task(self._monitor(interval))
+
+    async def stop_lag_monitor(self) -> None:
+        """Stop the background lag monitor."""
+        if self._monitor_task is not None:
+            self._monitor_task.cancel()
+            try:
+                await self._monitor_task
+            except asyncio.CancelledError:
+                pass
+            self._monitor_task = None
+
+    def pool_metrics(self) -> dict[str, dict[str, Any]]:
+        """
+        Connection pool statistics per engine.
+
+        Returns:
+            Mapping of engine name (``primary``, ``replica-N``) to pool
+            counters, plus routing/health information for replicas.
+        """
+        metrics = {
+            "primary": {
+                **pool_stats(self.primary),
+                "reads_routed": self.primary_reads_routed,
+            }
+        }
+        for replica in self.replicas:
+            metrics[replica.name] = {
+                **pool_stats(replica.engine),
+                "reads_routed": replica.reads_routed,
+                "healthy": replica.healthy,
+                "lag_seconds": replica.lag_seconds,
+            }
+        return metrics
+
+
+db_router = DatabaseRouter(
+    async_engine,
+    replica_engines,
+    max_lag_seconds=settings.DATABASE_REPLICA_MAX_LAG_SECONDS,
+)
+
+
+class RoutingSession(Session):
+    """Session that sends unlocked SELECTs to ``db_router.read_engine()``."""
+
+    def get_bind(self, mapper=None, clause=None, **kw) -> Engine:  # type: ignore[override]
+        if (
+            self._flushing
+            or is_pinned_to_primary()
+            or not isinstance(clause, Select)
+            or clause._for_update_arg is not None
+        ):
+            return db_router.primary.sync_engine
+        # Stay on one replica for the whole session (one connection per bind)
+        engine = self.info.get("read_engine")
+        if engine is None:
+            engine = self.info["read_engine"] = db_router.read_engine()
+        return engine.sync_engine
+
+
+@event.listens_for(Session, "after_flush")
+def _pin_after_flush(session: Session, flush_context: Any) -> None:
+    pin_to_primary()
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _pin_after_dml(orm_execute_state: Any) -> None:
+    # Anything but a SELECT (DML or raw text) may have written
+    if not orm_execute_state.is_select:
+        pin_to_primary()
+
+
+ReadSessionLocal = async_sessionmaker(
+    sync_session_class=RoutingSession,
+    autoflush=False,
+    expire_on_commit=False,
+    autobegin=True,
+)
+
+
+__all__ = [
+    "DatabaseRouter",
+    "ReadSessionLocal",
+    "ReplicaState",
+    "RoutingSession",
+    "db_router",
+    "is_pinned_to_primary",
+    "pin_to_primary",
+]
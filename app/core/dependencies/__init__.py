@@ -8,14 +8,18 @@ from app.core.dependencies.auth import (
     get_current_active_user,
     get_current_verified_user,
     get_optional_user,
+    get_current_principal,
+    get_current_active_principal,
     CurrentUser,
     CurrentActiveUser,
     CurrentVerifiedUser,
     OptionalUser,
+    CurrentPrincipal,
+    CurrentActivePrincipal,
     bearer_scheme,
     optional_bearer_scheme,
 )
-from app.core.dependencies.db import get_async_session
+from app.core.dependencies.db import get_async_session, get_read_session
 from app.core.dependencies.internal import (
     verify_internal_api_key,
     InternalAPIKeyDep,
@@ -27,10 +31,14 @@ __all__ = [
     "get_current_active_user",
     "get_current_verified_user",
     "get_optional_user",
+    "get_current_principal",
+    "get_current_active_principal",
     "CurrentUser",
     "CurrentActiveUser",
     "CurrentVerifiedUser",
     "OptionalUser",
+    "CurrentPrincipal",
+    "CurrentActivePrincipal",
     "bearer_scheme",
     "optional_bearer_scheme",
     # Dependency functions
@@ -40,4 +48,5 @@ __all__ = [
     # Exceptions
     "InvalidInternalAPIKeyException",
     "get_async_session",
+    "get_read_session",
 ]
@@ -3,6 +3,7 @@ Authentication dependencies for FastAPI endpoints.
 
 - Extracting and validating JWT access tokens from requests
 - Getting the current authenticated user
+- Getting the current principal (cached snapshot, no per-request DB read)
 - Ensuring user is active and verified
 - Optional authentication for public endpoints
 
@@ -13,6 +14,11 @@ Example usage:
     async def get_profile(user: User = Depends(get_current_active_user)):
         return user
 
+    @router.get("/workspaces")
+    async def list_workspaces(principal: CurrentActivePrincipal):
+        # Only the user's id and flags are needed: served from the cache
+        return await list_for_user(principal.id)
+
     @router.get("/public")
     async def public_endpoint(user: User | None = Depends(get_optional_user)):
         if user:
@@ -32,6 +38,8 @@ from app.core.config import auth_logger
 from app.core.db.crud import user_db
 from app.core.db.models import User
 from app.core.exceptions.types import AuthenticationException, ForbiddenException
+from app.core.services.redis_service import RedisService
+from app.core.services.user_cache import UserSnapshot, user_cache
 from app.core.utils import decode_jwt_token
 
 # Security scheme for Bearer token authentication
@@ -40,6 +48,43 @@ bearer_scheme = HTTPBearer(auto_error=True)
 optional_bearer_scheme = HTTPBearer(auto_error=False)
 
 
+def _decode_access_token(token: str) -> tuple[UUID, dict]:
+    """Decode an access token into the user ID and claims, or raise 401."""
+    payload = decode_jwt_token(token)
+
+    if payload is None:
+        auth_logger.warning("Authentication failed: invalid or expired token")
+        raise AuthenticationException("Invalid or expired access token")
+
+    user_id_str = payload.get("sub")
+    if not user_id_str:
+        auth_logger.warning("Authentication failed: token missing 'sub' claim")
+        raise AuthenticationException("Invalid access token")
+
+    token_type = payload.get("type")
+    if token_type != "access":
+        auth_logger.warning(f"Authentication failed: wrong token type '{token_type}'")
+        raise AuthenticationException("Invalid access token")
+
+    try:
+        user_id = UUID(user_id_str)
+    except ValueError:
+        auth_logger.warning(
+            f"Authentication failed: invalid user ID format '{user_id_str}'"
+        )
+        raise AuthenticationException("Invalid access token")
+
+    return user_id, payload
+
+
+def _check_token_version(user_id: UUID, payload: dict, current_version: int) -> None:
+    """Reject tokens issued before the user's last revocation."""
+    token_version = payload.get("ver", 0)
+    if not isinstance(token_version, int) or token_version < current_version:
+        auth_logger.warning(f"Authentication failed: token revoked for {user_id}")
+        raise AuthenticationException("Access token has been revoked")
+
+
 async def get_current_user(
     credentials: Annotated[HTTPAuthorizationCredentials, Depends(bearer_scheme)],
     session: Annotated[AsyncSession, Depends(get_async_session)],
@@ -68,32 +113,7 @@ async def get_current_user(
         async def protected_route(user: User = Depends(get_current_user)):
             return {"user_id": str(user.id)}
     """
-    token = credentials.credentials
-
-    # Decode and validate the token
-    payload = decode_jwt_token(token)
-
-    if payload is None:
-        auth_logger.warning("Authentication failed: invalid or expired token")
-        raise AuthenticationException("Invalid or expired access token")
-
-    user_id_str = payload.get("sub")
-    if not user_id_str:
-        auth_logger.warning("Authentication failed: token missing 'sub' claim")
-        raise AuthenticationException("Invalid access token")
-
-    token_type = payload.get("type")
-    if token_type != "access":
-        auth_logger.warning(f"Authentication failed: wrong token type '{token_type}'")
-        raise AuthenticationException("Invalid access token")
-
-    try:
-        user_id = UUID(user_id_str)
-    except ValueError:
-        auth_logger.warning(
-            f"Authentication failed: invalid user ID format '{user_id_str}'"
-        )
-        raise AuthenticationException("Invalid access token")
+    user_id, payload = _decode_access_token(credentials.credentials)
 
     # Fetch user from database (use transaction to avoid leaving implicit transaction open)
     async with session.begin():
@@ -107,10 +127,100 @@ async def get_current_user(
         auth_logger.warning(f"Authentication failed: user deleted {user_id}")
         raise AuthenticationException("User account has been deleted")
 
+    _check_token_version(user_id, payload, user.token_version or 0)
+
     auth_logger.debug(f"User authenticated: {user.email}")
     return user
 
 
+async def get_current_principal(
+    credentials: Annotated[HTTPAuthorizationCredentials, Depends(bearer_scheme)],
+    session: Annotated[AsyncSession, Depends(get_async_session)],
+) -> UserSnapshot:
+    """
+    Authenticate the request without loading the full user row.
+
+    Use this instead of ``get_current_user`` when an endpoint only needs
+    the user's id and account flags. The principal comes from:
+
+    1. The token itself, when it carries signed ``act``/``evf`` claims
+       (``AUTH_ACCESS_TOKEN_CLAIMS``) and Redis is available to check the
+       token version against the last revocation - no database read.
+    2. Otherwise the user snapshot cache (in-process, then Redis), which
+       reads the user only on a miss.
+
+    Args:
+        credentials: The HTTP Bearer credentials containing the access token.
+        session: The database session (used on a cache miss).
+
+    Returns:
+        UserSnapshot: The authenticated principal.
+
+    Raises:
+        AuthenticationException: 401 if the token is invalid, expired or
+            revoked, or the user no longer exists.
+
+    Example:
+        @router.get("/items")
+        async def list_items(principal: CurrentPrincipal):
+            return {"user_id": str(principal.id)}
+    """
+    user_id, payload = _decode_access_token(credentials.credentials)
+    token_version = payload.get("ver", 0)
+
+    # Signed claims are only trusted while revocations can be checked
+    has_claims = payload.get("act") is True and isinstance(payload.get("evf"), bool)
+    if has_claims and RedisService.is_connected():
+        revoked_version = await user_cache.revoked_token_version(user_id)
+        if revoked_version is not None:
+            _check_token_version(user_id, payload, revoked_version)
+        return UserSnapshot(
+            id=user_id,
+            email=payload.get("email", ""),
+            is_active=True,
+            email_verified=payload["evf"],
+            token_version=token_version,
+        )
+
+    snapshot = await user_cache.get(session, user_id)
+
+    if snapshot is None:
+        auth_logger.warning(f"Authentication failed: user not found {user_id}")
+        raise AuthenticationException("User not found")
+
+    if snapshot.is_deleted:
+        auth_logger.warning(f"Authentication failed: user deleted {user_id}")
+        raise AuthenticationException("User account has been deleted")
+
+    _check_token_version(user_id, payload, snapshot.token_version)
+
+    return snapshot
+
+
+async def get_current_active_principal(
+    principal: Annotated[UserSnapshot, Depends(get_current_principal)],
+) -> UserSnapshot:
+    """
+    Ensure the current principal's account is active.
+
+    The principal counterpart of ``get_current_active_user``.
+
+    Args:
+        principal: The authenticated principal.
+
+    Returns:
+        UserSnapshot: The authenticated and active principal.
+
+    Raises:
+        ForbiddenException: 403 if the user account is deactivated.
+    """
+    if not principal.is_active:
+        auth_logger.warning(f"Access denied: user deactivated {principal.email}")
+        raise ForbiddenException("User account is deactivated")
+
+    return principal
+
+
 async def get_current_active_user(
     user: Annotated[User, Depends(get_current_user)],
 ) -> User:
@@ -231,6 +341,10 @@ async def get_optional_user(
     if user is None or user.is_deleted or not user.is_active:
         return None
 
+    token_version = payload.get("ver", 0)
+    if not isinstance(token_version, int) or token_version < (user.token_version or 0):
+        return None
+
     return user
 
 
@@ -239,6 +353,8 @@ CurrentUser = Annotated[User, Depends(get_current_user)]
 CurrentActiveUser = Annotated[User, Depends(get_current_active_user)]
 CurrentVerifiedUser = Annotated[User, Depends(get_current_verified_user)]
 OptionalUser = Annotated[User | None, Depends(get_optional_user)]
+CurrentPrincipal = Annotated[UserSnapshot, Depends(get_current_principal)]
+CurrentActivePrincipal = Annotated[UserSnapshot, Depends(get_current_active_principal)]
 
 
 __all__ = [
@@ -246,10 +362,14 @@ __all__ = [
     "get_current_active_user",
     "get_current_verified_user",
     "get_optional_user",
+    "get_current_principal",
+    "get_current_active_principal",
     "CurrentUser",
     "CurrentActiveUser",
     "CurrentVerifiedUser",
     "OptionalUser",
+    "CurrentPrincipal",
+    "CurrentActivePrincipal",
     "bearer_scheme",
     "optional_bearer_scheme",
 ]
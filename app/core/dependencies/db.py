@@ -1,7 +1,7 @@
 from typing import AsyncGenerator
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.db import AsyncSessionLocal
+from app.core.db import AsyncSessionLocal, ReadSessionLocal
 
 
 async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
@@ -14,3 +14,17 @@ async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
     """
     async with AsyncSessionLocal() as async_session:
         yield async_session
+
+
+async def get_read_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Asynchronous generator function that returns a replica-routed async session.
+    Read-only statements go to a healthy read replica (or the primary when none
+    is available); writes, and every statement after a write in the same
+    request, go to the primary.
+
+    Yields:
+        async_session: An async session object.
+    """
+    async with ReadSessionLocal() as async_session:
+        yield async_session
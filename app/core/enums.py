@@ -114,6 +114,13 @@ class UsageLogStatus(str, Enum):
     EXPIRED = "expired"  # Pending too long, expired by scheduler
 
 
+class UsageRollupGranularity(str, Enum):
+    """Time bucket size of a pre-aggregated usage rollup row."""
+
+    HOUR = "hour"
+    DAY = "day"
+
+
 class FailureType(str, Enum):
     """Type of failure for API usage tracking.
 
@@ -178,6 +185,7 @@ __all__ = [
     "SalesRequestStatus",
     "SubscriptionStatus",
     "UsageLogStatus",
+    "UsageRollupGranularity",
     "WorkspaceStatus",
     "FeatureKey",
 ]
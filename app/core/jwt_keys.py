@@ -0,0 +1,218 @@
+"""
+JWT signing keys.
+
+Access tokens are signed with ``JWT_ALGORITHM``:
+
+- ``HS256`` (default): the shared ``JWT_SECRET_KEY``. Only this app can
+  verify tokens, and no keys are published.
+- ``EdDSA`` (Ed25519) or ``ES256`` (P-256): the private key
+  ``JWT_SIGNING_KEYS[JWT_ACTIVE_KID]``. Tokens carry its ``kid`` header, and
+  the public keys are published at ``/.well-known/jwks.json`` so other
+  services (the developer API edge, AI tool servers) can verify tokens
+  locally.
+
+``JWTKeySet`` parses every PEM once and keeps the key objects by ``kid``,
+so verifying a token is a dict lookup plus the signature check.
+
+Rotating keys:
+
+1. Add the new private key to ``JWT_SIGNING_KEYS``. It is published in the
+   JWKS but does not sign yet. Wait at least ``JWT_JWKS_MAX_AGE_SECONDS``
+   so verifiers pick it up.
+2. Point ``JWT_ACTIVE_KID`` at the new key.
+3. Once tokens signed with the old key have expired
+   (``ACCESS_TOKEN_EXPIRE_MINUTES``), move the old key to
+   ``JWT_VERIFICATION_KEYS`` (its public half) or drop it.
+"""
+
+import hashlib
+from typing import Any
+
+import jwt
+import orjson
+from jwt.algorithms import get_default_algorithms
+
+from app.core.config import settings, utils_logger
+
+ASYMMETRIC_ALGORITHMS = ("EdDSA", "ES256")
+
+
+class JWTKeySet:
+    """
+    Parsed signing and verification keys for one JWT algorithm.
+
+    Attributes:
+        algorithm: JWT algorithm every key in the set uses.
+        active_kid: Key ID used to sign new tokens (None for HS256).
+        jwks: JSON Web Key Set of the public keys.
+        jwks_json: ``jwks`` serialized once, for the JWKS endpoint.
+        jwks_etag: ETag of ``jwks_json``.
+    """
+
+    def __init__(
+        self,
+        algorithm: str,
+        secret: str = "",
+        signing_keys: dict[str, str] | None = None,
+        verification_keys: dict[str, str] | None = None,
+        active_kid: str = "",
+    ):
+        """
+        Parse the configured keys.
+
+        Args:
+            algorithm: ``HS256``, ``EdDSA`` or ``ES256``.
+            secret: Shared secret, used only with ``HS256``.
+            signing_keys: Private keys (PEM) by key ID.
+            verification_keys: Public keys (PEM) by key ID for retired keys.
+            active_kid: Key ID in ``signing_keys`` that signs new tokens.
+
+        Raises:
+            ValueError: If the algorithm is unsupported, a key does not
+                parse for it, or ``active_kid`` is not a signing key.
+        """
+        self.algorithm = algorithm
+        self._secret = secret
+        self._private_keys: dict[str, Any] = {}
+        self._public_keys: dict[str, Any] = {}
+        self.active_kid: str | None = None
+
+        if algorithm == "HS256":
+            self.jwks: dict[str, list[dict[str, Any]]] = {"keys": []}
+        elif algorithm in ASYMMETRIC_ALGORITHMS:
+            alg = get_default_algorithms()[algorithm]
+            for kid, pem in (signing_keys or {}).items():
+                private_key = self._prepare(algorithm, alg, kid, pem)
+                if not hasattr(private_key, "sign"):
+                    raise ValueError(f"JWT signing key '{kid}' is not a private key")
+                self._private_keys[kid] = private_key
+                self._public_keys[kid] = private_key.public_key()
+            for kid, pem in (verification_keys or {}).items():
+                public_key = self._prepare(algorithm, alg, kid, pem)
+                self._public_keys.setdefault(
+                    kid,
+                    (
+                        public_key.public_key()
+                        if hasattr(public_key, "sign")
+                        else public_key
+                    ),
+                )
+            if active_kid not in self._private_keys:
+                raise ValueError(
+                    f"JWT_ACTIVE_KID '{active_kid}' is not one of JWT_SIGNING_KEYS"
+                )
+            self.active_kid = active_kid
+            self.jwks = {
+                "keys": [
+                    {
+                        **alg.to_jwk(key, as_dict=True),
+                        "kid": kid,
+                        "alg": algorithm,
+                        "use": "sig",
+                    }
+                    for kid, key in self._public_keys.items()
+                ]
+            }
+        else:
+            raise ValueError(f"Unsupported JWT algorithm: {algorithm}")
+
+        self.jwks_json = orjson.dumps(self.jwks)
+        self.jwks_etag = f'"{hashlib.sha256(self.jwks_json).hexdigest()[:32]}"'
+
+    @staticmethod
+    def _prepare(algorithm: str, alg: Any, kid: str, pem: str) -> Any:
+        try:
+            key = alg.prepare_key(pem.encode())
+        except (jwt.InvalidKeyError, ValueError, TypeError) as e:
+            raise ValueError(f"Invalid JWT key '{kid}': {e}") from e
+        if algorithm == "ES256" and key.curve.name != "secp256r1":
+            raise ValueError(f"JWT key '{kid}' is not a P-256 key")
+        return key
+
+    def signing_key(self) -> tuple[Any, dict[str, str] | None]:
+        """
+        Key and JWT headers for signing a new token.
+
+        Returns:
+            The key object (or secret) and the ``kid`` header, if any.
+        """
+        if self.active_kid is None:
+            return self._secret, None
+        return self._private_keys[self.active_kid], {"kid": self.active_kid}
+
+    def verification_key(self, header: dict[str, Any]) -> Any | None:
+        """
+        Key that verifies a token with the given (unverified) header.
+
+        The header's ``alg`` must match the key set's algorithm, so a token
+        cannot pick a weaker algorithm for a key.
+
+        Returns:
+            The key object (or secret), or None if no key matches.
+        """
+        if header.get("alg") != self.algorithm:
+            return None
+        if self.active_kid is None:
+            return self._secret
+        return self._public_keys.get(header.get("kid", ""))
+
+    @staticmethod
+    def generate_private_key(algorithm: str) -> str:
+        """
+        Generate a private key (PEM) for ``JWT_SIGNING_KEYS``.
+
+        Args:
+            algorithm: ``EdDSA`` or ``ES256``.
+
+        Returns:
+            The unencrypted PKCS#8 PEM.
+        """
+        from cryptography.hazmat.primitives import serialization
+        from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+
+        if algorithm == "EdDSA":
+            key: Any = ed25519.Ed25519PrivateKey.generate()
+        elif algorithm == "ES256":
+            key = ec.generate_private_key(ec.SECP256R1())
+        else:
+            raise ValueError(f"Unsupported JWT algorithm: {algorithm}")
+        return key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        ).decode()
+
+
+_keyset: JWTKeySet | None = None
+
+
+def get_jwt_keyset() -> JWTKeySet:
+    """The process-wide key set, parsed from settings on first use."""
+    global _keyset
+    if _keyset is None:
+        _keyset = JWTKeySet(
+            algorithm=settings.JWT_ALGORITHM,
+            secret=settings.JWT_SECRET_KEY,
+            signing_keys=settings.JWT_SIGNING_KEYS,
+            verification_keys=settings.JWT_VERIFICATION_KEYS,
+            active_kid=settings.JWT_ACTIVE_KID,
+        )
+        utils_logger.info(
+            f"JWT key set loaded: algorithm={_keyset.algorithm} "
+            f"active_kid={_keyset.active_kid} keys={len(_keyset.jwks['keys'])}"
+        )
+    return _keyset
+
+
+def reset_jwt_keyset() -> None:
+    """Drop the parsed key set so the next use re-reads settings."""
+    global _keyset
+    _keyset = None
+
+
+__all__ = [
+    "ASYMMETRIC_ALGORITHMS",
+    "JWTKeySet",
+    "get_jwt_keyset",
+    "reset_jwt_keyset",
+]
@@ -9,13 +9,19 @@ from typing import Any
 from fastapi import APIRouter, Request, Response, status
 from fastapi.responses import JSONResponse
 
-from app.core.config import webhook_logger
+from app.core.config import settings, webhook_logger
 from app.core.exceptions.types import BadRequestException
+from app.core.services.idempotency import ClaimStatus, IdempotencyLease
 from app.core.services.payment.stripe.main import Stripe
 from app.core.services.event_publisher import get_publisher
 
 router = APIRouter(prefix="/webhooks")
 
+# Redis key prefix for webhook delivery deduplication
+WEBHOOK_EVENT_KEY_PREFIX = "stripe_webhook:"
+# Stripe retries deliveries for up to 72 hours
+WEBHOOK_EVENT_TTL = 72 * 3600
+
 
 EVENT_QUEUE_MAPPING: dict[str, str] = {
     "checkout.session.completed": "stripe_checkout_completed",
@@ -55,8 +61,10 @@ for asynchronous processing.
 **Processing Flow:**
 1. Verify Stripe signature header
 2. Parse and validate event payload
-3. Publish to appropriate message queue
-4. Return 200 OK immediately (async processing)
+3. Claim the event id in Redis (redeliveries of a queued event are acknowledged
+   without publishing again)
+4. Publish to appropriate message queue
+5. Return 200 OK immediately (async processing)
 
 **Note:** This endpoint should only be called by Stripe's webhook system.
 Configure the webhook URL in your Stripe Dashboard.
@@ -75,6 +83,10 @@ Configure the webhook URL in your Stripe Dashboard.
                             "summary": "Unhandled event type",
                             "value": {"status": "ignored"},
                         },
+                        "duplicate": {
+                            "summary": "Event already queued",
+                            "value": {"status": "duplicate"},
+                        },
                     }
                 }
             },
@@ -100,6 +112,14 @@ Configure the webhook URL in your Stripe Dashboard.
                 }
             },
         },
+        409: {
+            "description": "The same event is being queued by another request; Stripe will retry",
+            "content": {
+                "application/json": {
+                    "example": {"status": "in_progress"},
+                }
+            },
+        },
         500: {
             "description": "Internal error - event could not be queued; Stripe will retry",
             "content": {
@@ -123,7 +143,8 @@ async def handle_stripe_webhook(request: Request) -> dict[str, str] | Response:
     - Verifies Stripe signature
     - Returns 200 OK immediately after publishing
     - Business logic handled by message consumers
-    - Idempotency handled by message handlers via Redis
+    - Redeliveries are claimed with a Redis lease and published once;
+      handlers claim each event again before processing it
     """
     payload = await request.body()
     sig_header = request.headers.get("Stripe-Signature")
@@ -157,12 +178,31 @@ async def handle_stripe_webhook(request: Request) -> dict[str, str] | Response:
     data = event.get("data", {})
     obj = data.get("object", {})
 
+    lease = IdempotencyLease(
+        f"{WEBHOOK_EVENT_KEY_PREFIX}{event_id}",
+        settings.STRIPE_WEBHOOK_LEASE_MS,
+        WEBHOOK_EVENT_TTL,
+    )
+    claim = await lease.claim()
+    if claim is ClaimStatus.COMPLETED:
+        webhook_logger.info(f"Duplicate webhook {event_id} already queued")
+        return {"status": "duplicate"}
+    if claim is ClaimStatus.IN_PROGRESS:
+        # Another request is publishing it; if that one fails Stripe's
+        # retry will find the lease released
+        return JSONResponse(
+            status_code=status.HTTP_409_CONFLICT,
+            content={"status": "in_progress"},
+        )
+    # ClaimStatus.UNAVAILABLE fails open: handlers still deduplicate
+
     try:
         message = _build_queue_message(event_id, event_type, obj)
         await get_publisher()(queue_name, message)
         webhook_logger.info(f"Published {event_type} to queue {queue_name}")
     except Exception as e:
         webhook_logger.error(f"Failed to publish event {event_id} to queue: {e}")
+        await lease.release()
         # Return 500 so Stripe retries the event (up to 72h with exponential backoff).
         # This is safer than swallowing failures — Stripe has robust retry logic.
         return JSONResponse(
@@ -170,6 +210,7 @@ async def handle_stripe_webhook(request: Request) -> dict[str, str] | Response:
             content={"status": "publish_failed"},
         )
 
+    await lease.complete()
     return {"status": "received"}
 
 
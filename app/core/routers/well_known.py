@@ -0,0 +1,62 @@
+"""
+Well-known endpoints for services that verify our tokens.
+
+Business logic is NOT handled here - keys come from ``app.core.jwt_keys``.
+"""
+
+from fastapi import APIRouter, Request, Response, status
+
+from app.core.config import settings
+from app.core.jwt_keys import get_jwt_keyset
+
+router = APIRouter(prefix="/.well-known")
+
+
+@router.get(
+    "/jwks.json",
+    status_code=status.HTTP_200_OK,
+    summary="JSON Web Key Set",
+    description="""
+Public keys that verify access tokens signed with `EdDSA` or `ES256`.
+
+Pick the key whose `kid` matches the token header and check the signature
+locally; no call back to this API is needed. The response is cacheable for
+`JWT_JWKS_MAX_AGE_SECONDS` and carries an `ETag` for conditional requests.
+On an unknown `kid`, refetch once: the key may have just been added.
+
+With `HS256` signing the key set is empty.
+""",
+    responses={
+        200: {
+            "description": "The key set",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "keys": [
+                            {
+                                "kty": "OKP",
+                                "crv": "Ed25519",
+                                "x": "11qYAYKxCrfVS_7TyWQHOg7hcvPapiMlrwIaaPcHURo",
+                                "kid": "2026-10",
+                                "alg": "EdDSA",
+                                "use": "sig",
+                            }
+                        ]
+                    }
+                }
+            },
+        },
+        304: {"description": "Key set unchanged (If-None-Match)"},
+    },
+)
+async def get_jwks(request: Request) -> Response:
+    keyset = get_jwt_keyset()
+    headers = {
+        "Cache-Control": f"public, max-age={settings.JWT_JWKS_MAX_AGE_SECONDS}",
+        "ETag": keyset.jwks_etag,
+    }
+    if request.headers.get("if-none-match") == keyset.jwks_etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(
+        content=keyset.jwks_json, media_type="application/json", headers=headers
+    )
@@ -38,6 +38,12 @@ from app.core.schemas.plan import (
     PlanResponse,
     PlanListResponse,
 )
+from app.core.schemas.usage import (
+    UsageFeatureSummary,
+    UsageSeriesPoint,
+    UsageStats,
+    UsageSummaryResponse,
+)
 
 __all__ = [
     # Base
@@ -72,4 +78,9 @@ __all__ = [
     "FeatureResponse",
     "PlanResponse",
     "PlanListResponse",
+    # Usage
+    "UsageFeatureSummary",
+    "UsageSeriesPoint",
+    "UsageStats",
+    "UsageSummaryResponse",
 ]
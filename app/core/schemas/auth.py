@@ -334,6 +334,7 @@ class ProfileResponse(BaseModel):
                 "updated_at": "2024-01-20T15:45:00Z",
                 "has_password": True,
                 "oauth_providers": ["google"],
+                "provisioning_status": "ready",
             }
         },
     )
@@ -356,6 +357,15 @@ class ProfileResponse(BaseModel):
         list[OAuthProviders],
         Field(default_factory=list, description="List of linked OAuth providers"),
     ]
+    provisioning_status: Annotated[
+        Literal["provisioning", "ready"],
+        Field(
+            description=(
+                "Whether the personal workspace and free subscriptions are "
+                "still being set up after sign-up"
+            ),
+        ),
+    ] = "ready"
 
 
 class ProfileUpdateRequest(BaseModel):
@@ -0,0 +1,155 @@
+"""
+Pydantic schemas for usage summary endpoints.
+
+Shared by the API (per-workspace) and Career (per-user) products. Every
+figure is computed from the pre-aggregated usage rollup tables, never from
+the raw usage logs.
+"""
+
+from datetime import datetime
+from decimal import Decimal
+from typing import Annotated
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from app.core.enums import FeatureKey, UsageRollupGranularity
+
+
+class UsageStats(BaseModel):
+    """Aggregated counters for a set of committed usage events."""
+
+    request_count: Annotated[
+        int,
+        Field(description="Committed requests (successful + failed)."),
+    ] = 0
+    success_count: Annotated[
+        int,
+        Field(description="Requests committed as SUCCESS."),
+    ] = 0
+    failed_count: Annotated[
+        int,
+        Field(description="Requests committed as FAILED."),
+    ] = 0
+    credits_charged: Annotated[
+        Decimal,
+        Field(description="Credits charged for successful requests."),
+    ] = Decimal("0")
+    input_tokens: Annotated[
+        int,
+        Field(description="Total input tokens reported on commit."),
+    ] = 0
+    output_tokens: Annotated[
+        int,
+        Field(description="Total output tokens reported on commit."),
+    ] = 0
+    avg_latency_ms: Annotated[
+        float | None,
+        Field(description="Mean latency, null when no latency was reported."),
+    ] = None
+    p50_latency_ms: Annotated[
+        float | None,
+        Field(description="Estimated median latency (histogram based)."),
+    ] = None
+    p95_latency_ms: Annotated[
+        float | None,
+        Field(description="Estimated 95th percentile latency (histogram based)."),
+    ] = None
+    p99_latency_ms: Annotated[
+        float | None,
+        Field(description="Estimated 99th percentile latency (histogram based)."),
+    ] = None
+
+
+class UsageFeatureSummary(UsageStats):
+    """Usage totals for a single feature over the requested window."""
+
+    feature_key: Annotated[
+        FeatureKey,
+        Field(description="Feature the counters belong to."),
+    ]
+
+
+class UsageSeriesPoint(UsageStats):
+    """Usage totals for one time bucket (all features combined)."""
+
+    bucket_start: Annotated[
+        datetime,
+        Field(description="Start of the hour/day bucket (UTC)."),
+    ]
+
+
+class UsageSummaryResponse(BaseModel):
+    """Usage summary built from hourly or daily rollups."""
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "granularity": "day",
+                "start": "2026-02-01T00:00:00Z",
+                "end": "2026-03-01T00:00:00Z",
+                "totals": {
+                    "request_count": 120,
+                    "success_count": 117,
+                    "failed_count": 3,
+                    "credits_charged": "58.50",
+                    "input_tokens": 240000,
+                    "output_tokens": 61000,
+                    "avg_latency_ms": 812.4,
+                    "p50_latency_ms": 640.0,
+                    "p95_latency_ms": 1900.0,
+                    "p99_latency_ms": 4200.0,
+                },
+                "by_feature": [
+                    {
+                        "feature_key": "api.job_match",
+                        "request_count": 120,
+                        "success_count": 117,
+                        "failed_count": 3,
+                        "credits_charged": "58.50",
+                        "input_tokens": 240000,
+                        "output_tokens": 61000,
+                        "avg_latency_ms": 812.4,
+                        "p50_latency_ms": 640.0,
+                        "p95_latency_ms": 1900.0,
+                        "p99_latency_ms": 4200.0,
+                    }
+                ],
+                "series": [],
+            }
+        }
+    )
+
+    granularity: Annotated[
+        UsageRollupGranularity,
+        Field(description="Bucket size used for `series`."),
+    ]
+    start: Annotated[
+        datetime,
+        Field(description="Inclusive window start, aligned to the bucket size."),
+    ]
+    end: Annotated[
+        datetime,
+        Field(description="Exclusive window end."),
+    ]
+    totals: Annotated[
+        UsageStats,
+        Field(description="Totals across all features in the window."),
+    ]
+    by_feature: Annotated[
+        list[UsageFeatureSummary],
+        Field(description="Per-feature totals, highest request count first."),
+    ]
+    series: Annotated[
+        list[UsageSeriesPoint],
+        Field(
+            description="Per-bucket totals in chronological order (empty buckets omitted)."
+        ),
+    ]
+
+
+__all__ = [
+    "UsageFeatureSummary",
+    "UsageSeriesPoint",
+    "UsageStats",
+    "UsageSummaryResponse",
+]
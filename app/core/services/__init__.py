@@ -13,8 +13,11 @@ from app.core.services.quota_cache import (
 )
 from app.core.services.rate_limit import (
     MemoryBackend,
+    PenaltyBox,
     RateLimitBackend,
+    RateLimitBucket,
     RateLimiter,
+    RateLimitPolicy,
     RateLimitResult,
     RedisBackend,
     rate_limit_by_email,
@@ -50,6 +53,9 @@ __all__ = [
     "RateLimiter",
     "RateLimitResult",
     "RedisBackend",
+    "RateLimitBucket",
+    "RateLimitPolicy",
+    "PenaltyBox",
     "rate_limit_by_email",
     "rate_limit_by_endpoint",
     "rate_limit_by_ip",
@@ -2,7 +2,7 @@
 Authentication Service for managing user authentication flows.
 
 - Email signup with password hashing and OTP verification
-- Email signin with password verification
+- Email signin with password verification (and rehash on cost change)
 - OAuth authentication (Google, GitHub)
 - OTP generation, sending, and verification
 - Password reset flow
@@ -44,31 +44,36 @@ from datetime import datetime, timedelta, timezone
 from typing import Literal, Type
 from uuid import UUID
 
-import bcrypt
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import auth_logger, settings
 from app.core.db.crud import (
     oauth_account_db,
-    otp_token_db,
-    refresh_token_db,
     user_db,
 )
+from app.core.db.models import User
 from app.core.enums import OAuthProviders, OTPPurpose
 from app.core.exceptions.types import (
     AuthenticationException,
+    DatabaseException,
     InvalidCredentialsException,
     OAuthException,
     OTPInvalidException,
+    RateLimitExceededException,
     TooManyAttemptsException,
 )
 from app.core.services.event_publisher import get_publisher
 from app.core.services.base import SingletonService
+from app.core.services.password_hasher import password_hasher
 from app.core.services.oauth import (
     GitHubOAuthService,
     GoogleOAuthService,
 )
 from app.core.services.oauth.base import BaseOAuthProvider, OAuthUserInfo
+from app.core.services.otp_store import otp_store
 from app.core.services.payment.stripe.main import Stripe
+from app.core.services.session_store import SessionRecord, session_store
+from app.core.services.user_cache import user_cache
 from app.core.utils import create_jwt_token, hmac_hash_otp
 
 __all__ = ["AuthService", "TokenPair"]
@@ -138,34 +143,34 @@ class AuthService(SingletonService):
         auth_logger.info("AuthService initialized")
 
     @classmethod
-    def hash_password(cls, password: str) -> str:
+    async def hash_password(cls, password: str) -> str:
         """
-        Hash a password using bcrypt.
+        Hash a password using bcrypt, off the event loop.
 
         Args:
             password: The plain text password to hash.
 
         Returns:
-            str: The bcrypt hashed password.
+            str: The bcrypt hashed password (PASSWORD_BCRYPT_ROUNDS cost).
+
+        Raises:
+            RateLimitExceededException: If the password hasher is saturated.
 
         Note:
             bcrypt silently truncates at 72 bytes. We truncate explicitly
             so hashing and verification are consistent.
 
         Example:
-            >>> hashed = AuthService.hash_password("mypassword")
+            >>> hashed = await AuthService.hash_password("mypassword")
             >>> hashed.startswith("$2b$")
             True
         """
-        password_bytes = password.encode("utf-8")[:72]  # bcrypt 72-byte limit
-        salt = bcrypt.gensalt()
-        hashed = bcrypt.hashpw(password_bytes, salt)
-        return hashed.decode("utf-8")
+        return await password_hasher.hash(password)
 
     @classmethod
-    def verify_password(cls, password: str, hashed: str) -> bool:
+    async def verify_password(cls, password: str, hashed: str) -> bool:
         """
-        Verify a password against its hash.
+        Verify a password against its hash, off the event loop.
 
         Args:
             password: The plain text password to verify.
@@ -174,18 +179,43 @@ class AuthService(SingletonService):
         Returns:
             bool: True if password matches, False otherwise.
 
+        Raises:
+            RateLimitExceededException: If the password hasher is saturated.
+
         Example:
-            >>> hashed = AuthService.hash_password("mypassword")
-            >>> AuthService.verify_password("mypassword", hashed)
+            >>> hashed = await AuthService.hash_password("mypassword")
+            >>> await AuthService.verify_password("mypassword", hashed)
             True
-            >>> AuthService.verify_password("wrongpassword", hashed)
+            >>> await AuthService.verify_password("wrongpassword", hashed)
             False
         """
+        return await password_hasher.verify(password, hashed)
+
+    @classmethod
+    async def _rehash_password(
+        cls, session: AsyncSession, user: User, password: str
+    ) -> None:
+        """
+        Replace a hash made with an outdated bcrypt cost.
+
+        Called after the password was verified. The update runs in a
+        savepoint, so a failure is logged and ignored without aborting the
+        caller's transaction: the old hash still works and is retried on
+        the next signin.
+        """
         try:
-            password_bytes = password.encode("utf-8")[:72]  # bcrypt 72-byte limit
-            return bcrypt.checkpw(password_bytes, hashed.encode("utf-8"))
-        except Exception:
-            return False
+            password_hash = await cls.hash_password(password)
+            async with session.begin_nested():
+                await user_db.update(
+                    session=session,
+                    id=user.id,
+                    updates={"password_hash": password_hash},
+                    commit_self=False,
+                )
+        except (DatabaseException, RateLimitExceededException) as e:
+            auth_logger.warning(f"Password rehash failed for {user.email}: {e}")
+            return
+        auth_logger.info(f"Password rehashed with updated cost: email={user.email}")
 
     @classmethod
     def generate_otp(cls, length: int | None = None) -> str:
@@ -223,8 +253,8 @@ class AuthService(SingletonService):
         """
         Generate and send an OTP to the specified email.
 
-        This method invalidates any previous OTPs for the same email and
-        purpose, creates a new OTP token, and sends it via email.
+        This method replaces any previous OTP for the same email and
+        purpose in the OTP store, and sends the new code via email.
 
         Args:
             session: The database session.
@@ -245,37 +275,24 @@ class AuthService(SingletonService):
             ... )
             True
         """
-        # Invalidate previous tokens
-        await otp_token_db.invalidate_previous_tokens(
-            session=session,
-            email=email,
-            purpose=purpose,
-            commit_self=False,
-        )
-
         otp_code = cls.generate_otp()
         code_hash = hmac_hash_otp(otp_code, settings.OTP_HMAC_SECRET)
         expires_at = datetime.now(timezone.utc) + timedelta(
             minutes=settings.OTP_EXPIRY_MINUTES
         )
 
-        await otp_token_db.create(
+        # Replaces any previous code for the same email and purpose
+        await otp_store.issue(
             session=session,
-            data={
-                "user_id": user_id,
-                "email": email,
-                "code_hash": code_hash,
-                "purpose": purpose,
-                "expires_at": expires_at,
-            },
-            commit_self=False,
+            email=email,
+            purpose=purpose,
+            code_hash=code_hash,
+            expires_at=expires_at,
+            user_id=user_id,
         )
 
-        if commit_self:
-            await session.commit()
-
-        # Publish OTP email event to the message queue
-        await get_publisher()(
+        # Publish OTP email event (written to the outbox with the token)
+        await get_publisher(session)(
             queue_name="otp_emails",
             event={
                 "email": email,
@@ -285,6 +302,9 @@ class AuthService(SingletonService):
             },
         )
 
+        if commit_self:
+            await session.commit()
+
         auth_logger.info(f"OTP queued: email={email}, purpose={purpose.value}")
         return True
 
@@ -327,28 +347,25 @@ class AuthService(SingletonService):
         # Hash the provided OTP
         code_hash = hmac_hash_otp(otp_code, settings.OTP_HMAC_SECRET)
 
-        # Find valid token
-        token = await otp_token_db.get_valid_token_by_hash(
+        # Check and consume the code
+        outcome = await otp_store.consume(
             session=session,
-            code_hash=code_hash,
             email=email,
             purpose=purpose,
+            code_hash=code_hash,
+            commit_self=commit_self,
         )
 
-        if token is None:
+        if outcome == "invalid":
             auth_logger.warning(f"OTP verification failed: invalid code for {email}")
             raise OTPInvalidException()
 
-        if token.attempts >= settings.OTP_MAX_ATTEMPTS:
+        if outcome == "locked":
             auth_logger.warning(
                 f"OTP verification failed: too many attempts for {email}"
             )
             raise TooManyAttemptsException()
 
-        await otp_token_db.mark_as_used(
-            session=session, token=token, commit_self=commit_self
-        )
-
         auth_logger.info(f"OTP verified: email={email}, purpose={purpose.value}")
         return True
 
@@ -397,7 +414,7 @@ class AuthService(SingletonService):
             )
 
         # Hash password
-        password_hash = cls.hash_password(password)
+        password_hash = await cls.hash_password(password)
 
         user = await user_db.create(
             session=session,
@@ -480,7 +497,7 @@ class AuthService(SingletonService):
                 message="This account uses OAuth login. Please sign in with Google or GitHub."
             )
 
-        if not cls.verify_password(password, user.password_hash):
+        if not await cls.verify_password(password, user.password_hash):
             auth_logger.warning(f"Signin failed: wrong password {email}")
             raise InvalidCredentialsException()
 
@@ -488,6 +505,9 @@ class AuthService(SingletonService):
             auth_logger.warning(f"Signin failed: user deactivated {email}")
             raise AuthenticationException(message="This account has been deactivated")
 
+        if password_hasher.needs_rehash(user.password_hash):
+            await cls._rehash_password(session, user, password)
+
         auth_logger.info(f"User signin: email={email}")
         return user
 
@@ -552,19 +572,17 @@ class AuthService(SingletonService):
         # Map provider string to enum
         provider_enum = OAuthProviders(user_info.provider)
 
-        existing_oauth = await oauth_account_db.get_one_by_conditions(
+        # Linked user, else the user with the email, in one query
+        existing_user, existing_oauth = await oauth_account_db.resolve_user(
             session=session,
-            conditions=[
-                oauth_account_db.model.provider == provider_enum,
-                oauth_account_db.model.provider_account_id
-                == user_info.provider_user_id,
-            ],
-            options=[oauth_account_db.user_loader],
+            provider=provider_enum,
+            provider_account_id=user_info.provider_user_id,
+            email=user_info.email,
         )
 
-        if existing_oauth:
+        if existing_user and existing_oauth:
             # OAuth account exists, return associated user
-            user = existing_oauth.user
+            user = existing_user
 
             updates = {}
             if user_info.name and not user.full_name:
@@ -575,6 +593,7 @@ class AuthService(SingletonService):
                 updates["email_verified"] = True
 
             if updates:
+                await user_cache.invalidate_on_commit(session, user.id)
                 await user_db.update(
                     session=session,
                     id=user.id,
@@ -587,11 +606,6 @@ class AuthService(SingletonService):
             )
             return user
 
-        existing_user = await user_db.get_one_by_conditions(
-            session=session,
-            conditions=[user_db.model.email == user_info.email],
-        )
-
         if existing_user:
             # Link OAuth account to existing user
             await oauth_account_db.create(
@@ -619,6 +633,7 @@ class AuthService(SingletonService):
                     updates=updates,
                     commit_self=False,
                 )
+                await user_cache.invalidate_on_commit(session, existing_user.id)
 
             if commit_self:
                 await session.commit()
@@ -720,17 +735,17 @@ class AuthService(SingletonService):
             raise AuthenticationException(message="User not found")
 
         # Hash new password
-        password_hash = cls.hash_password(new_password)
+        password_hash = await cls.hash_password(new_password)
 
         await user_db.update(
             session=session,
             id=user.id,
             updates={"password_hash": password_hash},
-            commit_self=commit_self,
+            commit_self=False,
         )
 
         # Publish password reset confirmation email event
-        await get_publisher()(
+        await get_publisher(session)(
             queue_name="password_reset_confirmation_emails",
             event={
                 "email": email,
@@ -738,6 +753,9 @@ class AuthService(SingletonService):
             },
         )
 
+        if commit_self:
+            await session.commit()
+
         auth_logger.info(f"Password reset: email={email}")
         return True
 
@@ -779,6 +797,30 @@ class AuthService(SingletonService):
         """
         return secrets.token_urlsafe(48)
 
+    @classmethod
+    def _create_access_token(cls, user) -> str:
+        """
+        Create a signed access token for a user.
+
+        The token always carries the user's token version (``ver``); with
+        ``AUTH_ACCESS_TOKEN_CLAIMS`` it also carries the account status
+        (``act``) and email verification (``evf``) flags, which lets
+        ``get_current_principal`` authorize it without reading the user.
+        """
+        claims = {
+            "sub": str(user.id),
+            "email": user.email,
+            "type": "access",
+            "ver": user.token_version or 0,
+        }
+        if settings.AUTH_ACCESS_TOKEN_CLAIMS:
+            claims["act"] = user.is_active
+            claims["evf"] = user.email_verified
+        return create_jwt_token(
+            data=claims,
+            expires_delta=timedelta(minutes=cls.ACCESS_TOKEN_EXPIRE_MINUTES),
+        )
+
     @classmethod
     async def create_token_pair(
         cls,
@@ -793,7 +835,7 @@ class AuthService(SingletonService):
 
         This method generates:
         1. A short-lived JWT access token (15 minutes)
-        2. A long-lived refresh token stored in the database
+        2. A long-lived refresh token stored in the session store
            (7 days normal, 30 days with remember_me)
 
         Args:
@@ -816,15 +858,7 @@ class AuthService(SingletonService):
             ... )
             >>> print(tokens.access_token)
         """
-        access_token_expires = timedelta(minutes=cls.ACCESS_TOKEN_EXPIRE_MINUTES)
-        access_token = create_jwt_token(
-            data={
-                "sub": str(user.id),
-                "email": user.email,
-                "type": "access",
-            },
-            expires_delta=access_token_expires,
-        )
+        access_token = cls._create_access_token(user)
 
         refresh_token = cls._generate_refresh_token()
         refresh_token_hash = cls._hash_refresh_token(refresh_token)
@@ -836,14 +870,12 @@ class AuthService(SingletonService):
 
         refresh_expires_at = datetime.now(timezone.utc) + refresh_expires_delta
 
-        await refresh_token_db.create(
+        await session_store.create(
             session=session,
-            data={
-                "user_id": user.id,
-                "token_hash": refresh_token_hash,
-                "expires_at": refresh_expires_at,
-                "device_info": device_info,
-            },
+            user_id=user.id,
+            token_hash=refresh_token_hash,
+            expires_at=refresh_expires_at,
+            device_info=device_info,
             commit_self=commit_self,
         )
 
@@ -890,7 +922,7 @@ class AuthService(SingletonService):
         token_hash = cls._hash_refresh_token(refresh_token)
 
         # Find valid token
-        token_record = await refresh_token_db.get_valid_token(
+        token_record = await session_store.get_valid(
             session=session,
             token_hash=token_hash,
         )
@@ -901,21 +933,15 @@ class AuthService(SingletonService):
             )
             raise AuthenticationException(message="Invalid or expired refresh token")
 
-        user = token_record.user
+        user = await user_cache.get(session, token_record.user_id)
 
-        if not user.is_active or user.is_deleted:
-            auth_logger.warning(f"Token refresh failed: user inactive {user.email}")
+        if user is None or not user.is_active or user.is_deleted:
+            auth_logger.warning(
+                f"Token refresh failed: user inactive {token_record.user_id}"
+            )
             raise AuthenticationException(message="User account is not active")
 
-        access_token_expires = timedelta(minutes=cls.ACCESS_TOKEN_EXPIRE_MINUTES)
-        access_token = create_jwt_token(
-            data={
-                "sub": str(user.id),
-                "email": user.email,
-                "type": "access",
-            },
-            expires_delta=access_token_expires,
-        )
+        access_token = cls._create_access_token(user)
 
         auth_logger.info(f"Access token refreshed: user={user.email}")
         return access_token
@@ -946,7 +972,7 @@ class AuthService(SingletonService):
             True
         """
         token_hash = cls._hash_refresh_token(refresh_token)
-        revoked = await refresh_token_db.revoke(
+        revoked = await session_store.revoke(
             session=session,
             token_hash=token_hash,
             commit_self=commit_self,
@@ -969,6 +995,9 @@ class AuthService(SingletonService):
         """
         Revoke all refresh tokens for a user (sign out all devices).
 
+        Also bumps the user's token version, which revokes every access
+        token issued so far once the transaction commits.
+
         Args:
             session: The database session.
             user_id: The ID of the user.
@@ -984,7 +1013,15 @@ class AuthService(SingletonService):
             ... )
             >>> print(f"Revoked {count} sessions")
         """
-        count = await refresh_token_db.revoke_all_for_user(
+        version = await user_db.bump_token_version(
+            session=session, id=user_id, commit_self=False
+        )
+        if version is not None:
+            await user_cache.publish_token_version_on_commit(
+                session, user_id, version, ttl=cls.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+            )
+
+        count = await session_store.revoke_all(
             session=session,
             user_id=user_id,
             commit_self=commit_self,
@@ -998,7 +1035,7 @@ class AuthService(SingletonService):
         cls,
         session,
         user_id: UUID,
-    ) -> list:
+    ) -> list[SessionRecord]:
         """
         Get all active sessions for a user.
 
@@ -1007,7 +1044,7 @@ class AuthService(SingletonService):
             user_id: The ID of the user.
 
         Returns:
-            list: List of active RefreshToken records.
+            list[SessionRecord]: The active sessions, oldest first.
 
         Example:
             >>> sessions = await AuthService.get_active_sessions(
@@ -1015,7 +1052,7 @@ class AuthService(SingletonService):
             ...     user_id=user.id,
             ... )
         """
-        return await refresh_token_db.get_active_tokens_for_user(
+        return await session_store.list_active(
             session=session,
             user_id=user_id,
         )
@@ -1063,14 +1100,14 @@ class AuthService(SingletonService):
                 message="Cannot change password. Account uses OAuth login only."
             )
 
-        if not cls.verify_password(current_password, user.password_hash):
+        if not await cls.verify_password(current_password, user.password_hash):
             auth_logger.warning(
                 f"Password change failed: wrong current password {user.email}"
             )
             raise InvalidCredentialsException()
 
         # Hash and update new password
-        new_password_hash = cls.hash_password(new_password)
+        new_password_hash = await cls.hash_password(new_password)
         await user_db.update(
             session=session,
             id=user.id,
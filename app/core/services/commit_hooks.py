@@ -0,0 +1,76 @@
+"""
+Cache invalidation repeated after the enclosing transaction commits.
+
+A cache entry dropped while a row is being changed can be refilled from
+the pre-commit row by a reader that races the write. Caches therefore drop
+the entry at once, record it as pending work in ``session.info`` under
+their own key, and register a ``CommitHook`` that runs the work again once
+the session commits. A rollback discards the pending work.
+"""
+
+import asyncio
+from collections.abc import Callable, Coroutine
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+_hooks: list["CommitHook"] = []
+# The loop only keeps weak references to tasks; hold flushes until they finish
+_flush_tasks: set[asyncio.Task] = set()
+
+
+@dataclass(frozen=True)
+class CommitHook:
+    """
+    Work a cache defers until a session's transaction ends.
+
+    Attributes:
+        info_key: ``session.info`` key holding the cache's pending work.
+        flush: Coroutine function run with the pending work after commit.
+        on_commit: Called with the pending work at commit, before ``flush``
+            is scheduled (for in-process state that needs no I/O).
+        on_rollback: Called with the session after a rollback.
+    """
+
+    info_key: str
+    flush: Callable[[Any], Coroutine[Any, Any, None]]
+    on_commit: Callable[[Any], None] | None = None
+    on_rollback: Callable[[Session], None] | None = None
+
+
+def register_commit_hook(hook: CommitHook) -> None:
+    """Run ``hook`` on every session commit and rollback."""
+    _hooks.append(hook)
+
+
+@event.listens_for(Session, "after_commit")
+def _flush_after_commit(session: Session) -> None:
+    for hook in _hooks:
+        pending = session.info.pop(hook.info_key, None)
+        if not pending:
+            continue
+        if hook.on_commit is not None:
+            hook.on_commit(pending)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            continue
+        task = loop.create_task(hook.flush(pending))
+        _flush_tasks.add(task)
+        task.add_done_callback(_flush_tasks.discard)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session: Session) -> None:
+    for hook in _hooks:
+        session.info.pop(hook.info_key, None)
+        if hook.on_rollback is not None:
+            hook.on_rollback(session)
+
+
+__all__ = [
+    "CommitHook",
+    "register_commit_hook",
+]
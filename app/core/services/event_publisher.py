@@ -8,16 +8,35 @@ Usage in service code::
     from app.core.services.event_publisher import get_publisher
     await get_publisher()(queue_name, event, headers)
 
+Fan-out of several events (one confirm wait per batch)::
+
+    from app.core.services.event_publisher import get_batch_publisher
+    await get_batch_publisher()([(queue_name, event), ...])
+
+Events that belong to a database transaction pass its session, so that
+with the transactional outbox registered they are written to the outbox in
+that transaction (and published by the relay once it commits)::
+
+    await get_publisher(session)(queue_name, event)
+
+Without an outbox, the session is ignored and the event is published
+immediately.
+
 Registration (in ``lifespan``)::
 
     from app.core.services.event_publisher import register_publisher
-    from app.infrastructure.messaging import publish_event
-    register_publisher(publish_event)
+    from app.core.services.outbox import OutboxPublisher
+    outbox = OutboxPublisher()
+    register_publisher(outbox, outbox.publish_many)
 """
 
 from __future__ import annotations
 
-from typing import Any, Protocol
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Any, Iterable, Protocol
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
 
 
 class EventPublisher(Protocol):
@@ -31,26 +50,105 @@ class EventPublisher(Protocol):
     ) -> None: ...
 
 
+class EventBatchPublisher(Protocol):
+    """Callable that publishes ``(queue_name, event[, headers])`` tuples."""
+
+    async def __call__(self, events: Iterable[tuple]) -> int: ...
+
+
+class SessionWriter(Protocol):
+    """Publisher bound to one session (see ``TransactionalPublisher.bind``)."""
+
+    async def __call__(
+        self,
+        queue_name: str,
+        event: dict[str, Any],
+        headers: dict[str, Any] | None = None,
+    ) -> None: ...
+
+    async def publish_many(self, events: Iterable[tuple]) -> int: ...
+
+
+class TransactionalPublisher(ABC):
+    """Publisher that can enlist events in a caller's database transaction."""
+
+    @abstractmethod
+    async def __call__(
+        self,
+        queue_name: str,
+        event: dict[str, Any],
+        headers: dict[str, Any] | None = None,
+    ) -> None: ...
+
+    @abstractmethod
+    def bind(self, session: AsyncSession) -> SessionWriter:
+        """Return a publisher that writes events in ``session``'s transaction."""
+
+
 _publisher: EventPublisher | None = None
+_batch_publisher: EventBatchPublisher | None = None
 
 
-def register_publisher(publisher: EventPublisher) -> None:
-    """Register the concrete publisher (called once at startup)."""
-    global _publisher
+def register_publisher(
+    publisher: EventPublisher,
+    batch_publisher: EventBatchPublisher | None = None,
+) -> None:
+    """Register the concrete publisher(s) (called once at startup)."""
+    global _publisher, _batch_publisher
     _publisher = publisher
+    _batch_publisher = batch_publisher
+
 
+def get_publisher(session: AsyncSession | None = None) -> EventPublisher:
+    """
+    Return the registered publisher or raise if not yet registered.
 
-def get_publisher() -> EventPublisher:
-    """Return the registered publisher or raise if not yet registered."""
+    Args:
+        session: Session whose transaction the events belong to. When the
+            registered publisher is transactional, the returned publisher
+            writes to it; otherwise the session is ignored.
+    """
     if _publisher is None:
         raise RuntimeError(
             "No event publisher registered. "
             "Call register_publisher() during application startup."
         )
+    if session is not None and isinstance(_publisher, TransactionalPublisher):
+        return _publisher.bind(session)
     return _publisher
 
 
+def get_batch_publisher(
+    session: AsyncSession | None = None,
+) -> EventBatchPublisher:
+    """
+    Return the registered batch publisher.
+
+    Falls back to publishing one event at a time through the single-event
+    publisher when no batch publisher was registered.
+
+    Args:
+        session: Session whose transaction the events belong to (see
+            ``get_publisher``).
+    """
+    if session is not None and isinstance(_publisher, TransactionalPublisher):
+        return _publisher.bind(session).publish_many
+    if _batch_publisher is not None:
+        return _batch_publisher
+    publisher = get_publisher()
+
+    async def publish_one_by_one(events: Iterable[tuple]) -> int:
+        count = 0
+        for queue_name, event, *headers in events:
+            await publisher(queue_name, event, *headers)
+            count += 1
+        return count
+
+    return publish_one_by_one
+
+
 def reset_publisher() -> None:
-    """Clear the registered publisher — intended for test teardown only."""
-    global _publisher
+    """Clear the registered publishers — intended for test teardown only."""
+    global _publisher, _batch_publisher
     _publisher = None
+    _batch_publisher = None
@@ -0,0 +1,111 @@
+"""
+Lease-based idempotency claims backed by Redis.
+
+A unit of work (a Stripe event, a webhook delivery) is claimed by setting
+its key to a per-claimant lease token with ``SET NX PX``. While the lease
+is held, other claimants see ``IN_PROGRESS`` and back off; when the work
+succeeds the lease is replaced by a completion marker kept for
+``done_ttl`` seconds, and when it fails the lease is released so a retry
+can claim it straight away. Long-running work keeps its lease alive with
+``hold()``, which renews it in the background.
+
+Any value that is not a lease token counts as completed, so markers
+written before leases existed (``"1"``) are still honoured.
+
+If Redis is unavailable the claim reports ``UNAVAILABLE``; callers decide
+whether to fail open (process anyway) or back off.
+"""
+
+import asyncio
+import uuid
+from contextlib import asynccontextmanager
+from enum import Enum
+from typing import AsyncIterator
+
+from app.core.config import redis_logger
+from app.core.services.redis_service import RedisService
+
+LEASE_PREFIX = "lease:"
+DONE_MARKER = "1"
+
+
+class ClaimStatus(str, Enum):
+    """Outcome of an idempotency claim."""
+
+    ACQUIRED = "acquired"  # We own the lease and should do the work
+    COMPLETED = "completed"  # The work was already done
+    IN_PROGRESS = "in_progress"  # Another claimant holds the lease
+    UNAVAILABLE = "unavailable"  # Redis could not be reached
+
+
+class IdempotencyLease:
+    """
+    A claim on one idempotency key.
+
+    Example:
+        >>> lease = IdempotencyLease(f"stripe_event:{event_id}", 30_000, 48 * 3600)
+        >>> if await lease.claim() is ClaimStatus.COMPLETED:
+        ...     return
+        >>> async with lease.hold():
+        ...     await process(event)
+    """
+
+    def __init__(self, key: str, lease_ms: int, done_ttl: int):
+        self.key = key
+        self.lease_ms = lease_ms
+        self.done_ttl = done_ttl
+        self.token = f"{LEASE_PREFIX}{uuid.uuid4().hex}"
+
+    async def claim(self) -> ClaimStatus:
+        """Try to take the lease."""
+        value = await RedisService.acquire_lease(self.key, self.token, self.lease_ms)
+        if value is None:
+            return ClaimStatus.UNAVAILABLE
+        if value == self.token:
+            return ClaimStatus.ACQUIRED
+        if value.startswith(LEASE_PREFIX):
+            return ClaimStatus.IN_PROGRESS
+        return ClaimStatus.COMPLETED
+
+    async def renew(self) -> bool:
+        """Extend the lease; False if it was lost."""
+        return await RedisService.renew_lease(self.key, self.token, self.lease_ms)
+
+    async def complete(self) -> bool:
+        """Replace the lease with the completion marker."""
+        return await RedisService.complete_lease(
+            self.key, self.token, DONE_MARKER, self.done_ttl
+        )
+
+    async def release(self) -> bool:
+        """Give the lease up without completing."""
+        return await RedisService.release_lease(self.key, self.token)
+
+    async def _keep_alive(self) -> None:
+        interval = self.lease_ms / 3000
+        while True:
+            await asyncio.sleep(interval)
+            if not await self.renew():
+                redis_logger.warning(f"Lost idempotency lease on {self.key}")
+                return
+
+    @asynccontextmanager
+    async def hold(self) -> AsyncIterator[None]:
+        """
+        Keep the lease alive while the block runs.
+
+        The lease is renewed every third of its duration. Leaving the block
+        normally completes it; an exception releases it and propagates.
+        """
+        renewer = asyncio.create_task(self._keep_alive())
+        try:
+            yield
+        except BaseException:
+            renewer.cancel()
+            await self.release()
+            raise
+        renewer.cancel()
+        await self.complete()
+
+
+__all__ = ["ClaimStatus", "IdempotencyLease"]
@@ -1,7 +1,7 @@
 """Post-signup hook registry — decouples core auth from app-specific setup.
 
 Apps register their hooks at startup; the auth router calls
-``run_post_signup_hooks`` after a user's first successful sign-up.
+``request_provisioning`` after a user's first successful sign-up.
 
 Usage (registration, in each app's startup or a central place)::
 
@@ -12,14 +12,30 @@ Hook signature::
 
     async def my_hook(session: AsyncSession, user: User) -> None: ...
 
-Hooks are called in registration order. Individual failures are logged
-but do **not** abort the sign-up flow.
+Hooks are called in registration order and must be idempotent.
+
+Provisioning (running the hooks) is a background job by default
+(``SIGNUP_PROVISIONING_MODE=async``): the sign-up transaction only
+publishes a ``user_provisioning`` event, and the job runs the hooks and
+sets ``users.provisioned_at``. Until then the profile reports
+``provisioning_status="provisioning"``. Imports and migrations enqueue
+many users at once with ``enqueue_provisioning``.
+
+With ``SIGNUP_PROVISIONING_MODE=inline`` (or when no event publisher is
+registered) the hooks run in the sign-up request; individual failures are
+logged but do **not** abort the sign-up flow.
 """
 
 from __future__ import annotations
 
 import logging
-from typing import TYPE_CHECKING, Callable, Coroutine, Any
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Callable, Coroutine, Any, Iterable
+from uuid import UUID
+
+from app.core.config import settings
+from app.core.db.crud import user_db
+from app.core.services.event_publisher import get_batch_publisher, get_publisher
 
 if TYPE_CHECKING:
     from sqlalchemy.ext.asyncio import AsyncSession
@@ -27,28 +43,115 @@ if TYPE_CHECKING:
 
 PostSignupHook = Callable[["AsyncSession", "User"], Coroutine[Any, Any, None]]
 
+PROVISIONING_QUEUE = "user_provisioning"
+
 _hooks: list[PostSignupHook] = []
 
 logger = logging.getLogger(__name__)
 
 
 def register_post_signup_hook(hook: PostSignupHook) -> None:
-    """Register a coroutine to be called after user sign-up."""
-    _hooks.append(hook)
+    """Register a coroutine to be called after user sign-up (once)."""
+    if hook not in _hooks:
+        _hooks.append(hook)
 
 
-async def run_post_signup_hooks(session: "AsyncSession", user: "User") -> None:
-    """Execute all registered post-signup hooks, logging failures."""
+async def run_post_signup_hooks(session: "AsyncSession", user: "User") -> bool:
+    """Execute all registered post-signup hooks, logging failures.
+
+    Returns:
+        bool: True if every hook succeeded.
+    """
+    succeeded = True
     for hook in _hooks:
         try:
             await hook(session, user)
         except Exception as exc:  # noqa: BLE001
+            succeeded = False
             logger.warning(
                 "Post-signup hook %s failed for user %s: %s",
                 hook.__qualname__,
                 user.id,
                 exc,
             )
+    return succeeded
+
+
+async def _mark_provisioned(session: "AsyncSession", user: "User") -> None:
+    provisioned_at = datetime.now(timezone.utc)
+    await user_db.update(
+        session=session,
+        id=user.id,
+        updates={"provisioned_at": provisioned_at},
+        commit_self=False,
+    )
+    user.provisioned_at = provisioned_at
+
+
+async def provision_user(session: "AsyncSession", user: "User") -> None:
+    """Run every post-signup hook for ``user`` and mark them provisioned.
+
+    Unlike ``run_post_signup_hooks``, a failing hook raises, so the
+    caller's transaction rolls back and the job is retried.
+
+    Raises:
+        RuntimeError: If no hooks are registered (the process was started
+            without the app hooks, so provisioning would be a no-op).
+    """
+    if not _hooks:
+        raise RuntimeError("No post-signup hooks registered")
+
+    for hook in _hooks:
+        await hook(session, user)
+    await _mark_provisioned(session, user)
+
+
+async def request_provisioning(session: "AsyncSession", user: "User") -> None:
+    """Provision a newly signed-up user, in the background when possible.
+
+    Does nothing for users who are already provisioned, so it is safe to
+    call on every sign-in.
+    """
+    if user.provisioned_at is not None:
+        return
+
+    if settings.SIGNUP_PROVISIONING_MODE == "async":
+        try:
+            await get_publisher(session)(PROVISIONING_QUEUE, {"user_id": str(user.id)})
+            return
+        except Exception as exc:  # noqa: BLE001
+            logger.warning(
+                "Could not enqueue provisioning for user %s, running inline: %s",
+                user.id,
+                exc,
+            )
+
+    # Users whose hooks failed stay unprovisioned and are picked up by the
+    # provisioning sweep
+    if await run_post_signup_hooks(session, user):
+        await _mark_provisioned(session, user)
+
+
+async def enqueue_provisioning(
+    user_ids: Iterable[UUID], session: "AsyncSession | None" = None
+) -> int:
+    """Enqueue provisioning jobs for many users (imports, migrations).
+
+    Each user gets their own event, so one failing user is retried (and
+    dead-lettered) on its own. Already provisioned users are skipped by
+    the job.
+
+    Args:
+        user_ids: Users to provision.
+        session: Session whose transaction the events belong to (see
+            ``get_publisher``).
+
+    Returns:
+        int: Number of events published.
+    """
+    return await get_batch_publisher(session)(
+        [(PROVISIONING_QUEUE, {"user_id": str(user_id)}) for user_id in user_ids]
+    )
 
 
 def reset_hooks() -> None:
@@ -0,0 +1,390 @@
+"""
+Metrics for the messaging layer.
+
+The consumers, publisher and queue-depth poller (``app.infrastructure
+.messaging``) record into the process-wide ``messaging_metrics`` registry.
+It lives in core so that readers do not import infrastructure.
+
+Consumers mostly run outside the API (the standalone worker and each of
+its ``--workers`` processes), so every process runs a
+``MessagingMetricsReporter`` that writes its registry to the
+``messaging_metrics`` Redis hash every ``MESSAGING_METRICS_REPORT_SECONDS``.
+The admin metrics API reads them back with ``collect_messaging_metrics``,
+which merges every live process into one registry.
+
+Recorded per process:
+
+- ``handler_seconds``: handler run time, per queue and handler.
+- ``time_in_queue_seconds``: publish timestamp (``x-published-at``) to
+  ack, per queue. Retries keep the original timestamp, so this is the
+  end-to-end delay of a message, retry waits included.
+- ``messages``: outcome counts per queue (``acked``, ``retried``,
+  ``dead_lettered``, ``dropped``).
+- ``queue_depth``: ready messages and consumers per queue, as last polled
+  from the broker.
+
+Histograms use fixed, Prometheus-style cumulative buckets.
+"""
+
+import asyncio
+import bisect
+import json
+import os
+import socket
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any
+
+from app.core.config import settings, rabbitmq_logger
+from app.core.services.redis_service import RedisService
+
+# Upper bounds (seconds) shared by every latency histogram
+LATENCY_BUCKETS: tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    300.0,
+    900.0,
+)
+
+OUTCOMES = ("acked", "retried", "dead_lettered", "dropped")
+
+# Redis hash holding one exported registry per reporting process
+METRICS_REDIS_KEY = "messaging_metrics"
+
+
+class Histogram:
+    """Fixed-bucket histogram of observed values."""
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        # One slot per bucket plus +Inf
+        self._counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self._counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> list[tuple[str, int]]:
+        """``(le, count)`` pairs, including ``+Inf``."""
+        pairs = []
+        running = 0
+        for bound, count in zip(self.buckets, self._counts):
+            running += count
+            pairs.append((f"{bound:g}", running))
+        pairs.append(("+Inf", self.count))
+        return pairs
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "buckets": dict(self.cumulative()),
+        }
+
+    def export(self) -> dict[str, Any]:
+        """Raw slot counts, for merging into another process's histogram."""
+        return {"counts": list(self._counts), "sum": self.sum}
+
+    def merge(self, exported: dict[str, Any]) -> None:
+        """Add the observations of an exported histogram with the same buckets."""
+        for slot, count in enumerate(exported["counts"]):
+            self._counts[slot] += count
+        self.count += sum(exported["counts"])
+        self.sum += exported["sum"]
+
+
+@dataclass
+class QueueDepth:
+    """Broker-side state of one queue at the last poll."""
+
+    messages: int | None = None
+    consumers: int | None = None
+    polled_at: float | None = None  # time.time()
+    error: str | None = None
+
+
+@dataclass
+class MessagingMetrics:
+    """Registry of messaging metrics for this process."""
+
+    handler_seconds: dict[tuple[str, str], Histogram] = field(
+        default_factory=lambda: defaultdict(Histogram)
+    )
+    time_in_queue_seconds: dict[str, Histogram] = field(
+        default_factory=lambda: defaultdict(Histogram)
+    )
+    messages: dict[tuple[str, str], int] = field(
+        default_factory=lambda: defaultdict(int)
+    )
+    queue_depth: dict[str, QueueDepth] = field(default_factory=dict)
+
+    def observe_handler(self, queue: str, handler: str, seconds: float) -> None:
+        self.handler_seconds[(queue, handler)].observe(seconds)
+
+    def record_outcome(
+        self, queue: str, outcome: str, published_at_ms: Any = None
+    ) -> None:
+        """
+        Count a settled message.
+
+        Args:
+            queue: Queue the message was consumed from.
+            outcome: One of ``OUTCOMES``.
+            published_at_ms: The message's ``x-published-at`` header; on
+                ``acked`` it is turned into a time-in-queue observation.
+                Missing or malformed values are ignored.
+        """
+        self.messages[(queue, outcome)] += 1
+        if outcome == "acked" and isinstance(published_at_ms, (int, float)):
+            lag = time.time() - published_at_ms / 1000
+            self.time_in_queue_seconds[queue].observe(max(lag, 0.0))
+
+    def set_queue_depth(self, queue: str, messages: int, consumers: int) -> None:
+        self.queue_depth[queue] = QueueDepth(messages, consumers, time.time())
+
+    def set_queue_depth_error(self, queue: str, error: str) -> None:
+        depth = self.queue_depth.setdefault(queue, QueueDepth())
+        depth.error = error
+        depth.polled_at = time.time()
+
+    def snapshot(self) -> dict[str, Any]:
+        """JSON-ready view of every metric."""
+        queues: dict[str, dict[str, Any]] = defaultdict(
+            lambda: {
+                "handlers": {},
+                "time_in_queue_seconds": None,
+                "messages": {},
+                "depth": None,
+            }
+        )
+        for (queue, handler), histogram in self.handler_seconds.items():
+            queues[queue]["handlers"][handler] = histogram.to_dict()
+        for queue, histogram in self.time_in_queue_seconds.items():
+            queues[queue]["time_in_queue_seconds"] = histogram.to_dict()
+        for (queue, outcome), count in self.messages.items():
+            queues[queue]["messages"][outcome] = count
+        for queue, depth in self.queue_depth.items():
+            queues[queue]["depth"] = {
+                "messages": depth.messages,
+                "consumers": depth.consumers,
+                "polled_at": depth.polled_at,
+                "error": depth.error,
+            }
+        return dict(sorted(queues.items()))
+
+    def render_prometheus(self) -> str:
+        """Render the metrics in the Prometheus text exposition format."""
+        lines: list[str] = []
+
+        def histogram(
+            name: str, help_text: str, series: dict[Any, Histogram], labels
+        ) -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for key, hist in sorted(series.items()):
+                label = labels(key)
+                for le, count in hist.cumulative():
+                    lines.append(f'{name}_bucket{{{label},le="{le}"}} {count}')
+                lines.append(f"{name}_sum{{{label}}} {hist.sum:g}")
+                lines.append(f"{name}_count{{{label}}} {hist.count}")
+
+        histogram(
+            "messaging_handler_seconds",
+            "Message handler run time.",
+            self.handler_seconds,
+            lambda key: f'queue="{key[0]}",handler="{key[1]}"',
+        )
+        histogram(
+            "messaging_time_in_queue_seconds",
+            "Publish to ack delay, retries included.",
+            self.time_in_queue_seconds,
+            lambda key: f'queue="{key}"',
+        )
+
+        lines.append("# HELP messaging_messages_total Settled messages by outcome.")
+        lines.append("# TYPE messaging_messages_total counter")
+        for (queue, outcome), count in sorted(self.messages.items()):
+            lines.append(
+                f'messaging_messages_total{{queue="{queue}",outcome="{outcome}"}} '
+                f"{count}"
+            )
+
+        lines.append("# HELP messaging_queue_messages Ready messages at last poll.")
+        lines.append("# TYPE messaging_queue_messages gauge")
+        for queue, depth in sorted(self.queue_depth.items()):
+            if depth.messages is not None:
+                lines.append(
+                    f'messaging_queue_messages{{queue="{queue}"}} {depth.messages}'
+                )
+        lines.append("# HELP messaging_queue_consumers Consumers at last poll.")
+        lines.append("# TYPE messaging_queue_consumers gauge")
+        for queue, depth in sorted(self.queue_depth.items()):
+            if depth.consumers is not None:
+                lines.append(
+                    f'messaging_queue_consumers{{queue="{queue}"}} {depth.consumers}'
+                )
+        return "\n".join(lines) + "\n"
+
+    def export(self) -> dict[str, Any]:
+        """JSON-ready raw state of the registry (see ``merge``)."""
+        return {
+            "handler_seconds": [
+                [queue, handler, histogram.export()]
+                for (queue, handler), histogram in self.handler_seconds.items()
+            ],
+            "time_in_queue_seconds": [
+                [queue, histogram.export()]
+                for queue, histogram in self.time_in_queue_seconds.items()
+            ],
+            "messages": [
+                [queue, outcome, count]
+                for (queue, outcome), count in self.messages.items()
+            ],
+            "queue_depth": [
+                [queue, depth.messages, depth.consumers, depth.polled_at, depth.error]
+                for queue, depth in self.queue_depth.items()
+            ],
+        }
+
+    def merge(self, exported: dict[str, Any]) -> None:
+        """
+        Add another process's exported registry to this one.
+
+        Histograms and counts are summed; for queue depth the most recent
+        poll wins.
+        """
+        for queue, handler, histogram in exported["handler_seconds"]:
+            self.handler_seconds[(queue, handler)].merge(histogram)
+        for queue, histogram in exported["time_in_queue_seconds"]:
+            self.time_in_queue_seconds[queue].merge(histogram)
+        for queue, outcome, count in exported["messages"]:
+            self.messages[(queue, outcome)] += count
+        for queue, messages, consumers, polled_at, error in exported["queue_depth"]:
+            current = self.queue_depth.get(queue)
+            if current is None or (polled_at or 0) > (current.polled_at or 0):
+                self.queue_depth[queue] = QueueDepth(
+                    messages, consumers, polled_at, error
+                )
+
+    def reset(self) -> None:
+        self.handler_seconds.clear()
+        self.time_in_queue_seconds.clear()
+        self.messages.clear()
+        self.queue_depth.clear()
+
+
+messaging_metrics = MessagingMetrics()
+
+
+def process_id() -> str:
+    """Field of this process in the metrics hash: ``<role>:<host>:<pid>``."""
+    return f"{settings.PROCESS_ROLE}:{socket.gethostname()}:{os.getpid()}"
+
+
+class MessagingMetricsReporter:
+    """Writes this process's registry to Redis on an interval."""
+
+    def __init__(self, metrics: MessagingMetrics = messaging_metrics):
+        self.metrics = metrics
+        self._task: asyncio.Task | None = None
+
+    async def report_once(self) -> bool:
+        """Write the registry to Redis; returns False if Redis is unavailable."""
+        return await RedisService.hset(
+            METRICS_REDIS_KEY,
+            process_id(),
+            json.dumps({"reported_at": time.time(), "metrics": self.metrics.export()}),
+            ttl=int(3 * settings.MESSAGING_METRICS_REPORT_SECONDS) + 1,
+        )
+
+    async def _run(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.report_once()
+            except Exception as e:
+                rabbitmq_logger.warning(f"Messaging metrics report failed: {e}")
+
+    def start(self, interval: float) -> None:
+        """Start reporting in the background."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(interval))
+
+    async def stop(self) -> None:
+        """Stop reporting and remove this process from the hash."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            await RedisService.hdel(METRICS_REDIS_KEY, process_id())
+
+
+async def collect_messaging_metrics(
+    local: MessagingMetrics = messaging_metrics,
+) -> tuple[MessagingMetrics, list[str]]:
+    """
+    Merge the registries of every process reporting to Redis.
+
+    This process contributes its live ``local`` registry instead of its last
+    report. Reports older than three report intervals belong to processes
+    that stopped without cleaning up and are removed. Without Redis only
+    the local registry is returned.
+
+    Returns:
+        ``(merged registry, ids of the processes included)``.
+    """
+    merged = MessagingMetrics()
+    merged.merge(local.export())
+    processes = [process_id()]
+
+    reports = await RedisService.hgetall(METRICS_REDIS_KEY) or {}
+    max_age = 3 * settings.MESSAGING_METRICS_REPORT_SECONDS
+    stale = []
+    for reporter, raw in sorted(reports.items()):
+        if reporter == process_id():
+            continue
+        try:
+            report = json.loads(raw)
+            if time.time() - report["reported_at"] > max_age:
+                stale.append(reporter)
+                continue
+            merged.merge(report["metrics"])
+        except (ValueError, KeyError, TypeError) as e:
+            rabbitmq_logger.warning(f"Ignoring messaging metrics from {reporter}: {e}")
+            continue
+        processes.append(reporter)
+    if stale:
+        await RedisService.hdel(METRICS_REDIS_KEY, *stale)
+    return merged, processes
+
+
+__all__ = [
+    "LATENCY_BUCKETS",
+    "METRICS_REDIS_KEY",
+    "OUTCOMES",
+    "Histogram",
+    "MessagingMetrics",
+    "MessagingMetricsReporter",
+    "QueueDepth",
+    "collect_messaging_metrics",
+    "messaging_metrics",
+    "process_id",
+]
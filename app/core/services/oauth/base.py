@@ -17,15 +17,19 @@ Example usage:
             ...
 """
 
+import asyncio
+import importlib.util
 import secrets
+import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from typing import Any
 from urllib.parse import urlparse
 
+import httpx
 from itsdangerous import BadSignature, SignatureExpired, URLSafeTimedSerializer
 
-from app.core.config import settings
+from app.core.config import auth_logger, settings
 
 __all__ = [
     "BaseOAuthProvider",
@@ -169,6 +173,11 @@ class BaseOAuthProvider(ABC):
         - exchange_code_for_tokens: Exchange auth code for access tokens
         - get_user_info: Retrieve user information using access token
 
+    Providers share a long-lived HTTP client built by ``_create_client``.
+    A provider that publishes an OpenID discovery document sets
+    ``_DISCOVERY_URL``; ``load_metadata`` caches it and ``_endpoint``
+    resolves endpoints from it, falling back to the hard-coded URLs.
+
     Example:
         >>> class MyProvider(BaseOAuthProvider):
         ...     provider_name = "my_provider"
@@ -187,6 +196,104 @@ class BaseOAuthProvider(ABC):
 
     provider_name: str
 
+    _client: httpx.AsyncClient | None = None
+
+    # OpenID discovery document, if the provider publishes one
+    _DISCOVERY_URL: str | None = None
+    _DISCOVERY_TIMEOUT_SECONDS: float = 5.0
+    # Retry delay after a failed discovery fetch
+    _DISCOVERY_RETRY_SECONDS: int = 60
+    _metadata: dict[str, Any] = {}
+    _metadata_expires_at: float = 0.0
+    _metadata_refresh: "asyncio.Task[dict[str, Any]] | None" = None
+
+    @staticmethod
+    def _create_client() -> httpx.AsyncClient:
+        """
+        Build a keep-alive HTTP client for provider API calls.
+
+        Uses HTTP/2 when ``OAUTH_HTTP2`` is set and the h2 package is
+        installed, so concurrent calls to one host share a connection.
+
+        Returns:
+            httpx.AsyncClient: The configured client.
+        """
+        http2 = settings.OAUTH_HTTP2
+        if http2 and importlib.util.find_spec("h2") is None:
+            auth_logger.warning("h2 is not installed; OAuth clients use HTTP/1.1")
+            http2 = False
+
+        return httpx.AsyncClient(
+            http2=http2,
+            timeout=httpx.Timeout(settings.OAUTH_HTTP_TIMEOUT_SECONDS),
+            limits=httpx.Limits(
+                max_connections=settings.OAUTH_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.OAUTH_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.OAUTH_HTTP_KEEPALIVE_EXPIRY_SECONDS,
+            ),
+        )
+
+    @classmethod
+    async def load_metadata(cls) -> dict[str, Any]:
+        """
+        Fetch and cache the provider's discovery document.
+
+        Should be called once after ``init`` during application startup;
+        afterwards ``_endpoint`` refreshes the cache in the background when
+        it expires. On failure the previous document (or the hard-coded
+        endpoints) stays in use and the fetch is retried shortly.
+
+        Returns:
+            dict[str, Any]: The cached discovery document (empty if the
+                provider has none or it was never fetched).
+        """
+        if cls._DISCOVERY_URL is None or cls._client is None:
+            return cls._metadata
+
+        ttl = settings.OAUTH_METADATA_CACHE_TTL_SECONDS
+        try:
+            response = await cls._client.get(
+                cls._DISCOVERY_URL, timeout=cls._DISCOVERY_TIMEOUT_SECONDS
+            )
+            response.raise_for_status()
+            cls._metadata = response.json()
+            auth_logger.info(f"{cls.provider_name} OAuth metadata loaded")
+        except (httpx.HTTPError, ValueError) as e:
+            ttl = cls._DISCOVERY_RETRY_SECONDS
+            auth_logger.warning(f"{cls.provider_name} OAuth metadata fetch failed: {e}")
+
+        cls._metadata_expires_at = time.monotonic() + ttl
+        return cls._metadata
+
+    @classmethod
+    def _endpoint(cls, name: str, default: str) -> str:
+        """
+        Resolve an endpoint from the cached discovery document.
+
+        Never waits on the network: an expired document is refreshed by a
+        background task while the cached (or default) URL is returned.
+
+        Args:
+            name: Discovery document field, e.g. ``token_endpoint``.
+            default: URL to use when the document doesn't have it.
+
+        Returns:
+            str: The endpoint URL.
+        """
+        if (
+            cls._metadata_expires_at
+            and time.monotonic() >= cls._metadata_expires_at
+            and (cls._metadata_refresh is None or cls._metadata_refresh.done())
+        ):
+            try:
+                cls._metadata_refresh = asyncio.get_running_loop().create_task(
+                    cls.load_metadata()
+                )
+            except RuntimeError:
+                # No running loop - refresh on the next async call
+                pass
+        return cls._metadata.get(name) or default
+
     @classmethod
     @abstractmethod
     def get_authorization_url(cls, redirect_uri: str, state: str) -> str:
@@ -102,7 +102,7 @@ class GitHubOAuthService(BaseOAuthProvider):
         """
         Initialize the GitHub OAuth service.
 
-        Sets up the HTTP client and optionally overrides credentials.
+        Sets up the long-lived HTTP client and optionally overrides credentials.
         Should be called during application startup.
 
         Args:
@@ -118,10 +118,7 @@ class GitHubOAuthService(BaseOAuthProvider):
             cls._client_secret = client_secret
 
         await cls.aclose()
-        cls._client = httpx.AsyncClient(
-            timeout=httpx.Timeout(30.0),
-            limits=httpx.Limits(max_keepalive_connections=5, max_connections=10),
-        )
+        cls._client = cls._create_client()
         auth_logger.info("GitHubOAuthService initialized")
 
     @classmethod
@@ -321,7 +318,7 @@ class GitHubOAuthService(BaseOAuthProvider):
         Retrieve user information from GitHub.
 
         Fetches the authenticated user's profile information and
-        primary email address using the provided access token.
+        primary email address concurrently using the provided access token.
 
         Args:
             access_token: A valid access token from token exchange.
@@ -361,7 +358,12 @@ class GitHubOAuthService(BaseOAuthProvider):
 
         for attempt in range(max_retries + 1):
             try:
-                response = await cls._client.get(cls._USER_URL, headers=headers)
+                # The profile and email list are independent - fetch them
+                # concurrently (one multiplexed connection with HTTP/2)
+                response, (primary_email, email_verified) = await asyncio.gather(
+                    cls._client.get(cls._USER_URL, headers=headers),
+                    cls._get_primary_email(access_token),
+                )
 
                 if response.status_code != 200:
                     auth_logger.error(
@@ -373,15 +375,9 @@ class GitHubOAuthService(BaseOAuthProvider):
 
                 user_data = response.json()
 
-                email = user_data.get("email")
-                email_verified = False
-
-                if not email:
-                    # Fetch primary email from emails endpoint
-                    email, email_verified = await cls._get_primary_email(access_token)
-                else:
-                    # If email is in profile, check verification via emails endpoint
-                    _, email_verified = await cls._get_primary_email(access_token)
+                # Prefer the public profile email; verification always comes
+                # from the emails endpoint
+                email = user_data.get("email") or primary_email
 
                 auth_logger.info(
                     f"GitHub user info retrieved: user_id={user_data.get('id')}"
@@ -5,6 +5,7 @@ Example usage:
     from app.core.services.oauth.google import GoogleOAuthService
 
     await GoogleOAuthService.init()
+    await GoogleOAuthService.load_metadata()
 
     url = GoogleOAuthService.get_authorization_url(
         redirect_uri="https://app.com/callback",
@@ -53,7 +54,8 @@ class GoogleOAuthService(BaseOAuthProvider):
         _client_secret: Google OAuth client secret.
         _client: HTTP client for API requests.
 
-    Google API Endpoints:
+    Google API Endpoints (resolved from the cached OpenID discovery
+    document once ``load_metadata`` has run):
         - Authorization: https://accounts.google.com/o/oauth2/v2/auth
         - Token: https://oauth2.googleapis.com/token
         - User Info: https://www.googleapis.com/oauth2/v3/userinfo
@@ -84,7 +86,10 @@ class GoogleOAuthService(BaseOAuthProvider):
     _client_secret: str = settings.GOOGLE_CLIENT_SECRET
     _client: httpx.AsyncClient | None = None
 
-    # Google OAuth endpoints
+    # Google OAuth endpoints (defaults; the discovery document wins)
+    _DISCOVERY_URL: str | None = (
+        "https://accounts.google.com/.well-known/openid-configuration"
+    )
     _AUTHORIZATION_URL: str = "https://accounts.google.com/o/oauth2/v2/auth"
     _TOKEN_URL: str = "https://oauth2.googleapis.com/token"
     _USERINFO_URL: str = "https://www.googleapis.com/oauth2/v3/userinfo"
@@ -101,7 +106,7 @@ class GoogleOAuthService(BaseOAuthProvider):
         """
         Initialize the Google OAuth service.
 
-        Sets up the HTTP client and optionally overrides credentials.
+        Sets up the long-lived HTTP client and optionally overrides credentials.
         Should be called during application startup.
 
         Args:
@@ -117,10 +122,7 @@ class GoogleOAuthService(BaseOAuthProvider):
             cls._client_secret = client_secret
 
         await cls.aclose()
-        cls._client = httpx.AsyncClient(
-            timeout=httpx.Timeout(30.0),
-            limits=httpx.Limits(max_keepalive_connections=5, max_connections=10),
-        )
+        cls._client = cls._create_client()
         auth_logger.info("GoogleOAuthService initialized")
 
     @classmethod
@@ -133,6 +135,9 @@ class GoogleOAuthService(BaseOAuthProvider):
         Returns:
             None
         """
+        if cls._metadata_refresh is not None:
+            cls._metadata_refresh.cancel()
+            cls._metadata_refresh = None
         if cls._client is not None:
             try:
                 await cls._client.aclose()
@@ -173,7 +178,10 @@ class GoogleOAuthService(BaseOAuthProvider):
             "access_type": "offline",
             "prompt": "consent",
         }
-        return f"{cls._AUTHORIZATION_URL}?{urlencode(params)}"
+        authorization_url = cls._endpoint(
+            "authorization_endpoint", cls._AUTHORIZATION_URL
+        )
+        return f"{authorization_url}?{urlencode(params)}"
 
     @classmethod
     async def exchange_code_for_tokens(
@@ -218,7 +226,9 @@ class GoogleOAuthService(BaseOAuthProvider):
         }
 
         try:
-            response = await cls._client.post(cls._TOKEN_URL, data=data)
+            response = await cls._client.post(
+                cls._endpoint("token_endpoint", cls._TOKEN_URL), data=data
+            )
 
             if response.status_code != 200:
                 auth_logger.error(
@@ -285,6 +295,7 @@ class GoogleOAuthService(BaseOAuthProvider):
             assert cls._client is not None, "Client initialization failed"
 
         headers = {"Authorization": f"Bearer {access_token}"}
+        userinfo_url = cls._endpoint("userinfo_endpoint", cls._USERINFO_URL)
 
         # Retry logic for transient network errors
         max_retries = 2
@@ -292,7 +303,7 @@ class GoogleOAuthService(BaseOAuthProvider):
 
         for attempt in range(max_retries + 1):
             try:
-                response = await cls._client.get(cls._USERINFO_URL, headers=headers)
+                response = await cls._client.get(userinfo_url, headers=headers)
 
                 if response.status_code != 200:
                     auth_logger.error(
@@ -0,0 +1,285 @@
+"""
+OTP stores.
+
+``AuthService.send_otp`` and ``verify_otp`` keep OTPs in an ``OTPStore``
+chosen by ``OTP_STORE_BACKEND``:
+
+- ``database`` (default): the ``otp_tokens`` table.
+- ``redis``: one hash per (email, purpose) holding the code's HMAC and an
+  attempts counter, expiring with the code. Issuing a code replaces the
+  previous one, and verification counts the attempt, checks the code and
+  consumes it in one Lua script. With ``OTP_STORE_AUDIT``, issued and used
+  codes are also published to the ``otp_audit`` queue, whose handler
+  records them in ``otp_tokens``.
+"""
+
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from typing import Any, Literal
+from uuid import UUID, uuid4
+
+import orjson
+from fastapi import status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import auth_logger, settings
+from app.core.db.crud import otp_token_db
+from app.core.enums import OTPPurpose
+from app.core.exceptions.types import AppException
+from app.core.services.event_publisher import get_publisher
+from app.core.services.redis_service import RedisService
+
+OTP_AUDIT_QUEUE = "otp_audit"
+
+# Outcome of checking a code: consumed, wrong/unknown, or out of attempts
+OTPCheck = Literal["verified", "invalid", "locked"]
+
+
+class OTPStoreUnavailableException(AppException):
+    """Exception raised when OTPs cannot be issued or checked."""
+
+    def __init__(self, message: str = "OTP store is unavailable."):
+        super().__init__(message, status.HTTP_503_SERVICE_UNAVAILABLE)
+
+
+class OTPStore(ABC):
+    """Abstract OTP store."""
+
+    @abstractmethod
+    async def issue(
+        self,
+        session: AsyncSession,
+        email: str,
+        purpose: OTPPurpose,
+        code_hash: str,
+        expires_at: datetime,
+        user_id: UUID | None = None,
+    ) -> None:
+        """Store a code, replacing any unused code for the email and purpose."""
+
+    @abstractmethod
+    async def consume(
+        self,
+        session: AsyncSession,
+        email: str,
+        purpose: OTPPurpose,
+        code_hash: str,
+        commit_self: bool = True,
+    ) -> OTPCheck:
+        """Check a code and mark it used if it matches."""
+
+
+class DatabaseOTPStore(OTPStore):
+    """OTP store backed by the ``otp_tokens`` table."""
+
+    async def issue(
+        self,
+        session: AsyncSession,
+        email: str,
+        purpose: OTPPurpose,
+        code_hash: str,
+        expires_at: datetime,
+        user_id: UUID | None = None,
+    ) -> None:
+        await otp_token_db.invalidate_previous_tokens(
+            session=session,
+            email=email,
+            purpose=purpose,
+            commit_self=False,
+        )
+        await otp_token_db.create(
+            session=session,
+            data={
+                "user_id": user_id,
+                "email": email,
+                "code_hash": code_hash,
+                "purpose": purpose,
+                "expires_at": expires_at,
+            },
+            commit_self=False,
+        )
+
+    async def consume(
+        self,
+        session: AsyncSession,
+        email: str,
+        purpose: OTPPurpose,
+        code_hash: str,
+        commit_self: bool = True,
+    ) -> OTPCheck:
+        token = await otp_token_db.get_valid_token_by_hash(
+            session=session,
+            code_hash=code_hash,
+            email=email,
+            purpose=purpose,
+        )
+        if token is None:
+            return "invalid"
+        if token.attempts >= settings.OTP_MAX_ATTEMPTS:
+            return "locked"
+
+        await otp_token_db.mark_as_used(
+            session=session, token=token, commit_self=commit_self
+        )
+        return "verified"
+
+
+class RedisOTPStore(OTPStore):
+    """
+    OTP store backed by Redis.
+
+    Each (email, purpose) has one hash ``otp:{purpose}:{email}`` with the
+    fields ``id``, ``hash``, ``user_id``, ``expires_at`` and ``attempts``,
+    expiring with the code. Every verification counts as an attempt, so a
+    code accepts at most ``OTP_MAX_ATTEMPTS`` guesses.
+    """
+
+    KEY_PREFIX = "otp:"
+
+    # KEYS: otp; ARGV: id, hash, user_id, expires_at, ttl
+    _ISSUE_SCRIPT = """
+    redis.call('DEL', KEYS[1])
+    redis.call('HSET', KEYS[1], 'id', ARGV[1], 'hash', ARGV[2],
+        'user_id', ARGV[3], 'expires_at', ARGV[4], 'attempts', 0)
+    redis.call('EXPIRE', KEYS[1], ARGV[5])
+    return 1
+    """
+
+    # KEYS: otp; ARGV: hash, max attempts
+    _CONSUME_SCRIPT = """
+    local stored = redis.call('HGET', KEYS[1], 'hash')
+    if not stored then
+        return {'invalid'}
+    end
+    local attempts = redis.call('HINCRBY', KEYS[1], 'attempts', 1)
+    if attempts > tonumber(ARGV[2]) then
+        return {'locked'}
+    end
+    if stored ~= ARGV[1] then
+        return {'invalid'}
+    end
+    local token = redis.call('HMGET', KEYS[1], 'id', 'user_id', 'expires_at')
+    redis.call('DEL', KEYS[1])
+    return {'verified', token[1], token[2], token[3], attempts}
+    """
+
+    def __init__(self, audit: bool = False, max_attempts: int = 5):
+        """
+        Args:
+            audit: Publish issued and used codes to ``otp_audit``.
+            max_attempts: Verification attempts allowed per code.
+        """
+        self.audit = audit
+        self.max_attempts = max_attempts
+
+    def _key(self, email: str, purpose: OTPPurpose) -> str:
+        return f"{self.KEY_PREFIX}{purpose.value}:{email}"
+
+    async def _publish_audit(
+        self, session: AsyncSession, action: str, **fields: Any
+    ) -> None:
+        if not self.audit:
+            return
+        try:
+            await get_publisher(session)(
+                OTP_AUDIT_QUEUE,
+                {"action": action, **orjson.loads(orjson.dumps(fields))},
+            )
+        except Exception as e:
+            # The audit trail must never block sign-up or sign-in
+            auth_logger.error(f"Failed to publish OTP audit ({action}): {e}")
+
+    async def issue(
+        self,
+        session: AsyncSession,
+        email: str,
+        purpose: OTPPurpose,
+        code_hash: str,
+        expires_at: datetime,
+        user_id: UUID | None = None,
+    ) -> None:
+        token_id = uuid4()
+        ttl = max(int((expires_at - datetime.now(timezone.utc)).total_seconds()), 1)
+        result = await RedisService.eval(
+            self._ISSUE_SCRIPT,
+            [self._key(email, purpose)],
+            [
+                str(token_id),
+                code_hash,
+                str(user_id or ""),
+                expires_at.isoformat(),
+                str(ttl),
+            ],
+        )
+        if result is None:
+            raise OTPStoreUnavailableException()
+
+        await self._publish_audit(
+            session,
+            "issued",
+            id=token_id,
+            user_id=user_id,
+            email=email,
+            purpose=purpose.value,
+            code_hash=code_hash,
+            expires_at=expires_at,
+        )
+
+    async def consume(
+        self,
+        session: AsyncSession,
+        email: str,
+        purpose: OTPPurpose,
+        code_hash: str,
+        commit_self: bool = True,
+    ) -> OTPCheck:
+        result = await RedisService.eval(
+            self._CONSUME_SCRIPT,
+            [self._key(email, purpose)],
+            [code_hash, str(self.max_attempts)],
+        )
+        if result is None:
+            raise OTPStoreUnavailableException()
+
+        outcome = result[0].decode()
+        if outcome == "verified":
+            token_id, user_id, expires_at, attempts = result[1:]
+            await self._publish_audit(
+                session,
+                "used",
+                id=token_id.decode(),
+                user_id=user_id.decode() or None,
+                email=email,
+                purpose=purpose.value,
+                code_hash=code_hash,
+                expires_at=expires_at.decode(),
+                attempts=attempts,
+                used_at=datetime.now(timezone.utc),
+            )
+        return outcome  # type: ignore[return-value]
+
+
+def create_otp_store(backend: str | None = None) -> OTPStore:
+    """
+    Build the OTP store for ``backend`` (default: OTP_STORE_BACKEND).
+    """
+    if (backend or settings.OTP_STORE_BACKEND) == "redis":
+        return RedisOTPStore(
+            audit=settings.OTP_STORE_AUDIT, max_attempts=settings.OTP_MAX_ATTEMPTS
+        )
+    return DatabaseOTPStore()
+
+
+otp_store = create_otp_store()
+
+
+__all__ = [
+    "DatabaseOTPStore",
+    "OTP_AUDIT_QUEUE",
+    "OTPCheck",
+    "OTPStore",
+    "OTPStoreUnavailableException",
+    "RedisOTPStore",
+    "create_otp_store",
+    "otp_store",
+]
@@ -0,0 +1,135 @@
+"""
+Password hashing off the event loop.
+
+bcrypt is deliberately slow (~100-300 ms per hash or check at cost 12),
+so calling it from a request handler stalls every other request on the
+worker. ``PasswordHasher`` runs it in a dedicated thread pool instead:
+bcrypt releases the GIL while it works, so threads give real parallelism
+without the pickling and start-up cost of a process pool.
+
+Backpressure: at most ``max_pending`` calls are queued or running at
+once. Further callers wait up to ``queue_timeout`` seconds for a slot and
+then get ``RateLimitExceededException`` (429 with ``Retry-After``), so a
+sign-in storm is shed at the door instead of growing an unbounded queue
+whose latency every caller pays.
+
+Cost factor: new hashes use ``rounds`` (``PASSWORD_BCRYPT_ROUNDS``).
+``needs_rehash`` reports hashes made with another cost, which sign-in
+replaces transparently once the password has been verified.
+"""
+
+import asyncio
+import math
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Callable, TypeVar
+
+from app.core.config import auth_logger, settings
+from app.core.exceptions.types import RateLimitExceededException
+from app.core.utils import hash_password, verify_password
+
+T = TypeVar("T")
+
+
+def bcrypt_cost(hashed: str) -> int | None:
+    """
+    Cost factor of a bcrypt hash (``$2b$12$...`` -> 12).
+
+    Returns:
+        The cost, or None if ``hashed`` is not a bcrypt hash.
+    """
+    parts = hashed.split("$")
+    if len(parts) < 4 or not parts[1].startswith("2"):
+        return None
+    try:
+        return int(parts[2])
+    except ValueError:
+        return None
+
+
+class PasswordHasher:
+    """
+    Hashes and verifies passwords in a bounded worker pool.
+
+    Example:
+        >>> hashed = await password_hasher.hash("SecurePass123!")
+        >>> await password_hasher.verify("SecurePass123!", hashed)
+        True
+    """
+
+    def __init__(
+        self,
+        rounds: int,
+        workers: int,
+        max_pending: int,
+        queue_timeout: float,
+    ):
+        self.rounds = rounds
+        self.workers = workers
+        self.max_pending = max_pending
+        self.queue_timeout = queue_timeout
+        self._slots = asyncio.Semaphore(max_pending)
+        self._executor: ThreadPoolExecutor | None = None
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        """Calls currently queued or running in the pool."""
+        return self._pending
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="password-hasher"
+            )
+        return self._executor
+
+    async def _run(self, fn: Callable[[], T]) -> T:
+        try:
+            async with asyncio.timeout(self.queue_timeout):
+                await self._slots.acquire()
+        except TimeoutError:
+            auth_logger.warning(
+                f"Password hasher saturated ({self.max_pending} pending), "
+                "rejecting request"
+            )
+            raise RateLimitExceededException(
+                message="Too many sign-in requests. Please try again shortly.",
+                retry_after=max(1, math.ceil(self.queue_timeout)),
+            )
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), fn)
+        finally:
+            self._pending -= 1
+            self._slots.release()
+
+    async def hash(self, password: str) -> str:
+        """Hash a password with the configured cost."""
+        return await self._run(partial(hash_password, password, rounds=self.rounds))
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        """Check a password against a hash; False for malformed hashes."""
+        return await self._run(partial(verify_password, password, hashed))
+
+    def needs_rehash(self, hashed: str) -> bool:
+        """Whether a (bcrypt) hash was made with a cost other than ``rounds``."""
+        cost = bcrypt_cost(hashed)
+        return cost is not None and cost != self.rounds
+
+    def shutdown(self) -> None:
+        """Stop the worker threads (new calls start a fresh pool)."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    rounds=settings.PASSWORD_BCRYPT_ROUNDS,
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    queue_timeout=settings.PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS,
+)
+
+__all__ = ["PasswordHasher", "bcrypt_cost", "password_hasher"]
@@ -1,12 +1,19 @@
 """
 Rate limiting service with configurable backends.
 
+Besides the single-bucket dependencies (``rate_limit_by_ip`` etc.),
+``RateLimitPolicy`` evaluates an ordered set of buckets (per IP, per
+account, global) in one backend call - one Lua script with Redis - and can
+put repeat offenders in a penalty box whose lockout doubles on every
+strike. Policies are built from specs such as
+``"ip:10/60,email:20/3600,global:5000/60"`` (scope:limit/window seconds).
+
 """
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from datetime import datetime, timezone
-from typing import Callable, Literal
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Collection, Literal, get_args
 
 from fastapi import Request
 
@@ -29,6 +36,8 @@ class RateLimitResult:
         limit: The maximum number of requests allowed.
         reset_at: When the rate limit window resets.
         retry_after: Seconds until the client can retry (only if not allowed).
+        scope: Bucket scope that decided a policy check ("penalty" when the
+            client is locked out); None for single-bucket checks.
     """
 
     allowed: bool
@@ -36,6 +45,80 @@ class RateLimitResult:
     limit: int
     reset_at: datetime
     retry_after: int | None = None
+    scope: str | None = None
+
+
+# Who a policy bucket counts requests for
+RateLimitScope = Literal["ip", "email", "user", "global"]
+
+
+@dataclass(frozen=True)
+class RateLimitBucket:
+    """
+    One bucket of a rate limit policy.
+
+    Attributes:
+        scope: What the bucket counts per (client IP, account email, user
+            ID, or the whole endpoint).
+        limit: Maximum requests allowed in the window.
+        window: Time window in seconds.
+    """
+
+    scope: RateLimitScope
+    limit: int
+    window: int
+
+
+@dataclass(frozen=True)
+class PenaltyBox:
+    """
+    Exponential lockout for repeated failures.
+
+    After ``threshold`` failures within ``window`` seconds the subject is
+    locked out for ``base_lockout`` seconds, doubling with every further
+    strike up to ``max_lockout``. Strikes are forgotten after ``decay``
+    seconds without a lockout.
+    """
+
+    threshold: int
+    window: int
+    base_lockout: int
+    max_lockout: int
+    decay: int = 86400
+
+
+def parse_rate_limit_buckets(spec: str) -> tuple[RateLimitBucket, ...]:
+    """
+    Parse a policy spec into buckets, keeping their order.
+
+    Args:
+        spec: Comma-separated ``scope:limit/window`` entries, e.g.
+            ``"ip:10/60,email:20/3600,global:5000/60"``.
+
+    Returns:
+        The buckets in spec order.
+
+    Raises:
+        ValueError: If an entry is malformed or uses an unknown scope.
+    """
+    buckets = []
+    for entry in filter(None, (part.strip() for part in spec.split(","))):
+        try:
+            scope, rate = entry.split(":")
+            limit, window = (int(value) for value in rate.split("/"))
+        except ValueError:
+            raise ValueError(
+                f"Invalid rate limit bucket '{entry}' (expected scope:limit/window)"
+            ) from None
+        if scope not in get_args(RateLimitScope):
+            raise ValueError(f"Unknown rate limit scope '{scope}' in '{entry}'")
+        if limit < 1 or window < 1:
+            raise ValueError(f"Rate limit bucket '{entry}' must be positive")
+        buckets.append(RateLimitBucket(scope, limit, window))  # type: ignore[arg-type]
+
+    if not buckets:
+        raise ValueError("Rate limit policy needs at least one bucket")
+    return tuple(buckets)
 
 
 class RateLimitBackend(ABC):
@@ -86,6 +169,57 @@ class RateLimitBackend(ABC):
         """
         pass
 
+    @abstractmethod
+    async def check_buckets(
+        self,
+        buckets: list[tuple[str, str, int, int]],
+        locks: list[str],
+    ) -> RateLimitResult:
+        """
+        Check several buckets at once, counting the request in all of them.
+
+        Buckets are checked in order and the first full one denies the
+        request, which is then counted nowhere. A live lock key denies the
+        request before any bucket is looked at.
+
+        Args:
+            buckets: (scope, key, limit, window) per bucket, in policy order.
+            locks: Penalty lock keys to honour.
+
+        Returns:
+            RateLimitResult for the tightest bucket (or the denying one),
+            with ``scope`` set to its scope, or "penalty" for a lockout.
+        """
+        pass
+
+    @abstractmethod
+    async def record_failure(
+        self,
+        subjects: list[tuple[str, str, str]],
+        penalty: PenaltyBox,
+    ) -> int:
+        """
+        Count a failure and lock out subjects that reached the threshold.
+
+        Args:
+            subjects: (failures key, strikes key, lock key) per subject.
+            penalty: The lockout policy.
+
+        Returns:
+            The longest lockout applied in seconds (0 if none).
+        """
+        pass
+
+    @abstractmethod
+    async def clear(self, keys: list[str]) -> None:
+        """
+        Delete several keys (e.g. failure counters after a success).
+
+        Args:
+            keys: The keys to delete.
+        """
+        pass
+
 
 class MemoryBackend(RateLimitBackend):
     """
@@ -206,6 +340,123 @@ class MemoryBackend(RateLimitBackend):
 
         return max(0, limit - count)
 
+    def _live(self, key: str, now: datetime) -> tuple[int, datetime] | None:
+        entry = self._store.get(key)
+        if entry is not None and now >= entry[1]:
+            del self._store[key]
+            return None
+        return entry
+
+    async def check_buckets(
+        self,
+        buckets: list[tuple[str, str, int, int]],
+        locks: list[str],
+    ) -> RateLimitResult:
+        """
+        Check several buckets at once, counting the request in all of them.
+
+        Args:
+            buckets: (scope, key, limit, window) per bucket, in policy order.
+            locks: Penalty lock keys to honour.
+
+        Returns:
+            RateLimitResult for the tightest bucket (or the denying one).
+        """
+        now = datetime.now(timezone.utc)
+
+        for key in locks:
+            lock = self._live(key, now)
+            if lock is not None:
+                retry_after = max(1, int((lock[1] - now).total_seconds()))
+                return RateLimitResult(
+                    allowed=False,
+                    remaining=0,
+                    limit=0,
+                    reset_at=lock[1],
+                    retry_after=retry_after,
+                    scope="penalty",
+                )
+
+        for scope, key, limit, window in buckets:
+            entry = self._live(key, now)
+            if entry is not None and entry[0] >= limit:
+                retry_after = max(1, int((entry[1] - now).total_seconds()))
+                return RateLimitResult(
+                    allowed=False,
+                    remaining=0,
+                    limit=limit,
+                    reset_at=entry[1],
+                    retry_after=retry_after,
+                    scope=scope,
+                )
+
+        tightest: RateLimitResult | None = None
+        for scope, key, limit, window in buckets:
+            entry = self._live(key, now)
+            count, reset_at = entry or (0, now + timedelta(seconds=window))
+            self._store[key] = (count + 1, reset_at)
+            remaining = limit - count - 1
+            if tightest is None or remaining < tightest.remaining:
+                tightest = RateLimitResult(
+                    allowed=True,
+                    remaining=remaining,
+                    limit=limit,
+                    reset_at=reset_at,
+                    scope=scope,
+                )
+
+        assert tightest is not None, "check_buckets needs at least one bucket"
+        return tightest
+
+    async def record_failure(
+        self,
+        subjects: list[tuple[str, str, str]],
+        penalty: PenaltyBox,
+    ) -> int:
+        """
+        Count a failure and lock out subjects that reached the threshold.
+
+        Args:
+            subjects: (failures key, strikes key, lock key) per subject.
+            penalty: The lockout policy.
+
+        Returns:
+            The longest lockout applied in seconds (0 if none).
+        """
+        now = datetime.now(timezone.utc)
+        lockout = 0
+
+        for failures_key, strikes_key, lock_key in subjects:
+            failures, reset_at = self._live(failures_key, now) or (
+                0,
+                now + timedelta(seconds=penalty.window),
+            )
+            failures += 1
+            if failures < penalty.threshold:
+                self._store[failures_key] = (failures, reset_at)
+                continue
+
+            self._store.pop(failures_key, None)
+            strikes = (self._live(strikes_key, now) or (0, now))[0] + 1
+            self._store[strikes_key] = (strikes, now + timedelta(seconds=penalty.decay))
+            seconds = min(
+                penalty.base_lockout * 2 ** (strikes - 1), penalty.max_lockout
+            )
+            self._store[lock_key] = (strikes, now + timedelta(seconds=seconds))
+            lockout = max(lockout, seconds)
+
+        return lockout
+
+    async def clear(self, keys: list[str]) -> None:
+        """
+        Delete several keys.
+
+        Args:
+            keys: The keys to delete.
+        """
+        for key in keys:
+            self._store.pop(key, None)
+
 
 class RedisBackend(RateLimitBackend):
     """
@@ -313,6 +564,173 @@ class RedisBackend(RateLimitBackend):
         except ValueError:
             return limit
 
+    # KEYS: lock keys, then bucket keys; ARGV: lock count, then limit and
+    # window per bucket. Returns {allowed, bucket index (0 = penalty box),
+    # ttl, remaining}.
+    _CHECK_BUCKETS_SCRIPT = """
+    local locks = tonumber(ARGV[1])
+    for i = 1, locks do
+        local ttl = redis.call('TTL', KEYS[i])
+        if ttl > 0 then
+            return {0, 0, ttl, 0}
+        end
+    end
+    local buckets = #KEYS - locks
+    for j = 1, buckets do
+        local key = KEYS[locks + j]
+        local count = tonumber(redis.call('GET', key) or '0')
+        if count >= tonumber(ARGV[2 * j]) then
+            local ttl = redis.call('TTL', key)
+            if ttl < 0 then
+                ttl = tonumber(ARGV[2 * j + 1])
+            end
+            return {0, j, ttl, 0}
+        end
+    end
+    local tightest, tightest_ttl, remaining = 0, 0, 0
+    for j = 1, buckets do
+        local key = KEYS[locks + j]
+        local count = redis.call('INCR', key)
+        if count == 1 then
+            redis.call('EXPIRE', key, ARGV[2 * j + 1])
+        end
+        local left = tonumber(ARGV[2 * j]) - count
+        if tightest == 0 or left < remaining then
+            tightest, remaining = j, left
+            tightest_ttl = redis.call('TTL', key)
+        end
+    end
+    return {1, tightest, tightest_ttl, remaining}
+    """
+
+    # KEYS: failures, strikes and lock key per subject; ARGV: threshold,
+    # window, base lockout, max lockout, strike decay. Returns the longest
+    # lockout applied.
+    _RECORD_FAILURE_SCRIPT = """
+    local lockout = 0
+    for i = 1, #KEYS, 3 do
+        local failures = redis.call('INCR', KEYS[i])
+        if failures == 1 then
+            redis.call('EXPIRE', KEYS[i], ARGV[2])
+        end
+        if failures >= tonumber(ARGV[1]) then
+            redis.call('DEL', KEYS[i])
+            local strikes = redis.call('INCR', KEYS[i + 1])
+            redis.call('EXPIRE', KEYS[i + 1], ARGV[5])
+            local seconds = math.min(
+                tonumber(ARGV[3]) * 2 ^ (strikes - 1), tonumber(ARGV[4]))
+            seconds = math.floor(seconds)
+            redis.call('SET', KEYS[i + 2], strikes, 'EX', seconds)
+            lockout = math.max(lockout, seconds)
+        end
+    end
+    return lockout
+    """
+
+    _CLEAR_SCRIPT = "return redis.call('DEL', unpack(KEYS))"
+
+    async def check_buckets(
+        self,
+        buckets: list[tuple[str, str, int, int]],
+        locks: list[str],
+    ) -> RateLimitResult:
+        """
+        Check several buckets at once in a single Lua script.
+
+        Like ``check``, fails open (allows the request) if Redis is
+        unavailable.
+
+        Args:
+            buckets: (scope, key, limit, window) per bucket, in policy order.
+            locks: Penalty lock keys to honour.
+
+        Returns:
+            RateLimitResult for the tightest bucket (or the denying one).
+        """
+        now = datetime.now(timezone.utc)
+        args = [str(len(locks))]
+        for _, _, limit, window in buckets:
+            args += [str(limit), str(window)]
+
+        result = await RedisService.eval(
+            self._CHECK_BUCKETS_SCRIPT,
+            locks + [key for _, key, _, _ in buckets],
+            args,
+        )
+        if result is None:
+            rate_limit_logger.warning(
+                f"Redis error during rate limit policy check for "
+                f"{buckets[0][1]}, allowing request"
+            )
+            _, _, limit, window = buckets[0]
+            return RateLimitResult(
+                allowed=True,
+                remaining=limit - 1,
+                limit=limit,
+                reset_at=now + timedelta(seconds=window),
+            )
+
+        allowed, index, ttl, remaining = (int(value) for value in result)
+        scope, _, limit, _ = buckets[index - 1] if index else ("penalty", "", 0, 0)
+        reset_at = now + timedelta(seconds=max(ttl, 0))
+        if not allowed:
+            rate_limit_logger.warning(
+                f"Rate limit policy exceeded for {scope} bucket, retry after: {ttl}s"
+            )
+            return RateLimitResult(
+                allowed=False,
+                remaining=0,
+                limit=limit,
+                reset_at=reset_at,
+                retry_after=max(1, ttl),
+                scope=scope,
+            )
+        return RateLimitResult(
+            allowed=True,
+            remaining=remaining,
+            limit=limit,
+            reset_at=reset_at,
+            scope=scope,
+        )
+
+    async def record_failure(
+        self,
+        subjects: list[tuple[str, str, str]],
+        penalty: PenaltyBox,
+    ) -> int:
+        """
+        Count a failure and lock out subjects in a single Lua script.
+
+        Args:
+            subjects: (failures key, strikes key, lock key) per subject.
+            penalty: The lockout policy.
+
+        Returns:
+            The longest lockout applied in seconds (0 if none or on error).
+        """
+        result = await RedisService.eval(
+            self._RECORD_FAILURE_SCRIPT,
+            [key for subject in subjects for key in subject],
+            [
+                str(penalty.threshold),
+                str(penalty.window),
+                str(penalty.base_lockout),
+                str(penalty.max_lockout),
+                str(penalty.decay),
+            ],
+        )
+        return int(result or 0)
+
+    async def clear(self, keys: list[str]) -> None:
+        """
+        Delete several keys in one round trip.
+
+        Args:
+            keys: The keys to delete.
+        """
+        if keys:
+            await RedisService.eval(self._CLEAR_SCRIPT, keys, [])
+
 
 class RateLimiter:
     """
@@ -386,6 +804,49 @@ class RateLimiter:
         """
         return await self._backend.get_remaining(key, limit, window)
 
+    async def check_buckets(
+        self,
+        buckets: list[tuple[str, str, int, int]],
+        locks: list[str],
+    ) -> RateLimitResult:
+        """
+        Check several buckets at once, counting the request in all of them.
+
+        Args:
+            buckets: (scope, key, limit, window) per bucket, in policy order.
+            locks: Penalty lock keys to honour.
+
+        Returns:
+            RateLimitResult for the tightest bucket (or the denying one).
+        """
+        return await self._backend.check_buckets(buckets, locks)
+
+    async def record_failure(
+        self,
+        subjects: list[tuple[str, str, str]],
+        penalty: PenaltyBox,
+    ) -> int:
+        """
+        Count a failure and lock out subjects that reached the threshold.
+
+        Args:
+            subjects: (failures key, strikes key, lock key) per subject.
+            penalty: The lockout policy.
+
+        Returns:
+            The longest lockout applied in seconds (0 if none).
+        """
+        return await self._backend.record_failure(subjects, penalty)
+
+    async def clear(self, keys: list[str]) -> None:
+        """
+        Delete several keys.
+
+        Args:
+            keys: The keys to delete.
+        """
+        await self._backend.clear(keys)
+
 
 def format_rate_limit_key(
     key_type: Literal["ip", "user", "endpoint", "email"],
@@ -615,13 +1076,264 @@ def rate_limit_by_email(
     return check
 
 
+# Policies built so far, so tests can reset in-memory state between runs
+_policies: list["RateLimitPolicy"] = []
+
+
+class RateLimitPolicy:
+    """
+    Layered rate limit: ordered buckets checked in one backend call.
+
+    A policy such as "10/min per IP, 20/hour per account, 5000/min for the
+    endpoint" counts each request in every bucket at once (one Lua script
+    with Redis); the first full bucket denies the request. With a
+    ``PenaltyBox``, the route reports failures (e.g. wrong passwords) via
+    ``record_failure`` and subjects that keep failing are locked out with
+    an exponentially growing lockout.
+
+    The policy is usable directly as a FastAPI dependency when its buckets
+    only need the request (IP and global scopes); otherwise call ``check``
+    with the account's email or user ID. Buckets whose subject isn't known
+    for a request are skipped.
+
+    Example:
+        >>> signin_limit = RateLimitPolicy.from_spec(
+        ...     "signin", "ip:10/60,email:20/3600,global:5000/60",
+        ...     penalty=PenaltyBox(threshold=5, window=900,
+        ...                        base_lockout=60, max_lockout=3600),
+        ... )
+        >>> await signin_limit.check(request, email=data.email)
+        >>> # ... on a wrong password:
+        >>> await signin_limit.record_failure(request, email=data.email)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        buckets: tuple[RateLimitBucket, ...],
+        penalty: PenaltyBox | None = None,
+        backend: Literal["memory", "redis"] | None = None,
+    ):
+        """
+        Initialize the policy.
+
+        Args:
+            name: Policy name (for logs).
+            buckets: Buckets in the order they are checked.
+            penalty: Optional lockout for repeated failures.
+            backend: Backend type. Defaults to settings.RATE_LIMIT_BACKEND.
+        """
+        self.name = name
+        self.buckets = buckets
+        self.penalty = penalty
+        # One limiter per policy, so the memory backend keeps its counts
+        self._limiter = RateLimiter(backend=backend)
+        _policies.append(self)
+
+    @classmethod
+    def from_spec(
+        cls,
+        name: str,
+        spec: str,
+        penalty: PenaltyBox | None = None,
+        backend: Literal["memory", "redis"] | None = None,
+    ) -> "RateLimitPolicy":
+        """
+        Build a policy from a spec string (see ``parse_rate_limit_buckets``).
+
+        Raises:
+            ValueError: If the spec is invalid.
+        """
+        return cls(name, parse_rate_limit_buckets(spec), penalty, backend)
+
+    @staticmethod
+    def _subjects(
+        request: Request, email: str | None, user_id: str | None
+    ) -> dict[str, str]:
+        subjects = {
+            "ip": request.client.host if request.client else "unknown",
+            "global": request.url.path,
+        }
+        if email:
+            subjects["email"] = email.lower()
+        if user_id:
+            subjects["user"] = user_id
+        return subjects
+
+    def _penalty_keys(
+        self,
+        request: Request,
+        email: str | None,
+        user_id: str | None,
+        scopes: Collection[str] | None = None,
+    ) -> list[tuple[str, str, str]]:
+        endpoint = request.url.path
+        keys = []
+        for scope, identifier in self._subjects(request, email, user_id).items():
+            if scope == "global" or scope not in {b.scope for b in self.buckets}:
+                continue
+            if scopes is not None and scope not in scopes:
+                continue
+            base = f"rate_limit_penalty:{scope}:{identifier}:{endpoint}"
+            keys.append((f"{base}:failures", f"{base}:strikes", f"{base}:lock"))
+        return keys
+
+    async def check(
+        self,
+        request: Request,
+        email: str | None = None,
+        user_id: str | None = None,
+    ) -> RateLimitResult:
+        """
+        Count the request in every bucket, or reject it.
+
+        Args:
+            request: The incoming request (client IP and path).
+            email: Account email, for ``email`` buckets.
+            user_id: Authenticated user ID, for ``user`` buckets.
+
+        Returns:
+            RateLimitResult for the tightest bucket.
+
+        Raises:
+            RateLimitExceededException: If a bucket is full or the client is
+                in the penalty box.
+        """
+        endpoint = request.url.path
+        subjects = self._subjects(request, email, user_id)
+        buckets = [
+            (
+                bucket.scope,
+                format_rate_limit_key(
+                    "endpoint" if bucket.scope == "global" else bucket.scope,
+                    subjects[bucket.scope],
+                    endpoint,
+                ),
+                bucket.limit,
+                bucket.window,
+            )
+            for bucket in self.buckets
+            if bucket.scope in subjects
+        ]
+        if not buckets:
+            raise ValueError(f"Rate limit policy '{self.name}' has no usable bucket")
+
+        locks = (
+            [lock for _, _, lock in self._penalty_keys(request, email, user_id)]
+            if self.penalty
+            else []
+        )
+        result = await self._limiter.check_buckets(buckets, locks)
+
+        if not result.allowed:
+            if result.scope == "penalty":
+                message = (
+                    f"Too many failed attempts. "
+                    f"Try again in {result.retry_after} seconds."
+                )
+            else:
+                message = (
+                    f"Rate limit exceeded. Try again in {result.retry_after} seconds."
+                )
+            raise RateLimitExceededException(
+                message=message, retry_after=result.retry_after
+            )
+
+        return result
+
+    async def __call__(self, request: Request) -> RateLimitResult:
+        """FastAPI dependency form of ``check`` (IP and global buckets)."""
+        return await self.check(request)
+
+    async def record_failure(
+        self,
+        request: Request,
+        email: str | None = None,
+        user_id: str | None = None,
+    ) -> int:
+        """
+        Count a failed attempt towards the penalty box.
+
+        Args:
+            request: The incoming request.
+            email: Account email the attempt was for.
+            user_id: User ID the attempt was for.
+
+        Returns:
+            Lockout applied in seconds (0 if none, or without a penalty box).
+        """
+        if self.penalty is None:
+            return 0
+
+        lockout = await self._limiter.record_failure(
+            self._penalty_keys(request, email, user_id), self.penalty
+        )
+        if lockout:
+            rate_limit_logger.warning(
+                f"Rate limit policy '{self.name}' locked out "
+                f"{request.url.path} for {lockout}s"
+            )
+        return lockout
+
+    async def record_success(
+        self,
+        request: Request,
+        email: str | None = None,
+        user_id: str | None = None,
+    ) -> None:
+        """
+        Forget the account's failed attempts after a success (strikes are
+        kept).
+
+        Only account-scoped counters (email, user) are cleared: a client
+        could otherwise reset its IP's count by signing in to its own
+        account between guesses at other accounts.
+
+        Args:
+            request: The incoming request.
+            email: Account email the attempt was for.
+            user_id: User ID the attempt was for.
+        """
+        if self.penalty is None:
+            return
+
+        keys = self._penalty_keys(request, email, user_id, scopes=("email", "user"))
+        if keys:
+            await self._limiter.clear([failures for failures, _, _ in keys])
+
+
+def penalty_box_from_settings() -> PenaltyBox:
+    """Build the auth penalty box from the RATE_LIMIT_PENALTY_* settings."""
+    return PenaltyBox(
+        threshold=settings.RATE_LIMIT_PENALTY_THRESHOLD,
+        window=settings.RATE_LIMIT_PENALTY_WINDOW,
+        base_lockout=settings.RATE_LIMIT_PENALTY_BASE_LOCKOUT,
+        max_lockout=settings.RATE_LIMIT_PENALTY_MAX_LOCKOUT,
+        decay=settings.RATE_LIMIT_PENALTY_DECAY,
+    )
+
+
+def reset_policies() -> None:
+    """Reset the in-memory state of every policy (for tests)."""
+    for policy in _policies:
+        if isinstance(policy._limiter._backend, MemoryBackend):
+            policy._limiter._backend._store.clear()
+
+
 __all__ = [
     "RateLimitResult",
     "RateLimitBackend",
     "MemoryBackend",
     "RedisBackend",
     "RateLimiter",
+    "RateLimitBucket",
+    "RateLimitPolicy",
+    "RateLimitScope",
+    "PenaltyBox",
     "format_rate_limit_key",
+    "parse_rate_limit_buckets",
+    "penalty_box_from_settings",
+    "reset_policies",
     "rate_limit_by_email",
     "rate_limit_by_ip",
     "rate_limit_by_user",
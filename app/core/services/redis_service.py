@@ -5,6 +5,8 @@ Redis service for caching and rate limiting.
 
 from __future__ import annotations
 
+from typing import Any
+
 from redis.asyncio import Redis
 
 from app.core.config import redis_logger, settings
@@ -469,6 +471,149 @@ class RedisService:
             redis_logger.error(f"Redis rate_limit_incr({key}) failed: {str(e)}")
             return None
 
+    # Lua scripts for lease-based claims. A lease is a key holding the
+    # owner's token with a millisecond expiry; only the owner may renew,
+    # complete or release it.
+    # Returns the key's value after the claim (ARGV[1] if we acquired it)
+    _ACQUIRE_LEASE_SCRIPT = """
+    if redis.call('SET', KEYS[1], ARGV[1], 'NX', 'PX', ARGV[2]) then
+        return ARGV[1]
+    end
+    return redis.call('GET', KEYS[1])
+    """
+
+    _RENEW_LEASE_SCRIPT = """
+    if redis.call('GET', KEYS[1]) == ARGV[1] then
+        return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+    end
+    return 0
+    """
+
+    # Also completes when the lease expired and nobody else claimed the key
+    _COMPLETE_LEASE_SCRIPT = """
+    local current = redis.call('GET', KEYS[1])
+    if current == false or current == ARGV[1] then
+        redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+        return 1
+    end
+    return 0
+    """
+
+    _RELEASE_LEASE_SCRIPT = """
+    if redis.call('GET', KEYS[1]) == ARGV[1] then
+        return redis.call('DEL', KEYS[1])
+    end
+    return 0
+    """
+
+    @classmethod
+    async def acquire_lease(cls, key: str, token: str, lease_ms: int) -> str | None:
+        """
+        Atomically claim a key with an expiring lease (SET NX PX).
+
+        Args:
+            key: The key to claim.
+            token: Value identifying this claimant.
+            lease_ms: Lease duration in milliseconds.
+
+        Returns:
+            The key's value after the claim: ``token`` if the lease was
+            acquired, otherwise the value held by the current owner.
+            None if Redis is unavailable.
+        """
+        if cls._client is None:
+            redis_logger.warning(
+                f"Redis acquire_lease({key}) attempted but client not initialized"
+            )
+            return None
+
+        try:
+            result = await cls._client.eval(  # type: ignore[misc]
+                cls._ACQUIRE_LEASE_SCRIPT, 1, key, token, str(lease_ms)
+            )
+            value = result.decode("utf-8") if isinstance(result, bytes) else result
+            redis_logger.debug(f"Redis acquire_lease({key}) value={value}")
+            return value
+        except Exception as e:
+            redis_logger.error(f"Redis acquire_lease({key}) failed: {str(e)}")
+            return None
+
+    @classmethod
+    async def _lease_script(cls, name: str, script: str, key: str, *args: str) -> bool:
+        if cls._client is None:
+            redis_logger.warning(
+                f"Redis {name}({key}) attempted but client not initialized"
+            )
+            return False
+
+        try:
+            result = await cls._client.eval(script, 1, key, *args)  # type: ignore[misc]
+            return bool(result)
+        except Exception as e:
+            redis_logger.error(f"Redis {name}({key}) failed: {str(e)}")
+            return False
+
+    @classmethod
+    async def eval(cls, script: str, keys: list[str], args: list[str]) -> Any:
+        """
+        Run a Lua script atomically.
+
+        Args:
+            script: The Lua source.
+            keys: Keys the script touches (``KEYS``).
+            args: Script arguments (``ARGV``).
+
+        Returns:
+            The script's result (bulk strings as bytes), or None if Redis
+            is unavailable or the script failed.
+        """
+        if cls._client is None:
+            redis_logger.warning("Redis eval attempted but client not initialized")
+            return None
+
+        try:
+            return await cls._client.eval(script, len(keys), *keys, *args)  # type: ignore[misc]
+        except Exception as e:
+            redis_logger.error(f"Redis eval({', '.join(keys)}) failed: {str(e)}")
+            return None
+
+    @classmethod
+    async def renew_lease(cls, key: str, token: str, lease_ms: int) -> bool:
+        """
+        Extend a lease we still own.
+
+        Returns:
+            bool: True if renewed, False if the lease was lost or on error.
+        """
+        return await cls._lease_script(
+            "renew_lease", cls._RENEW_LEASE_SCRIPT, key, token, str(lease_ms)
+        )
+
+    @classmethod
+    async def complete_lease(cls, key: str, token: str, value: str, ttl: int) -> bool:
+        """
+        Replace our lease with a completion marker kept for ``ttl`` seconds.
+
+        Returns:
+            bool: True if the marker was written, False if another claimant
+            owns the key or on error.
+        """
+        return await cls._lease_script(
+            "complete_lease", cls._COMPLETE_LEASE_SCRIPT, key, token, value, str(ttl)
+        )
+
+    @classmethod
+    async def release_lease(cls, key: str, token: str) -> bool:
+        """
+        Drop a lease we own so the key can be claimed again immediately.
+
+        Returns:
+            bool: True if released, False if not owned or on error.
+        """
+        return await cls._lease_script(
+            "release_lease", cls._RELEASE_LEASE_SCRIPT, key, token
+        )
+
     @classmethod
     async def hset(
         cls, key: str, field: str, value: str, ttl: int | None = None
@@ -559,6 +704,30 @@ class RedisService:
             redis_logger.error(f"Redis hgetall({key}) failed: {str(e)}")
             return None
 
+    @classmethod
+    async def hdel(cls, key: str, *fields: str) -> int:
+        """
+        Delete fields from a hash.
+
+        Args:
+            key: The hash key.
+            fields: The field names to delete.
+
+        Returns:
+            Number of fields deleted (0 on error).
+        """
+        if cls._client is None:
+            redis_logger.warning(
+                f"Redis hdel({key}) attempted but client not initialized"
+            )
+            return 0
+
+        try:
+            return await cls._client.hdel(key, *fields)  # type: ignore[misc]
+        except Exception as e:
+            redis_logger.error(f"Redis hdel({key}) failed: {str(e)}")
+            return 0
+
     @classmethod
     async def sadd(cls, key: str, *members: str) -> int | None:
         """
@@ -0,0 +1,462 @@
+"""
+Refresh token session stores.
+
+A session is one refresh token (stored by its SHA256 hash) issued to a
+user on one device. ``AuthService`` reads and writes sessions through a
+``SessionStore`` chosen by ``SESSION_STORE_BACKEND``:
+
+- ``database`` (default): the ``refresh_tokens`` table.
+- ``redis``: per-session hashes that expire with the token, plus a sorted
+  set of each user's sessions. Signing out everywhere bumps a per-user
+  generation counter instead of touching every session, so it costs the
+  same for one session as for a thousand. With ``SESSION_STORE_AUDIT``,
+  session changes are also published to the ``refresh_session_audit``
+  queue, whose handler records them in ``refresh_tokens``.
+
+Expired and revoked rows in ``refresh_tokens`` are pruned by the scheduled
+``cleanup_refresh_tokens`` job.
+"""
+
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Any
+from uuid import UUID, uuid4
+
+import orjson
+from fastapi import status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import auth_logger, settings
+from app.core.db.crud import refresh_token_db
+from app.core.db.models import RefreshToken
+from app.core.exceptions.types import AppException
+from app.core.services.event_publisher import get_publisher
+from app.core.services.redis_service import RedisService
+
+SESSION_AUDIT_QUEUE = "refresh_session_audit"
+
+
+@dataclass(frozen=True)
+class SessionRecord:
+    """
+    A refresh token session.
+
+    Attributes:
+        id: Session ID.
+        user_id: Owner of the session.
+        token_hash: SHA256 hash of the refresh token.
+        created_at: When the session was created (sign-in time).
+        expires_at: When the refresh token expires.
+        device_info: Optional device/client information.
+    """
+
+    id: UUID
+    user_id: UUID
+    token_hash: str
+    created_at: datetime
+    expires_at: datetime
+    device_info: str | None = None
+
+    @classmethod
+    def from_model(cls, token: RefreshToken) -> "SessionRecord":
+        return cls(
+            id=token.id,
+            user_id=token.user_id,
+            token_hash=token.token_hash,
+            created_at=token.created_at,
+            expires_at=token.expires_at,
+            device_info=token.device_info,
+        )
+
+    def to_json(self) -> str:
+        return orjson.dumps(asdict(self)).decode()
+
+    @classmethod
+    def from_json(cls, raw: str | bytes) -> "SessionRecord":
+        data = orjson.loads(raw)
+        return cls(
+            id=UUID(data["id"]),
+            user_id=UUID(data["user_id"]),
+            token_hash=data["token_hash"],
+            created_at=datetime.fromisoformat(data["created_at"]),
+            expires_at=datetime.fromisoformat(data["expires_at"]),
+            device_info=data.get("device_info"),
+        )
+
+
+class SessionStoreUnavailableException(AppException):
+    """Exception raised when sessions cannot be written."""
+
+    def __init__(self, message: str = "Session store is unavailable."):
+        super().__init__(message, status.HTTP_503_SERVICE_UNAVAILABLE)
+
+
+class SessionStore(ABC):
+    """Abstract refresh token session store."""
+
+    @abstractmethod
+    async def create(
+        self,
+        session: AsyncSession,
+        user_id: UUID,
+        token_hash: str,
+        expires_at: datetime,
+        device_info: str | None = None,
+        commit_self: bool = True,
+    ) -> SessionRecord:
+        """Store a new session."""
+
+    @abstractmethod
+    async def get_valid(
+        self, session: AsyncSession, token_hash: str
+    ) -> SessionRecord | None:
+        """Find a session that is neither expired nor revoked."""
+
+    @abstractmethod
+    async def revoke(
+        self, session: AsyncSession, token_hash: str, commit_self: bool = True
+    ) -> bool:
+        """Revoke one session; False if it was not active."""
+
+    @abstractmethod
+    async def revoke_all(
+        self, session: AsyncSession, user_id: UUID, commit_self: bool = True
+    ) -> int:
+        """Revoke every session of a user; returns how many were active."""
+
+    @abstractmethod
+    async def list_active(
+        self, session: AsyncSession, user_id: UUID
+    ) -> list[SessionRecord]:
+        """Active sessions of a user."""
+
+    @abstractmethod
+    async def cleanup_expired(
+        self, session: AsyncSession, commit_self: bool = True
+    ) -> int:
+        """Remove expired and revoked sessions; returns how many."""
+
+
+class DatabaseSessionStore(SessionStore):
+    """Session store backed by the ``refresh_tokens`` table."""
+
+    async def create(
+        self,
+        session: AsyncSession,
+        user_id: UUID,
+        token_hash: str,
+        expires_at: datetime,
+        device_info: str | None = None,
+        commit_self: bool = True,
+    ) -> SessionRecord:
+        token = await refresh_token_db.create(
+            session=session,
+            data={
+                "user_id": user_id,
+                "token_hash": token_hash,
+                "expires_at": expires_at,
+                "device_info": device_info,
+            },
+            commit_self=commit_self,
+        )
+        return SessionRecord.from_model(token)
+
+    async def get_valid(
+        self, session: AsyncSession, token_hash: str
+    ) -> SessionRecord | None:
+        # Read in its own transaction when the caller has none, so the
+        # session is free for the user lookup that follows a refresh
+        if session.in_transaction():
+            token = await refresh_token_db.get_valid_token(session, token_hash)
+        else:
+            async with session.begin():
+                token = await refresh_token_db.get_valid_token(session, token_hash)
+        return SessionRecord.from_model(token) if token else None
+
+    async def revoke(
+        self, session: AsyncSession, token_hash: str, commit_self: bool = True
+    ) -> bool:
+        return await refresh_token_db.revoke(
+            session=session, token_hash=token_hash, commit_self=commit_self
+        )
+
+    async def revoke_all(
+        self, session: AsyncSession, user_id: UUID, commit_self: bool = True
+    ) -> int:
+        return await refresh_token_db.revoke_all_for_user(
+            session=session, user_id=user_id, commit_self=commit_self
+        )
+
+    async def list_active(
+        self, session: AsyncSession, user_id: UUID
+    ) -> list[SessionRecord]:
+        tokens = await refresh_token_db.get_active_tokens_for_user(
+            session=session, user_id=user_id
+        )
+        return [SessionRecord.from_model(token) for token in tokens]
+
+    async def cleanup_expired(
+        self, session: AsyncSession, commit_self: bool = True
+    ) -> int:
+        return await refresh_token_db.cleanup_expired(
+            session=session, commit_self=commit_self
+        )
+
+
+class RedisSessionStore(SessionStore):
+    """
+    Session store backed by Redis.
+
+    Keys:
+        - ``refresh_session:{token_hash}``: hash of ``data`` (the record as
+          JSON), ``user`` and ``gen``, expiring with the token.
+        - ``user_sessions:{user_id}``: sorted set of the user's token
+          hashes scored by expiry.
+        - ``user_session_gen:{user_id}``: the user's session generation.
+          A session is valid only while its ``gen`` equals this counter.
+
+    The scripts derive per-user keys from the session's ``user`` field, so
+    every key of a user must live on one Redis node.
+    """
+
+    SESSION_PREFIX = "refresh_session:"
+    USER_SESSIONS_PREFIX = "user_sessions:"
+    GENERATION_PREFIX = "user_session_gen:"
+
+    # KEYS: session, user sessions, generation
+    # ARGV: data, ttl, expires_at (epoch), token_hash, now (epoch), user_id
+    _CREATE_SCRIPT = """
+    local gen = redis.call('GET', KEYS[3]) or '0'
+    local ttl = tonumber(ARGV[2])
+    redis.call('HSET', KEYS[1], 'data', ARGV[1], 'user', ARGV[6], 'gen', gen)
+    redis.call('EXPIRE', KEYS[1], ttl)
+    redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', ARGV[5])
+    redis.call('ZADD', KEYS[2], ARGV[3], ARGV[4])
+    if redis.call('TTL', KEYS[2]) < ttl then
+        redis.call('EXPIRE', KEYS[2], ttl)
+    end
+    -- The counter must outlive every session stamped with it
+    if gen ~= '0' and redis.call('TTL', KEYS[3]) < ttl then
+        redis.call('EXPIRE', KEYS[3], ttl)
+    end
+    return gen
+    """
+
+    # KEYS: session; ARGV: generation prefix
+    _GET_SCRIPT = """
+    local s = redis.call('HMGET', KEYS[1], 'data', 'user', 'gen')
+    if not s[1] then
+        return false
+    end
+    if (redis.call('GET', ARGV[1] .. s[2]) or '0') ~= s[3] then
+        return false
+    end
+    return s[1]
+    """
+
+    # KEYS: session; ARGV: user sessions prefix, generation prefix, token_hash
+    _REVOKE_SCRIPT = """
+    local s = redis.call('HMGET', KEYS[1], 'user', 'gen')
+    if not s[1] then
+        return 0
+    end
+    redis.call('DEL', KEYS[1])
+    redis.call('ZREM', ARGV[1] .. s[1], ARGV[3])
+    if (redis.call('GET', ARGV[2] .. s[1]) or '0') ~= s[2] then
+        return 0
+    end
+    return 1
+    """
+
+    # KEYS: user sessions, generation; ARGV: now (epoch), minimum ttl
+    _REVOKE_ALL_SCRIPT = """
+    local count = redis.call('ZCOUNT', KEYS[1], '(' .. ARGV[1], '+inf')
+    local ttl = math.max(redis.call('TTL', KEYS[1]), tonumber(ARGV[2]))
+    redis.call('UNLINK', KEYS[1])
+    redis.call('INCR', KEYS[2])
+    if redis.call('TTL', KEYS[2]) < ttl then
+        redis.call('EXPIRE', KEYS[2], ttl)
+    end
+    return count
+    """
+
+    # KEYS: user sessions, generation; ARGV: now (epoch), session prefix
+    _LIST_SCRIPT = """
+    redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', ARGV[1])
+    local gen = redis.call('GET', KEYS[2]) or '0'
+    local active = {}
+    for _, hash in ipairs(redis.call('ZRANGE', KEYS[1], 0, -1)) do
+        local s = redis.call('HMGET', ARGV[2] .. hash, 'data', 'gen')
+        if s[1] and s[2] == gen then
+            table.insert(active, s[1])
+        else
+            redis.call('ZREM', KEYS[1], hash)
+        end
+    end
+    return active
+    """
+
+    def __init__(self, audit: bool = False, min_generation_ttl: int = 30 * 86400):
+        """
+        Args:
+            audit: Publish session changes to ``refresh_session_audit``.
+            min_generation_ttl: Minimum lifetime (seconds) of a bumped
+                generation counter; at least the longest session lifetime.
+        """
+        self.audit = audit
+        self.min_generation_ttl = min_generation_ttl
+
+    def _session_key(self, token_hash: str) -> str:
+        return f"{self.SESSION_PREFIX}{token_hash}"
+
+    def _user_sessions_key(self, user_id: UUID) -> str:
+        return f"{self.USER_SESSIONS_PREFIX}{user_id}"
+
+    def _generation_key(self, user_id: UUID) -> str:
+        return f"{self.GENERATION_PREFIX}{user_id}"
+
+    async def _publish_audit(
+        self, session: AsyncSession, action: str, **fields: Any
+    ) -> None:
+        if not self.audit:
+            return
+        try:
+            await get_publisher(session)(
+                SESSION_AUDIT_QUEUE,
+                {"action": action, **orjson.loads(orjson.dumps(fields))},
+            )
+        except Exception as e:
+            # The audit trail must never block authentication
+            auth_logger.error(f"Failed to publish session audit ({action}): {e}")
+
+    async def create(
+        self,
+        session: AsyncSession,
+        user_id: UUID,
+        token_hash: str,
+        expires_at: datetime,
+        device_info: str | None = None,
+        commit_self: bool = True,
+    ) -> SessionRecord:
+        now = datetime.now(timezone.utc)
+        record = SessionRecord(
+            id=uuid4(),
+            user_id=user_id,
+            token_hash=token_hash,
+            created_at=now,
+            expires_at=expires_at,
+            device_info=device_info,
+        )
+        ttl = max(int((expires_at - now).total_seconds()), 1)
+        result = await RedisService.eval(
+            self._CREATE_SCRIPT,
+            [
+                self._session_key(token_hash),
+                self._user_sessions_key(user_id),
+                self._generation_key(user_id),
+            ],
+            [
+                record.to_json(),
+                str(ttl),
+                str(expires_at.timestamp()),
+                token_hash,
+                str(now.timestamp()),
+                str(user_id),
+            ],
+        )
+        if result is None:
+            raise SessionStoreUnavailableException()
+
+        await self._publish_audit(session, "created", **asdict(record))
+        return record
+
+    async def get_valid(
+        self, session: AsyncSession, token_hash: str
+    ) -> SessionRecord | None:
+        raw = await RedisService.eval(
+            self._GET_SCRIPT,
+            [self._session_key(token_hash)],
+            [self.GENERATION_PREFIX],
+        )
+        if not raw:
+            return None
+        record = SessionRecord.from_json(raw)
+        if record.expires_at <= datetime.now(timezone.utc):
+            return None
+        return record
+
+    async def revoke(
+        self, session: AsyncSession, token_hash: str, commit_self: bool = True
+    ) -> bool:
+        result = await RedisService.eval(
+            self._REVOKE_SCRIPT,
+            [self._session_key(token_hash)],
+            [self.USER_SESSIONS_PREFIX, self.GENERATION_PREFIX, token_hash],
+        )
+        if result is None:
+            raise SessionStoreUnavailableException()
+
+        revoked = bool(result)
+        if revoked:
+            await self._publish_audit(session, "revoked", token_hash=token_hash)
+        return revoked
+
+    async def revoke_all(
+        self, session: AsyncSession, user_id: UUID, commit_self: bool = True
+    ) -> int:
+        now = datetime.now(timezone.utc)
+        result = await RedisService.eval(
+            self._REVOKE_ALL_SCRIPT,
+            [self._user_sessions_key(user_id), self._generation_key(user_id)],
+            [str(now.timestamp()), str(self.min_generation_ttl)],
+        )
+        if result is None:
+            raise SessionStoreUnavailableException()
+
+        await self._publish_audit(
+            session, "revoked_all", user_id=user_id, revoked_at=now
+        )
+        return int(result)
+
+    async def list_active(
+        self, session: AsyncSession, user_id: UUID
+    ) -> list[SessionRecord]:
+        result = await RedisService.eval(
+            self._LIST_SCRIPT,
+            [self._user_sessions_key(user_id), self._generation_key(user_id)],
+            [str(datetime.now(timezone.utc).timestamp()), self.SESSION_PREFIX],
+        )
+        records = [SessionRecord.from_json(raw) for raw in result or []]
+        return sorted(records, key=lambda record: record.created_at)
+
+    async def cleanup_expired(
+        self, session: AsyncSession, commit_self: bool = True
+    ) -> int:
+        # Sessions expire through their TTL and are pruned from the
+        # per-user sets on the next create/list
+        return 0
+
+
+def create_session_store(backend: str | None = None) -> SessionStore:
+    """
+    Build the session store for ``backend`` (default: SESSION_STORE_BACKEND).
+    """
+    if (backend or settings.SESSION_STORE_BACKEND) == "redis":
+        return RedisSessionStore(audit=settings.SESSION_STORE_AUDIT)
+    return DatabaseSessionStore()
+
+
+session_store = create_session_store()
+
+
+__all__ = [
+    "DatabaseSessionStore",
+    "RedisSessionStore",
+    "SESSION_AUDIT_QUEUE",
+    "SessionRecord",
+    "SessionStore",
+    "SessionStoreUnavailableException",
+    "create_session_store",
+    "session_store",
+]
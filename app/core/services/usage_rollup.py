@@ -0,0 +1,221 @@
+"""
+Usage summary helpers shared by the API and Career products.
+
+- Resolving and bounding the requested summary window
+- Latency percentile estimation from rollup histograms
+- Folding rollup rows into a ``UsageSummaryResponse``
+
+Rollup rows are written by the usage commit path (see
+``app.core.db.crud.usage_rollup``) and are the only source read by the
+usage summary endpoints, so summary cost depends on the number of buckets,
+not the number of logs.
+"""
+
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any, Iterable, Sequence
+
+from app.core.db.crud.usage_rollup import (
+    LATENCY_HISTOGRAM_BOUNDS_MS,
+    LATENCY_HISTOGRAM_SIZE,
+    truncate_to_bucket,
+)
+from app.core.enums import FeatureKey, UsageRollupGranularity
+from app.core.exceptions.types import BadRequestException
+from app.core.schemas.usage import (
+    UsageFeatureSummary,
+    UsageSeriesPoint,
+    UsageStats,
+    UsageSummaryResponse,
+)
+
+# Default and maximum summary window per granularity. The maximum keeps a
+# single summary read bounded to ~750 buckets per feature.
+SUMMARY_DEFAULT_WINDOW: dict[UsageRollupGranularity, timedelta] = {
+    UsageRollupGranularity.HOUR: timedelta(hours=24),
+    UsageRollupGranularity.DAY: timedelta(days=30),
+}
+SUMMARY_MAX_WINDOW: dict[UsageRollupGranularity, timedelta] = {
+    UsageRollupGranularity.HOUR: timedelta(days=31),
+    UsageRollupGranularity.DAY: timedelta(days=366),
+}
+
+
+def resolve_summary_window(
+    granularity: UsageRollupGranularity,
+    start: datetime | None,
+    end: datetime | None,
+) -> tuple[datetime, datetime]:
+    """
+    Resolve and validate the window requested from a usage summary endpoint.
+
+    Missing bounds default to the trailing ``SUMMARY_DEFAULT_WINDOW`` ending
+    now. Rollups are read in whole buckets: the start is aligned down to
+    its bucket and any bucket starting before ``end`` is included, so the
+    first and last buckets may cover usage just outside the requested
+    bounds.
+
+    Args:
+        granularity: Requested bucket size.
+        start: Optional inclusive window start.
+        end: Optional exclusive window end.
+
+    Returns:
+        Tuple of ``(start, end)``.
+
+    Raises:
+        BadRequestException: If the window is empty or too large.
+    """
+    if end is None:
+        end = datetime.now(timezone.utc)
+    elif end.tzinfo is None:
+        end = end.replace(tzinfo=timezone.utc)
+    if start is None:
+        start = end - SUMMARY_DEFAULT_WINDOW[granularity]
+    start = truncate_to_bucket(start, granularity)
+
+    if start >= end:
+        raise BadRequestException("'start' must be before 'end'.")
+    if end - start > SUMMARY_MAX_WINDOW[granularity]:
+        raise BadRequestException(
+            f"Window too large for {granularity.value} granularity "
+            f"(max {SUMMARY_MAX_WINDOW[granularity].days} days)."
+        )
+    return start, end
+
+
+def estimate_latency_percentile(
+    histogram: Sequence[int], percentile: float
+) -> float | None:
+    """
+    Estimate a latency percentile from a fixed-bound histogram.
+
+    Interpolates linearly inside the slot containing the target rank.
+    Observations in the overflow slot are reported at the last bound.
+
+    Args:
+        histogram: Slot counts aligned with ``LATENCY_HISTOGRAM_BOUNDS_MS``.
+        percentile: Percentile in the ``(0, 100]`` range.
+
+    Returns:
+        The estimated latency in milliseconds, or ``None`` for an empty
+        histogram.
+    """
+    total = sum(histogram)
+    if total == 0:
+        return None
+
+    rank = total * percentile / 100
+    cumulative = 0
+    for index, count in enumerate(histogram):
+        if count == 0:
+            continue
+        if cumulative + count >= rank:
+            if index >= len(LATENCY_HISTOGRAM_BOUNDS_MS):
+                return float(LATENCY_HISTOGRAM_BOUNDS_MS[-1])
+            lower = LATENCY_HISTOGRAM_BOUNDS_MS[index - 1] if index > 0 else 0
+            upper = LATENCY_HISTOGRAM_BOUNDS_MS[index]
+            fraction = (rank - cumulative) / count
+            return round(lower + (upper - lower) * fraction, 2)
+        cumulative += count
+    return float(LATENCY_HISTOGRAM_BOUNDS_MS[-1])
+
+
+class _Accumulator:
+    """Mutable running totals used while folding rollup rows."""
+
+    def __init__(self) -> None:
+        self.request_count = 0
+        self.success_count = 0
+        self.failed_count = 0
+        self.credits_charged = Decimal("0")
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.latency_ms_sum = 0
+        self.latency_count = 0
+        self.histogram = [0] * LATENCY_HISTOGRAM_SIZE
+
+    def add(self, row: Any) -> None:
+        self.request_count += row.request_count
+        self.success_count += row.success_count
+        self.failed_count += row.failed_count
+        self.credits_charged += Decimal(row.credits_charged or 0)
+        self.input_tokens += row.input_tokens
+        self.output_tokens += row.output_tokens
+        self.latency_ms_sum += row.latency_ms_sum
+        self.latency_count += row.latency_count
+        for index, count in enumerate(row.latency_histogram or []):
+            if index < LATENCY_HISTOGRAM_SIZE:
+                self.histogram[index] += count
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "request_count": self.request_count,
+            "success_count": self.success_count,
+            "failed_count": self.failed_count,
+            "credits_charged": self.credits_charged,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "avg_latency_ms": (
+                round(self.latency_ms_sum / self.latency_count, 2)
+                if self.latency_count
+                else None
+            ),
+            "p50_latency_ms": estimate_latency_percentile(self.histogram, 50),
+            "p95_latency_ms": estimate_latency_percentile(self.histogram, 95),
+            "p99_latency_ms": estimate_latency_percentile(self.histogram, 99),
+        }
+
+
+def summarize_rollups(
+    rows: Iterable[Any],
+    granularity: UsageRollupGranularity,
+    start: datetime,
+    end: datetime,
+) -> UsageSummaryResponse:
+    """
+    Fold rollup rows into totals, per-feature totals and a time series.
+
+    Args:
+        rows: Rollup rows (any model exposing the rollup columns).
+        granularity: Granularity the rows were read at.
+        start: Window start reported in the response.
+        end: Window end reported in the response.
+
+    Returns:
+        The populated ``UsageSummaryResponse``.
+    """
+    totals = _Accumulator()
+    by_feature: dict[FeatureKey, _Accumulator] = {}
+    by_bucket: dict[datetime, _Accumulator] = {}
+
+    for row in rows:
+        totals.add(row)
+        by_feature.setdefault(row.feature_key, _Accumulator()).add(row)
+        by_bucket.setdefault(row.bucket_start, _Accumulator()).add(row)
+
+    features = sorted(
+        by_feature.items(), key=lambda item: (-item[1].request_count, item[0].value)
+    )
+    return UsageSummaryResponse(
+        granularity=granularity,
+        start=start,
+        end=end,
+        totals=UsageStats(**totals.stats()),
+        by_feature=[
+            UsageFeatureSummary(feature_key=key, **acc.stats()) for key, acc in features
+        ],
+        series=[
+            UsageSeriesPoint(bucket_start=bucket, **acc.stats())
+            for bucket, acc in sorted(by_bucket.items())
+        ],
+    )
+
+
+__all__ = [
+    "SUMMARY_DEFAULT_WINDOW",
+    "SUMMARY_MAX_WINDOW",
+    "estimate_latency_percentile",
+    "resolve_summary_window",
+    "summarize_rollups",
+]
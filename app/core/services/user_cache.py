@@ -0,0 +1,280 @@
+"""
+User snapshot cache for request authentication.
+
+Authenticating a request used to load the full ``User`` row in its own
+transaction on every call. Most endpoints only need the user's id and
+account flags, so ``UserCache`` keeps a small ``UserSnapshot`` per user in
+two layers:
+
+- an in-process LRU with a short TTL (``USER_CACHE_LOCAL_TTL_SECONDS``),
+  which absorbs bursts of dashboard calls without a network round trip;
+- Redis (``user_snapshot:{id}``, ``USER_CACHE_TTL_SECONDS``), shared by
+  every worker, used when ``RedisService`` is connected.
+
+Invalidation: code that changes a user's profile, status or deletion flag
+calls ``invalidate_on_commit``, which clears both layers at once and again
+after the transaction commits (see ``commit_hooks``). Other workers' local
+entries expire within the local TTL.
+
+Revocation: ``users.token_version`` is copied into every access token
+(``ver``). Bumping it (sign out everywhere, password change, deletion)
+revokes older tokens; after commit the new version is also written to
+``user_token_version:{id}`` for the lifetime of an access token, so tokens
+that carry signed ``act``/``evf`` claims can be checked without reading
+the user at all.
+"""
+
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any
+from uuid import UUID
+
+import orjson
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import auth_logger, settings
+from app.core.db.crud import user_db
+from app.core.db.models import User
+from app.core.services.commit_hooks import CommitHook, register_commit_hook
+from app.core.services.redis_service import RedisService
+
+_PENDING_KEY = "user_cache_pending"
+
+
+@dataclass(frozen=True)
+class UserSnapshot:
+    """
+    The fields request authorization needs from a ``User``.
+
+    Attributes:
+        id: User ID.
+        email: Email address (for logging).
+        is_active: Whether the account is active.
+        email_verified: Whether the email address is verified.
+        is_deleted: Whether the account is soft deleted.
+        token_version: Access tokens with a lower ``ver`` are revoked.
+    """
+
+    id: UUID
+    email: str
+    is_active: bool
+    email_verified: bool
+    is_deleted: bool = False
+    token_version: int = 0
+
+    @classmethod
+    def from_user(cls, user: User) -> "UserSnapshot":
+        return cls(
+            id=user.id,
+            email=user.email,
+            is_active=user.is_active,
+            email_verified=user.email_verified,
+            is_deleted=user.is_deleted,
+            token_version=user.token_version or 0,
+        )
+
+    def to_json(self) -> bytes:
+        return orjson.dumps({**asdict(self), "id": str(self.id)})
+
+    @classmethod
+    def from_json(cls, raw: str | bytes) -> "UserSnapshot":
+        data = orjson.loads(raw)
+        return cls(**{**data, "id": UUID(data["id"])})
+
+
+def snapshot_key(user_id: UUID) -> str:
+    return f"user_snapshot:{user_id}"
+
+
+def token_version_key(user_id: UUID) -> str:
+    return f"user_token_version:{user_id}"
+
+
+class UserCache:
+    """
+    Two-layer (in-process + Redis) cache of ``UserSnapshot`` by user ID.
+
+    Example:
+        >>> snapshot = await user_cache.get(session, user_id)
+        >>> await user_cache.invalidate_on_commit(session, user_id)
+    """
+
+    def __init__(self, ttl: int, local_ttl: float, local_max_entries: int):
+        self.ttl = ttl
+        self.local_ttl = local_ttl
+        self.local_max_entries = local_max_entries
+        self._local: OrderedDict[UUID, tuple[float, UserSnapshot]] = OrderedDict()
+
+    # ------------------------------------------------------------------
+    # In-process layer
+    # ------------------------------------------------------------------
+
+    def _get_local(self, user_id: UUID) -> UserSnapshot | None:
+        entry = self._local.get(user_id)
+        if entry is None:
+            return None
+        expires_at, snapshot = entry
+        if expires_at <= time.monotonic():
+            self._local.pop(user_id, None)
+            return None
+        self._local.move_to_end(user_id)
+        return snapshot
+
+    def _set_local(self, snapshot: UserSnapshot) -> None:
+        if self.local_ttl <= 0 or self.local_max_entries <= 0:
+            return
+        self._local[snapshot.id] = (time.monotonic() + self.local_ttl, snapshot)
+        self._local.move_to_end(snapshot.id)
+        while len(self._local) > self.local_max_entries:
+            self._local.popitem(last=False)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    async def get(self, session: AsyncSession, user_id: UUID) -> UserSnapshot | None:
+        """
+        Snapshot of a user, loading it on a miss (in its own transaction
+        unless one is already open).
+
+        Args:
+            session: Database session used on a cache miss.
+            user_id: The user ID.
+
+        Returns:
+            The snapshot, or None if no such user exists. Soft-deleted
+            users are returned (and cached) with ``is_deleted=True``.
+        """
+        snapshot = self._get_local(user_id)
+        if snapshot is not None:
+            return snapshot
+
+        if RedisService.is_connected():
+            raw = await RedisService.get(snapshot_key(user_id))
+            if raw is not None:
+                try:
+                    snapshot = UserSnapshot.from_json(raw)
+                except (orjson.JSONDecodeError, KeyError, TypeError, ValueError):
+                    auth_logger.warning(f"Discarding malformed user snapshot {user_id}")
+                else:
+                    self._set_local(snapshot)
+                    return snapshot
+
+        if session.in_transaction():
+            user = await user_db.get_by_id(session=session, id=user_id)
+        else:
+            async with session.begin():
+                user = await user_db.get_by_id(session=session, id=user_id)
+        if user is None:
+            return None
+
+        snapshot = UserSnapshot.from_user(user)
+        self._set_local(snapshot)
+        if RedisService.is_connected():
+            await RedisService.set(
+                snapshot_key(user_id), snapshot.to_json().decode(), ttl=self.ttl
+            )
+        return snapshot
+
+    async def revoked_token_version(self, user_id: UUID) -> int | None:
+        """
+        The token version published by the last revocation, if still live.
+
+        Returns:
+            The version, or None if there was no revocation within an
+            access token's lifetime (or Redis is unavailable).
+        """
+        if not RedisService.is_connected():
+            return None
+        raw = await RedisService.get(token_version_key(user_id))
+        try:
+            return int(raw) if raw is not None else None
+        except ValueError:
+            return None
+
+    # ------------------------------------------------------------------
+    # Invalidation
+    # ------------------------------------------------------------------
+
+    async def invalidate(self, *user_ids: UUID) -> None:
+        """Drop users from both layers now."""
+        for user_id in user_ids:
+            self._local.pop(user_id, None)
+        if RedisService.is_connected():
+            for user_id in user_ids:
+                await RedisService.delete(snapshot_key(user_id))
+
+    async def publish_token_version(
+        self, user_id: UUID, version: int, ttl: int
+    ) -> None:
+        """Record a revocation for the claims-only authentication path."""
+        if RedisService.is_connected():
+            await RedisService.set(token_version_key(user_id), str(version), ttl=ttl)
+
+    def _pending(self, session: AsyncSession | Session) -> dict[str, Any]:
+        return session.info.setdefault(
+            _PENDING_KEY, {"invalidate": set(), "versions": {}}
+        )
+
+    async def invalidate_on_commit(
+        self, session: AsyncSession | Session, user_id: UUID
+    ) -> None:
+        """
+        Invalidate a user's snapshot now and again when ``session`` commits.
+
+        The second delete clears a snapshot that a concurrent request
+        cached from the pre-commit row in between.
+        """
+        self._pending(session)["invalidate"].add(user_id)
+        await self.invalidate(user_id)
+
+    async def publish_token_version_on_commit(
+        self, session: AsyncSession | Session, user_id: UUID, version: int, ttl: int
+    ) -> None:
+        """Invalidate a user's snapshot and publish ``version`` on commit."""
+        self._pending(session)["versions"][user_id] = (version, ttl)
+        await self.invalidate_on_commit(session, user_id)
+
+    async def _flush(self, pending: dict[str, Any]) -> None:
+        try:
+            await self.invalidate(*pending["invalidate"])
+            for user_id, (version, ttl) in pending["versions"].items():
+                await self.publish_token_version(user_id, version, ttl)
+        except Exception as e:
+            auth_logger.error(f"User cache invalidation failed: {e}")
+
+    def clear(self) -> None:
+        """Drop every in-process entry."""
+        self._local.clear()
+
+
+user_cache = UserCache(
+    ttl=settings.USER_CACHE_TTL_SECONDS,
+    local_ttl=settings.USER_CACHE_LOCAL_TTL_SECONDS,
+    local_max_entries=settings.USER_CACHE_LOCAL_MAX_ENTRIES,
+)
+
+
+def _evict_local(pending: dict[str, Any]) -> None:
+    for user_id in pending["invalidate"]:
+        user_cache._local.pop(user_id, None)
+
+
+register_commit_hook(
+    CommitHook(
+        info_key=_PENDING_KEY,
+        flush=lambda pending: user_cache._flush(pending),
+        on_commit=_evict_local,
+    )
+)
+
+
+__all__ = [
+    "UserCache",
+    "UserSnapshot",
+    "snapshot_key",
+    "token_version_key",
+    "user_cache",
+]
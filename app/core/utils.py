@@ -21,12 +21,17 @@ from fastapi import FastAPI
 import jwt
 
 from app.core.config import settings, utils_logger
+from app.core.jwt_keys import get_jwt_keyset
 
 
-def hash_password(password: str | None) -> str:
+def hash_password(password: str | None, rounds: int | None = None) -> str:
     """
     Hash a password using bcrypt with a secure salt.
 
+    This blocks for the whole bcrypt computation; async code should use
+    ``password_hasher`` (``app.core.services.password_hasher``), which runs
+    it in a bounded worker pool.
+
     This function uses bcrypt, which is specifically designed for password hashing
     and includes:
     - Automatic salt generation (random for each hash)
@@ -35,6 +40,7 @@ def hash_password(password: str | None) -> str:
 
     Args:
         password: The plain text password to hash. Cannot be None.
+        rounds: bcrypt cost factor. Defaults to PASSWORD_BCRYPT_ROUNDS.
 
     Returns:
         str: The bcrypt hashed password (60 characters).
@@ -51,7 +57,7 @@ def hash_password(password: str | None) -> str:
         True
 
     Security Notes:
-        - Uses bcrypt's default work factor (currently 12 rounds)
+        - Uses the PASSWORD_BCRYPT_ROUNDS work factor (12 by default)
         - Each call generates a unique hash due to random salt
         - Same password will produce different hashes (by design)
         - Resistant to timing attacks
@@ -71,8 +77,7 @@ def hash_password(password: str | None) -> str:
             )
             password_bytes = password_bytes[:72]
 
-        # bcrypt.gensalt() uses a default of 12 rounds which is secure and performant
-        salt = bcrypt.gensalt()
+        salt = bcrypt.gensalt(rounds=rounds or settings.PASSWORD_BCRYPT_ROUNDS)
         hashed = bcrypt.hashpw(password_bytes, salt)
 
         utils_logger.info("Password hashed successfully")
@@ -89,7 +94,8 @@ def verify_password(password: str | None, hashed_password: str | None) -> bool:
     Verify a password against a bcrypt hash.
 
     This function safely compares a plain text password with a bcrypt hash
-    using constant-time comparison to prevent timing attacks.
+    using constant-time comparison to prevent timing attacks. Like
+    ``hash_password`` it blocks; async code should use ``password_hasher``.
 
     Args:
         password: The plain text password to verify. Can be None.
@@ -164,9 +170,9 @@ def create_jwt_token(
     """
     Create a JWT token with the given data and expiration time.
 
-    This function encodes a dictionary into a JWT (JSON Web Token) using the
-    HS256 algorithm with the application's secret key. The token includes an
-    expiration claim (exp) for security.
+    This function encodes a dictionary into a JWT (JSON Web Token) signed
+    with the active key of the JWT key set (see ``app.core.jwt_keys``). The
+    token includes an expiration claim (exp) for security.
 
     Args:
         data: Dictionary containing the data to encode in the token.
@@ -190,8 +196,8 @@ def create_jwt_token(
         >>> token = create_jwt_token({"user_id": "456"}, expires_delta=timedelta(hours=1))
 
     Security Notes:
-        - Uses HS256 algorithm (HMAC with SHA-256)
-        - Signs with JWT_SECRET_KEY from settings
+        - Uses JWT_ALGORITHM: HS256 signs with JWT_SECRET_KEY; EdDSA/ES256
+          sign with the JWT_ACTIVE_KID private key and set the ``kid`` header
         - Always includes expiration claim (exp) for security
         - Default expiration: 15 minutes
         - Token can be decoded with decode_jwt_token()
@@ -215,8 +221,10 @@ def create_jwt_token(
         to_encode["jti"] = str(uuid.uuid4())
 
         # Encode the JWT token
+        keyset = get_jwt_keyset()
+        key, headers = keyset.signing_key()
         encoded_jwt = jwt.encode(
-            to_encode, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM
+            to_encode, key, algorithm=keyset.algorithm, headers=headers
         )
 
         utils_logger.info(
@@ -255,7 +263,9 @@ def decode_jwt_token(token: str | None) -> dict[str, Any] | None:
         None
 
     Security Notes:
-        - Validates signature using JWT_SECRET_KEY
+        - Validates the signature with the key named by the token's ``kid``
+          (keys are parsed once per process); the token's ``alg`` must be
+          JWT_ALGORITHM
         - Checks expiration automatically
         - Returns None for any validation failure (safe default)
         - Constant-time signature verification
@@ -269,10 +279,16 @@ def decode_jwt_token(token: str | None) -> dict[str, Any] | None:
         return None
 
     try:
+        keyset = get_jwt_keyset()
+        key = keyset.verification_key(jwt.get_unverified_header(token))
+        if key is None:
+            utils_logger.warning(
+                "JWT token decoding failed: unknown signing key or algorithm"
+            )
+            return None
+
         # Decode and validate the JWT token
-        payload = jwt.decode(
-            token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM]
-        )
+        payload = jwt.decode(token, key, algorithms=[keyset.algorithm])
 
         utils_logger.info("JWT token decoded and validated successfully")
         return payload
@@ -1,4 +1,9 @@
-from app.infrastructure.messaging.publisher import publish_event
+from app.infrastructure.messaging.outbox_relay import register_event_publisher
+from app.infrastructure.messaging.publisher import (
+    close_publisher,
+    publish_event,
+    publish_many,
+)
 
 
 def get_start_consumers():
@@ -16,4 +21,10 @@ async def start_consumers(keep_alive: bool):
     return await _start_consumers(keep_alive)
 
 
-__all__ = ["publish_event", "start_consumers"]
+__all__ = [
+    "close_publisher",
+    "publish_event",
+    "publish_many",
+    "register_event_publisher",
+    "start_consumers",
+]
@@ -0,0 +1,175 @@
+"""
+Batching message consumer.
+
+Queues configured with a ``batch_handler`` are consumed by a
+``BatchConsumer`` instead of ``process_message``: deliveries are
+accumulated until ``batch_size`` messages have arrived or ``max_wait_ms``
+has passed since the first one, then handed to the batch handler together
+(which applies them in one database transaction). Messages are acked only
+after the batch handler returns, i.e. after the transaction committed.
+
+If the batch handler raises, every message of the batch is re-processed on
+its own through ``process_message`` with the queue's single-message
+handler, so one poison message is retried or dead-lettered by itself while
+the rest of the batch still commits.
+
+Bodies are decoded like ``process_message`` does, so with a
+``payload_model`` the batch handler receives validated models.
+
+A committed batch records one batch-handler run time and an ``acked``
+outcome (with time in queue) per message in ``messaging_metrics``.
+"""
+
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Awaitable, Callable
+
+import aio_pika
+from pydantic import BaseModel
+
+from app.core.config import rabbitmq_logger
+from app.core.services.messaging_metrics import messaging_metrics
+from app.infrastructure.messaging.codec import MessageDecodeError, decode_event
+from app.infrastructure.messaging.consumer import handler_name, process_message
+from app.infrastructure.messaging.publisher import PUBLISHED_AT_HEADER
+
+
+class MessageBatcher(ABC):
+    """
+    Buffers deliveries and hands them to ``_process`` in batches.
+
+    A batch is flushed when ``batch_size`` messages are buffered or
+    ``max_wait_ms`` after the first message of a partial batch arrived.
+    Subclasses implement ``_process`` and are responsible for acking.
+    """
+
+    def __init__(self, batch_size: int, max_wait_ms: int):
+        self.batch_size = batch_size
+        self.max_wait_ms = max_wait_ms
+        self._pending: list[aio_pika.abc.AbstractIncomingMessage] = []
+        self._timer: asyncio.Task | None = None
+        self._lock = asyncio.Lock()
+
+    async def __call__(self, message: aio_pika.abc.AbstractIncomingMessage) -> None:
+        """Consumer callback: buffer the delivery and flush when full."""
+        self._pending.append(message)
+        if len(self._pending) >= self.batch_size:
+            self._cancel_timer()
+            await self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.create_task(self._flush_later())
+
+    def _cancel_timer(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.max_wait_ms / 1000)
+        # Detach before flushing so a size-triggered flush cannot cancel us
+        # halfway through a batch
+        self._timer = None
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Process up to ``batch_size`` buffered messages."""
+        async with self._lock:
+            batch = self._pending[: self.batch_size]
+            self._pending = self._pending[self.batch_size :]
+            if self._pending and self._timer is None:
+                self._timer = asyncio.create_task(self._flush_later())
+            if batch:
+                await self._process(batch)
+
+    async def drain(self) -> None:
+        """Flush everything buffered, without waiting for the timer."""
+        self._cancel_timer()
+        while self._pending:
+            await self.flush()
+        self._cancel_timer()
+
+    @abstractmethod
+    async def _process(self, batch: list[aio_pika.abc.AbstractIncomingMessage]) -> None:
+        """Handle one batch of deliveries, including acking them."""
+
+
+class BatchConsumer(MessageBatcher):
+    """Accumulates deliveries from one queue and processes them in batches."""
+
+    def __init__(
+        self,
+        batch_handler: Callable[[list[Any]], Awaitable[Any]],
+        handler: Callable[[Any], Any],
+        channel: aio_pika.Channel,
+        batch_size: int,
+        max_wait_ms: int,
+        retry_queue: str | None = None,
+        retry_queues: list[dict[str, Any]] | None = None,
+        max_retries: int | None = None,
+        dead_letter_queue: str | None = None,
+        payload_model: type[BaseModel] | None = None,
+        queue_name: str | None = None,
+    ):
+        super().__init__(batch_size, max_wait_ms)
+        self.batch_handler = batch_handler
+        self.handler = handler
+        self.channel = channel
+        self.retry_queue = retry_queue
+        self.retry_queues = retry_queues
+        self.max_retries = max_retries
+        self.dead_letter_queue = dead_letter_queue
+        self.payload_model = payload_model
+        self.queue_name = queue_name
+
+    async def _process(self, batch: list[aio_pika.abc.AbstractIncomingMessage]) -> None:
+        messages: list[aio_pika.abc.AbstractIncomingMessage] = []
+        events: list[Any] = []
+        for message in batch:
+            try:
+                events.append(decode_event(message, self.payload_model))
+                messages.append(message)
+            except MessageDecodeError:
+                # Let the single-message path retry/dead-letter it
+                await self._process_one(message)
+
+        if not messages:
+            return
+
+        queue = self.queue_name or messages[0].routing_key or "unknown"
+        started = time.perf_counter()
+        try:
+            await self.batch_handler(events)
+        except Exception as e:
+            rabbitmq_logger.error(
+                f"Batch of {len(messages)} failed ({e}); "
+                f"re-processing messages individually"
+            )
+            for message in messages:
+                await self._process_one(message)
+            return
+
+        messaging_metrics.observe_handler(
+            queue, handler_name(self.batch_handler), time.perf_counter() - started
+        )
+        for message in messages:
+            await message.ack()
+            messaging_metrics.record_outcome(
+                queue, "acked", (message.headers or {}).get(PUBLISHED_AT_HEADER)
+            )
+
+    async def _process_one(self, message: aio_pika.abc.AbstractIncomingMessage) -> None:
+        await process_message(
+            message,  # type: ignore[arg-type]
+            handler=self.handler,
+            channel=self.channel,
+            retry_queue=self.retry_queue,
+            retry_queues=self.retry_queues,
+            max_retries=self.max_retries,
+            dead_letter_queue=self.dead_letter_queue,
+            payload_model=self.payload_model,
+            queue_name=self.queue_name,
+        )
+
+
+__all__ = ["BatchConsumer", "MessageBatcher"]
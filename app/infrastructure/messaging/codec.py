@@ -0,0 +1,228 @@
+"""
+Message body codecs, selected by the AMQP ``content_type`` property.
+
+Publishers encode with the codec named by ``RABBITMQ_MESSAGE_CONTENT_TYPE``
+and stamp its content type on the message; consumers pick the decoder
+from each message's own ``content_type``, so producers can switch formats
+without a coordinated deploy. Messages without a content type (older or
+external producers) are read as JSON.
+
+- ``application/json`` - orjson (default).
+- ``application/msgpack`` - msgpack, smaller and faster for large
+  payloads such as career ``result_data``. Optional: available only when
+  the ``msgpack`` package is installed.
+
+Queues that declare a ``payload_model`` get the model itself:
+``decode_event`` validates JSON bodies with ``model_validate_json`` on the
+raw bytes, skipping the intermediate dict.
+"""
+
+from abc import ABC, abstractmethod
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from typing import Any, TypeVar
+from uuid import UUID
+
+import orjson
+from aio_pika.abc import AbstractMessage
+from pydantic import BaseModel, ValidationError
+
+from app.infrastructure.messaging.errors import PermanentMessageError
+
+try:
+    import msgpack  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - exercised only without msgpack
+    msgpack = None
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+JSON_CONTENT_TYPE = "application/json"
+MSGPACK_CONTENT_TYPE = "application/msgpack"
+
+
+class MessageDecodeError(PermanentMessageError):
+    """Raised when a message body cannot be decoded."""
+
+
+class UnsupportedContentTypeError(MessageDecodeError):
+    """Raised for a content type without a registered codec."""
+
+
+def _to_serialisable(obj: Any) -> Any:
+    """Fallback for values the encoders do not handle natively."""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    if isinstance(obj, Decimal):
+        return str(obj)
+    raise TypeError(f"Type is not serialisable: {type(obj).__name__}")
+
+
+class MessageCodec(ABC):
+    """Encodes payloads to and decodes them from message bodies."""
+
+    content_type: str
+
+    @abstractmethod
+    def encode(self, payload: Any) -> bytes:
+        """Serialise a dict (or Pydantic model) to a message body."""
+
+    @abstractmethod
+    def decode(self, body: bytes) -> Any:
+        """
+        Deserialise a message body.
+
+        Raises:
+            MessageDecodeError: If the body is not valid for this codec.
+        """
+
+    def decode_model(self, body: bytes, model: type[ModelT]) -> ModelT:
+        """
+        Deserialise and validate a message body as ``model``.
+
+        Raises:
+            MessageDecodeError: If the body is not valid for this codec.
+            ValidationError: If the payload does not match ``model``.
+        """
+        return model.model_validate(self.decode(body))
+
+
+class JSONCodec(MessageCodec):
+    content_type = JSON_CONTENT_TYPE
+
+    def encode(self, payload: Any) -> bytes:
+        return orjson.dumps(payload, default=_to_serialisable)
+
+    def decode(self, body: bytes) -> Any:
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError as e:
+            raise MessageDecodeError(f"Invalid JSON message body: {e}") from e
+
+    def decode_model(self, body: bytes, model: type[ModelT]) -> ModelT:
+        # Parsed and validated by pydantic-core in one pass, no dict round trip
+        return model.model_validate_json(body)
+
+
+def _msgpack_default(obj: Any) -> Any:
+    if isinstance(obj, (UUID, Decimal)):
+        return str(obj)
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, Enum):
+        return obj.value
+    return _to_serialisable(obj)
+
+
+class MsgPackCodec(MessageCodec):
+    content_type = MSGPACK_CONTENT_TYPE
+
+    def __init__(self):
+        if msgpack is None:
+            raise RuntimeError("The msgpack codec requires the 'msgpack' package")
+
+    def encode(self, payload: Any) -> bytes:
+        return msgpack.packb(payload, default=_msgpack_default)  # type: ignore[union-attr]
+
+    def decode(self, body: bytes) -> Any:
+        try:
+            return msgpack.unpackb(body, raw=False)  # type: ignore[union-attr]
+        except (ValueError, msgpack.UnpackException) as e:  # type: ignore[union-attr]
+            raise MessageDecodeError(f"Invalid msgpack message body: {e}") from e
+
+
+_CODECS: dict[str, MessageCodec] = {JSON_CONTENT_TYPE: JSONCodec()}
+if msgpack is not None:
+    _CODECS[MSGPACK_CONTENT_TYPE] = MsgPackCodec()
+
+
+def register_codec(codec: MessageCodec) -> None:
+    """Register (or replace) the codec for ``codec.content_type``."""
+    _CODECS[codec.content_type] = codec
+
+
+def get_codec(content_type: str | None) -> MessageCodec:
+    """
+    Look up the codec for a content type.
+
+    Parameters such as ``; charset=utf-8`` are ignored, and a missing
+    content type means JSON.
+
+    Raises:
+        UnsupportedContentTypeError: If no codec is registered for it.
+    """
+    if not content_type:
+        return _CODECS[JSON_CONTENT_TYPE]
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    try:
+        return _CODECS[media_type]
+    except KeyError:
+        raise UnsupportedContentTypeError(
+            f"No codec for content type {content_type!r}"
+        ) from None
+
+
+def content_type_of(message: AbstractMessage) -> str | None:
+    """A message's ``content_type`` property, if it is set."""
+    content_type = getattr(message, "content_type", None)
+    return content_type if isinstance(content_type, str) else None
+
+
+def codec_for(message: AbstractMessage) -> MessageCodec:
+    """The codec for a message's ``content_type`` property."""
+    return get_codec(content_type_of(message))
+
+
+def decode_event(
+    message: AbstractMessage, payload_model: type[BaseModel] | None = None
+) -> Any:
+    """
+    Decode a message body for its handler.
+
+    With a ``payload_model`` the validated model is returned. A payload
+    that fails validation is returned as the decoded dict instead, so the
+    handler's invalid-payload path (alert, no retry) still sees it.
+
+    Raises:
+        MessageDecodeError: If the body cannot be decoded at all.
+    """
+    codec = codec_for(message)
+    if payload_model is not None:
+        try:
+            return codec.decode_model(message.body, payload_model)
+        except ValidationError:
+            pass
+    return codec.decode(message.body)
+
+
+def body_text(message: AbstractMessage) -> str:
+    """
+    A readable rendering of a message body, for alerts and the DLQ table.
+
+    Non-JSON bodies are re-rendered as JSON; undecodable ones are returned
+    as (lossy) UTF-8.
+    """
+    try:
+        codec = codec_for(message)
+        if isinstance(codec, JSONCodec):
+            return message.body.decode("utf-8")
+        return orjson.dumps(codec.decode(message.body), default=str).decode()
+    except (MessageDecodeError, UnicodeDecodeError):
+        return message.body.decode("utf-8", errors="replace")
+
+
+__all__ = [
+    "JSON_CONTENT_TYPE",
+    "MSGPACK_CONTENT_TYPE",
+    "JSONCodec",
+    "MessageCodec",
+    "MessageDecodeError",
+    "MsgPackCodec",
+    "UnsupportedContentTypeError",
+    "body_text",
+    "codec_for",
+    "content_type_of",
+    "decode_event",
+    "get_codec",
+    "register_codec",
+]
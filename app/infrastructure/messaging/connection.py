@@ -1,6 +1,7 @@
 import aio_pika
 
 from app.core.config import settings
+from app.infrastructure.messaging.local_broker import LocalConnection
 
 _connection: aio_pika.RobustConnection | None = None
 
@@ -13,10 +14,16 @@ async def get_connection() -> aio_pika.RobustConnection:
     using the URL specified in the application settings. Otherwise, the existing connection
     is returned.
 
+    With ``MESSAGING_BROKER=local`` the connection is a ``LocalConnection`` to an
+    in-process broker instead (see ``local_broker``), which offers the same API.
+
     Returns:
         aio_pika.RobustConnection: An active robust connection to RabbitMQ.
     """
     global _connection
     if _connection is None or _connection.is_closed:
-        _connection = await aio_pika.connect_robust(settings.RABBITMQ_URL)  # type: ignore[assignment]
+        if settings.MESSAGING_BROKER == "local":
+            _connection = LocalConnection(settings.LOCAL_BROKER_MAX_QUEUE_SIZE)  # type: ignore[assignment]
+        else:
+            _connection = await aio_pika.connect_robust(settings.RABBITMQ_URL)  # type: ignore[assignment]
     return _connection  # type: ignore[return-value]
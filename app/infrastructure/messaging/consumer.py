@@ -1,55 +1,85 @@
-import json
+import random
+import time
 from typing import Callable, Any
 
 import aio_pika
+from pydantic import BaseModel
 
 from app.core.config import rabbitmq_logger
 from app.core.services.email_manager import EmailManagerService
+from app.core.services.messaging_metrics import messaging_metrics
+from app.infrastructure.messaging.codec import body_text, content_type_of, decode_event
+from app.infrastructure.messaging.errors import is_permanent_failure
+from app.infrastructure.messaging.publisher import PUBLISHED_AT_HEADER
+
+
+def handler_name(handler: Callable[..., Any]) -> str:
+    """Metrics label for a handler: its qualified name, or its class name."""
+    return getattr(handler, "__qualname__", None) or type(handler).__name__
 
 
 async def process_message(
     message: aio_pika.IncomingMessage,
-    handler: Callable[[dict[str, Any]], Any],
+    handler: Callable[[Any], Any],
     channel: aio_pika.Channel,
     retry_queue: str | None = None,
     retry_queues: list[dict[str, Any]] | None = None,
     max_retries: int | None = None,
     dead_letter_queue: str | None = None,
+    payload_model: type[BaseModel] | None = None,
+    queue_name: str | None = None,
 ) -> None:
     """
     Processes an incoming RabbitMQ message with a given handler, supporting retry and dead-letter queues.
     Args:
         message (aio_pika.IncomingMessage): The incoming message to process.
-        handler (Callable[[Dict[str, Any]], Any]): The async function to handle the message payload.
+        handler (Callable[[Any], Any]): The async function to handle the message payload (a dict, or a ``payload_model`` instance).
         channel (aio_pika.Channel): The channel to use for publishing messages.
         retry_queue (str, optional): The name of the queue to use for retrying failed messages. Defaults to None.
-        retry_queues (list[Dict[str, Any]], optional): A list of retry queue configurations for multiple retries. Each dict should have 'name' and 'ttl' keys. Defaults to None.
+        retry_queues (list[Dict[str, Any]], optional): A list of retry queue configurations for multiple retries. Each dict should have 'name' and 'ttl' keys, and may list jitter queues for the same tier under 'spread' (one of the tier's queues is picked at random). Defaults to None.
         max_retries (int, optional): The maximum number of retry attempts for single retry queue. Defaults to None.
         dead_letter_queue (str, optional): The name of the dead-letter queue for messages that exceed retry attempts. Defaults to None.
+        payload_model (type[BaseModel], optional): Model the payload is validated into before it reaches the handler. Payloads that fail validation are passed as dicts so the handler can report them. Defaults to None (handler receives the decoded dict).
+        queue_name (str, optional): Queue label for metrics. Defaults to the message's routing key.
     Raises:
         None. All exceptions are caught and handled internally.
     Behavior:
-        - Decodes the message body and passes it to the handler.
-        - If the handler raises an exception, increments the retry attempt count.
+        - Decodes the message body with the codec for its content type (see ``codec``) and passes it to the handler.
+        - If the handler raises an exception, classifies it as transient or permanent (see ``errors.is_permanent_failure``).
+        - Permanent failures skip the retry queues and go straight to the dead-letter queue.
+        - For transient failures, increments the retry attempt count.
         - Retries the message by publishing it to the retry queue, if the maximum number of attempts has not been reached.
         - If the maximum number of attempts is reached or no retry queue is specified, publishes the message to the dead-letter queue (if provided).
         - Logs errors, retries, and dead-lettering actions.
         - Rejects the message without requeuing after handling.
+        - Records the handler's run time and the message's outcome (and, when acked, its time in queue) in ``messaging_metrics``.
     """
+    queue = queue_name or message.routing_key or "unknown"
+    started = time.perf_counter()
     async with message.process(ignore_processed=True):
         try:
-            event = json.loads(message.body.decode())
+            event = decode_event(message, payload_model)
             await handler(event)
         except Exception as e:
+            messaging_metrics.observe_handler(
+                queue, handler_name(handler), time.perf_counter() - started
+            )
             rabbitmq_logger.error(f"Error in handler: {e}")
             headers = dict(message.headers or {})
             attempt = int(headers.get("x-retry-attempt", 0))  # type: ignore[arg-type]
             next_queue: str | None = None
+            permanent = is_permanent_failure(e)
 
+            if permanent:
+                rabbitmq_logger.warning(
+                    f"Permanent failure ({type(e).__name__}), skipping retries"
+                )
             # Multiple retry queues logic
-            if retry_queues:
+            elif retry_queues:
                 if attempt < len(retry_queues):
-                    next_queue = retry_queues[attempt]["name"]
+                    tier = retry_queues[attempt]
+                    # Spread retries across the tier's queues (different TTLs)
+                    next_queue = random.choice([tier, *tier.get("spread", [])])["name"]
                     rabbitmq_logger.info(f"Retrying message via {next_queue}")
             # Single retry queue logic
             elif retry_queue:
@@ -64,26 +94,34 @@ async def process_message(
                         body=message.body,
                         delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
                         headers=headers,
+                        content_type=content_type_of(message),
                     ),
                     routing_key=next_queue,
                 )
-                print(f"Message requeued to {next_queue}")
+                rabbitmq_logger.info(f"Message requeued to {next_queue}")
+                messaging_metrics.record_outcome(queue, "retried")
 
             # Dead-letter logic
             elif dead_letter_queue:
                 headers["x-error-message"] = str(e)
+                headers["x-failure-class"] = "permanent" if permanent else "transient"
                 # Derive the original main queue from the DLQ name
                 if dead_letter_queue.endswith("_dead"):
                     headers["x-original-queue"] = dead_letter_queue[: -len("_dead")]
 
                 await channel.default_exchange.publish(
-                    aio_pika.Message(body=message.body, headers=headers),
+                    aio_pika.Message(
+                        body=message.body,
+                        headers=headers,
+                        content_type=content_type_of(message),
+                    ),
                     routing_key=dead_letter_queue,
                 )
                 rabbitmq_logger.warning(f"Message dead-lettered to {dead_letter_queue}")
+                messaging_metrics.record_outcome(queue, "dead_lettered")
 
                 try:
-                    message_body = message.body.decode()
+                    message_body = body_text(message)
                     await EmailManagerService.send_dlq_alert(
                         queue_name=dead_letter_queue,
                         message_body=message_body,
@@ -93,6 +131,15 @@ async def process_message(
                     rabbitmq_logger.error(
                         f"Failed to send DLQ alert for {dead_letter_queue}: {alert_error}"
                     )
+            else:
+                messaging_metrics.record_outcome(queue, "dropped")
 
             # Reject the message without requeuing
             await message.reject(requeue=False)
+        else:
+            messaging_metrics.observe_handler(
+                queue, handler_name(handler), time.perf_counter() - started
+            )
+            messaging_metrics.record_outcome(
+                queue, "acked", (message.headers or {}).get(PUBLISHED_AT_HEADER)
+            )
@@ -0,0 +1,82 @@
+"""
+Failure classification for message handlers.
+
+A handler failure is either *transient* (the same message may succeed
+later: database or broker blips, upstream 5xx, rate limits) or
+*permanent* (retrying cannot help: malformed payloads, constraint
+violations, client errors). ``process_message`` retries transient
+failures through the backoff tiers and sends permanent ones straight to
+the dead-letter queue.
+
+Handlers can be explicit by raising ``PermanentMessageError`` or
+``TransientMessageError``; anything not recognised as permanent is
+treated as transient.
+"""
+
+import json
+
+from pydantic import ValidationError
+from sqlalchemy.exc import DataError, IntegrityError
+
+from app.core.exceptions.types import AppException
+
+
+class PermanentMessageError(Exception):
+    """Raised by a handler when the message can never be processed."""
+
+
+class TransientMessageError(Exception):
+    """Raised by a handler when the message should be retried."""
+
+
+# Client errors that are still worth retrying (timeout, too early, too many)
+_RETRYABLE_STATUS_CODES = frozenset({408, 425, 429})
+
+_PERMANENT_TYPES: tuple[type[BaseException], ...] = (
+    json.JSONDecodeError,
+    UnicodeDecodeError,
+    ValidationError,
+    KeyError,
+    TypeError,
+    IntegrityError,
+    DataError,
+)
+
+
+def is_permanent_failure(error: BaseException) -> bool:
+    """
+    Decide whether a handler failure should skip the retry tiers.
+
+    The exception and its ``__cause__`` chain are inspected, so a
+    ``DatabaseException`` raised from an ``IntegrityError`` is permanent
+    while one raised from a dropped connection is transient.
+
+    Args:
+        error: The exception raised by the handler.
+
+    Returns:
+        True for permanent failures, False for transient ones.
+    """
+    current: BaseException | None = error
+    seen: set[int] = set()
+    while current is not None and id(current) not in seen:
+        seen.add(id(current))
+        if isinstance(current, TransientMessageError):
+            return False
+        if isinstance(current, (PermanentMessageError, *_PERMANENT_TYPES)):
+            return True
+        if (
+            isinstance(current, AppException)
+            and 400 <= current.status_code < 500
+            and current.status_code not in _RETRYABLE_STATUS_CODES
+        ):
+            return True
+        current = current.__cause__
+    return False
+
+
+__all__ = [
+    "PermanentMessageError",
+    "TransientMessageError",
+    "is_permanent_failure",
+]
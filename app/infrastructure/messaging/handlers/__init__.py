@@ -5,6 +5,9 @@ Message handlers for the messaging infrastructure.
 - stripe: Handles Stripe webhook events (checkout, subscription changes, etc.)
 - usage_handler: Handles API usage commit messages
 - career_usage_handler: Handles career usage commit messages
+- session_audit_handler: Records refresh session changes in refresh_tokens
+- otp_audit_handler: Records issued and used OTPs in otp_tokens
+- provisioning_handler: Creates a new user's workspace and subscriptions
 """
 
 from app.infrastructure.messaging.handlers.email_handler import (
@@ -20,6 +23,13 @@ from app.infrastructure.messaging.handlers.stripe import (
 from app.infrastructure.messaging.handlers.career_usage_handler import (
     handle_career_usage_commit,
 )
+from app.infrastructure.messaging.handlers.otp_audit_handler import handle_otp_audit
+from app.infrastructure.messaging.handlers.provisioning_handler import (
+    handle_user_provisioning,
+)
+from app.infrastructure.messaging.handlers.session_audit_handler import (
+    handle_refresh_session_audit,
+)
 
 __all__ = [
     "handle_otp_email",
@@ -29,4 +39,7 @@ __all__ = [
     "handle_stripe_subscription_deleted",
     "handle_stripe_payment_failed",
     "handle_career_usage_commit",
+    "handle_refresh_session_audit",
+    "handle_otp_audit",
+    "handle_user_provisioning",
 ]
@@ -5,28 +5,86 @@ The payload schema matches UsageCommitRequest from the career internal schemas.
 """
 
 from typing import Any
+from uuid import UUID
 
 from pydantic import ValidationError
 
 from app.core.config import usage_logger
 from app.core.db import AsyncSessionLocal
+from app.core.db.crud import UsageLogCommit
 from app.apps.cubex_career.schemas.internal import UsageCommitRequest
 from app.apps.cubex_career.services.quota import career_quota_service
 from app.core.services.email_manager import EmailManagerService
 
 
-async def handle_career_usage_commit(event: dict[str, Any]) -> None:
+def _commit_details(
+    request: UsageCommitRequest,
+) -> tuple[dict[str, Any] | None, dict[str, Any] | None]:
+    """Convert a commit request's metrics/failure into service dicts."""
+    metrics = None
+    if request.metrics:
+        metrics = {
+            "model_used": request.metrics.model_used,
+            "input_tokens": request.metrics.input_tokens,
+            "output_tokens": request.metrics.output_tokens,
+            "latency_ms": request.metrics.latency_ms,
+        }
+
+    failure = None
+    if request.failure:
+        failure = {
+            "failure_type": request.failure.failure_type,
+            "reason": request.failure.reason,
+        }
+    return metrics, failure
+
+
+def _usage_id(event: UsageCommitRequest | dict[str, Any]) -> Any:
+    if isinstance(event, UsageCommitRequest):
+        return event.usage_id
+    return event.get("usage_id", "unknown")
+
+
+async def _validate_event(
+    event: UsageCommitRequest | dict[str, Any],
+) -> UsageCommitRequest | None:
+    """
+    Return the event as a validated request, or alert and return None.
+
+    The consumer already validates payloads into ``UsageCommitRequest``;
+    dicts only arrive for payloads that failed that validation (or from
+    direct callers), and are validated here so the failure is reported.
+    """
+    if isinstance(event, UsageCommitRequest):
+        return event
+    try:
+        return UsageCommitRequest.model_validate(event)
+    except ValidationError as e:
+        # Invalid payload - send alert and return success (no retry)
+        usage_logger.error(f"Invalid career usage commit payload: {e.errors()}")
+        await EmailManagerService.send_invalid_payload_alert(
+            queue_name="career_usage_commits",
+            message_body=event,
+            validation_errors=[dict(err) for err in e.errors()],
+        )
+        return None
+
+
+async def handle_career_usage_commit(
+    event: UsageCommitRequest | dict[str, Any],
+) -> None:
     """
     Handle a career usage commit message from the queue.
 
-    Validates the payload against the career UsageCommitRequest schema
+    Validates a dict payload against the career UsageCommitRequest schema
     and calls career_quota_service.commit_usage() to process the commit.
 
     On validation error: sends alert email and returns success (no retry).
     On processing error: raises exception to trigger retry.
 
     Args:
-        event: Dictionary payload matching career UsageCommitRequest schema.
+        event: The validated career UsageCommitRequest, or a dictionary
+            payload matching its schema.
             Required fields:
             - user_id: str (UUID) - The user who made the original request
             - usage_id: str (UUID) - The usage log ID to commit
@@ -38,37 +96,13 @@ async def handle_career_usage_commit(event: dict[str, Any]) -> None:
     Raises:
         Exception: On processing errors (triggers retry).
     """
-    usage_logger.info(
-        f"Processing career usage commit message: {event.get('usage_id', 'unknown')}"
-    )
+    usage_logger.info(f"Processing career usage commit message: {_usage_id(event)}")
 
-    try:
-        request = UsageCommitRequest(**event)
-    except ValidationError as e:
-        # Invalid payload - send alert and return success (no retry)
-        usage_logger.error(f"Invalid career usage commit payload: {e.errors()}")
-        await EmailManagerService.send_invalid_payload_alert(
-            queue_name="career_usage_commits",
-            message_body=event,
-            validation_errors=[dict(err) for err in e.errors()],
-        )
+    request = await _validate_event(event)
+    if request is None:
         return  # Don't retry - payload will never be valid
 
-    metrics = None
-    if request.metrics:
-        metrics = {
-            "model_used": request.metrics.model_used,
-            "input_tokens": request.metrics.input_tokens,
-            "output_tokens": request.metrics.output_tokens,
-            "latency_ms": request.metrics.latency_ms,
-        }
-
-    failure = None
-    if request.failure:
-        failure = {
-            "failure_type": request.failure.failure_type,
-            "reason": request.failure.reason,
-        }
+    metrics, failure = _commit_details(request)
 
     # Process the commit
     try:
@@ -105,4 +139,67 @@ async def handle_career_usage_commit(event: dict[str, Any]) -> None:
         raise  # Re-raise to trigger retry
 
 
-__all__ = ["handle_career_usage_commit"]
+def _to_usage_log_commit(request: UsageCommitRequest) -> UsageLogCommit:
+    metrics, failure = _commit_details(request)
+    return UsageLogCommit(
+        usage_log_id=request.usage_id,
+        success=request.success,
+        metrics=metrics,
+        failure=failure,
+    )
+
+
+async def handle_career_usage_commit_batch(
+    events: list[UsageCommitRequest | dict[str, Any]],
+) -> None:
+    """
+    Handle a batch of career usage commit messages in one transaction.
+
+    Invalid payloads are alerted on and skipped, exactly like the
+    single-message handler. The remaining commits are applied together by
+    ``career_quota_service.commit_usage_batch()`` and committed once; the
+    consumer acks the messages only after this returns.
+
+    Args:
+        events: Validated requests (or, for payloads that failed
+            validation, decoded dicts), in delivery order.
+
+    Raises:
+        Exception: On processing errors. The consumer then re-processes the
+            batch's messages one at a time so a poison message is retried
+            or dead-lettered on its own.
+    """
+    commits: list[tuple[UUID, UsageLogCommit, dict | None]] = []
+    for event in events:
+        request = await _validate_event(event)
+        if request is None:
+            continue
+        commits.append(
+            (
+                request.user_id,
+                _to_usage_log_commit(request),
+                request.result_data,
+            )
+        )
+
+    if not commits:
+        return
+
+    async with AsyncSessionLocal.begin() as session:
+        outcomes = await career_quota_service.commit_usage_batch(session, commits)
+
+    rejected = 0
+    for (_, commit, _), (success, message) in zip(commits, outcomes):
+        if not success:
+            rejected += 1
+            usage_logger.warning(
+                f"Career usage commit rejected: usage_id={commit.usage_log_id}, "
+                f"message={message}"
+            )
+    usage_logger.info(
+        f"Career usage commit batch processed: {len(commits)} commits, "
+        f"{rejected} rejected"
+    )
+
+
+__all__ = ["handle_career_usage_commit", "handle_career_usage_commit_batch"]
@@ -4,6 +4,12 @@ Dead-letter queue message handler.
 Consumes messages from ``*_dead`` queues and persists them as
 :class:`DLQMessage` rows.  Once written to the database the message
 is ACK'd, draining the RabbitMQ DLQ.
+
+``DLQBatchConsumer`` is what the consumers register: it buffers
+deliveries and writes each batch with one multi-row ``COPY``, so a mass
+failure (thousands of messages dead-lettered during an outage) drains in
+a handful of statements. ``handle_dlq_message`` persists a single message
+and is the fallback when a batch write fails.
 """
 
 from typing import Any
@@ -12,8 +18,35 @@ import aio_pika
 
 from app.core.config import rabbitmq_logger
 from app.core.db import AsyncSessionLocal
+from app.core.db.crud.dlq_message import dlq_message_db
 from app.core.db.models.dlq_message import DLQMessage
 from app.core.enums import DLQMessageStatus
+from app.infrastructure.messaging.batch_consumer import MessageBatcher
+from app.infrastructure.messaging.codec import body_text
+
+
+def _dlq_row(message: aio_pika.abc.AbstractIncomingMessage, queue_name: str) -> dict:
+    """Column values of the :class:`DLQMessage` row for a dead-letter message."""
+    headers: dict[str, Any] = dict(message.headers or {})
+
+    attempt_count = int(headers.get("x-retry-attempt", 0))  # type: ignore[arg-type]
+    error_message = headers.get("x-error-message")
+    if isinstance(error_message, bytes):
+        error_message = error_message.decode("utf-8", errors="replace")
+    elif error_message is not None and not isinstance(error_message, str):
+        error_message = str(error_message)
+
+    return {
+        "queue_name": queue_name,
+        # Stored as JSON text whatever the wire format, so it can be
+        # inspected and republished from the admin
+        "message_body": body_text(message),
+        "error_message": error_message,
+        # Sanitise header values so they are JSON-serialisable
+        "headers": _sanitise_headers(headers),
+        "attempt_count": attempt_count,
+        "status": DLQMessageStatus.PENDING,
+    }
 
 
 async def handle_dlq_message(
@@ -29,34 +62,15 @@ async def handle_dlq_message(
     """
     async with message.process(ignore_processed=True):
         try:
-            body = message.body.decode("utf-8", errors="replace")
-            headers: dict[str, Any] = dict(message.headers or {})
-
-            attempt_count = int(headers.get("x-retry-attempt", 0))
-            error_message = headers.get("x-error-message")
-            if isinstance(error_message, bytes):
-                error_message = error_message.decode("utf-8", errors="replace")
-            elif error_message is not None and not isinstance(error_message, str):
-                error_message = str(error_message)
-
-            # Sanitise header values so they are JSON-serialisable
-            safe_headers = _sanitise_headers(headers)
+            row = _dlq_row(message, queue_name)
 
             async with AsyncSessionLocal() as session:
                 async with session.begin():
-                    dlq_entry = DLQMessage(
-                        queue_name=queue_name,
-                        message_body=body,
-                        error_message=error_message,
-                        headers=safe_headers,
-                        attempt_count=attempt_count,
-                        status=DLQMessageStatus.PENDING,
-                    )
-                    session.add(dlq_entry)
+                    session.add(DLQMessage(**row))
 
             rabbitmq_logger.info(
                 f"Persisted DLQ message from {queue_name} "
-                f"(attempts={attempt_count})"
+                f"(attempts={row['attempt_count']})"
             )
 
         except Exception as e:
@@ -68,6 +82,40 @@ async def handle_dlq_message(
             await message.reject(requeue=False)
 
 
+class DLQBatchConsumer(MessageBatcher):
+    """
+    Drains one dead-letter queue into the database in batches.
+
+    Each batch is written with a single ``COPY`` in one transaction and
+    its messages are acked only after the commit. If the write fails,
+    the messages are persisted one at a time by ``handle_dlq_message``.
+    """
+
+    def __init__(self, queue_name: str, batch_size: int, max_wait_ms: int):
+        super().__init__(batch_size, max_wait_ms)
+        self.queue_name = queue_name
+
+    async def _process(self, batch: list[aio_pika.abc.AbstractIncomingMessage]) -> None:
+        try:
+            rows = [_dlq_row(message, self.queue_name) for message in batch]
+            async with AsyncSessionLocal.begin() as session:
+                await dlq_message_db.copy_insert(session, rows, commit_self=False)
+        except Exception as e:
+            rabbitmq_logger.error(
+                f"Failed to persist {len(batch)} DLQ messages from "
+                f"{self.queue_name} ({e}); persisting individually"
+            )
+            for message in batch:
+                await handle_dlq_message(message, self.queue_name)  # type: ignore[arg-type]
+            return
+
+        for message in batch:
+            await message.ack()
+        rabbitmq_logger.info(
+            f"Persisted {len(batch)} DLQ messages from {self.queue_name}"
+        )
+
+
 def _sanitise_headers(headers: dict[str, Any]) -> dict[str, Any]:
     """
     Convert header values to JSON-safe types.
@@ -0,0 +1,81 @@
+"""
+OTP audit handler.
+
+With the Redis OTP store, issued and used codes are published to the
+``otp_audit`` queue and recorded in ``otp_tokens`` here. Both actions are
+idempotent and carry the whole token, so redeliveries and out-of-order
+delivery are harmless.
+"""
+
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from app.core.config import auth_logger
+from app.core.db import AsyncSessionLocal
+from app.core.db.crud import otp_token_db
+from app.core.enums import OTPPurpose
+
+
+def _token_data(event: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "id": UUID(event["id"]),
+        "user_id": UUID(event["user_id"]) if event.get("user_id") else None,
+        "email": event["email"],
+        "purpose": OTPPurpose(event["purpose"]),
+        "code_hash": event["code_hash"],
+        "expires_at": datetime.fromisoformat(event["expires_at"]),
+    }
+
+
+async def handle_otp_audit(event: dict[str, Any]) -> None:
+    """
+    Record an issued or used OTP in ``otp_tokens``.
+
+    Args:
+        event: Dictionary with ``action`` (``issued`` or ``used``) and the
+            token: id, user_id, email, purpose, code_hash, expires_at.
+            ``used`` also carries used_at and attempts.
+
+    Raises:
+        Exception: On database errors (triggers retry).
+    """
+    action = event.get("action")
+    if action not in ("issued", "used"):
+        # Unknown actions will never succeed - drop instead of retrying
+        auth_logger.error(f"Unknown OTP audit action: {action}")
+        return
+
+    data = _token_data(event)
+
+    async with AsyncSessionLocal.begin() as session:
+        existing = await otp_token_db.get_by_id(session=session, id=data["id"])
+
+        if action == "issued":
+            if existing is not None:
+                return
+            await otp_token_db.invalidate_previous_tokens(
+                session=session,
+                email=data["email"],
+                purpose=data["purpose"],
+                commit_self=False,
+            )
+            await otp_token_db.create(session=session, data=data, commit_self=False)
+        else:
+            used = {
+                "used_at": datetime.fromisoformat(event["used_at"]),
+                "attempts": event["attempts"],
+            }
+            if existing is None:
+                await otp_token_db.create(
+                    session=session, data={**data, **used}, commit_self=False
+                )
+            else:
+                await otp_token_db.update(
+                    session=session, id=data["id"], updates=used, commit_self=False
+                )
+
+    auth_logger.info(f"OTP audit recorded: {action}")
+
+
+__all__ = ["handle_otp_audit"]
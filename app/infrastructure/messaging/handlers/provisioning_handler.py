@@ -0,0 +1,42 @@
+"""
+User provisioning handler.
+
+Sign-up publishes a ``user_provisioning`` event instead of creating the
+user's personal workspace and subscriptions in the request. The job is
+idempotent: users that are already provisioned (or being provisioned by
+another delivery) are skipped, and the hooks themselves reuse existing
+resources.
+"""
+
+from typing import Any
+from uuid import UUID
+
+from app.core.config import auth_logger
+from app.core.db import AsyncSessionLocal
+from app.core.db.crud import user_db
+from app.core.services.lifecycle import provision_user
+
+
+async def handle_user_provisioning(event: dict[str, Any]) -> None:
+    """
+    Run the post-signup hooks for a user and mark them provisioned.
+
+    Args:
+        event: Dictionary with ``user_id``.
+
+    Raises:
+        Exception: On database or hook errors (triggers retry).
+    """
+    user_id = UUID(event["user_id"])
+
+    async with AsyncSessionLocal.begin() as session:
+        user = await user_db.claim_for_provisioning(session=session, id=user_id)
+        if user is None:
+            auth_logger.debug(f"User {user_id} needs no provisioning")
+            return
+        await provision_user(session, user)
+
+    auth_logger.info(f"User {user_id} provisioned")
+
+
+__all__ = ["handle_user_provisioning"]
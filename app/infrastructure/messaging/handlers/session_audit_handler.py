@@ -0,0 +1,78 @@
+"""
+Refresh session audit handler.
+
+With the Redis session store, session changes are published to the
+``refresh_session_audit`` queue and recorded in ``refresh_tokens`` here, so
+the table stays a durable history without sitting on the refresh path.
+Every action is idempotent, so redeliveries are harmless.
+"""
+
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from app.core.config import auth_logger
+from app.core.db import AsyncSessionLocal
+from app.core.db.crud import refresh_token_db
+
+
+async def handle_refresh_session_audit(event: dict[str, Any]) -> None:
+    """
+    Record a refresh session change in ``refresh_tokens``.
+
+    Args:
+        event: Dictionary with ``action`` and its fields:
+            - created: id, user_id, token_hash, created_at, expires_at,
+              device_info
+            - revoked: token_hash
+            - revoked_all: user_id, revoked_at (tokens created before it
+              are revoked)
+
+    Raises:
+        Exception: On database errors (triggers retry).
+    """
+    action = event.get("action")
+
+    async with AsyncSessionLocal.begin() as session:
+        if action == "created":
+            existing = await refresh_token_db.get_by_token_hash(
+                session=session,
+                token_hash=event["token_hash"],
+                include_revoked=True,
+            )
+            if existing is not None:
+                return
+            await refresh_token_db.create(
+                session=session,
+                data={
+                    "id": UUID(event["id"]),
+                    "user_id": UUID(event["user_id"]),
+                    "token_hash": event["token_hash"],
+                    "created_at": datetime.fromisoformat(event["created_at"]),
+                    "expires_at": datetime.fromisoformat(event["expires_at"]),
+                    "device_info": event.get("device_info"),
+                },
+                commit_self=False,
+            )
+        elif action == "revoked":
+            await refresh_token_db.revoke(
+                session=session,
+                token_hash=event["token_hash"],
+                commit_self=False,
+            )
+        elif action == "revoked_all":
+            await refresh_token_db.revoke_all_for_user(
+                session=session,
+                user_id=UUID(event["user_id"]),
+                created_before=datetime.fromisoformat(event["revoked_at"]),
+                commit_self=False,
+            )
+        else:
+            # Unknown actions will never succeed - drop instead of retrying
+            auth_logger.error(f"Unknown refresh session audit action: {action}")
+            return
+
+    auth_logger.info(f"Refresh session audit recorded: {action}")
+
+
+__all__ = ["handle_refresh_session_audit"]
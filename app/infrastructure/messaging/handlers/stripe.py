@@ -2,15 +2,18 @@
 Stripe webhook message handlers for async event processing.
 
 Supports both API (workspace-based) and Career (user-based) subscriptions.
+Notification emails are published with the handler's session, so with the
+transactional outbox they commit together with the subscription changes.
 """
 
-from typing import Any
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.core.config import stripe_logger
+from app.core.config import settings, stripe_logger
 from app.core.db import AsyncSessionLocal
 from app.core.db.crud import (
     subscription_db,
@@ -23,13 +26,14 @@ from app.core.db.crud import (
 from app.core.db.models import Subscription
 from app.apps.cubex_api.db.models import Workspace
 from app.core.enums import ProductType
-from app.core.services import RedisService
+from app.core.services.idempotency import ClaimStatus, IdempotencyLease
 from app.apps.cubex_api.services import subscription_service as api_subscription_service
 from app.apps.cubex_api.db.crud import workspace_db
 from app.apps.cubex_career.services import (
     career_subscription_service,
 )
-from app.infrastructure.messaging.publisher import publish_event
+from app.core.services.event_publisher import get_publisher
+from app.infrastructure.messaging.errors import TransientMessageError
 
 # Redis key prefix for Stripe event deduplication
 STRIPE_EVENT_KEY_PREFIX = "stripe_event:"
@@ -37,28 +41,64 @@ STRIPE_EVENT_KEY_PREFIX = "stripe_event:"
 STRIPE_EVENT_TTL = 48 * 3600
 
 
-async def _is_event_already_processed(event_id: str) -> bool:
-    """Check if a Stripe event has already been processed using Redis."""
-    key = f"{STRIPE_EVENT_KEY_PREFIX}{event_id}"
-    return await RedisService.exists(key)
+@asynccontextmanager
+async def _claim_event(event_id: str, description: str) -> AsyncIterator[bool]:
+    """
+    Claim a Stripe event for processing with a Redis lease.
 
+    Yields False if the event was already processed. Otherwise the lease
+    is renewed while the block runs, completed when it succeeds and
+    released when it raises. If another consumer holds the lease the
+    delivery is retried later through the backoff tiers. Without Redis the
+    event is processed anyway and ``stripe_event_log`` deduplicates it.
+    """
+    lease = IdempotencyLease(
+        f"{STRIPE_EVENT_KEY_PREFIX}{event_id}",
+        settings.STRIPE_EVENT_LEASE_MS,
+        STRIPE_EVENT_TTL,
+    )
+    status = await lease.claim()
+    if status is ClaimStatus.COMPLETED:
+        stripe_logger.info(
+            f"{description} event {event_id} already processed, skipping"
+        )
+        yield False
+        return
+    if status is ClaimStatus.IN_PROGRESS:
+        raise TransientMessageError(
+            f"Stripe event {event_id} is being processed by another consumer"
+        )
+    async with lease.hold():
+        yield True
 
-async def _mark_event_as_processed(event_id: str) -> None:
-    """Mark a Stripe event as successfully processed in Redis."""
-    key = f"{STRIPE_EVENT_KEY_PREFIX}{event_id}"
-    await RedisService.set_if_not_exists(key, "1", ttl=STRIPE_EVENT_TTL)
+
+async def _start_event(
+    session: AsyncSession, event_id: str | None, event_type: str
+) -> bool:
+    """Log the event in the processing transaction; False if already processed.
+
+    The log row commits (or rolls back) together with the changes the event
+    makes, and a concurrent transaction for the same event waits on it, so
+    this is the durable backstop when the Redis marker is gone.
+    """
+    if event_id is None:
+        return True
+    if await stripe_event_log_db.record_event(
+        session, event_id=event_id, event_type=event_type, commit_self=False
+    ):
+        return True
+    stripe_logger.info(f"Stripe event {event_id} already logged, skipping")
+    return False
 
 
 async def _log_event_to_db(event_id: str, event_type: str) -> None:
-    """Persist a processed Stripe event to the DB for durable audit trail.
+    """Persist a Stripe event handled outside a processing transaction.
 
-    This complements the Redis-based deduplication with a permanent record.
-    Failures here are logged but never block the handler — Redis remains
-    the primary deduplication mechanism.
+    Failures here are logged but never block the handler.
     """
     try:
         async with AsyncSessionLocal.begin() as session:
-            await stripe_event_log_db.mark_event_processed(
+            await stripe_event_log_db.record_event(
                 session, event_id=event_id, event_type=event_type, commit_self=False
             )
     except Exception as e:
@@ -111,7 +151,7 @@ async def _send_subscription_activated_email(
         info = await _get_career_user_email_info(session, subscription.id)
         if info:
             email, full_name = info
-            await publish_event(
+            await get_publisher(session)(
                 "subscription_activated_emails",
                 {
                     "email": email,
@@ -128,7 +168,7 @@ async def _send_subscription_activated_email(
         info = await _get_api_workspace_owner_email_info(session, subscription.id)
         if info:
             email, full_name, workspace_name = info
-            await publish_event(
+            await get_publisher(session)(
                 "subscription_activated_emails",
                 {
                     "email": email,
@@ -154,7 +194,7 @@ async def _send_subscription_canceled_email(
         info = await _get_career_user_email_info(session, subscription.id)
         if info:
             email, full_name = info
-            await publish_event(
+            await get_publisher(session)(
                 "subscription_canceled_emails",
                 {
                     "email": email,
@@ -168,7 +208,7 @@ async def _send_subscription_canceled_email(
         info = await _get_api_workspace_owner_email_info(session, subscription.id)
         if info:
             email, full_name, workspace_name = info
-            await publish_event(
+            await get_publisher(session)(
                 "subscription_canceled_emails",
                 {
                     "email": email,
@@ -191,7 +231,7 @@ async def _send_payment_failed_email(
         info = await _get_career_user_email_info(session, subscription.id)
         if info:
             email, full_name = info
-            await publish_event(
+            await get_publisher(session)(
                 "payment_failed_emails",
                 {
                     "email": email,
@@ -206,7 +246,7 @@ async def _send_payment_failed_email(
         info = await _get_api_workspace_owner_email_info(session, subscription.id)
         if info:
             email, full_name, workspace_name = info
-            await publish_event(
+            await get_publisher(session)(
                 "payment_failed_emails",
                 {
                     "email": email,
@@ -224,6 +264,7 @@ async def _process_career_checkout(
     stripe_customer_id: str,
     user_id: UUID,
     plan_id: UUID,
+    event_id: str | None = None,
 ) -> None:
     """Process checkout completion for Career subscription."""
     stripe_logger.info(
@@ -231,6 +272,8 @@ async def _process_career_checkout(
         f"subscription={stripe_subscription_id}"
     )
     async with AsyncSessionLocal.begin() as session:
+        if not await _start_event(session, event_id, "checkout.session.completed"):
+            return
         await career_subscription_service.handle_checkout_completed(
             session,
             stripe_subscription_id=stripe_subscription_id,
@@ -250,6 +293,7 @@ async def _process_api_checkout(
     workspace_id: UUID,
     plan_id: UUID,
     seat_count: int,
+    event_id: str | None = None,
 ) -> None:
     """Process checkout completion for API subscription."""
     stripe_logger.info(
@@ -257,6 +301,8 @@ async def _process_api_checkout(
         f"subscription={stripe_subscription_id}"
     )
     async with AsyncSessionLocal.begin() as session:
+        if not await _start_event(session, event_id, "checkout.session.completed"):
+            return
         await api_subscription_service.handle_checkout_completed(
             session,
             stripe_subscription_id=stripe_subscription_id,
@@ -271,11 +317,15 @@ async def _process_api_checkout(
     )
 
 
-async def _process_subscription_update(stripe_subscription_id: str) -> None:
+async def _process_subscription_update(
+    stripe_subscription_id: str, event_id: str | None = None
+) -> None:
     """Process subscription update event."""
     stripe_logger.info(f"Processing subscription updated: {stripe_subscription_id}")
 
     async with AsyncSessionLocal.begin() as session:
+        if not await _start_event(session, event_id, "customer.subscription.updated"):
+            return
         subscription = await subscription_db.get_by_stripe_subscription_id(
             session, stripe_subscription_id
         )
@@ -308,11 +358,15 @@ async def _process_subscription_update(stripe_subscription_id: str) -> None:
             await _send_subscription_activated_email(session, updated, old_plan_name)
 
 
-async def _process_subscription_deletion(stripe_subscription_id: str) -> None:
+async def _process_subscription_deletion(
+    stripe_subscription_id: str, event_id: str | None = None
+) -> None:
     """Process subscription deletion event."""
     stripe_logger.info(f"Processing subscription deleted: {stripe_subscription_id}")
 
     async with AsyncSessionLocal.begin() as session:
+        if not await _start_event(session, event_id, "customer.subscription.deleted"):
+            return
         subscription = await subscription_db.get_by_stripe_subscription_id(
             session, stripe_subscription_id
         )
@@ -347,12 +401,15 @@ async def _process_subscription_deletion(stripe_subscription_id: str) -> None:
 async def _process_payment_failure(
     stripe_subscription_id: str | None,
     amount_due: int | None,
+    event_id: str | None = None,
 ) -> None:
     """Process payment failure - send notification email."""
     if not stripe_subscription_id:
         return
 
-    async with AsyncSessionLocal() as session:
+    async with AsyncSessionLocal.begin() as session:
+        if not await _start_event(session, event_id, "invoice.payment_failed"):
+            return
         subscription = await subscription_db.get_by_stripe_subscription_id(
             session, stripe_subscription_id
         )
@@ -373,38 +430,36 @@ async def handle_stripe_checkout_completed(event: dict[str, Any]) -> None:
     Routes to API or Career service based on product_type in metadata.
     """
     event_id = event["event_id"]
-
-    if await _is_event_already_processed(event_id):
-        stripe_logger.info(f"Checkout event {event_id} already processed, skipping")
-        return
-
     stripe_subscription_id = event["stripe_subscription_id"]
     stripe_customer_id = event["stripe_customer_id"]
     product_type = event.get("product_type", "api")
     plan_id = UUID(event["plan_id"])
 
-    try:
-        if product_type == "career":
-            await _process_career_checkout(
-                stripe_subscription_id,
-                stripe_customer_id,
-                UUID(event["user_id"]),
-                plan_id,
-            )
-        else:
-            await _process_api_checkout(
-                stripe_subscription_id,
-                stripe_customer_id,
-                UUID(event["workspace_id"]),
-                plan_id,
-                event["seat_count"],
-            )
-        await _mark_event_as_processed(event_id)
-        await _log_event_to_db(event_id, "checkout.session.completed")
-    except Exception as e:
-        entity_id = event.get("user_id") or event.get("workspace_id")
-        stripe_logger.error(f"Failed to process checkout for {entity_id}: {e}")
-        raise
+    async with _claim_event(event_id, "Checkout") as claimed:
+        if not claimed:
+            return
+        try:
+            if product_type == "career":
+                await _process_career_checkout(
+                    stripe_subscription_id,
+                    stripe_customer_id,
+                    UUID(event["user_id"]),
+                    plan_id,
+                    event_id=event_id,
+                )
+            else:
+                await _process_api_checkout(
+                    stripe_subscription_id,
+                    stripe_customer_id,
+                    UUID(event["workspace_id"]),
+                    plan_id,
+                    event["seat_count"],
+                    event_id=event_id,
+                )
+        except Exception as e:
+            entity_id = event.get("user_id") or event.get("workspace_id")
+            stripe_logger.error(f"Failed to process checkout for {entity_id}: {e}")
+            raise
 
 
 async def handle_stripe_subscription_updated(event: dict[str, Any]) -> None:
@@ -414,24 +469,20 @@ async def handle_stripe_subscription_updated(event: dict[str, Any]) -> None:
     Routes to API or Career service based on the subscription's plan product type.
     """
     event_id = event["event_id"]
-
-    if await _is_event_already_processed(event_id):
-        stripe_logger.info(
-            f"Subscription updated event {event_id} already processed, skipping"
-        )
-        return
-
     stripe_subscription_id = event["stripe_subscription_id"]
 
-    try:
-        await _process_subscription_update(stripe_subscription_id)
-        await _mark_event_as_processed(event_id)
-        await _log_event_to_db(event_id, "customer.subscription.updated")
-    except Exception as e:
-        stripe_logger.error(
-            f"Failed to process subscription updated {stripe_subscription_id}: {e}"
-        )
-        raise
+    async with _claim_event(event_id, "Subscription updated") as claimed:
+        if not claimed:
+            return
+        try:
+            await _process_subscription_update(
+                stripe_subscription_id, event_id=event_id
+            )
+        except Exception as e:
+            stripe_logger.error(
+                f"Failed to process subscription updated {stripe_subscription_id}: {e}"
+            )
+            raise
 
 
 async def handle_stripe_subscription_deleted(event: dict[str, Any]) -> None:
@@ -442,24 +493,20 @@ async def handle_stripe_subscription_deleted(event: dict[str, Any]) -> None:
     Freezes workspace (API) or downgrades user (Career) when subscription is canceled.
     """
     event_id = event["event_id"]
-
-    if await _is_event_already_processed(event_id):
-        stripe_logger.info(
-            f"Subscription deleted event {event_id} already processed, skipping"
-        )
-        return
-
     stripe_subscription_id = event["stripe_subscription_id"]
 
-    try:
-        await _process_subscription_deletion(stripe_subscription_id)
-        await _mark_event_as_processed(event_id)
-        await _log_event_to_db(event_id, "customer.subscription.deleted")
-    except Exception as e:
-        stripe_logger.error(
-            f"Failed to process subscription deleted {stripe_subscription_id}: {e}"
-        )
-        raise
+    async with _claim_event(event_id, "Subscription deleted") as claimed:
+        if not claimed:
+            return
+        try:
+            await _process_subscription_deletion(
+                stripe_subscription_id, event_id=event_id
+            )
+        except Exception as e:
+            stripe_logger.error(
+                f"Failed to process subscription deleted {stripe_subscription_id}: {e}"
+            )
+            raise
 
 
 async def handle_stripe_payment_failed(event: dict[str, Any]) -> None:
@@ -469,28 +516,26 @@ async def handle_stripe_payment_failed(event: dict[str, Any]) -> None:
     Sends payment failure notification email and logs the failure.
     """
     event_id = event["event_id"]
-
-    if await _is_event_already_processed(event_id):
-        stripe_logger.info(
-            f"Payment failed event {event_id} already processed, skipping"
-        )
-        return
-
     stripe_subscription_id = event.get("stripe_subscription_id")
     customer_email = event.get("customer_email")
     amount_due = event.get("amount_due")
 
-    stripe_logger.warning(
-        f"Payment failed for subscription {stripe_subscription_id}, customer: {customer_email}"
-    )
+    async with _claim_event(event_id, "Payment failed") as claimed:
+        if not claimed:
+            return
 
-    try:
-        await _process_payment_failure(stripe_subscription_id, amount_due)
-    except Exception as e:
-        stripe_logger.error(f"Failed to queue payment failed email: {e}")
+        stripe_logger.warning(
+            f"Payment failed for subscription {stripe_subscription_id}, customer: {customer_email}"
+        )
 
-    await _mark_event_as_processed(event_id)
-    await _log_event_to_db(event_id, "invoice.payment_failed")
+        try:
+            await _process_payment_failure(
+                stripe_subscription_id, amount_due, event_id=event_id
+            )
+        except Exception as e:
+            stripe_logger.error(f"Failed to queue payment failed email: {e}")
+            # The processing transaction (and its log row) rolled back
+            await _log_event_to_db(event_id, "invoice.payment_failed")
 
 
 __all__ = [
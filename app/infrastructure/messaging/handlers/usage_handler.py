@@ -10,23 +10,85 @@ from pydantic import ValidationError
 
 from app.core.config import usage_logger
 from app.core.db import AsyncSessionLocal
+from app.core.db.crud import UsageLogCommit
 from app.apps.cubex_api.schemas.workspace import UsageCommitRequest
 from app.apps.cubex_api.services.quota import quota_service
 from app.core.services.email_manager import EmailManagerService
 
 
-async def handle_usage_commit(event: dict[str, Any]) -> None:
+def _commit_details(
+    request: UsageCommitRequest,
+) -> tuple[dict[str, Any] | None, dict[str, Any] | None]:
+    """Convert a commit request's metrics/failure into service dicts."""
+    metrics = None
+    if request.metrics:
+        metrics = {
+            "model_used": request.metrics.model_used,
+            "input_tokens": request.metrics.input_tokens,
+            "output_tokens": request.metrics.output_tokens,
+            "latency_ms": request.metrics.latency_ms,
+        }
+
+    failure = None
+    if request.failure:
+        failure = {
+            "failure_type": request.failure.failure_type,
+            "reason": request.failure.reason,
+        }
+    return metrics, failure
+
+
+def _usage_id(event: UsageCommitRequest | dict[str, Any]) -> Any:
+    if isinstance(event, UsageCommitRequest):
+        return event.usage_id
+    return event.get("usage_id", "unknown")
+
+
+def _parse_event(
+    event: UsageCommitRequest | dict[str, Any],
+) -> tuple[UsageCommitRequest | None, list[dict[str, Any]]]:
+    """
+    Return the event as a validated request, or None and its validation errors.
+
+    The consumer already validates payloads into ``UsageCommitRequest``;
+    dicts only arrive for payloads that failed that validation (or from
+    direct callers), and are validated here so the failure is reported.
+    """
+    if isinstance(event, UsageCommitRequest):
+        return event, []
+    try:
+        return UsageCommitRequest.model_validate(event), []
+    except ValidationError as e:
+        return None, [dict(err) for err in e.errors()]
+
+
+async def _alert_invalid_payload(
+    event: UsageCommitRequest | dict[str, Any], errors: list[dict[str, Any]]
+) -> None:
+    """Log and alert on a payload that will never validate (no retry)."""
+    usage_logger.error(f"Invalid usage commit payload: {errors}")
+    await EmailManagerService.send_invalid_payload_alert(
+        queue_name="usage_commits",
+        message_body=event,
+        validation_errors=errors,
+    )
+
+
+async def handle_usage_commit(
+    event: UsageCommitRequest | dict[str, Any],
+) -> None:
     """
     Handle a usage commit message from the queue.
 
-    Validates the payload against UsageCommitRequest schema and calls
+    Validates a dict payload against UsageCommitRequest schema and calls
     quota_service.commit_usage() to process the commit.
 
     On validation error: sends alert email and returns success (no retry).
     On processing error: raises exception to trigger retry.
 
     Args:
-        event: Dictionary payload matching UsageCommitRequest schema.
+        event: The validated UsageCommitRequest, or a dictionary payload
+            matching its schema.
             Required fields:
             - api_key: str - The API key that made the original request
             - usage_id: str (UUID) - The usage log ID to commit
@@ -38,37 +100,15 @@ async def handle_usage_commit(event: dict[str, Any]) -> None:
     Raises:
         Exception: On processing errors (triggers retry).
     """
-    usage_logger.info(
-        f"Processing usage commit message: {event.get('usage_id', 'unknown')}"
-    )
+    usage_logger.info(f"Processing usage commit message: {_usage_id(event)}")
 
-    try:
-        request = UsageCommitRequest(**event)
-    except ValidationError as e:
+    request, errors = _parse_event(event)
+    if request is None:
         # Invalid payload - send alert and return success (no retry)
-        usage_logger.error(f"Invalid usage commit payload: {e.errors()}")
-        await EmailManagerService.send_invalid_payload_alert(
-            queue_name="usage_commits",
-            message_body=event,
-            validation_errors=[dict(err) for err in e.errors()],
-        )
-        return  # Don't retry - payload will never be valid
+        await _alert_invalid_payload(event, errors)
+        return
 
-    metrics = None
-    if request.metrics:
-        metrics = {
-            "model_used": request.metrics.model_used,
-            "input_tokens": request.metrics.input_tokens,
-            "output_tokens": request.metrics.output_tokens,
-            "latency_ms": request.metrics.latency_ms,
-        }
-
-    failure = None
-    if request.failure:
-        failure = {
-            "failure_type": request.failure.failure_type,
-            "reason": request.failure.reason,
-        }
+    metrics, failure = _commit_details(request)
 
     # Process the commit
     try:
@@ -101,4 +141,70 @@ async def handle_usage_commit(event: dict[str, Any]) -> None:
         raise  # Re-raise to trigger retry
 
 
-__all__ = ["handle_usage_commit"]
+def _to_usage_log_commit(request: UsageCommitRequest) -> UsageLogCommit:
+    metrics, failure = _commit_details(request)
+    return UsageLogCommit(
+        usage_log_id=request.usage_id,
+        success=request.success,
+        metrics=metrics,
+        failure=failure,
+    )
+
+
+async def handle_usage_commit_batch(
+    events: list[UsageCommitRequest | dict[str, Any]],
+) -> None:
+    """
+    Handle a batch of usage commit messages in one transaction.
+
+    Invalid payloads are skipped, and alerted on like the single-message
+    handler once the batch has committed, so a batch that falls back to
+    one-at-a-time processing does not alert twice. The remaining commits are
+    applied together by ``quota_service.commit_usage_batch()`` and committed
+    once; the consumer acks the messages only after this returns.
+
+    Args:
+        events: Validated requests (or, for payloads that failed
+            validation, decoded dicts), in delivery order.
+
+    Raises:
+        Exception: On processing errors. The consumer then re-processes the
+            batch's messages one at a time so a poison message is retried
+            or dead-lettered on its own.
+    """
+    commits: list[tuple[str, UsageLogCommit]] = []
+    invalid: list[tuple[UsageCommitRequest | dict[str, Any], list[dict[str, Any]]]] = []
+    for event in events:
+        request, errors = _parse_event(event)
+        if request is None:
+            invalid.append((event, errors))
+            continue
+        commits.append((request.api_key, _to_usage_log_commit(request)))
+
+    outcomes: list[tuple[bool, str]] = []
+    if commits:
+        async with AsyncSessionLocal.begin() as session:
+            outcomes = await quota_service.commit_usage_batch(session, commits)
+
+    # Alert only once the batch has committed: if it fails, the consumer
+    # re-processes each message on its own and alerts from there instead
+    for event, errors in invalid:
+        await _alert_invalid_payload(event, errors)
+
+    if not commits:
+        return
+
+    rejected = 0
+    for (_, commit), (success, message) in zip(commits, outcomes):
+        if not success:
+            rejected += 1
+            usage_logger.warning(
+                f"Usage commit rejected: usage_id={commit.usage_log_id}, "
+                f"message={message}"
+            )
+    usage_logger.info(
+        f"Usage commit batch processed: {len(commits)} commits, {rejected} rejected"
+    )
+
+
+__all__ = ["handle_usage_commit", "handle_usage_commit_batch"]
@@ -0,0 +1,455 @@
+"""
+In-process message broker for development, tests and single-process deployments.
+
+With ``MESSAGING_BROKER=local`` ``get_connection`` returns a
+``LocalConnection`` instead of connecting to RabbitMQ. It implements the
+part of aio-pika's connection, channel, queue and message API that the
+publisher, ``process_message``, the batch consumers and the consumer
+runtime use, so all of them run unchanged:
+
+- Queues are bounded (``LOCAL_BROKER_MAX_QUEUE_SIZE`` messages each).
+  Publishing to a full queue waits until a consumer makes room, so a slow
+  handler pushes back on its producers instead of growing memory.
+- The default exchange routes by queue name. Messages for undeclared
+  queues are dropped, as RabbitMQ drops unroutable messages.
+- ``x-message-ttl`` and per-message ``expiration`` expire messages when
+  they reach the head of their queue, and expired or rejected messages
+  are dead-lettered via ``x-dead-letter-routing-key``. Retry tiers
+  therefore feed back into their main queue after their delay, exactly
+  as the ``QUEUE_CONFIG`` declarations do on RabbitMQ.
+- A consumer holds at most its channel's ``prefetch_count`` unsettled
+  deliveries. Deliveries still unsettled when their channel closes are
+  requeued with ``redelivered`` set.
+
+Messages live in memory only and are lost when the process exits, and
+the broker is only reachable from its own process, so consumers must run
+in the API process (``ENABLE_MESSAGING=true``).
+"""
+
+import asyncio
+import itertools
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+
+import aio_pika
+from aio_pika.message import ProcessContext
+
+from app.core.config import rabbitmq_logger
+
+LocalCallback = Callable[["LocalIncomingMessage"], Awaitable[Any]]
+
+
+@dataclass
+class _Entry:
+    message: aio_pika.Message
+    deadline: float | None
+    redelivered: bool = False
+
+
+@dataclass
+class _Consumer:
+    tag: str
+    callback: LocalCallback
+    channel: "LocalChannel"
+    no_ack: bool
+    unsettled: int = 0
+
+    @property
+    def has_capacity(self) -> bool:
+        prefetch = self.channel.prefetch_count
+        return self.no_ack or not prefetch or self.unsettled < prefetch
+
+
+@dataclass
+class _Delivery:
+    entry: _Entry
+    consumer: _Consumer | None  # None: the message expired
+
+
+def _without_expiration(message: aio_pika.Message) -> aio_pika.Message:
+    return aio_pika.Message(
+        body=message.body,
+        headers=dict(message.headers or {}),
+        content_type=message.content_type,
+        content_encoding=message.content_encoding,
+        delivery_mode=message.delivery_mode,
+        priority=message.priority,
+        correlation_id=message.correlation_id,
+        message_id=message.message_id,
+        timestamp=message.timestamp,
+        type=message.type,
+        app_id=message.app_id,
+    )
+
+
+class LocalQueue:
+    """A bounded in-memory queue with TTL, dead-lettering and consumers."""
+
+    def __init__(self, broker: "LocalBroker", name: str, max_size: int):
+        self.broker = broker
+        self.name = name
+        self.max_size = max_size
+        self.message_ttl_ms: int | None = None
+        self.dead_letter_routing_key: str | None = None
+        self._entries: deque[_Entry] = deque()
+        self._consumers: list[_Consumer] = []
+        self._next_consumer = 0
+        self._changed = asyncio.Condition()
+        self._deliveries: set[asyncio.Task] = set()
+        self._dispatcher = asyncio.create_task(
+            self._dispatch(), name=f"local-broker-{name}"
+        )
+
+    @property
+    def message_count(self) -> int:
+        """Messages waiting for delivery (unsettled ones excluded)."""
+        return len(self._entries)
+
+    @property
+    def consumer_count(self) -> int:
+        return len(self._consumers)
+
+    def configure(self, arguments: dict[str, Any]) -> None:
+        """Apply ``x-message-ttl`` / ``x-dead-letter-routing-key`` arguments."""
+        if "x-message-ttl" in arguments:
+            self.message_ttl_ms = int(arguments["x-message-ttl"])
+        if "x-dead-letter-routing-key" in arguments:
+            self.dead_letter_routing_key = arguments["x-dead-letter-routing-key"]
+
+    def _deadline(self, message: aio_pika.Message) -> float | None:
+        ttls = [
+            ttl
+            for ttl in (
+                self.message_ttl_ms / 1000 if self.message_ttl_ms is not None else None,
+                message.expiration,
+            )
+            if isinstance(ttl, (int, float))
+        ]
+        if not ttls:
+            return None
+        return asyncio.get_running_loop().time() + min(ttls)
+
+    async def put(self, message: aio_pika.Message) -> None:
+        """Enqueue a message, waiting while the queue is full."""
+        async with self._changed:
+            await self._changed.wait_for(lambda: len(self._entries) < self.max_size)
+            self._entries.append(_Entry(message, self._deadline(message)))
+            self._changed.notify_all()
+
+    async def requeue(self, entry: _Entry) -> None:
+        """Return a delivered message to the head of the queue."""
+        async with self._changed:
+            entry.redelivered = True
+            self._entries.appendleft(entry)
+            self._changed.notify_all()
+
+    async def dead_letter(self, entry: _Entry) -> None:
+        """Route an expired or rejected message to the dead-letter queue."""
+        if self.dead_letter_routing_key is None:
+            return
+        await self.broker.route(
+            self.dead_letter_routing_key, _without_expiration(entry.message)
+        )
+
+    async def add_consumer(self, consumer: _Consumer) -> None:
+        async with self._changed:
+            self._consumers.append(consumer)
+            self._changed.notify_all()
+
+    async def remove_consumer(self, tag: str) -> None:
+        async with self._changed:
+            self._consumers = [c for c in self._consumers if c.tag != tag]
+            self._changed.notify_all()
+
+    async def settled(self, consumer: _Consumer) -> None:
+        async with self._changed:
+            consumer.unsettled -= 1
+            self._changed.notify_all()
+
+    def _free_consumer(self) -> _Consumer | None:
+        for offset in range(len(self._consumers)):
+            index = (self._next_consumer + offset) % len(self._consumers)
+            consumer = self._consumers[index]
+            if consumer.has_capacity:
+                self._next_consumer = index + 1
+                return consumer
+        return None
+
+    async def _next_delivery(self) -> _Delivery:
+        """Wait for the head message to expire or for a consumer to take it."""
+        loop = asyncio.get_running_loop()
+        async with self._changed:
+            while True:
+                timeout: float | None = None
+                if self._entries:
+                    head = self._entries[0]
+                    if head.deadline is not None and head.deadline <= loop.time():
+                        self._entries.popleft()
+                        self._changed.notify_all()
+                        return _Delivery(head, None)
+                    consumer = self._free_consumer()
+                    if consumer is not None:
+                        self._entries.popleft()
+                        if not consumer.no_ack:
+                            consumer.unsettled += 1
+                        self._changed.notify_all()
+                        return _Delivery(head, consumer)
+                    if head.deadline is not None:
+                        timeout = head.deadline - loop.time()
+                try:
+                    async with asyncio.timeout(timeout):
+                        await self._changed.wait()
+                except TimeoutError:
+                    pass
+
+    async def _dispatch(self) -> None:
+        while True:
+            delivery = await self._next_delivery()
+            if delivery.consumer is None:
+                await self.dead_letter(delivery.entry)
+                continue
+            incoming = LocalIncomingMessage(self, delivery.entry, delivery.consumer)
+            # Each delivery runs in its own task, as aio-pika runs callbacks
+            task = asyncio.create_task(self._deliver(delivery.consumer, incoming))
+            self._deliveries.add(task)
+            task.add_done_callback(self._deliveries.discard)
+
+    async def _deliver(
+        self, consumer: _Consumer, incoming: "LocalIncomingMessage"
+    ) -> None:
+        if consumer.no_ack:
+            incoming._settle()
+        else:
+            consumer.channel._unsettled.add(incoming)
+        try:
+            await consumer.callback(incoming)
+        except Exception as e:
+            # As with aio-pika, the delivery stays unsettled until its
+            # channel closes
+            rabbitmq_logger.exception(f"Local consumer on {self.name} failed: {e}")
+
+    def close(self) -> None:
+        self._dispatcher.cancel()
+
+
+class LocalIncomingMessage:
+    """A delivered message, settled with ack/reject/nack like aio-pika's."""
+
+    def __init__(self, queue: LocalQueue, entry: _Entry, consumer: _Consumer):
+        self.queue = queue
+        self.entry = entry
+        self.consumer = consumer
+        self.channel = consumer.channel
+        self.processed = False
+        message = entry.message
+        self.body = message.body
+        self.headers = dict(message.headers or {})
+        self.content_type = message.content_type
+        self.content_encoding = message.content_encoding
+        self.message_id = message.message_id
+        self.timestamp = message.timestamp
+        self.routing_key = queue.name
+        self.redelivered = entry.redelivered
+        self.consumer_tag = consumer.tag
+
+    def _settle(self) -> bool:
+        if self.processed:
+            return False
+        self.processed = True
+        self.channel._unsettled.discard(self)
+        return True
+
+    async def ack(self, multiple: bool = False) -> None:
+        if self._settle():
+            await self.queue.settled(self.consumer)
+
+    async def reject(self, requeue: bool = False) -> None:
+        if not self._settle():
+            return
+        await self.queue.settled(self.consumer)
+        if requeue:
+            await self.queue.requeue(self.entry)
+        else:
+            await self.queue.dead_letter(self.entry)
+
+    async def nack(self, multiple: bool = False, requeue: bool = True) -> None:
+        await self.reject(requeue=requeue)
+
+    def process(
+        self,
+        requeue: bool = False,
+        reject_on_redelivered: bool = False,
+        ignore_processed: bool = False,
+    ) -> ProcessContext:
+        """Ack on success, reject on error (aio-pika's ``process`` semantics)."""
+        return ProcessContext(
+            self,  # type: ignore[arg-type]
+            requeue=requeue,
+            reject_on_redelivered=reject_on_redelivered,
+            ignore_processed=ignore_processed,
+        )
+
+
+class LocalExchange:
+    """The default exchange: routes each message to the queue it names."""
+
+    def __init__(self, channel: "LocalChannel"):
+        self.channel = channel
+
+    async def publish(
+        self,
+        message: aio_pika.Message,
+        routing_key: str,
+        *,
+        mandatory: bool = True,
+        immediate: bool = False,
+        timeout: float | None = None,
+    ) -> None:
+        async with asyncio.timeout(timeout):
+            await self.channel.connection.broker.route(routing_key, message)
+
+
+@dataclass
+class _DeclareOk:
+    message_count: int
+    consumer_count: int
+
+
+class LocalQueueHandle:
+    """A queue as seen through one channel (consumers use its prefetch)."""
+
+    def __init__(self, queue: LocalQueue, channel: "LocalChannel"):
+        self.queue = queue
+        self.channel = channel
+        self.name = queue.name
+
+    @property
+    def declaration_result(self) -> "_DeclareOk":
+        """Queue counters, as aio-pika reports them from ``Queue.DeclareOk``."""
+        return _DeclareOk(self.queue.message_count, self.queue.consumer_count)
+
+    async def consume(self, callback: LocalCallback, no_ack: bool = False) -> str:
+        tag = f"local-ctag-{next(self.channel.connection.broker._tags)}"
+        consumer = _Consumer(tag, callback, self.channel, no_ack)
+        self.channel._consumers[tag] = self.queue
+        await self.queue.add_consumer(consumer)
+        return tag
+
+    async def cancel(self, consumer_tag: str) -> None:
+        self.channel._consumers.pop(consumer_tag, None)
+        await self.queue.remove_consumer(consumer_tag)
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class LocalChannel:
+    """A channel of a ``LocalConnection``."""
+
+    def __init__(self, connection: "LocalConnection"):
+        self.connection = connection
+        self.prefetch_count = 0
+        self.is_closed = False
+        self.default_exchange = LocalExchange(self)
+        self._consumers: dict[str, LocalQueue] = {}
+        self._unsettled: set[LocalIncomingMessage] = set()
+
+    async def set_qos(self, prefetch_count: int = 0, **kwargs: Any) -> None:
+        self.prefetch_count = prefetch_count
+
+    async def declare_queue(
+        self,
+        name: str,
+        *,
+        durable: bool = False,
+        arguments: dict[str, Any] | None = None,
+        passive: bool = False,
+        **kwargs: Any,
+    ) -> LocalQueueHandle:
+        broker = self.connection.broker
+        if passive:
+            queue = broker.queues.get(name)
+            if queue is None:
+                raise LookupError(f"Queue {name!r} is not declared")
+        else:
+            queue = broker.declare(name, arguments)
+        return LocalQueueHandle(queue, self)
+
+    async def close(self) -> None:
+        """Cancel this channel's consumers and requeue its unsettled deliveries."""
+        if self.is_closed:
+            return
+        self.is_closed = True
+        for tag, queue in list(self._consumers.items()):
+            await queue.remove_consumer(tag)
+        self._consumers.clear()
+        unsettled, self._unsettled = self._unsettled, set()
+        for incoming in unsettled:
+            incoming.processed = True
+            await incoming.queue.requeue(incoming.entry)
+        self.connection._channels.discard(self)
+
+
+class LocalBroker:
+    """The queues of one process."""
+
+    def __init__(self, max_queue_size: int):
+        self.max_queue_size = max_queue_size
+        self.queues: dict[str, LocalQueue] = {}
+        self._tags = itertools.count(1)
+
+    def declare(self, name: str, arguments: dict[str, Any] | None = None) -> LocalQueue:
+        queue = self.queues.get(name)
+        if queue is None:
+            queue = self.queues[name] = LocalQueue(self, name, self.max_queue_size)
+        if arguments:
+            queue.configure(arguments)
+        return queue
+
+    async def route(self, routing_key: str, message: aio_pika.Message) -> None:
+        queue = self.queues.get(routing_key)
+        if queue is None:
+            rabbitmq_logger.warning(
+                f"Local broker dropped a message for undeclared queue {routing_key}"
+            )
+            return
+        await queue.put(message)
+
+    def close(self) -> None:
+        for queue in self.queues.values():
+            queue.close()
+
+
+class LocalConnection:
+    """Stands in for an aio-pika connection; owns its ``LocalBroker``."""
+
+    def __init__(self, max_queue_size: int):
+        self.broker = LocalBroker(max_queue_size)
+        self.is_closed = False
+        self._channels: set[LocalChannel] = set()
+
+    async def channel(
+        self, publisher_confirms: bool = True, **kwargs: Any
+    ) -> LocalChannel:
+        channel = LocalChannel(self)
+        self._channels.add(channel)
+        return channel
+
+    async def close(self) -> None:
+        """Close every channel and stop the broker; queued messages are lost."""
+        if self.is_closed:
+            return
+        self.is_closed = True
+        for channel in list(self._channels):
+            await channel.close()
+        self.broker.close()
+
+
+__all__ = [
+    "LocalBroker",
+    "LocalChannel",
+    "LocalConnection",
+    "LocalIncomingMessage",
+    "LocalQueue",
+]
@@ -3,38 +3,86 @@ Messaging Module for CubeX Application.
 
 Standalone Usage:
     python -m app.infrastructure.messaging.main
+    python -m app.infrastructure.messaging.main --workers 4
+    python -m app.infrastructure.messaging.main --queues usage_commits,career_usage_commits
 
 Docker Usage:
     docker compose --profile worker-only up -d
 """
 
+import argparse
 import asyncio
+import multiprocessing
 import signal
+import time
 from functools import partial
+from typing import Collection
 
 import aio_pika
+from aio_pika.abc import AbstractChannel
 
+from app.infrastructure.messaging.batch_consumer import BatchConsumer
 from app.infrastructure.messaging.connection import get_connection
 from app.infrastructure.messaging.consumer import process_message
-from app.infrastructure.messaging.handlers.dlq_handler import handle_dlq_message
-from app.infrastructure.messaging.queues import get_queue_configs
+from app.infrastructure.messaging.handlers.dlq_handler import DLQBatchConsumer
+from app.infrastructure.messaging.outbox_relay import (
+    OutboxRelay,
+    register_event_publisher,
+)
+from app.infrastructure.messaging.publisher import close_publisher
+from app.infrastructure.messaging.queues import (
+    ConsumerPriority,
+    QueueConfig,
+    get_queue_configs,
+)
+from app.infrastructure.messaging.runtime import ConsumerRuntime
 from app.core.config import rabbitmq_logger, settings
-from app.core.db import init_db, dispose_db
+from app.core.db import init_db, dispose_db, pool_liveness_monitor
 from app.core.services import BrevoService, RedisService, Renderer
+from app.core.services.messaging_metrics import MessagingMetricsReporter
+from app.apps.provisioning import register_post_signup_hooks
 
 
-async def start_consumers(keep_alive: bool) -> aio_pika.RobustConnection | None:
+def select_queue_configs(
+    queue_names: Collection[str] | None = None,
+) -> list[QueueConfig]:
+    """
+    Return the configured queues, optionally restricted to some names.
+
+    Args:
+        queue_names: Queue names to keep; ``None`` keeps every queue.
+
+    Raises:
+        ValueError: If a name is not a configured queue.
+    """
+    queue_configs = get_queue_configs()
+    if queue_names is None:
+        return queue_configs
+    unknown = set(queue_names) - {q.name for q in queue_configs}
+    if unknown:
+        raise ValueError(f"Unknown queue(s): {', '.join(sorted(unknown))}")
+    return [q for q in queue_configs if q.name in queue_names]
+
+
+async def start_consumers(
+    keep_alive: bool,
+    runtime: ConsumerRuntime | None = None,
+    queue_names: Collection[str] | None = None,
+) -> aio_pika.RobustConnection | None:
     """
     Asynchronously starts message consumers for all queues defined in get_queue_configs().
-    This function establishes a connection to the message broker, sets the channel's QoS,
-    and declares the main, retry, and dead-letter queues as specified in the configuration.
-    It then registers a consumer for each queue, using the provided message handler and
-    optional retry and dead-letter queues. The consumers run indefinitely until the process
-    is stopped, at which point the connection is gracefully closed.
+    This function establishes a connection to the message broker, declares the main,
+    retry, and dead-letter queues as specified in the configuration, and registers a
+    consumer for each queue on its own channel, using the queue's prefetch, concurrency
+    limit and priority class. The consumers run indefinitely until the process is
+    stopped, at which point the connection is gracefully closed.
 
     Args:
         keep_alive (bool): If True, the consumers will run indefinitely. If False, they
             will stop only after the caller closes the connection.
+        runtime (ConsumerRuntime, optional): Runtime that limits the handlers and can
+            drain them on shutdown. A new one is created when omitted.
+        queue_names (Collection[str], optional): Only consume these queues.
     Returns:
         Optional[aio_pika.RobustConnection]: The connection object if keep_alive is False,
             None otherwise.
@@ -44,14 +92,24 @@ async def start_consumers(keep_alive: bool) -> aio_pika.RobustConnection | None:
     Note:
         This function is intended to be run within an asyncio event loop.
     """
+    if runtime is None:
+        runtime = ConsumerRuntime(settings.RABBITMQ_WORKER_CONCURRENCY)
+
     conn = await get_connection()
+    # Declarations share one channel; every main queue gets its own so its
+    # prefetch window is not shared with other queues
     channel = await conn.channel()
     await channel.set_qos(prefetch_count=10)  # fetch 10 messages at a time
+    # DLQ consumers write in batches, so they get a channel whose prefetch
+    # covers two batches (opened with the first dead-letter queue)
+    dlq_channel: AbstractChannel | None = None
+
+    for q in select_queue_configs(queue_names):
+        consume_channel = await conn.channel()
+        await consume_channel.set_qos(prefetch_count=q.effective_prefetch_count)
 
-    queue_configs = get_queue_configs()
-    for q in queue_configs:
         # Declare main, retry, and DLX queues
-        queue = await channel.declare_queue(q.name, durable=True)
+        queue = await consume_channel.declare_queue(q.name, durable=True)
 
         # Single retry queue setup
         if retry := q.retry_queue:
@@ -67,7 +125,7 @@ async def start_consumers(keep_alive: bool) -> aio_pika.RobustConnection | None:
 
         # Multiple retry queues setup
         if retries := q.retry_queues:
-            for retry in retries:
+            for retry in (tier_queue for r in retries for tier_queue in r.queues()):
                 await channel.declare_queue(
                     retry.name,
                     durable=True,
@@ -80,29 +138,62 @@ async def start_consumers(keep_alive: bool) -> aio_pika.RobustConnection | None:
 
         # Dead-letter queue setup
         if dead := q.dead_letter_queue:
-            dlq = await channel.declare_queue(dead, durable=True)
+            if dlq_channel is None:
+                dlq_channel = await conn.channel()
+                await dlq_channel.set_qos(
+                    prefetch_count=2 * settings.DLQ_INGEST_BATCH_SIZE
+                )
+            dlq = await dlq_channel.declare_queue(dead, durable=True)
             # Attach a consumer that drains DLQ messages into the database
-            await dlq.consume(
-                partial(handle_dlq_message, queue_name=dead),  # type: ignore[arg-type]
-                no_ack=False,
+            await runtime.consume(
+                dlq,
+                DLQBatchConsumer(
+                    queue_name=dead,
+                    batch_size=settings.DLQ_INGEST_BATCH_SIZE,
+                    max_wait_ms=settings.DLQ_INGEST_MAX_WAIT_MS,
+                ),
+                concurrency=1,
+                priority=ConsumerPriority.EMAIL,
             )
 
+        retry_queues = (
+            [retry_queue.model_dump() for retry_queue in q.retry_queues]
+            if q.retry_queues
+            else None
+        )
+
         # Register consumer
-        await queue.consume(  # type: ignore[arg-type]
-            partial(
+        if q.batch_handler:
+            callback = BatchConsumer(
+                batch_handler=q.batch_handler,
+                handler=q.handler,
+                channel=consume_channel,  # type: ignore[arg-type]
+                batch_size=q.batch_size,
+                max_wait_ms=q.batch_max_wait_ms,
+                retry_queue=q.retry_queue,
+                retry_queues=retry_queues,
+                max_retries=q.max_retries,
+                dead_letter_queue=q.dead_letter_queue,
+                payload_model=q.payload_model,
+                queue_name=q.name,
+            )
+        else:
+            callback = partial(
                 process_message,
                 handler=q.handler,
-                channel=channel,  # type: ignore[arg-type]
+                channel=consume_channel,  # type: ignore[arg-type]
                 retry_queue=q.retry_queue,
-                retry_queues=(
-                    [retry_queue.model_dump() for retry_queue in q.retry_queues]
-                    if q.retry_queues
-                    else None
-                ),
+                retry_queues=retry_queues,
                 max_retries=q.max_retries,
                 dead_letter_queue=q.dead_letter_queue,
-            ),
-            no_ack=False,
+                payload_model=q.payload_model,
+                queue_name=q.name,
+            )
+        await runtime.consume(
+            queue,
+            callback,  # type: ignore[arg-type]
+            concurrency=q.effective_concurrency,
+            priority=q.priority,
         )
     print("Consumers started. Waiting for messages...")
     if keep_alive:
@@ -115,16 +206,24 @@ async def start_consumers(keep_alive: bool) -> aio_pika.RobustConnection | None:
         return conn
 
 
-async def main() -> None:
+async def main(queue_names: Collection[str] | None = None) -> None:
     """
     Main entry point for standalone message consumer execution.
 
     Initializes required services (database, Redis, Brevo, templates),
-    starts the message consumers, and runs until interrupted.
+    starts the message consumers, and runs until interrupted. On SIGINT or
+    SIGTERM the consumers are drained (no new deliveries, in-flight
+    messages finished) before the connection is closed.
+
+    Args:
+        queue_names: Only consume these queues (default: all).
     """
     # Track shutdown state
     shutdown_event = asyncio.Event()
     conn: aio_pika.RobustConnection | None = None
+    outbox_relay: OutboxRelay | None = None
+    metrics_reporter: MessagingMetricsReporter | None = None
+    runtime = ConsumerRuntime(settings.RABBITMQ_WORKER_CONCURRENCY)
 
     def handle_shutdown(signum, frame):
         rabbitmq_logger.info(f"Received signal {signum}, initiating shutdown...")
@@ -140,6 +239,7 @@ async def main() -> None:
         rabbitmq_logger.info("Initializing database...")
         await init_db()
         rabbitmq_logger.info("Database initialized successfully.")
+        pool_liveness_monitor.start(settings.DB_LIVENESS_CHECK_INTERVAL_SECONDS)
 
         rabbitmq_logger.info("Initializing Redis service...")
         await RedisService.init(settings.REDIS_URL)
@@ -157,16 +257,34 @@ async def main() -> None:
         Renderer.initialize("app/templates")
         rabbitmq_logger.info("Template renderer initialized successfully.")
 
+        # Handlers publish follow-up events (e.g. Stripe emails) through the
+        # registered publisher; this also starts the outbox relay
+        outbox_relay = register_event_publisher()
+
+        # The user_provisioning handler runs each product's post-signup hooks
+        register_post_signup_hooks()
+
         # Start consumers (don't keep_alive, we manage lifecycle here)
         rabbitmq_logger.info("Starting message consumers...")
-        conn = await start_consumers(keep_alive=False)
+        conn = await start_consumers(
+            keep_alive=False, runtime=runtime, queue_names=queue_names
+        )
         rabbitmq_logger.info(
             "Message consumers started successfully. Waiting for messages..."
         )
 
+        # Handler and outcome metrics of this worker reach the admin API
+        # through Redis
+        if settings.MESSAGING_METRICS_REPORT_SECONDS > 0:
+            metrics_reporter = MessagingMetricsReporter()
+            metrics_reporter.start(settings.MESSAGING_METRICS_REPORT_SECONDS)
+
         # Wait for shutdown signal
         await shutdown_event.wait()
 
+        rabbitmq_logger.info("Draining message consumers...")
+        await runtime.drain(settings.RABBITMQ_DRAIN_TIMEOUT_SECONDS)
+
     except Exception as e:
         rabbitmq_logger.exception(f"Messaging error: {e}")
         raise
@@ -174,6 +292,14 @@ async def main() -> None:
     finally:
         rabbitmq_logger.info("Shutting down message consumer...")
 
+        if outbox_relay:
+            await outbox_relay.stop()
+
+        if metrics_reporter:
+            await metrics_reporter.stop()
+
+        await close_publisher()
+
         if conn:
             await conn.close()
             rabbitmq_logger.info("RabbitMQ connection closed successfully.")
@@ -187,8 +313,110 @@ async def main() -> None:
         rabbitmq_logger.info("Message consumer shutdown complete.")
 
 
+def _run_worker(queue_names: list[str] | None) -> None:
+    asyncio.run(main(queue_names))
+
+
+def run_workers(workers: int, queue_names: list[str] | None = None) -> int:
+    """
+    Run the consumers in several worker processes and supervise them.
+
+    SIGINT/SIGTERM are forwarded to the workers, which drain and exit; a
+    worker still running ``RABBITMQ_DRAIN_TIMEOUT_SECONDS`` (plus a grace
+    period for shutting down services) after that is killed. If a worker
+    exits on its own, the others are stopped as well, so the process
+    manager sees the failure and restarts the whole group.
+
+    Args:
+        workers: Number of worker processes.
+        queue_names: Only consume these queues (default: all).
+
+    Returns:
+        Exit code: 0 if every worker exited cleanly, else 1.
+    """
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(
+            target=_run_worker, args=(queue_names,), name=f"consumer-worker-{i}"
+        )
+        for i in range(workers)
+    ]
+    stopping_since: float | None = None
+
+    def stop_workers(signum=None, frame=None):
+        nonlocal stopping_since
+        if stopping_since is not None:
+            return
+        rabbitmq_logger.info(f"Stopping {workers} consumer worker(s)...")
+        stopping_since = time.monotonic()
+        for process in processes:
+            if process.is_alive():
+                process.terminate()  # SIGTERM: drain and exit
+
+    signal.signal(signal.SIGINT, stop_workers)
+    signal.signal(signal.SIGTERM, stop_workers)
+
+    for process in processes:
+        process.start()
+    rabbitmq_logger.info(f"Started {workers} consumer worker process(es)")
+
+    deadline = settings.RABBITMQ_DRAIN_TIMEOUT_SECONDS + 15
+    while any(process.is_alive() for process in processes):
+        if stopping_since is None and any(
+            process.exitcode is not None for process in processes
+        ):
+            rabbitmq_logger.error("A consumer worker exited unexpectedly")
+            stop_workers()
+        if stopping_since is not None and time.monotonic() - stopping_since > deadline:
+            for process in processes:
+                if process.is_alive():
+                    rabbitmq_logger.warning(
+                        f"Killing {process.name} after drain timeout"
+                    )
+                    process.kill()
+        time.sleep(0.5)
+
+    for process in processes:
+        process.join()
+    return 0 if all(process.exitcode == 0 for process in processes) else 1
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run the RabbitMQ consumers.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=settings.RABBITMQ_CONSUMER_WORKERS,
+        help="Number of consumer processes (default: RABBITMQ_CONSUMER_WORKERS)",
+    )
+    parser.add_argument(
+        "--queues",
+        type=lambda value: [name.strip() for name in value.split(",") if name.strip()],
+        default=None,
+        help="Comma-separated queue names to consume (default: all)",
+    )
+    args = parser.parse_args(argv)
+    if settings.MESSAGING_BROKER == "local":
+        parser.error(
+            "MESSAGING_BROKER=local is in-process only; run the consumers in the "
+            "API process (ENABLE_MESSAGING=true) instead of a standalone worker"
+        )
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.queues is not None:
+        try:
+            select_queue_configs(args.queues)
+        except ValueError as e:
+            parser.error(str(e))
+    return args
+
+
 # This code initializes message consumers for RabbitMQ queues defined in get_queue_configs().
 # It establishes a connection, declares the necessary queues, and sets up consumers
 # to process messages from those queues.
 if __name__ == "__main__":
-    asyncio.run(main())
+    args = parse_args()
+    if args.workers == 1:
+        asyncio.run(main(args.queues))
+    else:
+        raise SystemExit(run_workers(args.workers, args.queues))
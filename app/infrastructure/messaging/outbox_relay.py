@@ -0,0 +1,219 @@
+"""
+Outbox relay: publishes events written to the transactional outbox.
+
+Each iteration claims up to ``OUTBOX_RELAY_BATCH_SIZE`` pending events
+(``FOR UPDATE SKIP LOCKED``, so relays in several processes share the
+work without publishing a row twice), publishes them with one confirm
+wait and marks them published in the same transaction. A full batch is
+followed immediately by the next one; an idle relay polls every
+``OUTBOX_RELAY_POLL_INTERVAL_MS``.
+
+If publishing a batch fails, its events are published one at a time so
+an event that can never be published does not hold up the others. Each
+event that still fails stays pending with the attempt recorded and is not
+claimed again for ``2 ** attempts`` seconds (capped at
+``OUTBOX_EVENT_MAX_BACKOFF_SECONDS``); after ``OUTBOX_RELAY_MAX_ATTEMPTS``
+failed attempts it is skipped for good and left in the table for
+inspection. When nothing in a batch could be published (typically the
+broker is down) the relay itself backs off exponentially (capped at
+``OUTBOX_RELAY_MAX_BACKOFF_SECONDS``) until the broker is back.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Iterable, Sequence
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import rabbitmq_logger, settings
+from app.core.db import AsyncSessionLocal
+from app.core.db.crud.outbox_event import outbox_event_db
+from app.core.db.models import OutboxEvent
+from app.core.services.event_publisher import register_publisher
+from app.core.services.outbox import OutboxPublisher
+from app.infrastructure.messaging.publisher import publish_event, publish_many
+
+BatchPublish = Callable[[Iterable[tuple]], Awaitable[int]]
+
+
+class OutboxRelay:
+    """Background task moving outbox events to the broker."""
+
+    def __init__(
+        self,
+        publish: BatchPublish = publish_many,
+        session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal,
+        batch_size: int | None = None,
+        poll_interval: float | None = None,
+        max_backoff: float | None = None,
+        max_attempts: int | None = None,
+        event_max_backoff: float | None = None,
+    ):
+        self.publish = publish
+        self.session_factory = session_factory
+        self.batch_size = batch_size or settings.OUTBOX_RELAY_BATCH_SIZE
+        self.poll_interval = (
+            poll_interval
+            if poll_interval is not None
+            else settings.OUTBOX_RELAY_POLL_INTERVAL_MS / 1000
+        )
+        self.max_backoff = (
+            max_backoff
+            if max_backoff is not None
+            else settings.OUTBOX_RELAY_MAX_BACKOFF_SECONDS
+        )
+        self.max_attempts = max_attempts or settings.OUTBOX_RELAY_MAX_ATTEMPTS
+        self.event_max_backoff = (
+            event_max_backoff
+            if event_max_backoff is not None
+            else settings.OUTBOX_EVENT_MAX_BACKOFF_SECONDS
+        )
+        self._task: asyncio.Task | None = None
+        self._failures = 0
+
+    async def relay_once(self) -> int:
+        """
+        Publish one batch of pending events.
+
+        Returns:
+            The number of events published.
+
+        Raises:
+            Exception: What the publisher raised when no event of the batch
+                could be published; the failed attempts are recorded.
+        """
+        async with self.session_factory.begin() as session:
+            events = await outbox_event_db.claim_batch(
+                session, self.batch_size, max_attempts=self.max_attempts
+            )
+            if not events:
+                return 0
+            error: Exception | None = None
+            published: list[OutboxEvent] = []
+            failed: list[tuple[OutboxEvent, Exception]] = []
+            try:
+                await self.publish([self._outgoing(event) for event in events])
+                published = list(events)
+            except Exception as e:
+                # Recorded (and committed) before re-raising below
+                error = e
+                if len(events) > 1:
+                    # Isolate events that cannot be published
+                    published, failed = await self._publish_each(events)
+
+            if published:
+                await outbox_event_db.mark_published(
+                    session, [event.id for event in published], commit_self=False
+                )
+                for event, failure in failed:
+                    await self._record_failure(session, [event], failure)
+            else:
+                # Nothing got through (typically the broker is down)
+                await self._record_failure(session, list(events), error)
+        if error is not None and not published:
+            raise error
+        return len(published)
+
+    @staticmethod
+    def _outgoing(event: OutboxEvent) -> tuple[str, Any, dict[str, Any]]:
+        return (
+            event.queue_name,
+            event.payload,
+            {**(event.headers or {}), "x-outbox-id": str(event.id)},
+        )
+
+    async def _record_failure(
+        self,
+        session: AsyncSession,
+        events: list[OutboxEvent],
+        error: Exception | None,
+    ) -> None:
+        await outbox_event_db.record_failure(
+            session,
+            [event.id for event in events],
+            str(error),
+            max_backoff_seconds=self.event_max_backoff,
+            commit_self=False,
+        )
+        for event in events:
+            if event.attempts + 1 >= self.max_attempts:
+                rabbitmq_logger.error(
+                    f"Outbox event {event.id} to {event.queue_name} failed "
+                    f"{event.attempts + 1} times, giving up: {error}"
+                )
+
+    async def _publish_each(
+        self, events: Sequence[OutboxEvent]
+    ) -> tuple[list[OutboxEvent], list[tuple[OutboxEvent, Exception]]]:
+        """Publish events one at a time, splitting them by outcome."""
+        published: list[OutboxEvent] = []
+        failed: list[tuple[OutboxEvent, Exception]] = []
+        for event in events:
+            try:
+                await self.publish([self._outgoing(event)])
+            except Exception as e:
+                failed.append((event, e))
+            else:
+                published.append(event)
+        return published, failed
+
+    def _next_delay(self) -> float:
+        return min(self.poll_interval * 2**self._failures, self.max_backoff)
+
+    async def run(self) -> None:
+        """Relay events until cancelled."""
+        rabbitmq_logger.info("Outbox relay started")
+        while True:
+            try:
+                published = await self.relay_once()
+                self._failures = 0
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._failures += 1
+                delay = self._next_delay()
+                rabbitmq_logger.warning(
+                    f"Outbox relay failed ({self._failures} in a row), "
+                    f"retrying in {delay:.1f}s: {e}"
+                )
+                await asyncio.sleep(delay)
+                continue
+            if published < self.batch_size:
+                await asyncio.sleep(self.poll_interval)
+
+    def start(self) -> None:
+        """Start relaying in a background task."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run(), name="outbox-relay")
+
+    async def stop(self) -> None:
+        """Stop the background task (a batch in progress is rolled back)."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        rabbitmq_logger.info("Outbox relay stopped")
+
+
+def register_event_publisher() -> OutboxRelay | None:
+    """
+    Register the publisher used by core/app code and start its relay.
+
+    With ``EVENT_OUTBOX_ENABLED`` events go through the outbox and a
+    started relay is returned (stop it on shutdown); otherwise they are
+    published to RabbitMQ directly and None is returned.
+    """
+    if not settings.EVENT_OUTBOX_ENABLED:
+        register_publisher(publish_event, publish_many)
+        return None
+    outbox = OutboxPublisher()
+    register_publisher(outbox, outbox.publish_many)
+    relay = OutboxRelay()
+    relay.start()
+    return relay
+
+
+__all__ = ["OutboxRelay", "register_event_publisher"]
@@ -1,36 +1,249 @@
-import json
-from typing import Any
+"""
+RabbitMQ event publisher.
+
+Publishing goes through a process-wide ``ChannelPoolPublisher``:
+
+- Channels are long-lived and pooled (at most ``RABBITMQ_PUBLISHER_CHANNELS``
+  per process). Callers beyond that wait for a free channel instead of
+  opening new ones, so bursts cannot leak channels.
+- Every queue is declared once per process (per connection) rather than
+  on every publish.
+- Channels use publisher confirms. ``publish_many`` sends a whole batch
+  before waiting, so a fan-out costs one confirm round trip per
+  ``RABBITMQ_PUBLISH_BATCH_SIZE`` messages instead of one per message.
+- Bodies are encoded with the codec named by ``RABBITMQ_MESSAGE_CONTENT_TYPE``
+  (see ``codec``), whose content type is set on every message.
+- Every message is stamped with an ``x-published-at`` header (epoch
+  milliseconds), from which consumers measure time in queue. A timestamp
+  already present in the caller's headers is kept.
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Iterable
 
 import aio_pika
+from aio_pika.abc import AbstractChannel, AbstractConnection
+from pydantic import BaseModel
 
+from app.core.config import rabbitmq_logger, settings
+from app.infrastructure.messaging.codec import MessageCodec, get_codec
 from app.infrastructure.messaging.connection import get_connection
 
+# A dict payload or a Pydantic model (serialised in JSON mode)
+EventPayload = dict[str, Any] | BaseModel
+# (queue_name, event, headers) - headers may be omitted
+OutgoingEvent = tuple[str, EventPayload] | tuple[str, EventPayload, dict[str, Any]]
+
+# Header carrying the publish time in epoch milliseconds
+PUBLISHED_AT_HEADER = "x-published-at"
+
+
+def _build_message(
+    event: EventPayload, headers: dict[str, Any], codec: MessageCodec
+) -> aio_pika.Message:
+    return aio_pika.Message(
+        body=codec.encode(event),
+        headers={PUBLISHED_AT_HEADER: int(time.time() * 1000), **headers},
+        content_type=codec.content_type,
+        delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
+    )
+
+
+class ChannelPoolPublisher:
+    """
+    Publishes persistent messages over a bounded pool of confirm channels.
+
+    The pool follows the connection returned by ``get_connection``: if a
+    new connection is established (the previous one was closed), pooled
+    channels and the declared-queue cache are dropped and rebuilt on it.
+    """
+
+    def __init__(
+        self,
+        max_channels: int,
+        confirm_timeout: float,
+        batch_size: int,
+        codec: MessageCodec | None = None,
+    ):
+        self.max_channels = max_channels
+        self.confirm_timeout = confirm_timeout
+        self.batch_size = batch_size
+        self.codec = codec or get_codec(None)
+        self._slots = asyncio.Semaphore(max_channels)
+        self._idle: list[AbstractChannel] = []
+        self._connection: AbstractConnection | None = None
+        self._declared: set[str] = set()
+
+    @property
+    def open_channels(self) -> int:
+        """Number of idle pooled channels."""
+        return len(self._idle)
+
+    async def _bind_connection(self) -> AbstractConnection:
+        connection = await get_connection()
+        if connection is not self._connection:
+            self._connection = connection
+            self._idle.clear()
+            self._declared.clear()
+        return connection
+
+    @asynccontextmanager
+    async def channel(self) -> AsyncIterator[AbstractChannel]:
+        """
+        Borrow a confirm channel from the pool.
+
+        A channel that raised while borrowed is closed instead of being
+        returned, since it may have been closed by the broker.
+        """
+        async with self._slots:
+            connection = await self._bind_connection()
+            channel = None
+            while self._idle:
+                candidate = self._idle.pop()
+                if not candidate.is_closed:
+                    channel = candidate
+                    break
+            if channel is None:
+                channel = await connection.channel(publisher_confirms=True)
+
+            try:
+                yield channel
+            except BaseException:
+                await self._discard(channel)
+                raise
+            if connection is self._connection:
+                self._idle.append(channel)
+
+    async def _discard(self, channel: AbstractChannel) -> None:
+        try:
+            await channel.close()
+        except Exception as e:
+            rabbitmq_logger.debug(f"Error closing publisher channel: {e}")
+
+    async def _ensure_queue(self, channel: AbstractChannel, queue_name: str) -> None:
+        if queue_name not in self._declared:
+            await channel.declare_queue(queue_name, durable=True)
+            self._declared.add(queue_name)
+
+    async def publish(
+        self,
+        queue_name: str,
+        event: EventPayload,
+        headers: dict[str, Any] | None = None,
+    ) -> None:
+        """
+        Publish one event and wait for the broker's confirm.
+
+        Args:
+            queue_name: Destination queue (declared durable on first use).
+            event: Event payload (a dict or a Pydantic model).
+            headers: Optional message headers.
+        """
+        message = _build_message(event, headers or {}, self.codec)
+        async with self.channel() as channel:
+            await self._ensure_queue(channel, queue_name)
+            await channel.default_exchange.publish(
+                message, routing_key=queue_name, timeout=self.confirm_timeout
+            )
+
+    async def publish_many(self, events: Iterable[OutgoingEvent]) -> int:
+        """
+        Publish several events on one channel, waiting for confirms per batch.
+
+        Messages in a batch are sent back to back and their confirms awaited
+        together. Ordering is preserved per channel, so events for the same
+        queue arrive in the order given.
+
+        Args:
+            events: ``(queue_name, event)`` or ``(queue_name, event, headers)``
+                tuples.
+
+        Returns:
+            Number of messages published.
+
+        Raises:
+            Exception: The first publish/confirm failure of a batch; earlier
+                batches have already been confirmed.
+        """
+        outgoing = [
+            (
+                item[0],
+                _build_message(item[1], item[2] if len(item) > 2 else {}, self.codec),  # type: ignore[misc]
+            )
+            for item in events
+        ]
+        if not outgoing:
+            return 0
+
+        async with self.channel() as channel:
+            for queue_name in dict.fromkeys(queue for queue, _ in outgoing):
+                await self._ensure_queue(channel, queue_name)
+            exchange = channel.default_exchange
+            for start in range(0, len(outgoing), self.batch_size):
+                batch = outgoing[start : start + self.batch_size]
+                await asyncio.gather(
+                    *(
+                        exchange.publish(
+                            message,
+                            routing_key=queue_name,
+                            timeout=self.confirm_timeout,
+                        )
+                        for queue_name, message in batch
+                    )
+                )
+        return len(outgoing)
+
+    async def close(self) -> None:
+        """Close all pooled channels and forget declared queues."""
+        idle, self._idle = self._idle, []
+        for channel in idle:
+            await self._discard(channel)
+        self._declared.clear()
+        self._connection = None
+
+
+publisher = ChannelPoolPublisher(
+    max_channels=settings.RABBITMQ_PUBLISHER_CHANNELS,
+    confirm_timeout=settings.RABBITMQ_PUBLISH_CONFIRM_TIMEOUT,
+    batch_size=settings.RABBITMQ_PUBLISH_BATCH_SIZE,
+    codec=get_codec(settings.RABBITMQ_MESSAGE_CONTENT_TYPE),
+)
+
 
 async def publish_event(
-    queue_name: str, event: dict[str, Any], headers: dict[str, Any] = {}
+    queue_name: str, event: EventPayload, headers: dict[str, Any] = {}
 ) -> None:
     """
     Publishes an event message to the specified queue asynchronously.
     Args:
         queue_name (str): The name of the queue to publish the event to.
-        event (dict[str, Any]): The event data to be published as a dictionary.
+        event (dict[str, Any] | BaseModel): The event data to be published, as a dictionary or a Pydantic model.
         headers (dict[str, Any], optional): Additional headers to include in the message. Defaults to an empty dictionary.
     Returns:
         None
     Raises:
         Any exceptions raised by the underlying connection or publishing mechanisms.
     Note:
-        The event is serialized to JSON and sent as a persistent message with content type 'application/json'.
+        The event is serialized with the configured codec (JSON by default, see RABBITMQ_MESSAGE_CONTENT_TYPE)
+        and sent as a persistent message with the codec's content type on a pooled channel, and the broker's
+        publisher confirm is awaited.
     """
-    connection = await get_connection()
-    channel = await connection.channel()
-    await channel.declare_queue(queue_name, durable=True)
-
-    message = aio_pika.Message(
-        body=json.dumps(event).encode(),
-        headers=headers,
-        content_type="application/json",
-        delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
-    )
+    await publisher.publish(queue_name, event, headers)
+
+
+async def publish_many(events: Iterable[OutgoingEvent]) -> int:
+    """
+    Publishes several events with batched publisher confirms.
+    Args:
+        events: ``(queue_name, event)`` or ``(queue_name, event, headers)`` tuples.
+    Returns:
+        int: Number of messages published.
+    """
+    return await publisher.publish_many(events)
+
 
-    await channel.default_exchange.publish(message, routing_key=queue_name)
+async def close_publisher() -> None:
+    """Close the pooled publisher channels (called on shutdown)."""
+    await publisher.close()
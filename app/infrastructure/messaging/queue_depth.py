@@ -0,0 +1,93 @@
+"""
+Queue depth polling.
+
+``QueueDepthPoller`` periodically declares every configured queue (main,
+retry and dead-letter) passively and records the broker's ready-message
+and consumer counts in ``messaging_metrics``, where the admin metrics API
+reports them. A passive declare never creates a queue; on RabbitMQ a
+missing queue closes the channel, so the poller reopens it and records
+the error against that queue.
+"""
+
+import asyncio
+
+from aio_pika.abc import AbstractChannel
+
+from app.core.config import rabbitmq_logger
+from app.core.services.messaging_metrics import MessagingMetrics, messaging_metrics
+from app.infrastructure.messaging.connection import get_connection
+from app.infrastructure.messaging.queues import get_queue_configs
+
+
+def configured_queue_names() -> list[str]:
+    """Every queue declared by ``start_consumers``, main queues first."""
+    names: list[str] = []
+    for q in get_queue_configs():
+        names.append(q.name)
+        if q.retry_queue:
+            names.append(q.retry_queue)
+        for retry in q.retry_queues or []:
+            names.extend(tier_queue.name for tier_queue in retry.queues())
+        if q.dead_letter_queue:
+            names.append(q.dead_letter_queue)
+    return list(dict.fromkeys(names))
+
+
+class QueueDepthPoller:
+    """Records queue depths from passive declares on an interval."""
+
+    def __init__(
+        self,
+        queue_names: list[str] | None = None,
+        metrics: MessagingMetrics = messaging_metrics,
+    ):
+        self.queue_names = queue_names or configured_queue_names()
+        self.metrics = metrics
+        self._task: asyncio.Task | None = None
+
+    async def poll_once(self) -> None:
+        """Poll every queue once over a short-lived channel."""
+        connection = await get_connection()
+        channel: AbstractChannel | None = None
+        try:
+            for name in self.queue_names:
+                if channel is None or channel.is_closed:
+                    channel = await connection.channel()
+                try:
+                    queue = await channel.declare_queue(name, passive=True)
+                except Exception as e:
+                    self.metrics.set_queue_depth_error(name, str(e) or type(e).__name__)
+                    continue
+                result = queue.declaration_result
+                self.metrics.set_queue_depth(
+                    name, result.message_count or 0, result.consumer_count or 0
+                )
+        finally:
+            if channel is not None and not channel.is_closed:
+                await channel.close()
+
+    async def _run(self, interval: float) -> None:
+        while True:
+            try:
+                await self.poll_once()
+            except Exception as e:
+                rabbitmq_logger.warning(f"Queue depth poll failed: {e}")
+            await asyncio.sleep(interval)
+
+    def start(self, interval: float) -> None:
+        """Start polling in the background."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(interval))
+
+    async def stop(self) -> None:
+        """Stop polling."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+__all__ = ["QueueDepthPoller", "configured_queue_names"]
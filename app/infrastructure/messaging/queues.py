@@ -1,3 +1,4 @@
+from enum import IntEnum
 from functools import lru_cache
 from typing import Annotated, Any, Callable
 
@@ -17,21 +18,147 @@ from app.infrastructure.messaging.handlers.stripe import (
     handle_stripe_subscription_deleted,
     handle_stripe_payment_failed,
 )
-from app.infrastructure.messaging.handlers.usage_handler import handle_usage_commit
+from app.apps.cubex_api.schemas.workspace import UsageCommitRequest
+from app.apps.cubex_career.schemas.internal import (
+    UsageCommitRequest as CareerUsageCommitRequest,
+)
+from app.core.config import settings
+from app.infrastructure.messaging.handlers.usage_handler import (
+    handle_usage_commit,
+    handle_usage_commit_batch,
+)
 from app.infrastructure.messaging.handlers.career_usage_handler import (
     handle_career_usage_commit,
+    handle_career_usage_commit_batch,
+)
+from app.infrastructure.messaging.handlers.otp_audit_handler import handle_otp_audit
+from app.infrastructure.messaging.handlers.provisioning_handler import (
+    handle_user_provisioning,
 )
+from app.infrastructure.messaging.handlers.session_audit_handler import (
+    handle_refresh_session_audit,
+)
+
+
+class ConsumerPriority(IntEnum):
+    """
+    Priority classes for consumer handler slots (lower value wins).
+
+    When a worker's shared handler slots are contended, billing handlers
+    run before usage commits, usage commits before emails, and emails
+    before audit records.
+    """
+
+    BILLING = 0
+    USAGE = 1
+    EMAIL = 2
+    AUDIT = 3
+
+
+class ConsumerLimits(BaseModel):
+    prefetch_count: Annotated[
+        int, Field(gt=0, description="Unacked deliveries per queue channel")
+    ]
+    concurrency: Annotated[
+        int, Field(gt=0, description="Handlers of the queue running at once")
+    ]
+
+
+# Defaults per priority class; QueueConfig can override either value
+PRIORITY_LIMITS: dict[ConsumerPriority, ConsumerLimits] = {
+    ConsumerPriority.BILLING: ConsumerLimits(prefetch_count=20, concurrency=10),
+    ConsumerPriority.USAGE: ConsumerLimits(prefetch_count=50, concurrency=20),
+    ConsumerPriority.EMAIL: ConsumerLimits(prefetch_count=10, concurrency=5),
+    ConsumerPriority.AUDIT: ConsumerLimits(prefetch_count=50, concurrency=10),
+}
 
 
 class RetryQueue(BaseModel):
     name: Annotated[str, Field(description="Name of the retry queue")]
     ttl: Annotated[int, Field(gt=0, description="Time to live in milliseconds")]
+    spread: Annotated[
+        list["RetryQueue"],
+        Field(
+            description=(
+                "Extra queues with shorter TTLs; each retry of this tier goes "
+                "to one of the tier's queues at random"
+            )
+        ),
+    ] = []
+
+    def queues(self) -> list["RetryQueue"]:
+        """Every queue a retry of this tier may be published to."""
+        return [self, *self.spread]
+
+
+def _duration_label(delay_ms: int) -> str:
+    """Short queue-name suffix for a delay: 5s, 2m, 1h, 1500ms."""
+    for unit, size in (("h", 3_600_000), ("m", 60_000), ("s", 1_000)):
+        if delay_ms % size == 0:
+            return f"{delay_ms // size}{unit}"
+    return f"{delay_ms}ms"
+
+
+class BackoffPolicy(BaseModel):
+    delays_ms: Annotated[
+        list[Annotated[int, Field(gt=0)]],
+        Field(min_length=1, description="Delay of each retry tier, in order (ms)"),
+    ]
+    jitter: Annotated[
+        float,
+        Field(
+            ge=0,
+            lt=1,
+            description="Fraction by which each retry's delay is randomly shortened",
+        ),
+    ] = 0.0
+    jitter_queues: Annotated[
+        int,
+        Field(
+            ge=2,
+            description="Queues per tier that jittered retries are spread across",
+        ),
+    ] = 4
+
+    def tiers(self, queue_name: str) -> list[RetryQueue]:
+        """
+        Retry queues for a main queue, e.g. ``usage_commits_retry_30s``.
+
+        RabbitMQ only expires messages at the head of a queue, so a tier's
+        delay cannot be varied per message. With jitter, each tier instead
+        gets ``jitter_queues - 1`` extra queues (``..._retry_30s_1``, ...)
+        whose TTLs step down evenly to ``delay * (1 - jitter)``; retries pick
+        one at random, so messages that failed together are released at
+        different times.
+        """
+        tiers = []
+        for delay in self.delays_ms:
+            name = f"{queue_name}_retry_{_duration_label(delay)}"
+            spread = []
+            if self.jitter:
+                steps = self.jitter_queues - 1
+                spread = [
+                    RetryQueue(
+                        name=f"{name}_{step}",
+                        ttl=max(1, round(delay * (1 - self.jitter * step / steps))),
+                    )
+                    for step in range(1, self.jitter_queues)
+                ]
+            tiers.append(RetryQueue(name=name, ttl=delay, spread=spread))
+        return tiers
+
+
+DEFAULT_RETRY_POLICY = BackoffPolicy(
+    delays_ms=settings.RABBITMQ_RETRY_DELAYS_MS,
+    jitter=settings.RABBITMQ_RETRY_JITTER,
+    jitter_queues=settings.RABBITMQ_RETRY_JITTER_QUEUES,
+)
 
 
 class QueueConfig(BaseModel):
     name: Annotated[str, Field(description="Name of the main queue")]
     handler: Annotated[
-        Callable[[dict[str, Any]], Any],
+        Callable[[Any], Any],
         Field(description="Function to handle messages from the queue"),
     ]
     retry_queue: Annotated[
@@ -58,6 +185,83 @@ class QueueConfig(BaseModel):
     dead_letter_queue: Annotated[
         str | None, Field(description="Name of the dead letter queue")
     ] = None
+    batch_handler: Annotated[
+        Callable[[list[Any]], Any] | None,
+        Field(
+            description=(
+                "Function to handle a batch of messages in one transaction; "
+                "'handler' is still used to re-process a failed batch one "
+                "message at a time"
+            )
+        ),
+    ] = None
+    batch_size: Annotated[
+        int, Field(gt=0, description="Maximum messages per batch")
+    ] = 100
+    batch_max_wait_ms: Annotated[
+        int,
+        Field(
+            gt=0,
+            description="Milliseconds to wait for a batch to fill before flushing",
+        ),
+    ] = 200
+    payload_model: Annotated[
+        type[BaseModel] | None,
+        Field(
+            description=(
+                "Model the payload is validated into (from the raw body) "
+                "before it reaches the handler; None passes the decoded dict"
+            )
+        ),
+    ] = None
+    retry_policy: Annotated[
+        BackoffPolicy | None,
+        Field(
+            description=(
+                "Backoff policy; generates 'retry_queues' tiers named "
+                "<name>_retry_<delay> (exclusive with retry_queue(s))"
+            )
+        ),
+    ] = None
+    priority: Annotated[
+        ConsumerPriority,
+        Field(description="Priority class for the worker's shared handler slots"),
+    ] = ConsumerPriority.EMAIL
+    prefetch_count: Annotated[
+        int | None,
+        Field(
+            gt=0,
+            description=(
+                "Prefetch of the queue's channel (default: twice the batch "
+                "size for batched queues, else the priority class default)"
+            ),
+        ),
+    ] = None
+    concurrency: Annotated[
+        int | None,
+        Field(
+            gt=0,
+            description=(
+                "Maximum handlers running at once (default: the priority "
+                "class default)"
+            ),
+        ),
+    ] = None
+
+    @property
+    def effective_prefetch_count(self) -> int:
+        if self.prefetch_count is not None:
+            return self.prefetch_count
+        if self.batch_handler:
+            # A full batch plus the next one filling up
+            return self.batch_size * 2
+        return PRIORITY_LIMITS[self.priority].prefetch_count
+
+    @property
+    def effective_concurrency(self) -> int:
+        if self.concurrency is not None:
+            return self.concurrency
+        return PRIORITY_LIMITS[self.priority].concurrency
 
     @model_validator(mode="before")
     @classmethod
@@ -70,6 +274,11 @@ class QueueConfig(BaseModel):
             raise ValueError(
                 "Specify either 'retry_queue' or 'retry_queues', not both."
             )
+        if values.get("retry_policy") and (retry_queue or retry_queues):
+            raise ValueError(
+                "'retry_policy' generates the retry queues; do not also set "
+                "'retry_queue' or 'retry_queues'."
+            )
         if retry_queue and not retry_ttl:
             raise ValueError("'retry_ttl' must be set when using 'retry_queue'.")
         if retry_queues is not None:
@@ -77,115 +286,142 @@ class QueueConfig(BaseModel):
                 raise ValueError("'retry_queues' must contain at least one entry.")
         return values
 
+    @model_validator(mode="after")
+    def build_retry_tiers(self) -> "QueueConfig":
+        if self.retry_policy is not None:
+            self.retry_queues = self.retry_policy.tiers(self.name)
+        return self
+
 
 QUEUE_CONFIG = [
     # OTP Email Queue - sends OTP codes for verification and password reset
     {
         "name": "otp_emails",
+        "priority": ConsumerPriority.EMAIL,
         "handler": handle_otp_email,
-        "retry_queue": "otp_emails_retry",
-        "retry_ttl": 30 * 1000,  # 30 seconds
-        "max_retries": 3,
+        "retry_policy": DEFAULT_RETRY_POLICY,
         "dead_letter_queue": "otp_emails_dead",
     },
     # Password Reset Confirmation Email Queue
     {
         "name": "password_reset_confirmation_emails",
+        "priority": ConsumerPriority.EMAIL,
         "handler": handle_password_reset_confirmation_email,
-        "retry_queue": "password_reset_confirmation_emails_retry",
-        "retry_ttl": 30 * 1000,  # 30 seconds
-        "max_retries": 3,
+        "retry_policy": DEFAULT_RETRY_POLICY,
         "dead_letter_queue": "password_reset_confirmation_emails_dead",
     },
     # Subscription Activated Email Queue
     {
         "name": "subscription_activated_emails",
+        "priority": ConsumerPriority.EMAIL,
         "handler": handle_subscription_activated_email,
-        "retry_queue": "subscription_activated_emails_retry",
-        "retry_ttl": 30 * 1000,  # 30 seconds
-        "max_retries": 3,
+        "retry_policy": DEFAULT_RETRY_POLICY,
         "dead_letter_queue": "subscription_activated_emails_dead",
     },
     # Subscription Canceled Email Queue
     {
         "name": "subscription_canceled_emails",
+        "priority": ConsumerPriority.EMAIL,
         "handler": handle_subscription_canceled_email,
-        "retry_queue": "subscription_canceled_emails_retry",
-        "retry_ttl": 30 * 1000,  # 30 seconds
-        "max_retries": 3,
+        "retry_policy": DEFAULT_RETRY_POLICY,
         "dead_letter_queue": "subscription_canceled_emails_dead",
     },
     # Payment Failed Email Queue
     {
         "name": "payment_failed_emails",
+        "priority": ConsumerPriority.EMAIL,
         "handler": handle_payment_failed_email,
-        "retry_queue": "payment_failed_emails_retry",
-        "retry_ttl": 30 * 1000,  # 30 seconds
-        "max_retries": 3,
+        "retry_policy": DEFAULT_RETRY_POLICY,
         "dead_letter_queue": "payment_failed_emails_dead",
     },
     # Workspace Invitation Email Queue
     {
         "name": "workspace_invitation_emails",
+        "priority": ConsumerPriority.EMAIL,
         "handler": handle_workspace_invitation_email,
-        "retry_queue": "workspace_invitation_emails_retry",
-        "retry_ttl": 30 * 1000,  # 30 seconds
-        "max_retries": 3,
+        "retry_policy": DEFAULT_RETRY_POLICY,
         "dead_letter_queue": "workspace_invitation_emails_dead",
     },
     # Stripe Checkout Completed - activates subscription after payment
     {
         "name": "stripe_checkout_completed",
+        "priority": ConsumerPriority.BILLING,
         "handler": handle_stripe_checkout_completed,
-        "retry_queue": "stripe_checkout_completed_retry",
-        "retry_ttl": 60 * 1000,  # 1 minute
-        "max_retries": 5,
+        "retry_policy": DEFAULT_RETRY_POLICY,
         "dead_letter_queue": "stripe_checkout_completed_dead",
     },
     # Stripe Subscription Updated - syncs subscription status
     {
         "name": "stripe_subscription_updated",
+        "priority": ConsumerPriority.BILLING,
         "handler": handle_stripe_subscription_updated,
-        "retry_queue": "stripe_subscription_updated_retry",
-        "retry_ttl": 60 * 1000,  # 1 minute
-        "max_retries": 5,
+        "retry_policy": DEFAULT_RETRY_POLICY,
         "dead_letter_queue": "stripe_subscription_updated_dead",
     },
     # Stripe Subscription Deleted - freezes workspace
     {
         "name": "stripe_subscription_deleted",
+        "priority": ConsumerPriority.BILLING,
         "handler": handle_stripe_subscription_deleted,
-        "retry_queue": "stripe_subscription_deleted_retry",
-        "retry_ttl": 60 * 1000,  # 1 minute
-        "max_retries": 5,
+        "retry_policy": DEFAULT_RETRY_POLICY,
         "dead_letter_queue": "stripe_subscription_deleted_dead",
     },
     # Stripe Payment Failed - logs failure (subscription update comes separately)
     {
         "name": "stripe_payment_failed",
+        "priority": ConsumerPriority.BILLING,
         "handler": handle_stripe_payment_failed,
-        "retry_queue": "stripe_payment_failed_retry",
-        "retry_ttl": 60 * 1000,  # 1 minute
-        "max_retries": 3,
+        "retry_policy": DEFAULT_RETRY_POLICY,
         "dead_letter_queue": "stripe_payment_failed_dead",
     },
     # Usage Commit Queue - processes usage commits from external servers
     {
         "name": "usage_commits",
+        "priority": ConsumerPriority.USAGE,
         "handler": handle_usage_commit,
-        "retry_queue": "usage_commits_retry",
-        "retry_ttl": 30 * 1000,  # 30 seconds
-        "max_retries": 3,
+        "payload_model": UsageCommitRequest,
+        "retry_policy": DEFAULT_RETRY_POLICY,
         "dead_letter_queue": "usage_commits_dead",
+        "batch_handler": handle_usage_commit_batch,
+        "batch_size": settings.USAGE_COMMIT_BATCH_SIZE,
+        "batch_max_wait_ms": settings.USAGE_COMMIT_BATCH_MAX_WAIT_MS,
     },
     # Career Usage Commit Queue - processes career usage commits from AI tool servers
     {
         "name": "career_usage_commits",
+        "priority": ConsumerPriority.USAGE,
         "handler": handle_career_usage_commit,
-        "retry_queue": "career_usage_commits_retry",
-        "retry_ttl": 30 * 1000,  # 30 seconds
-        "max_retries": 3,
+        "payload_model": CareerUsageCommitRequest,
+        "retry_policy": DEFAULT_RETRY_POLICY,
         "dead_letter_queue": "career_usage_commits_dead",
+        "batch_handler": handle_career_usage_commit_batch,
+        "batch_size": settings.USAGE_COMMIT_BATCH_SIZE,
+        "batch_max_wait_ms": settings.USAGE_COMMIT_BATCH_MAX_WAIT_MS,
+    },
+    # Refresh Session Audit - records Redis session changes in refresh_tokens
+    {
+        "name": "refresh_session_audit",
+        "priority": ConsumerPriority.AUDIT,
+        "handler": handle_refresh_session_audit,
+        "retry_policy": DEFAULT_RETRY_POLICY,
+        "dead_letter_queue": "refresh_session_audit_dead",
+    },
+    # OTP Audit - records Redis OTP issuance and use in otp_tokens
+    {
+        "name": "otp_audit",
+        "priority": ConsumerPriority.AUDIT,
+        "handler": handle_otp_audit,
+        "retry_policy": DEFAULT_RETRY_POLICY,
+        "dead_letter_queue": "otp_audit_dead",
+    },
+    # User Provisioning - creates a new user's workspace and subscriptions.
+    # New users wait on it, so it runs alongside emails rather than audits.
+    {
+        "name": "user_provisioning",
+        "priority": ConsumerPriority.EMAIL,
+        "handler": handle_user_provisioning,
+        "retry_policy": DEFAULT_RETRY_POLICY,
+        "dead_letter_queue": "user_provisioning_dead",
     },
 ]
 
@@ -0,0 +1,195 @@
+"""
+Consumer runtime: concurrency limits, priorities and graceful drain.
+
+aio-pika runs every delivery in its own task, so without limits a queue
+runs as many handlers at once as its channel prefetches. The runtime
+wraps each queue's consumer callback so that:
+
+- each queue has its own channel and prefetch window, so a backlog on
+  one queue cannot use up the deliveries of the others;
+- each queue runs at most ``concurrency`` handlers at a time;
+- all queues of the process share ``RABBITMQ_WORKER_CONCURRENCY`` handler
+  slots, handed to the highest-priority class first (billing > usage >
+  email > audit) when they are contended.
+
+``drain`` cancels the consumers (the broker stops delivering), waits for
+the handlers already running or queued locally to finish and flushes
+partially filled batches, so a SIGTERM does not abandon in-flight work.
+"""
+
+import asyncio
+import heapq
+import itertools
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+from aio_pika.abc import AbstractIncomingMessage, AbstractQueue
+
+from app.core.config import rabbitmq_logger
+from app.infrastructure.messaging.batch_consumer import MessageBatcher
+
+ConsumerCallback = Callable[[AbstractIncomingMessage], Awaitable[Any]]
+
+
+class PriorityLimiter:
+    """
+    A semaphore whose waiters are woken in priority order.
+
+    Lower ``priority`` values are served first; waiters of equal priority
+    are served in arrival order.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.in_use = 0
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._sequence = itertools.count()
+
+    @property
+    def waiting(self) -> int:
+        """Number of tasks waiting for a slot."""
+        return sum(1 for *_, future in self._waiters if not future.done())
+
+    async def acquire(self, priority: int) -> None:
+        """Wait for a slot."""
+        if self.in_use < self.capacity and not self.waiting:
+            self.in_use += 1
+            return
+
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            # Granted just before the cancellation landed: hand it on
+            if future.done() and not future.cancelled():
+                self.release()
+            raise
+
+    def release(self) -> None:
+        """Free a slot and grant it to the highest-priority waiter."""
+        self.in_use -= 1
+        while self._waiters and self.in_use < self.capacity:
+            *_, future = heapq.heappop(self._waiters)
+            if not future.done():
+                self.in_use += 1
+                future.set_result(None)
+
+    @asynccontextmanager
+    async def slot(self, priority: int) -> AsyncIterator[None]:
+        """Hold a slot for the duration of the block."""
+        await self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+
+class LimitedConsumer:
+    """A consumer callback run under a per-queue and a shared limit."""
+
+    def __init__(
+        self,
+        runtime: "ConsumerRuntime",
+        callback: ConsumerCallback,
+        concurrency: int,
+        priority: int,
+    ):
+        self.runtime = runtime
+        self.callback = callback
+        self.concurrency = concurrency
+        self.priority = priority
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    async def __call__(self, message: AbstractIncomingMessage) -> None:
+        self.runtime._started()
+        try:
+            async with self._semaphore, self.runtime.limiter.slot(self.priority):
+                await self.callback(message)
+        finally:
+            self.runtime._finished()
+
+
+class ConsumerRuntime:
+    """Tracks the consumers of one process and limits their handlers."""
+
+    def __init__(self, max_in_flight: int):
+        self.limiter = PriorityLimiter(max_in_flight)
+        self.in_flight = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._consumers: list[tuple[AbstractQueue, str]] = []
+        self._batchers: list[MessageBatcher] = []
+
+    def _started(self) -> None:
+        self.in_flight += 1
+        self._idle.clear()
+
+    def _finished(self) -> None:
+        self.in_flight -= 1
+        if not self.in_flight:
+            self._idle.set()
+
+    async def consume(
+        self,
+        queue: AbstractQueue,
+        callback: ConsumerCallback,
+        concurrency: int,
+        priority: int,
+    ) -> str:
+        """
+        Start consuming a queue through a ``LimitedConsumer``.
+
+        Args:
+            queue: Queue to consume.
+            callback: The queue's consumer callback.
+            concurrency: Maximum handlers of this queue running at once.
+            priority: Priority class for the shared handler slots.
+
+        Returns:
+            The consumer tag.
+        """
+        if isinstance(callback, MessageBatcher):
+            self._batchers.append(callback)
+        consumer_tag = await queue.consume(
+            LimitedConsumer(self, callback, concurrency, priority), no_ack=False
+        )
+        self._consumers.append((queue, consumer_tag))
+        return consumer_tag
+
+    async def drain(self, timeout: float) -> bool:
+        """
+        Stop receiving messages and finish the ones already received.
+
+        Args:
+            timeout: Seconds to wait for in-flight handlers.
+
+        Returns:
+            True if everything finished within the timeout. Unfinished
+            messages stay unacked and are redelivered by the broker.
+        """
+        consumers, self._consumers = self._consumers, []
+        for queue, consumer_tag in consumers:
+            try:
+                await queue.cancel(consumer_tag)
+            except Exception as e:
+                rabbitmq_logger.warning(f"Error cancelling consumer on {queue}: {e}")
+
+        rabbitmq_logger.info(
+            f"Draining consumers: {self.in_flight} message(s) in flight"
+        )
+        try:
+            async with asyncio.timeout(timeout):
+                await self._idle.wait()
+                for batcher in self._batchers:
+                    await batcher.drain()
+        except TimeoutError:
+            rabbitmq_logger.warning(
+                f"Drain timed out after {timeout}s with "
+                f"{self.in_flight} message(s) in flight"
+            )
+            return False
+        return True
+
+
+__all__ = ["ConsumerRuntime", "LimitedConsumer", "PriorityLimiter"]
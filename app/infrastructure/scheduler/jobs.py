@@ -1,9 +1,11 @@
 from datetime import datetime, timedelta, timezone
+from uuid import UUID
 
 
 from app.core.config import scheduler_logger, settings
 from app.core.db import AsyncSessionLocal
-from app.core.db.crud import user_db
+from app.core.db.crud import outbox_event_db, refresh_token_db, user_db
+from app.core.services.lifecycle import provision_user
 from app.apps.cubex_api.db.crud import usage_log_db
 from app.apps.cubex_career.db.crud import career_usage_log_db
 
@@ -73,3 +75,104 @@ async def expire_pending_career_usage_logs() -> None:
         scheduler_logger.info(
             f"Completed expiration of pending career usage logs. Expired {expired_count} record(s)."
         )
+
+
+async def purge_published_outbox_events() -> None:
+    """
+    Periodic task to delete outbox events published longer ago than
+    OUTBOX_RETENTION_HOURS.
+
+    Pending events are never purged; they stay until the relay publishes them.
+    """
+    retention_hours = settings.OUTBOX_RETENTION_HOURS
+    cutoff_time = datetime.now(timezone.utc) - timedelta(hours=retention_hours)
+
+    async with AsyncSessionLocal.begin() as session:
+        scheduler_logger.info(
+            f"Starting purge of outbox events published before {cutoff_time}"
+        )
+        purged_count = await outbox_event_db.purge_published(
+            session, before=cutoff_time, commit_self=False
+        )
+        scheduler_logger.info(
+            f"Completed purge of published outbox events. Deleted {purged_count} record(s)."
+        )
+
+
+async def cleanup_refresh_tokens() -> None:
+    """
+    Periodic task to soft-delete expired and revoked refresh tokens, and to
+    permanently delete those cleaned up more than
+    REFRESH_TOKEN_RETENTION_DAYS ago.
+    """
+    retention_days = settings.REFRESH_TOKEN_RETENTION_DAYS
+    cutoff_time = datetime.now(timezone.utc) - timedelta(days=retention_days)
+
+    async with AsyncSessionLocal.begin() as session:
+        scheduler_logger.info("Starting cleanup of expired and revoked refresh tokens")
+        cleaned_count = await refresh_token_db.cleanup_expired(
+            session, commit_self=False
+        )
+        purged_count = await refresh_token_db.purge_deleted(
+            session, deleted_before=cutoff_time, commit_self=False
+        )
+        scheduler_logger.info(
+            f"Completed cleanup of refresh tokens. Soft-deleted {cleaned_count}, "
+            f"purged {purged_count} record(s)."
+        )
+
+
+async def _record_provisioning_failure(user_id: UUID) -> int | None:
+    try:
+        async with AsyncSessionLocal.begin() as session:
+            return await user_db.record_provisioning_failure(
+                session, user_id, commit_self=False
+            )
+    except Exception as e:
+        scheduler_logger.error(
+            f"Failed to record provisioning failure for user {user_id}: {e}"
+        )
+        return None
+
+
+async def provision_pending_users() -> None:
+    """
+    Periodic task to provision verified users whose post-signup provisioning
+    has not finished PROVISIONING_SWEEP_DELAY_MINUTES after sign-up (lost
+    or dead-lettered jobs, inline hook failures).
+
+    Each user is provisioned in their own transaction, so one failure does
+    not hold back the rest of the batch. Failures are counted on the user,
+    and users with the fewest failures are swept first, so a batch of users
+    that keep failing does not starve the users behind them.
+    """
+    delay_minutes = settings.PROVISIONING_SWEEP_DELAY_MINUTES
+    cutoff_time = datetime.now(timezone.utc) - timedelta(minutes=delay_minutes)
+
+    async with AsyncSessionLocal() as session:
+        user_ids = await user_db.get_unprovisioned_ids(
+            session,
+            created_before=cutoff_time,
+            limit=settings.PROVISIONING_SWEEP_BATCH_SIZE,
+        )
+    scheduler_logger.info(
+        f"Starting provisioning of {len(user_ids)} user(s) created before {cutoff_time}"
+    )
+
+    provisioned_count = 0
+    for user_id in user_ids:
+        try:
+            async with AsyncSessionLocal.begin() as session:
+                user = await user_db.claim_for_provisioning(session, user_id)
+                if user is None:
+                    continue
+                await provision_user(session, user)
+            provisioned_count += 1
+        except Exception as e:
+            attempts = await _record_provisioning_failure(user_id)
+            scheduler_logger.error(
+                f"Failed to provision user {user_id} (attempt {attempts}): {e}"
+            )
+    scheduler_logger.info(
+        f"Completed provisioning sweep. Provisioned {provisioned_count} user(s)."
+    )
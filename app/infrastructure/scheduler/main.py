@@ -18,7 +18,9 @@ from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 
 from app.core.config import scheduler_logger, settings
+from app.core.db import dispose_db, pool_liveness_monitor
 from app.core.services import BrevoService, RedisService, Renderer
+from app.apps.provisioning import register_post_signup_hooks
 
 logging.basicConfig(level=logging.INFO)
 logging.getLogger("apscheduler").setLevel(logging.DEBUG)
@@ -120,6 +122,72 @@ def schedule_expire_pending_career_usage_logs_job(interval_minutes: int = 5) ->
     )
 
 
+def schedule_purge_published_outbox_events_job(interval_minutes: int = 60) -> None:
+    """
+    Schedule the purge_published_outbox_events job to run at specified intervals.
+    """
+    from apscheduler.triggers.interval import IntervalTrigger
+
+    from app.infrastructure.scheduler.jobs import purge_published_outbox_events
+
+    scheduler_logger.info(
+        f"Scheduling 'purge_published_outbox_events' job to run every {interval_minutes} minutes"
+    )
+    scheduler.add_job(
+        purge_published_outbox_events,
+        trigger=IntervalTrigger(minutes=interval_minutes, timezone=timezone.utc),
+        replace_existing=True,
+        id="purge_published_outbox_events_job",
+        jobstore="cleanups",
+        misfire_grace_time=60 * 30,  # 30 minutes grace time
+    )
+    scheduler_logger.info("'purge_published_outbox_events' job scheduled successfully.")
+
+
+def schedule_cleanup_refresh_tokens_job(interval_minutes: int = 60) -> None:
+    """
+    Schedule the cleanup_refresh_tokens job to run at specified intervals.
+    """
+    from apscheduler.triggers.interval import IntervalTrigger
+
+    from app.infrastructure.scheduler.jobs import cleanup_refresh_tokens
+
+    scheduler_logger.info(
+        f"Scheduling 'cleanup_refresh_tokens' job to run every {interval_minutes} minutes"
+    )
+    scheduler.add_job(
+        cleanup_refresh_tokens,
+        trigger=IntervalTrigger(minutes=interval_minutes, timezone=timezone.utc),
+        replace_existing=True,
+        id="cleanup_refresh_tokens_job",
+        jobstore="cleanups",
+        misfire_grace_time=60 * 30,  # 30 minutes grace time
+    )
+    scheduler_logger.info("'cleanup_refresh_tokens' job scheduled successfully.")
+
+
+def schedule_provision_pending_users_job(interval_minutes: int = 5) -> None:
+    """
+    Schedule the provision_pending_users job to run at specified intervals.
+    """
+    from apscheduler.triggers.interval import IntervalTrigger
+
+    from app.infrastructure.scheduler.jobs import provision_pending_users
+
+    scheduler_logger.info(
+        f"Scheduling 'provision_pending_users' job to run every {interval_minutes} minutes"
+    )
+    scheduler.add_job(
+        provision_pending_users,
+        trigger=IntervalTrigger(minutes=interval_minutes, timezone=timezone.utc),
+        replace_existing=True,
+        id="provision_pending_users_job",
+        jobstore="cleanups",
+        misfire_grace_time=60 * 5,  # 5 minutes grace time
+    )
+    scheduler_logger.info("'provision_pending_users' job scheduled successfully.")
+
+
 def initialize_scheduler() -> None:
     """
     Initialize the scheduler by scheduling all required jobs.
@@ -132,6 +200,9 @@ def initialize_scheduler() -> None:
     )
     schedule_expire_pending_usage_logs_job(interval_minutes=5)
     schedule_expire_pending_career_usage_logs_job(interval_minutes=5)
+    schedule_purge_published_outbox_events_job(interval_minutes=60)
+    schedule_cleanup_refresh_tokens_job(interval_minutes=60)
+    schedule_provision_pending_users_job(interval_minutes=5)
 
 
 async def main() -> None:
@@ -155,6 +226,8 @@ async def main() -> None:
     scheduler_logger.info("Starting standalone scheduler...")
 
     try:
+        pool_liveness_monitor.start(settings.DB_LIVENESS_CHECK_INTERVAL_SECONDS)
+
         scheduler_logger.info("Initializing Redis service...")
         await RedisService.init(settings.REDIS_URL)
         scheduler_logger.info("Redis service initialized successfully.")
@@ -171,6 +244,9 @@ async def main() -> None:
         Renderer.initialize("app/templates")
         scheduler_logger.info("Template renderer initialized successfully.")
 
+        # The provisioning sweep runs each product's post-signup hooks
+        register_post_signup_hooks()
+
         # Start scheduler
         scheduler_logger.info("Starting scheduler...")
         scheduler.start()
@@ -193,6 +269,9 @@ async def main() -> None:
         await RedisService.aclose()
         scheduler_logger.info("Redis service closed successfully.")
 
+        await dispose_db()
+        scheduler_logger.info("Database disposed successfully.")
+
         scheduler_logger.info("Scheduler shutdown complete.")
 
 
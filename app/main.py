@@ -59,8 +59,9 @@ from app.core.exceptions.types import (
 )
 from app.core.services import BrevoService, CloudinaryService, Renderer, RedisService
 from app.core.services.auth import AuthService
+from app.core.jwt_keys import get_jwt_keyset
 from app.core.services.oauth import GoogleOAuthService, GitHubOAuthService
-from app.core.routers import auth_router, webhook_router
+from app.core.routers import auth_router, webhook_router, well_known_router
 from app.apps.cubex_api.routers import (
     internal_router,
     support_router,
@@ -71,27 +72,34 @@ from app.apps.cubex_career.routers import (
     history_router as career_history_router,
     subscription_router as career_subscription_router,
     internal_router as career_internal_router,
+    usage_router as career_usage_router,
 )
-from app.core.db import AsyncSessionLocal
+from app.core.db import AsyncSessionLocal, db_router, pool_liveness_monitor
 from app.core.services import QuotaCacheService
 from app.core.utils import generate_openapi_json, write_to_file_async
 from app.admin import init_admin
 from app.admin.dlq_router import router as dlq_router
+from app.admin.metrics_router import router as admin_metrics_router
 from app.infrastructure.scheduler import scheduler, initialize_scheduler
-from app.infrastructure.messaging import start_consumers, publish_event
-from app.infrastructure.messaging.connection import get_connection
-from app.core.services.event_publisher import register_publisher
-from app.core.services.lifecycle import register_post_signup_hook
-from app.apps.cubex_api.services.workspace import WorkspaceService
-from app.apps.cubex_career.services.subscription import (
-    CareerSubscriptionService,
+from app.infrastructure.messaging import (
+    close_publisher,
+    register_event_publisher,
+    start_consumers,
 )
+from app.infrastructure.messaging.connection import get_connection
+from app.infrastructure.messaging.queue_depth import QueueDepthPoller
+from app.core.services.messaging_metrics import MessagingMetricsReporter
+from app.core.services.password_hasher import password_hasher
+from app.apps.provisioning import register_post_signup_hooks
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     app_logger.info("Starting application...")
     consumer_connection = None
+    outbox_relay = None
+    queue_depth_poller = None
+    metrics_reporter = None
 
     app_logger.info("Initializing Redis service...")
     await RedisService.init(settings.REDIS_URL)
@@ -105,6 +113,7 @@ async def lifespan(app: FastAPI):
 
     app_logger.info("Initializing Auth service...")
     AuthService.init()
+    get_jwt_keyset()
     app_logger.info("Auth service initialized successfully.")
 
     app_logger.info("Initializing OAuth services...")
@@ -116,8 +125,18 @@ async def lifespan(app: FastAPI):
         client_id=settings.GITHUB_CLIENT_ID,
         client_secret=settings.GITHUB_CLIENT_SECRET,
     )
+    await GoogleOAuthService.load_metadata()
     app_logger.info("OAuth services initialized successfully.")
 
+    app_logger.info("Starting database liveness monitor...")
+    pool_liveness_monitor.start(settings.DB_LIVENESS_CHECK_INTERVAL_SECONDS)
+    app_logger.info("Database liveness monitor started successfully.")
+
+    if settings.DATABASE_REPLICA_URLS:
+        app_logger.info("Starting read replica lag monitor...")
+        db_router.start_lag_monitor(settings.DATABASE_REPLICA_CHECK_INTERVAL_SECONDS)
+        app_logger.info("Read replica lag monitor started successfully.")
+
     # Start the scheduler (only if enabled)
     if settings.ENABLE_SCHEDULER:
         app_logger.info("Starting scheduler...")
@@ -151,24 +170,23 @@ async def lifespan(app: FastAPI):
         app_logger.info("Message consumers started successfully.")
 
         # Register the concrete publisher so core/app code can publish events
-        # without importing infrastructure directly.
-        register_publisher(publish_event)
+        # without importing infrastructure directly (the transactional outbox
+        # and its relay, unless EVENT_OUTBOX_ENABLED is off).
+        outbox_relay = register_event_publisher()
+
+        if settings.RABBITMQ_QUEUE_DEPTH_POLL_SECONDS > 0:
+            queue_depth_poller = QueueDepthPoller()
+            queue_depth_poller.start(settings.RABBITMQ_QUEUE_DEPTH_POLL_SECONDS)
+
+        if settings.MESSAGING_METRICS_REPORT_SECONDS > 0:
+            metrics_reporter = MessagingMetricsReporter()
+            metrics_reporter.start(settings.MESSAGING_METRICS_REPORT_SECONDS)
     else:
         app_logger.info("Messaging disabled via ENABLE_MESSAGING setting.")
 
     # Register post-signup hooks from each app
     app_logger.info("Registering post-signup hooks...")
-
-    async def _create_personal_workspace(session, user):  # type: ignore[no-untyped-def]
-        ws_svc = WorkspaceService()
-        await ws_svc.create_personal_workspace(session, user, commit_self=False)
-
-    async def _create_career_subscription(session, user):  # type: ignore[no-untyped-def]
-        career_svc = CareerSubscriptionService()
-        await career_svc.create_free_subscription(session, user, commit_self=False)
-
-    register_post_signup_hook(_create_personal_workspace)
-    register_post_signup_hook(_create_career_subscription)
+    register_post_signup_hooks()
     app_logger.info("Post-signup hooks registered.")
 
     app_logger.info("Initializing template renderer...")
@@ -184,6 +202,19 @@ async def lifespan(app: FastAPI):
 
     app_logger.info("Shutting down application...")
 
+    if queue_depth_poller:
+        await queue_depth_poller.stop()
+
+    if metrics_reporter:
+        await metrics_reporter.stop()
+
+    # Stop relaying outbox events; pending ones are published after restart
+    if outbox_relay:
+        await outbox_relay.stop()
+
+    # Close pooled publisher channels before the connection goes away
+    await close_publisher()
+
     # Stop message consumers
     if consumer_connection:
         app_logger.info("Closing message consumer connection...")
@@ -196,12 +227,17 @@ async def lifespan(app: FastAPI):
         scheduler.shutdown()
         app_logger.info("Scheduler stopped successfully.")
 
+    await db_router.stop_lag_monitor()
+    await pool_liveness_monitor.stop()
+
     # Close OAuth services
     app_logger.info("Closing OAuth services...")
     await GoogleOAuthService.aclose()
     await GitHubOAuthService.aclose()
     app_logger.info("OAuth services closed successfully.")
 
+    password_hasher.shutdown()
+
     # Close Redis service
     app_logger.info("Closing Redis service...")
     await RedisService.aclose()
@@ -272,6 +308,7 @@ app.add_middleware(
 # Include routers
 app.include_router(auth_router, prefix="/auth", tags=["Authentication"])
 app.include_router(webhook_router, tags=["Webhooks"])
+app.include_router(well_known_router, tags=["Well-Known"])
 app.include_router(workspace_router, prefix="/api", tags=["API - Workspaces"])
 app.include_router(api_subscription_router, prefix="/api", tags=["API - Subscriptions"])
 app.include_router(support_router, prefix="/api", tags=["API - Support"])
@@ -283,13 +320,16 @@ app.include_router(
     career_internal_router, prefix="/career", tags=["Career - Internal API"]
 )
 app.include_router(career_history_router, prefix="/career", tags=["Career - History"])
+app.include_router(career_usage_router, prefix="/career", tags=["Career - Usage"])
+
+# Admin API endpoints (separate from SQLAdmin UI). Registered before the
+# SQLAdmin mount, which would otherwise shadow everything under /admin.
+app.include_router(dlq_router, prefix="/admin/api", tags=["Admin - DLQ"])
+app.include_router(admin_metrics_router, prefix="/admin/api", tags=["Admin - Metrics"])
 
 # Mount admin interface
 init_admin(app)
 
-# Admin API endpoints (separate from SQLAdmin UI)
-app.include_router(dlq_router, prefix="/admin/api", tags=["Admin - DLQ"])
-
 
 @app.get("/", include_in_schema=False)
 async def root(request: Request):
@@ -376,22 +376,20 @@ async def sync_plans_task(dry_run: bool = False) -> None:
             print(f"  - {plan['product_type']}/{plan['name']}: {plan['display_price']}")
         return
 
-    created_count = 0
-    updated_count = 0
-
-    async with AsyncSessionLocal() as session:
-        for plan_def in all_plans:
-            # Resolve Stripe price IDs from environment variables
-            stripe_price_id = None
-            if env_var := plan_def.get("stripe_price_id_env"):
-                stripe_price_id = getattr(settings, env_var, None)
-
-            seat_stripe_price_id = None
-            if env_var := plan_def.get("seat_stripe_price_id_env"):
-                seat_stripe_price_id = getattr(settings, env_var, None)
-
-            # Build plan data
-            plan_data = {
+    rows = []
+    for plan_def in all_plans:
+        # Resolve Stripe price IDs from environment variables
+        stripe_price_id = None
+        if env_var := plan_def.get("stripe_price_id_env"):
+            stripe_price_id = getattr(settings, env_var, None)
+
+        seat_stripe_price_id = None
+        if env_var := plan_def.get("seat_stripe_price_id_env"):
+            seat_stripe_price_id = getattr(settings, env_var, None)
+
+        # Build plan data
+        rows.append(
+            {
                 "name": plan_def["name"],
                 "product_type": ProductType(plan_def["product_type"].lower()),
                 "description": plan_def.get("description"),
@@ -408,29 +406,34 @@ async def sync_plans_task(dry_run: bool = False) -> None:
                 "min_seats": plan_def.get("min_seats", 1),
                 "max_seats": plan_def.get("max_seats"),
             }
+        )
 
-            try:
-                plan, created = await plan_db.upsert(
-                    session=session,
-                    data=plan_data,
-                    unique_fields=["name", "product_type"],
-                    commit_self=True,
-                )
+    created_count = 0
+    updated_count = 0
 
-                if created:
-                    created_count += 1
-                    print(
-                        f"[green]  ✓ Created:[/green] {plan.product_type.value}/{plan.name}"
-                    )
-                else:
-                    updated_count += 1
-                    print(
-                        f"[blue]  ↻ Updated:[/blue] {plan.product_type.value}/{plan.name}"
-                    )
-
-            except Exception as e:
+    # All plans are written by a single INSERT ... ON CONFLICT statement
+    async with AsyncSessionLocal() as session:
+        try:
+            plans = await plan_db.bulk_upsert(
+                session=session,
+                rows=rows,
+                unique_fields=["name", "product_type"],
+                commit_self=True,
+            )
+        except Exception as e:
+            print(f"[red]  ✗ Error syncing plans: {e}[/red]")
+            raise typer.Exit(1)
+
+        for plan in plans:
+            if plan.created_at == plan.updated_at:
+                created_count += 1
+                print(
+                    f"[green]  ✓ Created:[/green] {plan.product_type.value}/{plan.name}"
+                )
+            else:
+                updated_count += 1
                 print(
-                    f"[red]  ✗ Error syncing {plan_def['product_type']}/{plan_def['name']}: {e}[/red]"
+                    f"[blue]  ↻ Updated:[/blue] {plan.product_type.value}/{plan.name}"
                 )
 
     print(
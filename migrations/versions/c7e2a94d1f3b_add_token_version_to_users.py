@@ -0,0 +1,37 @@
+"""add token version to users
+
+Revision ID: c7e2a94d1f3b
+Revises: fa59ae40e3b1
+Create Date: 2026-10-19 09:12:37.480211
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7e2a94d1f3b'
+down_revision: Union[str, Sequence[str], None] = 'fa59ae40e3b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'users',
+        sa.Column(
+            'token_version',
+            sa.Integer(),
+            server_default='0',
+            nullable=False,
+            comment='Bumped to revoke every access token issued before the change',
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'token_version')
@@ -261,6 +261,48 @@ class TestDLQMetricsEndpoint:
         routes = [r.path for r in router.routes]
         assert "/dlq/metrics" in routes
 
+    def test_dlq_retry_route_is_post(self):
+        from app.admin.dlq_router import router
+
+        methods = {
+            method
+            for route in router.routes
+            if getattr(route, "path", None) == "/dlq/retry"
+            for method in route.methods  # type: ignore[attr-defined]
+        }
+        assert methods == {"POST"}
+
+    @pytest.mark.asyncio
+    async def test_dlq_retry_passes_filter(self):
+        from datetime import datetime, timezone
+        from unittest.mock import AsyncMock, patch
+
+        from app.admin.dlq_router import DLQRetryRequest, dlq_retry
+        from app.core.services.dlq import DLQRetryResult
+
+        since = datetime(2026, 5, 1, tzinfo=timezone.utc)
+        with patch(
+            "app.admin.dlq_router.retry_by_filter",
+            new_callable=AsyncMock,
+            return_value=DLQRetryResult(retried=7, skipped=1),
+        ) as mock_retry:
+            response = await dlq_retry(
+                DLQRetryRequest(
+                    queue_name="stripe_payment_failed",
+                    error_pattern="timeout",
+                    since=since,
+                )
+            )
+
+        mock_retry.assert_awaited_once_with(
+            queue_name="stripe_payment_failed",
+            error_pattern="timeout",
+            since=since,
+            until=None,
+        )
+        assert response.retried == 7
+        assert response.skipped == 1
+
     def test_dlq_metrics_is_get(self):
         from app.admin.dlq_router import router
 
@@ -0,0 +1,106 @@
+"""
+Test suite for the admin runtime metrics endpoints.
+
+Run tests:
+    pytest tests/admin/test_metrics.py -v
+
+Run with coverage:
+    pytest tests/admin/test_metrics.py --cov=app.admin.metrics_router --cov-report=term-missing -v
+"""
+
+from unittest.mock import patch
+
+import pytest
+from httpx import AsyncClient
+
+from app.admin.dlq_router import require_admin_auth
+from app.core.services.messaging_metrics import MessagingMetrics, process_id
+
+MODULE = "app.admin.metrics_router"
+
+
+class TestDBPoolMetricsEndpoint:
+
+    def test_route_registered(self):
+        from app.admin.metrics_router import router
+
+        routes = [r.path for r in router.routes if hasattr(r, "path")]  # type: ignore[attr-defined]
+        assert "/metrics/db-pool" in routes
+
+    @pytest.mark.asyncio
+    async def test_requires_admin_auth(self, client: AsyncClient):
+        response = await client.get("/admin/api/metrics/db-pool")
+
+        assert response.status_code == 401
+
+    @pytest.mark.asyncio
+    async def test_reports_pool_profile_and_engines(self, app, client: AsyncClient):
+        async def allow():
+            return None
+
+        app.dependency_overrides[require_admin_auth] = allow
+        try:
+            response = await client.get("/admin/api/metrics/db-pool")
+        finally:
+            app.dependency_overrides.pop(require_admin_auth, None)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["process_role"] == "api"
+        assert data["profile"]["pool_size"] > 0
+        assert data["pre_ping"] is False
+        primary = data["engines"]["primary"]
+        assert {"size", "checked_out", "checkouts", "liveness_ok"} <= set(primary)
+
+
+class TestMessagingMetricsEndpoint:
+
+    def test_routes_registered(self):
+        from app.admin.metrics_router import router
+
+        routes = [r.path for r in router.routes if hasattr(r, "path")]  # type: ignore[attr-defined]
+        assert "/metrics/messaging" in routes
+        assert "/metrics/messaging/prometheus" in routes
+
+    @pytest.mark.asyncio
+    async def test_requires_admin_auth(self, client: AsyncClient):
+        response = await client.get("/admin/api/metrics/messaging")
+
+        assert response.status_code == 401
+
+    @pytest.mark.asyncio
+    async def test_reports_queues_and_outbox(self, app, client: AsyncClient):
+        metrics = MessagingMetrics()
+        metrics.observe_handler("emails", "send_email", 0.02)
+        metrics.record_outcome("emails", "acked")
+        metrics.set_queue_depth("emails", messages=4, consumers=1)
+
+        async def allow():
+            return None
+
+        app.dependency_overrides[require_admin_auth] = allow
+        try:
+            with patch(f"{MODULE}.messaging_metrics", metrics):
+                response = await client.get("/admin/api/metrics/messaging")
+                prometheus = await client.get("/admin/api/metrics/messaging/prometheus")
+        finally:
+            app.dependency_overrides.pop(require_admin_auth, None)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["processes"][0] == process_id()
+        emails = data["queues"]["emails"]
+        assert emails["handlers"]["send_email"]["count"] == 1
+        assert emails["messages"] == {"acked": 1}
+        assert emails["depth"]["messages"] == 4
+        assert data["outbox"] == {
+            "pending": 0,
+            "oldest_pending_age_seconds": None,
+            "exhausted": 0,
+        }
+
+        assert prometheus.status_code == 200
+        assert prometheus.headers["content-type"].startswith("text/plain")
+        assert 'messaging_queue_messages{queue="emails"} 4' in prometheus.text
+        assert "messaging_outbox_pending 0" in prometheus.text
+        assert "messaging_outbox_exhausted 0" in prometheus.text
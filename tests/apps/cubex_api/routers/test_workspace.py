@@ -1035,3 +1035,112 @@ class TestActivatePersonalWorkspace:
         response = await client.post("/api/workspaces/activate")
 
         assert response.status_code == 401
+
+
+class TestUsageSummary:
+    """Tests for GET /api/workspaces/{workspace_id}/usage/summary"""
+
+    @staticmethod
+    async def _pending_log(db_session, workspace, api_key):
+        from decimal import Decimal
+
+        from app.apps.cubex_api.db.models import UsageLog
+        from app.core.enums import AccessStatus, FeatureKey, UsageLogStatus
+
+        usage_log = UsageLog(
+            id=uuid4(),
+            api_key_id=api_key.id,
+            workspace_id=workspace.id,
+            request_id=str(uuid4()),
+            fingerprint_hash="b" * 64,
+            access_status=AccessStatus.GRANTED,
+            feature_key=FeatureKey.API_JOB_MATCH,
+            endpoint="/test/job-match",
+            method="POST",
+            credits_reserved=Decimal("2.00"),
+            status=UsageLogStatus.PENDING,
+        )
+        db_session.add(usage_log)
+        await db_session.flush()
+        return usage_log
+
+    @pytest.mark.asyncio
+    async def test_commit_is_counted_once(
+        self,
+        authenticated_client: AsyncClient,
+        db_session,
+        test_workspace,
+        live_api_key,
+    ):
+        """Replaying a commit must not double-count the rollup."""
+        from app.apps.cubex_api.services.quota import quota_service
+
+        raw_key, api_key = live_api_key
+        usage_log = await self._pending_log(db_session, test_workspace, api_key)
+
+        for _ in range(2):
+            await quota_service.commit_usage(
+                db_session,
+                raw_key,
+                usage_log.id,
+                success=True,
+                metrics={"input_tokens": 300, "output_tokens": 90, "latency_ms": 420},
+                commit_self=False,
+            )
+
+        response = await authenticated_client.get(
+            f"/api/workspaces/{test_workspace.id}/usage/summary",
+            params={"granularity": "hour"},
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["granularity"] == "hour"
+        assert data["totals"]["request_count"] == 1
+        assert data["totals"]["success_count"] == 1
+        assert data["totals"]["input_tokens"] == 300
+        assert float(data["totals"]["credits_charged"]) == 2.0
+        assert data["totals"]["avg_latency_ms"] == 420.0
+        assert data["by_feature"][0]["feature_key"] == "api.job_match"
+        assert len(data["series"]) == 1
+
+    @pytest.mark.asyncio
+    async def test_empty_summary(
+        self, authenticated_client: AsyncClient, test_workspace
+    ):
+        """Should return zeroed totals when nothing was committed."""
+        response = await authenticated_client.get(
+            f"/api/workspaces/{test_workspace.id}/usage/summary"
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["granularity"] == "day"
+        assert data["totals"]["request_count"] == 0
+        assert data["totals"]["p50_latency_ms"] is None
+        assert data["by_feature"] == []
+        assert data["series"] == []
+
+    @pytest.mark.asyncio
+    async def test_invalid_window(
+        self, authenticated_client: AsyncClient, test_workspace
+    ):
+        """Should return 400 when start is after end."""
+        response = await authenticated_client.get(
+            f"/api/workspaces/{test_workspace.id}/usage/summary",
+            params={
+                "start": "2026-03-02T00:00:00Z",
+                "end": "2026-03-01T00:00:00Z",
+            },
+        )
+
+        assert response.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_non_member(self, authenticated_client: AsyncClient):
+        """Should return 404 for a workspace the user is not a member of."""
+        response = await authenticated_client.get(
+            f"/api/workspaces/{uuid4()}/usage/summary"
+        )
+
+        assert response.status_code == 404
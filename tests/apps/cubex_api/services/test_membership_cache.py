@@ -0,0 +1,254 @@
+"""
+Test suite for the workspace membership cache.
+
+Run tests:
+    pytest tests/apps/cubex_api/services/test_membership_cache.py -v
+
+Run with coverage:
+    pytest tests/apps/cubex_api/services/test_membership_cache.py --cov=app.apps.cubex_api.services.membership_cache --cov-report=term-missing -v
+"""
+
+import asyncio
+from fnmatch import fnmatchcase
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.apps.cubex_api.services.membership_cache import (
+    MembershipCache,
+    MembershipSnapshot,
+    membership_key,
+    membership_pattern,
+)
+from app.core.enums import MemberRole, MemberStatus
+from app.core.services.commit_hooks import (
+    _discard_after_rollback,
+    _flush_after_commit,
+)
+
+MODULE = "app.apps.cubex_api.services.membership_cache"
+
+
+class TestMembershipPattern:
+
+    def test_matches_every_member_of_the_workspace(self):
+        workspace_id = uuid4()
+        pattern = membership_pattern(workspace_id)
+
+        assert fnmatchcase(membership_key(workspace_id, uuid4()), pattern)
+        assert not fnmatchcase(membership_key(uuid4(), uuid4()), pattern)
+
+
+def _member(**overrides):
+    fields = {
+        "workspace_id": uuid4(),
+        "user_id": uuid4(),
+        "role": MemberRole.ADMIN,
+        "status": MemberStatus.ENABLED,
+    }
+    return SimpleNamespace(**{**fields, **overrides})
+
+
+@pytest.fixture
+def session():
+    session = MagicMock()
+    session.info = {}
+    session.in_transaction.return_value = True
+    return session
+
+
+@pytest.fixture
+def redis():
+    with patch(f"{MODULE}.RedisService") as mock_redis:
+        mock_redis.is_connected.return_value = False
+        mock_redis.get = AsyncMock(return_value=None)
+        mock_redis.set = AsyncMock(return_value=True)
+        mock_redis.delete = AsyncMock(return_value=True)
+        mock_redis.delete_pattern = AsyncMock(return_value=0)
+        yield mock_redis
+
+
+@pytest.fixture
+def member_db():
+    with patch(f"{MODULE}.workspace_member_db") as mock_member_db:
+        yield mock_member_db
+
+
+class TestMembershipSnapshot:
+
+    def test_json_round_trip(self):
+        snapshot = MembershipSnapshot.from_member(_member())
+
+        restored = MembershipSnapshot.from_json(
+            snapshot.workspace_id, snapshot.user_id, snapshot.to_json()
+        )
+
+        assert restored == snapshot
+
+    def test_role_and_status_properties(self):
+        owner = MembershipSnapshot.from_member(_member(role=MemberRole.OWNER))
+        member = MembershipSnapshot.from_member(
+            _member(role=MemberRole.MEMBER, status=MemberStatus.DISABLED)
+        )
+
+        assert owner.is_owner and owner.is_admin and owner.is_enabled
+        assert not member.is_admin and not member.is_enabled
+
+
+class TestMembershipCacheGet:
+
+    @pytest.mark.asyncio
+    async def test_memoized_within_request(self, session, redis, member_db):
+        member = _member()
+        member_db.get_member = AsyncMock(return_value=member)
+        cache = MembershipCache(ttl=60)
+
+        first = await cache.get(session, member.workspace_id, member.user_id)
+        second = await cache.get(session, member.workspace_id, member.user_id)
+
+        assert first == second == MembershipSnapshot.from_member(member)
+        member_db.get_member.assert_awaited_once_with(
+            session, member.workspace_id, member.user_id, load_user=False
+        )
+
+    @pytest.mark.asyncio
+    async def test_non_member_memoized_but_not_stored(self, session, redis, member_db):
+        redis.is_connected.return_value = True
+        member_db.get_member = AsyncMock(return_value=None)
+        cache = MembershipCache(ttl=60)
+        workspace_id, user_id = uuid4(), uuid4()
+
+        assert await cache.get(session, workspace_id, user_id) is None
+        assert await cache.get(session, workspace_id, user_id) is None
+        member_db.get_member.assert_awaited_once()
+        redis.set.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_redis_tier_shared_across_requests(self, session, redis, member_db):
+        member = _member()
+        snapshot = MembershipSnapshot.from_member(member)
+        key = membership_key(member.workspace_id, member.user_id)
+        redis.is_connected.return_value = True
+        member_db.get_member = AsyncMock(return_value=member)
+        cache = MembershipCache(ttl=60)
+
+        await cache.get(session, member.workspace_id, member.user_id)
+        redis.set.assert_awaited_once_with(key, snapshot.to_json(), ttl=60)
+
+        other_request = MagicMock(info={})
+        redis.get.return_value = snapshot.to_json()
+        assert (
+            await cache.get(other_request, member.workspace_id, member.user_id)
+            == snapshot
+        )
+        member_db.get_member.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_loads_in_own_transaction_outside_one(
+        self, session, redis, member_db
+    ):
+        session.in_transaction.return_value = False
+        session.begin = MagicMock(return_value=AsyncMock())
+        member_db.get_member = AsyncMock(return_value=_member())
+        cache = MembershipCache(ttl=60)
+
+        await cache.get(session, uuid4(), uuid4())
+
+        session.begin.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_malformed_redis_entry_falls_back_to_database(
+        self, session, redis, member_db
+    ):
+        member = _member()
+        redis.is_connected.return_value = True
+        redis.get.return_value = '{"role": "nobody"}'
+        member_db.get_member = AsyncMock(return_value=member)
+        cache = MembershipCache(ttl=60)
+
+        snapshot = await cache.get(session, member.workspace_id, member.user_id)
+
+        assert snapshot == MembershipSnapshot.from_member(member)
+
+
+class TestMembershipCacheInvalidation:
+
+    @pytest.mark.asyncio
+    async def test_invalidate_on_commit_clears_now_and_after_commit(
+        self, session, redis, member_db
+    ):
+        member = _member()
+        redis.is_connected.return_value = True
+        member_db.get_member = AsyncMock(return_value=member)
+        cache = MembershipCache(ttl=60)
+        await cache.get(session, member.workspace_id, member.user_id)
+
+        with patch(f"{MODULE}.membership_cache", cache):
+            await cache.invalidate_on_commit(
+                session, member.workspace_id, member.user_id
+            )
+            assert redis.delete.await_count == 1
+
+            # The next check in the request re-reads the membership
+            await cache.get(session, member.workspace_id, member.user_id)
+            assert member_db.get_member.await_count == 2
+
+            _flush_after_commit(session)
+            await asyncio.sleep(0)
+
+        redis.delete.assert_awaited_with(
+            membership_key(member.workspace_id, member.user_id)
+        )
+        assert redis.delete.await_count == 2
+        assert "workspace_membership_pending" not in session.info
+
+    @pytest.mark.asyncio
+    async def test_memo_survives_read_only_commit(self, session, redis, member_db):
+        member = _member()
+        member_db.get_member = AsyncMock(return_value=member)
+        cache = MembershipCache(ttl=60)
+
+        await cache.get(session, member.workspace_id, member.user_id)
+        _flush_after_commit(session)
+        await cache.get(session, member.workspace_id, member.user_id)
+
+        member_db.get_member.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_invalidate_workspace_on_commit(self, session, redis, member_db):
+        member = _member()
+        redis.is_connected.return_value = True
+        member_db.get_member = AsyncMock(return_value=member)
+        cache = MembershipCache(ttl=60)
+        await cache.get(session, member.workspace_id, member.user_id)
+
+        with patch(f"{MODULE}.membership_cache", cache):
+            await cache.invalidate_workspace_on_commit(session, member.workspace_id)
+            await cache.get(session, member.workspace_id, member.user_id)
+            _flush_after_commit(session)
+            await asyncio.sleep(0)
+
+        assert member_db.get_member.await_count == 2
+        redis.delete_pattern.assert_awaited_with(
+            membership_pattern(member.workspace_id)
+        )
+        assert redis.delete_pattern.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_rollback_discards_memo_and_pending_work(
+        self, session, redis, member_db
+    ):
+        redis.is_connected.return_value = True
+        member_db.get_member = AsyncMock(return_value=_member())
+        cache = MembershipCache(ttl=60)
+        await cache.get(session, uuid4(), uuid4())
+        await cache.invalidate_on_commit(session, uuid4(), uuid4())
+
+        _discard_after_rollback(session)
+        _flush_after_commit(session)
+        await asyncio.sleep(0)
+
+        assert session.info == {}
+        assert redis.delete.await_count == 1
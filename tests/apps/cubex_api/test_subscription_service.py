@@ -26,6 +26,16 @@ from app.core.enums import (
 )
 
 
+@pytest.fixture(autouse=True)
+def mock_membership_cache():
+    """Sessions here are mocks, so stub out membership cache invalidation."""
+    with patch(
+        "app.apps.cubex_api.services.subscription.membership_cache",
+        new_callable=AsyncMock,
+    ) as mock_cache:
+        yield mock_cache
+
+
 class TestSubscriptionServiceInit:
 
     def test_service_import(self):
@@ -1267,6 +1277,7 @@ class TestHandleCheckoutCompletedLogic:
                 seat_count=5,
             )
 
+            mock_get_pub.assert_called_once_with(mock_session)
             mock_publisher = mock_get_pub.return_value
             mock_publisher.assert_called_once()
             payload = mock_publisher.call_args[0][1]
@@ -1374,7 +1385,9 @@ class TestHandleSubscriptionDeleted:
             assert "canceled_at" in data
 
     @pytest.mark.asyncio
-    async def test_freezes_workspace_for_api_subscription(self, service):
+    async def test_freezes_workspace_for_api_subscription(
+        self, service, mock_membership_cache
+    ):
         from app.core.enums import WorkspaceStatus
 
         workspace_id = uuid4()
@@ -1416,6 +1429,9 @@ class TestHandleSubscriptionDeleted:
             mock_member_db.disable_all_members.assert_called_once_with(
                 mock_session, workspace_id, except_owner=True, commit_self=False
             )
+            mock_membership_cache.invalidate_workspace_on_commit.assert_awaited_once_with(
+                mock_session, workspace_id
+            )
 
     @pytest.mark.asyncio
     async def test_no_freeze_when_no_api_context(self, service):
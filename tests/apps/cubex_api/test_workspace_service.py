@@ -194,3 +194,43 @@ class TestWorkspaceCRUDIntegration:
         from app.apps.cubex_api.db.crud.workspace import workspace_invitation_db
 
         assert workspace_invitation_db is not None
+
+
+class TestCreatePersonalWorkspace:
+
+    @pytest.mark.asyncio
+    async def test_returns_hydrated_rows_without_refresh(self, db_session, test_user):
+        from sqlalchemy import event
+
+        from app.apps.cubex_api.services.workspace import workspace_service
+
+        statements: list[str] = []
+
+        def _record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        engine = db_session.bind.sync_engine
+        event.listen(engine, "before_cursor_execute", _record)
+        try:
+            workspace, member, subscription = (
+                await workspace_service.create_personal_workspace(
+                    db_session, test_user, commit_self=False
+                )
+            )
+        finally:
+            event.remove(engine, "before_cursor_execute", _record)
+
+        # No row written here is read back with a refresh SELECT
+        for table in ("workspaces", "workspace_members", "subscriptions"):
+            assert not any(
+                s.lstrip().startswith("SELECT")
+                and f"FROM {table} \nWHERE {table}.id" in s
+                for s in statements
+            )
+
+        assert workspace.is_personal is True
+        assert workspace.api_subscription_context.subscription_id == subscription.id
+        assert member.role == MemberRole.OWNER
+        assert member.status == MemberStatus.ENABLED
+        assert subscription.plan.product_type.value == "api"
+        assert subscription.created_at is not None
@@ -0,0 +1,171 @@
+"""
+Test suite for workspace slug allocation.
+
+- generate_unique_slug: one query, random suffix for taken slugs
+- create_with_unique_slug: insert-and-retry on the unique index
+- Query cost stays constant however many slugs share the base name
+
+Run all tests:
+    pytest tests/apps/cubex_api/test_workspace_slug.py -v
+
+Run with coverage:
+    pytest tests/apps/cubex_api/test_workspace_slug.py --cov=app.apps.cubex_api.db.crud.workspace --cov-report=term-missing -v
+"""
+
+import re
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.apps.cubex_api.db.crud import workspace_db
+from app.apps.cubex_api.db.crud.workspace import slugify
+from app.core.enums import WorkspaceStatus
+from app.core.exceptions.types import DatabaseException
+
+SUFFIXED = re.compile(r"^ws-personal-[0-9a-f]{6}$")
+
+
+def _workspace_data(owner_id, **extra) -> dict:
+    return {
+        "display_name": "Personal",
+        "owner_id": owner_id,
+        "status": WorkspaceStatus.ACTIVE,
+        "is_personal": False,
+        **extra,
+    }
+
+
+async def _insert_slugs(session: AsyncSession, owner_id, slugs: list[str]) -> None:
+    await workspace_db.bulk_insert_returning(
+        session,
+        [_workspace_data(owner_id, slug=slug) for slug in slugs],
+        commit_self=False,
+    )
+
+
+async def _probing_slug(session: AsyncSession, base_name: str) -> str:
+    """The previous allocator: probe slug, slug-1, slug-2, ... in turn."""
+    base_slug = f"{workspace_db.SLUG_PREFIX}-{slugify(base_name)}"
+    slug = base_slug
+    suffix = 1
+    while await workspace_db.exists(session, {"slug": slug}):
+        slug = f"{base_slug}-{suffix}"
+        suffix += 1
+    return slug
+
+
+class TestGenerateUniqueSlug:
+
+    @pytest.mark.asyncio
+    async def test_free_base_slug_is_used(self, db_session: AsyncSession):
+        assert (
+            await workspace_db.generate_unique_slug(db_session, "Personal")
+            == "ws-personal"
+        )
+
+    @pytest.mark.asyncio
+    async def test_taken_base_slug_gets_random_suffix(
+        self, db_session: AsyncSession, test_user
+    ):
+        await _insert_slugs(db_session, test_user.id, ["ws-personal"])
+
+        first = await workspace_db.generate_unique_slug(db_session, "Personal")
+        second = await workspace_db.generate_unique_slug(db_session, "Personal")
+
+        assert SUFFIXED.match(first) and SUFFIXED.match(second)
+        assert first != second
+
+    @pytest.mark.asyncio
+    async def test_long_names_fit_the_column(self, db_session: AsyncSession):
+        slug = await workspace_db.generate_unique_slug(db_session, "a" * 300)
+
+        assert len(workspace_db._suffixed_slug(slug)) <= workspace_db.SLUG_MAX_LENGTH
+
+
+class TestCreateWithUniqueSlug:
+
+    @pytest.mark.asyncio
+    async def test_creates_with_base_slug(self, db_session: AsyncSession, test_user):
+        workspace = await workspace_db.create_with_unique_slug(
+            db_session, _workspace_data(test_user.id), base_name="Personal"
+        )
+
+        assert workspace.slug == "ws-personal"
+
+    @pytest.mark.asyncio
+    async def test_retries_when_slug_taken_concurrently(
+        self, db_session: AsyncSession, test_user
+    ):
+        await _insert_slugs(db_session, test_user.id, ["ws-personal"])
+
+        # Simulate a concurrent transaction taking the slug after the check
+        with patch.object(
+            workspace_db, "generate_unique_slug", return_value="ws-personal"
+        ):
+            workspace = await workspace_db.create_with_unique_slug(
+                db_session, _workspace_data(test_user.id), base_name="Personal"
+            )
+
+        assert SUFFIXED.match(workspace.slug)
+        # The failed insert only rolled back its savepoint
+        assert await workspace_db.exists(db_session, {"slug": "ws-personal"})
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_attempts(
+        self, db_session: AsyncSession, test_user
+    ):
+        await _insert_slugs(db_session, test_user.id, ["ws-personal"])
+
+        with (
+            patch.object(
+                workspace_db, "generate_unique_slug", return_value="ws-personal"
+            ),
+            patch.object(workspace_db, "_suffixed_slug", return_value="ws-personal"),
+        ):
+            with pytest.raises(DatabaseException, match="unique workspace slug"):
+                await workspace_db.create_with_unique_slug(
+                    db_session, _workspace_data(test_user.id), base_name="Personal"
+                )
+
+    @pytest.mark.asyncio
+    async def test_other_integrity_errors_are_not_retried(
+        self, db_session: AsyncSession
+    ):
+        with patch.object(
+            workspace_db, "_suffixed_slug", wraps=workspace_db._suffixed_slug
+        ) as mock_suffixed:
+            with pytest.raises(DatabaseException):
+                await workspace_db.create_with_unique_slug(
+                    db_session, _workspace_data(uuid4()), base_name="Personal"
+                )
+
+        mock_suffixed.assert_not_called()
+
+
+class TestSlugQueryCost:
+    """Probing cost grows with taken slugs; the allocator stays at one query."""
+
+    TAKEN = 200
+
+    @pytest.mark.asyncio
+    async def test_one_query_for_a_popular_base_name(
+        self, db_session: AsyncSession, test_user, statement_counter
+    ):
+        await _insert_slugs(
+            db_session,
+            test_user.id,
+            ["ws-personal"] + [f"ws-personal-{i}" for i in range(1, self.TAKEN)],
+        )
+
+        with statement_counter() as probing:
+            await _probing_slug(db_session, "Personal")
+        with statement_counter() as taken:
+            slug = await workspace_db.generate_unique_slug(db_session, "Personal")
+        with statement_counter() as free:
+            await workspace_db.generate_unique_slug(db_session, uuid4().hex)
+
+        assert probing.count > self.TAKEN
+        assert taken.count == 1 and free.count == 1
+        assert SUFFIXED.match(slug)
@@ -0,0 +1,129 @@
+"""
+Integration tests for Career usage router.
+
+Endpoints tested:
+- GET /career/usage/summary — usage summary served from rollup tables
+
+Run all tests:
+    pytest tests/apps/cubex_career/routers/test_usage.py -v
+
+Run with coverage:
+    pytest tests/apps/cubex_career/routers/test_usage.py \
+        --cov=app.apps.cubex_career.routers.usage --cov-report=term-missing -v
+"""
+
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.enums import FeatureKey
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture
+async def pending_usage_log(db_session: AsyncSession, test_user, career_subscription):
+    """Create a PENDING CareerUsageLog for test_user."""
+    from app.apps.cubex_career.db.models import CareerUsageLog
+    from app.core.enums import AccessStatus, UsageLogStatus
+
+    usage_log = CareerUsageLog(
+        id=uuid4(),
+        user_id=test_user.id,
+        subscription_id=career_subscription.id,
+        request_id=str(uuid4()),
+        feature_key=FeatureKey.CAREER_JOB_MATCH,
+        fingerprint_hash="c" * 64,
+        access_status=AccessStatus.GRANTED,
+        endpoint="/test/job-match",
+        method="POST",
+        credits_reserved=Decimal("1.00"),
+        status=UsageLogStatus.PENDING,
+    )
+    db_session.add(usage_log)
+    await db_session.flush()
+    return usage_log
+
+
+class TestUsageRouterSetup:
+
+    def test_usage_router_export(self):
+        from app.apps.cubex_career.routers import usage_router
+
+        assert usage_router.prefix == "/usage"
+
+    def test_usage_router_has_summary_endpoint(self):
+        from app.apps.cubex_career.routers.usage import router
+
+        paths = [r.path for r in router.routes if hasattr(r, "path")]  # type: ignore[attr-defined]
+        assert "/usage/summary" in paths
+
+
+class TestUsageSummary:
+    """Tests for GET /career/usage/summary"""
+
+    @pytest.mark.asyncio
+    async def test_unauthenticated_returns_401(self, client: AsyncClient):
+        response = await client.get("/career/usage/summary")
+        assert response.status_code == 401
+
+    @pytest.mark.asyncio
+    async def test_empty_summary(self, authenticated_client: AsyncClient):
+        response = await authenticated_client.get("/career/usage/summary")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["totals"]["request_count"] == 0
+        assert data["series"] == []
+
+    @pytest.mark.asyncio
+    async def test_committed_usage_is_summarised_once(
+        self,
+        authenticated_client: AsyncClient,
+        db_session: AsyncSession,
+        test_user,
+        pending_usage_log,
+    ):
+        from app.apps.cubex_career.services.quota import career_quota_service
+
+        for _ in range(2):
+            await career_quota_service.commit_usage(
+                db_session,
+                test_user.id,
+                pending_usage_log.id,
+                success=True,
+                metrics={"input_tokens": 50, "output_tokens": 20, "latency_ms": 80},
+                commit_self=False,
+            )
+
+        response = await authenticated_client.get(
+            "/career/usage/summary",
+            params={"feature_key": FeatureKey.CAREER_JOB_MATCH.value},
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["totals"]["request_count"] == 1
+        assert float(data["totals"]["credits_charged"]) == 1.0
+        assert data["totals"]["output_tokens"] == 20
+        assert data["by_feature"][0]["feature_key"] == "career.job_match"
+
+    @pytest.mark.asyncio
+    async def test_hour_window_too_large_returns_400(
+        self, authenticated_client: AsyncClient
+    ):
+        response = await authenticated_client.get(
+            "/career/usage/summary",
+            params={
+                "granularity": "hour",
+                "start": "2026-01-01T00:00:00Z",
+                "end": "2026-03-01T00:00:00Z",
+            },
+        )
+
+        assert response.status_code == 400
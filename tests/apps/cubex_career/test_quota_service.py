@@ -29,7 +29,7 @@ from uuid import uuid4
 import pytest
 from pydantic import ValidationError
 
-from app.core.enums import AccessStatus, FailureType, FeatureKey
+from app.core.enums import AccessStatus, FailureType, FeatureKey, UsageLogStatus
 
 
 class TestRateLimitInfoDataclass:
@@ -1138,6 +1138,7 @@ class TestCommitUsage:
         mock_log = AsyncMock()
         mock_log.user_id = user_id
         mock_log.is_deleted = False
+        mock_log.status = UsageLogStatus.PENDING
 
         mock_committed = AsyncMock()
         mock_committed.credits_charged = Decimal("1.50")
@@ -1166,6 +1167,10 @@ class TestCommitUsage:
                 "app.apps.cubex_career.services.quota.career_subscription_context_db.increment_credits_used",
                 new_callable=AsyncMock,
             ) as mock_increment,
+            patch(
+                "app.apps.cubex_career.services.quota.career_usage_rollup_db.record",
+                new_callable=AsyncMock,
+            ),
         ):
             ok, msg = await service.commit_usage(
                 mock_session, user_id, usage_id, success=True, commit_self=False
@@ -26,7 +26,7 @@ from sqlalchemy.ext.asyncio import (
     AsyncSession,
     create_async_engine,
 )
-from sqlalchemy import select
+from sqlalchemy import event, select
 
 
 def create_test_access_token(user) -> str:
@@ -92,6 +92,16 @@ def _reset_singletons():
 
     reset_hooks()
 
+    # Rate limit policy counters (memory backend)
+    from app.core.services.rate_limit import reset_policies
+
+    reset_policies()
+
+    # In-process user snapshot cache
+    from app.core.services.user_cache import user_cache
+
+    user_cache.clear()
+
 
 @pytest.fixture(scope="session")
 def event_loop_policy():
@@ -262,6 +272,37 @@ async def db_session() -> AsyncGenerator[AsyncSession, None]:
         await engine.dispose()
 
 
+class StatementCounter:
+    """Count statements sent to the database through a session's engine."""
+
+    def __init__(self, session: AsyncSession):
+        self.engine = session.get_bind().engine
+        self.count = 0
+
+    def _on_execute(self, *args, **kwargs):
+        self.count += 1
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
+
+
+@pytest.fixture
+def statement_counter(db_session: AsyncSession):
+    """Count statements sent through ``db_session``.
+
+    Usage::
+
+        with statement_counter() as counter:
+            ...
+        assert counter.count == 1
+    """
+    return lambda: StatementCounter(db_session)
+
+
 @pytest.fixture
 def app():
     """Create FastAPI application for testing."""
@@ -278,13 +319,14 @@ async def client(app, db_session: AsyncSession) -> AsyncGenerator[AsyncClient, N
     session as the test fixtures. This allows tests to set up data
     that the app can see within the same transaction.
     """
-    from app.core.dependencies import get_async_session
+    from app.core.dependencies import get_async_session, get_read_session
 
     # Override to yield the test session (no transaction management here)
     async def override_get_session():
         yield db_session
 
     app.dependency_overrides[get_async_session] = override_get_session
+    app.dependency_overrides[get_read_session] = override_get_session
 
     try:
         async with AsyncClient(
@@ -294,6 +336,7 @@ async def client(app, db_session: AsyncSession) -> AsyncGenerator[AsyncClient, N
             yield ac
     finally:
         app.dependency_overrides.pop(get_async_session, None)
+        app.dependency_overrides.pop(get_read_session, None)
 
 
 @pytest.fixture(autouse=True)
@@ -363,10 +406,6 @@ def mock_email_service():
             "app.infrastructure.messaging.publisher.publish_event",
             side_effect=mock_publish_event,
         ),
-        patch(
-            "app.infrastructure.messaging.handlers.stripe.publish_event",
-            side_effect=mock_publish_event,
-        ),
     ):
         yield
 
@@ -14,7 +14,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from app.core.db.crud import plan_db
+from app.core.db.crud import ReturnStrategy, plan_db
 from app.core.enums import PlanType, ProductType
 from app.core.exceptions.types import DatabaseException
 
@@ -213,3 +213,76 @@ class TestBaseDBUpsertTimestamps:
 
             assert created is False
             assert plan.updated_at > plan.created_at
+
+
+class TestBaseDBReturnStrategy:
+
+    @pytest.mark.asyncio
+    async def test_create_refreshes_by_default(self):
+        mock_session = AsyncMock()
+        mock_session.add = MagicMock()
+
+        await plan_db.create(mock_session, {"name": "Plan"}, commit_self=False)
+
+        mock_session.refresh.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_create_without_refresh(self):
+        mock_session = AsyncMock()
+        mock_session.add = MagicMock()
+
+        await plan_db.create(
+            mock_session,
+            {"name": "Plan"},
+            commit_self=False,
+            return_strategy=ReturnStrategy.NONE,
+        )
+
+        mock_session.flush.assert_awaited_once()
+        mock_session.refresh.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_create_returning_loads_only_unloaded_columns(self):
+        mock_session = AsyncMock()
+        mock_session.add = MagicMock()
+
+        with patch(
+            "app.core.db.crud.base.sa_inspect",
+            return_value=MagicMock(
+                unloaded={"description"},
+                mapper=MagicMock(
+                    column_attrs=[MagicMock(key="name"), MagicMock(key="description")]
+                ),
+            ),
+        ):
+            await plan_db.create(
+                mock_session,
+                {"name": "Plan"},
+                commit_self=False,
+                return_strategy=ReturnStrategy.RETURNING,
+            )
+
+        mock_session.refresh.assert_awaited_once()
+        assert mock_session.refresh.call_args.kwargs == {
+            "attribute_names": ["description"]
+        }
+
+    @pytest.mark.asyncio
+    async def test_upsert_returning_skips_refresh(self):
+        mock_session = AsyncMock()
+        mock_plan = MagicMock()
+        mock_plan.created_at = mock_plan.updated_at = datetime.now(timezone.utc)
+        mock_result = MagicMock()
+        mock_result.scalar_one.return_value = mock_plan
+        mock_session.execute.return_value = mock_result
+
+        plan, created = await plan_db.upsert(
+            session=mock_session,
+            data={"name": "Plan", "product_type": ProductType.API},
+            unique_fields=["name", "product_type"],
+            return_strategy=ReturnStrategy.RETURNING,
+        )
+
+        assert plan is mock_plan
+        assert created is True
+        mock_session.refresh.assert_not_called()
@@ -0,0 +1,384 @@
+"""
+Test suite for BaseDB set-based bulk operations.
+
+- bulk_insert_returning: multi-row INSERT ... RETURNING
+- bulk_upsert: multi-row INSERT ... ON CONFLICT DO UPDATE
+- bulk_update_by_pk: UPDATE ... FROM (VALUES ...)
+- copy_insert: asyncpg COPY ingest
+- Statement counts of the set-based paths vs the per-row ORM path
+
+Run all tests:
+    pytest tests/core/db/crud/test_bulk_ops.py -v
+
+Run with coverage:
+    pytest tests/core/db/crud/test_bulk_ops.py --cov=app.core.db.crud.base --cov-report=term-missing -v
+"""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.db.crud import dlq_message_db
+from app.core.db.crud.base import MAX_BIND_PARAMS
+from app.core.db.crud.usage_rollup import LATENCY_HISTOGRAM_SIZE
+from app.core.db.models import DLQMessage
+from app.core.enums import DLQMessageStatus, FeatureKey, UsageRollupGranularity
+from app.core.exceptions.types import DatabaseException
+
+
+def _dlq_rows(count: int, queue: str = "bulk_test_dead") -> list[dict]:
+    return [
+        {
+            "queue_name": queue,
+            "message_body": f'{{"n": {i}}}',
+            "error_message": None,
+            "headers": {"x-original-queue": queue[: -len("_dead")], "n": i},
+            "attempt_count": i % 3,
+        }
+        for i in range(count)
+    ]
+
+
+BUCKET = datetime(2026, 3, 1, tzinfo=timezone.utc)
+ROLLUP_KEY = ["workspace_id", "feature_key", "granularity", "bucket_start"]
+
+
+def _rollup_row(workspace_id, hour: int = 0, **counters) -> dict:
+    return {
+        "workspace_id": workspace_id,
+        "feature_key": FeatureKey.API_JOB_MATCH,
+        "granularity": UsageRollupGranularity.HOUR,
+        "bucket_start": BUCKET + timedelta(hours=hour),
+        "latency_histogram": [0] * LATENCY_HISTOGRAM_SIZE,
+        **counters,
+    }
+
+
+class TestChunking:
+
+    def test_chunks_respect_bind_parameter_limit(self):
+        rows = [{f"c{i}": i for i in range(10)} for _ in range(10_000)]
+
+        chunks = list(dlq_message_db._chunks(rows, None))
+
+        assert all(len(chunk) * 10 <= MAX_BIND_PARAMS for chunk in chunks)
+        assert sum(len(chunk) for chunk in chunks) == 10_000
+
+    def test_explicit_chunk_size_is_capped(self):
+        rows = [{"a": i} for i in range(25)]
+
+        chunks = list(dlq_message_db._chunks(rows, 10))
+
+        assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+
+    def test_prepare_fills_column_defaults(self):
+        now = datetime.now(timezone.utc)
+        rows = dlq_message_db._prepare_bulk_rows(
+            [{"queue_name": "q", "message_body": "{}"}], now
+        )
+
+        assert rows[0]["id"] is not None
+        assert rows[0]["status"] == DLQMessageStatus.PENDING
+        assert rows[0]["attempt_count"] == 0
+        assert rows[0]["created_at"] == rows[0]["updated_at"] == now
+
+    def test_prepare_rejects_mixed_columns(self):
+        with pytest.raises(ValueError):
+            dlq_message_db._prepare_bulk_rows(
+                [
+                    {"queue_name": "q", "message_body": "{}"},
+                    {"queue_name": "q", "message_body": "{}", "error_message": "x"},
+                ],
+                datetime.now(timezone.utc),
+            )
+
+
+class TestBulkInsertReturning:
+
+    @pytest.mark.asyncio
+    async def test_empty_rows_is_noop(self):
+        mock_session = AsyncMock()
+
+        assert await dlq_message_db.bulk_insert_returning(mock_session, []) == []
+        mock_session.execute.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_inserts_and_returns_instances(self, db_session: AsyncSession):
+        rows = _dlq_rows(5)
+
+        messages = await dlq_message_db.bulk_insert_returning(
+            db_session, rows, commit_self=False
+        )
+
+        assert len(messages) == 5
+        assert [m.headers["n"] for m in messages] == [0, 1, 2, 3, 4]
+        assert all(m.status == DLQMessageStatus.PENDING for m in messages)
+
+    @pytest.mark.asyncio
+    async def test_chunks_large_inputs(
+        self, db_session: AsyncSession, statement_counter
+    ):
+        with statement_counter() as counter:
+            messages = await dlq_message_db.bulk_insert_returning(
+                db_session, _dlq_rows(25), commit_self=False, chunk_size=10
+            )
+
+        assert len(messages) == 25
+        assert counter.count == 3
+
+    @pytest.mark.asyncio
+    async def test_wraps_integrity_errors(self, db_session: AsyncSession):
+        rows = _dlq_rows(1)
+        rows[0]["queue_name"] = None
+
+        with pytest.raises(DatabaseException):
+            await dlq_message_db.bulk_insert_returning(
+                db_session, rows, commit_self=False
+            )
+
+
+class TestBulkUpsert:
+
+    @pytest.mark.asyncio
+    async def test_missing_unique_field_raises(self):
+        from app.apps.cubex_api.db.crud import workspace_usage_rollup_db
+
+        with pytest.raises(ValueError, match="bucket_start"):
+            await workspace_usage_rollup_db.bulk_upsert(
+                AsyncMock(),
+                [{"workspace_id": None, "feature_key": None, "granularity": None}],
+                unique_fields=ROLLUP_KEY,
+            )
+
+    @pytest.mark.asyncio
+    async def test_duplicate_conflict_keys_raise(self):
+        from app.apps.cubex_api.db.crud import workspace_usage_rollup_db
+
+        row = _rollup_row(None)
+        with pytest.raises(ValueError, match="Duplicate conflict key"):
+            await workspace_usage_rollup_db.bulk_upsert(
+                AsyncMock(), [row, dict(row)], unique_fields=ROLLUP_KEY
+            )
+
+    @pytest.mark.asyncio
+    async def test_inserts_then_updates(self, db_session: AsyncSession, test_workspace):
+        from app.apps.cubex_api.db.crud import workspace_usage_rollup_db
+
+        first = await workspace_usage_rollup_db.bulk_upsert(
+            db_session,
+            [
+                _rollup_row(test_workspace.id, 0, request_count=1),
+                _rollup_row(test_workspace.id, 1, request_count=1),
+            ],
+            unique_fields=ROLLUP_KEY,
+            commit_self=False,
+        )
+        assert all(r.created_at == r.updated_at for r in first)
+
+        second = await workspace_usage_rollup_db.bulk_upsert(
+            db_session,
+            [
+                _rollup_row(test_workspace.id, 0, request_count=3),
+                _rollup_row(test_workspace.id, 2, request_count=1),
+            ],
+            unique_fields=ROLLUP_KEY,
+            increment_fields=["request_count"],
+            commit_self=False,
+        )
+
+        existing, inserted = second
+        assert existing.id == first[0].id
+        assert existing.request_count == 4
+        assert existing.created_at != existing.updated_at
+        assert inserted.created_at == inserted.updated_at
+
+    @pytest.mark.asyncio
+    async def test_defaults_do_not_overwrite_existing_values(
+        self, db_session: AsyncSession, test_workspace
+    ):
+        from app.apps.cubex_api.db.crud import workspace_usage_rollup_db
+
+        await workspace_usage_rollup_db.bulk_upsert(
+            db_session,
+            [_rollup_row(test_workspace.id, request_count=5, success_count=5)],
+            unique_fields=ROLLUP_KEY,
+            commit_self=False,
+        )
+
+        # request_count is not provided, so its column default must not win
+        (row,) = await workspace_usage_rollup_db.bulk_upsert(
+            db_session,
+            [_rollup_row(test_workspace.id, success_count=2)],
+            unique_fields=ROLLUP_KEY,
+            commit_self=False,
+        )
+
+        assert row.request_count == 5
+        assert row.success_count == 2
+
+
+class TestBulkUpdateByPk:
+
+    @pytest.mark.asyncio
+    async def test_requires_id(self):
+        with pytest.raises(ValueError, match="'id'"):
+            await dlq_message_db.bulk_update_by_pk(
+                AsyncMock(), [{"status": DLQMessageStatus.RETRIED}]
+            )
+
+    @pytest.mark.asyncio
+    async def test_updates_each_row_with_its_own_values(self, db_session: AsyncSession):
+        messages = await dlq_message_db.bulk_insert_returning(
+            db_session, _dlq_rows(3), commit_self=False
+        )
+
+        updated = await dlq_message_db.bulk_update_by_pk(
+            db_session,
+            [
+                {
+                    "id": m.id,
+                    "status": DLQMessageStatus.RETRIED,
+                    "attempt_count": 10 + i,
+                    "error_message": None if i == 0 else f"err {i}",
+                }
+                for i, m in enumerate(messages)
+            ],
+            commit_self=False,
+        )
+
+        assert updated == 3
+        result = await db_session.execute(
+            select(
+                DLQMessage.status, DLQMessage.attempt_count, DLQMessage.error_message
+            )
+            .where(DLQMessage.id.in_([m.id for m in messages]))
+            .order_by(DLQMessage.attempt_count)
+        )
+        assert result.all() == [
+            (DLQMessageStatus.RETRIED, 10, None),
+            (DLQMessageStatus.RETRIED, 11, "err 1"),
+            (DLQMessageStatus.RETRIED, 12, "err 2"),
+        ]
+
+
+class TestCopyInsert:
+
+    @pytest.mark.asyncio
+    async def test_copies_rows_in_session_transaction(self, db_session: AsyncSession):
+        savepoint = await db_session.begin_nested()
+        count = await dlq_message_db.copy_insert(
+            db_session, _dlq_rows(20, queue="copy_test_dead"), commit_self=False
+        )
+
+        assert count == 20
+        messages = await dlq_message_db.get_all(
+            db_session, filters=[DLQMessage.queue_name == "copy_test_dead"], limit=100
+        )
+        assert len(messages) == 20
+        # Enum and JSON columns are encoded exactly as the ORM encodes them
+        assert all(m.status == DLQMessageStatus.PENDING for m in messages)
+        assert {m.headers["n"] for m in messages} == set(range(20))
+
+        # Rolled back together with the surrounding transaction
+        await savepoint.rollback()
+        total = await db_session.scalar(
+            select(func.count())
+            .select_from(DLQMessage)
+            .where(DLQMessage.queue_name == "copy_test_dead")
+        )
+        assert total == 0
+
+    @pytest.mark.asyncio
+    async def test_driver_errors_are_wrapped(self, db_session: AsyncSession):
+        rows = _dlq_rows(2, queue="copy_test_dead")
+        rows[1]["queue_name"] = None
+
+        savepoint = await db_session.begin_nested()
+        with pytest.raises(DatabaseException, match="Error copying DLQMessage"):
+            await dlq_message_db.copy_insert(db_session, rows, commit_self=False)
+        await savepoint.rollback()
+
+    @pytest.mark.asyncio
+    async def test_falls_back_without_copy_support(self, db_session: AsyncSession):
+        with (
+            patch.object(
+                dlq_message_db,
+                "bulk_insert_returning",
+                wraps=dlq_message_db.bulk_insert_returning,
+            ) as fallback,
+            patch(
+                "sqlalchemy.ext.asyncio.AsyncConnection.get_raw_connection",
+                AsyncMock(
+                    return_value=type("Raw", (), {"driver_connection": object()})()
+                ),
+            ),
+        ):
+            count = await dlq_message_db.copy_insert(
+                db_session, _dlq_rows(2), commit_self=False
+            )
+
+        assert count == 2
+        fallback.assert_awaited_once()
+
+
+class TestBulkOpsQueryCost:
+    """The set-based paths issue far fewer statements than the per-row ORM path."""
+
+    ROWS = 1_000
+
+    @pytest.mark.asyncio
+    async def test_bulk_insert_statement_counts(
+        self, db_session: AsyncSession, statement_counter
+    ):
+        with statement_counter() as per_row:
+            await dlq_message_db.bulk_create(
+                db_session,
+                [DLQMessage(**row) for row in _dlq_rows(self.ROWS, "bench_a_dead")],
+                commit_self=False,
+            )
+        with statement_counter() as returning:
+            await dlq_message_db.bulk_insert_returning(
+                db_session, _dlq_rows(self.ROWS, "bench_b_dead"), commit_self=False
+            )
+        with statement_counter() as copy:
+            await dlq_message_db.copy_insert(
+                db_session, _dlq_rows(self.ROWS, "bench_c_dead"), commit_self=False
+            )
+
+        assert returning.count < per_row.count
+        assert copy.count < per_row.count
+
+    @pytest.mark.asyncio
+    async def test_bulk_upsert_statement_counts(
+        self, db_session: AsyncSession, test_workspace, statement_counter
+    ):
+        from app.apps.cubex_api.db.crud import workspace_usage_rollup_db
+
+        rows = [
+            _rollup_row(test_workspace.id, hour, request_count=1) for hour in range(200)
+        ]
+
+        with statement_counter() as per_row:
+            for row in rows:
+                await workspace_usage_rollup_db.upsert(
+                    db_session,
+                    row,
+                    unique_fields=ROLLUP_KEY,
+                    increment_fields=["request_count"],
+                    commit_self=False,
+                )
+        with statement_counter() as bulk:
+            result = await workspace_usage_rollup_db.bulk_upsert(
+                db_session,
+                rows,
+                unique_fields=ROLLUP_KEY,
+                increment_fields=["request_count"],
+                commit_self=False,
+            )
+
+        assert per_row.count >= len(rows)
+        assert bulk.count == 1
+        assert all(r.request_count == 2 for r in result)
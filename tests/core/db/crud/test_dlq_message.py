@@ -0,0 +1,137 @@
+"""
+Test suite for the DLQ message CRUD used by bulk retries.
+
+Run all tests:
+    pytest tests/core/db/crud/test_dlq_message.py -v
+
+Run with coverage:
+    pytest tests/core/db/crud/test_dlq_message.py --cov=app.core.db.crud.dlq_message --cov-report=term-missing -v
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.db.crud import dlq_message_db
+from app.core.enums import DLQMessageStatus
+
+T0 = datetime(2026, 5, 1, 12, tzinfo=timezone.utc)
+
+
+async def _insert(db_session: AsyncSession, rows: list[dict]):
+    return await dlq_message_db.bulk_insert_returning(
+        db_session,
+        [
+            {
+                "message_body": "{}",
+                "error_message": None,
+                "headers": {},
+                "attempt_count": 0,
+                "created_at": T0,
+                **row,
+            }
+            for row in rows
+        ],
+        commit_self=False,
+    )
+
+
+class TestGetPendingPage:
+
+    @pytest.mark.asyncio
+    async def test_keyset_pages_cover_all_rows_once(self, db_session: AsyncSession):
+        inserted = await _insert(
+            db_session,
+            [
+                {"queue_name": "page_test_dead", "created_at": T0 + timedelta(s)}
+                for s in (0, 0, 0, 1, 2)
+            ],
+        )
+
+        seen = []
+        cursor = None
+        while True:
+            page = await dlq_message_db.get_pending_page(
+                db_session, limit=2, queue_name="page_test_dead", after=cursor
+            )
+            if not page:
+                break
+            seen.extend(page)
+            cursor = (page[-1].created_at, page[-1].id)
+
+        assert sorted(m.id for m in seen) == sorted(m.id for m in inserted)
+        assert [m.created_at for m in seen] == sorted(m.created_at for m in seen)
+
+    @pytest.mark.asyncio
+    async def test_filters(self, db_session: AsyncSession):
+        match, *_ = await _insert(
+            db_session,
+            [
+                {
+                    "queue_name": "filter_test_dead",
+                    "error_message": "Stripe API Timeout",
+                    "created_at": T0 + timedelta(minutes=5),
+                },
+                # Wrong error
+                {
+                    "queue_name": "filter_test_dead",
+                    "error_message": "card declined",
+                    "created_at": T0 + timedelta(minutes=5),
+                },
+                # Outside the window
+                {
+                    "queue_name": "filter_test_dead",
+                    "error_message": "timeout",
+                    "created_at": T0 + timedelta(hours=2),
+                },
+                # Other queue
+                {
+                    "queue_name": "other_test_dead",
+                    "error_message": "timeout",
+                    "created_at": T0 + timedelta(minutes=5),
+                },
+                # Already handled
+                {
+                    "queue_name": "filter_test_dead",
+                    "error_message": "timeout",
+                    "created_at": T0 + timedelta(minutes=5),
+                    "status": DLQMessageStatus.RETRIED,
+                },
+            ],
+        )
+
+        page = await dlq_message_db.get_pending_page(
+            db_session,
+            limit=10,
+            # The original queue name resolves to its DLQ
+            queue_name="filter_test",
+            error_pattern="timeout",
+            since=T0,
+            until=T0 + timedelta(hours=1),
+        )
+
+        assert [m.id for m in page] == [match.id]
+
+
+class TestBulkMarkRetried:
+
+    @pytest.mark.asyncio
+    async def test_marks_only_pending_rows(self, db_session: AsyncSession):
+        pending, done = await _insert(
+            db_session,
+            [
+                {"queue_name": "mark_test_dead"},
+                {"queue_name": "mark_test_dead", "status": DLQMessageStatus.DISCARDED},
+            ],
+        )
+
+        updated = await dlq_message_db.bulk_mark_retried(
+            db_session, [pending.id, done.id], commit_self=False
+        )
+
+        assert updated == 1
+        await db_session.refresh(pending)
+        await db_session.refresh(done)
+        assert pending.status == DLQMessageStatus.RETRIED
+        assert done.status == DLQMessageStatus.DISCARDED
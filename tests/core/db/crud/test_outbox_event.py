@@ -0,0 +1,190 @@
+"""
+Test suite for the transactional outbox CRUD.
+
+Run all tests:
+    pytest tests/core/db/crud/test_outbox_event.py -v
+
+Run with coverage:
+    pytest tests/core/db/crud/test_outbox_event.py --cov=app.core.db.crud.outbox_event --cov-report=term-missing -v
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.db.crud import outbox_event_db
+
+T0 = datetime(2026, 5, 1, 12, tzinfo=timezone.utc)
+
+
+async def _insert(db_session: AsyncSession, rows: list[dict]):
+    return await outbox_event_db.bulk_insert_returning(
+        db_session,
+        [
+            {
+                "queue_name": "otp_emails",
+                "payload": {"n": i},
+                "headers": None,
+                "attempts": 0,
+                "last_error": None,
+                "published_at": None,
+                "next_attempt_at": None,
+                "created_at": T0 + timedelta(seconds=i),
+                **row,
+            }
+            for i, row in enumerate(rows)
+        ],
+        commit_self=False,
+    )
+
+
+class TestClaimBatch:
+
+    @pytest.mark.asyncio
+    async def test_returns_oldest_pending_first(self, db_session: AsyncSession):
+        events = await _insert(db_session, [{}, {}, {}])
+
+        claimed = await outbox_event_db.claim_batch(db_session, limit=2)
+
+        assert [e.id for e in claimed] == [events[0].id, events[1].id]
+
+    @pytest.mark.asyncio
+    async def test_skips_published_events(self, db_session: AsyncSession):
+        events = await _insert(db_session, [{"published_at": T0}, {}])
+
+        claimed = await outbox_event_db.claim_batch(db_session, limit=10)
+
+        assert [e.id for e in claimed] == [events[1].id]
+
+    @pytest.mark.asyncio
+    async def test_skips_backing_off_and_exhausted_events(
+        self, db_session: AsyncSession
+    ):
+        now = datetime.now(timezone.utc)
+        events = await _insert(
+            db_session,
+            [
+                {"attempts": 1, "next_attempt_at": now + timedelta(minutes=5)},
+                {"attempts": 3, "next_attempt_at": now - timedelta(seconds=1)},
+                {"attempts": 5},
+                {},
+            ],
+        )
+
+        claimed = await outbox_event_db.claim_batch(
+            db_session, limit=10, max_attempts=5
+        )
+
+        assert [e.id for e in claimed] == [events[1].id, events[3].id]
+
+
+class TestMarkPublished:
+
+    @pytest.mark.asyncio
+    async def test_sets_published_at(self, db_session: AsyncSession):
+        events = await _insert(db_session, [{"last_error": "boom"}, {}])
+
+        updated = await outbox_event_db.mark_published(
+            db_session, [events[0].id], commit_self=False
+        )
+
+        assert updated == 1
+        await db_session.refresh(events[0])
+        assert events[0].published_at is not None
+        assert events[0].last_error is None
+        assert [e.id for e in await outbox_event_db.claim_batch(db_session, 10)] == [
+            events[1].id
+        ]
+
+
+class TestRecordFailure:
+
+    @pytest.mark.asyncio
+    async def test_counts_attempts_and_keeps_event_pending(
+        self, db_session: AsyncSession
+    ):
+        (event,) = await _insert(db_session, [{}])
+
+        await outbox_event_db.record_failure(
+            db_session, [event.id], "broker down", commit_self=False
+        )
+        await outbox_event_db.record_failure(
+            db_session, [event.id], "still down", commit_self=False
+        )
+
+        await db_session.refresh(event)
+        assert event.attempts == 2
+        assert event.last_error == "still down"
+        assert event.published_at is None
+
+    @pytest.mark.asyncio
+    async def test_backs_off_exponentially_up_to_cap(self, db_session: AsyncSession):
+        first, second, third = await _insert(
+            db_session, [{"attempts": 0}, {"attempts": 3}, {"attempts": 12}]
+        )
+
+        before = await db_session.scalar(select(func.now()))
+        await outbox_event_db.record_failure(
+            db_session,
+            [first.id, second.id, third.id],
+            "broker down",
+            max_backoff_seconds=60,
+            commit_self=False,
+        )
+
+        delays = []
+        for event in (first, second, third):
+            await db_session.refresh(event)
+            delays.append((event.next_attempt_at - before).total_seconds())
+        assert delays == [1, 8, 60]
+        assert [first.attempts, second.attempts, third.attempts] == [1, 4, 13]
+
+
+class TestPurgePublished:
+
+    @pytest.mark.asyncio
+    async def test_deletes_only_old_published_events(self, db_session: AsyncSession):
+        old, recent, pending = await _insert(
+            db_session,
+            [
+                {"published_at": T0 - timedelta(days=5)},
+                {"published_at": T0},
+                {},
+            ],
+        )
+
+        purged = await outbox_event_db.purge_published(
+            db_session, before=T0 - timedelta(days=1), commit_self=False
+        )
+
+        assert purged == 1
+        assert await outbox_event_db.get_by_id(db_session, old.id) is None
+        assert await outbox_event_db.get_by_id(db_session, recent.id) is not None
+        assert await outbox_event_db.get_by_id(db_session, pending.id) is not None
+
+
+class TestBacklog:
+
+    @pytest.mark.asyncio
+    async def test_counts_pending_and_oldest(self, db_session: AsyncSession):
+        await _insert(db_session, [{"published_at": T0}, {}, {}])
+
+        pending, oldest = await outbox_event_db.backlog(db_session)
+
+        assert pending == 2
+        assert oldest == T0 + timedelta(seconds=1)
+
+    @pytest.mark.asyncio
+    async def test_empty(self, db_session: AsyncSession):
+        assert await outbox_event_db.backlog(db_session) == (0, None)
+
+    @pytest.mark.asyncio
+    async def test_counts_exhausted_events(self, db_session: AsyncSession):
+        await _insert(
+            db_session,
+            [{"attempts": 5}, {"attempts": 5, "published_at": T0}, {"attempts": 4}],
+        )
+
+        assert await outbox_event_db.count_exhausted(db_session, max_attempts=5) == 1
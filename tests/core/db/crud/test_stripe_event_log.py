@@ -0,0 +1,42 @@
+"""
+Test suite for the Stripe event log CRUD.
+
+Run all tests:
+    pytest tests/core/db/crud/test_stripe_event_log.py -v
+
+Run with coverage:
+    pytest tests/core/db/crud/test_stripe_event_log.py --cov=app.core.db.crud.subscription --cov-report=term-missing -v
+"""
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.db.crud import stripe_event_log_db
+
+
+class TestRecordEvent:
+
+    @pytest.mark.asyncio
+    async def test_logs_new_event(self, db_session: AsyncSession):
+        logged = await stripe_event_log_db.record_event(
+            db_session, "evt_new", "invoice.paid", commit_self=False
+        )
+
+        assert logged is True
+        assert await stripe_event_log_db.is_event_processed(db_session, "evt_new")
+
+    @pytest.mark.asyncio
+    async def test_duplicate_event_is_not_logged_twice(self, db_session: AsyncSession):
+        await stripe_event_log_db.record_event(
+            db_session, "evt_dup", "invoice.paid", commit_self=False
+        )
+
+        logged = await stripe_event_log_db.record_event(
+            db_session, "evt_dup", "invoice.paid", commit_self=False
+        )
+
+        assert logged is False
+        rows = await stripe_event_log_db.get_by_filters(
+            db_session, {"event_id": "evt_dup"}
+        )
+        assert len(rows) == 1
@@ -0,0 +1,332 @@
+"""
+Test suite for the set-based usage log commit path.
+
+Covers UsageLogBaseDB.commit_many and the batch commit services built on
+it (QuotaService.commit_usage_batch, CareerQuotaService.commit_usage_batch).
+
+Run all tests:
+    pytest tests/core/db/crud/test_usage_log.py -v
+
+Run with coverage:
+    pytest tests/core/db/crud/test_usage_log.py --cov=app.core.db.crud.usage_log --cov-report=term-missing -v
+"""
+
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.db.crud import UsageLogCommit
+from app.core.enums import AccessStatus, FeatureKey, UsageLogStatus
+
+
+async def _api_usage_log(
+    db_session: AsyncSession,
+    api_key,
+    credits: str = "1.00",
+    status: UsageLogStatus = UsageLogStatus.PENDING,
+):
+    from app.apps.cubex_api.db.models import UsageLog
+
+    usage_log = UsageLog(
+        id=uuid4(),
+        api_key_id=api_key.id,
+        workspace_id=api_key.workspace_id,
+        request_id=str(uuid4()),
+        feature_key=FeatureKey.API_JOB_MATCH,
+        fingerprint_hash="a" * 64,
+        access_status=AccessStatus.GRANTED,
+        endpoint="/test/job-match",
+        method="POST",
+        credits_reserved=Decimal(credits),
+        status=status,
+    )
+    db_session.add(usage_log)
+    await db_session.flush()
+    return usage_log
+
+
+async def _career_usage_log(
+    db_session: AsyncSession, user, subscription, credits="1.00"
+):
+    from app.apps.cubex_career.db.models import CareerUsageLog
+
+    usage_log = CareerUsageLog(
+        id=uuid4(),
+        user_id=user.id,
+        subscription_id=subscription.id,
+        request_id=str(uuid4()),
+        feature_key=FeatureKey.CAREER_JOB_MATCH,
+        fingerprint_hash="c" * 64,
+        access_status=AccessStatus.GRANTED,
+        endpoint="/test/job-match",
+        method="POST",
+        credits_reserved=Decimal(credits),
+        status=UsageLogStatus.PENDING,
+    )
+    db_session.add(usage_log)
+    await db_session.flush()
+    return usage_log
+
+
+class TestUsageLogCommit:
+
+    def test_detail_values_from_metrics_and_failure(self):
+        commit = UsageLogCommit(
+            usage_log_id=uuid4(),
+            success=False,
+            metrics={"model_used": "gpt", "input_tokens": 3},
+            failure={"failure_type": "timeout", "reason": "slow"},
+        )
+
+        values = commit.detail_values()
+
+        assert values["model_used"] == "gpt"
+        assert values["input_tokens"] == 3
+        assert values["output_tokens"] is None
+        assert values["failure_type"] == "timeout"
+        assert values["failure_reason"] == "slow"
+
+
+class TestCommitMany:
+
+    @pytest.mark.asyncio
+    async def test_commits_pending_logs_in_one_statement(
+        self, db_session: AsyncSession, live_api_key
+    ):
+        from app.apps.cubex_api.db.crud import usage_log_db
+
+        _, api_key = live_api_key
+        ok = await _api_usage_log(db_session, api_key, credits="2.00")
+        failed = await _api_usage_log(db_session, api_key)
+
+        committed = await usage_log_db.commit_many(
+            db_session,
+            [
+                UsageLogCommit(
+                    usage_log_id=ok.id,
+                    success=True,
+                    metrics={"model_used": "m", "latency_ms": 50},
+                ),
+                UsageLogCommit(
+                    usage_log_id=failed.id,
+                    success=False,
+                    failure={"failure_type": "internal_error", "reason": "boom"},
+                ),
+            ],
+        )
+
+        by_id = {log.id: log for log in committed}
+        assert set(by_id) == {ok.id, failed.id}
+        assert by_id[ok.id].status == UsageLogStatus.SUCCESS
+        assert by_id[ok.id].credits_charged == Decimal("2.00")
+        assert by_id[ok.id].model_used == "m"
+        assert by_id[ok.id].latency_ms == 50
+        assert by_id[ok.id].committed_at is not None
+        assert by_id[failed.id].status == UsageLogStatus.FAILED
+        assert by_id[failed.id].credits_charged is None
+        assert by_id[failed.id].failure_reason == "boom"
+
+    @pytest.mark.asyncio
+    async def test_skips_logs_not_pending(self, db_session: AsyncSession, live_api_key):
+        from app.apps.cubex_api.db.crud import usage_log_db
+
+        _, api_key = live_api_key
+        done = await _api_usage_log(db_session, api_key, status=UsageLogStatus.SUCCESS)
+
+        committed = await usage_log_db.commit_many(
+            db_session,
+            [
+                UsageLogCommit(usage_log_id=done.id, success=False),
+                UsageLogCommit(usage_log_id=uuid4(), success=True),
+            ],
+        )
+
+        assert committed == []
+
+    @pytest.mark.asyncio
+    async def test_rejects_duplicate_ids(self, db_session: AsyncSession):
+        from app.apps.cubex_api.db.crud import usage_log_db
+
+        usage_id = uuid4()
+        with pytest.raises(ValueError):
+            await usage_log_db.commit_many(
+                db_session,
+                [
+                    UsageLogCommit(usage_log_id=usage_id, success=True),
+                    UsageLogCommit(usage_log_id=usage_id, success=False),
+                ],
+            )
+
+    @pytest.mark.asyncio
+    async def test_empty_batch(self, db_session: AsyncSession):
+        from app.apps.cubex_api.db.crud import usage_log_db
+
+        assert await usage_log_db.commit_many(db_session, []) == []
+
+
+class TestAPICommitUsageBatch:
+
+    @pytest.mark.asyncio
+    async def test_outcomes_and_credits(
+        self, db_session: AsyncSession, live_api_key, test_workspace
+    ):
+        from app.apps.cubex_api.services.quota import quota_service
+        from app.core.db.models import APISubscriptionContext
+
+        raw_key, api_key = live_api_key
+        first = await _api_usage_log(db_session, api_key, credits="1.50")
+        second = await _api_usage_log(db_session, api_key, credits="2.00")
+        failed = await _api_usage_log(db_session, api_key, credits="5.00")
+
+        outcomes = await quota_service.commit_usage_batch(
+            db_session,
+            [
+                (raw_key, UsageLogCommit(usage_log_id=first.id, success=True)),
+                (raw_key, UsageLogCommit(usage_log_id=second.id, success=True)),
+                (raw_key, UsageLogCommit(usage_log_id=failed.id, success=False)),
+                ("bad-key", UsageLogCommit(usage_log_id=first.id, success=True)),
+                (raw_key, UsageLogCommit(usage_log_id=uuid4(), success=True)),
+            ],
+        )
+
+        assert outcomes[0] == (True, "Usage committed as SUCCESS.")
+        assert outcomes[1] == (True, "Usage committed as SUCCESS.")
+        assert outcomes[2] == (True, "Usage committed as FAILED.")
+        assert outcomes[3][0] is True
+        assert "Invalid API key format" in outcomes[3][1]
+        assert "Usage log not found" in outcomes[4][1]
+
+        context = (
+            await db_session.execute(
+                select(APISubscriptionContext).where(
+                    APISubscriptionContext.workspace_id == test_workspace.id
+                )
+            )
+        ).scalar_one()
+        await db_session.refresh(context)
+        assert context.credits_used == Decimal("3.50")
+
+    @pytest.mark.asyncio
+    async def test_replay_does_not_charge_twice(
+        self, db_session: AsyncSession, live_api_key, test_workspace
+    ):
+        from app.apps.cubex_api.services.quota import quota_service
+        from app.core.db.models import APISubscriptionContext
+
+        raw_key, api_key = live_api_key
+        usage_log = await _api_usage_log(db_session, api_key, credits="1.00")
+        batch = [(raw_key, UsageLogCommit(usage_log_id=usage_log.id, success=True))]
+
+        await quota_service.commit_usage_batch(db_session, batch)
+        outcomes = await quota_service.commit_usage_batch(db_session, batch)
+
+        assert outcomes == [(True, "Usage committed as SUCCESS.")]
+        context = (
+            await db_session.execute(
+                select(APISubscriptionContext).where(
+                    APISubscriptionContext.workspace_id == test_workspace.id
+                )
+            )
+        ).scalar_one()
+        await db_session.refresh(context)
+        assert context.credits_used == Decimal("1.00")
+
+    @pytest.mark.asyncio
+    async def test_ownership_mismatch_rejected(
+        self, db_session: AsyncSession, live_api_key, test_api_key
+    ):
+        from app.apps.cubex_api.services.quota import quota_service
+
+        _, live_key = live_api_key
+        test_raw_key, _ = test_api_key
+        usage_log = await _api_usage_log(db_session, live_key)
+
+        outcomes = await quota_service.commit_usage_batch(
+            db_session,
+            [(test_raw_key, UsageLogCommit(usage_log_id=usage_log.id, success=True))],
+        )
+
+        assert outcomes == [(False, "API key does not own this usage log.")]
+        await db_session.refresh(usage_log)
+        assert usage_log.status == UsageLogStatus.PENDING
+
+
+class TestCareerCommitUsageBatch:
+
+    @pytest.mark.asyncio
+    async def test_commits_charges_and_stores_results(
+        self, db_session: AsyncSession, test_user, career_subscription
+    ):
+        from app.apps.cubex_career.db.models import CareerAnalysisResult
+        from app.apps.cubex_career.services.quota import career_quota_service
+        from app.core.db.models import CareerSubscriptionContext
+
+        first = await _career_usage_log(db_session, test_user, career_subscription)
+        second = await _career_usage_log(
+            db_session, test_user, career_subscription, credits="0.50"
+        )
+
+        outcomes = await career_quota_service.commit_usage_batch(
+            db_session,
+            [
+                (
+                    test_user.id,
+                    UsageLogCommit(usage_log_id=first.id, success=True),
+                    {"score": 1},
+                ),
+                (
+                    test_user.id,
+                    UsageLogCommit(usage_log_id=second.id, success=True),
+                    None,
+                ),
+                (
+                    uuid4(),
+                    UsageLogCommit(usage_log_id=first.id, success=True),
+                    None,
+                ),
+            ],
+        )
+
+        assert outcomes[0] == (True, "Usage committed as SUCCESS.")
+        assert outcomes[1] == (True, "Usage committed as SUCCESS.")
+        assert outcomes[2][0] is False
+
+        context = (
+            await db_session.execute(
+                select(CareerSubscriptionContext).where(
+                    CareerSubscriptionContext.user_id == test_user.id
+                )
+            )
+        ).scalar_one()
+        await db_session.refresh(context)
+        assert context.credits_used == Decimal("1.50")
+
+        results = (
+            (
+                await db_session.execute(
+                    select(CareerAnalysisResult).where(
+                        CareerAnalysisResult.user_id == test_user.id
+                    )
+                )
+            )
+            .scalars()
+            .all()
+        )
+        assert [r.usage_log_id for r in results] == [first.id]
+
+        # Replaying the batch neither charges again nor duplicates results
+        await career_quota_service.commit_usage_batch(
+            db_session,
+            [
+                (
+                    test_user.id,
+                    UsageLogCommit(usage_log_id=first.id, success=True),
+                    {"score": 1},
+                )
+            ],
+        )
+        await db_session.refresh(context)
+        assert context.credits_used == Decimal("1.50")
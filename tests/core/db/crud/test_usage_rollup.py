@@ -0,0 +1,307 @@
+"""
+Test suite for usage rollup CRUD and summary helpers.
+
+Run all tests:
+    pytest tests/core/db/crud/test_usage_rollup.py -v
+
+Run with coverage:
+    pytest tests/core/db/crud/test_usage_rollup.py --cov=app.core.db.crud.usage_rollup --cov=app.core.services.usage_rollup --cov-report=term-missing -v
+"""
+
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.db.crud.usage_rollup import (
+    LATENCY_HISTOGRAM_BOUNDS_MS,
+    LATENCY_HISTOGRAM_SIZE,
+    build_rollup_counters,
+    latency_histogram,
+    truncate_to_bucket,
+)
+from app.core.enums import FeatureKey, UsageLogStatus, UsageRollupGranularity
+from app.core.exceptions.types import BadRequestException
+from app.core.services.usage_rollup import (
+    estimate_latency_percentile,
+    resolve_summary_window,
+    summarize_rollups,
+)
+
+
+def _committed_log(
+    status: UsageLogStatus = UsageLogStatus.SUCCESS,
+    latency_ms: int | None = 120,
+    created_at: datetime | None = None,
+    feature_key: FeatureKey = FeatureKey.API_JOB_MATCH,
+) -> SimpleNamespace:
+    return SimpleNamespace(
+        feature_key=feature_key,
+        status=status,
+        created_at=created_at or datetime(2026, 3, 1, 10, 42, tzinfo=timezone.utc),
+        input_tokens=100,
+        output_tokens=40,
+        latency_ms=latency_ms,
+    )
+
+
+class TestRollupHelpers:
+
+    def test_truncate_to_hour_and_day(self):
+        moment = datetime(2026, 3, 1, 10, 42, 13, 500, tzinfo=timezone.utc)
+
+        assert truncate_to_bucket(moment, UsageRollupGranularity.HOUR) == datetime(
+            2026, 3, 1, 10, tzinfo=timezone.utc
+        )
+        assert truncate_to_bucket(moment, UsageRollupGranularity.DAY) == datetime(
+            2026, 3, 1, tzinfo=timezone.utc
+        )
+
+    def test_truncate_treats_naive_as_utc(self):
+        naive = datetime(2026, 3, 1, 10, 42)
+        result = truncate_to_bucket(naive, UsageRollupGranularity.HOUR)
+        assert result.tzinfo is not None
+        assert result.hour == 10
+
+    def test_latency_histogram_slots(self):
+        assert latency_histogram(None) == [0] * LATENCY_HISTOGRAM_SIZE
+        assert latency_histogram(50)[0] == 1
+        assert latency_histogram(51)[1] == 1
+        assert latency_histogram(10**7)[-1] == 1
+
+    def test_percentile_empty_histogram(self):
+        assert estimate_latency_percentile([0] * LATENCY_HISTOGRAM_SIZE, 50) is None
+
+    def test_percentile_interpolates_within_slot(self):
+        histogram = [0] * LATENCY_HISTOGRAM_SIZE
+        histogram[1] = 10  # (50, 100] ms
+        assert estimate_latency_percentile(histogram, 50) == 75.0
+        assert estimate_latency_percentile(histogram, 100) == 100.0
+
+    def test_percentile_overflow_reports_last_bound(self):
+        histogram = [0] * LATENCY_HISTOGRAM_SIZE
+        histogram[-1] = 1
+        assert estimate_latency_percentile(histogram, 99) == float(
+            LATENCY_HISTOGRAM_BOUNDS_MS[-1]
+        )
+
+    def test_counters_for_success(self):
+        counters = build_rollup_counters(_committed_log(), Decimal("2.50"))
+        assert counters["success_count"] == 1
+        assert counters["failed_count"] == 0
+        assert counters["credits_charged"] == Decimal("2.50")
+        assert counters["latency_count"] == 1
+        assert sum(counters["latency_histogram"]) == 1
+
+    def test_counters_for_failure_never_charge(self):
+        counters = build_rollup_counters(
+            _committed_log(status=UsageLogStatus.FAILED, latency_ms=None),
+            Decimal("2.50"),
+        )
+        assert counters["failed_count"] == 1
+        assert counters["credits_charged"] == 0
+        assert counters["latency_count"] == 0
+
+    def test_resolve_window_defaults(self):
+        start, end = resolve_summary_window(UsageRollupGranularity.DAY, None, None)
+        assert start.hour == 0 and start.minute == 0
+        assert timedelta(days=30) <= end - start < timedelta(days=31)
+
+    def test_resolve_window_rejects_inverted(self):
+        now = datetime.now(timezone.utc)
+        with pytest.raises(BadRequestException):
+            resolve_summary_window(
+                UsageRollupGranularity.HOUR, now, now - timedelta(hours=2)
+            )
+
+    def test_resolve_window_rejects_too_large(self):
+        now = datetime.now(timezone.utc)
+        with pytest.raises(BadRequestException):
+            resolve_summary_window(
+                UsageRollupGranularity.HOUR, now - timedelta(days=40), now
+            )
+
+    def test_summarize_rollups_groups_by_feature_and_bucket(self):
+        hour = datetime(2026, 3, 1, 10, tzinfo=timezone.utc)
+        histogram = latency_histogram(120)
+        rows = [
+            SimpleNamespace(
+                feature_key=feature,
+                bucket_start=bucket,
+                request_count=2,
+                success_count=2,
+                failed_count=0,
+                credits_charged=Decimal("1.00"),
+                input_tokens=10,
+                output_tokens=5,
+                latency_ms_sum=240,
+                latency_count=2,
+                latency_histogram=[count * 2 for count in histogram],
+            )
+            for feature, bucket in [
+                (FeatureKey.API_JOB_MATCH, hour),
+                (FeatureKey.API_JOB_MATCH, hour + timedelta(hours=1)),
+                (FeatureKey.API_CAREER_PATH, hour),
+            ]
+        ]
+
+        summary = summarize_rollups(
+            rows, UsageRollupGranularity.HOUR, hour, hour + timedelta(hours=2)
+        )
+
+        assert summary.totals.request_count == 6
+        assert summary.totals.credits_charged == Decimal("3.00")
+        assert summary.totals.avg_latency_ms == 120.0
+        assert [f.feature_key for f in summary.by_feature] == [
+            FeatureKey.API_JOB_MATCH,
+            FeatureKey.API_CAREER_PATH,
+        ]
+        assert [p.bucket_start for p in summary.series] == [
+            hour,
+            hour + timedelta(hours=1),
+        ]
+        assert summary.series[0].request_count == 4
+
+
+class TestWorkspaceUsageRollupDB:
+
+    @pytest.mark.asyncio
+    async def test_record_creates_hour_and_day_rows(
+        self, db_session: AsyncSession, test_workspace
+    ):
+        from app.apps.cubex_api.db.crud import workspace_usage_rollup_db
+
+        log = _committed_log()
+        await workspace_usage_rollup_db.record(
+            db_session, test_workspace.id, log, Decimal("1.50")
+        )
+
+        for granularity in UsageRollupGranularity:
+            rows = await workspace_usage_rollup_db.list_buckets(
+                db_session,
+                test_workspace.id,
+                granularity,
+                truncate_to_bucket(log.created_at, granularity),
+                log.created_at + timedelta(hours=1),
+            )
+            assert len(rows) == 1
+            assert rows[0].request_count == 1
+            assert rows[0].credits_charged == Decimal("1.50")
+
+    @pytest.mark.asyncio
+    async def test_record_accumulates_on_conflict(
+        self, db_session: AsyncSession, test_workspace
+    ):
+        from app.apps.cubex_api.db.crud import workspace_usage_rollup_db
+
+        await workspace_usage_rollup_db.record(
+            db_session, test_workspace.id, _committed_log(latency_ms=40), Decimal("1")
+        )
+        await workspace_usage_rollup_db.record(
+            db_session,
+            test_workspace.id,
+            _committed_log(status=UsageLogStatus.FAILED, latency_ms=900),
+            None,
+        )
+
+        start = datetime(2026, 3, 1, tzinfo=timezone.utc)
+        rows = await workspace_usage_rollup_db.list_buckets(
+            db_session,
+            test_workspace.id,
+            UsageRollupGranularity.HOUR,
+            start,
+            start + timedelta(days=1),
+        )
+
+        assert len(rows) == 1
+        row = rows[0]
+        assert row.request_count == 2
+        assert row.success_count == 1
+        assert row.failed_count == 1
+        assert row.credits_charged == Decimal("1.00")
+        assert row.input_tokens == 200
+        assert row.latency_ms_sum == 940
+        assert row.latency_count == 2
+        assert row.latency_histogram == [
+            a + b for a, b in zip(latency_histogram(40), latency_histogram(900))
+        ]
+
+    @pytest.mark.asyncio
+    async def test_record_many_matches_repeated_record(
+        self, db_session: AsyncSession, test_workspace
+    ):
+        from app.apps.cubex_api.db.crud import workspace_usage_rollup_db
+
+        await workspace_usage_rollup_db.record_many(
+            db_session,
+            [
+                (test_workspace.id, _committed_log(latency_ms=40), Decimal("1")),
+                (
+                    test_workspace.id,
+                    _committed_log(status=UsageLogStatus.FAILED, latency_ms=900),
+                    None,
+                ),
+                (test_workspace.id, _committed_log(latency_ms=40), Decimal("0.5")),
+            ],
+        )
+        # A second call merges into the same rows
+        await workspace_usage_rollup_db.record_many(
+            db_session,
+            [(test_workspace.id, _committed_log(latency_ms=40), Decimal("1"))],
+        )
+
+        start = datetime(2026, 3, 1, tzinfo=timezone.utc)
+        rows = await workspace_usage_rollup_db.list_buckets(
+            db_session,
+            test_workspace.id,
+            UsageRollupGranularity.HOUR,
+            start,
+            start + timedelta(days=1),
+        )
+
+        assert len(rows) == 1
+        row = rows[0]
+        assert row.request_count == 4
+        assert row.success_count == 3
+        assert row.failed_count == 1
+        assert row.credits_charged == Decimal("2.50")
+        assert row.latency_count == 4
+        assert row.latency_histogram == [
+            3 * a + b for a, b in zip(latency_histogram(40), latency_histogram(900))
+        ]
+
+    @pytest.mark.asyncio
+    async def test_record_many_empty_is_noop(self, db_session: AsyncSession):
+        from app.apps.cubex_api.db.crud import workspace_usage_rollup_db
+
+        await workspace_usage_rollup_db.record_many(db_session, [])
+
+    @pytest.mark.asyncio
+    async def test_list_buckets_filters_by_feature(
+        self, db_session: AsyncSession, test_workspace
+    ):
+        from app.apps.cubex_api.db.crud import workspace_usage_rollup_db
+
+        await workspace_usage_rollup_db.record(
+            db_session, test_workspace.id, _committed_log(), Decimal("1")
+        )
+        await workspace_usage_rollup_db.record(
+            db_session,
+            test_workspace.id,
+            _committed_log(feature_key=FeatureKey.API_CAREER_PATH),
+            Decimal("1"),
+        )
+
+        start = datetime(2026, 3, 1, tzinfo=timezone.utc)
+        rows = await workspace_usage_rollup_db.list_buckets(
+            db_session,
+            test_workspace.id,
+            UsageRollupGranularity.DAY,
+            start,
+            start + timedelta(days=1),
+            feature_key=FeatureKey.API_CAREER_PATH,
+        )
+
+        assert [r.feature_key for r in rows] == [FeatureKey.API_CAREER_PATH]
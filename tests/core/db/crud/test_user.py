@@ -0,0 +1,179 @@
+"""
+Test suite for User CRUD operations.
+
+Run all tests:
+    pytest tests/core/db/crud/test_user.py -v
+
+Run with coverage:
+    pytest tests/core/db/crud/test_user.py --cov=app.core.db.crud.user --cov-report=term-missing -v
+"""
+
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.db.crud import oauth_account_db, user_db
+from app.core.enums import OAuthProviders
+
+
+class TestBumpTokenVersion:
+
+    @pytest.mark.asyncio
+    async def test_increments_and_returns_new_version(
+        self, db_session: AsyncSession, test_user
+    ):
+        assert test_user.token_version == 0
+
+        first = await user_db.bump_token_version(
+            db_session, test_user.id, commit_self=False
+        )
+        second = await user_db.bump_token_version(
+            db_session, test_user.id, commit_self=False
+        )
+
+        assert (first, second) == (1, 2)
+        await db_session.refresh(test_user)
+        assert test_user.token_version == 2
+
+    @pytest.mark.asyncio
+    async def test_unknown_user_returns_none(self, db_session: AsyncSession):
+        assert (
+            await user_db.bump_token_version(db_session, uuid4(), commit_self=False)
+            is None
+        )
+
+
+class TestProvisioning:
+
+    @pytest.mark.asyncio
+    async def test_claim_returns_unprovisioned_user(
+        self, db_session: AsyncSession, test_user
+    ):
+        user = await user_db.claim_for_provisioning(db_session, test_user.id)
+
+        assert user is not None and user.id == test_user.id
+
+    @pytest.mark.asyncio
+    async def test_claim_skips_provisioned_and_unknown_users(
+        self, db_session: AsyncSession, test_user
+    ):
+        test_user.provisioned_at = datetime.now(timezone.utc)
+        await db_session.flush()
+
+        assert await user_db.claim_for_provisioning(db_session, test_user.id) is None
+        assert await user_db.claim_for_provisioning(db_session, uuid4()) is None
+
+    @pytest.mark.asyncio
+    async def test_get_unprovisioned_ids(
+        self, db_session: AsyncSession, test_user, test_user_unverified
+    ):
+        provisioned = await user_db.create(
+            db_session,
+            data={
+                "email": "provisioned@example.com",
+                "email_verified": True,
+                "provisioned_at": datetime.now(timezone.utc),
+            },
+            commit_self=False,
+        )
+        later = datetime.now(timezone.utc) + timedelta(minutes=1)
+
+        ids = await user_db.get_unprovisioned_ids(
+            db_session, created_before=later, limit=10
+        )
+        earlier = await user_db.get_unprovisioned_ids(
+            db_session, created_before=later - timedelta(hours=1), limit=10
+        )
+
+        assert ids == [test_user.id]
+        assert provisioned.id not in ids
+        assert earlier == []
+
+    @pytest.mark.asyncio
+    async def test_failed_users_are_swept_last(
+        self, db_session: AsyncSession, test_user
+    ):
+        newer = await user_db.create(
+            db_session,
+            data={"email": "newer@example.com", "email_verified": True},
+            commit_self=False,
+        )
+        later = datetime.now(timezone.utc) + timedelta(minutes=1)
+
+        attempts = await user_db.record_provisioning_failure(
+            db_session, test_user.id, commit_self=False
+        )
+        ids = await user_db.get_unprovisioned_ids(
+            db_session, created_before=later, limit=1
+        )
+
+        assert attempts == 1
+        assert ids == [newer.id]
+        assert (
+            await user_db.record_provisioning_failure(
+                db_session, uuid4(), commit_self=False
+            )
+            is None
+        )
+
+
+class TestResolveOAuthUser:
+
+    async def _link(self, session: AsyncSession, user, account_id: str):
+        return await oauth_account_db.create(
+            session,
+            data={
+                "user_id": user.id,
+                "provider": OAuthProviders.GITHUB,
+                "provider_account_id": account_id,
+            },
+            commit_self=False,
+        )
+
+    @pytest.mark.asyncio
+    async def test_returns_linked_user_and_account(
+        self, db_session: AsyncSession, test_user
+    ):
+        account = await self._link(db_session, test_user, "gh-1")
+
+        user, oauth = await oauth_account_db.resolve_user(
+            db_session, OAuthProviders.GITHUB, "gh-1", "other@example.com"
+        )
+
+        assert user is not None and user.id == test_user.id
+        assert oauth is not None and oauth.id == account.id
+
+    @pytest.mark.asyncio
+    async def test_prefers_linked_user_over_email_match(
+        self, db_session: AsyncSession, test_user
+    ):
+        linked = await user_db.create(
+            db_session, data={"email": "linked@example.com"}, commit_self=False
+        )
+        await self._link(db_session, linked, "gh-1")
+
+        user, oauth = await oauth_account_db.resolve_user(
+            db_session, OAuthProviders.GITHUB, "gh-1", test_user.email
+        )
+
+        assert user is not None and user.id == linked.id
+        assert oauth is not None
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_email_match(self, db_session: AsyncSession, test_user):
+        await self._link(db_session, test_user, "gh-1")
+
+        user, oauth = await oauth_account_db.resolve_user(
+            db_session, OAuthProviders.GOOGLE, "gh-1", test_user.email
+        )
+
+        assert user is not None and user.id == test_user.id
+        assert oauth is None
+
+    @pytest.mark.asyncio
+    async def test_no_match(self, db_session: AsyncSession):
+        assert await oauth_account_db.resolve_user(
+            db_session, OAuthProviders.GITHUB, "gh-404", "nobody@example.com"
+        ) == (None, None)
@@ -0,0 +1,178 @@
+"""
+Test suite for connection pool configuration, instrumentation and liveness.
+
+Run all tests:
+    pytest tests/core/db/test_pool.py -v
+
+Run with coverage:
+    pytest tests/core/db/test_pool.py --cov=app.core.db.pool --cov-report=term-missing -v
+"""
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from app.core.config import DatabasePoolProfile, Settings
+from app.core.db import async_engine
+from app.core.db.pool import (
+    PoolLivenessMonitor,
+    engine_options,
+    instrument_engine,
+    pool_stats,
+)
+
+PROFILE = DatabasePoolProfile(pool_size=4, max_overflow=2, pool_timeout=5)
+
+
+@pytest.fixture
+async def engine():
+    """A small, instrumented engine on the test database."""
+    engine = create_async_engine(
+        async_engine.url, **engine_options(PROFILE, statement_cache_size=50)
+    )
+    instrument_engine(engine)
+    yield engine
+    await engine.dispose()
+
+
+class TestPoolProfiles:
+
+    def test_role_selects_profile(self):
+        settings = Settings(
+            DATABASE_URL="postgresql+asyncpg://x", PROCESS_ROLE="worker"
+        )
+
+        assert settings.db_pool_profile == settings.DB_POOL_PROFILES["worker"]
+        assert (
+            settings.db_pool_profile.pool_size
+            < settings.DB_POOL_PROFILES["api"].pool_size
+        )
+
+    def test_profiles_from_json(self, monkeypatch):
+        monkeypatch.setenv(
+            "DB_POOL_PROFILES",
+            '{"scheduler": {"pool_size": 1, "max_overflow": 0}}',
+        )
+        settings = Settings(
+            DATABASE_URL="postgresql+asyncpg://x", PROCESS_ROLE="scheduler"
+        )
+
+        assert settings.db_pool_profile.pool_size == 1
+        assert settings.db_pool_profile.pool_recycle == 3600
+
+    def test_engine_options(self):
+        options = engine_options(PROFILE, statement_cache_size=50)
+
+        assert options["pool_size"] == 4
+        assert options["max_overflow"] == 2
+        assert options["pool_pre_ping"] is False
+        assert options["connect_args"] == {
+            "statement_cache_size": 50,
+            "prepared_statement_cache_size": 50,
+        }
+
+    def test_pgbouncer_mode_disables_statement_caches(self):
+        connect_args = engine_options(
+            PROFILE, statement_cache_size=50, pgbouncer_transaction_mode=True
+        )["connect_args"]
+
+        assert connect_args["statement_cache_size"] == 0
+        assert connect_args["prepared_statement_cache_size"] == 0
+        name_func = connect_args["prepared_statement_name_func"]
+        assert name_func() != name_func()
+
+    @pytest.mark.asyncio
+    async def test_pgbouncer_mode_executes(self):
+        engine = create_async_engine(
+            async_engine.url,
+            **engine_options(
+                PROFILE, statement_cache_size=50, pgbouncer_transaction_mode=True
+            ),
+        )
+        try:
+            for _ in range(2):
+                async with engine.connect() as conn:
+                    value = (await conn.execute(text("SELECT 1"))).scalar_one()
+                    assert value == 1
+        finally:
+            await engine.dispose()
+
+
+class TestPoolInstrumentation:
+
+    @pytest.mark.asyncio
+    async def test_counts_pool_events(self, engine: AsyncEngine):
+        for _ in range(3):
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+
+        stats = pool_stats(engine)
+
+        assert stats["pool"] == "AsyncAdaptedQueuePool"
+        assert stats["size"] == 4
+        assert stats["checked_out"] == 0
+        assert stats["connects"] == 1
+        assert stats["checkouts"] == 3
+        assert stats["checkins"] == 3
+        assert stats["hold_ms_avg"] is not None
+        assert stats["hold_ms_max"] >= stats["hold_ms_avg"]
+
+    def test_instrumentation_is_idempotent(self, engine: AsyncEngine):
+        assert instrument_engine(engine) is instrument_engine(engine)
+
+    @pytest.mark.asyncio
+    async def test_counters_survive_dispose(self, engine: AsyncEngine):
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+        await engine.dispose()
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+        assert pool_stats(engine)["connects"] == 2
+
+    def test_uninstrumented_engine_reports_pool_only(self):
+        engine = create_async_engine(async_engine.url)
+
+        assert "checkouts" not in pool_stats(engine)
+
+
+class TestPoolLivenessMonitor:
+
+    @pytest.mark.asyncio
+    async def test_healthy_engine(self, engine: AsyncEngine):
+        monitor = PoolLivenessMonitor({"primary": engine})
+
+        await monitor.check_all()
+
+        stats = pool_stats(engine)
+        assert stats["liveness_ok"] is True
+        assert stats["liveness_latency_ms"] is not None
+        assert stats["liveness_failures"] == 0
+
+    @pytest.mark.asyncio
+    async def test_unreachable_engine_is_disposed(self):
+        engine = create_async_engine(
+            async_engine.url.set(port=1), **engine_options(PROFILE, 50)
+        )
+        monitor = PoolLivenessMonitor({"primary": engine})
+        pool_before = engine.pool
+
+        try:
+            assert await monitor.check_engine("primary", engine) is False
+        finally:
+            await engine.dispose()
+
+        stats = pool_stats(engine)
+        assert stats["liveness_ok"] is False
+        assert stats["liveness_failures"] == 1
+        assert engine.pool is not pool_before
+
+    @pytest.mark.asyncio
+    async def test_start_and_stop(self, engine: AsyncEngine):
+        monitor = PoolLivenessMonitor({"primary": engine})
+
+        monitor.start(interval=60)
+        monitor.start(interval=60)
+        await monitor.stop()
+
+        assert monitor._task is None
@@ -0,0 +1,203 @@
+"""
+Test suite for primary/replica session routing.
+
+Run all tests:
+    pytest tests/core/db/test_routing.py -v
+
+Run with coverage:
+    pytest tests/core/db/test_routing.py --cov=app.core.db.routing --cov-report=term-missing -v
+"""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import select, text, update
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+
+from app.core.db import async_engine
+from app.core.db import routing
+from app.core.db.models import Plan
+from app.core.db.routing import (
+    DatabaseRouter,
+    RoutingSession,
+    is_pinned_to_primary,
+    pin_to_primary,
+)
+
+
+@pytest.fixture
+async def replica_engine():
+    """A second engine on the test database standing in for a replica."""
+    engine = create_async_engine(async_engine.url)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+def router(replica_engine: AsyncEngine) -> DatabaseRouter:
+    return DatabaseRouter(async_engine, [replica_engine], max_lag_seconds=5.0)
+
+
+async def _in_new_task(coro_factory):
+    """Run in a fresh task so the primary pin does not leak between tests."""
+    return await asyncio.create_task(coro_factory())
+
+
+class TestDatabaseRouter:
+
+    def test_unchecked_replica_is_not_used(self, router: DatabaseRouter):
+        assert router.read_engine() is async_engine
+        assert router.primary_reads_routed == 1
+
+    @pytest.mark.asyncio
+    async def test_healthy_replica_is_used(
+        self, router: DatabaseRouter, replica_engine: AsyncEngine
+    ):
+        await router.check_replicas()
+
+        assert router.replicas[0].healthy is True
+        assert router.replicas[0].lag_seconds == 0
+        assert await _in_new_task(lambda: _read_engine(router)) is replica_engine
+
+    @pytest.mark.asyncio
+    async def test_lagging_replica_falls_back_to_primary(
+        self, replica_engine: AsyncEngine
+    ):
+        router = DatabaseRouter(async_engine, [replica_engine], max_lag_seconds=-1)
+
+        await router.check_replicas()
+
+        assert router.replicas[0].healthy is False
+        assert router.read_engine() is async_engine
+
+    @pytest.mark.asyncio
+    async def test_unreachable_replica_falls_back_to_primary(self):
+        url = async_engine.url.set(port=1)
+        engine = create_async_engine(url)
+        router = DatabaseRouter(async_engine, [engine], max_lag_seconds=5.0)
+        router.replicas[0].healthy = True
+
+        try:
+            await router.check_replicas()
+        finally:
+            await engine.dispose()
+
+        assert router.replicas[0].healthy is False
+        assert router.replicas[0].lag_seconds is None
+        assert router.read_engine() is async_engine
+
+    @pytest.mark.asyncio
+    async def test_pinned_request_reads_from_primary(self, router: DatabaseRouter):
+        await router.check_replicas()
+
+        async def pinned():
+            pin_to_primary()
+            return router.read_engine()
+
+        assert await _in_new_task(pinned) is async_engine
+        # The pin is scoped to the task that wrote
+        assert is_pinned_to_primary() is False
+
+    def test_pool_metrics_per_engine(self, router: DatabaseRouter):
+        metrics = router.pool_metrics()
+
+        assert set(metrics) == {"primary", "replica-0"}
+        assert {"size", "checked_out", "overflow", "reads_routed"} <= set(
+            metrics["primary"]
+        )
+        assert metrics["replica-0"]["healthy"] is False
+
+
+async def _read_engine(router: DatabaseRouter) -> AsyncEngine:
+    return router.read_engine()
+
+
+class TestRoutingSession:
+
+    @pytest.mark.asyncio
+    async def test_statement_routing(
+        self, router: DatabaseRouter, replica_engine: AsyncEngine
+    ):
+        await router.check_replicas()
+
+        async def route():
+            session = RoutingSession()
+            binds = {
+                "select": session.get_bind(clause=select(Plan)),
+                "locking": session.get_bind(clause=select(Plan).with_for_update()),
+                "update": session.get_bind(clause=update(Plan).values(rank=1)),
+                "text": session.get_bind(clause=text("UPDATE plans SET rank = 1")),
+                "no_clause": session.get_bind(),
+            }
+            pin_to_primary()
+            binds["after_write"] = session.get_bind(clause=select(Plan))
+            return binds
+
+        with patch.object(routing, "db_router", router):
+            binds = await _in_new_task(route)
+
+        assert binds["select"] is replica_engine.sync_engine
+        assert binds["locking"] is async_engine.sync_engine
+        assert binds["update"] is async_engine.sync_engine
+        assert binds["text"] is async_engine.sync_engine
+        assert binds["no_clause"] is async_engine.sync_engine
+        assert binds["after_write"] is async_engine.sync_engine
+
+    @pytest.mark.asyncio
+    async def test_flush_pins_request_to_primary(self):
+        async def write_then_check():
+            from app.core.db.models import DLQMessage
+
+            async with async_sessionmaker(bind=async_engine)() as session:
+                async with session.begin():
+                    session.add(
+                        DLQMessage(queue_name="routing_dead", message_body="{}")
+                    )
+                    await session.flush()
+                    pinned = is_pinned_to_primary()
+                    await session.rollback()
+            return pinned
+
+        assert await _in_new_task(write_then_check) is True
+
+    @pytest.mark.asyncio
+    async def test_raw_text_runs_on_primary_and_pins(self, replica_engine: AsyncEngine):
+        primary_engine = create_async_engine(async_engine.url)
+        router = DatabaseRouter(primary_engine, [replica_engine], max_lag_seconds=5.0)
+        await router.check_replicas()
+
+        async def execute_text():
+            async with routing.ReadSessionLocal() as session:
+                await session.execute(text("SELECT 1"))
+                return (
+                    "read_engine" in session.sync_session.info,
+                    is_pinned_to_primary(),
+                )
+
+        try:
+            with patch.object(routing, "db_router", router):
+                used_replica, pinned = await _in_new_task(execute_text)
+        finally:
+            await primary_engine.dispose()
+
+        assert used_replica is False
+        assert pinned is True
+        assert router.replicas[0].reads_routed == 0
+
+    @pytest.mark.asyncio
+    async def test_read_session_executes_on_replica(
+        self, router: DatabaseRouter, replica_engine: AsyncEngine
+    ):
+        await router.check_replicas()
+
+        async def read():
+            async with routing.ReadSessionLocal() as session:
+                await session.execute(select(Plan.id).limit(1))
+                return session.sync_session.info["read_engine"]
+
+        with patch.object(routing, "db_router", router):
+            engine = await _in_new_task(read)
+
+        assert engine is replica_engine
+        assert router.replicas[0].reads_routed == 1
@@ -5,6 +5,7 @@ Test suite for authentication dependencies.
 - get_current_active_user: Active user verification
 - get_current_verified_user: Email verification check
 - get_optional_user: Optional authentication
+- get_current_principal: Cached snapshot and signed-claims authentication
 
 Run all tests:
     pytest tests/core/dependencies/test_auth.py -v
@@ -33,6 +34,7 @@ class TestGetCurrentUser:
         mock_user.id = user_id
         mock_user.email = "test@example.com"
         mock_user.is_deleted = False
+        mock_user.token_version = 0
 
         mock_credentials = MagicMock(spec=HTTPAuthorizationCredentials)
         mock_credentials.credentials = "valid_token"
@@ -223,6 +225,222 @@ class TestGetCurrentUser:
                 assert exc_info.value.status_code == 401
                 assert "User account has been deleted" in str(exc_info.value)
 
+    @pytest.mark.asyncio
+    async def test_token_older_than_token_version_raises_401(self):
+        from app.core.dependencies import get_current_user
+
+        user_id = uuid4()
+        mock_user = MagicMock()
+        mock_user.id = user_id
+        mock_user.is_deleted = False
+        mock_user.token_version = 2
+
+        mock_credentials = MagicMock(spec=HTTPAuthorizationCredentials)
+        mock_credentials.credentials = "valid_token"
+        mock_session = MagicMock()
+        mock_session.begin = MagicMock(return_value=AsyncMock())
+
+        with patch("app.core.dependencies.auth.decode_jwt_token") as mock_decode:
+            mock_decode.return_value = {
+                "sub": str(user_id),
+                "type": "access",
+                "ver": 1,
+                "exp": 9999999999,
+            }
+
+            with patch("app.core.dependencies.auth.user_db") as mock_user_db:
+                mock_user_db.get_by_id = AsyncMock(return_value=mock_user)
+
+                with pytest.raises(AuthenticationException) as exc_info:
+                    await get_current_user(
+                        credentials=mock_credentials,
+                        session=mock_session,
+                    )
+
+                assert "Access token has been revoked" in str(exc_info.value)
+
+
+def _snapshot(user_id, **overrides):
+    from app.core.services.user_cache import UserSnapshot
+
+    fields = {
+        "id": user_id,
+        "email": "test@example.com",
+        "is_active": True,
+        "email_verified": True,
+    }
+    return UserSnapshot(**{**fields, **overrides})
+
+
+class TestGetCurrentPrincipal:
+
+    @pytest.fixture
+    def credentials(self):
+        mock_credentials = MagicMock(spec=HTTPAuthorizationCredentials)
+        mock_credentials.credentials = "valid_token"
+        return mock_credentials
+
+    @pytest.mark.asyncio
+    async def test_returns_cached_snapshot(self, credentials):
+        from app.core.dependencies import get_current_principal
+
+        user_id = uuid4()
+        snapshot = _snapshot(user_id, token_version=1)
+        session = MagicMock()
+
+        with (
+            patch("app.core.dependencies.auth.decode_jwt_token") as mock_decode,
+            patch("app.core.dependencies.auth.user_cache") as mock_cache,
+        ):
+            mock_decode.return_value = {"sub": str(user_id), "type": "access", "ver": 1}
+            mock_cache.get = AsyncMock(return_value=snapshot)
+
+            result = await get_current_principal(
+                credentials=credentials, session=session
+            )
+
+        assert result is snapshot
+        mock_cache.get.assert_awaited_once_with(session, user_id)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "snapshot_overrides, token_version, message",
+        [
+            ({"is_deleted": True}, 0, "User account has been deleted"),
+            ({"token_version": 3}, 2, "Access token has been revoked"),
+        ],
+    )
+    async def test_rejects_deleted_user_and_revoked_token(
+        self, credentials, snapshot_overrides, token_version, message
+    ):
+        from app.core.dependencies import get_current_principal
+
+        user_id = uuid4()
+
+        with (
+            patch("app.core.dependencies.auth.decode_jwt_token") as mock_decode,
+            patch("app.core.dependencies.auth.user_cache") as mock_cache,
+        ):
+            mock_decode.return_value = {
+                "sub": str(user_id),
+                "type": "access",
+                "ver": token_version,
+            }
+            mock_cache.get = AsyncMock(
+                return_value=_snapshot(user_id, **snapshot_overrides)
+            )
+
+            with pytest.raises(AuthenticationException) as exc_info:
+                await get_current_principal(
+                    credentials=credentials, session=MagicMock()
+                )
+
+        assert message in str(exc_info.value)
+
+    @pytest.mark.asyncio
+    async def test_unknown_user_raises_401(self, credentials):
+        from app.core.dependencies import get_current_principal
+
+        with (
+            patch("app.core.dependencies.auth.decode_jwt_token") as mock_decode,
+            patch("app.core.dependencies.auth.user_cache") as mock_cache,
+        ):
+            mock_decode.return_value = {"sub": str(uuid4()), "type": "access"}
+            mock_cache.get = AsyncMock(return_value=None)
+
+            with pytest.raises(AuthenticationException):
+                await get_current_principal(
+                    credentials=credentials, session=MagicMock()
+                )
+
+    @pytest.mark.asyncio
+    async def test_signed_claims_skip_the_cache(self, credentials):
+        from app.core.dependencies import get_current_principal
+
+        user_id = uuid4()
+
+        with (
+            patch("app.core.dependencies.auth.decode_jwt_token") as mock_decode,
+            patch("app.core.dependencies.auth.user_cache") as mock_cache,
+            patch("app.core.dependencies.auth.RedisService") as mock_redis,
+        ):
+            mock_decode.return_value = {
+                "sub": str(user_id),
+                "email": "test@example.com",
+                "type": "access",
+                "ver": 4,
+                "act": True,
+                "evf": False,
+            }
+            mock_redis.is_connected.return_value = True
+            mock_cache.revoked_token_version = AsyncMock(return_value=4)
+            mock_cache.get = AsyncMock()
+
+            result = await get_current_principal(
+                credentials=credentials, session=MagicMock()
+            )
+
+        assert result == _snapshot(user_id, email_verified=False, token_version=4)
+        mock_cache.get.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_signed_claims_honour_revocation(self, credentials):
+        from app.core.dependencies import get_current_principal
+
+        with (
+            patch("app.core.dependencies.auth.decode_jwt_token") as mock_decode,
+            patch("app.core.dependencies.auth.user_cache") as mock_cache,
+            patch("app.core.dependencies.auth.RedisService") as mock_redis,
+        ):
+            mock_decode.return_value = {
+                "sub": str(uuid4()),
+                "type": "access",
+                "ver": 1,
+                "act": True,
+                "evf": True,
+            }
+            mock_redis.is_connected.return_value = True
+            mock_cache.revoked_token_version = AsyncMock(return_value=2)
+
+            with pytest.raises(AuthenticationException):
+                await get_current_principal(
+                    credentials=credentials, session=MagicMock()
+                )
+
+    @pytest.mark.asyncio
+    async def test_signed_claims_need_redis(self, credentials):
+        from app.core.dependencies import get_current_principal
+
+        user_id = uuid4()
+        snapshot = _snapshot(user_id)
+
+        with (
+            patch("app.core.dependencies.auth.decode_jwt_token") as mock_decode,
+            patch("app.core.dependencies.auth.user_cache") as mock_cache,
+            patch("app.core.dependencies.auth.RedisService") as mock_redis,
+        ):
+            mock_decode.return_value = {
+                "sub": str(user_id),
+                "type": "access",
+                "act": True,
+                "evf": True,
+            }
+            mock_redis.is_connected.return_value = False
+            mock_cache.get = AsyncMock(return_value=snapshot)
+
+            result = await get_current_principal(
+                credentials=credentials, session=MagicMock()
+            )
+
+        assert result is snapshot
+
+    @pytest.mark.asyncio
+    async def test_inactive_principal_raises_403(self):
+        from app.core.dependencies import get_current_active_principal
+
+        with pytest.raises(ForbiddenException):
+            await get_current_active_principal(_snapshot(uuid4(), is_active=False))
+
 
 class TestGetCurrentActiveUser:
 
@@ -292,6 +510,7 @@ class TestGetOptionalUser:
         mock_user = MagicMock()
         mock_user.id = user_id
         mock_user.is_deleted = False
+        mock_user.token_version = 0
 
         mock_credentials = MagicMock(spec=HTTPAuthorizationCredentials)
         mock_credentials.credentials = "valid_token"
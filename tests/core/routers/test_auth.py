@@ -4,6 +4,8 @@ Integration tests for auth router endpoints.
 Tests all auth endpoints with real database and per-test rollback.
 """
 
+from datetime import datetime, timezone
+
 import pytest
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -272,6 +274,36 @@ class TestSigninEndpoint:
 
         assert response.status_code == 401
 
+    @pytest.mark.asyncio
+    async def test_signin_locks_out_after_repeated_failures(
+        self, client: AsyncClient, db_session: AsyncSession
+    ):
+        from app.core.config import settings
+        from app.core.db.models import User
+        from app.core.utils import hash_password
+
+        user = User(
+            id=uuid4(),
+            email="lockout@example.com",
+            password_hash=hash_password("CorrectPassword123!"),
+            full_name="Lockout User",
+            email_verified=True,
+            is_active=True,
+        )
+        db_session.add(user)
+        await db_session.flush()
+
+        payload = {"email": user.email, "password": "WrongPassword123!"}
+        statuses = [
+            (await client.post("/auth/signin", json=payload)).status_code
+            for _ in range(settings.RATE_LIMIT_PENALTY_THRESHOLD)
+        ]
+        payload["password"] = "CorrectPassword123!"
+        response = await client.post("/auth/signin", json=payload)
+
+        assert statuses == [401] * settings.RATE_LIMIT_PENALTY_THRESHOLD
+        assert response.status_code == 429
+
     @pytest.mark.asyncio
     async def test_signin_user_not_found(self, client: AsyncClient):
         payload = {"email": "nonexistent@example.com", "password": "SomePassword123!"}
@@ -394,6 +426,18 @@ class TestSignoutAllEndpoint:
 
         assert response.status_code == 401
 
+    @pytest.mark.asyncio
+    async def test_signout_all_revokes_access_tokens(
+        self, authenticated_client: AsyncClient
+    ):
+        assert (await authenticated_client.get("/auth/me")).status_code == 200
+
+        response = await authenticated_client.post("/auth/signout/all")
+        assert response.status_code == 200
+
+        response = await authenticated_client.get("/auth/me")
+        assert response.status_code == 401
+
 
 class TestPasswordResetRequestEndpoint:
 
@@ -539,6 +583,18 @@ class TestGetProfileEndpoint:
         data = response.json()
         assert data["email"] == test_user.email
         assert data["full_name"] == test_user.full_name
+        assert data["provisioning_status"] == "provisioning"
+
+    @pytest.mark.asyncio
+    async def test_get_profile_provisioned(
+        self, authenticated_client: AsyncClient, db_session: AsyncSession, test_user
+    ):
+        test_user.provisioned_at = datetime.now(timezone.utc)
+        await db_session.flush()
+
+        response = await authenticated_client.get("/auth/me")
+
+        assert response.json()["provisioning_status"] == "ready"
 
     @pytest.mark.asyncio
     async def test_get_profile_unauthenticated(self, client: AsyncClient):
@@ -412,6 +412,111 @@ class TestStripeWebhookEndpoint:
         assert response.json()["status"] == "publish_failed"
 
 
+class TestStripeWebhookDeduplication:
+
+    EVENT = {
+        "id": "evt_dedup_123",
+        "type": "customer.subscription.updated",
+        "data": {"object": {"id": "sub_123"}},
+    }
+
+    async def _post(self, client: AsyncClient, claim, publisher: AsyncMock):
+        from app.core.services.idempotency import IdempotencyLease
+
+        with (
+            patch(
+                "app.core.routers.webhook.Stripe.verify_webhook_signature",
+                return_value=self.EVENT,
+            ),
+            patch(
+                "app.core.routers.webhook.get_publisher",
+                return_value=publisher,
+            ),
+            patch.object(
+                IdempotencyLease, "claim", autospec=True, return_value=claim
+            ) as mock_claim,
+            patch.object(
+                IdempotencyLease, "complete", new_callable=AsyncMock
+            ) as mock_complete,
+            patch.object(
+                IdempotencyLease, "release", new_callable=AsyncMock
+            ) as mock_release,
+        ):
+            response = await client.post(
+                "/webhooks/stripe",
+                content=json.dumps({}),
+                headers={
+                    "Content-Type": "application/json",
+                    "Stripe-Signature": "valid_signature",
+                },
+            )
+        return response, mock_claim, mock_complete, mock_release
+
+    @pytest.mark.asyncio
+    async def test_first_delivery_is_published_and_completed(self, client: AsyncClient):
+        from app.core.services.idempotency import ClaimStatus
+
+        publisher = AsyncMock()
+        response, claim, complete, release = await self._post(
+            client, ClaimStatus.ACQUIRED, publisher
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {"status": "received"}
+        assert claim.call_args.args[0].key == "stripe_webhook:evt_dedup_123"
+        publisher.assert_awaited_once()
+        complete.assert_awaited_once()
+        release.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_redelivery_is_not_published_again(self, client: AsyncClient):
+        from app.core.services.idempotency import ClaimStatus
+
+        publisher = AsyncMock()
+        response, _, complete, _ = await self._post(
+            client, ClaimStatus.COMPLETED, publisher
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {"status": "duplicate"}
+        publisher.assert_not_awaited()
+        complete.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_delivery_returns_409(self, client: AsyncClient):
+        from app.core.services.idempotency import ClaimStatus
+
+        publisher = AsyncMock()
+        response, *_ = await self._post(client, ClaimStatus.IN_PROGRESS, publisher)
+
+        assert response.status_code == 409
+        assert response.json() == {"status": "in_progress"}
+        publisher.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_publish_failure_releases_claim(self, client: AsyncClient):
+        from app.core.services.idempotency import ClaimStatus
+
+        publisher = AsyncMock(side_effect=Exception("Queue connection failed"))
+        response, _, complete, release = await self._post(
+            client, ClaimStatus.ACQUIRED, publisher
+        )
+
+        assert response.status_code == 500
+        release.assert_awaited_once()
+        complete.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_redis_unavailable_fails_open(self, client: AsyncClient):
+        from app.core.services.idempotency import ClaimStatus
+
+        publisher = AsyncMock()
+        response, *_ = await self._post(client, ClaimStatus.UNAVAILABLE, publisher)
+
+        assert response.status_code == 200
+        publisher.assert_awaited_once()
+
+
 class TestEventQueueMapping:
 
     def test_checkout_session_completed_mapping(self):
@@ -0,0 +1,50 @@
+"""
+Integration tests for the well-known router endpoints.
+
+Run tests:
+    pytest tests/core/routers/test_well_known.py -v
+
+Run with coverage:
+    pytest tests/core/routers/test_well_known.py --cov=app.core.routers.well_known --cov-report=term-missing -v
+"""
+
+from unittest.mock import patch
+
+import pytest
+from httpx import AsyncClient
+
+from app.core.jwt_keys import JWTKeySet
+
+
+class TestJWKSEndpoint:
+
+    @pytest.fixture
+    def keyset(self):
+        keyset = JWTKeySet(
+            "EdDSA",
+            signing_keys={"k1": JWTKeySet.generate_private_key("EdDSA")},
+            active_kid="k1",
+        )
+        with patch("app.core.routers.well_known.get_jwt_keyset", return_value=keyset):
+            yield keyset
+
+    @pytest.mark.asyncio
+    async def test_returns_cacheable_key_set(self, client: AsyncClient, keyset):
+        response = await client.get("/.well-known/jwks.json")
+
+        assert response.status_code == 200
+        assert response.json() == keyset.jwks
+        assert response.json()["keys"][0]["kid"] == "k1"
+        assert response.headers["cache-control"].startswith("public, max-age=")
+        assert response.headers["etag"] == keyset.jwks_etag
+
+    @pytest.mark.asyncio
+    async def test_if_none_match_returns_not_modified(
+        self, client: AsyncClient, keyset
+    ):
+        response = await client.get(
+            "/.well-known/jwks.json", headers={"If-None-Match": keyset.jwks_etag}
+        )
+
+        assert response.status_code == 304
+        assert response.content == b""
@@ -0,0 +1,140 @@
+"""
+Test suite for the JWT key set.
+
+Run tests:
+    pytest tests/core/test_jwt_keys.py -v
+
+Run with coverage:
+    pytest tests/core/test_jwt_keys.py --cov=app.core.jwt_keys --cov-report=term-missing -v
+"""
+
+from datetime import timedelta
+from unittest.mock import patch
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+
+from app.core.jwt_keys import JWTKeySet
+from app.core.utils import create_jwt_token, decode_jwt_token
+
+
+def _public_pem(private_pem: str) -> str:
+    private_key = serialization.load_pem_private_key(private_pem.encode(), None)
+    return (
+        private_key.public_key()
+        .public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+        .decode()
+    )
+
+
+@pytest.fixture(scope="module")
+def pems() -> dict[str, str]:
+    return {
+        "ed-1": JWTKeySet.generate_private_key("EdDSA"),
+        "ed-2": JWTKeySet.generate_private_key("EdDSA"),
+        "es-1": JWTKeySet.generate_private_key("ES256"),
+    }
+
+
+def _sign_and_decode(keyset: JWTKeySet, verifier: JWTKeySet | None = None):
+    with patch("app.core.utils.get_jwt_keyset", return_value=keyset):
+        token = create_jwt_token({"sub": "123"}, expires_delta=timedelta(minutes=5))
+    with patch("app.core.utils.get_jwt_keyset", return_value=verifier or keyset):
+        return token, decode_jwt_token(token)
+
+
+class TestJWTKeySet:
+
+    @pytest.mark.parametrize("algorithm,kid", [("EdDSA", "ed-1"), ("ES256", "es-1")])
+    def test_signs_with_kid_and_verifies(self, pems, algorithm, kid):
+        keyset = JWTKeySet(algorithm, signing_keys={kid: pems[kid]}, active_kid=kid)
+
+        token, payload = _sign_and_decode(keyset)
+
+        assert jwt.get_unverified_header(token) == {
+            "alg": algorithm,
+            "kid": kid,
+            "typ": "JWT",
+        }
+        assert payload is not None and payload["sub"] == "123"
+
+    def test_jwks_publishes_public_keys_only(self, pems):
+        keyset = JWTKeySet(
+            "EdDSA",
+            signing_keys={"ed-1": pems["ed-1"]},
+            verification_keys={"ed-2": _public_pem(pems["ed-2"])},
+            active_kid="ed-1",
+        )
+
+        keys = keyset.jwks["keys"]
+
+        assert [key["kid"] for key in keys] == ["ed-1", "ed-2"]
+        assert all(key["use"] == "sig" and key["alg"] == "EdDSA" for key in keys)
+        assert all("d" not in key for key in keys)
+        assert jwt.PyJWK(keys[0]).key is not None
+
+    def test_rotation_keeps_retired_key_verifying(self, pems):
+        old = JWTKeySet("EdDSA", signing_keys={"ed-1": pems["ed-1"]}, active_kid="ed-1")
+        rotated = JWTKeySet(
+            "EdDSA",
+            signing_keys={"ed-2": pems["ed-2"]},
+            verification_keys={"ed-1": _public_pem(pems["ed-1"])},
+            active_kid="ed-2",
+        )
+        retired = JWTKeySet(
+            "EdDSA", signing_keys={"ed-2": pems["ed-2"]}, active_kid="ed-2"
+        )
+
+        assert _sign_and_decode(old, rotated)[1] is not None
+        assert _sign_and_decode(old, retired)[1] is None
+
+    def test_rejects_token_with_other_algorithm(self, pems):
+        hs256 = JWTKeySet("HS256", secret="test-secret")
+        eddsa = JWTKeySet(
+            "EdDSA", signing_keys={"ed-1": pems["ed-1"]}, active_kid="ed-1"
+        )
+
+        assert _sign_and_decode(hs256, eddsa)[1] is None
+        assert _sign_and_decode(eddsa, hs256)[1] is None
+
+    def test_hs256_has_no_kid_or_published_keys(self):
+        keyset = JWTKeySet("HS256", secret="test-secret")
+
+        token, payload = _sign_and_decode(keyset)
+
+        assert "kid" not in jwt.get_unverified_header(token)
+        assert payload is not None
+        assert keyset.jwks == {"keys": []}
+
+    def test_invalid_configuration(self, pems):
+        with pytest.raises(ValueError, match="JWT_ACTIVE_KID"):
+            JWTKeySet("EdDSA", signing_keys={"ed-1": pems["ed-1"]}, active_kid="x")
+        with pytest.raises(ValueError, match="not a private key"):
+            JWTKeySet(
+                "EdDSA",
+                signing_keys={"ed-1": _public_pem(pems["ed-1"])},
+                active_kid="ed-1",
+            )
+        with pytest.raises(ValueError, match="Invalid JWT key"):
+            JWTKeySet("ES256", signing_keys={"ed-1": pems["ed-1"]}, active_kid="ed-1")
+        with pytest.raises(ValueError, match="Unsupported"):
+            JWTKeySet("RS256")
+
+    def test_es256_requires_p256(self):
+        p384 = (
+            ec.generate_private_key(ec.SECP384R1())
+            .private_bytes(
+                serialization.Encoding.PEM,
+                serialization.PrivateFormat.PKCS8,
+                serialization.NoEncryption(),
+            )
+            .decode()
+        )
+
+        with pytest.raises(ValueError, match="P-256"):
+            JWTKeySet("ES256", signing_keys={"p384": p384}, active_kid="p384")
@@ -0,0 +1,174 @@
+"""
+Test suite for the batching RabbitMQ consumer.
+
+Run tests:
+    pytest tests/infrastructure/messaging/test_batch_consumer.py -v
+
+Run with coverage:
+    pytest tests/infrastructure/messaging/test_batch_consumer.py --cov=app.infrastructure.messaging.batch_consumer --cov-report=term-missing -v
+"""
+
+import asyncio
+import json
+import time
+from unittest.mock import AsyncMock, patch
+
+import aio_pika
+import pytest
+from pydantic import BaseModel
+
+from app.core.services.messaging_metrics import MessagingMetrics
+from app.infrastructure.messaging.batch_consumer import BatchConsumer, MessageBatcher
+from app.infrastructure.messaging.publisher import PUBLISHED_AT_HEADER
+
+
+def _message(body: bytes | dict) -> AsyncMock:
+    message = AsyncMock(spec=aio_pika.IncomingMessage)
+    message.body = body if isinstance(body, bytes) else json.dumps(body).encode()
+    message.headers = {}
+    return message
+
+
+class Event(BaseModel):
+    n: int
+
+
+def _consumer(
+    batch_handler, batch_size: int = 3, max_wait_ms: int = 20, payload_model=None
+):
+    return BatchConsumer(
+        batch_handler=batch_handler,
+        handler=AsyncMock(),
+        channel=AsyncMock(spec=aio_pika.Channel),
+        batch_size=batch_size,
+        max_wait_ms=max_wait_ms,
+        retry_queue="q_retry",
+        max_retries=3,
+        dead_letter_queue="q_dead",
+        payload_model=payload_model,
+    )
+
+
+class TestMessageBatcher:
+
+    def test_subclass_without_process_cannot_be_instantiated(self):
+        class IncompleteBatcher(MessageBatcher):
+            pass
+
+        with pytest.raises(TypeError):
+            IncompleteBatcher(batch_size=10, max_wait_ms=100)
+
+
+class TestBatchConsumer:
+
+    @pytest.mark.asyncio
+    async def test_flushes_when_batch_is_full(self):
+        batch_handler = AsyncMock()
+        consumer = _consumer(batch_handler, batch_size=2, max_wait_ms=60_000)
+        messages = [_message({"n": 1}), _message({"n": 2})]
+
+        for message in messages:
+            await consumer(message)
+
+        batch_handler.assert_awaited_once_with([{"n": 1}, {"n": 2}])
+        for message in messages:
+            message.ack.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_flushes_partial_batch_after_max_wait(self):
+        batch_handler = AsyncMock()
+        consumer = _consumer(batch_handler, batch_size=10, max_wait_ms=10)
+        message = _message({"n": 1})
+
+        await consumer(message)
+        batch_handler.assert_not_awaited()
+
+        await asyncio.sleep(0.05)
+
+        batch_handler.assert_awaited_once_with([{"n": 1}])
+        message.ack.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_does_not_ack_before_handler_returns(self):
+        acked_during_handler = []
+        messages = [_message({"n": 1})]
+
+        async def batch_handler(events):
+            acked_during_handler.append(messages[0].ack.await_count)
+
+        consumer = _consumer(batch_handler, batch_size=1)
+        await consumer(messages[0])
+
+        assert acked_during_handler == [0]
+        messages[0].ack.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_is_reprocessed_per_message(self):
+        batch_handler = AsyncMock(side_effect=RuntimeError("db down"))
+        consumer = _consumer(batch_handler, batch_size=2)
+        messages = [_message({"n": 1}), _message({"n": 2})]
+
+        with patch(
+            "app.infrastructure.messaging.batch_consumer.process_message",
+            new_callable=AsyncMock,
+        ) as mock_process:
+            for message in messages:
+                await consumer(message)
+
+        assert [c.args[0] for c in mock_process.await_args_list] == messages
+        kwargs = mock_process.await_args_list[0].kwargs
+        assert kwargs["handler"] is consumer.handler
+        assert kwargs["retry_queue"] == "q_retry"
+        assert kwargs["dead_letter_queue"] == "q_dead"
+        for message in messages:
+            message.ack.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_undecodable_message_goes_through_single_path(self):
+        batch_handler = AsyncMock()
+        consumer = _consumer(batch_handler, batch_size=2)
+        bad = _message(b"not json")
+        good = _message({"n": 1})
+
+        with patch(
+            "app.infrastructure.messaging.batch_consumer.process_message",
+            new_callable=AsyncMock,
+        ) as mock_process:
+            await consumer(bad)
+            await consumer(good)
+
+        mock_process.assert_awaited_once()
+        assert mock_process.await_args.args[0] is bad  # type: ignore[union-attr]
+        batch_handler.assert_awaited_once_with([{"n": 1}])
+        good.ack.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_payload_model_validates_events(self):
+        batch_handler = AsyncMock()
+        consumer = _consumer(batch_handler, batch_size=2, payload_model=Event)
+
+        await consumer(_message({"n": 1}))
+        await consumer(_message({"n": "x"}))
+
+        # Invalid payloads reach the handler as dicts so it can alert on them
+        batch_handler.assert_awaited_once_with([Event(n=1), {"n": "x"}])
+
+    @pytest.mark.asyncio
+    async def test_committed_batch_records_metrics(self):
+        metrics = MessagingMetrics()
+        batch_handler = AsyncMock()
+        consumer = _consumer(batch_handler, batch_size=2, max_wait_ms=60_000)
+        consumer.queue_name = "usage_commits"
+        published_at = int(time.time() * 1000) - 500
+
+        with patch(
+            "app.infrastructure.messaging.batch_consumer.messaging_metrics", metrics
+        ):
+            for n in (1, 2):
+                message = _message({"n": n})
+                message.headers = {PUBLISHED_AT_HEADER: published_at}
+                await consumer(message)
+
+        assert metrics.handler_seconds[("usage_commits", "AsyncMock")].count == 1
+        assert metrics.messages[("usage_commits", "acked")] == 2
+        assert metrics.time_in_queue_seconds["usage_commits"].count == 2
@@ -50,10 +50,18 @@ class TestCareerUsageHandlerImports:
         assert "career_usage_commits" in queue_names
 
         config = next(c for c in configs if c.name == "career_usage_commits")
-        assert config.retry_queue == "career_usage_commits_retry"
+        assert config.retry_queues is not None
+        assert [q.name for q in config.retry_queues] == [
+            "career_usage_commits_retry_5s",
+            "career_usage_commits_retry_30s",
+            "career_usage_commits_retry_2m",
+            "career_usage_commits_retry_10m",
+        ]
         assert config.dead_letter_queue == "career_usage_commits_dead"
-        assert config.max_retries == 3
-        assert config.retry_ttl == 30_000
+
+        from app.apps.cubex_career.schemas.internal import UsageCommitRequest
+
+        assert config.payload_model is UsageCommitRequest
 
 
 class TestCareerUsageHandlerValidation:
@@ -474,3 +482,76 @@ class TestCareerUsageHandlerErrorHandling:
                 ),
             ):
                 await handle_career_usage_commit(event)
+
+
+class TestCareerUsageHandlerBatch:
+
+    def test_batch_handler_in_all(self):
+        from app.infrastructure.messaging.handlers import career_usage_handler
+
+        assert "handle_career_usage_commit_batch" in career_usage_handler.__all__
+
+    @pytest.mark.asyncio
+    async def test_batch_commits_valid_events_in_one_transaction(self):
+        from app.infrastructure.messaging.handlers.career_usage_handler import (
+            handle_career_usage_commit_batch,
+        )
+
+        valid = {"user_id": str(uuid4()), "usage_id": str(uuid4()), "success": True}
+        invalid = {"bad_field": "value"}
+
+        mock_session = AsyncMock()
+        mock_context_manager = AsyncMock()
+        mock_context_manager.__aenter__ = AsyncMock(return_value=mock_session)
+        mock_context_manager.__aexit__ = AsyncMock(return_value=False)
+
+        with (
+            patch(
+                "app.infrastructure.messaging.handlers.career_usage_handler.AsyncSessionLocal.begin",
+                return_value=mock_context_manager,
+            ) as mock_begin,
+            patch(
+                "app.infrastructure.messaging.handlers.career_usage_handler.career_quota_service.commit_usage_batch",
+                new_callable=AsyncMock,
+                return_value=[(True, "Usage committed as SUCCESS.")],
+            ) as mock_commit,
+            patch(
+                "app.infrastructure.messaging.handlers.career_usage_handler.EmailManagerService.send_invalid_payload_alert",
+                new_callable=AsyncMock,
+            ) as mock_alert,
+        ):
+            await handle_career_usage_commit_batch([valid, invalid])
+
+        mock_begin.assert_called_once()
+        mock_alert.assert_awaited_once()
+        assert mock_alert.call_args.kwargs["queue_name"] == "career_usage_commits"
+        commits = mock_commit.call_args.args[1]
+        assert len(commits) == 1
+        assert str(commits[0][1].usage_log_id) == valid["usage_id"]
+        assert commits[0][1].success is True
+
+    @pytest.mark.asyncio
+    async def test_batch_processing_error_raises(self):
+        from app.infrastructure.messaging.handlers.career_usage_handler import (
+            handle_career_usage_commit_batch,
+        )
+
+        event = {"user_id": str(uuid4()), "usage_id": str(uuid4()), "success": True}
+
+        mock_context_manager = AsyncMock()
+        mock_context_manager.__aenter__ = AsyncMock(return_value=AsyncMock())
+        mock_context_manager.__aexit__ = AsyncMock(return_value=False)
+
+        with (
+            patch(
+                "app.infrastructure.messaging.handlers.career_usage_handler.AsyncSessionLocal.begin",
+                return_value=mock_context_manager,
+            ),
+            patch(
+                "app.infrastructure.messaging.handlers.career_usage_handler.career_quota_service.commit_usage_batch",
+                new_callable=AsyncMock,
+                side_effect=RuntimeError("db down"),
+            ),
+        ):
+            with pytest.raises(RuntimeError):
+                await handle_career_usage_commit_batch([event])
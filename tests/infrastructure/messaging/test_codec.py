@@ -0,0 +1,203 @@
+"""
+Test suite for the content-type message codecs.
+
+Run tests:
+    pytest tests/infrastructure/messaging/test_codec.py -v
+
+Run with coverage:
+    pytest tests/infrastructure/messaging/test_codec.py --cov=app.infrastructure.messaging.codec --cov-report=term-missing -v
+"""
+
+import json
+from decimal import Decimal
+from typing import Any
+from unittest.mock import AsyncMock
+from uuid import UUID, uuid4
+
+import aio_pika
+import pytest
+from pydantic import BaseModel
+
+from app.infrastructure.messaging import codec as codec_module
+from app.infrastructure.messaging.codec import (
+    JSONCodec,
+    MessageCodec,
+    MessageDecodeError,
+    UnsupportedContentTypeError,
+    body_text,
+    decode_event,
+    get_codec,
+    register_codec,
+)
+from app.infrastructure.messaging.errors import is_permanent_failure
+
+
+class Payload(BaseModel):
+    id: UUID
+    amount: Decimal
+    result_data: dict[str, Any] | None = None
+
+
+class ReversedJSONCodec(MessageCodec):
+    """A toy non-JSON wire format: JSON text, reversed."""
+
+    content_type = "application/x-reversed-json"
+
+    def encode(self, payload: Any) -> bytes:
+        return JSONCodec().encode(payload)[::-1]
+
+    def decode(self, body: bytes) -> Any:
+        return JSONCodec().decode(body[::-1])
+
+
+@pytest.fixture
+def reversed_codec():
+    codec = ReversedJSONCodec()
+    register_codec(codec)
+    yield codec
+    codec_module._CODECS.pop(codec.content_type)
+
+
+def _message(body: bytes, content_type: str | None = "application/json"):
+    message = AsyncMock(spec=aio_pika.IncomingMessage)
+    message.body = body
+    message.content_type = content_type
+    return message
+
+
+class TestGetCodec:
+
+    def test_missing_content_type_is_json(self):
+        assert isinstance(get_codec(None), JSONCodec)
+        assert isinstance(get_codec(""), JSONCodec)
+
+    def test_ignores_parameters_and_case(self):
+        assert isinstance(get_codec("Application/JSON; charset=utf-8"), JSONCodec)
+
+    def test_unknown_content_type_is_permanent(self):
+        with pytest.raises(UnsupportedContentTypeError) as exc_info:
+            get_codec("text/csv")
+
+        assert is_permanent_failure(exc_info.value)
+
+
+class TestMessageCodec:
+
+    def test_codec_without_decode_cannot_be_instantiated(self):
+        class EncodeOnlyCodec(MessageCodec):
+            content_type = "application/x-encode-only"
+
+            def encode(self, payload: Any) -> bytes:
+                return b""
+
+        with pytest.raises(TypeError):
+            EncodeOnlyCodec()
+
+
+class TestJSONCodec:
+
+    def test_round_trip(self):
+        codec = JSONCodec()
+        event_id = uuid4()
+
+        body = codec.encode({"id": event_id, "amount": Decimal("1.50")})
+
+        assert json.loads(body) == {"id": str(event_id), "amount": "1.50"}
+        assert codec.decode(body) == {"id": str(event_id), "amount": "1.50"}
+
+    def test_encodes_models(self):
+        payload = Payload(id=uuid4(), amount=Decimal("2"), result_data={"a": 1})
+
+        body = JSONCodec().encode(payload)
+
+        assert Payload.model_validate_json(body) == payload
+
+    def test_invalid_body_raises_decode_error(self):
+        with pytest.raises(MessageDecodeError):
+            JSONCodec().decode(b"not json")
+
+    def test_unserialisable_value_raises(self):
+        with pytest.raises(TypeError):
+            JSONCodec().encode({"value": object()})
+
+
+class TestMsgPackCodec:
+
+    def test_round_trip(self):
+        pytest.importorskip("msgpack")
+        from app.infrastructure.messaging.codec import MsgPackCodec
+
+        codec = MsgPackCodec()
+        payload = Payload(id=uuid4(), amount=Decimal("3.25"), result_data={"k": [1]})
+
+        body = codec.encode(payload)
+
+        assert isinstance(get_codec("application/msgpack"), MsgPackCodec)
+        assert codec.decode_model(body, Payload) == payload
+
+    def test_invalid_body_raises_decode_error(self):
+        pytest.importorskip("msgpack")
+        from app.infrastructure.messaging.codec import MsgPackCodec
+
+        with pytest.raises(MessageDecodeError):
+            MsgPackCodec().decode(b"\xc1")
+
+
+class TestDecodeEvent:
+
+    def test_without_model_returns_dict(self):
+        message = _message(b'{"n": 1}')
+
+        assert decode_event(message) == {"n": 1}
+
+    def test_with_model_returns_validated_model(self):
+        event_id = uuid4()
+        message = _message(f'{{"id": "{event_id}", "amount": "1.5"}}'.encode())
+
+        event = decode_event(message, Payload)
+
+        assert isinstance(event, Payload)
+        assert event.id == event_id
+        assert event.amount == Decimal("1.5")
+
+    def test_invalid_payload_falls_back_to_dict(self):
+        message = _message(b'{"id": "not-a-uuid"}')
+
+        assert decode_event(message, Payload) == {"id": "not-a-uuid"}
+
+    def test_undecodable_body_raises(self):
+        with pytest.raises(MessageDecodeError):
+            decode_event(_message(b"not json"), Payload)
+
+    def test_non_string_content_type_is_json(self):
+        message = _message(b'{"n": 1}')
+        message.content_type = AsyncMock()
+
+        assert decode_event(message) == {"n": 1}
+
+    def test_uses_message_content_type(self, reversed_codec):
+        event_id = uuid4()
+        body = reversed_codec.encode({"id": event_id, "amount": Decimal("4")})
+        message = _message(body, content_type=reversed_codec.content_type)
+
+        event = decode_event(message, Payload)
+
+        assert event == Payload(id=event_id, amount=Decimal("4"))
+
+
+class TestBodyText:
+
+    def test_json_body_is_returned_as_is(self):
+        assert body_text(_message(b'{"n": 1}')) == '{"n": 1}'
+
+    def test_other_codecs_are_rendered_as_json(self, reversed_codec):
+        message = _message(
+            reversed_codec.encode({"n": 1}), content_type=reversed_codec.content_type
+        )
+
+        assert json.loads(body_text(message)) == {"n": 1}
+
+    def test_undecodable_body_is_lossy_text(self):
+        message = _message(b"\xff\xfe", content_type="text/csv")
+
+        assert body_text(message) == "��"
@@ -105,3 +105,24 @@ class TestGetConnection:
 
             # Check it's a RobustConnection (or mock thereof)
             assert hasattr(result, "is_closed")
+
+    @pytest.mark.asyncio
+    async def test_local_broker_setting_returns_local_connection(self):
+        from app.infrastructure.messaging import connection as conn_module
+        from app.infrastructure.messaging.local_broker import LocalConnection
+
+        previous = conn_module._connection
+        conn_module._connection = None
+
+        with (
+            patch.object(conn_module.settings, "MESSAGING_BROKER", "local"),
+            patch("aio_pika.connect_robust", new_callable=AsyncMock) as mock_connect,
+        ):
+            result = await get_connection()
+            try:
+                assert isinstance(result, LocalConnection)
+                assert await get_connection() is result
+                mock_connect.assert_not_called()
+            finally:
+                await result.close()
+                conn_module._connection = previous
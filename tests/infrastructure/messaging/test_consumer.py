@@ -9,12 +9,18 @@ Run with coverage:
 """
 
 import json
+import time
 from unittest.mock import AsyncMock, patch
 
 import pytest
 import aio_pika
 
 from app.infrastructure.messaging.consumer import process_message
+from app.core.services.messaging_metrics import MessagingMetrics
+from app.infrastructure.messaging.errors import PermanentMessageError
+from app.infrastructure.messaging.publisher import PUBLISHED_AT_HEADER
+
+MODULE = "app.infrastructure.messaging.consumer"
 
 
 class TestProcessMessage:
@@ -450,3 +456,274 @@ class TestDeadLetterHeaderEnrichment:
 
                 call_kwargs = mock_msg_cls.call_args[1]
                 assert "x-original-queue" not in call_kwargs["headers"]
+
+
+class TestProcessMessageBackoff:
+
+    def _message(self, headers=None):
+        mock_message = AsyncMock(spec=aio_pika.IncomingMessage)
+        mock_message.body = json.dumps({"data": "test"}).encode()
+        mock_message.headers = headers or {}
+        mock_context = AsyncMock()
+        mock_context.__aenter__ = AsyncMock()
+        mock_context.__aexit__ = AsyncMock()
+        mock_message.process.return_value = mock_context
+        return mock_message
+
+    @pytest.mark.asyncio
+    async def test_retry_is_spread_across_tier_queues(self):
+        async def failing_handler(event):
+            raise ConnectionError("db down")
+
+        mock_channel = AsyncMock(spec=aio_pika.Channel)
+        mock_channel.default_exchange = AsyncMock()
+        tier = {
+            "name": "q_retry_30s",
+            "ttl": 30_000,
+            "spread": [
+                {"name": "q_retry_30s_1", "ttl": 27_000},
+                {"name": "q_retry_30s_2", "ttl": 24_000},
+            ],
+        }
+
+        with patch("aio_pika.Message"):
+            for _ in range(50):
+                await process_message(
+                    self._message({"x-retry-attempt": 1}),
+                    failing_handler,
+                    mock_channel,
+                    retry_queues=[{"name": "q_retry_5s", "ttl": 5_000}, tier],
+                )
+
+        routing_keys = {
+            call.kwargs["routing_key"]
+            for call in mock_channel.default_exchange.publish.call_args_list
+        }
+        assert routing_keys == {"q_retry_30s", "q_retry_30s_1", "q_retry_30s_2"}
+
+    @pytest.mark.asyncio
+    async def test_tier_without_spread_uses_its_queue(self):
+        async def failing_handler(event):
+            raise ConnectionError("db down")
+
+        mock_channel = AsyncMock(spec=aio_pika.Channel)
+        mock_channel.default_exchange = AsyncMock()
+
+        with patch("aio_pika.Message") as mock_message_class:
+            await process_message(
+                self._message(),
+                failing_handler,
+                mock_channel,
+                retry_queues=[{"name": "q_retry_5s", "ttl": 5_000}],
+            )
+
+        publish_kwargs = mock_channel.default_exchange.publish.call_args.kwargs
+        assert publish_kwargs["routing_key"] == "q_retry_5s"
+        # The queue TTL alone sets the delay
+        assert "expiration" not in mock_message_class.call_args.kwargs
+
+    @pytest.mark.asyncio
+    async def test_permanent_failure_skips_retries(self):
+        mock_message = self._message()
+
+        async def failing_handler(event):
+            raise PermanentMessageError("unknown workspace")
+
+        mock_channel = AsyncMock(spec=aio_pika.Channel)
+        mock_channel.default_exchange = AsyncMock()
+
+        with (
+            patch("aio_pika.Message") as mock_message_class,
+            patch(
+                "app.infrastructure.messaging.consumer.EmailManagerService.send_dlq_alert",
+                new_callable=AsyncMock,
+            ),
+        ):
+            await process_message(
+                mock_message,
+                failing_handler,
+                mock_channel,
+                retry_queues=[{"name": "q_retry_5s", "ttl": 5_000}],
+                dead_letter_queue="q_dead",
+            )
+
+        publish_kwargs = mock_channel.default_exchange.publish.call_args.kwargs
+        assert publish_kwargs["routing_key"] == "q_dead"
+        headers = mock_message_class.call_args.kwargs["headers"]
+        assert headers["x-failure-class"] == "permanent"
+        assert "x-retry-attempt" not in headers
+        mock_message.reject.assert_called_once_with(requeue=False)
+
+    @pytest.mark.asyncio
+    async def test_exhausted_transient_failure_marked_transient(self):
+        mock_message = self._message({"x-retry-attempt": 1})
+
+        async def failing_handler(event):
+            raise ConnectionError("db down")
+
+        mock_channel = AsyncMock(spec=aio_pika.Channel)
+        mock_channel.default_exchange = AsyncMock()
+
+        with (
+            patch("aio_pika.Message") as mock_message_class,
+            patch(
+                "app.infrastructure.messaging.consumer.EmailManagerService.send_dlq_alert",
+                new_callable=AsyncMock,
+            ),
+        ):
+            await process_message(
+                mock_message,
+                failing_handler,
+                mock_channel,
+                retry_queues=[{"name": "q_retry_5s", "ttl": 5_000}],
+                dead_letter_queue="q_dead",
+            )
+
+        headers = mock_message_class.call_args.kwargs["headers"]
+        assert headers["x-failure-class"] == "transient"
+
+
+class TestProcessMessageCodec:
+
+    def _message(self, body: bytes, content_type: str | None = "application/json"):
+        mock_message = AsyncMock(spec=aio_pika.IncomingMessage)
+        mock_message.body = body
+        mock_message.headers = {}
+        mock_message.content_type = content_type
+        mock_message.process.return_value = AsyncMock()
+        return mock_message
+
+    @pytest.mark.asyncio
+    async def test_handler_receives_payload_model(self):
+        from pydantic import BaseModel
+
+        class Event(BaseModel):
+            user_id: int
+
+        received = []
+
+        async def handler(event):
+            received.append(event)
+
+        await process_message(
+            self._message(b'{"user_id": 7}'),
+            handler,
+            AsyncMock(spec=aio_pika.Channel),
+            payload_model=Event,
+        )
+
+        assert received == [Event(user_id=7)]
+
+    @pytest.mark.asyncio
+    async def test_unsupported_content_type_is_dead_lettered(self):
+        mock_message = self._message(b"a,b", content_type="text/csv")
+        handler = AsyncMock()
+        mock_channel = AsyncMock(spec=aio_pika.Channel)
+        mock_channel.default_exchange = AsyncMock()
+
+        with patch(
+            "app.infrastructure.messaging.consumer.EmailManagerService.send_dlq_alert",
+            new_callable=AsyncMock,
+        ):
+            await process_message(
+                mock_message,
+                handler,
+                mock_channel,
+                retry_queue="q_retry",
+                dead_letter_queue="q_dead",
+            )
+
+        handler.assert_not_awaited()
+        published = mock_channel.default_exchange.publish.call_args
+        assert published.kwargs["routing_key"] == "q_dead"
+        assert published.args[0].content_type == "text/csv"
+        assert published.args[0].headers["x-failure-class"] == "permanent"
+
+    @pytest.mark.asyncio
+    async def test_retry_keeps_content_type(self):
+        mock_message = self._message(b'{"n": 1}', content_type="application/json")
+        mock_channel = AsyncMock(spec=aio_pika.Channel)
+        mock_channel.default_exchange = AsyncMock()
+
+        await process_message(
+            mock_message,
+            AsyncMock(side_effect=ConnectionError("down")),
+            mock_channel,
+            retry_queue="q_retry",
+        )
+
+        published = mock_channel.default_exchange.publish.call_args
+        assert published.kwargs["routing_key"] == "q_retry"
+        assert published.args[0].content_type == "application/json"
+
+
+class TestProcessMessageMetrics:
+
+    def _message(self, headers=None):
+        mock_message = AsyncMock(spec=aio_pika.IncomingMessage)
+        mock_message.body = json.dumps({"data": "test"}).encode()
+        mock_message.headers = headers or {}
+        mock_message.routing_key = "emails"
+        mock_context = AsyncMock()
+        mock_context.__aenter__ = AsyncMock()
+        mock_context.__aexit__ = AsyncMock()
+        mock_message.process.return_value = mock_context
+        return mock_message
+
+    @pytest.mark.asyncio
+    async def test_success_records_handler_time_and_time_in_queue(self):
+        metrics = MessagingMetrics()
+        published_at = int((time.time() - 1) * 1000)
+
+        async def send_email(event):
+            pass
+
+        with patch(f"{MODULE}.messaging_metrics", metrics):
+            await process_message(
+                self._message({PUBLISHED_AT_HEADER: published_at}),
+                send_email,
+                AsyncMock(spec=aio_pika.Channel),
+            )
+
+        handler_key = ("emails", send_email.__qualname__)
+        assert metrics.handler_seconds[handler_key].count == 1
+        assert metrics.messages[("emails", "acked")] == 1
+        assert metrics.time_in_queue_seconds["emails"].sum >= 1
+
+    @pytest.mark.asyncio
+    async def test_failures_count_by_outcome(self):
+        metrics = MessagingMetrics()
+        mock_channel = AsyncMock(spec=aio_pika.Channel)
+        mock_channel.default_exchange = AsyncMock()
+        handler = AsyncMock(side_effect=ConnectionError("down"))
+
+        with (
+            patch(f"{MODULE}.messaging_metrics", metrics),
+            patch(f"{MODULE}.EmailManagerService.send_dlq_alert", new=AsyncMock()),
+        ):
+            await process_message(
+                self._message(),
+                handler,
+                mock_channel,
+                retry_queue="emails_retry",
+                max_retries=1,
+                queue_name="email_queue",
+            )
+            await process_message(
+                self._message({"x-retry-attempt": 1}),
+                handler,
+                mock_channel,
+                retry_queue="emails_retry",
+                max_retries=1,
+                dead_letter_queue="emails_dead",
+                queue_name="email_queue",
+            )
+            await process_message(self._message(), handler, mock_channel)
+
+        assert metrics.messages == {
+            ("email_queue", "retried"): 1,
+            ("email_queue", "dead_lettered"): 1,
+            ("emails", "dropped"): 1,
+        }
+        assert metrics.handler_seconds[("email_queue", "AsyncMock")].count == 2
+        assert not metrics.time_in_queue_seconds
@@ -14,6 +14,7 @@ import pytest
 import aio_pika
 
 from app.infrastructure.messaging.handlers.dlq_handler import (
+    DLQBatchConsumer,
     _sanitise_headers,
     handle_dlq_message,
 )
@@ -264,3 +265,106 @@ class TestHandleDLQMessage:
         added = mock_session.add.call_args[0][0]
         # Should not raise — `errors="replace"` is used in handler
         assert isinstance(added.message_body, str)
+
+
+# ---------------------------------------------------------------------------
+# DLQBatchConsumer
+# ---------------------------------------------------------------------------
+
+
+class TestDLQBatchConsumer:
+
+    @staticmethod
+    def _message(n: int) -> AsyncMock:
+        msg = AsyncMock(spec=aio_pika.IncomingMessage)
+        msg.body = f'{{"n": {n}}}'.encode()
+        msg.headers = {"x-retry-attempt": 4, "x-error-message": b"timeout"}
+        return msg
+
+    @staticmethod
+    def _patch_begin():
+        begin_ctx = MagicMock()
+        begin_ctx.__aenter__ = AsyncMock(return_value=MagicMock())
+        begin_ctx.__aexit__ = AsyncMock(return_value=False)
+        return patch(
+            "app.infrastructure.messaging.handlers.dlq_handler.AsyncSessionLocal.begin",
+            return_value=begin_ctx,
+        )
+
+    @pytest.mark.asyncio
+    async def test_full_batch_is_written_with_one_copy(self):
+        consumer = DLQBatchConsumer("otp_emails_dead", batch_size=3, max_wait_ms=60_000)
+        messages = [self._message(n) for n in range(3)]
+
+        with (
+            self._patch_begin(),
+            patch(
+                "app.infrastructure.messaging.handlers.dlq_handler.dlq_message_db.copy_insert",
+                new_callable=AsyncMock,
+            ) as mock_copy,
+        ):
+            for msg in messages:
+                await consumer(msg)
+
+        mock_copy.assert_awaited_once()
+        rows = mock_copy.await_args.args[1]  # type: ignore[union-attr]
+        assert [row["message_body"] for row in rows] == [
+            '{"n": 0}',
+            '{"n": 1}',
+            '{"n": 2}',
+        ]
+        assert rows[0]["queue_name"] == "otp_emails_dead"
+        assert rows[0]["attempt_count"] == 4
+        assert rows[0]["error_message"] == "timeout"
+        assert rows[0]["status"] == DLQMessageStatus.PENDING
+        assert mock_copy.await_args.kwargs["commit_self"] is False  # type: ignore[union-attr]
+        for msg in messages:
+            msg.ack.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_partial_batch_is_written_on_drain(self):
+        consumer = DLQBatchConsumer(
+            "otp_emails_dead", batch_size=10, max_wait_ms=60_000
+        )
+        msg = self._message(1)
+
+        with (
+            self._patch_begin(),
+            patch(
+                "app.infrastructure.messaging.handlers.dlq_handler.dlq_message_db.copy_insert",
+                new_callable=AsyncMock,
+            ) as mock_copy,
+        ):
+            await consumer(msg)
+            mock_copy.assert_not_awaited()
+            await consumer.drain()
+
+        mock_copy.assert_awaited_once()
+        msg.ack.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_falls_back_to_single_writes(self):
+        consumer = DLQBatchConsumer("otp_emails_dead", batch_size=2, max_wait_ms=60_000)
+        messages = [self._message(n) for n in range(2)]
+
+        with (
+            self._patch_begin(),
+            patch(
+                "app.infrastructure.messaging.handlers.dlq_handler.dlq_message_db.copy_insert",
+                new_callable=AsyncMock,
+                side_effect=Exception("DB down"),
+            ),
+            patch(
+                "app.infrastructure.messaging.handlers.dlq_handler.handle_dlq_message",
+                new_callable=AsyncMock,
+            ) as mock_single,
+        ):
+            for msg in messages:
+                await consumer(msg)
+
+        assert [c.args for c in mock_single.await_args_list] == [
+            (messages[0], "otp_emails_dead"),
+            (messages[1], "otp_emails_dead"),
+        ]
+        for msg in messages:
+            msg.ack.assert_not_awaited()
@@ -0,0 +1,94 @@
+"""
+Test suite for message handler failure classification.
+
+Run tests:
+    pytest tests/infrastructure/messaging/test_errors.py -v
+
+Run with coverage:
+    pytest tests/infrastructure/messaging/test_errors.py --cov=app.infrastructure.messaging.errors --cov-report=term-missing -v
+"""
+
+import json
+
+import pytest
+from pydantic import BaseModel, ValidationError
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+from app.core.exceptions.types import (
+    BadRequestException,
+    DatabaseException,
+    NotFoundException,
+    RateLimitException,
+    StripeAPIException,
+)
+from app.infrastructure.messaging.errors import (
+    PermanentMessageError,
+    TransientMessageError,
+    is_permanent_failure,
+)
+
+
+class _Payload(BaseModel):
+    value: int
+
+
+def _validation_error() -> ValidationError:
+    try:
+        _Payload.model_validate({"value": "x"})
+    except ValidationError as e:
+        return e
+    raise AssertionError("expected a validation error")
+
+
+def _raised_from(error: Exception, cause: Exception) -> Exception:
+    try:
+        raise error from cause
+    except Exception as e:
+        return e
+
+
+class TestIsPermanentFailure:
+
+    @pytest.mark.parametrize(
+        "error",
+        [
+            PermanentMessageError("bad"),
+            json.JSONDecodeError("bad", "doc", 0),
+            KeyError("missing"),
+            BadRequestException("bad"),
+            NotFoundException("gone"),
+        ],
+    )
+    def test_permanent(self, error):
+        assert is_permanent_failure(error) is True
+
+    def test_validation_error_is_permanent(self):
+        assert is_permanent_failure(_validation_error()) is True
+
+    @pytest.mark.parametrize(
+        "error",
+        [
+            Exception("boom"),
+            ValueError("connection timed out"),
+            TransientMessageError("later"),
+            ConnectionError("reset"),
+            RateLimitException(),
+            StripeAPIException(),
+        ],
+    )
+    def test_transient(self, error):
+        assert is_permanent_failure(error) is False
+
+    def test_database_exception_follows_cause(self):
+        integrity = IntegrityError("INSERT", {}, Exception("duplicate key"))
+        operational = OperationalError("SELECT 1", {}, Exception("conn lost"))
+
+        assert is_permanent_failure(_raised_from(DatabaseException("dup"), integrity))
+        assert not is_permanent_failure(
+            _raised_from(DatabaseException("down"), operational)
+        )
+
+    def test_explicit_transient_wins_over_cause(self):
+        error = _raised_from(TransientMessageError("retry"), KeyError("x"))
+
+        assert is_permanent_failure(error) is False
@@ -0,0 +1,295 @@
+"""
+Test suite for the in-process message broker.
+
+Run tests:
+    pytest tests/infrastructure/messaging/test_local_broker.py -v
+
+Run with coverage:
+    pytest tests/infrastructure/messaging/test_local_broker.py --cov=app.infrastructure.messaging.local_broker --cov-report=term-missing -v
+"""
+
+import asyncio
+from functools import partial
+from unittest.mock import AsyncMock, patch
+
+import aio_pika
+import pytest
+
+from app.infrastructure.messaging.consumer import process_message
+from app.infrastructure.messaging.errors import PermanentMessageError
+from app.infrastructure.messaging.local_broker import LocalConnection
+from app.infrastructure.messaging.publisher import ChannelPoolPublisher
+from app.infrastructure.messaging.runtime import ConsumerRuntime
+
+
+@pytest.fixture
+async def connection():
+    conn = LocalConnection(max_queue_size=100)
+    yield conn
+    await conn.close()
+
+
+async def _until(predicate, timeout: float = 2.0) -> None:
+    async with asyncio.timeout(timeout):
+        while not predicate():
+            await asyncio.sleep(0.005)
+
+
+class _Recorder:
+    """Handler that records events and fails the first ``failures`` calls."""
+
+    def __init__(self, failures: int = 0, error: Exception | None = None):
+        self.events: list = []
+        self.failures = failures
+        self.error = error or RuntimeError("transient")
+
+    async def __call__(self, event) -> None:
+        self.events.append(event)
+        if len(self.events) <= self.failures:
+            raise self.error
+
+
+class TestPublishAndConsume:
+
+    @pytest.mark.asyncio
+    async def test_published_events_reach_handler(self, connection: LocalConnection):
+        publisher = ChannelPoolPublisher(
+            max_channels=2, confirm_timeout=1, batch_size=10
+        )
+        channel = await connection.channel()
+        queue = await channel.declare_queue("orders", durable=True)
+        handler = _Recorder()
+        await queue.consume(partial(process_message, handler=handler, channel=channel))
+
+        with patch(
+            "app.infrastructure.messaging.publisher.get_connection",
+            new=AsyncMock(return_value=connection),
+        ):
+            await publisher.publish_many([("orders", {"n": 1}), ("orders", {"n": 2})])
+        await _until(lambda: len(handler.events) == 2)
+
+        assert handler.events == [{"n": 1}, {"n": 2}]
+        assert connection.broker.queues["orders"].message_count == 0
+
+    @pytest.mark.asyncio
+    async def test_undeclared_queue_drops_message(self, connection: LocalConnection):
+        channel = await connection.channel()
+
+        await channel.default_exchange.publish(
+            aio_pika.Message(b"{}"), routing_key="nowhere"
+        )
+
+        assert "nowhere" not in connection.broker.queues
+
+    @pytest.mark.asyncio
+    async def test_runtime_drain_waits_for_handlers(self, connection: LocalConnection):
+        channel = await connection.channel()
+        queue = await channel.declare_queue("slow", durable=True)
+        release = asyncio.Event()
+        done: list = []
+
+        async def handler(event):
+            await release.wait()
+            done.append(event)
+
+        runtime = ConsumerRuntime(max_in_flight=4)
+        await runtime.consume(
+            queue,  # type: ignore[arg-type]
+            partial(process_message, handler=handler, channel=channel),  # type: ignore[arg-type]
+            concurrency=2,
+            priority=0,
+        )
+        await channel.default_exchange.publish(
+            aio_pika.Message(b'{"n": 1}'), routing_key="slow"
+        )
+        await _until(lambda: runtime.in_flight == 1)
+
+        drain = asyncio.create_task(runtime.drain(timeout=2))
+        release.set()
+
+        assert await drain is True
+        assert done == [{"n": 1}]
+
+
+class TestRetryAndDeadLetter:
+
+    async def _declare(self, connection: LocalConnection, retry_ttl_ms: int):
+        channel = await connection.channel()
+        main = await channel.declare_queue("jobs", durable=True)
+        await channel.declare_queue(
+            "jobs_retry",
+            durable=True,
+            arguments={
+                "x-message-ttl": retry_ttl_ms,
+                "x-dead-letter-exchange": "",
+                "x-dead-letter-routing-key": "jobs",
+            },
+        )
+        dead = await channel.declare_queue("jobs_dead", durable=True)
+        return channel, main, dead
+
+    @pytest.mark.asyncio
+    async def test_retry_queue_ttl_feeds_back_into_main_queue(
+        self, connection: LocalConnection
+    ):
+        channel, main, _ = await self._declare(connection, retry_ttl_ms=20)
+        handler = _Recorder(failures=1)
+        await main.consume(
+            partial(
+                process_message,
+                handler=handler,
+                channel=channel,
+                retry_queues=[{"name": "jobs_retry", "ttl": 20}],
+                dead_letter_queue="jobs_dead",
+            )
+        )
+
+        await channel.default_exchange.publish(
+            aio_pika.Message(b'{"n": 1}'), routing_key="jobs"
+        )
+        await _until(lambda: len(handler.events) == 2)
+
+        assert handler.events == [{"n": 1}, {"n": 1}]
+
+    @pytest.mark.asyncio
+    async def test_permanent_failure_is_dead_lettered(
+        self, connection: LocalConnection
+    ):
+        channel, main, dead = await self._declare(connection, retry_ttl_ms=20)
+        handler = _Recorder(failures=1, error=PermanentMessageError("bad"))
+        dead_letters: list = []
+
+        async def collect(message):
+            dead_letters.append(message)
+            await message.ack()
+
+        await main.consume(
+            partial(
+                process_message,
+                handler=handler,
+                channel=channel,
+                retry_queues=[{"name": "jobs_retry", "ttl": 20}],
+                dead_letter_queue="jobs_dead",
+            )
+        )
+        await dead.consume(collect)
+
+        with patch(
+            "app.infrastructure.messaging.consumer.EmailManagerService.send_dlq_alert",
+            new_callable=AsyncMock,
+        ):
+            await channel.default_exchange.publish(
+                aio_pika.Message(b'{"n": 1}'), routing_key="jobs"
+            )
+            await _until(lambda: len(dead_letters) == 1)
+
+        headers = dead_letters[0].headers
+        assert headers["x-error-message"] == "bad"
+        assert headers["x-original-queue"] == "jobs"
+        assert len(handler.events) == 1
+
+    @pytest.mark.asyncio
+    async def test_per_message_expiration_shortens_queue_ttl(
+        self, connection: LocalConnection
+    ):
+        channel, main, _ = await self._declare(connection, retry_ttl_ms=60_000)
+        received: list = []
+
+        async def collect(message):
+            received.append(message)
+            await message.ack()
+
+        await main.consume(collect)
+        await channel.default_exchange.publish(
+            aio_pika.Message(b"{}", expiration=0.01), routing_key="jobs_retry"
+        )
+
+        await _until(lambda: len(received) == 1)
+
+
+class TestFlowControl:
+
+    @pytest.mark.asyncio
+    async def test_full_queue_blocks_publisher(self):
+        conn = LocalConnection(max_queue_size=1)
+        channel = await conn.channel()
+        queue = await channel.declare_queue("tiny", durable=True)
+        exchange = channel.default_exchange
+        try:
+            await exchange.publish(aio_pika.Message(b"1"), routing_key="tiny")
+            with pytest.raises(TimeoutError):
+                await exchange.publish(
+                    aio_pika.Message(b"2"), routing_key="tiny", timeout=0.05
+                )
+
+            received: list = []
+
+            async def collect(message):
+                received.append(message.body)
+                await message.ack()
+
+            await queue.consume(collect)
+            await exchange.publish(aio_pika.Message(b"3"), routing_key="tiny")
+            await _until(lambda: len(received) == 2)
+        finally:
+            await conn.close()
+
+        assert received == [b"1", b"3"]
+
+    @pytest.mark.asyncio
+    async def test_prefetch_limits_unsettled_deliveries(
+        self, connection: LocalConnection
+    ):
+        channel = await connection.channel()
+        await channel.set_qos(prefetch_count=1)
+        queue = await channel.declare_queue("limited", durable=True)
+        held: list = []
+
+        async def hold(message):
+            held.append(message)
+
+        await queue.consume(hold)
+        for body in (b"1", b"2"):
+            await channel.default_exchange.publish(
+                aio_pika.Message(body), routing_key="limited"
+            )
+        await _until(lambda: len(held) == 1)
+        await asyncio.sleep(0.02)
+        assert len(held) == 1
+
+        await held[0].ack()
+        await _until(lambda: len(held) == 2)
+
+    @pytest.mark.asyncio
+    async def test_closing_channel_requeues_unsettled(
+        self, connection: LocalConnection
+    ):
+        first = await connection.channel()
+        queue = await first.declare_queue("work", durable=True)
+        held: list = []
+
+        async def hold(message):
+            held.append(message)
+
+        await queue.consume(hold)
+        await first.default_exchange.publish(aio_pika.Message(b"x"), routing_key="work")
+        await _until(lambda: len(held) == 1)
+        await first.close()
+
+        second = await connection.channel()
+        queue = await second.declare_queue("work", durable=True)
+        await queue.consume(hold)
+        await _until(lambda: len(held) == 2)
+
+        assert held[1].redelivered is True
+        assert held[1].body == b"x"
+
+
+class TestPassiveDeclare:
+
+    @pytest.mark.asyncio
+    async def test_unknown_queue_raises(self, connection: LocalConnection):
+        channel = await connection.channel()
+
+        with pytest.raises(LookupError):
+            await channel.declare_queue("missing", passive=True)
@@ -10,13 +10,22 @@ Run with coverage:
 
 import asyncio
 from functools import partial
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, call, patch
 
 import pytest
 import aio_pika
 
+from app.core.config import settings
+from app.infrastructure.messaging.batch_consumer import BatchConsumer
+from app.infrastructure.messaging.handlers.dlq_handler import DLQBatchConsumer
 from app.infrastructure.messaging.main import start_consumers
-from app.infrastructure.messaging.queues import QueueConfig, RetryQueue
+from app.infrastructure.messaging.queues import (
+    BackoffPolicy,
+    QueueConfig,
+    RetryQueue,
+    get_queue_configs,
+)
+from app.infrastructure.messaging.runtime import LimitedConsumer
 
 
 class TestStartConsumers:
@@ -53,8 +62,9 @@ class TestStartConsumers:
             result = await start_consumers(keep_alive=False)
 
             mock_get_conn.assert_called_once()
-            mock_connection.channel.assert_called_once()
-            mock_channel.set_qos.assert_called_once_with(prefetch_count=10)
+            # Shared declaration channel plus one channel for the queue
+            assert mock_connection.channel.call_count == 2
+            mock_channel.set_qos.assert_any_call(prefetch_count=10)
 
             mock_channel.declare_queue.assert_called_once_with(
                 "test_queue", durable=True
@@ -287,7 +297,9 @@ class TestStartConsumers:
             mock_main_queue.consume.assert_called_once()
             consume_call = mock_main_queue.consume.call_args
 
-            consumer_callback = consume_call.args[0]
+            limited = consume_call.args[0]
+            assert isinstance(limited, LimitedConsumer)
+            consumer_callback = limited.callback
             assert isinstance(consumer_callback, partial)
 
             assert consumer_callback.func.__name__ == "process_message"
@@ -303,11 +315,15 @@ class TestStartConsumers:
             # DLQ consumer
             mock_dlq_queue.consume.assert_called_once()
             dlq_call = mock_dlq_queue.consume.call_args
-            dlq_callback = dlq_call.args[0]
-            assert isinstance(dlq_callback, partial)
-            assert dlq_callback.func.__name__ == "handle_dlq_message"
-            assert dlq_callback.keywords["queue_name"] == "test_dead"
+            dlq_callback = dlq_call.args[0].callback
+            assert isinstance(dlq_callback, DLQBatchConsumer)
+            assert dlq_callback.queue_name == "test_dead"
+            assert dlq_callback.batch_size == settings.DLQ_INGEST_BATCH_SIZE
             assert dlq_call.kwargs["no_ack"] is False
+            # DLQ consumers get their own channel sized for two batches
+            mock_channel.set_qos.assert_any_call(
+                prefetch_count=2 * settings.DLQ_INGEST_BATCH_SIZE
+            )
 
             assert result == mock_connection
 
@@ -390,7 +406,128 @@ class TestStartConsumers:
 
             await start_consumers(keep_alive=False)
 
-            mock_channel.set_qos.assert_called_once_with(prefetch_count=10)
+            # Declaration channel and the queue's own channel (email class)
+            assert mock_channel.set_qos.call_args_list == [
+                call(prefetch_count=10),
+                call(prefetch_count=10),
+            ]
+
+    @pytest.mark.asyncio
+    async def test_start_consumers_batch_queue_uses_own_channel(self):
+        mock_connection = AsyncMock(spec=aio_pika.RobustConnection)
+        mock_channel = AsyncMock(spec=aio_pika.Channel)
+        mock_batch_channel = AsyncMock(spec=aio_pika.Channel)
+        mock_dlq_channel = AsyncMock(spec=aio_pika.Channel)
+        mock_queue = AsyncMock()
+
+        mock_connection.channel = AsyncMock(
+            side_effect=[mock_channel, mock_batch_channel, mock_dlq_channel]
+        )
+        mock_batch_channel.declare_queue = AsyncMock(return_value=mock_queue)
+        mock_queue.consume = AsyncMock()
+
+        def sample_handler(msg):
+            pass
+
+        async def sample_batch_handler(msgs):
+            pass
+
+        queue_config = QueueConfig(
+            name="test_queue",
+            handler=sample_handler,
+            batch_handler=sample_batch_handler,
+            batch_size=25,
+            batch_max_wait_ms=50,
+            dead_letter_queue="test_queue_dead",
+        )
+
+        with (
+            patch(
+                "app.infrastructure.messaging.main.get_connection",
+                new_callable=AsyncMock,
+            ) as mock_get_conn,
+            patch(
+                "app.infrastructure.messaging.main.get_queue_configs"
+            ) as mock_get_configs,
+        ):
+            mock_get_conn.return_value = mock_connection
+            mock_get_configs.return_value = [queue_config]
+
+            await start_consumers(keep_alive=False)
+
+        mock_batch_channel.set_qos.assert_called_once_with(prefetch_count=50)
+        mock_batch_channel.declare_queue.assert_called_once_with(
+            "test_queue", durable=True
+        )
+        consumer = mock_queue.consume.call_args.args[0].callback
+        assert isinstance(consumer, BatchConsumer)
+        assert consumer.batch_handler is sample_batch_handler
+        assert consumer.handler is sample_handler
+        assert consumer.channel is mock_batch_channel
+        assert consumer.batch_size == 25
+        assert consumer.max_wait_ms == 50
+        assert consumer.dead_letter_queue == "test_queue_dead"
+        mock_dlq_channel.declare_queue.assert_called_once_with(
+            "test_queue_dead", durable=True
+        )
+
+    @pytest.mark.asyncio
+    async def test_start_consumers_declares_backoff_tiers(self):
+        mock_connection = AsyncMock(spec=aio_pika.RobustConnection)
+        mock_channel = AsyncMock(spec=aio_pika.Channel)
+        mock_queue = AsyncMock()
+
+        mock_connection.channel = AsyncMock(return_value=mock_channel)
+        mock_channel.declare_queue = AsyncMock(return_value=mock_queue)
+
+        def sample_handler(msg):
+            pass
+
+        queue_config = QueueConfig(
+            name="test_queue",
+            handler=sample_handler,
+            retry_policy=BackoffPolicy(delays_ms=[5_000, 120_000], jitter=0.3),
+        )
+
+        with (
+            patch(
+                "app.infrastructure.messaging.main.get_connection",
+                new_callable=AsyncMock,
+            ) as mock_get_conn,
+            patch(
+                "app.infrastructure.messaging.main.get_queue_configs"
+            ) as mock_get_configs,
+        ):
+            mock_get_conn.return_value = mock_connection
+            mock_get_configs.return_value = [queue_config]
+
+            await start_consumers(keep_alive=False)
+
+        mock_channel.declare_queue.assert_any_call(
+            "test_queue_retry_2m",
+            durable=True,
+            arguments={
+                "x-message-ttl": 120_000,
+                "x-dead-letter-exchange": "",
+                "x-dead-letter-routing-key": "test_queue",
+            },
+        )
+        # Jitter queues of a tier are declared with shorter TTLs
+        mock_channel.declare_queue.assert_any_call(
+            "test_queue_retry_2m_3",
+            durable=True,
+            arguments={
+                "x-message-ttl": 84_000,
+                "x-dead-letter-exchange": "",
+                "x-dead-letter-routing-key": "test_queue",
+            },
+        )
+        consumer_callback = mock_queue.consume.call_args.args[0].callback
+        assert "retry_jitter" not in consumer_callback.keywords
+        assert [q["name"] for q in consumer_callback.keywords["retry_queues"]] == [
+            "test_queue_retry_5s",
+            "test_queue_retry_2m",
+        ]
 
     @pytest.mark.asyncio
     async def test_start_consumers_keep_alive_true_runs_forever(self):
@@ -478,12 +615,12 @@ class TestStartConsumers:
             await start_consumers(keep_alive=False)
 
             mock_queue.consume.assert_called_once()
-            consumer_callback = mock_queue.consume.call_args.args[0]
+            consumer_callback = mock_queue.consume.call_args.args[0].callback
 
             retry_queues = consumer_callback.keywords["retry_queues"]
             assert retry_queues == [
-                {"name": "retry1", "ttl": 30000},
-                {"name": "retry2", "ttl": 60000},
+                {"name": "retry1", "ttl": 30000, "spread": []},
+                {"name": "retry2", "ttl": 60000, "spread": []},
             ]
 
     @pytest.mark.asyncio
@@ -537,3 +674,128 @@ class TestStartConsumers:
             queue_returns[0].consume.assert_called_once()
 
             assert result == mock_connection
+
+
+class TestSelectQueueConfigs:
+
+    def test_all_queues_by_default(self):
+        from app.infrastructure.messaging.main import select_queue_configs
+
+        get_queue_configs.cache_clear()
+        assert select_queue_configs() == get_queue_configs()
+
+    def test_filters_by_name(self):
+        from app.infrastructure.messaging.main import select_queue_configs
+
+        configs = select_queue_configs(["usage_commits", "career_usage_commits"])
+
+        assert {c.name for c in configs} == {"usage_commits", "career_usage_commits"}
+
+    def test_unknown_queue_raises(self):
+        from app.infrastructure.messaging.main import select_queue_configs
+
+        with pytest.raises(ValueError, match="no_such_queue"):
+            select_queue_configs(["no_such_queue"])
+
+
+class TestParseArgs:
+
+    def test_defaults(self):
+        from app.infrastructure.messaging.main import parse_args
+
+        args = parse_args([])
+
+        assert args.workers == 1
+        assert args.queues is None
+
+    def test_workers_and_queues(self):
+        from app.infrastructure.messaging.main import parse_args
+
+        args = parse_args(["--workers", "4", "--queues", "usage_commits, otp_emails"])
+
+        assert args.workers == 4
+        assert args.queues == ["usage_commits", "otp_emails"]
+
+    def test_invalid_workers_rejected(self):
+        from app.infrastructure.messaging.main import parse_args
+
+        with pytest.raises(SystemExit):
+            parse_args(["--workers", "0"])
+
+    def test_unknown_queue_rejected(self):
+        from app.infrastructure.messaging.main import parse_args
+
+        with pytest.raises(SystemExit):
+            parse_args(["--queues", "no_such_queue"])
+
+    def test_local_broker_rejected(self):
+        from app.infrastructure.messaging.main import parse_args
+
+        with (
+            patch(
+                "app.infrastructure.messaging.main.settings.MESSAGING_BROKER", "local"
+            ),
+            pytest.raises(SystemExit),
+        ):
+            parse_args([])
+
+
+class _FakeProcess:
+    def __init__(self, exitcode: int | None, target=None, args=(), name=""):
+        self.name = name
+        self.exitcode = exitcode
+        self.started = False
+        self.terminated = False
+
+    def start(self):
+        self.started = True
+
+    def is_alive(self):
+        return self.exitcode is None
+
+    def terminate(self):
+        self.terminated = True
+        self.exitcode = 0
+
+    def kill(self):
+        self.exitcode = -9
+
+    def join(self):
+        pass
+
+
+class TestRunWorkers:
+
+    def _run(self, exitcodes):
+        from app.infrastructure.messaging import main as messaging_main
+
+        processes = []
+
+        def make_process(**kwargs):
+            process = _FakeProcess(exitcodes[len(processes)], **kwargs)
+            processes.append(process)
+            return process
+
+        context = MagicMock()
+        context.Process = make_process
+        with (
+            patch.object(
+                messaging_main.multiprocessing, "get_context", return_value=context
+            ),
+            patch.object(messaging_main.signal, "signal"),
+            patch.object(messaging_main.time, "sleep"),
+        ):
+            code = messaging_main.run_workers(len(exitcodes), ["otp_emails"])
+        return code, processes
+
+    def test_clean_exit(self):
+        code, processes = self._run([0, 0])
+
+        assert code == 0
+        assert all(p.started for p in processes)
+
+    def test_unexpected_exit_stops_other_workers(self):
+        code, processes = self._run([1, None])
+
+        assert code == 1
+        assert processes[1].terminated
@@ -0,0 +1,126 @@
+"""
+Test suite for the OTP audit handler.
+
+Run all tests:
+    pytest tests/infrastructure/messaging/test_otp_audit_handler.py -v
+
+Run with coverage:
+    pytest tests/infrastructure/messaging/test_otp_audit_handler.py \
+        --cov=app.infrastructure.messaging.handlers.otp_audit_handler \
+        --cov-report=term-missing -v
+"""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import UUID, uuid4
+
+import pytest
+
+from app.core.enums import OTPPurpose
+from app.infrastructure.messaging.handlers.otp_audit_handler import handle_otp_audit
+
+MODULE = "app.infrastructure.messaging.handlers.otp_audit_handler"
+
+
+@pytest.fixture
+def mock_session():
+    with patch(f"{MODULE}.AsyncSessionLocal") as mock_session_local:
+        session = AsyncMock()
+        context = AsyncMock()
+        context.__aenter__.return_value = session
+        mock_session_local.begin.return_value = context
+        yield session
+
+
+@pytest.fixture
+def mock_db():
+    with patch(f"{MODULE}.otp_token_db") as mock_db:
+        mock_db.get_by_id = AsyncMock(return_value=None)
+        mock_db.invalidate_previous_tokens = AsyncMock(return_value=1)
+        mock_db.create = AsyncMock()
+        mock_db.update = AsyncMock()
+        yield mock_db
+
+
+def _event(action: str, **extra) -> dict:
+    return {
+        "action": action,
+        "id": str(uuid4()),
+        "user_id": None,
+        "email": "user@example.com",
+        "purpose": OTPPurpose.EMAIL_VERIFICATION.value,
+        "code_hash": "hash-1",
+        "expires_at": (datetime.now(timezone.utc) + timedelta(minutes=10)).isoformat(),
+        **extra,
+    }
+
+
+def _used_event() -> dict:
+    return _event("used", used_at=datetime.now(timezone.utc).isoformat(), attempts=2)
+
+
+class TestOTPAuditHandler:
+
+    def test_registered_in_queue_config(self):
+        from app.infrastructure.messaging.queues import (
+            ConsumerPriority,
+            get_queue_configs,
+        )
+
+        get_queue_configs.cache_clear()
+        config = next(c for c in get_queue_configs() if c.name == "otp_audit")
+
+        assert config.handler is handle_otp_audit
+        assert config.priority == ConsumerPriority.AUDIT
+
+    @pytest.mark.asyncio
+    async def test_issued_replaces_previous_tokens(self, mock_session, mock_db):
+        event = _event("issued")
+
+        await handle_otp_audit(event)
+
+        mock_db.invalidate_previous_tokens.assert_awaited_once_with(
+            session=mock_session,
+            email="user@example.com",
+            purpose=OTPPurpose.EMAIL_VERIFICATION,
+            commit_self=False,
+        )
+        data = mock_db.create.await_args.kwargs["data"]
+        assert data["id"] == UUID(event["id"])
+        assert data["user_id"] is None
+
+    @pytest.mark.asyncio
+    async def test_issued_is_idempotent(self, mock_session, mock_db):
+        mock_db.get_by_id.return_value = MagicMock()
+
+        await handle_otp_audit(_event("issued"))
+
+        mock_db.invalidate_previous_tokens.assert_not_awaited()
+        mock_db.create.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_used_updates_recorded_token(self, mock_session, mock_db):
+        mock_db.get_by_id.return_value = MagicMock()
+        event = _used_event()
+
+        await handle_otp_audit(event)
+
+        mock_db.update.assert_awaited_once()
+        assert mock_db.update.await_args.kwargs["updates"] == {
+            "used_at": datetime.fromisoformat(event["used_at"]),
+            "attempts": 2,
+        }
+
+    @pytest.mark.asyncio
+    async def test_used_before_issued_creates_token(self, mock_session, mock_db):
+        await handle_otp_audit(_used_event())
+
+        data = mock_db.create.await_args.kwargs["data"]
+        assert data["attempts"] == 2 and data["used_at"] is not None
+        mock_db.update.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_unknown_action_is_dropped(self, mock_session, mock_db):
+        await handle_otp_audit({"action": "other"})
+
+        mock_db.get_by_id.assert_not_awaited()
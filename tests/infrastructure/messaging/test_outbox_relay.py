@@ -0,0 +1,198 @@
+"""
+Test suite for the outbox relay.
+
+Run tests:
+    pytest tests/infrastructure/messaging/test_outbox_relay.py -v
+
+Run with coverage:
+    pytest tests/infrastructure/messaging/test_outbox_relay.py --cov=app.infrastructure.messaging.outbox_relay --cov-report=term-missing -v
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.db.crud import outbox_event_db
+from app.core.services import event_publisher
+from app.core.services.outbox import OutboxPublisher, OutboxWriter
+from app.infrastructure.messaging import outbox_relay
+from app.infrastructure.messaging.outbox_relay import (
+    OutboxRelay,
+    register_event_publisher,
+)
+
+MODULE = "app.infrastructure.messaging.outbox_relay"
+
+
+class _SessionFactory:
+    """Runs each relay transaction in a savepoint of the test session."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    @asynccontextmanager
+    async def begin(self):
+        async with self.session.begin_nested():
+            yield self.session
+
+
+def _relay(db_session: AsyncSession, publish: AsyncMock, **kwargs) -> OutboxRelay:
+    return OutboxRelay(
+        publish=publish,
+        session_factory=_SessionFactory(db_session),  # type: ignore[arg-type]
+        **kwargs,
+    )
+
+
+async def _enqueue(db_session: AsyncSession, count: int) -> None:
+    await OutboxWriter(db_session).publish_many(
+        [("otp_emails", {"n": i}, {"x-trace": f"t{i}"}) for i in range(count)]
+    )
+    await db_session.flush()
+
+
+class TestRelayOnce:
+
+    @pytest.mark.asyncio
+    async def test_publishes_and_marks_batch(self, db_session: AsyncSession):
+        await _enqueue(db_session, 3)
+        publish = AsyncMock(return_value=2)
+        relay = _relay(db_session, publish, batch_size=2)
+
+        assert await relay.relay_once() == 2
+
+        (outgoing,) = publish.await_args.args
+        assert [(q, e) for q, e, _ in outgoing] == [
+            ("otp_emails", {"n": 0}),
+            ("otp_emails", {"n": 1}),
+        ]
+        headers = outgoing[0][2]
+        assert headers["x-trace"] == "t0"
+        assert "x-outbox-id" in headers
+        remaining = await outbox_event_db.claim_batch(db_session, 10)
+        assert [e.payload for e in remaining] == [{"n": 2}]
+
+    @pytest.mark.asyncio
+    async def test_empty_outbox_publishes_nothing(self, db_session: AsyncSession):
+        publish = AsyncMock()
+
+        assert await _relay(db_session, publish).relay_once() == 0
+        publish.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_failure_keeps_batch_pending(self, db_session: AsyncSession):
+        await _enqueue(db_session, 2)
+        publish = AsyncMock(side_effect=ConnectionError("broker down"))
+
+        with pytest.raises(ConnectionError):
+            await _relay(db_session, publish).relay_once()
+
+        events = await outbox_event_db.get_all(db_session, limit=10)
+        assert len(events) == 2
+        for event in events:
+            await db_session.refresh(event)
+            assert event.attempts == 1
+            assert event.last_error == "broker down"
+            assert event.published_at is None
+            assert event.next_attempt_at is not None
+        # Backing off: not claimed again right away
+        assert await outbox_event_db.claim_batch(db_session, 10) == []
+
+    @pytest.mark.asyncio
+    async def test_unpublishable_event_does_not_block_the_batch(
+        self, db_session: AsyncSession
+    ):
+        await _enqueue(db_session, 3)
+
+        async def publish(outgoing):
+            if any(event == {"n": 0} for _, event, _ in outgoing):
+                raise ValueError("cannot encode")
+            return len(outgoing)
+
+        relay = _relay(db_session, AsyncMock(side_effect=publish))
+
+        assert await relay.relay_once() == 2
+
+        (poison,) = [
+            e
+            for e in await outbox_event_db.get_all(db_session, limit=10)
+            if e.published_at is None
+        ]
+        await db_session.refresh(poison)
+        assert poison.payload == {"n": 0}
+        assert poison.attempts == 1
+        assert poison.last_error == "cannot encode"
+
+    @pytest.mark.asyncio
+    async def test_exhausted_events_are_skipped(self, db_session: AsyncSession):
+        await _enqueue(db_session, 2)
+        (first,) = await outbox_event_db.claim_batch(db_session, 1)
+        await outbox_event_db.update(
+            db_session, first.id, {"attempts": 3}, commit_self=False
+        )
+        publish = AsyncMock(return_value=1)
+
+        assert await _relay(db_session, publish, max_attempts=3).relay_once() == 1
+
+        (outgoing,) = publish.await_args.args
+        assert [event for _, event, _ in outgoing] == [{"n": 1}]
+
+
+class TestRun:
+
+    def test_backoff_doubles_up_to_cap(self):
+        relay = OutboxRelay(publish=AsyncMock(), poll_interval=1, max_backoff=5)
+
+        delays = []
+        for failures in range(1, 5):
+            relay._failures = failures
+            delays.append(relay._next_delay())
+
+        assert delays == [2, 4, 5, 5]
+
+    @pytest.mark.asyncio
+    async def test_start_and_stop(self):
+        relay = OutboxRelay(publish=AsyncMock(), poll_interval=0.01)
+        calls = 0
+
+        async def relay_once():
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                raise ConnectionError("broker down")
+            return 0
+
+        with patch.object(relay, "relay_once", side_effect=relay_once):
+            relay.start()
+            while calls < 3:
+                await asyncio.sleep(0.01)
+            await relay.stop()
+
+        assert relay._task is None
+        assert relay._failures == 0
+
+
+class TestRegisterEventPublisher:
+
+    @pytest.mark.asyncio
+    async def test_outbox_enabled(self):
+        with (
+            patch(f"{MODULE}.settings.EVENT_OUTBOX_ENABLED", True),
+            patch.object(OutboxRelay, "start") as mock_start,
+        ):
+            relay = register_event_publisher()
+
+        assert isinstance(relay, OutboxRelay)
+        mock_start.assert_called_once()
+        assert isinstance(event_publisher.get_publisher(), OutboxPublisher)
+
+    @pytest.mark.asyncio
+    async def test_outbox_disabled_publishes_directly(self):
+        with patch(f"{MODULE}.settings.EVENT_OUTBOX_ENABLED", False):
+            relay = register_event_publisher()
+
+        assert relay is None
+        assert event_publisher.get_publisher() is outbox_relay.publish_event
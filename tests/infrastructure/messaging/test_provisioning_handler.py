@@ -0,0 +1,91 @@
+"""
+Test suite for the user provisioning handler.
+
+Run all tests:
+    pytest tests/infrastructure/messaging/test_provisioning_handler.py -v
+
+Run with coverage:
+    pytest tests/infrastructure/messaging/test_provisioning_handler.py \
+        --cov=app.infrastructure.messaging.handlers.provisioning_handler \
+        --cov-report=term-missing -v
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.infrastructure.messaging.handlers.provisioning_handler import (
+    handle_user_provisioning,
+)
+
+MODULE = "app.infrastructure.messaging.handlers.provisioning_handler"
+
+
+@pytest.fixture
+def mock_session():
+    with patch(f"{MODULE}.AsyncSessionLocal") as mock_session_local:
+        session = AsyncMock()
+        context = AsyncMock()
+        context.__aenter__.return_value = session
+        mock_session_local.begin.return_value = context
+        yield session
+
+
+@pytest.fixture
+def mock_user_db():
+    with patch(f"{MODULE}.user_db") as mock_db:
+        mock_db.claim_for_provisioning = AsyncMock(return_value=None)
+        yield mock_db
+
+
+class TestUserProvisioningHandler:
+
+    def test_registered_in_queue_config(self):
+        from app.infrastructure.messaging.queues import (
+            ConsumerPriority,
+            get_queue_configs,
+        )
+
+        get_queue_configs.cache_clear()
+        config = next(c for c in get_queue_configs() if c.name == "user_provisioning")
+
+        assert config.handler is handle_user_provisioning
+        assert config.priority == ConsumerPriority.EMAIL
+        assert config.dead_letter_queue == "user_provisioning_dead"
+
+    @pytest.mark.asyncio
+    async def test_provisions_claimed_user(self, mock_session, mock_user_db):
+        user = MagicMock(id=uuid4())
+        mock_user_db.claim_for_provisioning.return_value = user
+
+        with patch(
+            f"{MODULE}.provision_user", new_callable=AsyncMock
+        ) as mock_provision:
+            await handle_user_provisioning({"user_id": str(user.id)})
+
+        mock_user_db.claim_for_provisioning.assert_awaited_once_with(
+            session=mock_session, id=user.id
+        )
+        mock_provision.assert_awaited_once_with(mock_session, user)
+
+    @pytest.mark.asyncio
+    async def test_skips_provisioned_or_locked_user(self, mock_session, mock_user_db):
+        with patch(
+            f"{MODULE}.provision_user", new_callable=AsyncMock
+        ) as mock_provision:
+            await handle_user_provisioning({"user_id": str(uuid4())})
+
+        mock_provision.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_hook_failure_raises_for_retry(self, mock_session, mock_user_db):
+        mock_user_db.claim_for_provisioning.return_value = MagicMock(id=uuid4())
+
+        with patch(
+            f"{MODULE}.provision_user",
+            new_callable=AsyncMock,
+            side_effect=ValueError("Free Career plan not found"),
+        ):
+            with pytest.raises(ValueError):
+                await handle_user_provisioning({"user_id": str(uuid4())})
@@ -8,13 +8,15 @@ Run with coverage:
     pytest app/tests/infrastructure/messaging/test_publisher.py --cov=app.infrastructure.messaging.publisher --cov-report=term-missing -v
 """
 
+import asyncio
 import json
+import time
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 import aio_pika
 
-from app.infrastructure.messaging.publisher import publish_event
+from app.infrastructure.messaging.publisher import PUBLISHED_AT_HEADER, publish_event
 
 
 class TestPublishEvent:
@@ -102,10 +104,10 @@ class TestPublishEvent:
             mock_message_class.assert_called_once()
             call_kwargs = mock_message_class.call_args[1]
 
-            assert call_kwargs["body"] == json.dumps(event_data).encode()
+            assert json.loads(call_kwargs["body"]) == event_data
             assert call_kwargs["content_type"] == "application/json"
             assert call_kwargs["delivery_mode"] == aio_pika.DeliveryMode.PERSISTENT
-            assert call_kwargs["headers"] == {}
+            assert list(call_kwargs["headers"]) == [PUBLISHED_AT_HEADER]
 
     @pytest.mark.asyncio
     async def test_publish_event_persistent_delivery(self):
@@ -218,4 +220,289 @@ class TestPublishEvent:
             await publish_event("test_queue", {"data": "test"})
 
             call_kwargs = mock_message_class.call_args[1]
-            assert call_kwargs["headers"] == {}
+            assert list(call_kwargs["headers"]) == [PUBLISHED_AT_HEADER]
+
+    @pytest.mark.asyncio
+    async def test_publish_event_stamps_publish_time(self):
+        mock_connection = AsyncMock(spec=aio_pika.RobustConnection)
+        mock_channel = AsyncMock(spec=aio_pika.Channel)
+        mock_channel.is_closed = False
+        mock_channel.default_exchange = AsyncMock()
+        mock_connection.channel = AsyncMock(return_value=mock_channel)
+
+        with patch(
+            "app.infrastructure.messaging.publisher.get_connection",
+            new_callable=AsyncMock,
+            return_value=mock_connection,
+        ):
+            before = int(time.time() * 1000)
+            await publish_event("test_queue", {"data": "test"}, {"x-trace": "t"})
+            await publish_event("test_queue", {}, {PUBLISHED_AT_HEADER: 1234})
+
+        first, second = [
+            c.args[0].headers
+            for c in mock_channel.default_exchange.publish.call_args_list
+        ]
+        assert first["x-trace"] == "t"
+        assert before <= first[PUBLISHED_AT_HEADER] <= int(time.time() * 1000)
+        # A timestamp supplied by the caller (e.g. a republish) is kept
+        assert second[PUBLISHED_AT_HEADER] == 1234
+
+
+def _mock_connection(closed: bool = False):
+    """Connection whose channel() returns a fresh open channel per call."""
+    connection = AsyncMock(spec=aio_pika.RobustConnection)
+
+    async def open_channel(**kwargs):
+        channel = AsyncMock(spec=aio_pika.Channel)
+        channel.is_closed = closed
+        channel.default_exchange = AsyncMock()
+        return channel
+
+    connection.channel = AsyncMock(side_effect=open_channel)
+    return connection
+
+
+@pytest.fixture
+def pool_publisher():
+    from app.infrastructure.messaging.publisher import ChannelPoolPublisher
+
+    return ChannelPoolPublisher(max_channels=2, confirm_timeout=5, batch_size=2)
+
+
+class TestChannelPoolPublisher:
+
+    @pytest.mark.asyncio
+    async def test_channel_and_queue_declaration_are_reused(self, pool_publisher):
+        connection = _mock_connection()
+
+        with patch(
+            "app.infrastructure.messaging.publisher.get_connection",
+            new_callable=AsyncMock,
+            return_value=connection,
+        ):
+            for _ in range(3):
+                await pool_publisher.publish("test_queue", {"n": 1})
+
+        connection.channel.assert_called_once_with(publisher_confirms=True)
+        assert pool_publisher.open_channels == 1
+
+    @pytest.mark.asyncio
+    async def test_declares_each_queue_once(self, pool_publisher):
+        connection = _mock_connection()
+        with patch(
+            "app.infrastructure.messaging.publisher.get_connection",
+            new_callable=AsyncMock,
+            return_value=connection,
+        ):
+            await pool_publisher.publish("a", {})
+            await pool_publisher.publish("a", {})
+            await pool_publisher.publish("b", {})
+
+        channel = pool_publisher._idle[0]
+        declared = [c.args[0] for c in channel.declare_queue.call_args_list]
+        assert declared == ["a", "b"]
+        assert channel.default_exchange.publish.call_count == 3
+        assert channel.default_exchange.publish.call_args.kwargs["timeout"] == 5
+
+    @pytest.mark.asyncio
+    async def test_pool_is_bounded(self, pool_publisher):
+        connection = _mock_connection()
+        release = asyncio.Event()
+        in_flight = 0
+        peak = 0
+
+        async def slow_publish(*args, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await release.wait()
+            in_flight -= 1
+
+        async def open_channel(**kwargs):
+            channel = AsyncMock(spec=aio_pika.Channel)
+            channel.is_closed = False
+            channel.default_exchange = AsyncMock()
+            channel.default_exchange.publish.side_effect = slow_publish
+            return channel
+
+        connection.channel = AsyncMock(side_effect=open_channel)
+
+        with patch(
+            "app.infrastructure.messaging.publisher.get_connection",
+            new_callable=AsyncMock,
+            return_value=connection,
+        ):
+            tasks = [
+                asyncio.create_task(pool_publisher.publish("q", {"n": n}))
+                for n in range(5)
+            ]
+            await asyncio.sleep(0.01)
+            assert peak == 2
+            release.set()
+            await asyncio.gather(*tasks)
+
+        assert connection.channel.call_count == 2
+        assert pool_publisher.open_channels == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_channel_is_discarded(self, pool_publisher):
+        connection = _mock_connection()
+        with patch(
+            "app.infrastructure.messaging.publisher.get_connection",
+            new_callable=AsyncMock,
+            return_value=connection,
+        ):
+            await pool_publisher.publish("q", {})
+            channel = pool_publisher._idle[0]
+            channel.default_exchange.publish.side_effect = RuntimeError("nack")
+
+            with pytest.raises(RuntimeError):
+                await pool_publisher.publish("q", {})
+
+        channel.close.assert_awaited_once()
+        assert pool_publisher.open_channels == 0
+
+    @pytest.mark.asyncio
+    async def test_new_connection_resets_pool(self, pool_publisher):
+        first, second = _mock_connection(), _mock_connection()
+        with patch(
+            "app.infrastructure.messaging.publisher.get_connection",
+            new_callable=AsyncMock,
+            side_effect=[first, second],
+        ):
+            await pool_publisher.publish("q", {})
+            await pool_publisher.publish("q", {})
+
+        first.channel.assert_called_once()
+        second.channel.assert_called_once()
+        channel = pool_publisher._idle[0]
+        channel.declare_queue.assert_called_once_with("q", durable=True)
+
+    @pytest.mark.asyncio
+    async def test_publish_many_batches_on_one_channel(self, pool_publisher):
+        connection = _mock_connection()
+        with patch(
+            "app.infrastructure.messaging.publisher.get_connection",
+            new_callable=AsyncMock,
+            return_value=connection,
+        ):
+            count = await pool_publisher.publish_many(
+                [
+                    ("emails", {"n": 1}),
+                    ("emails", {"n": 2}, {"x-priority": "high"}),
+                    ("usage", {"n": 3}),
+                ]
+            )
+
+        assert count == 3
+        connection.channel.assert_called_once()
+        channel = pool_publisher._idle[0]
+        assert [c.args[0] for c in channel.declare_queue.call_args_list] == [
+            "emails",
+            "usage",
+        ]
+        publishes = channel.default_exchange.publish.call_args_list
+        assert [c.kwargs["routing_key"] for c in publishes] == [
+            "emails",
+            "emails",
+            "usage",
+        ]
+        assert json.loads(publishes[1].args[0].body) == {"n": 2}
+        assert publishes[1].args[0].headers["x-priority"] == "high"
+
+    @pytest.mark.asyncio
+    async def test_publishes_models_with_codec_content_type(self):
+        from pydantic import BaseModel
+
+        from app.infrastructure.messaging.codec import MessageCodec
+        from app.infrastructure.messaging.publisher import ChannelPoolPublisher
+
+        class Event(BaseModel):
+            n: int
+
+        class UpperCodec(MessageCodec):
+            content_type = "application/x-upper"
+
+            def encode(self, payload):
+                return payload.model_dump_json().upper().encode()
+
+            def decode(self, body):
+                return body.decode()
+
+        publisher = ChannelPoolPublisher(
+            max_channels=1, confirm_timeout=5, batch_size=2, codec=UpperCodec()
+        )
+        connection = _mock_connection()
+        with patch(
+            "app.infrastructure.messaging.publisher.get_connection",
+            new_callable=AsyncMock,
+            return_value=connection,
+        ):
+            await publisher.publish("events", Event(n=1))
+
+        message = publisher._idle[0].default_exchange.publish.call_args.args[0]
+        assert message.body == b'{"N":1}'
+        assert message.content_type == "application/x-upper"
+
+    @pytest.mark.asyncio
+    async def test_publish_many_empty(self, pool_publisher):
+        with patch(
+            "app.infrastructure.messaging.publisher.get_connection",
+            new_callable=AsyncMock,
+        ) as mock_get_conn:
+            assert await pool_publisher.publish_many([]) == 0
+
+        mock_get_conn.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_close(self, pool_publisher):
+        connection = _mock_connection()
+        with patch(
+            "app.infrastructure.messaging.publisher.get_connection",
+            new_callable=AsyncMock,
+            return_value=connection,
+        ):
+            await pool_publisher.publish("q", {})
+        channel = pool_publisher._idle[0]
+
+        await pool_publisher.close()
+
+        channel.close.assert_awaited_once()
+        assert pool_publisher.open_channels == 0
+
+
+class TestBatchPublisherRegistry:
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_single_publisher(self):
+        from app.core.services.event_publisher import (
+            get_batch_publisher,
+            register_publisher,
+            reset_publisher,
+        )
+
+        single = AsyncMock()
+        register_publisher(single)
+        try:
+            count = await get_batch_publisher()([("a", {"n": 1}), ("b", {}, {"h": 1})])
+        finally:
+            reset_publisher()
+
+        assert count == 2
+        single.assert_any_await("a", {"n": 1})
+        single.assert_any_await("b", {}, {"h": 1})
+
+    def test_registered_batch_publisher_is_used(self):
+        from app.core.services.event_publisher import (
+            get_batch_publisher,
+            register_publisher,
+            reset_publisher,
+        )
+
+        batch = AsyncMock()
+        register_publisher(AsyncMock(), batch)
+        try:
+            assert get_batch_publisher() is batch
+        finally:
+            reset_publisher()
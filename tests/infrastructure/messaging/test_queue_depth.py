@@ -0,0 +1,117 @@
+"""
+Test suite for queue depth polling.
+
+Run tests:
+    pytest tests/infrastructure/messaging/test_queue_depth.py -v
+
+Run with coverage:
+    pytest tests/infrastructure/messaging/test_queue_depth.py --cov=app.infrastructure.messaging.queue_depth --cov-report=term-missing -v
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import aio_pika
+import pytest
+
+from app.core.services.messaging_metrics import MessagingMetrics
+from app.infrastructure.messaging.local_broker import LocalConnection
+from app.infrastructure.messaging.queue_depth import (
+    QueueDepthPoller,
+    configured_queue_names,
+)
+from app.infrastructure.messaging.queues import get_queue_configs
+
+MODULE = "app.infrastructure.messaging.queue_depth"
+
+
+@pytest.fixture
+async def connection():
+    conn = LocalConnection(max_queue_size=100)
+    yield conn
+    await conn.close()
+
+
+class TestConfiguredQueueNames:
+
+    def test_includes_retry_and_dead_letter_queues(self):
+        names = configured_queue_names()
+
+        for q in get_queue_configs():
+            assert q.name in names
+            if q.dead_letter_queue:
+                assert q.dead_letter_queue in names
+            for retry in q.retry_queues or []:
+                assert all(tier_queue.name in names for tier_queue in retry.queues())
+        assert len(names) == len(set(names))
+
+
+class TestQueueDepthPoller:
+
+    @pytest.mark.asyncio
+    async def test_records_depth_from_passive_declare(
+        self, connection: LocalConnection
+    ):
+        channel = await connection.channel()
+        await channel.declare_queue("emails", durable=True)
+        for body in (b"1", b"2"):
+            await channel.default_exchange.publish(
+                aio_pika.Message(body), routing_key="emails"
+            )
+        metrics = MessagingMetrics()
+        poller = QueueDepthPoller(["emails", "missing"], metrics)
+
+        with patch(f"{MODULE}.get_connection", new=AsyncMock(return_value=connection)):
+            await poller.poll_once()
+
+        depth = metrics.queue_depth["emails"]
+        assert (depth.messages, depth.consumers) == (2, 0)
+        assert depth.polled_at is not None
+        # Passive declares never create queues
+        assert "missing" not in connection.broker.queues
+        assert metrics.queue_depth["missing"].error is not None
+
+    @pytest.mark.asyncio
+    async def test_reopens_channel_closed_by_missing_queue(self):
+        closed = AsyncMock()
+        closed.is_closed = False
+
+        async def passive_declare(name, passive):
+            closed.is_closed = True
+            raise aio_pika.exceptions.ChannelClosed(404, "NOT_FOUND")
+
+        closed.declare_queue = AsyncMock(side_effect=passive_declare)
+        healthy = AsyncMock()
+        healthy.is_closed = False
+        healthy.declare_queue.return_value.declaration_result.message_count = 3
+        healthy.declare_queue.return_value.declaration_result.consumer_count = 1
+        connection = AsyncMock()
+        connection.channel = AsyncMock(side_effect=[closed, healthy])
+        metrics = MessagingMetrics()
+
+        with patch(f"{MODULE}.get_connection", new=AsyncMock(return_value=connection)):
+            await QueueDepthPoller(["gone", "emails"], metrics).poll_once()
+
+        assert metrics.queue_depth["gone"].error is not None
+        assert metrics.queue_depth["emails"].messages == 3
+        closed.close.assert_not_awaited()
+        healthy.close.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_start_and_stop(self):
+        poller = QueueDepthPoller(["emails"], MessagingMetrics())
+        polls = 0
+
+        async def poll_once():
+            nonlocal polls
+            polls += 1
+            if polls == 1:
+                raise ConnectionError("broker down")
+
+        with patch.object(poller, "poll_once", side_effect=poll_once):
+            poller.start(0.01)
+            while polls < 2:
+                await asyncio.sleep(0.01)
+            await poller.stop()
+
+        assert poller._task is None
@@ -12,6 +12,9 @@ import pytest
 from pydantic import ValidationError
 
 from app.infrastructure.messaging.queues import (
+    PRIORITY_LIMITS,
+    BackoffPolicy,
+    ConsumerPriority,
     QueueConfig,
     RetryQueue,
     get_queue_configs,
@@ -167,6 +170,139 @@ class TestQueueConfig:
             )
 
 
+class TestBackoffPolicy:
+
+    def test_tiers_named_after_delays(self):
+        policy = BackoffPolicy(delays_ms=[5_000, 30_000, 120_000, 600_000, 1_500])
+
+        tiers = policy.tiers("usage_commits")
+
+        assert [t.name for t in tiers] == [
+            "usage_commits_retry_5s",
+            "usage_commits_retry_30s",
+            "usage_commits_retry_2m",
+            "usage_commits_retry_10m",
+            "usage_commits_retry_1500ms",
+        ]
+        assert [t.ttl for t in tiers] == [5_000, 30_000, 120_000, 600_000, 1_500]
+
+    def test_jitter_spreads_each_tier_over_shorter_ttls(self):
+        policy = BackoffPolicy(delays_ms=[30_000], jitter=0.2, jitter_queues=3)
+
+        (tier,) = policy.tiers("usage_commits")
+
+        assert [(q.name, q.ttl) for q in tier.queues()] == [
+            ("usage_commits_retry_30s", 30_000),
+            ("usage_commits_retry_30s_1", 27_000),
+            ("usage_commits_retry_30s_2", 24_000),
+        ]
+
+    def test_no_jitter_means_one_queue_per_tier(self):
+        policy = BackoffPolicy(delays_ms=[5_000, 30_000])
+
+        assert all(tier.spread == [] for tier in policy.tiers("usage_commits"))
+
+    def test_jitter_must_be_a_fraction(self):
+        with pytest.raises(ValidationError):
+            BackoffPolicy(delays_ms=[1_000], jitter=1.5)
+
+    def test_requires_a_tier(self):
+        with pytest.raises(ValidationError):
+            BackoffPolicy(delays_ms=[])
+
+    def test_queue_config_generates_retry_queues(self):
+        config = QueueConfig(
+            name="test_queue",
+            handler=lambda msg: None,
+            retry_policy=BackoffPolicy(delays_ms=[5_000, 60_000], jitter=0.1),
+        )
+
+        assert config.retry_queues is not None
+        assert [q.name for q in config.retry_queues] == [
+            "test_queue_retry_5s",
+            "test_queue_retry_1m",
+        ]
+        assert [q.name for q in config.retry_queues[0].queues()] == [
+            "test_queue_retry_5s",
+            "test_queue_retry_5s_1",
+            "test_queue_retry_5s_2",
+            "test_queue_retry_5s_3",
+        ]
+
+    def test_policy_exclusive_with_explicit_retry_queues(self):
+        with pytest.raises(ValidationError):
+            QueueConfig(
+                name="test_queue",
+                handler=lambda msg: None,
+                retry_queue="test_retry",
+                retry_ttl=1_000,
+                retry_policy=BackoffPolicy(delays_ms=[5_000]),
+            )
+
+    def test_configured_queues_use_backoff_tiers(self):
+        get_queue_configs.cache_clear()
+
+        for config in get_queue_configs():
+            assert config.retry_policy is not None
+            assert config.retry_queues is not None
+            assert config.retry_queues[0].name == f"{config.name}_retry_5s"
+
+
+class TestQueueConfigLimits:
+
+    def test_defaults_follow_priority_class(self):
+        config = QueueConfig(
+            name="test_queue",
+            handler=lambda msg: None,
+            priority=ConsumerPriority.BILLING,
+        )
+
+        limits = PRIORITY_LIMITS[ConsumerPriority.BILLING]
+        assert config.effective_prefetch_count == limits.prefetch_count
+        assert config.effective_concurrency == limits.concurrency
+
+    def test_default_priority_is_lowest(self):
+        config = QueueConfig(name="test_queue", handler=lambda msg: None)
+
+        assert config.priority == ConsumerPriority.EMAIL
+
+    def test_explicit_limits_override_defaults(self):
+        config = QueueConfig(
+            name="test_queue",
+            handler=lambda msg: None,
+            prefetch_count=3,
+            concurrency=2,
+        )
+
+        assert config.effective_prefetch_count == 3
+        assert config.effective_concurrency == 2
+
+    def test_batched_queue_prefetches_two_batches(self):
+        async def batch_handler(msgs):
+            pass
+
+        config = QueueConfig(
+            name="test_queue",
+            handler=lambda msg: None,
+            batch_handler=batch_handler,
+            batch_size=40,
+        )
+
+        assert config.effective_prefetch_count == 80
+
+    def test_limits_must_be_positive(self):
+        with pytest.raises(ValidationError):
+            QueueConfig(name="test_queue", handler=lambda msg: None, concurrency=0)
+
+    def test_configured_priority_classes(self):
+        get_queue_configs.cache_clear()
+        priorities = {c.name: c.priority for c in get_queue_configs()}
+
+        assert priorities["stripe_checkout_completed"] == ConsumerPriority.BILLING
+        assert priorities["usage_commits"] == ConsumerPriority.USAGE
+        assert priorities["otp_emails"] == ConsumerPriority.EMAIL
+
+
 class TestGetQueueConfigs:
 
     def test_get_queue_configs_returns_list(self):
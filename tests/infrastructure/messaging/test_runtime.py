@@ -0,0 +1,209 @@
+"""
+Test suite for the consumer runtime (concurrency limits, priorities, drain).
+
+Run tests:
+    pytest tests/infrastructure/messaging/test_runtime.py -v
+
+Run with coverage:
+    pytest tests/infrastructure/messaging/test_runtime.py --cov=app.infrastructure.messaging.runtime --cov-report=term-missing -v
+"""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.infrastructure.messaging.batch_consumer import BatchConsumer
+from app.infrastructure.messaging.queues import ConsumerPriority
+from app.infrastructure.messaging.runtime import (
+    ConsumerRuntime,
+    LimitedConsumer,
+    PriorityLimiter,
+)
+
+
+class TestPriorityLimiter:
+
+    @pytest.mark.asyncio
+    async def test_grants_immediately_below_capacity(self):
+        limiter = PriorityLimiter(2)
+
+        await limiter.acquire(ConsumerPriority.EMAIL)
+        await limiter.acquire(ConsumerPriority.EMAIL)
+
+        assert limiter.in_use == 2
+        assert limiter.waiting == 0
+
+    @pytest.mark.asyncio
+    async def test_wakes_highest_priority_first(self):
+        limiter = PriorityLimiter(1)
+        await limiter.acquire(ConsumerPriority.USAGE)
+        order: list[str] = []
+
+        async def wait(name: str, priority: ConsumerPriority):
+            async with limiter.slot(priority):
+                order.append(name)
+
+        tasks = [
+            asyncio.create_task(wait("email", ConsumerPriority.EMAIL)),
+            asyncio.create_task(wait("usage", ConsumerPriority.USAGE)),
+            asyncio.create_task(wait("billing", ConsumerPriority.BILLING)),
+        ]
+        await asyncio.sleep(0)
+        assert limiter.waiting == 3
+
+        limiter.release()
+        await asyncio.gather(*tasks)
+
+        assert order == ["billing", "usage", "email"]
+        assert limiter.in_use == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_is_skipped(self):
+        limiter = PriorityLimiter(1)
+        await limiter.acquire(ConsumerPriority.EMAIL)
+
+        cancelled = asyncio.create_task(limiter.acquire(ConsumerPriority.BILLING))
+        waiting = asyncio.create_task(limiter.acquire(ConsumerPriority.EMAIL))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.sleep(0)
+
+        limiter.release()
+        await waiting
+
+        assert limiter.in_use == 1
+
+
+class TestLimitedConsumer:
+
+    @pytest.mark.asyncio
+    async def test_limits_queue_concurrency(self):
+        runtime = ConsumerRuntime(max_in_flight=10)
+        running = 0
+        peak = 0
+
+        async def callback(message):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        consumer = LimitedConsumer(
+            runtime, callback, concurrency=2, priority=ConsumerPriority.EMAIL
+        )
+        await asyncio.gather(*(consumer(AsyncMock()) for _ in range(6)))
+
+        assert peak == 2
+        assert runtime.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_shared_slots_limit_all_queues(self):
+        runtime = ConsumerRuntime(max_in_flight=1)
+        running = 0
+        peak = 0
+
+        async def callback(message):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        billing = LimitedConsumer(runtime, callback, 5, ConsumerPriority.BILLING)
+        email = LimitedConsumer(runtime, callback, 5, ConsumerPriority.EMAIL)
+        await asyncio.gather(
+            *(billing(AsyncMock()) for _ in range(3)),
+            *(email(AsyncMock()) for _ in range(3)),
+        )
+
+        assert peak == 1
+
+
+class TestConsumerRuntimeDrain:
+
+    @pytest.mark.asyncio
+    async def test_consume_registers_limited_callback(self):
+        runtime = ConsumerRuntime(max_in_flight=4)
+        queue = AsyncMock()
+        queue.consume = AsyncMock(return_value="tag-1")
+        callback = AsyncMock()
+
+        tag = await runtime.consume(
+            queue, callback, concurrency=3, priority=ConsumerPriority.USAGE
+        )
+
+        assert tag == "tag-1"
+        limited = queue.consume.call_args.args[0]
+        assert isinstance(limited, LimitedConsumer)
+        assert limited.callback is callback
+        assert limited.concurrency == 3
+        assert queue.consume.call_args.kwargs["no_ack"] is False
+
+    @pytest.mark.asyncio
+    async def test_drain_cancels_and_waits_for_in_flight(self):
+        runtime = ConsumerRuntime(max_in_flight=4)
+        queue = AsyncMock()
+        queue.consume = AsyncMock(return_value="tag-1")
+        finished = []
+
+        async def callback(message):
+            await asyncio.sleep(0.02)
+            finished.append(message)
+
+        await runtime.consume(queue, callback, 2, ConsumerPriority.EMAIL)
+        limited = queue.consume.call_args.args[0]
+        task = asyncio.create_task(limited("message"))
+        await asyncio.sleep(0)
+
+        assert await runtime.drain(timeout=1) is True
+
+        queue.cancel.assert_awaited_once_with("tag-1")
+        assert finished == ["message"]
+        await task
+
+    @pytest.mark.asyncio
+    async def test_drain_times_out(self):
+        runtime = ConsumerRuntime(max_in_flight=4)
+        queue = AsyncMock()
+        queue.consume = AsyncMock(return_value="tag-1")
+        release = asyncio.Event()
+
+        async def callback(message):
+            await release.wait()
+
+        await runtime.consume(queue, callback, 1, ConsumerPriority.EMAIL)
+        task = asyncio.create_task(queue.consume.call_args.args[0]("message"))
+        await asyncio.sleep(0)
+
+        assert await runtime.drain(timeout=0.01) is False
+
+        release.set()
+        await task
+
+    @pytest.mark.asyncio
+    async def test_drain_flushes_partial_batches(self):
+        runtime = ConsumerRuntime(max_in_flight=4)
+        queue = AsyncMock()
+        queue.consume = AsyncMock(return_value="tag-1")
+        batch_handler = AsyncMock()
+        batch_consumer = BatchConsumer(
+            batch_handler=batch_handler,
+            handler=AsyncMock(),
+            channel=AsyncMock(),
+            batch_size=10,
+            max_wait_ms=60_000,
+        )
+        await runtime.consume(queue, batch_consumer, 10, ConsumerPriority.USAGE)
+
+        message = AsyncMock()
+        message.body = b'{"n": 1}'
+        message.headers = {}
+        await queue.consume.call_args.args[0](message)
+        batch_handler.assert_not_awaited()
+
+        assert await runtime.drain(timeout=1) is True
+
+        batch_handler.assert_awaited_once_with([{"n": 1}])
+        message.ack.assert_awaited_once()
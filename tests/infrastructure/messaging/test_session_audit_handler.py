@@ -0,0 +1,134 @@
+"""
+Test suite for the refresh session audit handler.
+
+Run all tests:
+    pytest tests/infrastructure/messaging/test_session_audit_handler.py -v
+
+Run with coverage:
+    pytest tests/infrastructure/messaging/test_session_audit_handler.py \
+        --cov=app.infrastructure.messaging.handlers.session_audit_handler \
+        --cov-report=term-missing -v
+"""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.infrastructure.messaging.handlers.session_audit_handler import (
+    handle_refresh_session_audit,
+)
+
+MODULE = "app.infrastructure.messaging.handlers.session_audit_handler"
+
+
+@pytest.fixture
+def mock_session():
+    with patch(f"{MODULE}.AsyncSessionLocal") as mock_session_local:
+        session = AsyncMock()
+        context = AsyncMock()
+        context.__aenter__.return_value = session
+        mock_session_local.begin.return_value = context
+        yield session
+
+
+@pytest.fixture
+def mock_db():
+    with patch(f"{MODULE}.refresh_token_db") as mock_db:
+        mock_db.get_by_token_hash = AsyncMock(return_value=None)
+        mock_db.create = AsyncMock()
+        mock_db.revoke = AsyncMock(return_value=True)
+        mock_db.revoke_all_for_user = AsyncMock(return_value=2)
+        yield mock_db
+
+
+def _created_event() -> dict:
+    now = datetime.now(timezone.utc)
+    return {
+        "action": "created",
+        "id": str(uuid4()),
+        "user_id": str(uuid4()),
+        "token_hash": "hash-1",
+        "created_at": now.isoformat(),
+        "expires_at": (now + timedelta(days=7)).isoformat(),
+        "device_info": None,
+    }
+
+
+class TestSessionAuditHandler:
+
+    def test_registered_in_queue_config(self):
+        from app.infrastructure.messaging.queues import (
+            ConsumerPriority,
+            get_queue_configs,
+        )
+
+        get_queue_configs.cache_clear()
+        config = next(
+            c for c in get_queue_configs() if c.name == "refresh_session_audit"
+        )
+
+        assert config.handler is handle_refresh_session_audit
+        assert config.priority == ConsumerPriority.AUDIT
+        assert config.dead_letter_queue == "refresh_session_audit_dead"
+
+    @pytest.mark.asyncio
+    async def test_created_inserts_row(self, mock_session, mock_db):
+        event = _created_event()
+
+        await handle_refresh_session_audit(event)
+
+        data = mock_db.create.await_args.kwargs["data"]
+        assert str(data["id"]) == event["id"]
+        assert data["token_hash"] == "hash-1"
+        assert data["created_at"] == datetime.fromisoformat(event["created_at"])
+        assert mock_db.create.await_args.kwargs["commit_self"] is False
+
+    @pytest.mark.asyncio
+    async def test_created_is_idempotent(self, mock_session, mock_db):
+        mock_db.get_by_token_hash.return_value = MagicMock()
+
+        await handle_refresh_session_audit(_created_event())
+
+        mock_db.create.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_revoked(self, mock_session, mock_db):
+        await handle_refresh_session_audit(
+            {"action": "revoked", "token_hash": "hash-1"}
+        )
+
+        mock_db.revoke.assert_awaited_once_with(
+            session=mock_session, token_hash="hash-1", commit_self=False
+        )
+
+    @pytest.mark.asyncio
+    async def test_revoked_all_only_revokes_earlier_sessions(
+        self, mock_session, mock_db
+    ):
+        user_id = uuid4()
+        revoked_at = datetime.now(timezone.utc)
+
+        await handle_refresh_session_audit(
+            {
+                "action": "revoked_all",
+                "user_id": str(user_id),
+                "revoked_at": revoked_at.isoformat(),
+            }
+        )
+
+        mock_db.revoke_all_for_user.assert_awaited_once_with(
+            session=mock_session,
+            user_id=user_id,
+            created_before=revoked_at,
+            commit_self=False,
+        )
+
+    @pytest.mark.asyncio
+    async def test_unknown_action_is_dropped(self, mock_session, mock_db):
+        await handle_refresh_session_audit({"action": "other"})
+
+        mock_db.create.assert_not_awaited()
+        mock_db.revoke.assert_not_awaited()
+        mock_db.revoke_all_for_user.assert_not_awaited()
@@ -8,7 +8,7 @@ app.infrastructure.messaging.handlers.stripe:
     - handle_stripe_subscription_deleted
     - handle_stripe_payment_failed
 
-Covers idempotency (Redis dedup), Career/API routing, email notifications,
+Covers idempotency (Redis lease claims), Career/API routing, email notifications,
 and error propagation for each handler.
 
 Run all tests:
@@ -26,6 +26,7 @@ from uuid import uuid4
 import pytest
 
 from app.core.enums import ProductType
+from app.core.services.idempotency import ClaimStatus, IdempotencyLease
 
 HANDLER_MODULE = "app.infrastructure.messaging.handlers.stripe"
 
@@ -128,10 +129,11 @@ class TestIdempotency:
         }
 
         with (
-            patch(
-                f"{HANDLER_MODULE}._is_event_already_processed",
-                new_callable=AsyncMock,
-                return_value=True,
+            patch.object(
+                IdempotencyLease,
+                "claim",
+                autospec=True,
+                return_value=ClaimStatus.COMPLETED,
             ) as mock_check,
             patch(
                 f"{HANDLER_MODULE}._process_api_checkout",
@@ -140,7 +142,7 @@ class TestIdempotency:
         ):
             await handle_stripe_checkout_completed(event)
 
-            mock_check.assert_called_once_with("evt_dup_checkout")
+            assert mock_check.call_args.args[0].key == "stripe_event:evt_dup_checkout"
             mock_process.assert_not_called()
 
     @pytest.mark.asyncio
@@ -155,10 +157,11 @@ class TestIdempotency:
         }
 
         with (
-            patch(
-                f"{HANDLER_MODULE}._is_event_already_processed",
-                new_callable=AsyncMock,
-                return_value=True,
+            patch.object(
+                IdempotencyLease,
+                "claim",
+                autospec=True,
+                return_value=ClaimStatus.COMPLETED,
             ) as mock_check,
             patch(
                 f"{HANDLER_MODULE}._process_subscription_update",
@@ -167,7 +170,7 @@ class TestIdempotency:
         ):
             await handle_stripe_subscription_updated(event)
 
-            mock_check.assert_called_once_with("evt_dup_update")
+            assert mock_check.call_args.args[0].key == "stripe_event:evt_dup_update"
             mock_process.assert_not_called()
 
     @pytest.mark.asyncio
@@ -182,10 +185,11 @@ class TestIdempotency:
         }
 
         with (
-            patch(
-                f"{HANDLER_MODULE}._is_event_already_processed",
-                new_callable=AsyncMock,
-                return_value=True,
+            patch.object(
+                IdempotencyLease,
+                "claim",
+                autospec=True,
+                return_value=ClaimStatus.COMPLETED,
             ) as mock_check,
             patch(
                 f"{HANDLER_MODULE}._process_subscription_deletion",
@@ -194,7 +198,7 @@ class TestIdempotency:
         ):
             await handle_stripe_subscription_deleted(event)
 
-            mock_check.assert_called_once_with("evt_dup_delete")
+            assert mock_check.call_args.args[0].key == "stripe_event:evt_dup_delete"
             mock_process.assert_not_called()
 
     @pytest.mark.asyncio
@@ -211,10 +215,11 @@ class TestIdempotency:
         }
 
         with (
-            patch(
-                f"{HANDLER_MODULE}._is_event_already_processed",
-                new_callable=AsyncMock,
-                return_value=True,
+            patch.object(
+                IdempotencyLease,
+                "claim",
+                autospec=True,
+                return_value=ClaimStatus.COMPLETED,
             ) as mock_check,
             patch(
                 f"{HANDLER_MODULE}._process_payment_failure",
@@ -223,9 +228,137 @@ class TestIdempotency:
         ):
             await handle_stripe_payment_failed(event)
 
-            mock_check.assert_called_once_with("evt_dup_payment")
+            assert mock_check.call_args.args[0].key == "stripe_event:evt_dup_payment"
             mock_process.assert_not_called()
 
+    @pytest.mark.asyncio
+    async def test_event_in_progress_elsewhere_is_retried(self):
+        from app.infrastructure.messaging.errors import TransientMessageError
+        from app.infrastructure.messaging.handlers.stripe import (
+            handle_stripe_subscription_updated,
+        )
+
+        event = {
+            "event_id": "evt_busy_update",
+            "stripe_subscription_id": "sub_123",
+        }
+
+        with (
+            patch.object(
+                IdempotencyLease,
+                "claim",
+                autospec=True,
+                return_value=ClaimStatus.IN_PROGRESS,
+            ),
+            patch(
+                f"{HANDLER_MODULE}._process_subscription_update",
+                new_callable=AsyncMock,
+            ) as mock_process,
+        ):
+            with pytest.raises(TransientMessageError):
+                await handle_stripe_subscription_updated(event)
+
+            mock_process.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_failure_releases_lease(self):
+        from app.infrastructure.messaging.handlers.stripe import (
+            handle_stripe_subscription_deleted,
+        )
+
+        event = {
+            "event_id": "evt_release_delete",
+            "stripe_subscription_id": "sub_123",
+        }
+
+        with (
+            patch.object(
+                IdempotencyLease,
+                "claim",
+                autospec=True,
+                return_value=ClaimStatus.ACQUIRED,
+            ),
+            patch.object(
+                IdempotencyLease, "complete", new_callable=AsyncMock
+            ) as mock_complete,
+            patch.object(
+                IdempotencyLease, "release", new_callable=AsyncMock
+            ) as mock_release,
+            patch(
+                f"{HANDLER_MODULE}._process_subscription_deletion",
+                new_callable=AsyncMock,
+                side_effect=Exception("DB error"),
+            ),
+        ):
+            with pytest.raises(Exception, match="DB error"):
+                await handle_stripe_subscription_deleted(event)
+
+            mock_release.assert_awaited_once()
+            mock_complete.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_processes_when_redis_unavailable(self):
+        from app.infrastructure.messaging.handlers.stripe import (
+            handle_stripe_subscription_updated,
+        )
+
+        event = {
+            "event_id": "evt_no_redis",
+            "stripe_subscription_id": "sub_123",
+        }
+
+        with (
+            patch.object(
+                IdempotencyLease,
+                "claim",
+                autospec=True,
+                return_value=ClaimStatus.UNAVAILABLE,
+            ),
+            patch.object(IdempotencyLease, "complete", new_callable=AsyncMock),
+            patch(
+                f"{HANDLER_MODULE}._process_subscription_update",
+                new_callable=AsyncMock,
+            ) as mock_process,
+        ):
+            await handle_stripe_subscription_updated(event)
+
+            mock_process.assert_called_once_with("sub_123", event_id="evt_no_redis")
+
+    @pytest.mark.asyncio
+    async def test_already_logged_event_is_not_processed(self):
+        from app.infrastructure.messaging.handlers.stripe import (
+            _process_subscription_update,
+        )
+
+        mock_session = AsyncMock()
+        mock_ctx = AsyncMock()
+        mock_ctx.__aenter__.return_value = mock_session
+
+        with (
+            patch(
+                f"{HANDLER_MODULE}.AsyncSessionLocal.begin",
+                return_value=mock_ctx,
+            ),
+            patch(
+                f"{HANDLER_MODULE}.stripe_event_log_db.record_event",
+                new_callable=AsyncMock,
+                return_value=False,
+            ) as mock_record,
+            patch(
+                f"{HANDLER_MODULE}.subscription_db.get_by_stripe_subscription_id",
+                new_callable=AsyncMock,
+            ) as mock_get,
+        ):
+            await _process_subscription_update("sub_123", event_id="evt_logged")
+
+            mock_record.assert_awaited_once_with(
+                mock_session,
+                event_id="evt_logged",
+                event_type="customer.subscription.updated",
+                commit_self=False,
+            )
+            mock_get.assert_not_called()
+
 
 class TestHandleCheckoutCompleted:
 
@@ -248,14 +381,14 @@ class TestHandleCheckoutCompleted:
         }
 
         with (
-            patch(
-                f"{HANDLER_MODULE}._is_event_already_processed",
-                new_callable=AsyncMock,
-                return_value=False,
-            ),
-            patch(
-                f"{HANDLER_MODULE}._mark_event_as_processed",
-                new_callable=AsyncMock,
+            patch.object(
+                IdempotencyLease,
+                "claim",
+                autospec=True,
+                return_value=ClaimStatus.ACQUIRED,
+            ),
+            patch.object(
+                IdempotencyLease, "complete", new_callable=AsyncMock
             ) as mock_mark,
             patch(
                 f"{HANDLER_MODULE}._process_api_checkout",
@@ -276,7 +409,7 @@ class TestHandleCheckoutCompleted:
             assert str(args[3]) == plan_id
             assert args[4] == 5
             mock_career.assert_not_called()
-            mock_mark.assert_called_once_with("evt_api_checkout")
+            mock_mark.assert_awaited_once()
 
     @pytest.mark.asyncio
     async def test_routes_to_career_checkout(self):
@@ -297,14 +430,14 @@ class TestHandleCheckoutCompleted:
         }
 
         with (
-            patch(
-                f"{HANDLER_MODULE}._is_event_already_processed",
-                new_callable=AsyncMock,
-                return_value=False,
-            ),
-            patch(
-                f"{HANDLER_MODULE}._mark_event_as_processed",
-                new_callable=AsyncMock,
+            patch.object(
+                IdempotencyLease,
+                "claim",
+                autospec=True,
+                return_value=ClaimStatus.ACQUIRED,
+            ),
+            patch.object(
+                IdempotencyLease, "complete", new_callable=AsyncMock
             ) as mock_mark,
             patch(
                 f"{HANDLER_MODULE}._process_career_checkout",
@@ -324,7 +457,7 @@ class TestHandleCheckoutCompleted:
             assert str(args[2]) == user_id
             assert str(args[3]) == plan_id
             mock_api.assert_not_called()
-            mock_mark.assert_called_once_with("evt_career_checkout")
+            mock_mark.assert_awaited_once()
 
     @pytest.mark.asyncio
     async def test_defaults_to_api_when_product_type_missing(self):
@@ -342,15 +475,13 @@ class TestHandleCheckoutCompleted:
         }
 
         with (
-            patch(
-                f"{HANDLER_MODULE}._is_event_already_processed",
-                new_callable=AsyncMock,
-                return_value=False,
-            ),
-            patch(
-                f"{HANDLER_MODULE}._mark_event_as_processed",
-                new_callable=AsyncMock,
+            patch.object(
+                IdempotencyLease,
+                "claim",
+                autospec=True,
+                return_value=ClaimStatus.ACQUIRED,
             ),
+            patch.object(IdempotencyLease, "complete", new_callable=AsyncMock),
             patch(
                 f"{HANDLER_MODULE}._process_api_checkout",
                 new_callable=AsyncMock,
@@ -376,14 +507,14 @@ class TestHandleCheckoutCompleted:
         }
 
         with (
-            patch(
-                f"{HANDLER_MODULE}._is_event_already_processed",
-                new_callable=AsyncMock,
-                return_value=False,
-            ),
-            patch(
-                f"{HANDLER_MODULE}._mark_event_as_processed",
-                new_callable=AsyncMock,
+            patch.object(
+                IdempotencyLease,
+                "claim",
+                autospec=True,
+                return_value=ClaimStatus.ACQUIRED,
+            ),
+            patch.object(
+                IdempotencyLease, "complete", new_callable=AsyncMock
             ) as mock_mark,
             patch(
                 f"{HANDLER_MODULE}._process_api_checkout",
@@ -411,24 +542,26 @@ class TestHandleSubscriptionUpdated:
         }
 
         with (
-            patch(
-                f"{HANDLER_MODULE}._is_event_already_processed",
-                new_callable=AsyncMock,
-                return_value=False,
+            patch.object(
+                IdempotencyLease,
+                "claim",
+                autospec=True,
+                return_value=ClaimStatus.ACQUIRED,
             ),
             patch(
                 f"{HANDLER_MODULE}._process_subscription_update",
                 new_callable=AsyncMock,
             ) as mock_update,
-            patch(
-                f"{HANDLER_MODULE}._mark_event_as_processed",
-                new_callable=AsyncMock,
+            patch.object(
+                IdempotencyLease, "complete", new_callable=AsyncMock
             ) as mock_mark,
         ):
             await handle_stripe_subscription_updated(event)
 
-            mock_update.assert_called_once_with("sub_update_123")
-            mock_mark.assert_called_once_with("evt_update_123")
+            mock_update.assert_called_once_with(
+                "sub_update_123", event_id="evt_update_123"
+            )
+            mock_mark.assert_awaited_once()
 
     @pytest.mark.asyncio
     async def test_error_propagates_without_marking_processed(self):
@@ -442,19 +575,19 @@ class TestHandleSubscriptionUpdated:
         }
 
         with (
-            patch(
-                f"{HANDLER_MODULE}._is_event_already_processed",
-                new_callable=AsyncMock,
-                return_value=False,
+            patch.object(
+                IdempotencyLease,
+                "claim",
+                autospec=True,
+                return_value=ClaimStatus.ACQUIRED,
             ),
             patch(
                 f"{HANDLER_MODULE}._process_subscription_update",
                 new_callable=AsyncMock,
                 side_effect=Exception("Service error"),
             ),
-            patch(
-                f"{HANDLER_MODULE}._mark_event_as_processed",
-                new_callable=AsyncMock,
+            patch.object(
+                IdempotencyLease, "complete", new_callable=AsyncMock
             ) as mock_mark,
         ):
             with pytest.raises(Exception, match="Service error"):
@@ -477,24 +610,26 @@ class TestHandleSubscriptionDeleted:
         }
 
         with (
-            patch(
-                f"{HANDLER_MODULE}._is_event_already_processed",
-                new_callable=AsyncMock,
-                return_value=False,
+            patch.object(
+                IdempotencyLease,
+                "claim",
+                autospec=True,
+                return_value=ClaimStatus.ACQUIRED,
             ),
             patch(
                 f"{HANDLER_MODULE}._process_subscription_deletion",
                 new_callable=AsyncMock,
             ) as mock_delete,
-            patch(
-                f"{HANDLER_MODULE}._mark_event_as_processed",
-                new_callable=AsyncMock,
+            patch.object(
+                IdempotencyLease, "complete", new_callable=AsyncMock
             ) as mock_mark,
         ):
             await handle_stripe_subscription_deleted(event)
 
-            mock_delete.assert_called_once_with("sub_delete_123")
-            mock_mark.assert_called_once_with("evt_delete_123")
+            mock_delete.assert_called_once_with(
+                "sub_delete_123", event_id="evt_delete_123"
+            )
+            mock_mark.assert_awaited_once()
 
     @pytest.mark.asyncio
     async def test_error_propagates_without_marking_processed(self):
@@ -508,19 +643,19 @@ class TestHandleSubscriptionDeleted:
         }
 
         with (
-            patch(
-                f"{HANDLER_MODULE}._is_event_already_processed",
-                new_callable=AsyncMock,
-                return_value=False,
+            patch.object(
+                IdempotencyLease,
+                "claim",
+                autospec=True,
+                return_value=ClaimStatus.ACQUIRED,
             ),
             patch(
                 f"{HANDLER_MODULE}._process_subscription_deletion",
                 new_callable=AsyncMock,
                 side_effect=Exception("Deletion failed"),
             ),
-            patch(
-                f"{HANDLER_MODULE}._mark_event_as_processed",
-                new_callable=AsyncMock,
+            patch.object(
+                IdempotencyLease, "complete", new_callable=AsyncMock
             ) as mock_mark,
         ):
             with pytest.raises(Exception, match="Deletion failed"):
@@ -545,24 +680,26 @@ class TestHandlePaymentFailed:
         }
 
         with (
-            patch(
-                f"{HANDLER_MODULE}._is_event_already_processed",
-                new_callable=AsyncMock,
-                return_value=False,
+            patch.object(
+                IdempotencyLease,
+                "claim",
+                autospec=True,
+                return_value=ClaimStatus.ACQUIRED,
             ),
             patch(
                 f"{HANDLER_MODULE}._process_payment_failure",
                 new_callable=AsyncMock,
             ) as mock_process,
-            patch(
-                f"{HANDLER_MODULE}._mark_event_as_processed",
-                new_callable=AsyncMock,
+            patch.object(
+                IdempotencyLease, "complete", new_callable=AsyncMock
             ) as mock_mark,
         ):
             await handle_stripe_payment_failed(event)
 
-            mock_process.assert_called_once_with("sub_pf_123", 4999)
-            mock_mark.assert_called_once_with("evt_pf_123")
+            mock_process.assert_called_once_with(
+                "sub_pf_123", 4999, event_id="evt_pf_123"
+            )
+            mock_mark.assert_awaited_once()
 
     @pytest.mark.asyncio
     async def test_marks_done_even_on_email_error(self):
@@ -578,24 +715,31 @@ class TestHandlePaymentFailed:
         }
 
         with (
-            patch(
-                f"{HANDLER_MODULE}._is_event_already_processed",
-                new_callable=AsyncMock,
-                return_value=False,
+            patch.object(
+                IdempotencyLease,
+                "claim",
+                autospec=True,
+                return_value=ClaimStatus.ACQUIRED,
             ),
             patch(
                 f"{HANDLER_MODULE}._process_payment_failure",
                 new_callable=AsyncMock,
                 side_effect=Exception("Email queue down"),
             ),
+            patch.object(
+                IdempotencyLease, "complete", new_callable=AsyncMock
+            ) as mock_mark,
             patch(
-                f"{HANDLER_MODULE}._mark_event_as_processed",
+                f"{HANDLER_MODULE}._log_event_to_db",
                 new_callable=AsyncMock,
-            ) as mock_mark,
+            ) as mock_log,
         ):
             await handle_stripe_payment_failed(event)
 
-            mock_mark.assert_called_once_with("evt_pf_email_err")
+            mock_mark.assert_awaited_once()
+            mock_log.assert_awaited_once_with(
+                "evt_pf_email_err", "invoice.payment_failed"
+            )
 
     @pytest.mark.asyncio
     async def test_handles_none_amount_due(self):
@@ -610,23 +754,23 @@ class TestHandlePaymentFailed:
         }
 
         with (
-            patch(
-                f"{HANDLER_MODULE}._is_event_already_processed",
-                new_callable=AsyncMock,
-                return_value=False,
+            patch.object(
+                IdempotencyLease,
+                "claim",
+                autospec=True,
+                return_value=ClaimStatus.ACQUIRED,
             ),
             patch(
                 f"{HANDLER_MODULE}._process_payment_failure",
                 new_callable=AsyncMock,
             ) as mock_process,
-            patch(
-                f"{HANDLER_MODULE}._mark_event_as_processed",
-                new_callable=AsyncMock,
-            ),
+            patch.object(IdempotencyLease, "complete", new_callable=AsyncMock),
         ):
             await handle_stripe_payment_failed(event)
 
-            mock_process.assert_called_once_with("sub_pf_123", None)
+            mock_process.assert_called_once_with(
+                "sub_pf_123", None, event_id="evt_pf_no_amount"
+            )
 
 
 class TestProcessSubscriptionUpdate:
@@ -1040,7 +1184,7 @@ class TestProcessPaymentFailure:
 
         with (
             patch(
-                f"{HANDLER_MODULE}.AsyncSessionLocal",
+                f"{HANDLER_MODULE}.AsyncSessionLocal.begin",
                 return_value=mock_ctx,
             ),
             patch(
@@ -1072,7 +1216,7 @@ class TestProcessPaymentFailure:
 
         with (
             patch(
-                f"{HANDLER_MODULE}.AsyncSessionLocal",
+                f"{HANDLER_MODULE}.AsyncSessionLocal.begin",
                 return_value=mock_ctx,
             ),
             patch(
@@ -1112,7 +1256,7 @@ class TestProcessPaymentFailure:
 
         with (
             patch(
-                f"{HANDLER_MODULE}.AsyncSessionLocal",
+                f"{HANDLER_MODULE}.AsyncSessionLocal.begin",
                 return_value=mock_ctx,
             ),
             patch(
@@ -1241,12 +1385,15 @@ class TestEmailHelpers:
                 return_value=user,
             ),
             patch(
-                f"{HANDLER_MODULE}.publish_event",
-                new_callable=AsyncMock,
-            ) as mock_publish,
+                f"{HANDLER_MODULE}.get_publisher",
+                return_value=AsyncMock(),
+            ) as mock_get_publisher,
         ):
+            mock_publish = mock_get_publisher.return_value
             await _send_subscription_activated_email(mock_session, sub, "Free")
 
+            # Published in the handler's transaction
+            mock_get_publisher.assert_called_once_with(mock_session)
             mock_publish.assert_called_once()
             call_args = mock_publish.call_args
             assert call_args[0][0] == "subscription_activated_emails"
@@ -1287,10 +1434,11 @@ class TestEmailHelpers:
                 return_value=workspace,
             ),
             patch(
-                f"{HANDLER_MODULE}.publish_event",
-                new_callable=AsyncMock,
-            ) as mock_publish,
+                f"{HANDLER_MODULE}.get_publisher",
+                return_value=AsyncMock(),
+            ) as mock_get_publisher,
         ):
+            mock_publish = mock_get_publisher.return_value
             await _send_subscription_activated_email(mock_session, sub, "Basic")
 
             mock_publish.assert_called_once()
@@ -1329,10 +1477,11 @@ class TestEmailHelpers:
                 return_value=user,
             ),
             patch(
-                f"{HANDLER_MODULE}.publish_event",
-                new_callable=AsyncMock,
-            ) as mock_publish,
+                f"{HANDLER_MODULE}.get_publisher",
+                return_value=AsyncMock(),
+            ) as mock_get_publisher,
         ):
+            mock_publish = mock_get_publisher.return_value
             await _send_subscription_canceled_email(mock_session, sub, "Plus")
 
             mock_publish.assert_called_once()
@@ -1376,10 +1525,11 @@ class TestEmailHelpers:
                 return_value=workspace,
             ),
             patch(
-                f"{HANDLER_MODULE}.publish_event",
-                new_callable=AsyncMock,
-            ) as mock_publish,
+                f"{HANDLER_MODULE}.get_publisher",
+                return_value=AsyncMock(),
+            ) as mock_get_publisher,
         ):
+            mock_publish = mock_get_publisher.return_value
             await _send_subscription_canceled_email(mock_session, sub, "Professional")
 
             mock_publish.assert_called_once()
@@ -1418,10 +1568,11 @@ class TestEmailHelpers:
                 return_value=user,
             ),
             patch(
-                f"{HANDLER_MODULE}.publish_event",
-                new_callable=AsyncMock,
-            ) as mock_publish,
+                f"{HANDLER_MODULE}.get_publisher",
+                return_value=AsyncMock(),
+            ) as mock_get_publisher,
         ):
+            mock_publish = mock_get_publisher.return_value
             await _send_payment_failed_email(mock_session, sub, "Plus", "$29.99")
 
             mock_publish.assert_called_once()
@@ -1464,10 +1615,11 @@ class TestEmailHelpers:
                 return_value=workspace,
             ),
             patch(
-                f"{HANDLER_MODULE}.publish_event",
-                new_callable=AsyncMock,
-            ) as mock_publish,
+                f"{HANDLER_MODULE}.get_publisher",
+                return_value=AsyncMock(),
+            ) as mock_get_publisher,
         ):
+            mock_publish = mock_get_publisher.return_value
             await _send_payment_failed_email(
                 mock_session, sub, "Professional", "$99.99"
             )
@@ -1496,10 +1648,11 @@ class TestEmailHelpers:
                 return_value=None,
             ),
             patch(
-                f"{HANDLER_MODULE}.publish_event",
-                new_callable=AsyncMock,
-            ) as mock_publish,
+                f"{HANDLER_MODULE}.get_publisher",
+                return_value=AsyncMock(),
+            ) as mock_get_publisher,
         ):
+            mock_publish = mock_get_publisher.return_value
             await _send_subscription_activated_email(mock_session, sub, "Free")
 
             mock_publish.assert_not_called()
@@ -1528,10 +1681,11 @@ class TestEmailHelpers:
                 return_value=None,
             ),
             patch(
-                f"{HANDLER_MODULE}.publish_event",
-                new_callable=AsyncMock,
-            ) as mock_publish,
+                f"{HANDLER_MODULE}.get_publisher",
+                return_value=AsyncMock(),
+            ) as mock_get_publisher,
         ):
+            mock_publish = mock_get_publisher.return_value
             await _send_subscription_activated_email(mock_session, sub, "Free")
 
             mock_publish.assert_not_called()
@@ -1563,10 +1717,11 @@ class TestEmailHelpers:
                 return_value=workspace,
             ),
             patch(
-                f"{HANDLER_MODULE}.publish_event",
-                new_callable=AsyncMock,
-            ) as mock_publish,
+                f"{HANDLER_MODULE}.get_publisher",
+                return_value=AsyncMock(),
+            ) as mock_get_publisher,
         ):
+            mock_publish = mock_get_publisher.return_value
             await _send_subscription_activated_email(mock_session, sub, "Free")
 
             mock_publish.assert_not_called()
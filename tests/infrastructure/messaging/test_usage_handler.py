@@ -43,9 +43,18 @@ class TestUsageHandlerImports:
         assert "usage_commits" in queue_names
 
         config = next(c for c in configs if c.name == "usage_commits")
-        assert config.retry_queue == "usage_commits_retry"
+        assert config.retry_queues is not None
+        assert [q.name for q in config.retry_queues] == [
+            "usage_commits_retry_5s",
+            "usage_commits_retry_30s",
+            "usage_commits_retry_2m",
+            "usage_commits_retry_10m",
+        ]
         assert config.dead_letter_queue == "usage_commits_dead"
-        assert config.max_retries == 3
+
+        from app.apps.cubex_api.schemas.workspace import UsageCommitRequest
+
+        assert config.payload_model is UsageCommitRequest
 
 
 class TestUsageHandlerValidation:
@@ -169,6 +178,40 @@ class TestUsageHandlerProcessing:
                 commit_self=False,
             )
 
+    @pytest.mark.asyncio
+    async def test_validated_request_is_used_as_is(self):
+        from app.apps.cubex_api.schemas.workspace import UsageCommitRequest
+        from app.infrastructure.messaging.handlers.usage_handler import (
+            handle_usage_commit,
+        )
+
+        request = UsageCommitRequest(
+            api_key="cbx_live_test123abc", usage_id=uuid4(), success=True
+        )
+
+        mock_context_manager = AsyncMock()
+        mock_context_manager.__aenter__ = AsyncMock(return_value=AsyncMock())
+        mock_context_manager.__aexit__ = AsyncMock(return_value=False)
+
+        with (
+            patch(
+                "app.infrastructure.messaging.handlers.usage_handler.AsyncSessionLocal.begin",
+                return_value=mock_context_manager,
+            ),
+            patch(
+                "app.infrastructure.messaging.handlers.usage_handler.quota_service.commit_usage",
+                new_callable=AsyncMock,
+                return_value=(True, "Usage committed as SUCCESS."),
+            ) as mock_commit,
+            patch(
+                "app.infrastructure.messaging.handlers.usage_handler.UsageCommitRequest.model_validate"
+            ) as mock_validate,
+        ):
+            await handle_usage_commit(request)
+
+            mock_validate.assert_not_called()
+            assert mock_commit.call_args.kwargs["usage_id"] == request.usage_id
+
     @pytest.mark.asyncio
     async def test_valid_success_with_metrics(self):
         from app.infrastructure.messaging.handlers.usage_handler import (
@@ -345,3 +388,141 @@ class TestUsageHandlerErrorHandling:
         ):
             with pytest.raises(RuntimeError, match="Cannot connect to DB"):
                 await handle_usage_commit(event)
+
+
+class TestUsageHandlerBatch:
+
+    def test_batch_handler_in_all(self):
+        from app.infrastructure.messaging.handlers import usage_handler
+
+        assert "handle_usage_commit_batch" in usage_handler.__all__
+
+    @pytest.mark.asyncio
+    async def test_batch_commits_valid_events_in_one_transaction(self):
+        from app.infrastructure.messaging.handlers.usage_handler import (
+            handle_usage_commit_batch,
+        )
+
+        valid = {
+            "api_key": "cbx_live_" + "a" * 32,
+            "usage_id": str(uuid4()),
+            "success": True,
+        }
+        invalid = {"bad_field": "value"}
+
+        mock_session = AsyncMock()
+        mock_context_manager = AsyncMock()
+        mock_context_manager.__aenter__ = AsyncMock(return_value=mock_session)
+        mock_context_manager.__aexit__ = AsyncMock(return_value=False)
+
+        with (
+            patch(
+                "app.infrastructure.messaging.handlers.usage_handler.AsyncSessionLocal.begin",
+                return_value=mock_context_manager,
+            ) as mock_begin,
+            patch(
+                "app.infrastructure.messaging.handlers.usage_handler.quota_service.commit_usage_batch",
+                new_callable=AsyncMock,
+                return_value=[(True, "Usage committed as SUCCESS.")],
+            ) as mock_commit,
+            patch(
+                "app.infrastructure.messaging.handlers.usage_handler.EmailManagerService.send_invalid_payload_alert",
+                new_callable=AsyncMock,
+            ) as mock_alert,
+        ):
+            await handle_usage_commit_batch([valid, invalid])
+
+        mock_begin.assert_called_once()
+        mock_alert.assert_awaited_once()
+        assert mock_alert.call_args.kwargs["queue_name"] == "usage_commits"
+        commits = mock_commit.call_args.args[1]
+        assert len(commits) == 1
+        assert str(commits[0][1].usage_log_id) == valid["usage_id"]
+        assert commits[0][1].success is True
+
+    @pytest.mark.asyncio
+    async def test_batch_processing_error_raises(self):
+        from app.infrastructure.messaging.handlers.usage_handler import (
+            handle_usage_commit_batch,
+        )
+
+        event = {
+            "api_key": "cbx_live_" + "a" * 32,
+            "usage_id": str(uuid4()),
+            "success": True,
+        }
+
+        mock_context_manager = AsyncMock()
+        mock_context_manager.__aenter__ = AsyncMock(return_value=AsyncMock())
+        mock_context_manager.__aexit__ = AsyncMock(return_value=False)
+
+        with (
+            patch(
+                "app.infrastructure.messaging.handlers.usage_handler.AsyncSessionLocal.begin",
+                return_value=mock_context_manager,
+            ),
+            patch(
+                "app.infrastructure.messaging.handlers.usage_handler.quota_service.commit_usage_batch",
+                new_callable=AsyncMock,
+                side_effect=RuntimeError("db down"),
+            ),
+        ):
+            with pytest.raises(RuntimeError):
+                await handle_usage_commit_batch([event])
+
+    @pytest.mark.asyncio
+    async def test_batch_failure_sends_no_alerts(self):
+        from app.infrastructure.messaging.handlers.usage_handler import (
+            handle_usage_commit_batch,
+        )
+
+        valid = {
+            "api_key": "cbx_live_" + "a" * 32,
+            "usage_id": str(uuid4()),
+            "success": True,
+        }
+
+        mock_context_manager = AsyncMock()
+        mock_context_manager.__aenter__ = AsyncMock(return_value=AsyncMock())
+        mock_context_manager.__aexit__ = AsyncMock(return_value=False)
+
+        with (
+            patch(
+                "app.infrastructure.messaging.handlers.usage_handler.AsyncSessionLocal.begin",
+                return_value=mock_context_manager,
+            ),
+            patch(
+                "app.infrastructure.messaging.handlers.usage_handler.quota_service.commit_usage_batch",
+                new_callable=AsyncMock,
+                side_effect=RuntimeError("db down"),
+            ),
+            patch(
+                "app.infrastructure.messaging.handlers.usage_handler.EmailManagerService.send_invalid_payload_alert",
+                new_callable=AsyncMock,
+            ) as mock_alert,
+        ):
+            with pytest.raises(RuntimeError):
+                await handle_usage_commit_batch([valid, {"bad_field": "value"}])
+
+        # The per-message fallback alerts on the invalid payload instead
+        mock_alert.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_batch_of_only_invalid_events_alerts_without_transaction(self):
+        from app.infrastructure.messaging.handlers.usage_handler import (
+            handle_usage_commit_batch,
+        )
+
+        with (
+            patch(
+                "app.infrastructure.messaging.handlers.usage_handler.AsyncSessionLocal.begin",
+            ) as mock_begin,
+            patch(
+                "app.infrastructure.messaging.handlers.usage_handler.EmailManagerService.send_invalid_payload_alert",
+                new_callable=AsyncMock,
+            ) as mock_alert,
+        ):
+            await handle_usage_commit_batch([{"bad_field": 1}, {"bad_field": 2}])
+
+        mock_begin.assert_not_called()
+        assert mock_alert.await_count == 2
@@ -15,10 +15,20 @@ from uuid import uuid4
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.infrastructure.scheduler.jobs import cleanup_soft_deleted_users
-from app.infrastructure.scheduler.main import schedule_cleanup_soft_deleted_users_job
-from app.core.db.crud import user_db
-from app.core.db.models import User
+from app.infrastructure.scheduler.jobs import (
+    cleanup_refresh_tokens,
+    cleanup_soft_deleted_users,
+    provision_pending_users,
+    purge_published_outbox_events,
+)
+from app.infrastructure.scheduler.main import (
+    schedule_cleanup_refresh_tokens_job,
+    schedule_cleanup_soft_deleted_users_job,
+    schedule_provision_pending_users_job,
+    schedule_purge_published_outbox_events_job,
+)
+from app.core.db.crud import outbox_event_db, refresh_token_db, user_db
+from app.core.db.models import RefreshToken, User
 
 
 class TestCleanupSoftDeletedUsersJob:
@@ -231,3 +241,171 @@ class TestScheduleCleanupSoftDeletedUsersJob:
                 assert "Scheduling" in first_call
                 assert "3:00 AM UTC" in first_call
                 assert "scheduled successfully" in second_call
+
+
+class TestPurgePublishedOutboxEventsJob:
+
+    async def test_purge_uses_retention_cutoff(self):
+        with patch(
+            "app.infrastructure.scheduler.jobs.AsyncSessionLocal"
+        ) as mock_session_local:
+            mock_session = AsyncMock()
+            mock_context = AsyncMock()
+            mock_context.__aenter__.return_value = mock_session
+            mock_session_local.begin.return_value = mock_context
+
+            with (
+                patch(
+                    "app.infrastructure.scheduler.jobs.settings.OUTBOX_RETENTION_HOURS",
+                    24,
+                ),
+                patch.object(
+                    outbox_event_db, "purge_published", new_callable=AsyncMock
+                ) as mock_purge,
+            ):
+                mock_purge.return_value = 3
+
+                await purge_published_outbox_events()
+
+                mock_purge.assert_called_once()
+                assert mock_purge.call_args[0][0] == mock_session
+                assert mock_purge.call_args[1]["commit_self"] is False
+                expected_cutoff = datetime.now(timezone.utc) - timedelta(hours=24)
+                cutoff_arg = mock_purge.call_args[1]["before"]
+                assert abs((cutoff_arg - expected_cutoff).total_seconds()) < 5
+
+    def test_schedule_job(self):
+        with patch("app.infrastructure.scheduler.main.scheduler") as mock_scheduler:
+            schedule_purge_published_outbox_events_job()
+
+            call_args = mock_scheduler.add_job.call_args
+            assert call_args[0][0] == purge_published_outbox_events
+            assert call_args[1]["id"] == "purge_published_outbox_events_job"
+            assert call_args[1]["jobstore"] == "cleanups"
+
+
+class TestCleanupRefreshTokensJob:
+
+    async def test_cleans_up_and_purges_old_rows(
+        self, db_session: AsyncSession, test_user
+    ):
+        now = datetime.now(timezone.utc)
+        rows = {
+            "active": {"expires_at": now + timedelta(days=7)},
+            "expired": {"expires_at": now - timedelta(days=1)},
+            "revoked": {"expires_at": now + timedelta(days=7), "revoked_at": now},
+            "purged": {
+                "expires_at": now - timedelta(days=60),
+                "is_deleted": True,
+                "deleted_at": now - timedelta(days=45),
+            },
+        }
+        for token_hash, fields in rows.items():
+            await refresh_token_db.create(
+                db_session,
+                data={"user_id": test_user.id, "token_hash": token_hash, **fields},
+                commit_self=False,
+            )
+
+        with patch("app.infrastructure.scheduler.jobs.AsyncSessionLocal") as mock_local:
+            mock_context = AsyncMock()
+            mock_context.__aenter__.return_value = db_session
+            mock_local.begin.return_value = mock_context
+
+            await cleanup_refresh_tokens()
+
+        result = await db_session.execute(
+            select(RefreshToken.token_hash, RefreshToken.is_deleted).where(
+                RefreshToken.user_id == test_user.id
+            )
+        )
+        assert dict(result.tuples().all()) == {
+            "active": False,
+            "expired": True,
+            "revoked": True,
+        }
+
+    def test_schedule_job(self):
+        with patch("app.infrastructure.scheduler.main.scheduler") as mock_scheduler:
+            schedule_cleanup_refresh_tokens_job()
+
+            call_args = mock_scheduler.add_job.call_args
+            assert call_args[0][0] == cleanup_refresh_tokens
+            assert call_args[1]["id"] == "cleanup_refresh_tokens_job"
+            assert call_args[1]["jobstore"] == "cleanups"
+
+
+class TestProvisionPendingUsersJob:
+
+    async def test_provisions_each_claimed_user(
+        self, db_session: AsyncSession, test_user
+    ):
+        other_id = uuid4()
+
+        with (
+            patch("app.infrastructure.scheduler.jobs.AsyncSessionLocal") as mock_local,
+            patch.object(
+                user_db,
+                "get_unprovisioned_ids",
+                new_callable=AsyncMock,
+                return_value=[test_user.id, other_id],
+            ),
+            patch(
+                "app.infrastructure.scheduler.jobs.provision_user",
+                new_callable=AsyncMock,
+            ) as mock_provision,
+        ):
+            mock_context = AsyncMock()
+            mock_context.__aenter__.return_value = db_session
+            mock_local.return_value = mock_context
+            mock_local.begin.return_value = mock_context
+
+            await provision_pending_users()
+
+        # other_id does not exist, so only test_user is claimed
+        mock_provision.assert_awaited_once()
+        assert mock_provision.call_args.args[1].id == test_user.id
+
+    async def test_failure_does_not_stop_the_batch(self):
+        user_ids = [uuid4(), uuid4()]
+
+        with (
+            patch("app.infrastructure.scheduler.jobs.AsyncSessionLocal") as mock_local,
+            patch.object(
+                user_db,
+                "get_unprovisioned_ids",
+                new_callable=AsyncMock,
+                return_value=user_ids,
+            ),
+            patch.object(
+                user_db, "claim_for_provisioning", new_callable=AsyncMock
+            ) as mock_claim,
+            patch.object(
+                user_db,
+                "record_provisioning_failure",
+                new_callable=AsyncMock,
+                return_value=1,
+            ) as mock_record,
+            patch(
+                "app.infrastructure.scheduler.jobs.provision_user",
+                new_callable=AsyncMock,
+                side_effect=[ValueError("no plan"), None],
+            ) as mock_provision,
+        ):
+            mock_local.return_value = AsyncMock()
+            mock_local.begin.return_value = AsyncMock()
+
+            await provision_pending_users()
+
+        assert mock_claim.await_count == 2
+        assert mock_provision.await_count == 2
+        mock_record.assert_awaited_once()
+        assert mock_record.call_args.args[1] == user_ids[0]
+
+    def test_schedule_job(self):
+        with patch("app.infrastructure.scheduler.main.scheduler") as mock_scheduler:
+            schedule_provision_pending_users_job()
+
+            call_args = mock_scheduler.add_job.call_args
+            assert call_args[0][0] == provision_pending_users
+            assert call_args[1]["id"] == "provision_pending_users_job"
@@ -0,0 +1,207 @@
+"""
+Test suite for the OAuth providers against a local mock provider server.
+
+- Discovery metadata is fetched once and cached
+- GitHub profile and email lookups run concurrently
+- Shared HTTP client configuration
+
+Run all tests:
+    pytest tests/services/oauth/test_mock_provider.py -v
+
+Run with coverage:
+    pytest tests/services/oauth/test_mock_provider.py --cov=app.core.services.oauth --cov-report=term-missing -v
+"""
+
+import asyncio
+import time
+from unittest.mock import patch
+
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from app.core.services.oauth.github import GitHubOAuthService
+from app.core.services.oauth.google import GoogleOAuthService
+
+
+class MockProvider:
+    """Minimal Google/GitHub API served in-process over ASGI."""
+
+    def __init__(self, discovery_status: int = 200):
+        self.discovery_status = discovery_status
+        self.requests: list[str] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.app = Starlette(
+            routes=[
+                Route("/.well-known/openid-configuration", self.discovery),
+                Route("/discovered/token", self.google_token, methods=["POST"]),
+                Route("/discovered/userinfo", self.google_userinfo),
+                Route("/user", self.github_user),
+                Route("/user/emails", self.github_emails),
+            ]
+        )
+
+    def client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=httpx.ASGITransport(app=self.app))
+
+    async def _track(self, request: Request) -> None:
+        self.requests.append(request.url.path)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.05)
+        self.in_flight -= 1
+
+    async def discovery(self, request: Request) -> JSONResponse:
+        await self._track(request)
+        return JSONResponse(
+            {
+                "authorization_endpoint": "https://mock.test/discovered/auth",
+                "token_endpoint": "https://mock.test/discovered/token",
+                "userinfo_endpoint": "https://mock.test/discovered/userinfo",
+            },
+            status_code=self.discovery_status,
+        )
+
+    async def google_token(self, request: Request) -> JSONResponse:
+        await self._track(request)
+        return JSONResponse({"access_token": "ya29.mock", "token_type": "Bearer"})
+
+    async def google_userinfo(self, request: Request) -> JSONResponse:
+        await self._track(request)
+        return JSONResponse(
+            {"sub": "g-1", "email": "user@example.com", "email_verified": True}
+        )
+
+    async def github_user(self, request: Request) -> JSONResponse:
+        await self._track(request)
+        return JSONResponse({"id": 42, "email": None, "name": "Octo"})
+
+    async def github_emails(self, request: Request) -> JSONResponse:
+        await self._track(request)
+        return JSONResponse(
+            [
+                {"email": "old@example.com", "primary": False, "verified": True},
+                {"email": "octo@example.com", "primary": True, "verified": True},
+            ]
+        )
+
+
+@pytest.fixture
+async def provider():
+    mock = MockProvider()
+    for service in (GoogleOAuthService, GitHubOAuthService):
+        await service.aclose()
+        service._client = mock.client()
+
+    yield mock
+
+    for service in (GoogleOAuthService, GitHubOAuthService):
+        await service.aclose()
+    GoogleOAuthService._metadata = {}
+    GoogleOAuthService._metadata_expires_at = 0.0
+
+
+class TestGoogleMetadata:
+
+    @pytest.mark.asyncio
+    async def test_discovered_endpoints_are_used(self, provider):
+        await GoogleOAuthService.load_metadata()
+
+        url = GoogleOAuthService.get_authorization_url("https://app.test/cb", "s")
+        tokens = await GoogleOAuthService.exchange_code_for_tokens(
+            "code", "https://app.test/cb"
+        )
+        user_info = await GoogleOAuthService.get_user_info(tokens.access_token)
+
+        assert url.startswith("https://mock.test/discovered/auth?")
+        assert user_info.email == "user@example.com"
+        assert provider.requests == [
+            "/.well-known/openid-configuration",
+            "/discovered/token",
+            "/discovered/userinfo",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_metadata_is_fetched_once_while_fresh(self, provider):
+        await GoogleOAuthService.load_metadata()
+
+        for _ in range(3):
+            tokens = await GoogleOAuthService.exchange_code_for_tokens(
+                "code", "https://app.test/cb"
+            )
+            await GoogleOAuthService.get_user_info(tokens.access_token)
+
+        assert provider.requests.count("/.well-known/openid-configuration") == 1
+
+    @pytest.mark.asyncio
+    async def test_expired_metadata_refreshes_in_background(self, provider):
+        await GoogleOAuthService.load_metadata()
+        GoogleOAuthService._metadata_expires_at = time.monotonic() - 1
+
+        GoogleOAuthService.get_authorization_url("https://app.test/cb", "s")
+        refresh = GoogleOAuthService._metadata_refresh
+        assert refresh is not None
+        await refresh
+
+        assert provider.requests.count("/.well-known/openid-configuration") == 2
+        assert GoogleOAuthService._metadata_expires_at > time.monotonic()
+
+    @pytest.mark.asyncio
+    async def test_failed_discovery_keeps_default_endpoints(self, provider):
+        provider.discovery_status = 503
+
+        metadata = await GoogleOAuthService.load_metadata()
+        url = GoogleOAuthService.get_authorization_url("https://app.test/cb", "s")
+
+        assert metadata == {}
+        assert url.startswith(GoogleOAuthService._AUTHORIZATION_URL)
+        # Retried soon rather than after the full cache TTL
+        assert (
+            GoogleOAuthService._metadata_expires_at
+            <= time.monotonic() + GoogleOAuthService._DISCOVERY_RETRY_SECONDS
+        )
+
+    @pytest.mark.asyncio
+    async def test_github_has_no_discovery(self, provider):
+        assert await GitHubOAuthService.load_metadata() == {}
+        assert provider.requests == []
+
+
+class TestGitHubConcurrentFetch:
+
+    @pytest.mark.asyncio
+    async def test_user_and_emails_fetched_concurrently(self, provider):
+        user_info = await GitHubOAuthService.get_user_info("gho_mock")
+
+        assert sorted(provider.requests) == ["/user", "/user/emails"]
+        assert provider.max_in_flight == 2
+        assert user_info.provider_user_id == "42"
+        assert user_info.email == "octo@example.com"
+        assert user_info.email_verified is True
+
+
+class TestCreateClient:
+
+    def test_http2_with_keepalive_limits(self):
+        with patch("app.core.services.oauth.base.httpx.AsyncClient") as mock_client:
+            GoogleOAuthService._create_client()
+
+        kwargs = mock_client.call_args.kwargs
+        assert kwargs["http2"] is True
+        assert kwargs["limits"].keepalive_expiry > 0
+
+    def test_falls_back_to_http1_without_h2(self):
+        with (
+            patch("app.core.services.oauth.base.httpx.AsyncClient") as mock_client,
+            patch(
+                "app.core.services.oauth.base.importlib.util.find_spec",
+                return_value=None,
+            ),
+        ):
+            GoogleOAuthService._create_client()
+
+        assert mock_client.call_args.kwargs["http2"] is False
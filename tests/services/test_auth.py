@@ -20,15 +20,19 @@ from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
 
 import pytest
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.enums import OAuthProviders, OTPPurpose
 from app.core.exceptions.types import (
     AuthenticationException,
+    DatabaseException,
     InvalidCredentialsException,
     OAuthException,
     OTPInvalidException,
     TooManyAttemptsException,
 )
+from app.core.utils import hash_password, verify_password
 
 
 class TestAuthServiceInit:
@@ -107,51 +111,57 @@ class TestGenerateOTP:
 
 class TestHashPassword:
 
-    def test_hash_password_returns_string(self):
+    @pytest.mark.asyncio
+    async def test_hash_password_returns_string(self):
         from app.core.services.auth import AuthService
 
-        hashed = AuthService.hash_password("password123")
+        hashed = await AuthService.hash_password("password123")
         assert isinstance(hashed, str)
 
-    def test_hash_password_different_from_input(self):
+    @pytest.mark.asyncio
+    async def test_hash_password_different_from_input(self):
         from app.core.services.auth import AuthService
 
         password = "password123"
-        hashed = AuthService.hash_password(password)
+        hashed = await AuthService.hash_password(password)
         assert hashed != password
 
-    def test_hash_password_different_for_same_input(self):
+    @pytest.mark.asyncio
+    async def test_hash_password_different_for_same_input(self):
         from app.core.services.auth import AuthService
 
         password = "password123"
-        hash1 = AuthService.hash_password(password)
-        hash2 = AuthService.hash_password(password)
+        hash1 = await AuthService.hash_password(password)
+        hash2 = await AuthService.hash_password(password)
         assert hash1 != hash2
 
 
 class TestVerifyPassword:
 
-    def test_verify_password_correct(self):
+    @pytest.mark.asyncio
+    async def test_verify_password_correct(self):
         from app.core.services.auth import AuthService
 
         password = "password123"
-        hashed = AuthService.hash_password(password)
+        hashed = await AuthService.hash_password(password)
 
-        assert AuthService.verify_password(password, hashed) is True
+        assert await AuthService.verify_password(password, hashed) is True
 
-    def test_verify_password_incorrect(self):
+    @pytest.mark.asyncio
+    async def test_verify_password_incorrect(self):
         from app.core.services.auth import AuthService
 
         password = "password123"
-        hashed = AuthService.hash_password(password)
+        hashed = await AuthService.hash_password(password)
 
-        assert AuthService.verify_password("wrongpassword", hashed) is False
+        assert await AuthService.verify_password("wrongpassword", hashed) is False
 
-    def test_verify_password_empty(self):
+    @pytest.mark.asyncio
+    async def test_verify_password_empty(self):
         from app.core.services.auth import AuthService
 
-        hashed = AuthService.hash_password("password123")
-        assert AuthService.verify_password("", hashed) is False
+        hashed = await AuthService.hash_password("password123")
+        assert await AuthService.verify_password("", hashed) is False
 
 
 class TestSendOTP:
@@ -169,7 +179,7 @@ class TestSendOTP:
         from app.core.services.auth import AuthService
 
         with (
-            patch("app.core.services.auth.otp_token_db") as mock_otp_db,
+            patch("app.core.services.otp_store.otp_token_db") as mock_otp_db,
             patch("app.core.services.auth.get_publisher", return_value=AsyncMock()),
             patch("app.core.services.auth.hmac_hash_otp") as mock_hash,
         ):
@@ -193,7 +203,7 @@ class TestSendOTP:
         from app.core.services.auth import AuthService
 
         with (
-            patch("app.core.services.auth.otp_token_db") as mock_otp_db,
+            patch("app.core.services.otp_store.otp_token_db") as mock_otp_db,
             patch("app.core.services.auth.get_publisher", return_value=AsyncMock()),
             patch("app.core.services.auth.hmac_hash_otp"),
         ):
@@ -219,7 +229,7 @@ class TestSendOTP:
 
         mock_publisher = AsyncMock()
         with (
-            patch("app.core.services.auth.otp_token_db") as mock_otp_db,
+            patch("app.core.services.otp_store.otp_token_db") as mock_otp_db,
             patch("app.core.services.auth.get_publisher", return_value=mock_publisher),
             patch("app.core.services.auth.hmac_hash_otp"),
         ):
@@ -248,7 +258,7 @@ class TestSendOTP:
         user_id = uuid4()
 
         with (
-            patch("app.core.services.auth.otp_token_db") as mock_otp_db,
+            patch("app.core.services.otp_store.otp_token_db") as mock_otp_db,
             patch("app.core.services.auth.get_publisher", return_value=AsyncMock()),
             patch("app.core.services.auth.hmac_hash_otp"),
         ):
@@ -291,7 +301,7 @@ class TestVerifyOTP:
         from app.core.services.auth import AuthService
 
         with (
-            patch("app.core.services.auth.otp_token_db") as mock_otp_db,
+            patch("app.core.services.otp_store.otp_token_db") as mock_otp_db,
             patch("app.core.services.auth.hmac_hash_otp") as mock_hash,
         ):
             mock_hash.return_value = "hashed_otp"
@@ -314,7 +324,7 @@ class TestVerifyOTP:
         from app.core.services.auth import AuthService
 
         with (
-            patch("app.core.services.auth.otp_token_db") as mock_otp_db,
+            patch("app.core.services.otp_store.otp_token_db") as mock_otp_db,
             patch("app.core.services.auth.hmac_hash_otp") as mock_hash,
         ):
             mock_hash.return_value = "hashed_otp"
@@ -336,9 +346,9 @@ class TestVerifyOTP:
         valid_token.attempts = 5  # Max attempts reached
 
         with (
-            patch("app.core.services.auth.otp_token_db") as mock_otp_db,
+            patch("app.core.services.otp_store.otp_token_db") as mock_otp_db,
             patch("app.core.services.auth.hmac_hash_otp") as mock_hash,
-            patch("app.core.services.auth.settings") as mock_settings,
+            patch("app.core.services.otp_store.settings") as mock_settings,
         ):
             mock_settings.OTP_MAX_ATTEMPTS = 5
             mock_hash.return_value = "hashed_otp"
@@ -447,6 +457,7 @@ class TestEmailSignin:
     def mock_session(self):
         """Create a mock database session."""
         session = AsyncMock()
+        session.begin_nested = MagicMock(return_value=AsyncMock())
         return session
 
     @pytest.fixture
@@ -564,6 +575,99 @@ class TestEmailSignin:
 
             assert "oauth" in str(exc_info.value.message).lower()
 
+    @pytest.mark.asyncio
+    async def test_email_signin_rehashes_outdated_cost(self, mock_session, valid_user):
+        from app.core.services.auth import AuthService
+
+        valid_user.password_hash = hash_password("password123", rounds=4)
+
+        with (
+            patch("app.core.services.auth.user_db") as mock_user_db,
+            patch("app.core.services.auth.password_hasher.rounds", 5),
+        ):
+            mock_user_db.model = MagicMock()
+            mock_user_db.model.email = "email"
+            mock_user_db.get_one_by_conditions = AsyncMock(return_value=valid_user)
+            mock_user_db.update = AsyncMock()
+
+            await AuthService.email_signin(
+                session=mock_session,
+                email="user@example.com",
+                password="password123",
+            )
+
+            new_hash = mock_user_db.update.call_args.kwargs["updates"]["password_hash"]
+            assert new_hash.startswith("$2b$05$")
+            assert verify_password("password123", new_hash)
+
+    @pytest.mark.asyncio
+    async def test_email_signin_keeps_current_cost_hash(self, mock_session, valid_user):
+        from app.core.services.auth import AuthService
+
+        valid_user.password_hash = hash_password("password123", rounds=4)
+
+        with (
+            patch("app.core.services.auth.user_db") as mock_user_db,
+            patch("app.core.services.auth.password_hasher.rounds", 4),
+        ):
+            mock_user_db.model = MagicMock()
+            mock_user_db.model.email = "email"
+            mock_user_db.get_one_by_conditions = AsyncMock(return_value=valid_user)
+            mock_user_db.update = AsyncMock()
+
+            await AuthService.email_signin(
+                session=mock_session,
+                email="user@example.com",
+                password="password123",
+            )
+
+            mock_user_db.update.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_email_signin_succeeds_when_rehash_fails(
+        self, mock_session, valid_user
+    ):
+        from app.core.services.auth import AuthService
+
+        valid_user.password_hash = hash_password("password123", rounds=4)
+
+        with (
+            patch("app.core.services.auth.user_db") as mock_user_db,
+            patch("app.core.services.auth.password_hasher.rounds", 5),
+        ):
+            mock_user_db.model = MagicMock()
+            mock_user_db.model.email = "email"
+            mock_user_db.get_one_by_conditions = AsyncMock(return_value=valid_user)
+            mock_user_db.update = AsyncMock(side_effect=DatabaseException("down"))
+
+            user = await AuthService.email_signin(
+                session=mock_session,
+                email="user@example.com",
+                password="password123",
+            )
+
+            assert user is valid_user
+            mock_session.begin_nested.return_value.__aexit__.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_failed_rehash_keeps_transaction_usable(
+        self, db_session: AsyncSession, test_user
+    ):
+        from sqlalchemy import text
+
+        from app.core.services.auth import AuthService
+
+        async def failing_update(session, **kwargs):
+            try:
+                await session.execute(text("SELECT 1 / 0"))
+            except SQLAlchemyError as e:
+                raise DatabaseException(str(e)) from e
+
+        with patch("app.core.services.auth.user_db.update", side_effect=failing_update):
+            await AuthService._rehash_password(db_session, test_user, "password123")
+
+        assert (await db_session.execute(text("SELECT 1"))).scalar() == 1
+
 
 class TestOAuthAuthenticate:
 
@@ -599,16 +703,9 @@ class TestOAuthAuthenticate:
             patch("app.core.services.auth.user_db") as mock_user_db,
             patch("app.core.services.auth.oauth_account_db") as mock_oauth_db,
         ):
-            mock_user_db.model = MagicMock()
-            mock_user_db.model.email = "email"
-            mock_user_db.get_one_by_conditions = AsyncMock(return_value=None)
             mock_user_db.create = AsyncMock(return_value=new_user)
 
-            mock_oauth_db.model = MagicMock()
-            mock_oauth_db.model.provider = "provider"
-            mock_oauth_db.model.provider_account_id = "provider_account_id"
-            mock_oauth_db.user_loader = MagicMock()
-            mock_oauth_db.get_one_by_conditions = AsyncMock(return_value=None)
+            mock_oauth_db.resolve_user = AsyncMock(return_value=(None, None))
             mock_oauth_db.create = AsyncMock(return_value=MagicMock())
 
             user = await AuthService.oauth_authenticate(
@@ -634,18 +731,11 @@ class TestOAuthAuthenticate:
         existing_user.email_verified = True
 
         with (
-            patch("app.core.services.auth.user_db") as mock_user_db,
+            patch("app.core.services.auth.user_db"),
             patch("app.core.services.auth.oauth_account_db") as mock_oauth_db,
         ):
-            mock_user_db.model = MagicMock()
-            mock_user_db.model.email = "email"
-            mock_user_db.get_one_by_conditions = AsyncMock(return_value=existing_user)
 
-            mock_oauth_db.model = MagicMock()
-            mock_oauth_db.model.provider = "provider"
-            mock_oauth_db.model.provider_account_id = "provider_account_id"
-            mock_oauth_db.user_loader = MagicMock()
-            mock_oauth_db.get_one_by_conditions = AsyncMock(return_value=None)
+            mock_oauth_db.resolve_user = AsyncMock(return_value=(existing_user, None))
             mock_oauth_db.create = AsyncMock(return_value=MagicMock())
 
             user = await AuthService.oauth_authenticate(
@@ -674,18 +764,13 @@ class TestOAuthAuthenticate:
         existing_oauth.user = existing_user
 
         with (
-            patch("app.core.services.auth.user_db") as mock_user_db,
+            patch("app.core.services.auth.user_db"),
             patch("app.core.services.auth.oauth_account_db") as mock_oauth_db,
         ):
-            mock_user_db.model = MagicMock()
-            mock_user_db.model.email = "email"
-            mock_user_db.get_one_by_conditions = AsyncMock(return_value=existing_user)
 
-            mock_oauth_db.model = MagicMock()
-            mock_oauth_db.model.provider = "provider"
-            mock_oauth_db.model.provider_account_id = "provider_account_id"
-            mock_oauth_db.user_loader = MagicMock()
-            mock_oauth_db.get_one_by_conditions = AsyncMock(return_value=existing_oauth)
+            mock_oauth_db.resolve_user = AsyncMock(
+                return_value=(existing_user, existing_oauth)
+            )
 
             user = await AuthService.oauth_authenticate(
                 session=mock_session,
@@ -715,17 +800,15 @@ class TestOAuthAuthenticate:
         with (
             patch("app.core.services.auth.user_db") as mock_user_db,
             patch("app.core.services.auth.oauth_account_db") as mock_oauth_db,
+            patch(
+                "app.core.services.auth.user_cache", new_callable=AsyncMock
+            ) as mock_user_cache,
         ):
-            mock_user_db.model = MagicMock()
-            mock_user_db.model.email = "email"
-            mock_user_db.get_one_by_conditions = AsyncMock(return_value=existing_user)
             mock_user_db.update = AsyncMock(return_value=existing_user)
 
-            mock_oauth_db.model = MagicMock()
-            mock_oauth_db.model.provider = "provider"
-            mock_oauth_db.model.provider_account_id = "provider_account_id"
-            mock_oauth_db.user_loader = MagicMock()
-            mock_oauth_db.get_one_by_conditions = AsyncMock(return_value=existing_oauth)
+            mock_oauth_db.resolve_user = AsyncMock(
+                return_value=(existing_user, existing_oauth)
+            )
 
             await AuthService.oauth_authenticate(
                 session=mock_session,
@@ -734,6 +817,9 @@ class TestOAuthAuthenticate:
 
             # Should update user with new info
             mock_user_db.update.assert_called_once()
+            mock_user_cache.invalidate_on_commit.assert_awaited_once_with(
+                mock_session, existing_user.id
+            )
 
 
 class TestGetOAuthProvider:
@@ -852,6 +938,70 @@ class TestPasswordReset:
                 )
 
 
+class TestAccessTokens:
+
+    @pytest.fixture
+    def user(self):
+        user = MagicMock()
+        user.id = uuid4()
+        user.email = "test@example.com"
+        user.is_active = True
+        user.email_verified = False
+        user.token_version = 3
+        return user
+
+    def test_access_token_carries_token_version(self, user):
+        from app.core.services.auth import AuthService
+        from app.core.utils import decode_jwt_token
+
+        payload = decode_jwt_token(AuthService._create_access_token(user))
+
+        assert payload is not None
+        assert payload["ver"] == 3
+        assert "act" not in payload and "evf" not in payload
+
+    def test_access_token_signed_claims(self, user):
+        from app.core.services.auth import AuthService
+        from app.core.utils import decode_jwt_token
+
+        with patch("app.core.services.auth.settings") as mock_settings:
+            mock_settings.AUTH_ACCESS_TOKEN_CLAIMS = True
+            token = AuthService._create_access_token(user)
+
+        payload = decode_jwt_token(token)
+        assert payload is not None
+        assert (payload["act"], payload["evf"]) == (True, False)
+
+    @pytest.mark.asyncio
+    async def test_revoke_all_user_tokens_bumps_token_version(self):
+        from app.core.services.auth import AuthService
+
+        session = MagicMock()
+        user_id = uuid4()
+
+        with (
+            patch("app.core.services.auth.user_db") as mock_user_db,
+            patch("app.core.services.auth.session_store") as mock_session_store,
+            patch(
+                "app.core.services.auth.user_cache", new_callable=AsyncMock
+            ) as mock_user_cache,
+        ):
+            mock_user_db.bump_token_version = AsyncMock(return_value=5)
+            mock_session_store.revoke_all = AsyncMock(return_value=2)
+
+            count = await AuthService.revoke_all_user_tokens(
+                session=session, user_id=user_id, commit_self=False
+            )
+
+        assert count == 2
+        mock_user_db.bump_token_version.assert_awaited_once_with(
+            session=session, id=user_id, commit_self=False
+        )
+        mock_user_cache.publish_token_version_on_commit.assert_awaited_once_with(
+            session, user_id, 5, ttl=AuthService.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+        )
+
+
 class TestModuleExports:
 
     def test_all_exports(self):
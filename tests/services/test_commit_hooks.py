@@ -0,0 +1,74 @@
+"""
+Test suite for after-commit cache invalidation hooks.
+
+Run tests:
+    pytest tests/services/test_commit_hooks.py -v
+
+Run with coverage:
+    pytest tests/services/test_commit_hooks.py --cov=app.core.services.commit_hooks --cov-report=term-missing -v
+"""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.core.services.commit_hooks import (
+    CommitHook,
+    _discard_after_rollback,
+    _flush_after_commit,
+    _flush_tasks,
+    register_commit_hook,
+)
+
+MODULE = "app.core.services.commit_hooks"
+
+
+@pytest.fixture
+def hooks():
+    with patch(f"{MODULE}._hooks", []) as registered:
+        yield registered
+
+
+class TestCommitHooks:
+
+    @pytest.mark.asyncio
+    async def test_commit_flushes_only_hooks_with_pending_work(self, hooks):
+        first = CommitHook("first", flush=AsyncMock(), on_commit=MagicMock())
+        second = CommitHook("second", flush=AsyncMock(), on_commit=MagicMock())
+        register_commit_hook(first)
+        register_commit_hook(second)
+        session = SimpleNamespace(info={"first": {"a"}, "second": set()})
+
+        _flush_after_commit(session)
+        (task,) = _flush_tasks
+        await task
+
+        first.on_commit.assert_called_once_with({"a"})
+        first.flush.assert_awaited_once_with({"a"})
+        second.flush.assert_not_awaited()
+        assert session.info == {}
+        assert not _flush_tasks
+
+    def test_commit_without_running_loop_only_runs_on_commit(self, hooks):
+        hook = CommitHook("pending", flush=MagicMock(), on_commit=MagicMock())
+        register_commit_hook(hook)
+        session = SimpleNamespace(info={"pending": {"a"}})
+
+        _flush_after_commit(session)
+
+        hook.on_commit.assert_called_once_with({"a"})
+        hook.flush.assert_not_called()
+        assert session.info == {}
+
+    def test_rollback_discards_pending_work(self, hooks):
+        hook = CommitHook("pending", flush=MagicMock(), on_rollback=MagicMock())
+        register_commit_hook(hook)
+        session = SimpleNamespace(info={"pending": {"a"}})
+
+        _discard_after_rollback(session)
+        _flush_after_commit(session)
+
+        hook.on_rollback.assert_called_once_with(session)
+        hook.flush.assert_not_called()
+        assert session.info == {}
@@ -0,0 +1,165 @@
+"""
+Test suite for bulk DLQ retries.
+
+Run tests:
+    pytest tests/services/test_dlq.py -v
+
+Run with coverage:
+    pytest tests/services/test_dlq.py --cov=app.core.services.dlq --cov-report=term-missing -v
+"""
+
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.db.crud import dlq_message_db
+from app.core.db.models import DLQMessage
+from app.core.enums import DLQMessageStatus
+from app.core.services.dlq import (
+    original_queue,
+    retry_by_filter,
+    retry_messages,
+    retry_payload,
+)
+from app.core.services.event_publisher import register_publisher, reset_publisher
+
+
+class _SessionFactory:
+    """Runs each page transaction in a savepoint of the test session."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    @asynccontextmanager
+    async def begin(self):
+        async with self.session.begin_nested():
+            yield self.session
+
+
+@pytest.fixture
+def batch_publisher():
+    publisher = AsyncMock(side_effect=lambda events: len(events))
+    register_publisher(AsyncMock(), publisher)
+    yield publisher
+    reset_publisher()
+
+
+async def _dead_letters(db_session: AsyncSession, count: int, **overrides):
+    return await dlq_message_db.bulk_insert_returning(
+        db_session,
+        [
+            {
+                "queue_name": "stripe_payment_failed_dead",
+                "message_body": f'{{"n": {i}}}',
+                "error_message": "Stripe timeout",
+                "headers": {},
+                "attempt_count": 4,
+                **overrides,
+            }
+            for i in range(count)
+        ],
+        commit_self=False,
+    )
+
+
+class TestHelpers:
+
+    def test_original_queue_prefers_header(self):
+        message = DLQMessage(queue_name="a_dead", headers={"x-original-queue": "b"})
+
+        assert original_queue(message) == "b"
+
+    def test_original_queue_from_dlq_name(self):
+        assert original_queue(DLQMessage(queue_name="a_dead", headers=None)) == "a"
+
+    def test_original_queue_unknown(self):
+        assert original_queue(DLQMessage(queue_name="mystery", headers={})) is None
+
+    def test_retry_payload_wraps_non_json(self):
+        assert retry_payload(DLQMessage(message_body="oops")) == {"raw": "oops"}
+
+
+class TestRetryByFilter:
+
+    @pytest.mark.asyncio
+    async def test_republishes_matching_rows_page_by_page(
+        self, db_session: AsyncSession, batch_publisher
+    ):
+        messages = await _dead_letters(db_session, 5)
+        await _dead_letters(db_session, 2, error_message="card declined")
+
+        result = await retry_by_filter(
+            queue_name="stripe_payment_failed",
+            error_pattern="TIMEOUT",
+            since=datetime(2000, 1, 1, tzinfo=timezone.utc),
+            page_size=2,
+            session_factory=_SessionFactory(db_session),  # type: ignore[arg-type]
+        )
+
+        assert result.retried == 5
+        assert result.skipped == 0
+        # One publish (one confirm wait) per page
+        assert batch_publisher.await_count == 3
+        published = [e for c in batch_publisher.await_args_list for e in c.args[0]]
+        assert {queue for queue, _, _ in published} == {"stripe_payment_failed"}
+        assert sorted(payload["n"] for _, payload, _ in published) == list(range(5))
+        assert {h["x-dlq-message-id"] for _, _, h in published} == {
+            str(m.id) for m in messages
+        }
+        for message in messages:
+            await db_session.refresh(message)
+            assert message.status == DLQMessageStatus.RETRIED
+
+    @pytest.mark.asyncio
+    async def test_rows_without_queue_are_skipped(
+        self, db_session: AsyncSession, batch_publisher
+    ):
+        (message,) = await _dead_letters(
+            db_session, 1, queue_name="orphan", error_message="orphaned"
+        )
+
+        result = await retry_by_filter(
+            error_pattern="orphaned",
+            session_factory=_SessionFactory(db_session),  # type: ignore[arg-type]
+        )
+
+        assert result.retried == 0
+        assert result.skipped == 1
+        batch_publisher.assert_not_awaited()
+        await db_session.refresh(message)
+        assert message.status == DLQMessageStatus.PENDING
+
+
+class TestRetryMessages:
+
+    @pytest.mark.asyncio
+    async def test_retries_only_selected_pending_rows(
+        self, db_session: AsyncSession, batch_publisher
+    ):
+        first, second, _ = await _dead_letters(db_session, 3)
+
+        result = await retry_messages(
+            [first.id, second.id, uuid4()],
+            session_factory=_SessionFactory(db_session),  # type: ignore[arg-type]
+        )
+
+        assert result.retried == 2
+        batch_publisher.assert_awaited_once()
+
+        # Already retried: nothing left to do
+        again = await retry_messages(
+            [first.id],
+            session_factory=_SessionFactory(db_session),  # type: ignore[arg-type]
+        )
+        assert again.retried == 0
+
+    @pytest.mark.asyncio
+    async def test_empty_selection(self, batch_publisher):
+        result = await retry_messages([])
+
+        assert result.retried == 0
+        batch_publisher.assert_not_awaited()
@@ -0,0 +1,119 @@
+"""
+Test suite for lease-based idempotency claims.
+
+Run tests:
+    pytest tests/services/test_idempotency.py -v
+
+Run with coverage:
+    pytest tests/services/test_idempotency.py --cov=app.core.services.idempotency --cov-report=term-missing -v
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.core.services.idempotency import ClaimStatus, IdempotencyLease
+
+REDIS = "app.core.services.idempotency.RedisService"
+
+
+class TestClaim:
+
+    @pytest.mark.asyncio
+    async def test_acquired(self):
+        lease = IdempotencyLease("job:1", 5000, 60)
+
+        with patch(
+            f"{REDIS}.acquire_lease", new_callable=AsyncMock, return_value=lease.token
+        ) as mock_acquire:
+            assert await lease.claim() is ClaimStatus.ACQUIRED
+
+        mock_acquire.assert_awaited_once_with("job:1", lease.token, 5000)
+
+    @pytest.mark.parametrize(
+        "value, status",
+        [
+            ("lease:someone-else", ClaimStatus.IN_PROGRESS),
+            ("1", ClaimStatus.COMPLETED),
+            (None, ClaimStatus.UNAVAILABLE),
+        ],
+    )
+    @pytest.mark.asyncio
+    async def test_other_outcomes(self, value, status):
+        lease = IdempotencyLease("job:1", 5000, 60)
+
+        with patch(
+            f"{REDIS}.acquire_lease", new_callable=AsyncMock, return_value=value
+        ):
+            assert await lease.claim() is status
+
+    def test_tokens_are_unique_leases(self):
+        first = IdempotencyLease("job:1", 5000, 60)
+        second = IdempotencyLease("job:1", 5000, 60)
+
+        assert first.token.startswith("lease:")
+        assert first.token != second.token
+
+
+class TestHold:
+
+    @pytest.mark.asyncio
+    async def test_completes_on_success(self):
+        lease = IdempotencyLease("job:1", 5000, 60)
+
+        with (
+            patch(f"{REDIS}.complete_lease", new_callable=AsyncMock) as mock_complete,
+            patch(f"{REDIS}.release_lease", new_callable=AsyncMock) as mock_release,
+        ):
+            async with lease.hold():
+                pass
+
+        mock_complete.assert_awaited_once_with("job:1", lease.token, "1", 60)
+        mock_release.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_releases_on_failure(self):
+        lease = IdempotencyLease("job:1", 5000, 60)
+
+        with (
+            patch(f"{REDIS}.complete_lease", new_callable=AsyncMock) as mock_complete,
+            patch(f"{REDIS}.release_lease", new_callable=AsyncMock) as mock_release,
+        ):
+            with pytest.raises(RuntimeError):
+                async with lease.hold():
+                    raise RuntimeError("boom")
+
+        mock_release.assert_awaited_once_with("job:1", lease.token)
+        mock_complete.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_renews_while_running(self):
+        lease = IdempotencyLease("job:1", 30, 60)
+
+        with (
+            patch(
+                f"{REDIS}.renew_lease", new_callable=AsyncMock, return_value=True
+            ) as mock_renew,
+            patch(f"{REDIS}.complete_lease", new_callable=AsyncMock),
+        ):
+            async with lease.hold():
+                await asyncio.sleep(0.05)
+
+        assert mock_renew.await_count >= 2
+        mock_renew.assert_awaited_with("job:1", lease.token, 30)
+
+    @pytest.mark.asyncio
+    async def test_stops_renewing_once_lease_is_lost(self):
+        lease = IdempotencyLease("job:1", 30, 60)
+
+        with (
+            patch(
+                f"{REDIS}.renew_lease", new_callable=AsyncMock, return_value=False
+            ) as mock_renew,
+            patch(f"{REDIS}.complete_lease", new_callable=AsyncMock),
+        ):
+            async with lease.hold():
+                await asyncio.sleep(0.05)
+
+        mock_renew.assert_awaited_once()
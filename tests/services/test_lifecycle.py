@@ -0,0 +1,199 @@
+"""
+Test suite for post-signup provisioning.
+
+Run tests:
+    pytest tests/services/test_lifecycle.py -v
+
+Run with coverage:
+    pytest tests/services/test_lifecycle.py --cov=app.core.services.lifecycle --cov-report=term-missing -v
+"""
+
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.services.lifecycle import (
+    PROVISIONING_QUEUE,
+    enqueue_provisioning,
+    provision_user,
+    register_post_signup_hook,
+    request_provisioning,
+)
+
+MODULE = "app.core.services.lifecycle"
+
+
+class HookRecorder:
+    """Registers post-signup hooks that record the users they ran for."""
+
+    def __init__(self):
+        self.calls: list[str] = []
+
+    def register(self, name: str, fail: bool = False) -> None:
+        async def hook(session, user):
+            self.calls.append(name)
+            if fail:
+                raise ValueError(f"{name} failed")
+
+        hook.__qualname__ = name
+        register_post_signup_hook(hook)
+
+
+@pytest.fixture
+def hooks():
+    return HookRecorder()
+
+
+class TestRegisterPostSignupHook:
+
+    @pytest.mark.asyncio
+    async def test_registering_twice_runs_once(
+        self, db_session: AsyncSession, test_user
+    ):
+        calls = []
+
+        async def hook(session, user):
+            calls.append(user.id)
+
+        register_post_signup_hook(hook)
+        register_post_signup_hook(hook)
+        await provision_user(db_session, test_user)
+
+        assert calls == [test_user.id]
+
+
+class TestProvisionUser:
+
+    @pytest.mark.asyncio
+    async def test_runs_hooks_in_order_and_marks_provisioned(
+        self, db_session: AsyncSession, test_user, hooks
+    ):
+        hooks.register("workspace")
+        hooks.register("career")
+
+        await provision_user(db_session, test_user)
+        await db_session.refresh(test_user)
+
+        assert hooks.calls == ["workspace", "career"]
+        assert test_user.provisioned_at is not None
+
+    @pytest.mark.asyncio
+    async def test_hook_failure_propagates(
+        self, db_session: AsyncSession, test_user, hooks
+    ):
+        hooks.register("workspace", fail=True)
+        hooks.register("career")
+
+        with pytest.raises(ValueError):
+            await provision_user(db_session, test_user)
+
+        assert hooks.calls == ["workspace"]
+        assert test_user.provisioned_at is None
+
+    @pytest.mark.asyncio
+    async def test_refuses_to_run_without_hooks(
+        self, db_session: AsyncSession, test_user
+    ):
+        with pytest.raises(RuntimeError):
+            await provision_user(db_session, test_user)
+
+        assert test_user.provisioned_at is None
+
+
+class TestRequestProvisioning:
+
+    @pytest.mark.asyncio
+    async def test_async_mode_publishes_job(
+        self, db_session: AsyncSession, test_user, hooks
+    ):
+        hooks.register("workspace")
+        publisher = AsyncMock()
+
+        with (
+            patch(f"{MODULE}.settings.SIGNUP_PROVISIONING_MODE", "async"),
+            patch(f"{MODULE}.get_publisher", return_value=publisher),
+        ):
+            await request_provisioning(db_session, test_user)
+
+        publisher.assert_awaited_once_with(
+            PROVISIONING_QUEUE, {"user_id": str(test_user.id)}
+        )
+        assert hooks.calls == []
+        assert test_user.provisioned_at is None
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_inline_without_publisher(
+        self, db_session: AsyncSession, test_user, hooks
+    ):
+        hooks.register("workspace")
+
+        with (
+            patch(f"{MODULE}.settings.SIGNUP_PROVISIONING_MODE", "async"),
+            patch(f"{MODULE}.get_publisher", side_effect=RuntimeError("none")),
+        ):
+            await request_provisioning(db_session, test_user)
+
+        assert hooks.calls == ["workspace"]
+        assert test_user.provisioned_at is not None
+
+    @pytest.mark.asyncio
+    async def test_inline_mode_runs_hooks(
+        self, db_session: AsyncSession, test_user, hooks
+    ):
+        hooks.register("workspace")
+
+        with (
+            patch(f"{MODULE}.settings.SIGNUP_PROVISIONING_MODE", "inline"),
+            patch(f"{MODULE}.get_publisher") as mock_get_publisher,
+        ):
+            await request_provisioning(db_session, test_user)
+
+        mock_get_publisher.assert_not_called()
+        assert hooks.calls == ["workspace"]
+        assert test_user.provisioned_at is not None
+
+    @pytest.mark.asyncio
+    async def test_inline_failure_leaves_user_for_the_sweep(
+        self, db_session: AsyncSession, test_user, hooks
+    ):
+        hooks.register("workspace", fail=True)
+        hooks.register("career")
+
+        with patch(f"{MODULE}.settings.SIGNUP_PROVISIONING_MODE", "inline"):
+            await request_provisioning(db_session, test_user)
+
+        assert hooks.calls == ["workspace", "career"]
+        assert test_user.provisioned_at is None
+
+    @pytest.mark.asyncio
+    async def test_provisioned_user_is_skipped(
+        self, db_session: AsyncSession, test_user, hooks
+    ):
+        hooks.register("workspace")
+        test_user.provisioned_at = datetime.now(timezone.utc)
+
+        with patch(f"{MODULE}.get_publisher") as mock_get_publisher:
+            await request_provisioning(db_session, test_user)
+
+        mock_get_publisher.assert_not_called()
+        assert hooks.calls == []
+
+
+class TestEnqueueProvisioning:
+
+    @pytest.mark.asyncio
+    async def test_publishes_one_event_per_user(self):
+        user_ids = [uuid4(), uuid4(), uuid4()]
+        publisher = AsyncMock(return_value=3)
+
+        with patch(f"{MODULE}.get_batch_publisher", return_value=publisher) as mock_get:
+            count = await enqueue_provisioning(user_ids)
+
+        mock_get.assert_called_once_with(None)
+        assert count == 3
+        assert publisher.await_args.args[0] == [
+            (PROVISIONING_QUEUE, {"user_id": str(user_id)}) for user_id in user_ids
+        ]
@@ -0,0 +1,199 @@
+"""
+Test suite for the messaging metrics registry.
+
+Run tests:
+    pytest tests/services/test_messaging_metrics.py -v
+
+Run with coverage:
+    pytest tests/services/test_messaging_metrics.py --cov=app.core.services.messaging_metrics --cov-report=term-missing -v
+"""
+
+import json
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.core.services.messaging_metrics import (
+    METRICS_REDIS_KEY,
+    Histogram,
+    MessagingMetrics,
+    MessagingMetricsReporter,
+    collect_messaging_metrics,
+    process_id,
+)
+
+MODULE = "app.core.services.messaging_metrics"
+
+
+class TestHistogram:
+
+    def test_buckets_are_cumulative(self):
+        histogram = Histogram(buckets=(0.1, 1.0))
+
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe(value)
+
+        assert histogram.cumulative() == [("0.1", 2), ("1", 3), ("+Inf", 4)]
+        assert histogram.count == 4
+        assert histogram.sum == 3.65
+
+    def test_merge_adds_exported_counts(self):
+        first = Histogram(buckets=(0.1, 1.0))
+        second = Histogram(buckets=(0.1, 1.0))
+        first.observe(0.05)
+        second.observe(0.5)
+        second.observe(3.0)
+
+        first.merge(json.loads(json.dumps(second.export())))
+
+        assert first.cumulative() == [("0.1", 1), ("1", 2), ("+Inf", 3)]
+        assert first.count == 3
+        assert first.sum == 3.55
+
+
+class TestMessagingMetrics:
+
+    def test_acked_outcome_records_time_in_queue(self):
+        metrics = MessagingMetrics()
+        published_at = int((time.time() - 2) * 1000)
+
+        metrics.record_outcome("usage_commits", "acked", published_at)
+        metrics.record_outcome("usage_commits", "retried", published_at)
+
+        histogram = metrics.time_in_queue_seconds["usage_commits"]
+        assert histogram.count == 1
+        assert 1.9 < histogram.sum < 10
+        assert metrics.messages[("usage_commits", "retried")] == 1
+
+    def test_missing_or_malformed_timestamp_is_ignored(self):
+        metrics = MessagingMetrics()
+
+        metrics.record_outcome("emails", "acked", None)
+        metrics.record_outcome("emails", "acked", b"not-a-number")
+
+        assert metrics.messages[("emails", "acked")] == 2
+        assert "emails" not in metrics.time_in_queue_seconds
+
+    def test_snapshot_groups_by_queue(self):
+        metrics = MessagingMetrics()
+        metrics.observe_handler("emails", "send_email", 0.02)
+        metrics.record_outcome("emails", "dead_lettered")
+        metrics.set_queue_depth("emails", messages=7, consumers=2)
+        metrics.set_queue_depth_error("emails_dead", "NOT_FOUND")
+
+        snapshot = metrics.snapshot()
+
+        assert list(snapshot) == ["emails", "emails_dead"]
+        emails = snapshot["emails"]
+        assert emails["handlers"]["send_email"]["count"] == 1
+        assert emails["messages"] == {"dead_lettered": 1}
+        assert emails["depth"]["messages"] == 7
+        assert emails["depth"]["consumers"] == 2
+        assert snapshot["emails_dead"]["depth"]["error"] == "NOT_FOUND"
+
+    def test_render_prometheus(self):
+        metrics = MessagingMetrics()
+        metrics.observe_handler("emails", "send_email", 0.02)
+        metrics.record_outcome("emails", "acked")
+        metrics.set_queue_depth("emails", messages=7, consumers=2)
+
+        text = metrics.render_prometheus()
+
+        assert "# TYPE messaging_handler_seconds histogram" in text
+        assert (
+            'messaging_handler_seconds_bucket{queue="emails",handler="send_email",'
+            'le="0.025"} 1' in text
+        )
+        assert (
+            'messaging_handler_seconds_count{queue="emails",handler="send_email"} 1'
+            in text
+        )
+        assert 'messaging_messages_total{queue="emails",outcome="acked"} 1' in text
+        assert 'messaging_queue_messages{queue="emails"} 7' in text
+        assert 'messaging_queue_consumers{queue="emails"} 2' in text
+
+    def test_merge_sums_counts_and_keeps_latest_depth(self):
+        api = MessagingMetrics()
+        api.observe_handler("emails", "send_email", 0.02)
+        api.record_outcome("emails", "acked")
+        api.set_queue_depth("emails", messages=7, consumers=2)
+        worker = MessagingMetrics()
+        worker.observe_handler("emails", "send_email", 0.5)
+        worker.record_outcome("emails", "acked")
+        worker.set_queue_depth("emails", messages=3, consumers=4)
+
+        merged = MessagingMetrics()
+        merged.merge(api.export())
+        merged.merge(json.loads(json.dumps(worker.export())))
+
+        assert merged.handler_seconds[("emails", "send_email")].count == 2
+        assert merged.messages[("emails", "acked")] == 2
+        assert merged.queue_depth["emails"].messages == 3
+        assert merged.queue_depth["emails"].consumers == 4
+
+
+def _report(metrics: MessagingMetrics, reported_at: float) -> str:
+    return json.dumps({"reported_at": reported_at, "metrics": metrics.export()})
+
+
+class TestCollectMessagingMetrics:
+
+    @pytest.mark.asyncio
+    async def test_merges_fresh_reports_and_drops_stale_ones(self):
+        local = MessagingMetrics()
+        local.record_outcome("emails", "acked")
+        worker = MessagingMetrics()
+        worker.record_outcome("emails", "acked")
+        worker.record_outcome("emails", "retried")
+        reports = {
+            process_id(): _report(local, 0),
+            "worker:host:1": _report(worker, time.time()),
+            "worker:host:2": _report(worker, time.time() - 3600),
+            "worker:host:3": "not json",
+        }
+
+        with patch(f"{MODULE}.RedisService") as redis:
+            redis.hgetall = AsyncMock(return_value=reports)
+            redis.hdel = AsyncMock(return_value=1)
+            merged, processes = await collect_messaging_metrics(local)
+
+        assert processes == [process_id(), "worker:host:1"]
+        assert merged.messages[("emails", "acked")] == 2
+        assert merged.messages[("emails", "retried")] == 1
+        redis.hdel.assert_awaited_once_with(METRICS_REDIS_KEY, "worker:host:2")
+
+    @pytest.mark.asyncio
+    async def test_without_redis_returns_local_registry(self):
+        local = MessagingMetrics()
+        local.record_outcome("emails", "dropped")
+
+        with patch(f"{MODULE}.RedisService") as redis:
+            redis.hgetall = AsyncMock(return_value=None)
+            redis.hdel = AsyncMock()
+            merged, processes = await collect_messaging_metrics(local)
+
+        assert processes == [process_id()]
+        assert merged.messages[("emails", "dropped")] == 1
+        redis.hdel.assert_not_awaited()
+
+
+class TestMessagingMetricsReporter:
+
+    @pytest.mark.asyncio
+    async def test_reports_and_removes_itself_on_stop(self):
+        metrics = MessagingMetrics()
+        metrics.record_outcome("emails", "acked")
+        reporter = MessagingMetricsReporter(metrics)
+
+        with patch(f"{MODULE}.RedisService") as redis:
+            redis.hset = AsyncMock(return_value=True)
+            redis.hdel = AsyncMock(return_value=1)
+            assert await reporter.report_once() is True
+            reporter.start(3600)
+            await reporter.stop()
+
+        key, field, value = redis.hset.await_args.args
+        assert (key, field) == (METRICS_REDIS_KEY, process_id())
+        assert json.loads(value)["metrics"]["messages"] == [["emails", "acked", 1]]
+        redis.hdel.assert_awaited_once_with(METRICS_REDIS_KEY, process_id())
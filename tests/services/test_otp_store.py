@@ -0,0 +1,168 @@
+"""
+Test suite for the OTP stores.
+
+Run tests:
+    pytest tests/services/test_otp_store.py -v
+
+Run with coverage:
+    pytest tests/services/test_otp_store.py --cov=app.core.services.otp_store --cov-report=term-missing -v
+"""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.enums import OTPPurpose
+from app.core.services.otp_store import (
+    OTP_AUDIT_QUEUE,
+    DatabaseOTPStore,
+    OTPStoreUnavailableException,
+    RedisOTPStore,
+    create_otp_store,
+)
+from app.core.services.redis_service import RedisService
+
+MODULE = "app.core.services.otp_store"
+EMAIL = "user@example.com"
+PURPOSE = OTPPurpose.EMAIL_VERIFICATION
+
+
+def _expires(minutes: int = 10) -> datetime:
+    return datetime.now(timezone.utc) + timedelta(minutes=minutes)
+
+
+@pytest.fixture
+def session():
+    return MagicMock()
+
+
+class TestRedisOTPStore:
+
+    @pytest.fixture
+    def store(self):
+        return RedisOTPStore(max_attempts=3)
+
+    @pytest.mark.asyncio
+    async def test_issue_and_consume(self, store, session):
+        await store.issue(session, EMAIL, PURPOSE, "hash-1", _expires())
+
+        assert await store.consume(session, EMAIL, PURPOSE, "hash-1") == "verified"
+        assert await store.consume(session, EMAIL, PURPOSE, "hash-1") == "invalid"
+
+    @pytest.mark.asyncio
+    async def test_code_expires_with_ttl(self, store, session):
+        await store.issue(session, EMAIL, PURPOSE, "hash-1", _expires(minutes=10))
+
+        ttl = await RedisService._client.ttl(store._key(EMAIL, PURPOSE))
+        assert 590 < ttl <= 600
+
+    @pytest.mark.asyncio
+    async def test_new_code_replaces_previous(self, store, session):
+        await store.issue(session, EMAIL, PURPOSE, "hash-1", _expires())
+        await store.issue(session, EMAIL, PURPOSE, "hash-2", _expires())
+
+        assert await store.consume(session, EMAIL, PURPOSE, "hash-1") == "invalid"
+        assert await store.consume(session, EMAIL, PURPOSE, "hash-2") == "verified"
+
+    @pytest.mark.asyncio
+    async def test_codes_are_scoped_by_purpose(self, store, session):
+        await store.issue(session, EMAIL, PURPOSE, "hash-1", _expires())
+
+        assert (
+            await store.consume(session, EMAIL, OTPPurpose.PASSWORD_RESET, "hash-1")
+            == "invalid"
+        )
+        assert await store.consume(session, EMAIL, PURPOSE, "hash-1") == "verified"
+
+    @pytest.mark.asyncio
+    async def test_wrong_guesses_lock_the_code(self, store, session):
+        await store.issue(session, EMAIL, PURPOSE, "hash-1", _expires())
+
+        outcomes = [
+            await store.consume(session, EMAIL, PURPOSE, "wrong") for _ in range(3)
+        ]
+
+        assert outcomes == ["invalid"] * 3
+        assert await store.consume(session, EMAIL, PURPOSE, "hash-1") == "locked"
+
+    @pytest.mark.asyncio
+    async def test_raises_when_redis_unavailable(self, store, session):
+        with patch(f"{MODULE}.RedisService.eval", AsyncMock(return_value=None)):
+            with pytest.raises(OTPStoreUnavailableException):
+                await store.issue(session, EMAIL, PURPOSE, "hash-1", _expires())
+            with pytest.raises(OTPStoreUnavailableException):
+                await store.consume(session, EMAIL, PURPOSE, "hash-1")
+
+    @pytest.mark.asyncio
+    async def test_audit_events_published(self, session):
+        store = RedisOTPStore(audit=True)
+        user_id = uuid4()
+        publisher = AsyncMock()
+
+        with patch(f"{MODULE}.get_publisher", return_value=publisher):
+            await store.issue(session, EMAIL, PURPOSE, "hash-1", _expires(), user_id)
+            await store.consume(session, EMAIL, PURPOSE, "wrong")
+            await store.consume(session, EMAIL, PURPOSE, "hash-1")
+
+        (issued_queue, issued), (used_queue, used) = (
+            call.args for call in publisher.await_args_list
+        )
+        assert issued_queue == used_queue == OTP_AUDIT_QUEUE
+        assert issued["action"] == "issued"
+        assert issued["user_id"] == str(user_id)
+        assert issued["purpose"] == PURPOSE.value
+        assert used["action"] == "used"
+        assert used["id"] == issued["id"]
+        assert used["attempts"] == 2
+
+    @pytest.mark.asyncio
+    async def test_audit_failure_does_not_block(self, session):
+        store = RedisOTPStore(audit=True)
+
+        with patch(f"{MODULE}.get_publisher", side_effect=RuntimeError("down")):
+            await store.issue(session, EMAIL, PURPOSE, "hash-1", _expires())
+
+        assert await store.consume(session, EMAIL, PURPOSE, "hash-1") == "verified"
+
+
+class TestDatabaseOTPStore:
+
+    @pytest.mark.asyncio
+    async def test_issue_and_consume(self, db_session: AsyncSession):
+        store = DatabaseOTPStore()
+
+        await store.issue(db_session, EMAIL, PURPOSE, "db-hash-1", _expires())
+        await store.issue(db_session, EMAIL, PURPOSE, "db-hash-2", _expires())
+
+        assert (
+            await store.consume(
+                db_session, EMAIL, PURPOSE, "db-hash-1", commit_self=False
+            )
+            == "invalid"
+        )
+        assert (
+            await store.consume(
+                db_session, EMAIL, PURPOSE, "db-hash-2", commit_self=False
+            )
+            == "verified"
+        )
+
+
+class TestCreateOTPStore:
+
+    def test_backends(self):
+        assert isinstance(create_otp_store("database"), DatabaseOTPStore)
+        assert isinstance(create_otp_store("redis"), RedisOTPStore)
+
+    def test_redis_store_follows_settings(self):
+        with patch(f"{MODULE}.settings") as mock_settings:
+            mock_settings.OTP_STORE_BACKEND = "redis"
+            mock_settings.OTP_STORE_AUDIT = False
+            mock_settings.OTP_MAX_ATTEMPTS = 7
+            store = create_otp_store()
+
+        assert isinstance(store, RedisOTPStore)
+        assert (store.audit, store.max_attempts) == (False, 7)
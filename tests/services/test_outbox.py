@@ -0,0 +1,145 @@
+"""
+Test suite for the transactional outbox publisher.
+
+Run tests:
+    pytest tests/services/test_outbox.py -v
+
+Run with coverage:
+    pytest tests/services/test_outbox.py --cov=app.core.services.outbox --cov-report=term-missing -v
+"""
+
+from contextlib import asynccontextmanager
+from decimal import Decimal
+from unittest.mock import AsyncMock
+from uuid import UUID, uuid4
+
+import pytest
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.db.crud import outbox_event_db
+from app.core.services.event_publisher import (
+    get_batch_publisher,
+    get_publisher,
+    register_publisher,
+    reset_publisher,
+)
+from app.core.services.outbox import OutboxPublisher, OutboxWriter
+
+
+class _SessionFactory:
+    """Runs each transaction in a savepoint of the test session."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    @asynccontextmanager
+    async def begin(self):
+        async with self.session.begin_nested():
+            yield self.session
+
+
+class Payload(BaseModel):
+    id: UUID
+    amount: Decimal
+
+
+@pytest.fixture
+def outbox(db_session: AsyncSession):
+    publisher = OutboxPublisher(_SessionFactory(db_session))  # type: ignore[arg-type]
+    register_publisher(publisher, publisher.publish_many)
+    yield publisher
+    reset_publisher()
+
+
+class TestOutboxWriter:
+
+    @pytest.mark.asyncio
+    async def test_adds_event_to_session(self, db_session: AsyncSession):
+        event_id = uuid4()
+
+        await OutboxWriter(db_session)(
+            "otp_emails", {"id": event_id, "n": 1}, {"x-trace": "t"}
+        )
+        await db_session.flush()
+
+        (event,) = await outbox_event_db.claim_batch(db_session, 10)
+        assert event.queue_name == "otp_emails"
+        assert event.payload == {"id": str(event_id), "n": 1}
+        assert event.headers == {"x-trace": "t"}
+        assert event.published_at is None
+
+    @pytest.mark.asyncio
+    async def test_serialises_models(self, db_session: AsyncSession):
+        payload = Payload(id=uuid4(), amount=Decimal("1.50"))
+
+        await OutboxWriter(db_session)("usage_commits", payload)
+        await db_session.flush()
+
+        (event,) = await outbox_event_db.claim_batch(db_session, 10)
+        assert Payload.model_validate(event.payload) == payload
+        assert event.headers is None
+
+    @pytest.mark.asyncio
+    async def test_publish_many(self, db_session: AsyncSession):
+        count = await OutboxWriter(db_session).publish_many(
+            [("a", {"n": 1}), ("b", {"n": 2}, {"h": 1})]
+        )
+        await db_session.flush()
+
+        events = await outbox_event_db.claim_batch(db_session, 10)
+        assert count == 2
+        assert sorted((e.queue_name, e.headers) for e in events) == [
+            ("a", None),
+            ("b", {"h": 1}),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_events_roll_back_with_transaction(self, db_session: AsyncSession):
+        savepoint = await db_session.begin_nested()
+        await OutboxWriter(db_session)("otp_emails", {"n": 1})
+        await db_session.flush()
+        await savepoint.rollback()
+
+        assert await outbox_event_db.claim_batch(db_session, 10) == []
+
+
+class TestOutboxPublisher:
+
+    @pytest.mark.asyncio
+    async def test_unbound_call_writes_own_transaction(
+        self, outbox: OutboxPublisher, db_session: AsyncSession
+    ):
+        await get_publisher()("welcome_emails", {"email": "a@b.c"})
+
+        (event,) = await outbox_event_db.claim_batch(db_session, 10)
+        assert event.queue_name == "welcome_emails"
+
+    @pytest.mark.asyncio
+    async def test_get_publisher_binds_session(
+        self, outbox: OutboxPublisher, db_session: AsyncSession
+    ):
+        publisher = get_publisher(db_session)
+
+        assert isinstance(publisher, OutboxWriter)
+        assert publisher.session is db_session
+
+    @pytest.mark.asyncio
+    async def test_get_batch_publisher_binds_session(
+        self, outbox: OutboxPublisher, db_session: AsyncSession
+    ):
+        await get_batch_publisher(db_session)([("a", {"n": 1}), ("a", {"n": 2})])
+        await db_session.flush()
+
+        assert len(await outbox_event_db.claim_batch(db_session, 10)) == 2
+
+    @pytest.mark.asyncio
+    async def test_session_is_ignored_by_direct_publishers(self):
+        direct = AsyncMock()
+        batch = AsyncMock()
+        register_publisher(direct, batch)
+        try:
+            assert get_publisher(AsyncMock()) is direct
+            assert get_batch_publisher(AsyncMock()) is batch
+        finally:
+            reset_publisher()
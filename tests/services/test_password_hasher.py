@@ -0,0 +1,107 @@
+"""
+Test suite for the pooled password hasher.
+
+Run tests:
+    pytest tests/services/test_password_hasher.py -v
+
+Run with coverage:
+    pytest tests/services/test_password_hasher.py --cov=app.core.services.password_hasher --cov-report=term-missing -v
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from app.core.exceptions.types import RateLimitExceededException
+from app.core.services.password_hasher import PasswordHasher, bcrypt_cost
+
+
+@pytest.fixture
+def hasher():
+    hasher = PasswordHasher(rounds=4, workers=2, max_pending=4, queue_timeout=1)
+    yield hasher
+    hasher.shutdown()
+
+
+class TestBcryptCost:
+
+    def test_parses_cost(self):
+        assert bcrypt_cost("$2b$12$" + "a" * 53) == 12
+        assert bcrypt_cost("$2a$04$" + "a" * 53) == 4
+
+    def test_non_bcrypt_hash(self):
+        assert bcrypt_cost("hashed_password") is None
+        assert bcrypt_cost("$argon2id$v=19$m=65536") is None
+
+
+class TestPasswordHasher:
+
+    @pytest.mark.asyncio
+    async def test_hash_and_verify(self, hasher: PasswordHasher):
+        hashed = await hasher.hash("SecurePass123!")
+
+        assert hashed.startswith("$2b$04$")
+        assert await hasher.verify("SecurePass123!", hashed) is True
+        assert await hasher.verify("wrong", hashed) is False
+        assert await hasher.verify("SecurePass123!", "not-a-hash") is False
+
+    @pytest.mark.asyncio
+    async def test_runs_off_the_event_loop(self, hasher: PasswordHasher):
+        loop_thread = threading.get_ident()
+
+        worker_thread = await hasher._run(threading.get_ident)
+
+        assert worker_thread != loop_thread
+
+    @pytest.mark.asyncio
+    async def test_needs_rehash_on_cost_change(self, hasher: PasswordHasher):
+        hashed = await hasher.hash("SecurePass123!")
+
+        assert hasher.needs_rehash(hashed) is False
+        hasher.rounds = 5
+        assert hasher.needs_rehash(hashed) is True
+        assert hasher.needs_rehash("legacy-plaintext-marker") is False
+
+    @pytest.mark.asyncio
+    async def test_saturated_pool_rejects_with_retry_after(self):
+        hasher = PasswordHasher(rounds=4, workers=1, max_pending=1, queue_timeout=0.05)
+        release = threading.Event()
+        try:
+            blocked = asyncio.create_task(hasher._run(release.wait))
+            await asyncio.sleep(0.01)
+            assert hasher.pending == 1
+
+            with pytest.raises(RateLimitExceededException) as exc_info:
+                await hasher.verify("password", "$2b$04$" + "a" * 53)
+
+            assert exc_info.value.retry_after == 1
+        finally:
+            release.set()
+            await blocked
+            hasher.shutdown()
+
+        assert hasher.pending == 0
+
+    @pytest.mark.asyncio
+    async def test_waiting_caller_gets_freed_slot(self):
+        hasher = PasswordHasher(rounds=4, workers=1, max_pending=1, queue_timeout=1)
+        release = threading.Event()
+        try:
+            blocked = asyncio.create_task(hasher._run(release.wait))
+            await asyncio.sleep(0.01)
+            waiting = asyncio.create_task(hasher.hash("password"))
+            await asyncio.sleep(0.01)
+            release.set()
+
+            await blocked
+            assert (await waiting).startswith("$2b$04$")
+        finally:
+            hasher.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_shutdown_then_reuse(self, hasher: PasswordHasher):
+        await hasher.hash("one")
+        hasher.shutdown()
+
+        assert (await hasher.hash("two")).startswith("$2b$04$")
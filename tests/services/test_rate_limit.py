@@ -425,3 +425,265 @@ class TestStackingRateLimiters:
             assert ip_result.allowed is True
             assert endpoint_result.allowed is True
             assert mock_limiter.check.call_count == 2
+
+
+class TestParseRateLimitBuckets:
+
+    def test_parses_buckets_in_order(self):
+        from app.core.services.rate_limit import (
+            RateLimitBucket,
+            parse_rate_limit_buckets,
+        )
+
+        buckets = parse_rate_limit_buckets("ip:10/60, email:20/3600,global:5000/60")
+
+        assert buckets == (
+            RateLimitBucket("ip", 10, 60),
+            RateLimitBucket("email", 20, 3600),
+            RateLimitBucket("global", 5000, 60),
+        )
+
+    @pytest.mark.parametrize(
+        "spec,match",
+        [
+            ("ip:10", "expected scope:limit/window"),
+            ("device:10/60", "Unknown rate limit scope"),
+            ("ip:0/60", "must be positive"),
+            ("", "at least one bucket"),
+        ],
+    )
+    def test_rejects_invalid_specs(self, spec, match):
+        from app.core.services.rate_limit import parse_rate_limit_buckets
+
+        with pytest.raises(ValueError, match=match):
+            parse_rate_limit_buckets(spec)
+
+
+@pytest.fixture(params=["memory", "redis"])
+def policy_backend(request):
+    return request.param
+
+
+def _policy_request(host: str = "10.0.0.1", path: str = "/auth/signin"):
+    request = MagicMock(spec=Request)
+    request.client.host = host
+    request.url.path = path
+    return request
+
+
+class TestRateLimitPolicy:
+
+    @pytest.mark.asyncio
+    async def test_first_full_bucket_denies(self, policy_backend):
+        from app.core.exceptions.types import RateLimitExceededException
+        from app.core.services.rate_limit import RateLimitPolicy
+
+        policy = RateLimitPolicy.from_spec(
+            "test", "ip:3/60,email:2/3600", backend=policy_backend
+        )
+        request = _policy_request()
+
+        first = await policy.check(request, email="a@example.com")
+        await policy.check(request, email="A@example.com")
+        with pytest.raises(RateLimitExceededException) as exc_info:
+            await policy.check(request, email="a@example.com")
+        # Another account from the same IP still fits the IP bucket
+        other = await policy.check(request, email="b@example.com")
+
+        assert first.scope == "email" and first.remaining == 1
+        assert 3590 <= exc_info.value.retry_after <= 3600
+        assert other.scope == "ip" and other.remaining == 0
+
+    @pytest.mark.asyncio
+    async def test_denied_request_is_not_counted(self, policy_backend):
+        from app.core.exceptions.types import RateLimitExceededException
+        from app.core.services.rate_limit import RateLimitPolicy
+
+        policy = RateLimitPolicy.from_spec(
+            "test", "email:1/60,ip:3/60", backend=policy_backend
+        )
+        request = _policy_request()
+
+        await policy.check(request, email="a@example.com")
+        with pytest.raises(RateLimitExceededException):
+            await policy.check(request, email="a@example.com")
+
+        # The IP bucket only counted the allowed request
+        result = await policy(request)
+        assert result.scope == "ip" and result.remaining == 1
+
+    @pytest.mark.asyncio
+    async def test_global_bucket_is_shared_by_all_clients(self, policy_backend):
+        from app.core.exceptions.types import RateLimitExceededException
+        from app.core.services.rate_limit import RateLimitPolicy
+
+        policy = RateLimitPolicy.from_spec(
+            "test", "ip:10/60,global:2/60", backend=policy_backend
+        )
+
+        await policy(_policy_request("10.0.0.1"))
+        await policy(_policy_request("10.0.0.2"))
+        with pytest.raises(RateLimitExceededException):
+            await policy(_policy_request("10.0.0.3"))
+
+    @pytest.mark.asyncio
+    async def test_buckets_without_subject_are_skipped(self, policy_backend):
+        from app.core.services.rate_limit import RateLimitPolicy
+
+        policy = RateLimitPolicy.from_spec(
+            "test", "ip:5/60,email:1/60", backend=policy_backend
+        )
+
+        result = await policy(_policy_request())
+
+        assert result.scope == "ip" and result.remaining == 4
+
+    @pytest.mark.asyncio
+    async def test_redis_policy_uses_one_script_call(self):
+        from app.core.services.rate_limit import RateLimitPolicy
+
+        policy = RateLimitPolicy.from_spec(
+            "test", "ip:10/60,email:20/3600,global:5000/60", backend="redis"
+        )
+
+        with patch(
+            "app.core.services.rate_limit.RedisService.eval",
+            AsyncMock(return_value=[1, 1, 60, 9]),
+        ) as mock_eval:
+            result = await policy.check(_policy_request(), email="a@example.com")
+
+        mock_eval.assert_awaited_once()
+        keys = mock_eval.await_args.args[1]
+        assert keys == [
+            "rate_limit:ip:10.0.0.1:/auth/signin",
+            "rate_limit:email:a@example.com:/auth/signin",
+            "rate_limit:endpoint:/auth/signin:/auth/signin",
+        ]
+        assert result.allowed is True and result.scope == "ip"
+
+    @pytest.mark.asyncio
+    async def test_redis_unavailable_allows_request(self):
+        from app.core.services.rate_limit import RateLimitPolicy
+
+        policy = RateLimitPolicy.from_spec("test", "ip:1/60", backend="redis")
+
+        with patch(
+            "app.core.services.rate_limit.RedisService.eval",
+            AsyncMock(return_value=None),
+        ):
+            result = await policy(_policy_request())
+
+        assert result.allowed is True
+
+
+class TestPenaltyBox:
+
+    def _policy(self, backend):
+        from app.core.services.rate_limit import PenaltyBox, RateLimitPolicy
+
+        return RateLimitPolicy.from_spec(
+            "test",
+            "ip:100/60,email:100/3600",
+            penalty=PenaltyBox(threshold=3, window=60, base_lockout=10, max_lockout=25),
+            backend=backend,
+        )
+
+    @pytest.mark.asyncio
+    async def test_lockout_after_threshold_and_doubles(self, policy_backend):
+        from app.core.exceptions.types import RateLimitExceededException
+
+        policy = self._policy(policy_backend)
+        request = _policy_request()
+
+        lockouts = [
+            await policy.record_failure(request, email="a@example.com")
+            for _ in range(3)
+        ]
+        with pytest.raises(RateLimitExceededException) as exc_info:
+            await policy.check(request, email="a@example.com")
+
+        assert lockouts == [0, 0, 10]
+        assert "failed attempts" in exc_info.value.message
+        assert 9 <= exc_info.value.retry_after <= 10
+
+        for _ in range(2):
+            await policy.record_failure(request, email="a@example.com")
+        assert await policy.record_failure(request, email="a@example.com") == 20
+        for _ in range(3):
+            lockout = await policy.record_failure(request, email="a@example.com")
+        assert lockout == 25  # capped at max_lockout
+
+    @pytest.mark.asyncio
+    async def test_lockout_applies_per_subject(self, policy_backend):
+        from app.core.exceptions.types import RateLimitExceededException
+
+        policy = self._policy(policy_backend)
+
+        for _ in range(3):
+            await policy.record_failure(
+                _policy_request("10.0.0.1"), email="a@example.com"
+            )
+
+        # The account is locked from any IP; the IP is locked for any account
+        with pytest.raises(RateLimitExceededException):
+            await policy.check(_policy_request("10.0.0.2"), email="a@example.com")
+        with pytest.raises(RateLimitExceededException):
+            await policy.check(_policy_request("10.0.0.1"), email="b@example.com")
+        result = await policy.check(_policy_request("10.0.0.2"), email="b@example.com")
+        assert result.allowed is True
+
+    @pytest.mark.asyncio
+    async def test_success_clears_account_failures(self, policy_backend):
+        policy = self._policy(policy_backend)
+
+        for _ in range(2):
+            await policy.record_failure(
+                _policy_request("10.0.0.1"), email="a@example.com"
+            )
+        await policy.record_success(_policy_request("10.0.0.1"), email="a@example.com")
+
+        assert (
+            await policy.record_failure(
+                _policy_request("10.0.0.2"), email="a@example.com"
+            )
+            == 0
+        )
+
+    @pytest.mark.asyncio
+    async def test_success_does_not_clear_ip_failures(self, policy_backend):
+        from app.core.exceptions.types import RateLimitExceededException
+
+        policy = self._policy(policy_backend)
+        request = _policy_request()
+
+        await policy.record_failure(request, email="victim1@example.com")
+        await policy.record_failure(request, email="victim2@example.com")
+        # Signing in to the attacker's own account from the same IP
+        await policy.record_success(request, email="attacker@example.com")
+
+        assert await policy.record_failure(request, email="victim3@example.com") == 10
+        with pytest.raises(RateLimitExceededException):
+            await policy.check(request, email="victim4@example.com")
+
+    @pytest.mark.asyncio
+    async def test_no_penalty_box_is_a_no_op(self, policy_backend):
+        from app.core.services.rate_limit import RateLimitPolicy
+
+        policy = RateLimitPolicy.from_spec("test", "ip:5/60", backend=policy_backend)
+
+        assert await policy.record_failure(_policy_request()) == 0
+        await policy.record_success(_policy_request())
+
+
+class TestResetPolicies:
+
+    @pytest.mark.asyncio
+    async def test_clears_memory_counters(self):
+        from app.core.services.rate_limit import RateLimitPolicy, reset_policies
+
+        policy = RateLimitPolicy.from_spec("test", "ip:1/60", backend="memory")
+        await policy(_policy_request())
+
+        reset_policies()
+
+        assert (await policy(_policy_request())).allowed is True
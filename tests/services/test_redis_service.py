@@ -454,6 +454,88 @@ class TestRedisServiceSetNX:
         assert result is False
 
 
+class TestRedisServiceLeases:
+
+    @pytest.mark.asyncio
+    async def test_acquire_lease_returns_current_value(self):
+        from app.core.services.redis_service import RedisService
+
+        with patch("app.core.services.redis_service.Redis") as mock_redis_class:
+            mock_client = AsyncMock()
+            mock_client.eval.return_value = b"lease:abc"
+            mock_redis_class.from_url.return_value = mock_client
+
+            await RedisService.init("redis://localhost:6379/0")
+            result = await RedisService.acquire_lease("job:1", "lease:abc", 5000)
+
+            assert result == "lease:abc"
+            args = mock_client.eval.call_args.args
+            assert args[0] == RedisService._ACQUIRE_LEASE_SCRIPT
+            assert args[1:] == (1, "job:1", "lease:abc", "5000")
+
+        await RedisService.aclose()
+
+    @pytest.mark.asyncio
+    async def test_acquire_lease_error_returns_none(self):
+        from app.core.services.redis_service import RedisService
+
+        with patch("app.core.services.redis_service.Redis") as mock_redis_class:
+            mock_client = AsyncMock()
+            mock_client.eval.side_effect = ConnectionError("down")
+            mock_redis_class.from_url.return_value = mock_client
+
+            await RedisService.init("redis://localhost:6379/0")
+            result = await RedisService.acquire_lease("job:1", "lease:abc", 5000)
+
+            assert result is None
+
+        await RedisService.aclose()
+
+    @pytest.mark.asyncio
+    async def test_complete_lease(self):
+        from app.core.services.redis_service import RedisService
+
+        with patch("app.core.services.redis_service.Redis") as mock_redis_class:
+            mock_client = AsyncMock()
+            mock_client.eval.return_value = 1
+            mock_redis_class.from_url.return_value = mock_client
+
+            await RedisService.init("redis://localhost:6379/0")
+            result = await RedisService.complete_lease("job:1", "lease:abc", "1", 60)
+
+            assert result is True
+            args = mock_client.eval.call_args.args
+            assert args[0] == RedisService._COMPLETE_LEASE_SCRIPT
+            assert args[1:] == (1, "job:1", "lease:abc", "1", "60")
+
+        await RedisService.aclose()
+
+    @pytest.mark.asyncio
+    async def test_renew_lease_lost(self):
+        from app.core.services.redis_service import RedisService
+
+        with patch("app.core.services.redis_service.Redis") as mock_redis_class:
+            mock_client = AsyncMock()
+            mock_client.eval.return_value = 0
+            mock_redis_class.from_url.return_value = mock_client
+
+            await RedisService.init("redis://localhost:6379/0")
+            result = await RedisService.renew_lease("job:1", "lease:abc", 5000)
+
+            assert result is False
+
+        await RedisService.aclose()
+
+    @pytest.mark.asyncio
+    async def test_lease_methods_when_not_initialized(self):
+        from app.core.services.redis_service import RedisService
+
+        RedisService._client = None
+
+        assert await RedisService.acquire_lease("job:1", "lease:abc", 5000) is None
+        assert await RedisService.release_lease("job:1", "lease:abc") is False
+
+
 class TestRedisServiceIsConnected:
 
     @pytest.mark.asyncio
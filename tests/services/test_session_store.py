@@ -0,0 +1,238 @@
+"""
+Test suite for the refresh token session stores.
+
+Run tests:
+    pytest tests/services/test_session_store.py -v
+
+Run with coverage:
+    pytest tests/services/test_session_store.py --cov=app.core.services.session_store --cov-report=term-missing -v
+"""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exceptions.types import AuthenticationException
+from app.core.services.redis_service import RedisService
+from app.core.services.session_store import (
+    SESSION_AUDIT_QUEUE,
+    DatabaseSessionStore,
+    RedisSessionStore,
+    SessionRecord,
+    SessionStoreUnavailableException,
+    create_session_store,
+)
+
+MODULE = "app.core.services.session_store"
+
+
+def _expires(days: int = 7) -> datetime:
+    return datetime.now(timezone.utc) + timedelta(days=days)
+
+
+@pytest.fixture
+def session():
+    return MagicMock()
+
+
+class TestSessionRecord:
+
+    def test_json_round_trip(self):
+        record = SessionRecord(
+            id=uuid4(),
+            user_id=uuid4(),
+            token_hash="hash",
+            created_at=datetime.now(timezone.utc),
+            expires_at=_expires(),
+            device_info="Mozilla/5.0",
+        )
+
+        assert SessionRecord.from_json(record.to_json()) == record
+
+
+class TestRedisSessionStore:
+
+    @pytest.fixture
+    def store(self):
+        return RedisSessionStore()
+
+    @pytest.mark.asyncio
+    async def test_create_and_get_valid(self, store, session):
+        user_id = uuid4()
+
+        record = await store.create(
+            session, user_id, "hash-1", _expires(), device_info="cli"
+        )
+
+        assert await store.get_valid(session, "hash-1") == record
+        assert record.user_id == user_id and record.device_info == "cli"
+        assert await store.get_valid(session, "unknown") is None
+
+    @pytest.mark.asyncio
+    async def test_session_keys_expire_with_token(self, store, session):
+        user_id = uuid4()
+
+        await store.create(session, user_id, "hash-1", _expires(days=1))
+
+        ttl = await RedisService._client.ttl(store._session_key("hash-1"))
+        set_ttl = await RedisService._client.ttl(store._user_sessions_key(user_id))
+        assert 86_000 < ttl <= 86_400
+        assert set_ttl >= ttl
+
+    @pytest.mark.asyncio
+    async def test_revoke(self, store, session):
+        user_id = uuid4()
+        await store.create(session, user_id, "hash-1", _expires())
+        await store.create(session, user_id, "hash-2", _expires())
+
+        assert await store.revoke(session, "hash-1") is True
+        assert await store.revoke(session, "hash-1") is False
+        assert await store.get_valid(session, "hash-1") is None
+        assert [r.token_hash for r in await store.list_active(session, user_id)] == [
+            "hash-2"
+        ]
+
+    @pytest.mark.asyncio
+    async def test_revoke_all_invalidates_existing_sessions_only(self, store, session):
+        user_id = uuid4()
+        other_user_id = uuid4()
+        await store.create(session, user_id, "hash-1", _expires())
+        await store.create(session, user_id, "hash-2", _expires(days=30))
+        await store.create(session, other_user_id, "hash-3", _expires())
+
+        assert await store.revoke_all(session, user_id) == 2
+        await store.create(session, user_id, "hash-4", _expires())
+
+        assert await store.get_valid(session, "hash-1") is None
+        assert await store.get_valid(session, "hash-2") is None
+        assert await store.revoke(session, "hash-2") is False
+        assert await store.get_valid(session, "hash-3") is not None
+        assert await store.get_valid(session, "hash-4") is not None
+        assert [r.token_hash for r in await store.list_active(session, user_id)] == [
+            "hash-4"
+        ]
+        # The counter outlives the longest revoked session
+        gen_ttl = await RedisService._client.ttl(store._generation_key(user_id))
+        assert gen_ttl >= 30 * 86_400 - 5
+
+    @pytest.mark.asyncio
+    async def test_list_active_oldest_first(self, store, session):
+        user_id = uuid4()
+        for token_hash in ("hash-1", "hash-2", "hash-3"):
+            await store.create(session, user_id, token_hash, _expires())
+
+        sessions = await store.list_active(session, user_id)
+
+        assert [r.token_hash for r in sessions] == ["hash-1", "hash-2", "hash-3"]
+
+    @pytest.mark.asyncio
+    async def test_cleanup_expired_is_a_no_op(self, store, session):
+        assert await store.cleanup_expired(session) == 0
+
+    @pytest.mark.asyncio
+    async def test_writes_raise_when_redis_unavailable(self, store, session):
+        with patch(f"{MODULE}.RedisService.eval", AsyncMock(return_value=None)):
+            with pytest.raises(SessionStoreUnavailableException):
+                await store.create(session, uuid4(), "hash-1", _expires())
+            with pytest.raises(SessionStoreUnavailableException):
+                await store.revoke_all(session, uuid4())
+            assert await store.get_valid(session, "hash-1") is None
+
+    @pytest.mark.asyncio
+    async def test_audit_events_published(self, session):
+        store = RedisSessionStore(audit=True)
+        user_id = uuid4()
+        publisher = AsyncMock()
+
+        with patch(f"{MODULE}.get_publisher", return_value=publisher):
+            record = await store.create(session, user_id, "hash-1", _expires())
+            await store.revoke(session, "hash-1")
+            await store.revoke_all(session, user_id)
+
+        events = [call.args for call in publisher.await_args_list]
+        assert [queue for queue, _ in events] == [SESSION_AUDIT_QUEUE] * 3
+        created, revoked, revoked_all = (event for _, event in events)
+        assert created["action"] == "created"
+        assert created["id"] == str(record.id)
+        assert created["token_hash"] == "hash-1"
+        assert revoked["action"] == "revoked"
+        assert revoked_all == {
+            "action": "revoked_all",
+            "user_id": str(user_id),
+            "revoked_at": revoked_all["revoked_at"],
+        }
+
+    @pytest.mark.asyncio
+    async def test_audit_failure_does_not_block(self, session):
+        store = RedisSessionStore(audit=True)
+
+        with patch(f"{MODULE}.get_publisher", side_effect=RuntimeError("down")):
+            record = await store.create(session, uuid4(), "hash-1", _expires())
+
+        assert await store.get_valid(session, "hash-1") == record
+
+
+class TestDatabaseSessionStore:
+
+    @pytest.mark.asyncio
+    async def test_round_trip(self, db_session: AsyncSession, test_user):
+        store = DatabaseSessionStore()
+
+        record = await store.create(
+            db_session, test_user.id, "db-hash-1", _expires(), commit_self=False
+        )
+        await store.create(
+            db_session, test_user.id, "db-hash-2", _expires(), commit_self=False
+        )
+
+        assert await store.get_valid(db_session, "db-hash-1") == record
+        assert len(await store.list_active(db_session, test_user.id)) == 2
+        assert await store.revoke_all(db_session, test_user.id, commit_self=False) == 2
+        assert await store.get_valid(db_session, "db-hash-2") is None
+
+
+class TestCreateSessionStore:
+
+    def test_backends(self):
+        assert isinstance(create_session_store("database"), DatabaseSessionStore)
+        assert isinstance(create_session_store("redis"), RedisSessionStore)
+
+    def test_redis_audit_follows_settings(self):
+        with patch(f"{MODULE}.settings") as mock_settings:
+            mock_settings.SESSION_STORE_BACKEND = "redis"
+            mock_settings.SESSION_STORE_AUDIT = False
+            store = create_session_store()
+
+        assert isinstance(store, RedisSessionStore) and store.audit is False
+
+
+class TestAuthServiceWithRedisStore:
+
+    @pytest.mark.asyncio
+    async def test_refresh_and_sign_out_everywhere(
+        self, db_session: AsyncSession, test_user
+    ):
+        from app.core.services.auth import AuthService
+
+        with patch("app.core.services.auth.session_store", RedisSessionStore()):
+            tokens = await AuthService.create_token_pair(
+                db_session, test_user, commit_self=False
+            )
+            access_token = await AuthService.refresh_access_token(
+                db_session, tokens.refresh_token
+            )
+            sessions = await AuthService.get_active_sessions(db_session, test_user.id)
+
+            count = await AuthService.revoke_all_user_tokens(
+                db_session, test_user.id, commit_self=False
+            )
+
+            with pytest.raises(AuthenticationException):
+                await AuthService.refresh_access_token(db_session, tokens.refresh_token)
+
+        assert access_token
+        assert [s.user_id for s in sessions] == [test_user.id]
+        assert count == 1
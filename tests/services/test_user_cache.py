@@ -0,0 +1,213 @@
+"""
+Test suite for the user snapshot cache.
+
+Run tests:
+    pytest tests/services/test_user_cache.py -v
+
+Run with coverage:
+    pytest tests/services/test_user_cache.py --cov=app.core.services.user_cache --cov-report=term-missing -v
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.core.services.user_cache import (
+    UserCache,
+    UserSnapshot,
+    snapshot_key,
+    token_version_key,
+)
+from app.core.services.commit_hooks import (
+    _discard_after_rollback,
+    _flush_after_commit,
+    _flush_tasks,
+)
+
+MODULE = "app.core.services.user_cache"
+
+
+def _user(**overrides):
+    fields = {
+        "id": uuid4(),
+        "email": "test@example.com",
+        "is_active": True,
+        "email_verified": True,
+        "is_deleted": False,
+        "token_version": 0,
+    }
+    return SimpleNamespace(**{**fields, **overrides})
+
+
+@pytest.fixture
+def session():
+    session = MagicMock()
+    session.info = {}
+    session.in_transaction = MagicMock(return_value=False)
+    session.begin = MagicMock(return_value=AsyncMock())
+    return session
+
+
+@pytest.fixture
+def redis():
+    with patch(f"{MODULE}.RedisService") as mock_redis:
+        mock_redis.is_connected.return_value = False
+        mock_redis.get = AsyncMock(return_value=None)
+        mock_redis.set = AsyncMock(return_value=True)
+        mock_redis.delete = AsyncMock(return_value=True)
+        yield mock_redis
+
+
+@pytest.fixture
+def user_db():
+    with patch(f"{MODULE}.user_db") as mock_user_db:
+        yield mock_user_db
+
+
+class TestUserSnapshot:
+
+    def test_json_round_trip(self):
+        snapshot = UserSnapshot.from_user(_user(token_version=3))
+
+        assert UserSnapshot.from_json(snapshot.to_json()) == snapshot
+
+
+class TestUserCacheGet:
+
+    @pytest.mark.asyncio
+    async def test_miss_loads_user_then_serves_from_memory(
+        self, session, redis, user_db
+    ):
+        user = _user()
+        user_db.get_by_id = AsyncMock(return_value=user)
+        cache = UserCache(ttl=60, local_ttl=5, local_max_entries=10)
+
+        first = await cache.get(session, user.id)
+        second = await cache.get(session, user.id)
+
+        assert first == second == UserSnapshot.from_user(user)
+        user_db.get_by_id.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_unknown_user_is_not_cached(self, session, redis, user_db):
+        user_db.get_by_id = AsyncMock(return_value=None)
+        cache = UserCache(ttl=60, local_ttl=5, local_max_entries=10)
+        user_id = uuid4()
+
+        assert await cache.get(session, user_id) is None
+        assert await cache.get(session, user_id) is None
+        assert user_db.get_by_id.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_local_entries_expire_and_are_bounded(self, session, redis, user_db):
+        users = [_user() for _ in range(3)]
+        user_db.get_by_id = AsyncMock(side_effect=users + users)
+        cache = UserCache(ttl=60, local_ttl=5, local_max_entries=2)
+
+        for user in users:
+            await cache.get(session, user.id)
+
+        assert list(cache._local) == [users[1].id, users[2].id]
+
+        with patch(f"{MODULE}.time.monotonic", return_value=float("inf")):
+            assert cache._get_local(users[2].id) is None
+
+    @pytest.mark.asyncio
+    async def test_redis_layer(self, session, redis, user_db):
+        user = _user()
+        snapshot = UserSnapshot.from_user(user)
+        redis.is_connected.return_value = True
+        user_db.get_by_id = AsyncMock(return_value=user)
+        cache = UserCache(ttl=60, local_ttl=0, local_max_entries=10)
+
+        await cache.get(session, user.id)
+        redis.set.assert_awaited_once_with(
+            snapshot_key(user.id), snapshot.to_json().decode(), ttl=60
+        )
+
+        redis.get.return_value = snapshot.to_json().decode()
+        assert await cache.get(session, user.id) == snapshot
+        user_db.get_by_id.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_malformed_redis_entry_falls_back_to_database(
+        self, session, redis, user_db
+    ):
+        user = _user()
+        redis.is_connected.return_value = True
+        redis.get.return_value = "{not json"
+        user_db.get_by_id = AsyncMock(return_value=user)
+        cache = UserCache(ttl=60, local_ttl=5, local_max_entries=10)
+
+        assert await cache.get(session, user.id) == UserSnapshot.from_user(user)
+
+
+class TestUserCacheInvalidation:
+
+    @pytest.mark.asyncio
+    async def test_invalidate_on_commit_clears_now_and_after_commit(
+        self, session, redis, user_db
+    ):
+        user = _user()
+        redis.is_connected.return_value = True
+        user_db.get_by_id = AsyncMock(return_value=user)
+        cache = UserCache(ttl=60, local_ttl=5, local_max_entries=10)
+        await cache.get(session, user.id)
+
+        with patch(f"{MODULE}.user_cache", cache):
+            await cache.invalidate_on_commit(session, user.id)
+            assert user.id not in cache._local
+            assert redis.delete.await_count == 1
+
+            # A racing reader re-caches the pre-commit row
+            await cache.get(session, user.id)
+            _flush_after_commit(session)
+            await asyncio.sleep(0)
+
+        assert user.id not in cache._local
+        assert redis.delete.await_count == 2
+        assert session.info == {}
+
+    @pytest.mark.asyncio
+    async def test_token_version_published_after_commit(self, session, redis):
+        redis.is_connected.return_value = True
+        cache = UserCache(ttl=60, local_ttl=5, local_max_entries=10)
+        user_id = uuid4()
+
+        with patch(f"{MODULE}.user_cache", cache):
+            await cache.publish_token_version_on_commit(session, user_id, 4, ttl=900)
+            redis.set.assert_not_awaited()
+
+            _flush_after_commit(session)
+            (task,) = _flush_tasks
+            await task
+
+        redis.set.assert_awaited_once_with(token_version_key(user_id), "4", ttl=900)
+        assert not _flush_tasks
+
+    @pytest.mark.asyncio
+    async def test_rollback_discards_pending_work(self, session, redis):
+        redis.is_connected.return_value = True
+        cache = UserCache(ttl=60, local_ttl=5, local_max_entries=10)
+
+        await cache.publish_token_version_on_commit(session, uuid4(), 4, ttl=900)
+        _discard_after_rollback(session)
+        _flush_after_commit(session)
+        await asyncio.sleep(0)
+
+        redis.set.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_revoked_token_version(self, redis):
+        cache = UserCache(ttl=60, local_ttl=5, local_max_entries=10)
+        user_id = uuid4()
+
+        assert await cache.revoked_token_version(user_id) is None
+
+        redis.is_connected.return_value = True
+        redis.get.return_value = "7"
+        assert await cache.revoked_token_version(user_id) == 7
+        redis.get.assert_awaited_with(token_version_key(user_id))
@@ -91,8 +91,10 @@ class TestLifespanEvents:
             patch(
                 "app.main.start_consumers", new_callable=AsyncMock, return_value=None
             ) as mock_start,
-            patch("app.main.register_publisher"),
-            patch("app.main.register_post_signup_hook"),
+            patch(
+                "app.main.register_event_publisher", return_value=None
+            ) as mock_register_publisher,
+            patch("app.main.register_post_signup_hooks"),
             patch("app.main.AsyncSessionLocal") as mock_session_local,
             patch("app.main.QuotaCacheService") as mock_quota,
             patch("app.main.AuthService"),
@@ -113,6 +115,7 @@ class TestLifespanEvents:
             mock_redis.init = AsyncMock()
             mock_redis.aclose = AsyncMock()
             mock_google.init = AsyncMock()
+            mock_google.load_metadata = AsyncMock()
             mock_google.aclose = AsyncMock()
             mock_github.init = AsyncMock()
             mock_github.aclose = AsyncMock()
@@ -121,6 +124,7 @@ class TestLifespanEvents:
                 "scheduler": mock_scheduler,
                 "initialize_scheduler": mock_init_sched,
                 "start_consumers": mock_start,
+                "register_event_publisher": mock_register_publisher,
                 "cloudinary": mock_cloudinary,
                 "brevo": mock_brevo,
                 "renderer": mock_renderer,
@@ -178,6 +182,14 @@ class TestLifespanEvents:
             pass
         mock_connection.close.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_lifespan_shutdown_stops_outbox_relay(self):
+        mock_relay = AsyncMock()
+        self.mocks["register_event_publisher"].return_value = mock_relay
+        async with lifespan(app):
+            mock_relay.stop.assert_not_called()
+        mock_relay.stop.assert_awaited_once()
+
     @pytest.mark.asyncio
     async def test_lifespan_shutdown_no_connection_to_close(self):
         async with lifespan(app):